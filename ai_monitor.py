@@ -10,6 +10,8 @@ import urllib.request
 import xml.etree.ElementTree as ET
 import json
 import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
 from pathlib import Path
 
@@ -19,6 +21,8 @@ HEADERS = {"User-Agent": "Vessel-AI-Monitor/1.0"}
 
 
 def _fetch_url(url: str, timeout: int = 10) -> bytes | None:
+    """Fetch semplice. Quando gira come job di Vessel viene sostituita da http_fetch
+    (GET condizionali, cache su disco, limite per host)."""
     try:
         req = urllib.request.Request(url, headers=HEADERS)
         with urllib.request.urlopen(req, timeout=timeout) as r:
@@ -153,20 +157,32 @@ def save_log(digest: str, hn: list, reddit: list, releases: list, nanobot_update
         f.write(entry + "\n")
 
 
-def main():
-    now = datetime.now()
+def _timed(name: str, fn, *args):
+    t0 = time.time()
+    try:
+        return fn(*args)
+    finally:
+        print(f"  {name}: {int((time.time() - t0) * 1000)}ms")
 
-    hn = fetch_hn_ai()
-    reddit = fetch_localllama()
 
-    releases = []
-    for owner, repo, label in [("ollama", "ollama", "Ollama")]:
-        rel = fetch_github_release(owner, repo)
-        if rel:
-            rel["label"] = label
-            releases.append(rel)
+def main():
+    now = datetime.now()
 
-    nanobot_update = check_nanobot_version()
+    # Fonti indipendenti in parallelo: il digest costa quanto la più lenta
+    repos = [("ollama", "ollama", "Ollama")]
+    with ThreadPoolExecutor(max_workers=3 + len(repos)) as pool:
+        f_hn = pool.submit(_timed, "hn", fetch_hn_ai)
+        f_reddit = pool.submit(_timed, "reddit", fetch_localllama)
+        f_nanobot = pool.submit(_timed, "pypi", check_nanobot_version)
+        f_releases = [(label, pool.submit(_timed, f"github {owner}/{repo}", fetch_github_release, owner, repo))
+                      for owner, repo, label in repos]
+        hn, reddit, nanobot_update = f_hn.result(), f_reddit.result(), f_nanobot.result()
+        releases = []
+        for label, f in f_releases:
+            rel = f.result()
+            if rel:
+                rel["label"] = label
+                releases.append(rel)
 
     # ── Componi digest ──
     lines = [f"[AI MONITOR] {now.strftime('%d/%m/%Y %H:%M')}"]
@@ -1,282 +1,115 @@
 #!/usr/bin/env python3
 """
-Benchmark LLM per selezione modello ottimale su Ollama PC
-Misura: tok/s (oggettivo) + qualità output (rubrica 0-3)
+Benchmark provider LLM sul percorso reale della chat
+Misura: TTFT, latenza end-to-end, tok/s di prompt eval e di generazione,
+        throughput aggregato a concorrenza 1..N; confronto col run precedente.
+
+Carica la dashboard (nanobot_dashboard_v2.py) e usa il suo services/bench.py:
+_enrich_system_prompt → build_context → get_provider → _provider_worker, come
+una chat vera. I run finiscono in ~/.nanobot/vessel.db (bench_runs), visibili
+anche da GET /api/bench/runs.
+
+Uso:  python3 benchmark_llm.py --provider ollama_pc [--model qwen2.5-coder:14b]
+                               [--concurrency 1,2,4] [--rounds 2]
+                               [--endpoint http://127.0.0.1:8099] [--no-memory]
+                               [--label stock] [--json]
+      python3 benchmark_llm.py --list [--provider ollama]
+Exit code 1 se il run ha regressioni rispetto al precedente confrontabile
+o se tutte le richieste sono fallite.
 """
 
+import argparse
+import asyncio
+import contextlib
 import json
-import time
-import requests
-from datetime import datetime
+import runpy
+import sys
+from pathlib import Path
 
-OLLAMA_HOST = "http://192.168.178.34:11434"
-NUM_PREDICT = 512   # token max per risposta — abbastanza per valutare, non troppo
-TEMPERATURE = 0.0   # deterministico
-
-# ─── MODELLI DA TESTARE ───────────────────────────────────────────────
-MODELS = [
-    "qwen2.5-coder:14b",   # baseline attuale — full GPU (9GB)
-    "qwen3-coder:30b",     # candidato — parziale offload (19GB, ~7GB su RAM)
+DASHBOARD_CANDIDATES = [
+    Path(__file__).resolve().parent / "nanobot_dashboard_v2.py",
+    Path.home() / "nanobot_dashboard.py",
 ]
+COLUMNS = [("c", "concurrency"), ("req", "requests"), ("err", "errors"),
+           ("ttft p50", "ttft_p50"), ("ttft p95", "ttft_p95"),
+           ("tot p50", "total_p50"), ("tot p95", "total_p95"),
+           ("pe tok/s", "prompt_tps"), ("gen tok/s", "gen_tps"), ("aggr tok/s", "throughput_tps")]
+
+
+def load_dashboard(path: str) -> dict:
+    """Esegue la dashboard senza avviare uvicorn (run_name diverso da __main__)."""
+    candidates = [Path(path)] if path else DASHBOARD_CANDIDATES
+    for p in candidates:
+        if p.exists():
+            return runpy.run_path(str(p), run_name="vessel_bench")
+    sys.exit(f"Dashboard non trovata: {', '.join(str(p) for p in candidates)}")
+
+
+def print_run(run: dict):
+    print(f"\n  Run #{run['id']} — {run['provider']} / {run['model']}"
+          + (f" @ {run['endpoint']}" if run.get("endpoint") else "")
+          + (f" [{run['label']}]" if run.get("label") else ""))
+    print("  " + " ".join(f"{h:>10}" for h, _ in COLUMNS))
+    print("  " + "-" * (11 * len(COLUMNS)))
+    for c, lv in run["levels"].items():
+        row = {"concurrency": c, **lv}
+        print("  " + " ".join(f"{'-' if row.get(k) is None else row[k]:>10}" for _, k in COLUMNS))
+    if run.get("previous_id"):
+        print(f"\n  Confronto con run #{run['previous_id']}: "
+              + (f"{len(run['regressions'])} regressioni" if run["regressions"] else "nessuna regressione"))
+    for r in run.get("regressions", []):
+        print(f"    ⚠ {r}")
+    if run.get("failed"):
+        print("\n  ⚠ tutte le richieste sono fallite (run escluso dai confronti)")
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Benchmark provider LLM (TTFT, tok/s, concorrenza)")
+    ap.add_argument("--provider", default="", help="id provider (ollama, ollama_pc, anthropic, ...; default ollama)")
+    ap.add_argument("--model", default="", help="modello (default: quello configurato per il provider)")
+    ap.add_argument("--concurrency", default="1,2,4", help="livelli di concorrenza, es. 1,2,4")
+    ap.add_argument("--rounds", type=int, default=2, help="ondate per livello")
+    ap.add_argument("--endpoint", default="", help="http(s)://host:porta al posto di quello del provider (es. mock)")
+    ap.add_argument("--no-memory", action="store_true", help="system prompt senza memoria/recall")
+    ap.add_argument("--label", default="", help="etichetta: si confronta solo con run della stessa etichetta")
+    ap.add_argument("--list", action="store_true", help="mostra lo storico invece di eseguire")
+    ap.add_argument("--json", action="store_true", help="output JSON")
+    ap.add_argument("--dashboard", default="", help="percorso di nanobot_dashboard_v2.py")
+    args = ap.parse_args()
 
-# ─── TASK DI BENCHMARK ───────────────────────────────────────────────
-# Casi reali del bridge — semplici ma rappresentativi
-TASKS = [
-    {
-        "id": "T1_debug_syntax",
-        "category": "debug",
-        "prompt": """Questo codice Python ha un errore. Trovalo e correggilo. Rispondi SOLO con il codice corretto, nessuna spiegazione.
-
-```python
-def build_context(messages, max_tokens=4000):
-    result = []
-    total = 0
-    for msg on messages:
-        tokens = len(msg['content'].split()) * 1.3
-        if total + tokens > max_tokens:
-            break
-        result.append(msg)
-        total += tokens
-    return result
-```""",
-        "expected_fix": "for msg in messages",  # keyword attesa nel codice corretto
-        "rubric": {
-            3: "Codice corretto, solo `for msg in messages`, nessuna spiegazione extra",
-            2: "Trova l'errore ma aggiunge testo non richiesto",
-            1: "Individua il problema ma il codice non è direttamente eseguibile",
-            0: "Non trova l'errore o risposta errata"
-        }
-    },
-    {
-        "id": "T2_add_feature",
-        "category": "modifica",
-        "prompt": """Aggiungi a questa funzione il parametro opzionale `include_system=True`. Se False, filtra i messaggi con role='system'.
-Rispondi SOLO con la funzione modificata.
-
-```python
-def get_recent_messages(db_path, limit=20):
-    conn = sqlite3.connect(db_path)
-    cur = conn.cursor()
-    cur.execute("SELECT role, content FROM chat_messages ORDER BY id DESC LIMIT ?", (limit,))
-    rows = cur.fetchall()
-    conn.close()
-    return [{"role": r[0], "content": r[1]} for r in reversed(rows)]
-```""",
-        "expected_fix": "include_system",
-        "rubric": {
-            3: "Funzione corretta con parametro, filtraggio condizionale, solo codice",
-            2: "Logica corretta ma include spiegazione o firma sbagliata",
-            1: "Aggiunge il parametro ma il filtraggio è incompleto/errato",
-            0: "Non modifica correttamente"
-        }
-    },
-    {
-        "id": "T3_create_function",
-        "category": "crea",
-        "prompt": """Scrivi una funzione Python `format_uptime(seconds: int) -> str` che converte secondi in formato leggibile tipo "3g 4h 12m". Rispondi SOLO con la funzione.""",
-        "expected_fix": "def format_uptime",
-        "rubric": {
-            3: "Funzione corretta, gestisce giorni/ore/minuti, solo codice",
-            2: "Funzione corretta ma con extra non richiesto",
-            1: "Funzione parziale (manca un'unità o logica errata)",
-            0: "Non restituisce una funzione valida"
-        }
-    },
-    {
-        "id": "T4_analyze_code",
-        "category": "analizza",
-        "prompt": """Analizza questo codice e rispondi con UNA sola frase: qual è il problema principale?
-
-```python
-@app.route('/api/messages', methods=['GET'])
-def get_messages():
-    user = request.args.get('user')
-    query = f"SELECT * FROM messages WHERE user = '{user}'"
-    conn = sqlite3.connect('app.db')
-    results = conn.execute(query).fetchall()
-    return jsonify(results)
-```""",
-        "expected_fix": "SQL injection",
-        "rubric": {
-            3: "Identifica SQL injection in una frase, conciso",
-            2: "Identifica SQL injection ma risposta troppo lunga",
-            1: "Menziona un problema ma non il principale",
-            0: "Non identifica SQL injection"
-        }
-    },
-    {
-        "id": "T5_refactor",
-        "category": "modifica",
-        "prompt": """Riscrivi questa funzione in modo pythonic usando una list comprehension. Rispondi SOLO con la funzione.
-
-```python
-def filter_errors(logs):
-    result = []
-    for entry in logs:
-        if entry.get('level') == 'ERROR':
-            result.append(entry['message'])
-    return result
-```""",
-        "expected_fix": "list comprehension",
-        "rubric": {
-            3: "Una list comprehension corretta, solo codice",
-            2: "Usa list comprehension ma aggiunge spiegazione",
-            1: "Refactor ma non usa list comprehension",
-            0: "Non refactora correttamente"
-        }
-    },
-]
-
-# ─── CORE BENCHMARK ──────────────────────────────────────────────────
-
-def run_single(model: str, task: dict) -> dict:
-    """Esegue un singolo task su un modello, restituisce metriche."""
-    payload = {
-        "model": model,
-        "prompt": task["prompt"],
-        "stream": False,
-        "options": {
-            "temperature": TEMPERATURE,
-            "num_predict": NUM_PREDICT,
-            "seed": 42,
-        }
-    }
-    t_start = time.time()
     try:
-        resp = requests.post(f"{OLLAMA_HOST}/api/generate", json=payload, timeout=120)
-        resp.raise_for_status()
-        data = resp.json()
-    except Exception as e:
-        return {"error": str(e), "toks": 0, "elapsed": time.time() - t_start}
-
-    t_elapsed = time.time() - t_start
-    eval_count = data.get("eval_count", 0)
-    eval_duration_ns = data.get("eval_duration", 1)
-    toks_per_sec = eval_count / (eval_duration_ns / 1e9) if eval_duration_ns else 0
-
-    return {
-        "output": data.get("response", ""),
-        "toks_per_sec": round(toks_per_sec, 1),
-        "eval_count": eval_count,
-        "elapsed_s": round(t_elapsed, 1),
-        "error": None
-    }
-
-
-def score_output(output: str, task: dict) -> int:
-    """Scoring semi-automatico: verifica presenza keyword attesa + lunghezza."""
-    out_lower = output.lower()
-    expected = task["expected_fix"].lower()
-
-    # Check keyword
-    has_keyword = expected in out_lower
-
-    # Penalità per risposte troppo verbose (> 60 parole per task di codice)
-    word_count = len(output.split())
-    is_verbose = word_count > 200 and task["category"] in ("debug", "modifica", "crea")
-
-    if not has_keyword:
-        return 0
-    if is_verbose:
-        return 2
-    return 3  # keyword presente, non verboso — score massimo automatico
-
-
-def benchmark_model(model: str) -> dict:
-    """Esegue tutti i task su un modello."""
-    print(f"\n{'='*60}")
-    print(f"  Modello: {model}")
-    print(f"{'='*60}")
+        levels = tuple(int(x) for x in args.concurrency.split(",") if x.strip())
+    except ValueError:
+        sys.exit(f"--concurrency non valido: {args.concurrency}")
+    if not levels or min(levels) < 1 or args.rounds < 1:
+        sys.exit("--concurrency e --rounds devono essere >= 1")
+    if args.endpoint and not args.endpoint.startswith(("http://", "https://")):
+        sys.exit("--endpoint deve iniziare con http:// o https://")
+
+    with contextlib.redirect_stdout(sys.stderr):   # log di avvio fuori da stdout (--json)
+        d = load_dashboard(args.dashboard)
+        d["init_db"]()
+
+    if args.list:
+        runs = d["db_get_bench_runs"](args.provider)
+        if args.json:
+            print(json.dumps(runs, indent=2, ensure_ascii=False))
+            return
+        for run in reversed(runs):
+            print_run(run)
+        return
+
+    provider = args.provider or "ollama"
+    print(f"Benchmark {provider} — concorrenza {list(levels)}, {args.rounds} ondate per livello")
+    run = asyncio.run(d["bench_run"](provider, args.model, levels, args.rounds,
+                                     endpoint=args.endpoint, memory=not args.no_memory,
+                                     label=args.label))
+    if args.json:
+        print(json.dumps(run, indent=2, ensure_ascii=False))
+    else:
+        print_run(run)
+    sys.exit(1 if run["regressions"] or run["failed"] else 0)
 
-    results = []
-    for task in TASKS:
-        print(f"  [{task['id']}] {task['category']}...", end=" ", flush=True)
-        r = run_single(model, task)
-        if r.get("error"):
-            print(f"ERRORE: {r['error']}")
-            results.append({"task_id": task["id"], "score": 0, "toks_per_sec": 0, "error": r["error"]})
-            continue
-
-        score = score_output(r["output"], task)
-        tps = r["toks_per_sec"]
-        print(f"{tps:.1f} tok/s | score {score}/3 | {r['elapsed_s']}s")
-
-        results.append({
-            "task_id": task["id"],
-            "category": task["category"],
-            "score": score,
-            "toks_per_sec": tps,
-            "elapsed_s": r["elapsed_s"],
-            "output_snippet": r["output"][:200].replace('\n', ' '),
-        })
-
-    return {"model": model, "results": results}
-
-
-def print_summary(all_results: list):
-    print(f"\n{'='*60}")
-    print("  RIEPILOGO BENCHMARK")
-    print(f"{'='*60}")
-    print(f"{'Modello':<30} {'Avg tok/s':>10} {'Score tot':>10} {'Score%':>8}")
-    print("-" * 60)
-
-    for mr in all_results:
-        results = mr["results"]
-        avg_tps = sum(r["toks_per_sec"] for r in results) / len(results)
-        total_score = sum(r["score"] for r in results)
-        max_score = len(results) * 3
-        score_pct = total_score / max_score * 100
-
-        print(f"{mr['model']:<30} {avg_tps:>10.1f} {total_score:>7}/{max_score} {score_pct:>7.0f}%")
-
-    print(f"\nNote:")
-    print(f"  - Scoring automatico (keyword + verbosità) — verifica output manuale consigliata")
-    print(f"  - Temperature=0 + seed=42 per riproducibilità")
-
-
-def save_results(all_results: list):
-    ts = datetime.now().strftime("%Y%m%d_%H%M%S")
-    fname = f"benchmark_results_{ts}.json"
-    with open(fname, "w", encoding="utf-8") as f:
-        json.dump(all_results, f, indent=2, ensure_ascii=False)
-    print(f"\n  Risultati salvati in: {fname}")
-    return fname
-
-
-# ─── MAIN ────────────────────────────────────────────────────────────
 
 if __name__ == "__main__":
-    # Modelli da testare — aggiornare con i nomi confermati
-    models_to_test = MODELS
-    if not models_to_test:
-        # fallback: chiedi all'API quali sono disponibili
-        try:
-            r = requests.get(f"{OLLAMA_HOST}/api/tags", timeout=5)
-            available = [m["name"] for m in r.json().get("models", [])]
-            print(f"Modelli disponibili su Ollama PC: {available}")
-            print("Aggiorna MODELS = [...] nello script con i modelli da testare.")
-        except Exception as e:
-            print(f"Errore connessione Ollama PC: {e}")
-        exit(0)
-
-    print(f"Benchmark LLM — {datetime.now().strftime('%Y-%m-%d %H:%M')}")
-    print(f"Modelli: {models_to_test}")
-    print(f"Task: {len(TASKS)} | Token max: {NUM_PREDICT} | Temp: {TEMPERATURE}")
-
-    all_results = []
-    for model in models_to_test:
-        mr = benchmark_model(model)
-        all_results.append(mr)
-
-    print_summary(all_results)
-    fname = save_results(all_results)
-
-    # Stampa output completi per review manuale
-    print(f"\n{'='*60}")
-    print("  OUTPUT COMPLETI (per valutazione manuale)")
-    print(f"{'='*60}")
-    for mr in all_results:
-        print(f"\n--- {mr['model']} ---")
-        for r in mr["results"]:
-            print(f"\n[{r['task_id']}] score={r['score']}/3 | {r['toks_per_sec']} tok/s")
-            print(f"  Output: {r.get('output_snippet', 'N/A')}")
+    main()
@@ -0,0 +1,177 @@
+#!/usr/bin/env python3
+"""
+Benchmark pipeline vocale su un campione registrato (vecchio vs codice in uso)
+Misura le funzioni vere della dashboard (caricata come benchmark_llm.py):
+  - multipart STT: vecchio bytes += (riferimento locale) vs _multipart()
+  - transcodifica TTS: vecchi file temporanei (riferimento locale) vs _ffmpeg_opus()
+    alimentato a chunk come lo stream di Edge TTS
+  - cache: tts_ogg() su una frase già in cache (chiave, lock, LRU)
+
+Uso:  python3 benchmark_voice.py registrazione.ogg [--runs 20] [--json] [--dashboard path]
+"""
+
+import argparse
+import asyncio
+import contextlib
+import json
+import os
+import runpy
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime
+from pathlib import Path
+
+FFMPEG_OPUS = ["-c:a", "libopus", "-b:a", "48k", "-application", "voip"]
+BOUNDARY = "----VesselSTTBoundary"
+FIELDS = {"model": "whisper-large-v3-turbo", "language": "it", "response_format": "json", "temperature": "0"}
+EDGE_CHUNK = 4096          # byte per chunk MP3, circa quelli che manda Edge TTS
+CACHE_TEXT = "Buongiorno! Ecco il briefing di oggi."
+DASHBOARD_CANDIDATES = [
+    Path(__file__).resolve().parent / "nanobot_dashboard_v2.py",
+    Path.home() / "nanobot_dashboard.py",
+]
+
+
+def load_dashboard(path: str) -> dict:
+    """Esegue la dashboard senza avviare uvicorn (run_name diverso da __main__)."""
+    candidates = [Path(path)] if path else DASHBOARD_CANDIDATES
+    for p in candidates:
+        if p.exists():
+            return runpy.run_path(str(p), run_name="vessel_bench")
+    sys.exit(f"Dashboard non trovata: {', '.join(str(p) for p in candidates)}")
+
+
+# ─── Multipart ────────────────────────────────────────────────────────
+def multipart_concat(audio: bytes) -> bytes:
+    """Vecchio transcribe_voice: body costruito con bytes += (una copia per pezzo)."""
+    body = b""
+    body += f"--{BOUNDARY}\r\n".encode()
+    body += b'Content-Disposition: form-data; name="file"; filename="voice.ogg"\r\n'
+    body += b"Content-Type: audio/ogg\r\n\r\n"
+    body += audio
+    body += b"\r\n"
+    for name, value in FIELDS.items():
+        body += f"--{BOUNDARY}\r\n".encode()
+        body += f'Content-Disposition: form-data; name="{name}"\r\n\r\n'.encode()
+        body += f"{value}\r\n".encode()
+    body += f"--{BOUNDARY}--\r\n".encode()
+    return body
+
+
+def measure(fn, runs: int) -> dict:
+    times = []
+    for _ in range(runs):
+        t0 = time.perf_counter()
+        fn()
+        times.append((time.perf_counter() - t0) * 1000)
+    tracemalloc.start()
+    fn()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return {"avg_ms": round(statistics.mean(times), 3), "min_ms": round(min(times), 3),
+            "peak_kb": round(peak / 1024, 1)}
+
+
+async def measure_async(fn, runs: int) -> dict:
+    """Come measure(), per le coroutine della dashboard: tutto nello stesso event loop."""
+    times = []
+    for _ in range(runs):
+        t0 = time.perf_counter()
+        await fn()
+        times.append((time.perf_counter() - t0) * 1000)
+    tracemalloc.start()
+    await fn()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return {"avg_ms": round(statistics.mean(times), 3), "min_ms": round(min(times), 3),
+            "peak_kb": round(peak / 1024, 1)}
+
+
+# ─── Transcodifica ────────────────────────────────────────────────────
+def transcode_files(audio: bytes) -> bytes:
+    """Vecchio text_to_voice: input su file temporaneo, ffmpeg file→file, rilettura."""
+    with tempfile.NamedTemporaryFile(suffix=".in", delete=False) as f:
+        f.write(audio)
+        in_path = f.name
+    out_path = in_path + ".ogg"
+    try:
+        subprocess.run(["ffmpeg", "-y", "-loglevel", "error", "-i", in_path] + FFMPEG_OPUS + [out_path],
+                       capture_output=True, timeout=60, check=True)
+        with open(out_path, "rb") as f:
+            return f.read()
+    finally:
+        for p in (in_path, out_path):
+            if os.path.exists(p):
+                os.unlink(p)
+
+
+def to_mp3(audio: bytes) -> bytes:
+    """Il campione in MP3, l'ingresso che _ffmpeg_opus riceve da Edge TTS (preparazione, non misurata)."""
+    r = subprocess.run(["ffmpeg", "-loglevel", "error", "-i", "pipe:0", "-f", "mp3", "pipe:1"],
+                       input=audio, capture_output=True, timeout=60, check=True)
+    return r.stdout
+
+
+async def mp3_chunks(mp3: bytes):
+    for i in range(0, len(mp3), EDGE_CHUNK):
+        yield mp3[i:i + EDGE_CHUNK]
+
+
+# ─── Main ─────────────────────────────────────────────────────────────
+def main():
+    ap = argparse.ArgumentParser(description="Benchmark pipeline vocale Vessel")
+    ap.add_argument("sample", help="file audio registrato (ogg/mp3)")
+    ap.add_argument("--runs", type=int, default=20)
+    ap.add_argument("--json", action="store_true", help="salva i risultati in benchmark_voice_<ts>.json")
+    ap.add_argument("--dashboard", default="", help="percorso di nanobot_dashboard_v2.py")
+    args = ap.parse_args()
+
+    with open(args.sample, "rb") as f:
+        audio = f.read()
+    with contextlib.redirect_stdout(sys.stderr):   # log di avvio della dashboard fuori dalla tabella
+        d = load_dashboard(args.dashboard)
+    print(f"Benchmark voce — {datetime.now().strftime('%Y-%m-%d %H:%M')}")
+    print(f"Campione: {args.sample} ({len(audio) / 1024:.1f} KB), {args.runs} run\n")
+
+    files = {"file": ("voice.ogg", "audio/ogg", audio)}
+    assert len(multipart_concat(audio)) == d["_multipart"](FIELDS, files, boundary=BOUNDARY)[1]
+    results = {"sample_bytes": len(audio), "runs": args.runs}
+    results["multipart_concat"] = measure(lambda: multipart_concat(audio), args.runs)
+    results["_multipart"] = measure(lambda: d["_multipart"](FIELDS, files, boundary=BOUNDARY), args.runs)
+
+    async def run_async():
+        if shutil.which("ffmpeg"):
+            mp3 = to_mp3(audio)
+            runs = max(3, args.runs // 4)
+            if not await d["_ffmpeg_opus"](mp3_chunks(mp3)):
+                sys.exit("_ffmpeg_opus non ha prodotto audio (libopus mancante?)")
+            results["transcode_files"] = measure(lambda: transcode_files(mp3), runs)
+            results["_ffmpeg_opus"] = await measure_async(lambda: d["_ffmpeg_opus"](mp3_chunks(mp3)), runs)
+        else:
+            print("ffmpeg non trovato: transcodifica saltata\n")
+        # Frase già in cache: tts_ogg non tocca né rete né ffmpeg
+        d["_tts_cache_put"](d["_tts_key"](CACHE_TEXT), audio)
+        results["tts_ogg_cache_hit"] = await measure_async(lambda: d["tts_ogg"](CACHE_TEXT), args.runs)
+
+    asyncio.run(run_async())
+
+    print(f"{'Fase':<20} {'Avg ms':>10} {'Min ms':>10} {'Picco KB':>10}")
+    print("-" * 52)
+    for name, r in results.items():
+        if isinstance(r, dict):
+            print(f"{name:<20} {r['avg_ms']:>10.3f} {r['min_ms']:>10.3f} {r['peak_kb']:>10.1f}")
+
+    if args.json:
+        fname = f"benchmark_voice_{datetime.now().strftime('%Y%m%d_%H%M')}.json"
+        with open(fname, "w") as f:
+            json.dump(results, f, indent=2)
+        print(f"\n  Risultati salvati in: {fname}")
+
+
+if __name__ == "__main__":
+    main()
@@ -3,8 +3,10 @@ import urllib.request
 import xml.etree.ElementTree as ET
 import json
 import os
+import socket
 import sqlite3
 import subprocess
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from pathlib import Path
 
@@ -12,10 +14,22 @@ HNRSS_URL = "https://hnrss.org/frontpage"
 WEATHER_URL = "https://api.open-meteo.com/v1/forecast?latitude=45.4654&longitude=9.1859&current=temperature_2m,weathercode&timezone=Europe/Rome"
 DISCORD_WEBHOOK = "https://discord.com/api/webhooks/1474119098509295716/7GgZomfhrub5615WUjYf1IS2q7TsLfbGGK0qJip0fE6HVzy8Bm0bw8RS9OeHoLN8GTOI"
 
+def _fetch_url(url: str, timeout: int = 10) -> bytes | None:
+    """Fetch semplice. Quando gira come job di Vessel viene sostituita da http_fetch
+    (GET condizionali, cache su disco, limite per host)."""
+    try:
+        with urllib.request.urlopen(url, timeout=timeout) as r:
+            return r.read()
+    except Exception as e:
+        print(f"Fetch error {url[:60]}: {e}")
+        return None
+
 def fetch_hn_stories():
+    data = _fetch_url(HNRSS_URL)
+    if not data:
+        return []
     try:
-        with urllib.request.urlopen(HNRSS_URL, timeout=10) as r:
-            root = ET.fromstring(r.read())
+        root = ET.fromstring(data)
         stories = []
         for item in root.findall('.//item')[:5]:
             t = item.find('title')
@@ -28,9 +42,11 @@ def fetch_hn_stories():
         return []
 
 def fetch_weather():
+    data = _fetch_url(WEATHER_URL)
+    if not data:
+        return "Meteo non disponibile"
     try:
-        with urllib.request.urlopen(WEATHER_URL, timeout=10) as r:
-            data = json.loads(r.read())
+        data = json.loads(data)
         temp = data['current']['temperature_2m']
         code = data['current']['weathercode']
         codes = {0:'☀️ Sereno',1:'🌤 Poco nuvoloso',2:'⛅ Nuvoloso',3:'☁️ Coperto',
@@ -76,9 +92,40 @@ BRIEFING_LOG = Path.home() / ".nanobot" / "briefing_log.jsonl"
 DB_PATH = Path.home() / ".nanobot" / "vessel.db"
 GOOGLE_HELPER = Path.home() / "scripts" / "google_helper.py"
 GOOGLE_PYTHON = Path.home() / ".local" / "share" / "google-workspace-mcp" / "bin" / "python"
+GOOGLE_SOCKET = Path(os.environ.get("GOOGLE_HELPER_SOCKET", str(Path.home() / ".nanobot" / "google_helper.sock")))
+BUS_SOCKET = os.environ.get("VESSEL_BUS_SOCKET", str(Path.home() / ".nanobot" / "vessel_bus.sock"))
+
+def _google_rpc(args: list) -> str | None:
+    """Prova il worker google_helper (Unix socket, credenziali già calde).
+    None se il worker non è attivo: il chiamante ripiega sul subprocess."""
+    try:
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as s:
+            s.settimeout(15)
+            s.connect(str(GOOGLE_SOCKET))
+            s.sendall((json.dumps({"jsonrpc": "2.0", "id": 1, "method": "call",
+                                   "params": {"argv": args}}) + "\n").encode("utf-8"))
+            buf = b""
+            while not buf.endswith(b"\n"):
+                chunk = s.recv(65536)
+                if not chunk:
+                    break
+                buf += chunk
+        resp = json.loads(buf)
+    except (OSError, ValueError):
+        return None
+    if "error" in resp:
+        return None
+    return resp.get("result", {}).get("output", "").strip() or None
+
 
 def fetch_calendar_events(period="today"):
-    """Chiama google_helper.py via subprocess per ottenere eventi calendario."""
+    """Eventi calendario da google_helper (worker via socket, fallback subprocess)."""
+    out = _google_rpc(["calendar", period, "--json"])
+    if out is not None:
+        try:
+            return json.loads(out).get("events", [])
+        except ValueError:
+            pass
     try:
         result = subprocess.run(
             [str(GOOGLE_PYTHON), str(GOOGLE_HELPER), "calendar", period, "--json"],
@@ -113,26 +160,40 @@ def save_to_db(briefing_text, weather, stories, events_today=None, events_tomorr
              briefing_text)
         )
 
-def set_tamagotchi_state(state: str):
-    """Imposta lo stato del tamagotchi ESP32 via REST locale."""
+def _bus_send(msg: dict) -> dict:
+    """Una riga JSON sul bus eventi di Vessel (Unix socket), ritorna la risposta."""
     try:
-        url = "http://127.0.0.1:8090/api/tamagotchi/state"
-        data = json.dumps({"state": state}).encode("utf-8")
-        req = urllib.request.Request(url, data=data,
-                                     headers={"Content-Type": "application/json"},
-                                     method="POST")
-        urllib.request.urlopen(req, timeout=5)
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as s:
+            s.settimeout(3)
+            s.connect(BUS_SOCKET)
+            s.sendall((json.dumps(msg) + "\n").encode("utf-8"))
+            buf = b""
+            while not buf.endswith(b"\n"):
+                chunk = s.recv(4096)
+                if not chunk:
+                    break
+                buf += chunk
+        return json.loads(buf)
+    except (OSError, ValueError) as e:
+        print(f"[Briefing] Bus error: {e}")
+        return {}
+
+def set_tamagotchi_state(state: str):
+    """Imposta lo stato del tamagotchi ESP32 via bus eventi locale."""
+    if _bus_send({"topic": "sigil.state", "data": {"state": state}}).get("ok"):
         print(f"[Briefing] Tamagotchi → {state}")
-    except Exception as e:
-        print(f"[Briefing] Tamagotchi error: {e}")
 
 
 def main():
     print("⏳ Generating morning briefing...")
-    stories = fetch_hn_stories()
-    weather = fetch_weather()
-    events_today = fetch_calendar_events("today")
-    events_tomorrow = fetch_calendar_events("tomorrow")
+    # Fonti indipendenti: in parallelo, il totale è quello della più lenta
+    with ThreadPoolExecutor(max_workers=4) as pool:
+        f_stories = pool.submit(fetch_hn_stories)
+        f_weather = pool.submit(fetch_weather)
+        f_today = pool.submit(fetch_calendar_events, "today")
+        f_tomorrow = pool.submit(fetch_calendar_events, "tomorrow")
+        stories, weather = f_stories.result(), f_weather.result()
+        events_today, events_tomorrow = f_today.result(), f_tomorrow.result()
     now = datetime.now()
     lines = [
         f"🌅 **MORNING BRIEFING** - {now.strftime('%A %d %B %Y, %H:%M')}",
@@ -1,10 +1,124 @@
 import re
 import json
+import argparse
+import zipfile
+import py_compile
+import gzip
+import base64
+import hashlib
 import shutil
 import subprocess
 from pathlib import Path
 
-def build():
+try:
+    import brotli  # opzionale: se presente genera anche le varianti .br
+except ImportError:
+    brotli = None
+
+# Widget caricati on-demand (chunk separati dal bundle principale)
+LAZY_CHUNKS = ("sigil", "analytics", "tracker")
+
+# Loader inserito in testa al bundle: per ogni funzione pubblica di un chunk
+# build() genera uno stub che carica lo script e poi richiama quella vera
+# (le function declaration del chunk sovrascrivono gli stub globali).
+LAZY_LOADER_JS = """
+// --- lazy chunks (generato da build.py) ---
+const _CHUNKS = {CHUNKS};
+const _chunkLoads = {};
+function loadChunk(name) {
+  if (!_chunkLoads[name]) {
+    _chunkLoads[name] = new Promise((resolve, reject) => {
+      const s = document.createElement('script');
+      s.src = _CHUNKS[name];
+      s.onload = resolve;
+      s.onerror = () => { delete _chunkLoads[name]; reject(new Error('chunk ' + name)); };
+      document.head.appendChild(s);
+    });
+  }
+  return _chunkLoads[name];
+}
+function _lazyCall(chunk, fn, args) {
+  return loadChunk(chunk).then(() => {
+    if (window[fn] && !window[fn]._lazy) return window[fn](...args);
+    console.error('[chunk] ' + chunk + ': ' + fn + ' non definita');
+  });
+}
+"""
+
+
+def _minify_css(css: str) -> str:
+    """Minificazione conservativa: via commenti, indentazione e righe vuote."""
+    css = re.sub(r'/\*.*?\*/', '', css, flags=re.S)
+    return "\n".join(line.strip() for line in css.splitlines() if line.strip())
+
+
+def _minify_js(js: str) -> str:
+    """Minificazione conservativa: via indentazione, righe vuote e commenti
+    a riga intera. I newline restano (ASI) e le righe dentro template literal
+    multilinea sono copiate intatte."""
+    out = []
+    in_template = False
+    for line in js.splitlines():
+        s = line.strip()
+        if in_template:
+            out.append(line)
+        elif not s or s.startswith("//"):
+            continue
+        else:
+            out.append(s)
+        if line.replace("\\`", "").count("`") % 2:
+            in_template = not in_template
+    return "\n".join(out) + "\n"
+
+
+def _chunk_exports(js: str) -> list[str]:
+    """Funzioni top-level di un widget (quelle al livello di indentazione minimo)."""
+    found = re.findall(r'^([ \t]*)function\s+(\w+)\s*\(', js, flags=re.M)
+    if not found:
+        return []
+    base = min(len(indent) for indent, _ in found)
+    return [name for indent, name in found if len(indent) == base]
+
+
+def _make_asset(stem: str, ext: str, content: str) -> tuple[str, dict]:
+    """Bundle con nome content-hashed + varianti precompresse (base64)."""
+    raw = content.encode("utf-8")
+    digest = hashlib.sha256(raw).hexdigest()
+    asset = {
+        "type": "text/css" if ext == "css" else "application/javascript",
+        "etag": f'"{digest[:16]}"',
+        "raw": content,
+        "gz": base64.b64encode(gzip.compress(raw, 9, mtime=0)).decode(),
+    }
+    if brotli is not None:
+        asset["br"] = base64.b64encode(brotli.compress(raw, quality=11)).decode()
+    return f"{stem}.{digest[:10]}.{ext}", asset
+
+
+def _build_dist(out_file: Path, dist_dir: Path, mode: str):
+    """Bytecode precompilato del file generato. Uno script lanciato come
+    __main__ viene ricompilato a ogni avvio (~450 KB di sorgente sul Pi):
+    con .pyc / .pyz l'avvio salta parsing e compilazione.
+    Il bytecode è legato alla versione di Python: eseguire la build con lo
+    stesso interprete del Pi (python3.13)."""
+    dist_dir.mkdir(exist_ok=True)
+    pyc = dist_dir / "vessel.pyc"
+    py_compile.compile(str(out_file), cfile=str(pyc), dfile="vessel.py", doraise=True,
+                       invalidation_mode=py_compile.PycInvalidationMode.UNCHECKED_HASH)
+    target = pyc
+    if mode == "zipapp":
+        target = dist_dir / "vessel.pyz"
+        with open(target, "wb") as f:
+            f.write(b"#!/usr/bin/env python3\n")
+            with zipfile.ZipFile(f, "w", zipfile.ZIP_DEFLATED) as z:
+                z.write(pyc, "__main__.pyc")
+        target.chmod(0o755)
+        pyc.unlink()
+    print(f" Bytecode: {target.relative_to(out_file.parent)} ({target.stat().st_size // 1024} KB)")
+    print(f"   Deploy: scp {target.relative_to(out_file.parent)} pi:~/ && python3.13 ~/{target.name}")
+
+
+def build(dist: str = ""):
     root = Path(__file__).parent
     src = root / "src"
     
@@ -18,27 +132,56 @@ def build():
     login_path = src / "frontend" / "login.html"
     login_html = login_path.read_text("utf-8") if login_path.exists() else ""
     
-    css_content = ""
+    css_bundle = ""
     for css_file in sorted((src / "frontend" / "css").glob("*.css")):
-        css_content += f"\n/* --- {css_file.name} --- */\n"
-        css_content += css_file.read_text("utf-8")
-        
-    js_content = ""
+        css_bundle += css_file.read_text("utf-8") + "\n"
+
+    # Widget pesanti e usati di rado → chunk separati, caricati al primo uso
+    chunks = {}
+    js_bundle = ""
     for js_file in sorted((src / "frontend" / "js" / "core").glob("*.js")) + sorted((src / "frontend" / "js" / "widgets").glob("*.js")):
-        js_content += f"\n// --- {js_file.name} --- \n"
-        js_content += js_file.read_text("utf-8")
-        
-    html_template = re.sub(r'<!--\s*\{INJECT_CSS\}\s*-->', lambda _: css_content, html_template)
-    html_template = re.sub(r'<!--\s*\{INJECT_JS\}\s*-->', lambda _: js_content, html_template)
+        if js_file.stem in LAZY_CHUNKS:
+            chunks[js_file.stem] = js_file.read_text("utf-8")
+        else:
+            js_bundle += f"\n// --- {js_file.name} --- \n"
+            js_bundle += js_file.read_text("utf-8")
+
+    assets = {}
+    chunk_urls = {}
+    stubs = ""
+    lazy_fns = []
+    for name, code in chunks.items():
+        asset_name, asset = _make_asset(name, "js", _minify_js(code))
+        assets[asset_name] = asset
+        chunk_urls[name] = f"/static/{asset_name}"
+        for fn in _chunk_exports(code):
+            stubs += f"function {fn}(...a) {{ return _lazyCall('{name}', '{fn}', a); }}\n"
+            lazy_fns.append(fn)
+    stubs += f"{json.dumps(lazy_fns)}.forEach(fn => {{ window[fn]._lazy = true; }});\n"
+    loader = LAZY_LOADER_JS.replace("{CHUNKS}", json.dumps(chunk_urls)) + stubs
+    css_name, assets_css = _make_asset("app", "css", _minify_css(css_bundle))
+    js_name, assets_js = _make_asset("app", "js", _minify_js(loader + js_bundle))
+    assets[css_name] = assets_css
+    assets[js_name] = assets_js
+
+    html_template = re.sub(r'<!--\s*\{INJECT_CSS\}\s*-->', lambda _: f'<link rel="stylesheet" href="/static/{css_name}">', html_template)
+    html_template = re.sub(r'<!--\s*\{INJECT_JS\}\s*-->', lambda _: f'<script src="/static/{js_name}"></script>', html_template)
+
+    for asset_name, asset in assets.items():
+        variants = "gzip" + (" + br" if "br" in asset else "")
+        print(f"   /static/{asset_name}: {len(asset['raw'].encode())} B → {len(base64.b64decode(asset['gz']))} B gzip ({variants})")
 
     frontend_py = '# ─── FRONTEND (Auto-Generato) ───────────────────────────────────────────────\n'
     frontend_py += f'HTML = {json.dumps(html_template, ensure_ascii=False)}\n'
-    frontend_py += f'LOGIN_HTML = {json.dumps(login_html, ensure_ascii=False)}\n\n'
-    frontend_py += '# Inject variables that were previously in the HTML f-string\n'
-    frontend_py += 'HTML = HTML.replace("{VESSEL_ICON}", VESSEL_ICON) if "VESSEL_ICON" in globals() else HTML.replace("{VESSEL_ICON}", "")\n'
-    frontend_py += 'HTML = HTML.replace("{VESSEL_ICON_192}", VESSEL_ICON_192) if "VESSEL_ICON_192" in globals() else HTML.replace("{VESSEL_ICON_192}", "")\n'
-    frontend_py += 'LOGIN_HTML = LOGIN_HTML.replace("{VESSEL_ICON}", VESSEL_ICON) if "VESSEL_ICON" in globals() else LOGIN_HTML.replace("{VESSEL_ICON}", "")\n'
-    frontend_py += 'LOGIN_HTML = LOGIN_HTML.replace("{VESSEL_ICON_192}", VESSEL_ICON_192) if "VESSEL_ICON_192" in globals() else LOGIN_HTML.replace("{VESSEL_ICON_192}", "")\n'
+    frontend_py += f'LOGIN_HTML = {json.dumps(login_html, ensure_ascii=False)}\n'
+    frontend_py += f'STATIC_BUNDLES = {json.dumps(assets, ensure_ascii=False, indent=0)}\n\n'
+    # Inject variables that were previously in the HTML f-string
+    # (solo se il placeholder c'è davvero: niente replace a vuoto a ogni avvio)
+    for var, text in (("HTML", html_template), ("LOGIN_HTML", login_html)):
+        for icon in ("VESSEL_ICON", "VESSEL_ICON_192"):
+            if "{" + icon + "}" in text:
+                frontend_py += f'{var} = {var}.replace("{{{icon}}}", {icon}) if "{icon}" in globals() else {var}.replace("{{{icon}}}", "")\n'
+    frontend_py += '_boot_mark("frontend")\n'
 
     # 2. BACKEND
     print(" Compilando il backend Python...")
@@ -49,14 +192,24 @@ def build():
         "database.py",
         "providers.py",
         "services/helpers.py",
+        "services/metrics.py",
+        "services/cache.py",
+        "services/bus.py",
+        "services/assets.py",
         "services/system.py",
+        "services/fetch.py",
         "services/crypto.py",
         "services/tokens.py",
         "services/knowledge.py",
+        "services/google.py",
         "services/telegram.py",
+        "services/conversations.py",
         "services/chat.py",
+        "services/bench.py",
         "services/bridge.py",
         "services/monitor.py",
+        "services/debug.py",
+        "services/scheduler.py",
         "services/cleanup.py",
         "routes/tamagotchi.py",
         "routes/telegram.py",
@@ -82,6 +235,9 @@ def build():
     
     print(f" Build completata! File generato: {out_file.name} ({len(backend_content)} bytes)")
 
+    if dist:
+        _build_dist(out_file, root / "dist", dist)
+
     # 3. FIRMWARE ESP32 (opzionale — richiede PlatformIO nel PATH)
     pio_dir = root / "vessel_tamagotchi"
     if (pio_dir / "platformio.ini").exists():
@@ -99,9 +255,14 @@ def build():
                     fw_dir = root / "firmware"
                     fw_dir.mkdir(exist_ok=True)
                     shutil.copy(bin_path, fw_dir / "tamagotchi.bin")
-                    size_kb = (fw_dir / "tamagotchi.bin").stat().st_size // 1024
-                    print(f" Firmware copiato: firmware/tamagotchi.bin ({size_kb} KB)")
-                    print("   Deploy: scp firmware/tamagotchi.bin pi:~/.nanobot/firmware/")
+                    data = (fw_dir / "tamagotchi.bin").read_bytes()
+                    # Manifest OTA: il device salta il download se ha già questa versione
+                    m = re.search(r'FW_VERSION\s*=\s*"([^"]+)"', (pio_dir / "src" / "main.cpp").read_text(encoding="utf-8"))
+                    manifest = {"version": m.group(1) if m else hashlib.sha256(data).hexdigest()[:12],
+                                "size": len(data), "sha256": hashlib.sha256(data).hexdigest()}
+                    (fw_dir / "tamagotchi.json").write_text(json.dumps(manifest, indent=2), encoding="utf-8")
+                    print(f" Firmware copiato: firmware/tamagotchi.bin ({len(data) // 1024} KB, v{manifest['version']})")
+                    print("   Deploy: scp firmware/tamagotchi.bin firmware/tamagotchi.json pi:~/.nanobot/firmware/")
                 else:
                     print(" [!].bin non trovato dopo compilazione (board diversa?)")
                 break
@@ -110,4 +271,9 @@ def build():
             print(" [!]PlatformIO non trovato nel PATH - skip firmware. Installa con: pip install platformio")
 
 if __name__ == "__main__":
-    build()
+    parser = argparse.ArgumentParser(description="Build di Vessel Dashboard")
+    parser.add_argument("--dist", choices=["pyc", "zipapp"], default="",
+                        help="genera anche dist/vessel.pyc o dist/vessel.pyz precompilati")
+    parser.add_argument("--firmware", action="store_true",
+                        help="compatibilità: il firmware è compilato comunque se esiste vessel_tamagotchi/platformio.ini")
+    build(parser.parse_args().dist)
@@ -6,6 +6,7 @@ Schedule: 0 20 * * *  python3.13 ~/check_in.py
 """
 import json
 import os
+import socket
 import sqlite3
 import subprocess
 import urllib.request
@@ -16,6 +17,7 @@ from pathlib import Path
 NANOBOT_DIR = Path.home() / ".nanobot"
 DB_PATH = NANOBOT_DIR / "vessel.db"
 IDLE_HOURS = 4  # ore di silenzio prima del check-in
+BUS_SOCKET = os.environ.get("VESSEL_BUS_SOCKET", str(Path.home() / ".nanobot" / "vessel_bus.sock"))
 
 
 # ─── Telegram ────────────────────────────────────────────────────────────────
@@ -49,21 +51,27 @@ def telegram_send(text: str) -> bool:
 
 
 # ─── Sigil ────────────────────────────────────────────────────────────────────
-def _notify_sigil(state: str, detail: str = "", text: str = ""):
+def _bus_send(msg: dict) -> dict:
+    """Una riga JSON sul bus eventi di Vessel (Unix socket), ritorna la risposta."""
     try:
-        payload: dict = {"state": state}
-        if detail:
-            payload["detail"] = detail
-        if text:
-            payload["text"] = text
-        data = json.dumps(payload).encode("utf-8")
-        req = urllib.request.Request(
-            "http://127.0.0.1:8090/api/tamagotchi/state",
-            data=data, headers={"Content-Type": "application/json"}, method="POST"
-        )
-        urllib.request.urlopen(req, timeout=3)
-    except Exception:
-        pass
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as s:
+            s.settimeout(3)
+            s.connect(BUS_SOCKET)
+            s.sendall((json.dumps(msg) + "\n").encode("utf-8"))
+            buf = b""
+            while not buf.endswith(b"\n"):
+                chunk = s.recv(4096)
+                if not chunk:
+                    break
+                buf += chunk
+        return json.loads(buf)
+    except (OSError, ValueError) as e:
+        print(f"[CheckIn] Bus error: {e}")
+        return {}
+
+
+def _notify_sigil(state: str, detail: str = "", text: str = ""):
+    _bus_send({"topic": "sigil.state", "data": {"state": state, "detail": detail, "text": text}})
 
 
 # ─── Idle check ──────────────────────────────────────────────────────────────
@@ -0,0 +1,200 @@
+#!/usr/bin/env python3
+"""Daily Summary — passo "map" dei riassunti.
+Riassume ogni giornata appena chiusa e salva un checkpoint in
+summary_checkpoints (kind='day'). weekly_summary.py e l'archivio di
+self_evolve.py riducono sui checkpoint: sette chiamate piccole sparse nella
+notte + una riduzione breve, invece di un prompt unico che su gemma3:4b
+(~4 tok/s) va in timeout e perde tutto.
+Ogni giornata è salvata appena pronta: un run interrotto riparte dalla successiva.
+Schedule: 20 0-6 * * *  python3.13 ~/daily_summary.py
+(più passaggi notturni; il run salta se l'utente sta chattando)
+"""
+import http.client
+import json
+import sqlite3
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+DB_PATH = Path.home() / ".nanobot" / "vessel.db"
+OLLAMA_HOST = "127.0.0.1"
+OLLAMA_PORT = 11434
+OLLAMA_MODEL = "gemma3:4b"
+OLLAMA_TIMEOUT = 120     # una giornata: prompt corto, max ~200 token in uscita
+LOOKBACK_DAYS = 14       # giornate chiuse da coprire all'indietro
+MAX_DAYS_PER_RUN = 4     # il resto al passaggio successivo
+TIME_BUDGET = 600        # s per run
+IDLE_MINUTES = 15        # chat più recente di così = utente attivo, Ollama gli serve
+MAX_ATTEMPTS = 3         # tentativi per giornata finita in fallback statistico
+
+
+def _db_conn():
+    conn = sqlite3.connect(str(DB_PATH), timeout=5)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.row_factory = sqlite3.Row
+    return conn
+
+
+def ensure_table():
+    """summary_checkpoints: un riassunto per periodo (kind='day'|'week'), riusabile dai reduce."""
+    with _db_conn() as conn:
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS summary_checkpoints (
+                kind         TEXT NOT NULL,
+                period_start TEXT NOT NULL,
+                period_end   TEXT NOT NULL,
+                ts           TEXT NOT NULL,
+                summary      TEXT NOT NULL DEFAULT '',
+                stats        TEXT NOT NULL DEFAULT '{}',
+                status       TEXT NOT NULL DEFAULT 'ok',
+                attempts     INTEGER NOT NULL DEFAULT 1,
+                PRIMARY KEY (kind, period_start)
+            )
+        """)
+
+
+def _call_ollama(prompt: str, num_predict: int = 200) -> str:
+    """Chiama Ollama locale (sync, no streaming) e ritorna il testo generato."""
+    payload = json.dumps({
+        "model": OLLAMA_MODEL,
+        "messages": [{"role": "user", "content": prompt}],
+        "stream": False,
+        "keep_alive": "60m",
+        "options": {"num_predict": num_predict},
+    })
+    conn = http.client.HTTPConnection(OLLAMA_HOST, OLLAMA_PORT, timeout=OLLAMA_TIMEOUT)
+    conn.request("POST", "/api/chat", body=payload,
+                 headers={"Content-Type": "application/json"})
+    resp = conn.getresponse()
+    body = resp.read().decode("utf-8", errors="replace")
+    conn.close()
+    if resp.status != 200:
+        raise RuntimeError(f"Ollama HTTP {resp.status}: {body[:200]}")
+    data = json.loads(body)
+    return data.get("message", {}).get("content", "").strip()
+
+
+# ─── Giornate da riassumere ──────────────────────────────────────────────────
+def user_is_active() -> bool:
+    with _db_conn() as conn:
+        last = conn.execute("SELECT MAX(ts) FROM chat_messages").fetchone()[0]
+    if not last:
+        return False
+    try:
+        return datetime.now() - datetime.fromisoformat(last[:19]) < timedelta(minutes=IDLE_MINUTES)
+    except ValueError:
+        return False
+
+
+def pending_days(today: datetime) -> list[str]:
+    """Giornate chiuse con attività e senza checkpoint buono, dalla più vecchia."""
+    since = (today - timedelta(days=LOOKBACK_DAYS)).strftime("%Y-%m-%d")
+    until = today.strftime("%Y-%m-%d")
+    with _db_conn() as conn:
+        active = {r[0] for r in conn.execute(
+            "SELECT DISTINCT substr(ts, 1, 10) FROM chat_messages WHERE ts >= ? AND ts < ? "
+            "UNION SELECT DISTINCT substr(ts, 1, 10) FROM usage WHERE ts >= ? AND ts < ?",
+            (since, until, since, until)).fetchall()}
+        done = {r[0] for r in conn.execute(
+            "SELECT period_start FROM summary_checkpoints WHERE kind = 'day' AND period_start >= ? "
+            "AND (status = 'ok' OR attempts >= ?)", (since, MAX_ATTEMPTS)).fetchall()}
+    return sorted(active - done)
+
+
+def gather_day(day: str) -> dict:
+    start, end = f"{day}T00:00:00", f"{day}T23:59:59"
+    with _db_conn() as conn:
+        by_provider = {r["provider"]: r["cnt"] for r in conn.execute(
+            "SELECT provider, COUNT(*) AS cnt FROM chat_messages WHERE ts >= ? AND ts <= ? GROUP BY provider",
+            (start, end)).fetchall()}
+        usage = conn.execute(
+            "SELECT COUNT(*) AS calls, COALESCE(SUM(input + output), 0) AS tok FROM usage WHERE ts >= ? AND ts <= ?",
+            (start, end)).fetchone()
+        new_entities = [r["name"] for r in conn.execute(
+            "SELECT name FROM entities WHERE first_seen >= ? AND first_seen <= ? ORDER BY frequency DESC LIMIT 8",
+            (start, end)).fetchall()]
+        user_msgs = [r["content"][:120] for r in conn.execute(
+            "SELECT content FROM chat_messages WHERE ts >= ? AND ts <= ? AND role = 'user' ORDER BY ts LIMIT 12",
+            (start, end)).fetchall()]
+    return {"chat_total": sum(by_provider.values()), "by_provider": by_provider,
+            "usage_calls": usage["calls"], "tokens": usage["tok"],
+            "new_entities": new_entities, "user_messages": user_msgs}
+
+
+def build_day_prompt(day: str, data: dict) -> str:
+    msgs = "\n".join(f"  - {m}" for m in data["user_messages"]) or "  (nessuna)"
+    ents = ", ".join(data["new_entities"]) or "nessuno"
+    return f"""Sei Vessel, assistente personale di Filippo su Raspberry Pi.
+Riassumi la giornata {day} in max 60 parole (italiano): di cosa si è parlato, cosa si è fatto.
+Non inventare dati.
+
+Messaggi: {data['chat_total']}, chiamate API: {data['usage_calls']}
+Nuovi argomenti: {ents}
+Domande dell'utente:
+{msgs}
+
+Riassunto giornata:"""
+
+
+def fallback_summary(day: str, data: dict) -> str:
+    """Riassunto statistico senza LLM (Ollama offline o timeout)."""
+    out = f"{day}: {data['chat_total']} messaggi, {data['usage_calls']} chiamate API."
+    if data["new_entities"]:
+        out += f" Argomenti: {', '.join(data['new_entities'][:5])}."
+    return out
+
+
+def save_checkpoint(kind: str, start: str, end: str, summary: str, stats: dict, status: str):
+    with _db_conn() as conn:
+        conn.execute(
+            "INSERT INTO summary_checkpoints (kind, period_start, period_end, ts, summary, stats, status) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?) "
+            "ON CONFLICT(kind, period_start) DO UPDATE SET period_end = excluded.period_end, ts = excluded.ts, "
+            "summary = excluded.summary, stats = excluded.stats, status = excluded.status, "
+            "attempts = summary_checkpoints.attempts + 1",
+            (kind, start, end, time.strftime("%Y-%m-%dT%H:%M:%S"), summary,
+             json.dumps(stats, ensure_ascii=False), status))
+
+
+def summarize_day(day: str) -> str:
+    """Riassume e salva una giornata. Ritorna lo status del checkpoint."""
+    data = gather_day(day)
+    stats = {k: data[k] for k in ("chat_total", "by_provider", "usage_calls", "tokens")}
+    t0 = time.time()
+    try:
+        summary, status = _call_ollama(build_day_prompt(day, data)), "ok"
+    except Exception as e:
+        print(f"[Daily Summary] {day}: Ollama non disponibile ({e}), fallback statistico")
+        summary, status = fallback_summary(day, data), "fallback"
+    save_checkpoint("day", day, day, summary, stats, status)
+    print(f"[Daily Summary] {day}: {status} in {time.time() - t0:.0f}s — {summary[:80]}")
+    return status
+
+
+def main():
+    now = datetime.now()
+    print(f"[Daily Summary] Avvio: {now.strftime('%Y-%m-%d %H:%M')}")
+    if not DB_PATH.exists():
+        print("[Daily Summary] DB non trovato, skip")
+        return
+    ensure_table()
+    if user_is_active():
+        print("[Daily Summary] Utente attivo, rimando al prossimo passaggio")
+        return
+    days = pending_days(now)
+    if not days:
+        print("[Daily Summary] Nessuna giornata da riassumere")
+        return
+    print(f"[Daily Summary] Da fare: {len(days)} giornate ({days[0]} → {days[-1]})")
+    t0 = time.time()
+    for i, day in enumerate(days[:MAX_DAYS_PER_RUN]):
+        if time.time() - t0 > TIME_BUDGET:
+            print(f"[Daily Summary] Budget di {TIME_BUDGET}s esaurito, {len(days) - i} al prossimo passaggio")
+            break
+        if summarize_day(day) == "fallback":
+            break  # Ollama giù: inutile insistere sulle altre, si riprova al prossimo passaggio
+    print("[Daily Summary] Completato")
+
+
+if __name__ == "__main__":
+    main()
@@ -5,6 +5,7 @@ Schedule: 0 22 * * *  python3.13 ~/scripts/goodnight.py
 """
 import json
 import os
+import socket
 import subprocess
 import urllib.request
 from datetime import datetime
@@ -14,6 +15,8 @@ from pathlib import Path
 NANOBOT_DIR = Path.home() / ".nanobot"
 GOOGLE_PYTHON = Path.home() / ".local" / "share" / "google-workspace-mcp" / "bin" / "python"
 GOOGLE_HELPER = Path.home() / "scripts" / "google_helper.py"
+GOOGLE_SOCKET = Path(os.environ.get("GOOGLE_HELPER_SOCKET", str(Path.home() / ".nanobot" / "google_helper.sock")))
+BUS_SOCKET = os.environ.get("VESSEL_BUS_SOCKET", str(Path.home() / ".nanobot" / "vessel_bus.sock"))
 
 
 # ─── Telegram ────────────────────────────────────────────────────────────────
@@ -47,7 +50,33 @@ def telegram_send(text: str) -> bool:
 
 
 # ─── Google Helper subprocess ────────────────────────────────────────────────
+def _google_rpc(args: list) -> str | None:
+    """Prova il worker google_helper (Unix socket, credenziali già calde).
+    None se il worker non è attivo: il chiamante ripiega sul subprocess."""
+    try:
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as s:
+            s.settimeout(15)
+            s.connect(str(GOOGLE_SOCKET))
+            s.sendall((json.dumps({"jsonrpc": "2.0", "id": 1, "method": "call",
+                                   "params": {"argv": args}}) + "\n").encode("utf-8"))
+            buf = b""
+            while not buf.endswith(b"\n"):
+                chunk = s.recv(65536)
+                if not chunk:
+                    break
+                buf += chunk
+        resp = json.loads(buf)
+    except (OSError, ValueError):
+        return None
+    if "error" in resp:
+        return None
+    return resp.get("result", {}).get("output", "").strip() or None
+
+
 def _call_google(args: list) -> str | None:
+    out = _google_rpc(args)
+    if out is not None:
+        return out
     if not GOOGLE_PYTHON.exists() or not GOOGLE_HELPER.exists():
         return None
     try:
@@ -110,33 +139,38 @@ def build_goodnight_message() -> str:
     return "Buonanotte Filippo!\n\n" + "\n\n".join(sections) + "\n\nBuon riposo!"
 
 
-def get_mood_counter() -> dict:
-    """Legge il contatore mood giornaliero dal backend (HAPPY/ALERT/ERROR)."""
+def _bus_send(msg: dict) -> dict:
+    """Una riga JSON sul bus eventi di Vessel (Unix socket), ritorna la risposta."""
     try:
-        req = urllib.request.Request("http://127.0.0.1:8090/api/tamagotchi/mood")
-        with urllib.request.urlopen(req, timeout=5) as resp:
-            return json.loads(resp.read())
-    except Exception as e:
-        print(f"[Goodnight] Mood fetch error: {e}")
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as s:
+            s.settimeout(3)
+            s.connect(BUS_SOCKET)
+            s.sendall((json.dumps(msg) + "\n").encode("utf-8"))
+            buf = b""
+            while not buf.endswith(b"\n"):
+                chunk = s.recv(4096)
+                if not chunk:
+                    break
+                buf += chunk
+        return json.loads(buf)
+    except (OSError, ValueError) as e:
+        print(f"[Goodnight] Bus error: {e}")
         return {}
 
+
+def get_mood_counter() -> dict:
+    """Legge il contatore mood giornaliero dal backend (HAPPY/ALERT/ERROR)."""
+    return _bus_send({"query": "sigil.mood"}).get("data") or {}
+
 def set_tamagotchi_state(state: str, mood: dict | None = None):
-    """Imposta lo stato del tamagotchi ESP32 via REST locale.
+    """Imposta lo stato del tamagotchi ESP32 via bus eventi locale.
     Se mood è fornito, viene incluso nel payload (es. {"happy":5,"alert":2,"error":1}).
     """
-    try:
-        url  = "http://127.0.0.1:8090/api/tamagotchi/state"
-        body: dict = {"state": state}
-        if mood:
-            body["mood"] = mood
-        data = json.dumps(body).encode("utf-8")
-        req  = urllib.request.Request(url, data=data,
-                                      headers={"Content-Type": "application/json"},
-                                      method="POST")
-        urllib.request.urlopen(req, timeout=5)
+    data: dict = {"state": state}
+    if mood:
+        data["mood"] = mood
+    if _bus_send({"topic": "sigil.state", "data": data}).get("ok"):
         print(f"[Goodnight] Tamagotchi → {state}" + (f" mood={mood}" if mood else ""))
-    except Exception as e:
-        print(f"[Goodnight] Tamagotchi error: {e}")
 
 
 def main():
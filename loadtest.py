@@ -0,0 +1,254 @@
+#!/usr/bin/env python3
+"""
+Test di carico della dashboard contro mock_llm.py
+Apre N WebSocket dashboard che chattano, M chiamanti "tipo Telegram" (update
+iniettati nel mock, risposta letta da sendMessage/editMessageText) e K finti
+ESP32 su /ws/tamagotchi (hello v2, ack dei frame, comandi get_stats).
+Riporta p50/p99 per classe, la latenza di una richiesta banale durante il
+carico (GET /auth/check) e il lag dell'event loop misurato dal server
+(GET /api/debug/loop) con i punti che l'hanno bloccato.
+
+Prima:  python3 mock_llm.py --port 8099
+        VESSEL_MOCK_URL=http://127.0.0.1:8099 TELEGRAM_TOKEN=mock TELEGRAM_CHAT_ID=1 \\
+        python3 nanobot_dashboard_v2.py
+Uso:    python3 loadtest.py --pin 1234 [--dashboards 5] [--telegram 2] [--esp32 3]
+                            [--duration 60] [--provider local] [--think 2] [--json]
+Richiede il pacchetto websockets (incluso in uvicorn[standard]).
+"""
+
+import argparse
+import asyncio
+import json
+import sys
+import time
+import urllib.request
+
+try:
+    import websockets
+except ImportError:
+    sys.exit("Serve il pacchetto websockets (pip install websockets, incluso in uvicorn[standard])")
+
+# websockets >= 14: additional_headers; prima: extra_headers
+WS_HEADERS_KW = "additional_headers" if int(websockets.__version__.split(".")[0]) >= 14 else "extra_headers"
+RESULTS: dict[str, dict] = {}
+
+
+def record(kind: str, metric: str, value: float):
+    RESULTS.setdefault(kind, {}).setdefault(metric, []).append(value)
+
+
+def count(kind: str, what: str):
+    c = RESULTS.setdefault(kind, {}).setdefault("_counts", {})
+    c[what] = c.get(what, 0) + 1
+
+
+def pct(values: list, q: float) -> float:
+    values = sorted(values)
+    return round(values[min(len(values) - 1, int(q * len(values)))], 1) if values else 0.0
+
+
+def http_json(url: str, data: dict | None = None, cookie: str = "", timeout: float = 90):
+    """Sincrona (da usare con asyncio.to_thread). Ritorna (json, Set-Cookie)."""
+    req = urllib.request.Request(url, json.dumps(data).encode() if data is not None else None,
+                                 {"Content-Type": "application/json", **({"Cookie": cookie} if cookie else {})})
+    with urllib.request.urlopen(req, timeout=timeout) as r:
+        return json.loads(r.read() or b"{}"), r.headers.get("Set-Cookie", "")
+
+
+def login(base: str, pin: str) -> str:
+    _, set_cookie = http_json(f"{base}/auth/login", {"pin": pin})
+    for part in set_cookie.split(";"):
+        if part.strip().startswith("vessel_session="):
+            return part.strip()
+    sys.exit("Login fallito: nessun cookie vessel_session")
+
+
+# ─── Client ───────────────────────────────────────────────────────────
+async def dashboard_client(i: int, ws_base: str, cookie: str, args, deadline: float):
+    """Chatta in loop: TTFT al primo chat_chunk, totale a chat_done."""
+    try:
+        async with websockets.connect(f"{ws_base}/ws", max_size=None,
+                                      **{WS_HEADERS_KW: {"Cookie": cookie}}) as ws:
+            while json.loads(await ws.recv()).get("type") != "init":
+                pass
+            n = 0
+            while time.monotonic() < deadline:
+                n += 1
+                await ws.send(json.dumps({"action": "chat", "provider": args.provider,
+                                          "text": f"Messaggio di prova {n} LT-{i}-{n}"}))
+                t0, first, text = time.monotonic(), None, ""
+                while True:
+                    msg = json.loads(await asyncio.wait_for(ws.recv(), args.timeout))
+                    mtype = msg.get("type")
+                    if mtype == "chat_chunk":
+                        first = first or time.monotonic()
+                        text += msg.get("text", "")
+                    elif mtype == "chat_done":
+                        if text.startswith("(errore"):   # provider (e failover) falliti
+                            count("dashboard", "llm_error")
+                            break
+                        record("dashboard", "ttft_ms", (first - t0) * 1000 if first else 0)
+                        record("dashboard", "total_ms", (time.monotonic() - t0) * 1000)
+                        count("dashboard", "ok")
+                        break
+                    elif mtype == "chat_reply":   # rate limit (20 chat/min per IP) o errore
+                        count("dashboard", "rate_limited" if "Troppi" in msg.get("text", "") else "error")
+                        break
+                await asyncio.sleep(args.think)
+    except Exception as e:
+        count("dashboard", f"error:{type(e).__name__}")
+
+
+async def telegram_caller(i: int, args, deadline: float):
+    """Update iniettato nel mock → attesa della prima risposta del bot col tag."""
+    n = 0
+    while time.monotonic() < deadline:
+        n += 1
+        tag = f"LT-{1000 + i}-{n}"
+        try:
+            await asyncio.to_thread(http_json, f"{args.mock}/mock/telegram/send",
+                                    {"text": f"Domanda {n} {tag}", "chat_id": args.tg_chat})
+            res, _ = await asyncio.to_thread(
+                http_json, f"{args.mock}/mock/telegram/wait?tag={tag}&timeout={args.timeout}",
+                None, "", args.timeout + 5)
+            if "latency_ms" in res:
+                record("telegram", "reply_ms", res["latency_ms"])
+                count("telegram", "ok")
+            else:
+                count("telegram", res.get("error", "error"))
+        except Exception as e:
+            count("telegram", f"error:{type(e).__name__}")
+        await asyncio.sleep(args.think)
+
+
+async def esp32_client(i: int, ws_base: str, args, deadline: float):
+    """Finto Sigil: hello v2, ack di ogni frame, get_stats ogni --esp-interval secondi."""
+    pending: dict[int, float] = {}
+    try:
+        async with websockets.connect(f"{ws_base}/ws/tamagotchi") as ws:
+            await ws.send(json.dumps({"hello": {"proto": 2, "id": f"loadtest-{i}", "fw": "loadtest"}}))
+
+            async def reader():
+                async for raw in ws:
+                    if isinstance(raw, bytes):
+                        count("esp32", "binary_frames")
+                        continue
+                    msg = json.loads(raw)
+                    if "seq" in msg:
+                        count("esp32", "frames")
+                        await ws.send(json.dumps({"ack": msg["seq"]}))
+                    elif "req_id" in msg and msg["req_id"] in pending:
+                        record("esp32", "cmd_ms", (time.monotonic() - pending.pop(msg["req_id"])) * 1000)
+                        count("esp32", "ok" if msg.get("ok") else "error")
+
+            task = asyncio.create_task(reader())
+            req_id = i * 100000
+            while time.monotonic() < deadline and not task.done():
+                req_id += 1
+                pending[req_id] = time.monotonic()
+                await ws.send(json.dumps({"cmd": "get_stats", "req_id": req_id}))
+                await asyncio.sleep(args.esp_interval)
+            task.cancel()
+            if pending:
+                count("esp32", "unanswered")
+    except Exception as e:
+        count("esp32", f"error:{type(e).__name__}")
+
+
+async def lag_probe(base: str, cookie: str, deadline: float, kind: str):
+    """Una richiesta che non fa lavoro: quanto aspetta è coda dell'event loop."""
+    while time.monotonic() < deadline:
+        t0 = time.monotonic()
+        try:
+            await asyncio.to_thread(http_json, f"{base}/auth/check", None, cookie, 10)
+            record(kind, "probe_ms", (time.monotonic() - t0) * 1000)
+        except Exception:
+            count(kind, "error")
+        await asyncio.sleep(0.5)
+
+
+# ─── Main ─────────────────────────────────────────────────────────────
+async def run(args) -> dict:
+    base = args.url.rstrip("/")
+    ws_base = "ws" + base[4:]
+    cookie = await asyncio.to_thread(login, base, args.pin)
+    mock_before, _ = await asyncio.to_thread(http_json, f"{args.mock}/mock/stats")
+    loop_before, _ = await asyncio.to_thread(http_json, f"{base}/api/debug/loop", None, cookie)
+    # Baseline a riposo, poi tutto insieme
+    await lag_probe(base, cookie, time.monotonic() + 3, "idle")
+    deadline = time.monotonic() + args.duration
+    t0 = time.monotonic()
+    await asyncio.gather(
+        lag_probe(base, cookie, deadline, "loop"),
+        *(dashboard_client(i, ws_base, cookie, args, deadline) for i in range(args.dashboards)),
+        *(telegram_caller(i, args, deadline) for i in range(args.telegram)),
+        *(esp32_client(i, ws_base, args, deadline) for i in range(args.esp32)))
+    mock_after, _ = await asyncio.to_thread(http_json, f"{args.mock}/mock/stats")
+    loop_after, _ = await asyncio.to_thread(http_json, f"{base}/api/debug/loop?top=5", None, cookie)
+    report = {"duration_s": round(time.monotonic() - t0, 1),
+              "clients": {"dashboard": args.dashboards, "telegram": args.telegram, "esp32": args.esp32},
+              "mock": {k: mock_after[k] for k in ("requests", "errors", "drops", "stalls", "peak_active", "telegram")},
+              "mock_requests": sum(mock_after["requests"].values()) - sum(mock_before["requests"].values()),
+              "server_loop": {"lag_1m": loop_after["lag"], "stalls": loop_after["stalls"] - loop_before["stalls"],
+                              "offenders": [{k: o[k] for k in ("where", "count", "max_ms", "total_ms")}
+                                            for o in loop_after["offenders"]]}}
+    for kind, metrics in RESULTS.items():
+        report[kind] = {"counts": metrics.get("_counts", {})}
+        for metric, values in metrics.items():
+            if metric != "_counts":
+                report[kind][metric] = {"n": len(values), "p50": pct(values, 0.5), "p99": pct(values, 0.99),
+                                        "max": round(max(values), 1)}
+    idle, busy = report.get("idle", {}).get("probe_ms"), report.get("loop", {}).get("probe_ms")
+    if idle and busy:
+        report["loop_lag_ms"] = {"p50": round(busy["p50"] - idle["p50"], 1), "p99": round(busy["p99"] - idle["p50"], 1)}
+    return report
+
+
+def print_report(r: dict):
+    print(f"\n  Durata {r['duration_s']}s — client {r['clients']} — richieste al mock {r['mock_requests']}")
+    print(f"  {'classe':<10} {'metrica':<10} {'n':>6} {'p50':>9} {'p99':>9} {'max':>9}   esiti")
+    for kind in ("dashboard", "telegram", "esp32", "idle", "loop"):
+        if kind not in r:
+            continue
+        metrics = [(m, v) for m, v in r[kind].items() if m != "counts"] or [("-", None)]
+        for j, (m, v) in enumerate(metrics):
+            nums = f"{v['n']:>6} {v['p50']:>9} {v['p99']:>9} {v['max']:>9}" if v else " " * 36
+            print(f"  {kind if not j else '':<10} {m:<10} {nums}   {r[kind]['counts'] if not j else ''}")
+    if "loop_lag_ms" in r:
+        print(f"\n  Lag event loop stimato (probe sotto carico − a riposo): p50 {r['loop_lag_ms']['p50']}ms, "
+              f"p99 {r['loop_lag_ms']['p99']}ms")
+    sl = r["server_loop"]
+    print(f"  Lag misurato dal server (ultimo minuto): p50 {sl['lag_1m']['p50']}ms, p99 {sl['lag_1m']['p99']}ms, "
+          f"max {sl['lag_1m']['max_1m']}ms — stalli durante il test: {sl['stalls']}")
+    for o in sl["offenders"]:
+        print(f"    {o['count']:>4}× max {o['max_ms']:>5}ms  {o['where']}")
+    print(f"  Mock: errori {r['mock']['errors']}, troncati {r['mock']['drops']}, stalli {r['mock']['stalls']}, "
+          f"stream contemporanei max {r['mock']['peak_active']}")
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Test di carico dashboard + Telegram + ESP32 contro mock_llm.py")
+    ap.add_argument("--url", default="http://127.0.0.1:8090", help="dashboard")
+    ap.add_argument("--mock", default="http://127.0.0.1:8099", help="mock_llm.py")
+    ap.add_argument("--pin", required=True)
+    ap.add_argument("--dashboards", type=int, default=5)
+    ap.add_argument("--telegram", type=int, default=2)
+    ap.add_argument("--esp32", type=int, default=3)
+    ap.add_argument("--duration", type=float, default=60)
+    ap.add_argument("--provider", default="local", help="provider dashboard (local, cloud, pc, deepseek, brain)")
+    ap.add_argument("--think", type=float, default=2.0, help="pausa tra una richiesta e la successiva (s)")
+    ap.add_argument("--esp-interval", type=float, default=2.0)
+    ap.add_argument("--tg-chat", default="1", help="deve coincidere con TELEGRAM_CHAT_ID della dashboard")
+    ap.add_argument("--timeout", type=float, default=120)
+    ap.add_argument("--json", action="store_true")
+    args = ap.parse_args()
+    args.mock = args.mock.rstrip("/")
+    report = asyncio.run(run(args))
+    if args.json:
+        print(json.dumps(report, indent=2, ensure_ascii=False))
+    else:
+        print_report(report)
+
+
+if __name__ == "__main__":
+    main()
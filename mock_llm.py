@@ -0,0 +1,386 @@
+#!/usr/bin/env python3
+"""
+Mock provider LLM + Bot API Telegram per test di carico deterministici
+Parla i quattro formati che _provider_worker sa leggere:
+  POST /v1/messages                → Anthropic SSE   (anthropic)
+  POST /api/v1/chat/completions    → OpenAI SSE      (openrouter)
+  POST /api/chat                   → Ollama NDJSON   (ollama, ollama_pc)
+  POST /brain                      → bridge NDJSON   (brain)
+più GET /health e GET /api/tags per gli health check, e una Bot API minima
+(getUpdates long polling, sendMessage, editMessageText, ...) per i chiamanti
+"tipo Telegram" di loadtest.py.
+
+Latenza del primo token, tok/s, dimensione dei chunk, errori HTTP, connessioni
+troncate e stalli sono configurabili globalmente o per formato, da riga di
+comando o a runtime (POST /mock/config). Stesso seed → stessa sequenza di testi,
+errori e stalli a ogni run.
+
+Se nel prompt c'è un tag LT-<n>-<n> (loadtest.py), la risposta inizia con lo stesso
+tag: così il driver abbina le risposte Telegram al chiamante.
+
+Uso:  python3 mock_llm.py [--port 8099] [--ttft-ms 300] [--tps 20] [--tokens 60]
+                          [--set anthropic.error_rate=1] [--set ollama.stall_rate=0.1]
+Dashboard:  VESSEL_MOCK_URL=http://127.0.0.1:8099 TELEGRAM_TOKEN=mock TELEGRAM_CHAT_ID=1 \\
+            python3 nanobot_dashboard_v2.py
+"""
+
+import argparse
+import json
+import random
+import re
+import threading
+import time
+import urllib.parse
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+CONFIG = {
+    "ttft_ms": 300,        # attesa prima del primo token
+    "tps": 20.0,           # token generati al secondo
+    "tokens": 60,          # token per risposta
+    "chunk_tokens": 1,     # token per chunk/evento
+    "jitter": 0.1,         # ± frazione casuale su attese
+    "prompt_tps": 200.0,   # solo per le durate riportate da Ollama
+    "error_rate": 0.0,     # frazione di richieste rifiutate con error_status
+    "error_status": 500,
+    "drop_rate": 0.0,      # frazione di stream troncati a metà (connessione chiusa)
+    "stall_rate": 0.0,     # frazione di stream che si fermano a metà per stall_ms
+    "stall_ms": 5000,
+    "seed": 42,
+    "per": {},             # override per formato: {"anthropic": {"error_rate": 1}, ...}
+}
+FORMATS = {"/v1/messages": "anthropic", "/api/v1/chat/completions": "openai",
+           "/api/chat": "ollama", "/brain": "brain"}
+WORDS = ("il sistema risponde con calma mentre la memoria scorre tra note appunti e idee del giorno "
+         "vessel controlla temperatura carico rete e poi torna a pensare alla prossima domanda").split()
+TAG_RE = re.compile(r"\bLT-\d+-\d+\b")
+TG_POLL_MAX = 30
+
+_lock = threading.Lock()
+_counters: dict[str, int] = {}
+STATS = {"requests": {}, "errors": 0, "drops": 0, "stalls": 0, "active": 0, "peak_active": 0}
+
+_tg_cond = threading.Condition()
+_tg_updates: list[dict] = []
+_tg_next_id = 1
+_tg_message_id = 0
+_tg_tags: dict[str, dict] = {}   # tag → {"t0", "first"} (monotonic)
+TG_STATS = {"received": 0, "sent": 0, "edits": 0}
+
+
+def cfg(fmt: str) -> dict:
+    with _lock:
+        return {**CONFIG, **CONFIG["per"].get(fmt, {})}
+
+
+def set_option(spec: str):
+    """"chiave=valore" o "formato.chiave=valore"; il tipo segue il default."""
+    key, _, raw = spec.partition("=")
+    fmt, _, key = key.rpartition(".")
+    if key not in CONFIG or key == "per":
+        raise ValueError(f"opzione sconosciuta: {key}")
+    value = type(CONFIG[key])(raw)
+    with _lock:
+        if fmt:
+            CONFIG["per"].setdefault(fmt, {})[key] = value
+        else:
+            CONFIG[key] = value
+
+
+def request_rng(fmt: str) -> random.Random:
+    """Un RNG per richiesta: n-esima richiesta del formato → sempre la stessa sorte."""
+    with _lock:
+        n = _counters[fmt] = _counters.get(fmt, 0) + 1
+        STATS["requests"][fmt] = n
+    return random.Random(f"{CONFIG['seed']}:{fmt}:{n}")
+
+
+def _jit(c: dict, rng: random.Random, secs: float) -> float:
+    return max(0.0, secs * (1 + rng.uniform(-c["jitter"], c["jitter"])))
+
+
+def reply_tokens(prompt: str, c: dict, rng: random.Random) -> list[str]:
+    words = [rng.choice(WORDS) for _ in range(max(1, c["tokens"]))]
+    tag = TAG_RE.search(prompt)
+    if tag:
+        words[0] = tag.group(0)
+    return [w + " " for w in words]
+
+
+def last_user_text(fmt: str, body: dict) -> str:
+    if fmt == "brain":
+        return str(body.get("prompt", ""))
+    for m in reversed(body.get("messages", [])):
+        if m.get("role") == "user":
+            return str(m.get("content", ""))
+    return ""
+
+
+# ─── Formati di stream ────────────────────────────────────────────────
+def events(fmt: str, model: str, in_tok: int, out_tok: int, c: dict):
+    """(testa, funzione testo → evento, coda) nel formato richiesto."""
+    if fmt == "anthropic":
+        def sse(etype, data):
+            return f"event: {etype}\ndata: {json.dumps({'type': etype, **data})}\n\n"
+        head = sse("message_start", {"message": {"id": "msg_mock", "model": model, "usage": {"input_tokens": in_tok}}})
+        body = lambda t: sse("content_block_delta", {"index": 0, "delta": {"type": "text_delta", "text": t}})
+        tail = sse("message_delta", {"delta": {"stop_reason": "end_turn"}, "usage": {"output_tokens": out_tok}}) \
+            + sse("message_stop", {})
+    elif fmt == "openai":
+        def sse(data):
+            return f"data: {json.dumps(data)}\n\n"
+        head = ": mock\n\n"
+        body = lambda t: sse({"choices": [{"delta": {"content": t}}], "model": model})
+        tail = sse({"choices": [{"delta": {}, "finish_reason": "stop"}],
+                    "usage": {"prompt_tokens": in_tok, "completion_tokens": out_tok}}) + "data: [DONE]\n\n"
+    elif fmt == "ollama":
+        head = ""
+        body = lambda t: json.dumps({"model": model, "message": {"role": "assistant", "content": t}, "done": False}) + "\n"
+        tail = json.dumps({"model": model, "message": {"role": "assistant", "content": ""}, "done": True,
+                           "prompt_eval_count": in_tok, "eval_count": out_tok,
+                           "prompt_eval_duration": int(in_tok / c["prompt_tps"] * 1e9),
+                           "eval_duration": int(out_tok / c["tps"] * 1e9)}) + "\n"
+    else:  # brain
+        head = ""
+        body = lambda t: json.dumps({"type": "chunk", "text": t}) + "\n"
+        tail = json.dumps({"type": "done", "text": ""}) + "\n"
+    return head, body, tail
+
+
+def error_body(fmt: str, status: int) -> str:
+    if fmt == "anthropic":
+        return json.dumps({"type": "error", "error": {"type": "overloaded_error", "message": f"mock {status}"}})
+    if fmt == "brain":
+        return json.dumps({"type": "error", "text": f"mock {status}"})
+    return json.dumps({"error": {"message": f"mock {status}", "code": status}})
+
+
+# ─── Bot API Telegram ─────────────────────────────────────────────────
+def tg_push(text: str, chat_id: str) -> int:
+    global _tg_next_id
+    with _tg_cond:
+        uid = _tg_next_id
+        _tg_next_id += 1
+        _tg_updates.append({"update_id": uid, "message": {
+            "message_id": uid, "date": int(time.time()), "text": text,
+            "chat": {"id": int(chat_id) if chat_id.lstrip("-").isdigit() else chat_id, "type": "private"},
+            "from": {"id": 1, "is_bot": False, "first_name": "loadtest"}}})
+        for tag in TAG_RE.findall(text):
+            _tg_tags[tag] = {"t0": time.monotonic(), "first": None}
+        TG_STATS["received"] += 1
+        _tg_cond.notify_all()
+    return uid
+
+
+def tg_get_updates(offset: int, timeout: float) -> list:
+    deadline = time.monotonic() + min(timeout, TG_POLL_MAX)
+    with _tg_cond:
+        # come Telegram: chiedere da offset conferma (e scarta) gli update precedenti
+        _tg_updates[:] = [u for u in _tg_updates if u["update_id"] >= offset]
+        while not _tg_updates:
+            left = deadline - time.monotonic()
+            if left <= 0:
+                break
+            _tg_cond.wait(left)
+        return list(_tg_updates)
+
+
+def tg_outgoing(method: str, payload: dict) -> dict:
+    global _tg_message_id
+    text = str(payload.get("text", payload.get("caption", "")))
+    with _tg_cond:
+        if method == "editMessageText":
+            TG_STATS["edits"] += 1
+            mid = payload.get("message_id", 0)
+        else:
+            TG_STATS["sent"] += 1
+            _tg_message_id += 1
+            mid = _tg_message_id
+        for tag in TAG_RE.findall(text):
+            st = _tg_tags.get(tag)
+            if st and st["first"] is None:
+                st["first"] = time.monotonic()
+                _tg_cond.notify_all()
+    if method in ("sendChatAction", "deleteMessage", "setMyCommands", "answerCallbackQuery"):
+        return {"ok": True, "result": True}
+    return {"ok": True, "result": {"message_id": mid, "date": int(time.time()), "text": text,
+                                   "chat": {"id": payload.get("chat_id", 0)}}}
+
+
+def tg_wait(tag: str, timeout: float) -> dict:
+    """Attende la prima risposta del bot che contiene il tag."""
+    deadline = time.monotonic() + timeout
+    with _tg_cond:
+        st = _tg_tags.get(tag)
+        if st is None:
+            return {"tag": tag, "error": "tag sconosciuto"}
+        while st["first"] is None:
+            left = deadline - time.monotonic()
+            if left <= 0:
+                return {"tag": tag, "error": "timeout"}
+            _tg_cond.wait(left)
+        _tg_tags.pop(tag, None)
+        return {"tag": tag, "latency_ms": round((st["first"] - st["t0"]) * 1000, 1)}
+
+
+# ─── HTTP ─────────────────────────────────────────────────────────────
+class MockHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"   # keep-alive per il client Telegram; gli stream sono chunked
+
+    def log_message(self, *args):
+        pass
+
+    def _json(self, data, status: int = 200):
+        raw = json.dumps(data, ensure_ascii=False).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(raw)))
+        self.end_headers()
+        self.wfile.write(raw)
+
+    def _body(self) -> dict:
+        raw = self.rfile.read(int(self.headers.get("Content-Length", 0) or 0))
+        try:
+            data = json.loads(raw or b"{}")
+            return data if isinstance(data, dict) else {}
+        except ValueError:
+            return {}   # multipart (sendVoice): il contenuto non interessa
+
+    def _chunk(self, text: str):
+        raw = text.encode("utf-8")
+        if raw:
+            self.wfile.write(b"%x\r\n%s\r\n" % (len(raw), raw))
+            self.wfile.flush()
+
+    def do_GET(self):
+        url = urllib.parse.urlsplit(self.path)
+        q = dict(urllib.parse.parse_qsl(url.query))
+        if url.path == "/health":
+            self._json({"status": "ok", "mock": True})
+        elif url.path == "/api/tags":
+            self._json({"models": [{"name": "mock"}]})
+        elif url.path == "/mock/config":
+            with _lock:
+                self._json(CONFIG)
+        elif url.path == "/mock/stats":
+            with _lock:
+                self._json({**STATS, "requests": dict(STATS["requests"]), "telegram": dict(TG_STATS)})
+        elif url.path == "/mock/telegram/wait":
+            self._json(tg_wait(q.get("tag", ""), float(q.get("timeout", 60))))
+        else:
+            self._json({"error": "not found"}, 404)
+
+    def do_POST(self):
+        path = urllib.parse.urlsplit(self.path).path
+        body = self._body()
+        if path in FORMATS:
+            return self._stream(FORMATS[path], body)
+        if path.startswith("/bot"):
+            method = path.rsplit("/", 1)[-1]
+            if method == "getUpdates":
+                return self._json({"ok": True, "result": tg_get_updates(int(body.get("offset", 0) or 0),
+                                                                        float(body.get("timeout", 0) or 0))})
+            return self._json(tg_outgoing(method, body))
+        if path == "/mock/config":
+            try:
+                for k, v in body.items():
+                    if k == "per" and isinstance(v, dict):
+                        for fmt, opts in v.items():
+                            for kk, vv in opts.items():
+                                set_option(f"{fmt}.{kk}={vv}")
+                    else:
+                        set_option(f"{k}={v}")
+            except (ValueError, TypeError) as e:
+                return self._json({"error": str(e)}, 400)
+            with _lock:
+                return self._json(CONFIG)
+        if path == "/mock/telegram/send":
+            return self._json({"update_id": tg_push(str(body.get("text", "")), str(body.get("chat_id", "1")))})
+        self._json({"error": "not found"}, 404)
+
+    def _stream(self, fmt: str, body: dict):
+        c = cfg(fmt)
+        rng = request_rng(fmt)
+        if rng.random() < c["error_rate"]:
+            with _lock:
+                STATS["errors"] += 1
+            raw = error_body(fmt, c["error_status"]).encode("utf-8")
+            self.send_response(c["error_status"])
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(raw)))
+            self.end_headers()
+            self.wfile.write(raw)
+            return
+        prompt = last_user_text(fmt, body)
+        tokens = reply_tokens(prompt, c, rng)
+        step = max(1, c["chunk_tokens"])
+        chunks = ["".join(tokens[i:i + step]) for i in range(0, len(tokens), step)]
+        in_tok = max(1, int(self.headers.get("Content-Length", 0) or 0) // 4)
+        head, piece, tail = events(fmt, str(body.get("model", "mock")), in_tok, len(tokens), c)
+        cut_at = rng.randrange(len(chunks)) if rng.random() < c["drop_rate"] else -1
+        stall_at = rng.randrange(len(chunks)) if rng.random() < c["stall_rate"] else -1
+        with _lock:
+            STATS["active"] += 1
+            STATS["peak_active"] = max(STATS["peak_active"], STATS["active"])
+        try:
+            self.send_response(200)
+            self.send_header("Content-Type", "application/x-ndjson" if fmt in ("ollama", "brain")
+                             else "text/event-stream")
+            self.send_header("Transfer-Encoding", "chunked")
+            self.end_headers()
+            self._chunk(head)
+            time.sleep(_jit(c, rng, c["ttft_ms"] / 1000))
+            for i, text in enumerate(chunks):
+                if i == cut_at:
+                    with _lock:
+                        STATS["drops"] += 1
+                    self.close_connection = True
+                    return
+                if i == stall_at:
+                    with _lock:
+                        STATS["stalls"] += 1
+                    time.sleep(c["stall_ms"] / 1000)
+                if i:
+                    time.sleep(_jit(c, rng, step / c["tps"]))
+                self._chunk(piece(text))
+            self._chunk(tail)
+            self.wfile.write(b"0\r\n\r\n")
+        except (BrokenPipeError, ConnectionResetError):
+            self.close_connection = True   # il client ha chiuso (timeout/failover): normale
+        finally:
+            with _lock:
+                STATS["active"] -= 1
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Mock provider LLM + Bot API Telegram per test di carico")
+    ap.add_argument("--host", default="127.0.0.1")
+    ap.add_argument("--port", type=int, default=8099)
+    ap.add_argument("--ttft-ms", type=int, default=CONFIG["ttft_ms"])
+    ap.add_argument("--tps", type=float, default=CONFIG["tps"])
+    ap.add_argument("--tokens", type=int, default=CONFIG["tokens"])
+    ap.add_argument("--chunk-tokens", type=int, default=CONFIG["chunk_tokens"])
+    ap.add_argument("--error-rate", type=float, default=CONFIG["error_rate"])
+    ap.add_argument("--stall-rate", type=float, default=CONFIG["stall_rate"])
+    ap.add_argument("--seed", type=int, default=CONFIG["seed"])
+    ap.add_argument("--set", action="append", default=[], metavar="[formato.]chiave=valore",
+                    help="qualsiasi opzione di CONFIG, anche per formato (anthropic, openai, ollama, brain)")
+    args = ap.parse_args()
+    CONFIG.update(ttft_ms=args.ttft_ms, tps=args.tps, tokens=args.tokens, chunk_tokens=args.chunk_tokens,
+                  error_rate=args.error_rate, stall_rate=args.stall_rate, seed=args.seed)
+    try:
+        for spec in args.set:
+            set_option(spec)
+    except ValueError as e:
+        ap.error(str(e))
+    server = ThreadingHTTPServer((args.host, args.port), MockHandler)
+    server.daemon_threads = True
+    print(f"[Mock LLM] http://{args.host}:{args.port} — ttft {CONFIG['ttft_ms']}ms, {CONFIG['tps']} tok/s, "
+          f"{CONFIG['tokens']} token, errori {CONFIG['error_rate']:.0%}, stalli {CONFIG['stall_rate']:.0%}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
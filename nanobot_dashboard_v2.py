@@ -9,31 +9,66 @@ Accesso: http://your-pi.local:{PORT}
 """
 
 import asyncio
+import base64
+import bisect
+import concurrent.futures
 import functools
+import gzip
 import hashlib
+import importlib.util
 import http.client
 import io
 import json
+import logging
 import os
 import zipfile
+import random
 import re
 import secrets
 import subprocess
 import time
+import urllib.error
+import urllib.parse
 import urllib.request
-import shlex
+import socket
 import ssl
+import statistics
+import struct
+import sys
 import sqlite3
-from datetime import datetime as _dt
+import threading
+import traceback
+import tracemalloc
+from datetime import datetime as _dt, timedelta
+from collections import Counter, OrderedDict, deque
 from contextlib import asynccontextmanager
+from dataclasses import dataclass, fields as dataclass_fields
 from pathlib import Path
+from typing import ClassVar
+
+# ─── Startup timeline (opt-in: VESSEL_STARTUP_TRACE=1) ───────────────────────
+# Le fasi registrano sempre il proprio istante (costo trascurabile); il dettaglio
+# viene stampato solo con la variabile d'ambiente attiva.
+STARTUP_TRACE = os.environ.get("VESSEL_STARTUP_TRACE") == "1"
+_BOOT_T0 = time.perf_counter()
+_BOOT_MARKS: list[tuple[str, float]] = []
+
+def _boot_mark(phase: str):
+    """Segna la fine di una fase di avvio."""
+    _BOOT_MARKS.append((phase, time.perf_counter()))
 
 from fastapi import FastAPI, WebSocket, WebSocketDisconnect, Request, HTTPException
-from fastapi.responses import HTMLResponse, Response, JSONResponse
+from fastapi.responses import HTMLResponse, Response, JSONResponse, StreamingResponse
 from starlette.middleware.base import BaseHTTPMiddleware
 from starlette.middleware.gzip import GZipMiddleware
 import uvicorn
 
+try:
+    import brotli  # opzionale: Content-Encoding br per pagine e bundle
+except ImportError:
+    brotli = None
+
+_boot_mark("imports")
 
 
 # --- src/backend/config.py ---
@@ -216,6 +251,17 @@ if not _bridge_cfg:
 CLAUDE_BRIDGE_URL = os.environ.get("CLAUDE_BRIDGE_URL", _bridge_cfg.get("url", "http://localhost:8095"))
 CLAUDE_BRIDGE_TOKEN = os.environ.get("CLAUDE_BRIDGE_TOKEN", _bridge_cfg.get("token", ""))
 
+# ─── Mock LLM (test di carico) ───────────────────────────────────────────────
+# VESSEL_MOCK_URL=http://127.0.0.1:8099 (mock_llm.py): provider LLM e Bot API
+# Telegram puntano al mock, API key non richieste. Mai in produzione.
+MOCK_URL = os.environ.get("VESSEL_MOCK_URL", "")
+
+# ─── Metriche (GET /metrics, Prometheus) ─────────────────────────────────────
+# Con token: Prometheus manda "Authorization: Bearer <token>". Senza token
+# /metrics risponde solo a una sessione dashboard (localhost non basta: il
+# tunnel cloudflared inoltra le richieste esterne da 127.0.0.1).
+METRICS_TOKEN = os.environ.get("VESSEL_METRICS_TOKEN", "")
+
 # ─── OpenRouter (DeepSeek V3) ────────────────────────────────────────────────
 _or_cfg = _get_config("openrouter.json")
 OPENROUTER_API_KEY = os.environ.get("OPENROUTER_API_KEY", _or_cfg.get("apiKey", ""))
@@ -227,6 +273,7 @@ OPENROUTER_LABEL = _or_cfg.get("label", "Auto")
 _tg_cfg = _get_config("telegram.json")
 TELEGRAM_TOKEN   = os.environ.get("TELEGRAM_TOKEN",   _tg_cfg.get("token", ""))
 TELEGRAM_CHAT_ID = os.environ.get("TELEGRAM_CHAT_ID", str(_tg_cfg.get("chat_id", "")))
+TELEGRAM_STREAMING = bool(_tg_cfg.get("streaming", True))  # risposte progressive via editMessageText
 
 # ─── Groq (Whisper STT) ─────────────────────────────────────────────────────
 _groq_cfg = _get_config("groq.json")
@@ -237,6 +284,10 @@ GROQ_WHISPER_LANGUAGE = _groq_cfg.get("language", "it")
 # ─── TTS (Edge TTS) ───────────────────────────────────────────────────────
 TTS_VOICE = "it-IT-DiegoNeural"
 TTS_MAX_CHARS = 2000  # limite caratteri per TTS (evita vocali troppo lunghi)
+# Vocali a frasi mentre il modello genera: "segments" = un vocale per gruppo di frasi
+# appena pronto, "single" = un unico OGG concatenato, "off" = TTS a risposta completa
+TTS_PIPELINE = _tg_cfg.get("voice_pipeline", "segments")
+TTS_WORKERS = 2  # sintesi in parallelo (Edge TTS + ffmpeg per frase)
 
 # ─── HTTPS Locale ────────────────────────────────────────────────────────────
 HTTPS_ENABLED = os.environ.get("HTTPS_ENABLED", "").lower() in ("true", "1", "yes")
@@ -332,7 +383,14 @@ def discover_plugins() -> list[dict]:
             print(f"[Plugin] {d.name}: errore manifest: {e}")
     return plugins
 
-PLUGINS = discover_plugins()
+_plugins_cache: list[dict] | None = None
+
+def get_plugins() -> list[dict]:
+    """Manifest dei plugin, scansionati al primo uso invece che all'import."""
+    global _plugins_cache
+    if _plugins_cache is None:
+        _plugins_cache = discover_plugins()
+    return _plugins_cache
 
 # ─── Auth ─────────────────────────────────────────────────────────────────────
 PIN_FILE = Path.home() / ".nanobot" / "dashboard_pin.hash"
@@ -346,14 +404,57 @@ def _load_sessions() -> dict[str, float]:
             pass
     return {}
 
-def _save_sessions():
+def _sessions_snapshot() -> dict[str, float]:
+    """Copia di SESSIONS presa sul loop: il dict live non va letto da un worker
+    thread. Il flag si azzera qui, così un login/logout durante la scrittura
+    lo rialza e finisce nel flush successivo."""
+    global _sessions_dirty
+    _sessions_dirty = False
+    return dict(SESSIONS)
+
+def _write_sessions(data: dict[str, float]):
+    """Scrittura atomica (tmp + rename): un crash a metà non corrompe sessions.json.
+    Sicura in un worker thread: lavora solo sullo snapshot."""
+    global _sessions_dirty, _sessions_saved_at
     try:
-        SESSION_FILE.write_text(json.dumps(SESSIONS))
-    except Exception:
-        pass
+        tmp = SESSION_FILE.with_suffix(".json.tmp")
+        tmp.write_text(json.dumps(data))
+        tmp.chmod(0o600)
+        os.replace(tmp, SESSION_FILE)
+        _sessions_saved_at = time.time()
+    except Exception as e:
+        _sessions_dirty = True  # riprova al prossimo flush
+        print(f"[Auth] Salvataggio sessioni fallito: {e}")
+
+def _save_sessions():
+    """Salvataggio immediato dal loop (login/logout)."""
+    _write_sessions(_sessions_snapshot())
+
+def _sessions_flush_due(force: bool = False) -> bool:
+    """True se le sessioni sono modificate e l'ultimo salvataggio ha più di
+    SESSION_FLUSH_INTERVAL secondi (o force=True)."""
+    if not _sessions_dirty:
+        return False
+    return force or time.time() - _sessions_saved_at >= SESSION_FLUSH_INTERVAL
+
+def _flush_sessions(force: bool = False):
+    """Persiste le sessioni se modificate. force=True allo shutdown."""
+    if _sessions_flush_due(force):
+        _save_sessions()
+
+def _ensure_sessions():
+    """Carica sessions.json al primo accesso (non all'import)."""
+    global _sessions_loaded
+    if not _sessions_loaded:
+        SESSIONS.update(_load_sessions())
+        _sessions_loaded = True
 
-SESSIONS: dict[str, float] = _load_sessions()
+SESSIONS: dict[str, float] = {}
+_sessions_loaded = False
 SESSION_TIMEOUT = 86400 * 7  # 7 giorni (per PWA iPhone)
+SESSION_FLUSH_INTERVAL = 60  # debounce scrittura last-seen su disco
+_sessions_dirty = False
+_sessions_saved_at = 0.0
 MAX_AUTH_ATTEMPTS = 5
 AUTH_LOCKOUT_SECONDS = 300  # 5 minuti
 
@@ -383,34 +484,96 @@ def _set_pin(pin: str):
     PIN_FILE.chmod(0o600)
 
 def _is_authenticated(token: str) -> bool:
+    """Verifica in memoria. Il last-seen aggiornato va su disco col flush debounced."""
+    global _sessions_dirty
+    _ensure_sessions()
     if token in SESSIONS:
-        if time.time() - SESSIONS[token] < SESSION_TIMEOUT:
-            SESSIONS[token] = time.time()
-            _save_sessions()
+        now = time.time()
+        if now - SESSIONS[token] < SESSION_TIMEOUT:
+            SESSIONS[token] = now
+            _sessions_dirty = True
             return True
         del SESSIONS[token]
-        _save_sessions()
+        _sessions_dirty = True
     return False
 
 def _create_session() -> str:
     token = secrets.token_urlsafe(32)
+    _ensure_sessions()
     SESSIONS[token] = time.time()
     _save_sessions()
     return token
 
+def _revoke_session(token: str):
+    _ensure_sessions()
+    if SESSIONS.pop(token, None) is not None:
+        _save_sessions()
+
 # ─── Rate Limiting ────────────────────────────────────────────────────────────
-RATE_LIMITS: dict[str, list[float]] = {}
+RATE_LIMIT_MAX_KEYS = 1024  # chiavi ip:action tenute in memoria (LRU)
+
+class SlidingWindowLimiter:
+    """Rate limit a sliding-window counter: per chiave solo (inizio finestra,
+    conteggio corrente, conteggio precedente), memoria O(1). Stima =
+    precedente pesato per la parte di finestra ancora sovrapposta + corrente.
+    Chiavi in LRU: oltre max_keys si scarta la meno recente."""
+
+    def __init__(self, max_keys: int = RATE_LIMIT_MAX_KEYS):
+        self.max_keys = max_keys
+        self._entries: "OrderedDict[str, list]" = OrderedDict()  # key → [start, curr, prev, window]
+
+    def hit(self, key: str, max_requests: int, window_seconds: float) -> bool:
+        now = time.time()
+        entry = self._entries.get(key)
+        if entry is None:
+            entry = [now, 0, 0, window_seconds]
+            self._entries[key] = entry
+            if len(self._entries) > self.max_keys:
+                self._entries.popitem(last=False)
+        else:
+            self._entries.move_to_end(key)
+            self._roll(entry, now)
+        start, curr, prev, window = entry
+        weight = max(0.0, 1 - (now - start) / window)
+        if prev * weight + curr >= max_requests:
+            return False
+        entry[1] += 1
+        return True
+
+    @staticmethod
+    def _roll(entry: list, now: float):
+        start, curr, _, window = entry
+        periods = int((now - start) // window)
+        if periods >= 1:
+            entry[2] = curr if periods == 1 else 0
+            entry[1] = 0
+            entry[0] = start + periods * window
+
+    def reset(self, key: str):
+        self._entries.pop(key, None)
+
+    def purge(self):
+        """Rimuove le chiavi inattive da più di due finestre."""
+        now = time.time()
+        for key, entry in list(self._entries.items()):
+            if now - entry[0] >= 2 * entry[3]:
+                del self._entries[key]
+
+    def __len__(self):
+        return len(self._entries)
+
+RATE_LIMITS = SlidingWindowLimiter()
 
 def _rate_limit(ip: str, action: str, max_requests: int, window_seconds: int) -> bool:
-    key = f"{ip}:{action}"
-    now = time.time()
-    timestamps = RATE_LIMITS.get(key, [])
-    timestamps = [t for t in timestamps if now - t < window_seconds]
-    RATE_LIMITS[key] = timestamps
-    if len(timestamps) >= max_requests:
-        return False
-    timestamps.append(now)
-    return True
+    return RATE_LIMITS.hit(f"{ip}:{action}", max_requests, window_seconds)
+
+def _startup_report() -> dict:
+    """Millisecondi per fase dall'inizio dell'avvio (dopo gli import stdlib)."""
+    phases, prev = {}, _BOOT_T0
+    for phase, t in _BOOT_MARKS:
+        phases[phase] = round((t - prev) * 1000, 1)
+        prev = t
+    return {"total_ms": round((prev - _BOOT_T0) * 1000, 1), "phases": phases}
 
 def _validate_config():
     """Stampa warning all'avvio per configurazioni mancanti o incomplete."""
@@ -430,10 +593,14 @@ def _validate_config():
 
 @asynccontextmanager
 async def lifespan(app):
+    _boot_mark("uvicorn")
     _validate_config()
     init_db()
-    db_log_event("system", "start", payload={"port": PORT, "pid": os.getpid(),
-                 "schema_version": SCHEMA_VERSION})
+    _boot_mark("init_db")
+    bus_server = await start_bus_socket()
+    asyncio.create_task(loop_monitor())
+    asyncio.create_task(health_scheduler())
+    asyncio.create_task(job_scheduler())
     asyncio.create_task(stats_broadcaster())
     asyncio.create_task(crypto_push_task())
     if TELEGRAM_TOKEN and TELEGRAM_CHAT_ID:
@@ -441,7 +608,18 @@ async def lifespan(app):
         asyncio.create_task(heartbeat_task())
     loop = asyncio.get_running_loop()
     loop.run_in_executor(None, warmup_ollama)
+    _boot_mark("lifespan")
+    startup = _startup_report()
+    if STARTUP_TRACE:
+        for phase, ms in startup["phases"].items():
+            print(f"[Startup] {phase:<10} {ms:>8.1f} ms")
+    print(f"[Startup] pronto in {startup['total_ms']:.0f} ms")
+    db_log_event("system", "start", payload={"port": PORT, "pid": os.getpid(),
+                 "schema_version": SCHEMA_VERSION, "boot_ms": startup["total_ms"]})
     yield
+    bus_server.close()
+    Path(BUS_SOCKET).unlink(missing_ok=True)
+    _flush_sessions(force=True)
     db_log_event("system", "stop")
 
 app = FastAPI(lifespan=lifespan)
@@ -457,8 +635,8 @@ class SecurityHeadersMiddleware(BaseHTTPMiddleware):
         response.headers["Permissions-Policy"] = "camera=(), microphone=(), geolocation=()"
         response.headers["Content-Security-Policy"] = (
             "default-src 'self'; "
-            "script-src 'unsafe-inline' 'unsafe-eval'; "
-            "style-src 'unsafe-inline' https://fonts.googleapis.com; "
+            "script-src 'self' 'unsafe-inline' 'unsafe-eval'; "
+            "style-src 'self' 'unsafe-inline' https://fonts.googleapis.com; "
             "font-src https://fonts.gstatic.com; "
             "img-src 'self' data:; "
             "connect-src 'self' ws: wss:; "
@@ -467,8 +645,21 @@ class SecurityHeadersMiddleware(BaseHTTPMiddleware):
         )
         return response
 
+class DynamicGZipMiddleware(GZipMiddleware):
+    """GZip solo per le risposte dinamiche: pagine, bundle e sw.js arrivano
+    già compressi (serve_asset) e non vanno ricompressi a ogni richiesta. Il firmware
+    OTA resta binario: Content-Length/Content-Range devono valere sui byte del .bin."""
+    PRECOMPRESSED = ("/", "/sw.js", "/manifest.json", "/api/tamagotchi/firmware")
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] == "http" and (scope["path"] in self.PRECOMPRESSED
+                                        or scope["path"].startswith("/static/")):
+            await self.app(scope, receive, send)
+            return
+        await super().__call__(scope, receive, send)
+
 app.add_middleware(SecurityHeadersMiddleware)
-app.add_middleware(GZipMiddleware, minimum_size=500)
+app.add_middleware(DynamicGZipMiddleware, minimum_size=500)
 
 # ─── Connection manager ───────────────────────────────────────────────────────
 class Manager:
@@ -503,179 +694,288 @@ VESSEL_ICON = "data:image/jpeg;base64,/9j/4AAQSkZJRgABAQAAAQABAAD/2wBDAAYEBQYFBA
 
 VESSEL_ICON_192 = "data:image/jpeg;base64,/9j/4AAQSkZJRgABAQAAAQABAAD/2wBDAAYEBQYFBAYGBQYHBwYIChAKCgkJChQODwwQFxQYGBcUFhYaHSUfGhsjHBYWICwgIyYnKSopGR8tMC0oMCUoKSj/2wBDAQcHBwoIChMKChMoGhYaKCgoKCgoKCgoKCgoKCgoKCgoKCgoKCgoKCgoKCgoKCgoKCgoKCgoKCgoKCgoKCgoKCj/wAARCADAAMADASIAAhEBAxEB/8QAHAABAQADAQEBAQAAAAAAAAAAAAUDBAYCBwEI/8QARRAAAgEDAgMFBQUFBQUJAAAAAQIDAAQRBSEGEjETIkFRYRQycYGRFSNCobEHYnKCwSRSkrKzNmN1ivAlMzRTZKPC0eL/xAAZAQEBAQEBAQAAAAAAAAAAAAAAAQIDBAX/xAAqEQEAAgIBAwEHBQEAAAAAAAAAAQIDESEEEjFBEyJRYXGBoSMykcHw4f/aAAwDAQACEQMRAD8A/l+lKVGSlKUClKUClKUClKUClK/MjxI+tB+0oN+m/wAKUClKUClKUClKUClKUClKUClKUClKUClKUClK2tNsZtRu1t4OQEgszueVI1G7Ox8FA3JoMVrbT3dwkFrDJNM+yxxqWY/IVU+zbCxJ+1r7nmB3trHllYfxSZ5B8uY+le7u9RYpNN0IMloVxPOdnusdWc/hj8k6DbmyajtPBAMQos7/AN9x3R8F8fifpRVaK+th3dM0OBzj37kvcv/w/hrKNc1aJT2dxZ2oA92KKCM48sKua07HRtZ1oqI45OyILKZDyJj0Hj8hWpc6PPbCQvJCyocEo2fpQ0rrqWou2JLPTL0nozWkLnb95QDWJ72wkfk1HRUgJO72cjwuP5XLKfoPjUZtOuVtknMf3TnlVsjc15SWe17kikoRns5FyCP8ArxFDStdaRm1e80ub22zjGZCF5ZYB/vE3wP3gSvr4VKrdtJ2hmW80uWSGeMk8obvJ8D+Ief5giqUkFvrsMk+nwx22pxoXms4xhJlAyzwjwIG5j+JXbKgiBSlKBSlKBSlKBSlKBSlKBSlKBSlKBV3UFbTLJNIiQ+3T8r3uB3geqQ/AbM37xAPuCsPDkUa3E99cRrJb2EfblG6O+QsaH4uQT6A1OkndUluJCXnmLAOeuT7zfHfHzNB4uJWx7JbEsGI5yoyZG9PQeA+ddFpWnGyMYtbSK61JVMkslxjsrcAE+JAJA69em2DXjQtMh03RG4h1GVBluzsrfYtPIOufJR1J+A6muj0yxk1VrIavHcSSXCe0R2Ma/f33kT4RxA7LnbYkAk0aYbWbVNV7VtOmmu5sHtbps28EA6d3ByfixA9DS60bVZFJs49KnuSVY3Elyk8vpyhu6g9MZ6V1XE9hb8NaHay8QQxSxdsxttHt5R2MbFOf71jlmJ6DPXfpgE8Rc8bWshhSHhPh6O3iDKEMBLMD4MwIJ33zQnhnttG1m1S5WWwilumIUmJd2A6jH/dv06EE+R3qYbM3NuxRM25GHsySWiOd+zzuCD4HruN+gtadrPBmpJ7NqeiTaVI/KBcWs7PEjbd8oSCN89PDzNeOJLCKwuLf7P1OO+mkQCCTmLCSM57jHGGycjzGPhRYjfhwUsMlqY54ZMqTlXXYqw8D4gitmCdudLu0ZobqFhITGcFWByHXHTf6H8uhhuBqQmSURBWXL9scEFfwHb3sDGfE8p65rndVtJNF1iSJTzKh5o2YbOh6H4EUTSlq0UWoWQ1a0jCPzBL2FBhY5D0dR4I+Dt0VgR0K1FqrpV5DY3/NIGbTbtDFPH5xMdx6lSAR6qDWpqllLp2o3FnOQZIXKFl6N5MPQjBHoaMtWlKUClKUClKUClKUClKUClKdNzQWbjmteFbSEBea/uGuCB1KR/dp8uZpfpWh7K19rVtp8OSedbdeUZ3zgn6kmqmthY9T0+1K4Szs4VYZ8eTtX/5nNev2dyG312fVG5SdOtpbwFiR3lHdxjxyRRYdNp0UFxqN7ql3bpc6ToSpp9ja52nmzyqBtuS3M5NdFLqknC8d5d392knEN7g3dyYwRbIR3YkzvzDyA8N8YzUKK1k07Q+GtMti32hdSnUpipyzNjCbeffA+INafGao2jWzW8MqGO6V3Unm5F5AuWPq2friuV7+9FPi+j0/T/oX6mY32+I+8eWtx/cMLW2hWVZIpp3mLY7zlVChsnfBBO1cXGjySLHGrO7kKqqMliegA8TXZcaw3WoXOnQ21q8svZTOFjUkkBsnbyAGfrWHS7FdPuNO1XTZJuzZuzkWdVDIWBVsEdCCDn0GpNjtFccTK9bitl6u9ax41/UOSYFWIYEEHBBGCDXe8NwWmpcMQJe3Biithc87xqGeLlHaKcZHiTj8q1eJdDRn1HUbmSWBuzR4FEXN7Q+FDsSTkZYkAgHJB8Mms3CxiPCd5DK5Rla551KnYdiuPzBpktFq7j5J0uK2HPNbfC34if7hsW0YEsOqxKXiYImpsWypLNiK4AIBAOVz8W8zUHiVEvLGNk5R2CEwjly/IGwUZvxFTkZ8h610PDD2qroK6kJGsbqA212CSABzycjH90ZHyOaw2gtbDWrzTLhxNZSJJGHBBBAx3xjrlBG3xU10rbfh5MmOaa36xE/y4K1btLWSI7mM9ov6N/Q/KqmrYuNL0u9Gefs2tJdsd6LHL/7bJ9KnrA1jrT206EFJGhdW+amqdiGm4b1a1Ytz20kV2BjpgmJ/wDOn0rTjKNSlKIUpSgUpSgUpSgUpSgV6RDI6xjq5C/XavNb/D6drr+mR5xz3UK58sutBucTSg8Sa84OAss0a5ONg3IB9Km6QUkQ2nMyyXc8URx05MnOfny/nWW+kMz6rMCEDyklTud5CfyxXnSJ/YHtr3kDmJmkVHUFSRgDY0WH0bXiYdf1u8ijaONEkW3kRyW7OJZF5lyehdWPyGK2bNoLaw0ldTaQz31y1sLrtOZVZY4/eVveUl92yMevSp3EJu04d0c6dG91LPpKGU8nNhWeUNhfnv8AHNc3cz3V/BYQXiSSRQTExckXKQWC8y4I32VdvT1rjbH3W5/3D6WLqpwYtU8zH2/c6riGwv7mDTJtOMUd1YPIVSQjv85BJye6cYII8azXF3penyxQ3t8IxMSO8CwUEYLHAJxjxx4eOK0LPVG1PiOwWI3KwSW0kcg5hy847RwGGNsfXbas3E2h6fqIYJexfaUSqGwCDHncBlO5XBGGGeuPSuHbMarfw+n7Wt5yZunj35nWp5ieJ5j5zHoqWWpiWZvsW4t7y4d1SMo5jWRlHcRiQCuT47Z6Z64kaDYT6fHMdSvIo5ZS91O/vCMFO8G8zjOwz1wK9aFokOlWojN0slxcqHlTmwTGGwGVOuAcjJwTvjbNTb3WJLyymgurT+0TI8aRQKFCR5HKMb97bqSTvvTtm2608cJGWuPtz54iL6tERGtbiPX5z406PTNXWOOKWzQJbaniyPtKgu0cgYc37pyqnb4ZO9RuKmjjsdH1fTwFUWkMhjG4EseFkVhjG4c/IVIlu9VtY7WB9PaJYGURK0JPeQEZLbYPe8vGus4isVteBJ0VBzFI5WDH3BKAe6PAAjfbfI3rvijsjUfN8zrck559pbe4isc/TlwX7Q7SG14j57VmMFxbw3EZIwcNGD/0fGv3Rh2uq30AIC3dnP8ADPZGUdPVRWHihQ2mcPTjmPNZdmWPQlJHGB8BgV+aRdpZavpN7LvCpQSYGO6DyOP8Pj612fPlJznfzpWxqNo9hqFzZye/bytEfXlOP6Vr0ZKUpQKUpSgUpSgUpSgVXt8pwpft07S9t0+OElJH5g1Iqup5eEZAQRz6gpU42OImzv/MPrQa1pKkOvWs0rckMgXmbyDLyt+ear8G6lFpOs3OmamgfTroPa3II35SMAj1Bww9RXOXAEtijg5aJuX+U7j88/WqEskF7ZxyBJEkgjRe3Azhx4N6Hwbw6b0aaWu6XLo+r3NjOys0LYDr7rqd1YehBB+dV+HFutT0XVdLieM4jFxGsjb5QklV9SM/Styzs5OJrKGwkeKPUrSMLaF2AEsZJPZlvjnlJ6EkHbGIFpcXvDusuWieG7h54pIpAQRkFWBHzp5WJ0mk9wDFfmCMHp5Gv3qnjtV/QbrSuxK6pbFmjGUK47xGdm9MVUQnaQZjkZgAclSfGq/CxNvNd34laI2lu7KVOCWYcgGfmT6gGp99Kt3fyPEuEJwuBjbw2r9SWaG2mtlK9lMylsdW5c4Hw3/SpKxOp3D1YWlxqV5Da2kTz3U7hEjXcsa7m9ay03RE4Z+0YoYY5fadRuIxzGWXGBGgHXlHTwzvtWLSIo+H+Hry9jRftFWVJZTJg4cHlhjx5+852IAA2zvOv9Nht9bMVzCyQabbRm7ZSMmUgE59SzYx6VB1+ladpum8K6jxFa27RLbxMsEtwxaaV2HIp2wqDfpgk+dfKtPGDPLkjkiIB9W7oH5n6VX4h4lfUZbyG0RoNOmZSkDMTy4Oc+WTtn4VKQdnp6kghpHLjPioGP1J+lVJVbzMPC+mREYM9xPcdOqgJGPzV6j1X4o+61JbIYC2MKWwH7wGX+rs5qRRkpSlApSlApSlApSlArPY3Utle291bnE0Ei/EpyP0rBSgraxbw2+rXCLiOxugJYSveCxv3kPrjofgRU2CabTLp1whyMHxDKR4HyIP51W0q4XULRdHvZEVS2bOd9uwkJ90n/AMtz18AcN/ezOnhc89pdfc3EDFFInd5SCeZCfDf6HPnRYbfaG0yUZVMYW4ijbfKn3kz47fpXZ8baU2p6Lpl+cyzXEAazuMZMgVd4H23cAEqfEbdTivnEtrcxDnIDCPqUcPyj1wTgb1Yl4v1SXTLexeXMNvIksONijKSRj60VBwUGGHhkfOv1YzISEUknoBuazzmW8f2l0HKzhDy4AzjYem1YJmw/KmQEJC56gZ/WgzWUsUZYSBtwcFTv02/PFb/Dk5g1iK4SNZblG5oIygdWlJATIPhk5+VRlyWx57Vf4QMCavFM5y8BaVRnGSqMwP1AoLn7Q7qHT9Yt9DjkllTTHLXMjPkz3LYMr+ODnC+PSuV1bV7nULy+mdgq3icoldEGFyM4+ma1VWW+uZXlly5DSPI+T6mtiNYbYc0bmWboGK4VPUZ3J+W1Db1BF2McUjQiS7lboV5iufdUDzP8A9VZ9jTSL4z67NFLeQN3bFHEjF16LKR3UUEbrnm2xgdR+JGOHuW4uiza0y88UBH/hSw2kkz+PByq+GQxP4Tz9EZLiaS4uJZ52LyysXdj4k1EeHdpHZ3Ys7EksxyST4k15pSgUpSgUpSgUpSgUpSgUpSg//2Q=="
 
+_boot_mark("config")
 
 
 # ─── FRONTEND (Auto-Generato) ───────────────────────────────────────────────
-HTML = "<!DOCTYPE html>\n<html lang=\"it\">\n\n<head>\n  <meta charset=\"UTF-8\">\n  <meta name=\"viewport\"\n    content=\"width=device-width, initial-scale=1.0, maximum-scale=1.0, user-scalable=no, viewport-fit=cover\">\n  <meta name=\"apple-mobile-web-app-capable\" content=\"yes\">\n  <meta name=\"apple-mobile-web-app-status-bar-style\" content=\"black-translucent\">\n  <meta name=\"theme-color\" content=\"#020502\">\n  <link rel=\"icon\" type=\"image/jpeg\"\n    href=\"data:image/jpeg;base64,/9j/4AAQSkZJRgABAQAAAQABAAD/2wBDAAYEBQYFBAYGBQYHBwYIChAKCgkJChQODwwQFxQYGBcUFhYaHSUfGhsjHBYWICwgIyYnKSopGR8tMC0oMCUoKSj/2wBDAQcHBwoIChMKChMoGhYaKCgoKCgoKCgoKCgoKCgoKCgoKCgoKCgoKCgoKCgoKCgoKCgoKCgoKCgoKCgoKCgoKCj/wAARCABAAEADASIAAhEBAxEB/8QAGwAAAgMBAQEAAAAAAAAAAAAAAAQDBQYBAgj/xAAzEAACAQMCAwUGBQUAAAAAAAABAgMABBEFIRIxUQYTFEFhIkJxgZGhMjM0YqIkUsHR4f/EABgBAQEBAQEAAAAAAAAAAAAAAAABAwIE/8QAHxEAAgIBBQEBAAAAAAAAAAAAAAECERIDBCExQcHx/9oADAMBAAIRAxEAPwD5foooqHIAEkAAknYAedMizkH5jRxnozbj5DJFTWscihEgXNzMCQc44Ewd8+WwJJ6fGr9ez8EOlie/MMMUhKxz3DlQxHMKu2PoTQqRmWtJMewUk2zhGyfpzper++0TwyQvaSxnvPy2STiSQjnggnBz8xVXcDvo3lK8M8ZxKMYzvjJ9c7H4g9aBoUooooQK6AWIUczsK5U1mvFdwD965+GcmgNDoAifV7xiMmFfYB3GAcDPpsnyzVz2g0+41Se27+QeGjZymWwFTCYUnkvnz3361R9mTEt3LNNJwRzJMr7kAIEBJyN+Zxt51Z6fdxppd1OyeKhZSixNk96SyjG4OPIEnfpWepdpo921cMXGa7+cjGmaSLF57cujW5mWQSNt7JU5AbqMDl0qg1e0MGslXzifijckjdweEnbrlWq0vrqNotOcq9vaTAKsaEjg3wQMY8s/9pfti8Ul74u2ZQomAQDkR3YwR6ZQfWmnfpN0oKlDz9MmOW/Oipr1Al3Mq/hDnHw5ioa0PEFMWP6kHojn+BpemLDe6Vf7wyD4lSB9zQFlp83dTaR3eULSzIXzsckD/VbWyS/vdVk0/TrKGSGBC8jKgGCB7uOZxvjesHbL4my7iIMLlJBJAVO/H5rj1XhI9Vx50/pvajV9O1gXGl3ipcToglWUDhDqMb8W2ee/7qjVm0Z4x47NzeeI0u6nS9igDwWviY3GzBdxupGzZHpnJrBX3FcdmraZlAMGNwv4svjJP2+VM33aHV+1F5Kt5NCZ5UEGY0CIIwcsxxzGw+u1edWuLaLSFs4JJBJ3iIsLAflpxZc48y2dvWolTE55JWUV9+oz1RD/AAWl6nvz/VyAe7hPoAP8VBXRiFdUlWBU4IOQelcooB/DTsZbRlWRx7UedwfQefUYz08q8a1O1/qcs726wSv+NVJxkbEnPLkc0nz50yLyXbIjZh77Rgn786FsLG7ltobuNSVkkQQ8QXZV4sk/b6E1I7eELcTCW6Jyxb2uA+vVvTcD48o/GSDHAkKMPeVN/vnHypckkkkkk7kmgs4SSSSck+dFFFCH/9k=\">\n  <link rel=\"apple-touch-icon\" sizes=\"192x192\"\n    href=\"data:image/jpeg;base64,/9j/4AAQSkZJRgABAQAAAQABAAD/2wBDAAYEBQYFBAYGBQYHBwYIChAKCgkJChQODwwQFxQYGBcUFhYaHSUfGhsjHBYWICwgIyYnKSopGR8tMC0oMCUoKSj/2wBDAQcHBwoIChMKChMoGhYaKCgoKCgoKCgoKCgoKCgoKCgoKCgoKCgoKCgoKCgoKCgoKCgoKCgoKCgoKCgoKCgoKCj/wAARCADAAMADASIAAhEBAxEB/8QAHAABAQADAQEBAQAAAAAAAAAAAAUDBAYCBwEI/8QARRAAAgEDAgMFBQUFBQUJAAAAAQIDAAQRBSEGEjETIkFRYRQycYGRFSNCobEHYnKCwSRSkrKzNmN1ovAlMzRTZKPC0eL/xAAZAQEBAQEBAQAAAAAAAAAAAAAAAQIDBAX/xAAqEQEAAgIBAwEHBQEAAAAAAAAAAQIDESEEEjFBEyJRYXGBoSMykcHw4f/aAAwDAQACEQMRAD8A/l+lKVGSlKUClKUClKUClKUClK/MjxI+tB+0oN+m/wAKUClKUClKUClKUClKUClKUClKUClKUClKUClK2tNsZtRu1t4OQEgszueVI1G7Ox8FA3JoMVrbT3dwkFrDJNM+yxxqWY/IVU+zbCxJ+1r7nmB3trHllYfxSZ5R8uY+le7u9RYpNN0IMloVxPOdnusdWc/hj8k6DbmyajtPBAMQos7/AN9x3R8F8fifpRVaK+th3dM0OBzj37kvcv8A/FB/hrKNc1aJT2dxZ2oA92KKCM48sKua07HRtZ1oqI45OyILKZDyJj0Hj8hWpc6PPbCQvJCyocEo2fpQ0rrqWou2JLPTL0nozWkLnb95QDWJ72wkfk1HRUgJO72cjwuP5XLKfoPjUZtOuVtknMf3TnlVsjc15SWe17kikoRns5FyCP8ArxFDStdaRm1e80ub22zjGZCF5ZYB/vE3wP3gSvr4VKrdtJ2hmW80uWSGeMk8obvJ8D+Ief5giqUkFvrsMk+nwx22pxoXms4xhJlAyzwjwIG5j+JXbKgiBSlKBSlKBSlKBSlKBSlKBSlKBSlKBV3UFbTLJNIiQ+3T8r3uB3geqQ/AbM37xAPuCsPDkUa3E9/cRrJb2EfblG6O+QsaH4uQT6A1OkndUluJCXnmLAOeuT7zfHfHzNB4uJWx7JbEsGI5yoyZG9PQeA+ddFpWnGyMYtbSK61JVMkslxjsrcAE+JAJA69em2DXjQtMh03RG4h1GVBluzsrfYtPIOufJR1J+A6muj0yxk1VrIavHcSSXCe0R2Ma/f33kT4RxA7LnbYkAk0aYbWbVNV7VtOmmu5sHtbps28EA6d3ByfixA9DS60bVZFJs49KnuSVY3Elyk8vpyhu6g9MZ6V1XE9hb8NaHay8QQxSxdsxttHt5R2MbFOf71jlmJ6DPXfpgE8Rc8bWshhSHhPh6O3iDKEMBLMD4MwIJ33zQnhnttG1m1S5WWwilumIUmJd2A6jH/dv06EE+R3qYbM3NuxRM25GHsySWiOd+zzuCD4HruN+gtadrPBmpJ7NqeiTaVI/KBcWs7PEjbd8oSCN89PDzNeOJLCKwuLf7P1OO+mkQCCTmLCSM57jHGGycjzGPhRYjfhwUsMlqY54ZMqTlXXYqw8D4gitmCdudLu0ZobqFhITGcFWByHXHTf6H8uhhuBqQmSURBWXL9scEFfwHb3sDGfE8p65rndVtJNF1iSJTzKh5o2YbOh6H4EUTSlq0UWoWQ1a0jCPzBL2FBhY5D0dR4I+Dt0VgR0K1FqrpV5DY3/NIGbTbtDFPH5xMdx6lSAR6qDWpqllLp2o3FnOQZIXKFl6N5MPQjBHoaMtWlKUClKUClKUClKUClKUClKdNzQWbjmteFbSEBea/uGuCB1KR/dp8uZpfpWh7K19rVtp8OSedbdeUZ3zgn6kmqmthY9T0+1K4Szs4VYZ8eTtX/5nNev2dyG312fVG5SdOtpbwFiR3lHdxjxyRRYdNp0UFxqN7ql3bpc6ToSpp9ja52nmzyqBtuS3M5NdFLqknC8d5d392knEN7g3dyYwRbIR3YkzvzDyA8N8YzUKK1k07Q+GtMti32hdSnUpipyzNjCbeffA+INafGao2jWzW8MqGO6V3Unm5F5AuWPq2friuV7+9FPi+j0/T/oX6mY32+I+8eWtx/cMLW2hWVZIpp3mLY7zlVChsnfBBO1cXGjySLHGrO7kKqqMliegA8TXZcaw3WoXOnQ21q8svZTOFjUkkBsnbyAGfrWHS7FdPuNO1XTZJuzZuzkWdVDIWBVsEdCCDg9RkGpjtFccTK9bitl6u9ax41/UOSYFWIYEEHBBGCDXe8NwWmpcMQJe3Biithc87xqGeLlHaKcZHiTj8q1eJdDRn1HUbmSWBuzR4FEXN7Q+FDsSTkZYkAgHJB8Mms3CxiPCd5DK5Rla551KnYdiuPzBpktFq7j5J0uK2HPNbfC34if7hsW0YEsOqxKXiYImpsWypLNiK4AIBAOVz8W8zUHiVEvLGNk5R2CEwjly/IGwUZvxFTkZ8h610PDD2qroK6kJGsbqA212CSABzycjH90ZHyOaw2gtbDWrzTLhxNZSJJGHBBBAx3xjrlBG3xU10rbfh5MmOaa36xE/y4K1btLWSI7mM9ov6N/Q/KqmrYuNL0u9Gefs2tJdsd6LHL/7bJ9KnrA1jrT206EFJGhdW+amqdiGm4b1a1Ytz20kV2BjpgmJ/wDOn0rTjKNSlKIUpSgUpSgUpSgUpSgV6RDI6xjq5C/XavNb/D6drr+mR5xz3UK58sutBucTSg8Sa84OAss0a5ONg3IB9Km6QUkQ2nMyyXc8URx05MnOfny/nWW+kMz6rMCEDyklTud5CfyxXnSJ/YHtr3kDmJmkVHUFSRgDY0WH0bXiYdf1u8ijaONEkW3kRyW7OJZF5lyehdWPyGK2bNoLaw0ldTaQz31y1sLrtOZVZY4/eVveUl92yMevSp3EJu04d0c6dG91LPpKGU8nNhWeUNhfnv8AHNc3cz3V/BYQXiSSRQTExckXKQWC8y4I32VdvT1rjbH3W5/3D6WLqpwYtU8zH2/c6riGwv7mDTJtOMUd1YPIVSQjv85BJye6cYII8azXF3penyxQ3t8IxMSO8CwUEYLHAJxjxx4eOK0LPVG1PiOwWI3KwSW0kcg5hy847RwGGNsfXbas3E2h6fqIYJexfaUSqGwCDHncBlO5XBGGGeuPSuHbMarfw+n7Wt5yZunj35nWp5ieJ5j5zHoqWWpiWZvsW4t7y4d1SMo5jWRlHcRiQCuT47Z6Z64kaDYT6fHMdSvIo5ZS91O/vCMFO8G8zjOwz1wK9aFokOlWojN0slxcqHlTmwTGGwGVOuAcjJwTvjbNTb3WJLyymgurT+0TI8aRQKFCR5HKMb97bqSTvvTtm2608cJGWuPtz54iL6tERGtbiPX5z406PTNXWOOKWzQJbaniyPtKgu0cgYc37pyqnb4ZO9RuKmjjsdH1fTwFUWkMhjG4EseFkVhjG4c/IVIlu9VtY7WB9PaJYGURK0JPeQEZLbYPe8vGus4isVteBJ0VBzFI5WDH3BKAe6PAAjfbfI3rvijsjUfN8zrck559pbe4isc/TlwX7Q7SG14j57VmMFxbw3EZIwcNGD/0fGv3Rh2uq30AIC3dnP8ADPZGUdPVRWHihQ2mcPTjmPNZdmWPQlJHGB8BgV+aRdpZavpN7LvCpQSYGO6DyOP8Pj612fPlJznfzpWxqNo9hqFzZye/bytEfXlOP6Vr0ZKUpQKUpQKUpQKUpQKrcJJz8S6aScJFMs7nOMLH3yfopqTVfQ/ubHWLvG8dr2KN5NKwT/J2lBMkLNZzynA53XI9Tk1X9kWHgsXVye9M+LcA755sH5YD/PHlUe5z7NbxLuXZpMAfyj9Pzq3xS7w6Zp+nEKFtpJVHL445Af8Am5qNQ72zFz9j6G0RTs5tFdUOAccpkLEjbOxIx8chchLFqEcWm3EsjTcrCaE8rSY91gwwAV25foM1b1XWJ9E0fRVsk7SW0sXtHkbohZic9ckESenh6iuFsrly8EDokqhgidozALkjyI29KxEc7dr5IikU9f8AruLZtUfVra6W3t4FCus8kYDc8feySw8TzEY67eVeuI+IIdCkktrS2jl1WVFaWVh3IsqCu343xjrsPImsltBLpOpwxaVDbGDmft2jkB7QhWHKoPUA9SOpG2QM1zWtWlxrPGt1D3svMqNIkRYIoUDJC+QFcqxu3Pwe/NlnHhmcc7mbeft6cR/LptB1y21OUTW9s0F3HyvLHty82fwP73KSB3T09agXsd9bWqK7WwQFVYJCJJmbJbmcee2fHw65pwMskGsX1tyAP2Y3cY5SsgxsfMmsvFFutnZJdCxtO3lmKXDorAZ5SRjOCAxyfI467Va11eYjwmTNGTpovefe5j68x+fq2dBW4GrO1zqaXzPazPHyOeYZ2yScYHmvU7ZFdVxTPBNHrlg2I5RolrKqhN+aMMW+uxz618s02S9F97fBBJMUfMhWMlTnqDjzGa7q61Y6trnGUkyx2yyaQFWLJOOQIQoLAHOfQV0iurbeO2fvxdk+d7/EQ5rU7J5f2c6feFhiG6kTGPMnx+I6VzcHf05lP4JfTow//IrqFmVOATaEESyiWU7noskfKcfNq5exbNrdpyqThHyRuMNjb61uHnlU4pJl1KK5bPNc2sE7EnOWMShj82BqRVjWyZdM0KbqPZGgO+d0lf8Aoy1HoyUpSgUpSgUpSgUpSgVXt8pwpft07S9t0+OElJH5g1Iqup5eEZAQRz6gpU42OImzv/MPrQaUSM+tWETAoR2I69AcHP55qhxnHLbvpsMzc0ns7Ss2feLyu2f0qfz/APbduzEpyiIEkbjCKM4+VVv2iXHtGq2IJVmj0+3QlRgE8mSfzqtKmkajaXGlqtzDDc3ccZZFktu1d/MEgg4x6+e1WrfR9DsVa5WSGU3jnso54WQBVD8yqcFRk8p6nAB3rmOEjLc2ZtbJGN6ctEYwAcg5Iz54J67bV0800UFjblobmY3aHktYlIM6ZYrzAZA2Hic4yCGGK57er2e9Spm1tl0tWtm5RZW4b2UHvc5L8hx+IMowcbrsehNal3apaWWse2XsEZubogorYD8yqvKcb5X3gPTfFcTrOoXI1BYkkjhZysjXEIJkBx0yDlcbjAx03roNLvpZXLS3eoX9uG+8D2RKy56hmG7bf3h08utZ7ZmNus5K1tGPfES6C2MF3Ck0DPc3CwmG3BJSJwCoK5CnbKryg4zvk1ivtN7WV4ruSWTtATMjzdtyDONmU9AXbxOD8K1dQ03V53kW3fVILcRt24i7kUSoOZe6x9B0x8zU7hDX5tQgFq9tJNf2qk2z2q5cj3jlTsQOXOOm5qdsxGyclb2mk/P/AH4dPY2Nnptm6RWyQ2ckeXcy5Ktg4bCncHBGfM+IzXEcHhdV4m1KAMkYvrG5jRnPunkyvz7uPnXSa1ewTaLNcm2Z2MMoSbmPZybtg4HQjIwT1AxXE8FTOnFWnBZDDI7tEH6Y51K/1rVeZ25ZfdpFYVtchhgNnDGqIj291B3TsSsjL4/wiuL00M87RqMl42GPkT/Su106N7y34W7clg1xcxNzdTl1Jyf5jXEt/Z9QcKfddlz9RXSHllZl+94QtjnPYX0i/ASRof1Q/nUeq8f+x83/ABCP/RepFGSlKUClKUClKUClKUCq1wccI2YH4764J+UcQH+Y1JqrdbcJ6ef/AFtz/pwUGmzq+sSyLl0QMRzHJIC4HSt3jK37OfTLhAOzurCGVcNzdAUPzyp2rWtIjDrNxEwbKpKDjOfcPlVS/hm1DgHT7nvSfZsrwkhfcidsjJ/jz/io08cCXEkN9L2KSGVQHjaLJdG6bAe9kHHL412Ou3EDSXT2k4Fy1oLm0RUK9ieUBjGVx3ioyc97unIzXzTRb86dqEU/LzoGHOv95cjIB8D613es6xJdaDcTXKrIttMgiePuGTnWUCXJyd+pA2J5sgZzWLRy9mG0TXn0aHCOgSzvaapIUmhkfLPk86SA9G6+GDkjffyNfarzhdrjTrZtHvZ7B5B30t3KKzYBYDGx8s4PU/Cvi37NuL10OZ9P1Aj7NuWHO7Z+7O3ex49PzNfZuHeJ+H7eHsDfxzSLzFkLj7xubPP16HGetbeR707SLixseS+uZbw55QlxJzqM+DeB2HjXyqOWzTjy4lS0lhjWcIvJlY3WNT2hwo65KkY6b19nk13Sra1E0FzCrqOZT3W5hnxJHj1PQ7V8Nvrqwm4mttL0GYS2zieN5J2LIDKcnBG+BgVm3iXTDMRkjbc/aHdSjh62hmitUklkSXntWYq5w5bJIGfeXbwxXJcLW9xfcR6bDYnF20qmNsjukb538sVtcd6u2qawCzsVUFivMSAzHJIyBjNZf2eLLbX11rCRNImnwMdjg8zgqoHrvUrHDWbi2l3h+C41G54dgtomWI6pdFXxsEHZs243wACfnXzy+5ZNWuDH7hlYrjyya+jcKzxWOtWlqs4eZFFnGVIKq8hJuJQemAMqD44r53ZvG2pl3BEZ52wBnGxxW4cFSP8A2Qm/4hH/AKL1Hqund4QYMPf1BeU/wwnP+YVIoyUpSgUpSgUpSgUpSgVYGJeD3H4oNQUn4SREfrHUerHDxM8Wpad19rtiyD/eRfeL9Qrr/NQa1pKkOvWs0rckMgXmbyDLyt+ear8G6lFpGs3OmamgfTroPa3II35SMAj1Bww9RXOXAEtijg5aJuX+U7j88/WqEskF7ZxyBJEkgjRe3Azhx4N6Hwbw6b0aaWu6XLo+r3NjOys0LYDr7rqd1YehBB+dV+HFutT0XVdLieM4jFxGsjb5QklV9SM/Styzs5OJrKGwkeKPUrSMLaF2AEsZJPZlvjnlJ6EkHbGIFpcXvDusuWieG7h54pIpAQRkFWBHzp5WJ0mk9wDFfmCMHp5Gv3qnjtV/QbrSuxK6pbFmjGUK47xGdm9MVUQnaQZjkZgAclSfGq/CxNvNd34laI2lu7KVOCWYcgGfmT6gGp99Kt3fyPEuEJwuBjbw2r9SWaG2mtlK9lMylsdW5c4Hw3/SpKxOp3D1YWlxqV5Da2kTz3U7hEjXcsa7m9ay03RE4Z+0YoYY5vadRuIxzGWXGBGgHXlHTwzvtWLSIo+H+Hry9jRftFWVJZTJg4cHlhjx5+852IAA2zvOv9Nht9bMVzCyQabbRm7ZSMmUgE59SzYx6VB1+ladpum8K6jxFa27RLbxMsEtwxaaV2HIp2wqDfpgk+dfKtPGDPLkjkiIB9W7oH5n6VX4h4lfUZbyG0RoNOmZSkDMTy4Oc+WTtn4VKQdnp6kghpHLjPioGP1J+lVJVbzMPC+mREYM9xPcdOqgJGPzV6j1X4o+61JbIYC2MKWwH7wGX+rs5qRRkpSlApSlApSlApSlArPY3Utle291bnE0Eiyp/EpyP0rBSgraxbw2+rXCLiOxugJYSveCxv3kPrjofgRU2CabTLp1whyMHxDKR4HyIP51W0q4XULRdHvZEVS2bOd9uwkJ90n/AMtz18AcN/ezOnhc89pdfc3EDFFEnd5SCeZCfDf6HPnRYbfaG0yUZVMYW4ijbfKn3kz47fpXZ8baU2p6Lpl+cyzXEAazuMZMgVd4H23cAEqfEbdTivnEtrcxDnIDCPqUcPyj1wTgb1Yl4v1SXTLexeXMNvIksONijKSRj60VBwUGGHhkfOv1YzISEUknoBuazzmW8f2l0HKzhDy4AzjYem1YJmw/KmQEJC56gZ/WgzWUsUZYSBtwcFTv02/PFb/Dk5g1iK4SNZblG5oIygdWlJATIPhk5+VRlyWx57Vf4QMCavFM5y8BaVRnGSqMwP1AoLn7Q7qHT9Yt9DjkllTTHLXMjPkz3LYMr+ODnC+PSuV1bV7nULy+mdgq3coldEGFyM4+ma1VWW+uZXlly5DSPI+T6mtiNYbYc0bmWboGK4VPUZ3J+W1Db1BF2McUaQiS7lboV5iufdUDzP8A9VZ9jTSL4z67NFLeQN3bFHEjF16LKR3UUEbrnm2xgdR+JGOHuW4uiza0y88UBH/hSw2kkz+PByq+GQxP4Tz9EZLiaS4uJZ52LyysXdj4sTkn6msdKUQpSlApSlApSlApSlAqu+q294kY1ax7eZAF9pgl7KV1AwA2QyscY72M+ZNSKUFoWWn3DB9K1P2aTG8N+eyYfCRcoR8eX4VjvrW7s7qC21AW4WYCVZI7KRXVsgMHXOR18diPDFSar211aXmnQ2GpO8DwFvZ7pU5wqsclHUb8vNkgjcEnY52CC0ckcrRMjCQHlKkb5+FbsMJs0MkuVuGH3a+K+bHyPkPnVhbLljCLxHpwiG4HazD8uzz8q8RRaDa7Xlxe6g77E2iiFY+vezICXPjjCg+dF2i6iPv1nC4SUBthtzfiH1zWO0iuXdmtI5XZRuY1JIB28Kvx6VKyn7M1LT7qFz7kk6QuT6xykb/DI9aSaXMojTVNRsLSBcHkSZZWGfERxZ3+OPjVNpEcTWsEna4WSVQoXO4XIJJ8ugFXbi8fQrTTobCGGDUGtxcT3XIGmUyElApOeTCch7uD3jvWtFNotj95BFdahcKcoLlFihHqyAszfDIHn5VLu7iW7uZbi5cyTSsXdj4k1EeHdpHZ3Ys7EksxyST4k15pSgUpSgUpSgUpSgUpSgUpSg//2Q==\">\n  <link rel=\"manifest\" href=\"/manifest.json\">\n  <link rel=\"preconnect\" href=\"https://fonts.googleapis.com\">\n  <link rel=\"preconnect\" href=\"https://fonts.gstatic.com\" crossorigin>\n  <link rel=\"stylesheet\" href=\"https://fonts.googleapis.com/css2?family=JetBrains+Mono:wght@300;400;500;600;700&display=swap\">\n  <title>Vessel Dashboard</title>\n  <style>\n    \n/* --- 01-design-system.css --- */\n/* Font caricato via <link> in index.html con preconnect + font-display:swap */\n\n/* ═══════════════════════════════════════════\n   VESSEL DASHBOARD — Design System v4\n   Theme Engine + Flexbox + Mobile-first\n   ═══════════════════════════════════════════ */\n\n:root {\n  /* ── Theme: Terminal Green (default) ── */\n  --bg: #020502;\n  --bg2: #081208;\n  --card: #0a1a0a;\n  --card2: #0f220f;\n  --border: #162816;\n  --border2: #1e3a1e;\n\n  --accent: #00ff41;\n  --accent2: #00dd38;\n  --accent3: #00aa2a;\n  --accent-dim: #002a0e;\n\n  --glow-sm: 0 0 4px rgba(0,255,65,0.4);\n  --glow-md: 0 0 8px rgba(0,255,65,0.3), 0 0 20px rgba(0,255,65,0.12);\n  --glow-text: 0 0 6px rgba(0,255,65,0.5), 0 0 14px rgba(0,255,65,0.2);\n\n  --amber: #ffb000;\n  --red: #ff3333;\n  --red-dim: #3a0808;\n  --cyan: #00ffcc;\n\n  --text: #c8ffc8;\n  --text2: #7ab87a;\n  --muted: #3d6b3d;\n\n  --btn-hover: #004422;\n\n  --font: 'JetBrains Mono', 'Fira Code', monospace;\n\n  --safe-top: env(safe-area-inset-top, 0px);\n  --safe-bot: env(safe-area-inset-bottom, 0px);\n}\n\n/* ── Theme: Amber CRT ── */\n[data-theme=\"amber\"] {\n  --bg: #050300;\n  --bg2: #0f0a04;\n  --card: #1a1008;\n  --card2: #22160a;\n  --border: #2e2010;\n  --border2: #3e2e18;\n\n  --accent: #ffb000;\n  --accent2: #dd9800;\n  --accent3: #aa7400;\n  --accent-dim: #2a1a00;\n\n  --glow-sm: 0 0 4px rgba(255,176,0,0.4);\n  --glow-md: 0 0 8px rgba(255,176,0,0.3), 0 0 20px rgba(255,176,0,0.12);\n  --glow-text: 0 0 6px rgba(255,176,0,0.5), 0 0 14px rgba(255,176,0,0.2);\n\n  --amber: #ff8800;\n  --cyan: #ffcc44;\n\n  --text: #ffe0a0;\n  --text2: #b89860;\n  --muted: #6b5530;\n\n  --btn-hover: #442200;\n}\n\n/* ── Theme: Cyan Ice ── */\n[data-theme=\"cyan\"] {\n  --bg: #000305;\n  --bg2: #040a10;\n  --card: #081420;\n  --card2: #0c1c2a;\n  --border: #102838;\n  --border2: #183a4e;\n\n  --accent: #00ffcc;\n  --accent2: #00ddaa;\n  --accent3: #00aa88;\n  --accent-dim: #002a22;\n\n  --glow-sm: 0 0 4px rgba(0,255,204,0.4);\n  --glow-md: 0 0 8px rgba(0,255,204,0.3), 0 0 20px rgba(0,255,204,0.12);\n  --glow-text: 0 0 6px rgba(0,255,204,0.5), 0 0 14px rgba(0,255,204,0.2);\n\n  --amber: #44aaff;\n  --cyan: #00ff88;\n\n  --text: #c0f0f0;\n  --text2: #6aa8a8;\n  --muted: #305858;\n\n  --btn-hover: #003344;\n}\n\n/* ── Theme: Red Alert ── */\n[data-theme=\"red\"] {\n  --bg: #050000;\n  --bg2: #100404;\n  --card: #1a0808;\n  --card2: #220c0c;\n  --border: #2e1414;\n  --border2: #3e1e1e;\n\n  --accent: #ff3333;\n  --accent2: #dd2828;\n  --accent3: #aa1e1e;\n  --accent-dim: #2a0808;\n\n  --glow-sm: 0 0 4px rgba(255,51,51,0.4);\n  --glow-md: 0 0 8px rgba(255,51,51,0.3), 0 0 20px rgba(255,51,51,0.12);\n  --glow-text: 0 0 6px rgba(255,51,51,0.5), 0 0 14px rgba(255,51,51,0.2);\n\n  --amber: #ff8844;\n  --red: #ff5555;\n  --red-dim: #3a0808;\n  --cyan: #ff6688;\n\n  --text: #ffc8c8;\n  --text2: #b87a7a;\n  --muted: #6b3d3d;\n\n  --btn-hover: #440000;\n}\n\n/* ── Theme: Sigil Violet ── */\n[data-theme=\"sigil\"] {\n  --bg: #050208;\n  --bg2: #0a0614;\n  --card: #120820;\n  --card2: #180c2a;\n  --border: #251440;\n  --border2: #351e58;\n\n  --accent: #b44dff;\n  --accent2: #9b3de0;\n  --accent3: #6a2d9e;\n  --accent-dim: #1a0a2a;\n\n  --glow-sm: 0 0 4px rgba(180,77,255,0.4);\n  --glow-md: 0 0 8px rgba(180,77,255,0.3), 0 0 20px rgba(180,77,255,0.12);\n  --glow-text: 0 0 6px rgba(180,77,255,0.5), 0 0 14px rgba(180,77,255,0.2);\n\n  --amber: #e0a0ff;\n  --red: #ff0040;\n  --red-dim: #2a0018;\n  --cyan: #8866ff;\n\n  --text: #e0d0f0;\n  --text2: #9878b8;\n  --muted: #5a3878;\n\n  --btn-hover: #2a1048;\n}\n\n/* ── Theme: Ghost White ── */\n[data-theme=\"ghost\"] {\n  --bg: #020202;\n  --bg2: #0a0a0a;\n  --card: #111111;\n  --card2: #1a1a1a;\n  --border: #252525;\n  --border2: #333333;\n\n  --accent: #e0e0e0;\n  --accent2: #bbbbbb;\n  --accent3: #888888;\n  --accent-dim: #1a1a1a;\n\n  --glow-sm: 0 0 4px rgba(224,224,224,0.3);\n  --glow-md: 0 0 8px rgba(224,224,224,0.2), 0 0 20px rgba(224,224,224,0.08);\n  --glow-text: 0 0 6px rgba(224,224,224,0.4), 0 0 14px rgba(224,224,224,0.15);\n\n  --amber: #aa9966;\n  --red: #cc4444;\n  --red-dim: #2a0808;\n  --cyan: #99bbcc;\n\n  --text: #d0d0d0;\n  --text2: #888888;\n  --muted: #555555;\n\n  --btn-hover: #2a2a2a;\n}\n\n* { box-sizing: border-box; margin: 0; padding: 0; -webkit-tap-highlight-color: transparent; }\n\nhtml, body {\n  height: 100%;\n  overscroll-behavior: none;\n  -webkit-overflow-scrolling: touch;\n  overflow: hidden;\n  position: fixed;\n  width: 100%;\n}\n\nbody {\n  background: var(--bg);\n  color: var(--text);\n  font-family: var(--font);\n  font-size: 13px;\n}\n\n/* Scan-line CRT sottile */\nbody::after {\n  content: '';\n  position: fixed;\n  inset: 0;\n  pointer-events: none;\n  background: repeating-linear-gradient(0deg, transparent 0px, transparent 2px, rgba(0,0,0,0.04) 2px, rgba(0,0,0,0.04) 4px);\n  z-index: 9999;\n}\n\n/* --- 02-layout.css --- */\n/* ── App Layout ── */\n.app-layout {\n  display: flex;\n  flex-direction: column;\n  height: 100dvh;\n  overflow: hidden;\n}\n\n.app-content {\n  flex: 1;\n  display: flex;\n  flex-direction: column;\n  min-height: 0;\n  overflow: hidden;\n}\n\n/* ── Tab Views ── */\n.tab-view {\n  display: none;\n  flex-direction: column;\n  flex: 1;\n  min-height: 0;\n  overflow: hidden;\n}\n\n.tab-view.active {\n  display: flex;\n}\n\n.tab-scroll {\n  flex: 1;\n  overflow-y: auto;\n  overflow-x: hidden;\n  -webkit-overflow-scrolling: touch;\n  padding: 0 14px;\n  padding-top: 10px;\n  padding-bottom: 12px;\n}\n\n/* ── Bottom Nav ── */\n.bottom-nav {\n  display: flex;\n  background: var(--card);\n  border-top: 1px solid var(--border2);\n  padding-bottom: var(--safe-bot);\n  flex-shrink: 0;\n}\n\n.nav-item {\n  flex: 1;\n  display: flex;\n  flex-direction: column;\n  align-items: center;\n  gap: 2px;\n  padding: 10px 0 8px;\n  background: none;\n  border: none;\n  color: var(--muted);\n  font-family: var(--font);\n  font-size: 9px;\n  cursor: pointer;\n  transition: color .15s;\n  min-height: 0;\n  letter-spacing: 0.5px;\n}\n\n.nav-item .nav-icon {\n  font-size: 24px;\n  line-height: 1;\n  transition: text-shadow .2s;\n}\n\n.nav-item.active {\n  color: var(--accent);\n  background: linear-gradient(180deg, rgba(var(--accent-rgb, 0,255,65), 0.06) 0%, transparent 100%);\n  box-shadow: inset 0 2px 0 var(--accent);\n}\n\n.nav-item.active .nav-icon {\n  text-shadow: var(--glow-text);\n}\n\n/* --- 03-dashboard.css --- */\n/* ══════════════════════════════\n   DASHBOARD TAB\n   ══════════════════════════════ */\n\n.app-header {\n  display: flex;\n  align-items: center;\n  gap: 8px;\n  padding: 6px 14px 10px;\n  padding-top: calc(6px + var(--safe-top));\n  flex-shrink: 0;\n}\n\n.logo-icon {\n  width: 26px;\n  height: 26px;\n  border-radius: 50%;\n  object-fit: cover;\n  border: 1px solid var(--accent3);\n  filter: drop-shadow(0 0 8px var(--accent3));\n}\n\n.dash-title {\n  font-weight: 700;\n  color: var(--accent);\n  letter-spacing: 2px;\n  font-size: 16px;\n  text-shadow: var(--glow-text);\n}\n\n.dash-spacer { flex: 1; }\n\n.dash-temp {\n  color: var(--amber);\n  font-size: 12px;\n  text-shadow: 0 0 6px rgba(255,176,0,0.4);\n}\n\n.dash-clock {\n  font-size: 12px;\n  color: var(--amber);\n  text-shadow: 0 0 6px rgba(255,176,0,0.4);\n  letter-spacing: 1px;\n  white-space: nowrap;\n}\n\n.dash-weather {\n  font-size: 11px;\n  color: var(--text2);\n  white-space: nowrap;\n  overflow: hidden;\n  text-overflow: ellipsis;\n  max-width: 120px;\n}\n\n.btn-sys-gear {\n  background: none;\n  border: 1px solid var(--border);\n  border-radius: 6px;\n  color: var(--muted);\n  font-size: 16px;\n  padding: 2px 6px;\n  cursor: pointer;\n  font-family: var(--font);\n  transition: all .15s;\n  min-height: 28px;\n  min-width: 28px;\n  display: flex;\n  align-items: center;\n  justify-content: center;\n  flex-shrink: 0;\n}\n.btn-sys-gear:hover,\n.btn-sys-gear:active {\n  color: var(--accent);\n  border-color: var(--accent3);\n}\n\n.dash-sep {\n  color: var(--muted);\n  font-size: 10px;\n  opacity: 0.5;\n  margin: 0 2px;\n}\n\n/* Health dot */\n.health-dot {\n  width: 10px;\n  height: 10px;\n  border-radius: 50%;\n  background: var(--muted);\n  transition: all .5s;\n  flex-shrink: 0;\n}\n.health-dot.green { background: var(--accent); box-shadow: var(--glow-sm); }\n.health-dot.yellow { background: var(--amber); box-shadow: 0 0 8px var(--amber); }\n.health-dot.red { background: var(--red); box-shadow: 0 0 8px var(--red); animation: pulse 1s infinite; }\n.health-dot-btn {\n  cursor: pointer;\n  transition: all .15s, background .5s;\n}\n.health-dot-btn:hover { transform: scale(1.4); }\n\n/* ── Sigil Header Canvas ── */\n.sigil-header-canvas {\n  width: 40px;\n  height: 16px;\n  display: block;\n  cursor: pointer;\n}\n\n.sigil-indicator {\n  cursor: pointer;\n}\n\n/* ── Sigil Widget ── */\n.sigil-widget {\n  background: var(--card);\n  border: 1px solid var(--border2);\n  border-radius: 10px;\n  padding: 14px 16px;\n  margin-bottom: 14px;\n  position: relative;\n  overflow: visible;\n}\n\n.sigil-widget::before {\n  content: '';\n  position: absolute;\n  top: 0; left: 0; right: 0;\n  height: 2px;\n  background: linear-gradient(90deg, transparent, #6a2d9e, #b44dff, #6a2d9e, transparent);\n}\n\n.sigil-widget-header {\n  display: flex;\n  justify-content: space-between;\n  align-items: center;\n  margin-bottom: 10px;\n}\n\n.sigil-widget-title {\n  font-size: 10px;\n  font-weight: 700;\n  color: #b44dff;\n  letter-spacing: 1.5px;\n  text-shadow: 0 0 8px rgba(180,77,255,0.4);\n}\n\n.sigil-widget-status {\n  font-size: 10px;\n  color: var(--muted);\n  display: flex;\n  align-items: center;\n  gap: 5px;\n}\n\n.sigil-online-dot {\n  width: 6px; height: 6px;\n  border-radius: 50%;\n  background: var(--accent);\n  box-shadow: 0 0 6px var(--accent);\n  display: inline-block;\n}\n\n.sigil-mood-sep { opacity: 0.4; }\n\n.sigil-canvas-wrap {\n  position: relative;\n  width: 100%;\n  aspect-ratio: 320 / 170;\n  border-radius: 6px;\n  overflow: hidden;\n  background: #050208;\n  margin-bottom: 10px;\n  cursor: pointer;\n}\n\n.sigil-widget-canvas {\n  width: 100%;\n  height: 100%;\n  display: block;\n  image-rendering: pixelated;\n  image-rendering: crisp-edges;\n}\n\n.sigil-wake-label {\n  position: absolute;\n  bottom: 12px;\n  left: 50%;\n  transform: translateX(-50%);\n  font-size: 9px;\n  color: var(--muted);\n  letter-spacing: 1.5px;\n  text-transform: uppercase;\n  pointer-events: none;\n  animation: sigilPulse 3s ease-in-out infinite;\n}\n@keyframes sigilPulse {\n  0%,100% { opacity: 0.4; }\n  50% { opacity: 0.8; }\n}\n\n.sigil-commands {\n  display: none;\n  gap: 6px;\n  flex-wrap: wrap;\n  margin-bottom: 8px;\n}\n\n.btn-sigil-term {\n  flex: 1 1 auto;\n  min-width: 44px;\n  min-height: 28px;\n  padding: 3px 6px;\n  font-family: var(--font);\n  font-size: 9px;\n  font-weight: 600;\n  letter-spacing: 1px;\n  color: var(--muted);\n  background: transparent;\n  border: 1px solid var(--border);\n  border-radius: 4px;\n  cursor: pointer;\n  transition: all .15s;\n  text-transform: uppercase;\n}\n.btn-sigil-term:hover,\n.btn-sigil-term:active {\n  color: var(--accent);\n  border-color: var(--accent3);\n  text-shadow: var(--glow-sm);\n}\n.btn-sigil-term.sigil-active {\n  color: var(--accent);\n  border-color: var(--accent3);\n  background: var(--accent-dim);\n  text-shadow: var(--glow-sm);\n}\n\n.sigil-debug-toggle {\n  display: none;\n  justify-content: flex-end;\n  margin-bottom: 4px;\n}\n.sigil-debug-toggle .btn-ghost { min-width: 28px; min-height: 24px; font-size: 14px; padding: 2px; }\n\n.sigil-text-row {\n  display: none;\n  gap: 6px;\n  margin-bottom: 8px;\n}\n\n.sigil-text-input {\n  flex: 1;\n  font-family: var(--font);\n  font-size: 11px;\n  background: var(--bg2);\n  color: var(--text);\n  border: 1px solid var(--border);\n  border-radius: 6px;\n  padding: 6px 10px;\n  outline: none;\n}\n.sigil-text-input:focus { border-color: #6a2d9e; }\n.sigil-text-input::placeholder { color: var(--muted); }\n\n.btn-sigil-send {\n  min-width: 36px;\n  min-height: 32px;\n  font-size: 14px;\n  background: var(--bg2);\n  color: #b44dff;\n  border: 1px solid #6a2d9e;\n  border-radius: 6px;\n  cursor: pointer;\n  font-family: var(--font);\n  transition: all .15s;\n}\n.btn-sigil-send:active { background: #1a0a2a; }\n\n.sigil-actions {\n  display: flex;\n  gap: 6px;\n}\n\n/* ── Stats Cards 2x2 ── */\n.dash-stats {\n  display: flex;\n  flex-wrap: wrap;\n  gap: 10px;\n  margin-bottom: 14px;\n}\n\n.stat-card {\n  flex: 1 1 calc(50% - 5px);\n  min-width: 0;\n  background: var(--card);\n  border: 1px solid var(--border2);\n  border-radius: 10px;\n  padding: 14px 16px;\n  position: relative;\n  overflow: hidden;\n}\n\n.stat-card::before {\n  content: '';\n  position: absolute;\n  top: 0; left: 0; right: 0;\n  height: 2px;\n  background: linear-gradient(90deg, transparent, var(--accent3), transparent);\n}\n\n.stat-icon {\n  font-size: 14px;\n  color: var(--muted);\n  margin-bottom: 4px;\n}\n\n.stat-label {\n  font-size: 10px;\n  color: var(--muted);\n  text-transform: uppercase;\n  letter-spacing: 1.5px;\n  margin-bottom: 6px;\n}\n\n.stat-value {\n  font-size: 22px;\n  font-weight: 700;\n  color: var(--accent);\n  text-shadow: var(--glow-text);\n  line-height: 1.2;\n}\n\n.stat-sub {\n  font-size: 9px;\n  color: var(--text2);\n  margin-top: 2px;\n}\n\n.stat-bar {\n  margin-top: 10px;\n  height: 4px;\n  background: var(--bg2);\n  border-radius: 2px;\n  overflow: hidden;\n}\n\n.stat-bar-fill {\n  height: 100%;\n  background: var(--accent);\n  border-radius: 2px;\n  transition: width .5s ease;\n  width: 0%;\n  box-shadow: var(--glow-sm);\n}\n\n.stat-bar-fill.stat-bar-cyan { background: var(--cyan); box-shadow: 0 0 4px rgba(0,255,204,0.4); }\n.stat-bar-fill.stat-bar-amber { background: var(--amber); box-shadow: 0 0 4px rgba(255,176,0,0.4); }\n\n/* ── Chart ── */\n.dash-chart {\n  background: var(--card);\n  border: 1px solid var(--border2);\n  border-radius: 10px;\n  padding: 14px 16px;\n  margin-bottom: 14px;\n}\n\n.chart-header {\n  display: flex;\n  justify-content: space-between;\n  align-items: center;\n  margin-bottom: 8px;\n}\n\n.chart-label {\n  font-size: 10px;\n  color: var(--muted);\n  text-transform: uppercase;\n  letter-spacing: 1px;\n}\n\n.chart-legend {\n  display: flex;\n  gap: 12px;\n}\n\n.chart-legend > span {\n  font-size: 10px;\n  display: flex;\n  align-items: center;\n  gap: 4px;\n  color: var(--text2);\n}\n\n.dot-cpu { width: 6px; height: 6px; border-radius: 50%; background: var(--accent); box-shadow: var(--glow-sm); }\n.dot-temp { width: 6px; height: 6px; border-radius: 50%; background: var(--amber); }\n\n.chart-scale {\n  font-size: 9px;\n  color: var(--muted);\n  letter-spacing: 0.04em;\n  opacity: 0.8;\n  margin-left: auto;\n}\n\n#pi-chart {\n  width: 100%;\n  height: 60px;\n  display: block;\n}\n\n/* ── Widget Cards 2x2 ── */\n.dash-widgets {\n  display: flex;\n  flex-wrap: wrap;\n  gap: 10px;\n}\n\n.widget-card {\n  flex: 1 1 calc(50% - 5px);\n  min-width: 0;\n  background: var(--card);\n  border: 1px solid var(--border2);\n  border-radius: 10px;\n  padding: 14px 16px;\n  cursor: pointer;\n  transition: border-color .2s, box-shadow .2s;\n  position: relative;\n  overflow: hidden;\n}\n\n.widget-card::before {\n  content: '';\n  position: absolute;\n  top: 0; left: 0; right: 0;\n  height: 2px;\n  background: linear-gradient(90deg, transparent, var(--accent3), transparent);\n  opacity: 0;\n  transition: opacity .2s;\n}\n\n.widget-card:hover::before,\n.widget-card:active::before { opacity: 1; }\n\n.widget-card:hover,\n.widget-card:active {\n  border-color: var(--accent3);\n  box-shadow: var(--glow-md);\n}\n\n.wc-header {\n  display: flex;\n  justify-content: space-between;\n  align-items: center;\n  margin-bottom: 8px;\n}\n\n.wc-label {\n  font-size: 10px;\n  color: var(--accent2);\n  text-transform: uppercase;\n  letter-spacing: 1.5px;\n  font-weight: 600;\n}\n\n.wc-icon {\n  font-size: 16px;\n  color: var(--muted);\n}\n\n.wc-chevron {\n  font-size: 18px;\n  color: var(--text2);\n  opacity: 0.6;\n  transition: opacity .15s, color .15s;\n  line-height: 1;\n}\n.widget-card:hover .wc-chevron,\n.widget-card:active .wc-chevron {\n  color: var(--accent);\n  opacity: 1;\n}\n\n.wc-body {\n  font-size: 11px;\n  color: var(--text2);\n  line-height: 1.4;\n  overflow: hidden;\n  text-overflow: ellipsis;\n  display: -webkit-box;\n  -webkit-line-clamp: 4;\n  -webkit-box-orient: vertical;\n}\n\n\n/* --- 04-code.css --- */\n/* ══════════════════════════════\n   CODE TAB\n   ══════════════════════════════ */\n\n#tab-code {\n  display: none;\n  flex-direction: column;\n}\n#tab-code.active { display: flex; }\n\n/* Code panel */\n.code-panel {\n  display: flex;\n  flex-direction: column;\n  flex: 1;\n  min-height: 0;\n}\n\n/* Chat */\n#chat-messages {\n  flex: 1;\n  overflow-y: auto;\n  padding: 12px 14px;\n  display: flex;\n  flex-direction: column;\n  gap: 8px;\n  scroll-behavior: smooth;\n  -webkit-overflow-scrolling: touch;\n  min-height: 0;\n}\n\n.msg {\n  max-width: 85%;\n  padding: 10px 14px;\n  border-radius: 8px;\n  line-height: 1.5;\n  font-size: 12px;\n}\n\n.msg-user {\n  align-self: flex-end;\n  background: var(--accent-dim);\n  color: var(--accent);\n  border: 1px solid var(--accent3);\n}\n\n.msg-bot {\n  align-self: flex-start;\n  background: var(--card2);\n  border: 1px solid var(--border);\n  color: var(--text2);\n  white-space: pre-wrap;\n}\n\n.copy-wrap { position: relative; }\n.copy-btn {\n  position: absolute; top: 4px; right: 4px;\n  background: var(--card2); border: 1px solid var(--border); border-radius: 3px;\n  color: var(--muted); font-size: 12px; cursor: pointer; padding: 2px 6px;\n  opacity: 0; transition: opacity .15s; z-index: 2; min-height: 0; font-family: var(--font);\n}\n.copy-btn:hover { color: var(--accent2); border-color: var(--accent3); }\n.copy-wrap:hover .copy-btn { opacity: 1; }\n@media (hover: none) { .copy-btn { opacity: 0.5; } }\n\n.msg-thinking {\n  align-self: flex-start;\n  color: var(--muted);\n  font-style: italic;\n  font-size: 11px;\n  display: flex;\n  align-items: center;\n  gap: 6px;\n}\n\n.dots span { animation: blink 1.2s infinite; display: inline-block; color: var(--accent); }\n.dots span:nth-child(2) { animation-delay: .2s; }\n.dots span:nth-child(3) { animation-delay: .4s; }\n\n/* Chat welcome state */\n.chat-welcome {\n  display: flex;\n  flex-direction: column;\n  align-items: center;\n  justify-content: center;\n  flex: 1;\n  gap: 12px;\n  padding: 40px 20px;\n  text-align: center;\n  min-height: 200px;\n}\n.chat-welcome-sigil {\n  font-size: 36px;\n  color: var(--accent3);\n  text-shadow: var(--glow-text);\n  animation: sigilPulse 3s ease-in-out infinite;\n}\n.chat-welcome-text {\n  font-size: 13px;\n  color: var(--text2);\n  line-height: 1.5;\n}\n.chat-welcome-hint {\n  font-size: 10px;\n  color: var(--muted);\n  letter-spacing: 0.8px;\n  text-transform: uppercase;\n  opacity: 0.6;\n}\n\n/* Code input */\n.code-input-area {\n  padding: 10px 14px;\n  padding-bottom: calc(10px + var(--safe-bot));\n  border-top: 1px solid var(--border);\n  background: var(--card);\n  flex-shrink: 0;\n}\n\n.code-input-row {\n  display: flex;\n  gap: 8px;\n  align-items: stretch;\n}\n\n#chat-input {\n  flex: 1;\n  background: var(--bg2);\n  border: 1px solid var(--border2);\n  border-radius: 8px;\n  color: var(--accent);\n  padding: 10px 14px;\n  min-height: 40px;\n  max-height: 120px;\n  font-family: var(--font);\n  font-size: 16px;\n  outline: none;\n  caret-color: var(--accent);\n  -webkit-appearance: none;\n  appearance: none;\n  overflow-y: auto;\n  resize: none;\n  line-height: 1.4;\n}\n\n#chat-input::placeholder { color: var(--muted); font-size: 13px; }\n#chat-input:focus { border-color: var(--accent3); box-shadow: var(--glow-md); }\n\n.btn-send {\n  background: var(--accent-dim);\n  border: 1px solid var(--accent3);\n  border-radius: 8px;\n  color: var(--accent);\n  font-family: var(--font);\n  font-size: 18px;\n  font-weight: 700;\n  cursor: pointer;\n  padding: 0 16px;\n  min-height: 40px;\n  min-width: 48px;\n  transition: all .15s;\n  text-shadow: var(--glow-text);\n}\n.btn-send:hover { background: var(--btn-hover); }\n.btn-send:disabled { opacity: 0.4; cursor: default; }\n\n.code-input-meta {\n  display: flex;\n  gap: 6px;\n  margin-top: 6px;\n}\n\n.btn-icon {\n  background: none;\n  border: 1px solid var(--border2);\n  border-radius: 6px;\n  color: var(--text2);\n  font-size: 14px;\n  cursor: pointer;\n  padding: 4px 8px;\n  min-height: 28px;\n  font-family: var(--font);\n  transition: all .15s;\n}\n.btn-icon:hover { border-color: var(--accent3); color: var(--accent2); }\n\n/* Provider dropdown */\n.provider-dropdown { position: relative; flex-shrink: 0; }\n\n.provider-btn {\n  display: flex;\n  align-items: center;\n  gap: 5px;\n  padding: 8px 10px;\n  min-height: 40px;\n  background: var(--card2);\n  border: 1px solid var(--border2);\n  border-radius: 8px;\n  color: var(--text2);\n  font-family: var(--font);\n  font-size: 11px;\n  font-weight: 600;\n  cursor: pointer;\n  white-space: nowrap;\n  transition: border-color .15s;\n}\n.provider-btn:hover { border-color: var(--accent3); }\n\n.provider-dot { width: 7px; height: 7px; border-radius: 50%; flex-shrink: 0; }\n.provider-arrow { font-size: 10px; color: var(--muted); transition: transform .15s; }\n.provider-dropdown.open .provider-arrow { transform: rotate(180deg); }\n\n.provider-menu {\n  position: absolute;\n  bottom: 100%;\n  left: 0;\n  margin-bottom: 4px;\n  min-width: 200px;\n  background: var(--card);\n  border: 1px solid var(--border2);\n  border-radius: 8px;\n  overflow: hidden;\n  box-shadow: 0 -4px 20px rgba(0,0,0,0.5);\n  display: none;\n  z-index: 50;\n}\n.provider-dropdown.open .provider-menu { display: block; }\n\n.provider-menu button {\n  display: flex;\n  align-items: center;\n  gap: 8px;\n  width: 100%;\n  padding: 10px 14px;\n  min-height: 40px;\n  background: none;\n  border: none;\n  border-bottom: 1px solid var(--border);\n  color: var(--text2);\n  font-family: var(--font);\n  font-size: 12px;\n  cursor: pointer;\n  text-align: left;\n}\n.provider-menu button:last-child { border-bottom: none; }\n.provider-menu button:hover { background: var(--accent-dim); color: var(--accent); }\n\n.provider-menu .dot,\n.dot {\n  width: 7px; height: 7px; border-radius: 50%; flex-shrink: 0;\n}\n.dot-auto { background: var(--accent); box-shadow: 0 0 4px var(--accent); }\n.dot-cloud { background: #ffb300; box-shadow: 0 0 4px #ffb300; }\n.dot-local { background: #00ffcc; box-shadow: 0 0 4px #00ffcc; }\n.dot-deepseek { background: #6c5ce7; box-shadow: 0 0 4px #6c5ce7; }\n.dot-pc { background: #ff006e; box-shadow: 0 0 4px #ff006e; }\n.dot-brain { background: #00d4ff; box-shadow: 0 0 6px #00d4ff; }\n\n.agent-badge {\n  display: inline-block;\n  font-size: 10px;\n  padding: 1px 6px;\n  border-radius: 3px;\n  margin-left: 6px;\n  font-family: var(--font);\n  letter-spacing: 0.5px;\n  text-transform: uppercase;\n  opacity: 0.85;\n}\n.agent-badge[data-agent=\"vessel\"]     { color: var(--accent); border: 1px solid var(--accent3); }\n.agent-badge[data-agent=\"coder\"]      { color: #00e5ff; border: 1px solid #00e5ff44; }\n.agent-badge[data-agent=\"sysadmin\"]   { color: #ffab00; border: 1px solid #ffab0044; }\n.agent-badge[data-agent=\"researcher\"] { color: #aa00ff; border: 1px solid #aa00ff44; }\n\n/* --- 05-system.css --- */\n/* ══════════════════════════════\n   SYSTEM TAB\n   ══════════════════════════════ */\n\n.sys-header {\n  display: flex;\n  align-items: center;\n  justify-content: space-between;\n  padding: 6px 0 14px;\n}\n\n.sys-title {\n  font-size: 16px;\n  font-weight: 700;\n  color: var(--accent);\n  letter-spacing: 2px;\n  text-shadow: var(--glow-text);\n}\n\n.version-badge {\n  font-size: 10px;\n  background: var(--accent-dim);\n  border: 1px solid var(--accent3);\n  border-radius: 4px;\n  padding: 2px 8px;\n  color: var(--accent2);\n}\n\n.sys-section {\n  background: var(--card);\n  border: 1px solid var(--border2);\n  border-radius: 10px;\n  padding: 14px 16px;\n  margin-bottom: 12px;\n}\n\n.sys-section-head {\n  display: flex;\n  align-items: center;\n  justify-content: space-between;\n  margin-bottom: 10px;\n}\n\n.sys-section-title {\n  font-size: 10px;\n  color: var(--muted);\n  text-transform: uppercase;\n  letter-spacing: 1.5px;\n  font-weight: 700;\n}\n\n.sys-actions {\n  display: flex;\n  gap: 8px;\n  padding: 8px 0;\n}\n\n/* Sessions */\n.session-list { display: flex; flex-direction: column; gap: 6px; }\n\n.session-item {\n  display: flex;\n  align-items: center;\n  justify-content: space-between;\n  background: var(--card2);\n  border: 1px solid var(--border);\n  border-radius: 6px;\n  padding: 8px 12px;\n}\n\n.session-name {\n  font-size: 12px;\n  display: flex;\n  align-items: center;\n  gap: 8px;\n  color: var(--text);\n}\n\n.session-dot {\n  width: 7px; height: 7px; border-radius: 50%;\n  background: var(--accent); box-shadow: var(--glow-sm);\n  animation: pulse 2s infinite;\n}\n\n/* Pi Info (moved from Profile) */\n.sys-pi-grid { display: flex; flex-direction: column; gap: 4px; }\n.sys-pi-row { display: flex; justify-content: space-between; align-items: center; padding: 4px 0; border-bottom: 1px solid var(--border); font-size: 11px; }\n.sys-pi-row:last-child { border-bottom: none; }\n.sys-pi-label { color: var(--muted); }\n.sys-pi-value { color: var(--accent); font-weight: 600; text-shadow: var(--glow-text); }\n\n/* --- 06-profile.css --- */\n/* ══════════════════════════════\n   PROFILE TAB\n   ══════════════════════════════ */\n\n.prof-section {\n  background: var(--card);\n  border: 1px solid var(--border2);\n  border-radius: 10px;\n  padding: 14px 16px;\n  margin-bottom: 12px;\n}\n\n.prof-section-mem { padding: 14px 0 0; }\n.prof-section-mem .prof-section-title { padding: 0 16px; }\n\n.prof-section-title {\n  font-size: 10px;\n  color: var(--muted);\n  text-transform: uppercase;\n  letter-spacing: 1.5px;\n  font-weight: 700;\n  margin-bottom: 10px;\n}\n\n.prof-grid {\n  display: flex;\n  flex-direction: column;\n  gap: 6px;\n}\n\n.prof-item {\n  display: flex;\n  justify-content: space-between;\n  align-items: center;\n  padding: 6px 0;\n  border-bottom: 1px solid var(--border);\n}\n.prof-item:last-child { border-bottom: none; }\n\n.prof-label { font-size: 11px; color: var(--muted); }\n.prof-value { font-size: 12px; color: var(--accent); font-weight: 600; text-shadow: var(--glow-text); }\n\n.prof-providers { display: flex; flex-direction: column; gap: 6px; }\n\n.prof-prov {\n  display: flex;\n  align-items: center;\n  gap: 10px;\n  padding: 8px 0;\n  border-bottom: 1px solid var(--border);\n}\n.prof-prov:last-child { border-bottom: none; }\n.prof-prov-name { font-size: 12px; color: var(--text); font-weight: 600; }\n.prof-prov-info { font-size: 10px; color: var(--muted); margin-left: auto; }\n\n.prof-btns {\n  display: flex;\n  gap: 6px;\n  margin-top: 8px;\n}\n\n/* Tabs (memoria) */\n.tab-row {\n  display: flex;\n  gap: 4px;\n  padding: 8px 16px;\n  border-bottom: 1px solid var(--border);\n  overflow-x: auto;\n  flex-shrink: 0;\n}\n\n.tab {\n  padding: 5px 10px;\n  border-radius: 4px;\n  font-size: 10px;\n  cursor: pointer;\n  background: transparent;\n  color: var(--muted);\n  border: 1px solid transparent;\n  font-family: var(--font);\n  font-weight: 600;\n  min-height: 28px;\n  white-space: nowrap;\n  transition: all .15s;\n}\n.tab.active {\n  background: var(--accent-dim);\n  color: var(--accent);\n  border-color: var(--accent3);\n}\n\n.tab-content { display: none; }\n.tab-content.active { display: block; }\n\n.mem-panels { padding: 12px 16px; }\n\n.search-row {\n  display: flex;\n  gap: 6px;\n  margin-bottom: 8px;\n  flex-wrap: wrap;\n}\n\n.input-field {\n  flex: 1;\n  min-width: 100px;\n  background: var(--bg2);\n  border: 1px solid var(--border2);\n  border-radius: 6px;\n  color: var(--accent);\n  padding: 6px 10px;\n  font-family: var(--font);\n  font-size: 11px;\n  outline: none;\n  min-height: 32px;\n}\n.input-field:focus { border-color: var(--accent3); }\n.input-date { color: var(--amber); min-width: 130px; }\n\n/* Theme selector */\n.theme-selector { display: flex; gap: 8px; flex-wrap: wrap; }\n.theme-chip {\n  display: flex; align-items: center; justify-content: center;\n  width: 44px; height: 44px; padding: 0; border-radius: 8px;\n  background: var(--bg2); border: 1px solid var(--border2);\n  cursor: pointer; transition: all .15s; flex-shrink: 0;\n}\n.theme-chip:hover { border-color: var(--accent3); transform: scale(1.08); }\n.theme-chip.active { border-color: var(--accent); box-shadow: var(--glow-sm); transform: scale(1.05); }\n.theme-swatch { width: 20px; height: 20px; border-radius: 50%; flex-shrink: 0; }\n\n/* ── Analytics (Fase 62) ── */\n.anl-period-btns { display: flex; gap: 4px; }\n.anl-period-btn {\n  background: transparent; border: 1px solid var(--border2);\n  color: var(--muted); padding: 2px 8px; border-radius: 4px;\n  font-size: 10px; cursor: pointer; min-height: 22px; line-height: 1;\n}\n.anl-period-btn.active { border-color: var(--accent); color: var(--accent); }\n.anl-period-btn:hover:not(.active) { border-color: var(--border); color: var(--text2); }\n\n.anl-section-label {\n  font-size: 10px; color: var(--muted); letter-spacing: 1px;\n  font-weight: 700; margin-bottom: 8px; text-transform: uppercase;\n}\n\n.anl-bars { display: flex; flex-direction: column; gap: 5px; margin-bottom: 6px; }\n.anl-bar-row { display: flex; align-items: center; gap: 8px; }\n.anl-bar-label { width: 72px; font-size: 11px; flex-shrink: 0; }\n.anl-bar-track {\n  flex: 1; height: 8px; background: var(--bg2);\n  border-radius: 4px; overflow: hidden; min-width: 40px;\n}\n.anl-bar-fill { height: 100%; border-radius: 4px; transition: width .3s ease; }\n.anl-bar-val { width: 48px; text-align: right; font-size: 11px; color: var(--text2); flex-shrink: 0; }\n.anl-total { font-size: 11px; color: var(--muted); text-align: right; }\n.anl-total span { color: var(--text2); }\n\n.anl-error-row { display: flex; flex-wrap: wrap; gap: 8px; margin-bottom: 4px; }\n.anl-error-badge {\n  display: flex; flex-direction: column; align-items: center;\n  background: var(--bg2); border: 1px solid var(--border2);\n  border-radius: 6px; padding: 6px 10px; min-width: 56px;\n}\n.anl-error-badge.anl-error-bad { border-color: var(--red); }\n.anl-error-name { font-size: 10px; color: var(--muted); }\n.anl-error-pct { font-size: 15px; font-weight: 700; color: var(--text); }\n.anl-error-badge.anl-error-bad .anl-error-pct { color: var(--red); }\n.anl-error-detail { font-size: 9px; color: var(--muted); }\n\n.anl-failover-list { display: flex; flex-direction: column; gap: 4px; }\n.anl-failover-item {\n  display: flex; align-items: baseline; gap: 8px; flex-wrap: wrap;\n  font-size: 11px; padding: 4px 0; border-bottom: 1px solid var(--border);\n}\n.anl-fail-ts { color: var(--muted); flex-shrink: 0; font-size: 10px; }\n.anl-fail-route { color: var(--amber); font-weight: 600; }\n.anl-fail-reason { color: var(--text2); font-size: 10px; opacity: 0.8; }\n\n/* Heatmap tooltip */\n.anl-heatmap-tip {\n  position: absolute; pointer-events: none;\n  background: var(--card); border: 1px solid var(--border2);\n  padding: 3px 7px; border-radius: 4px; font-size: 10px;\n  color: var(--text); white-space: nowrap; z-index: 10;\n  box-shadow: 0 2px 8px rgba(0,0,0,0.4);\n}\n\n/* --- 07-components.css --- */\n/* ══════════════════════════════\n   DRAWER (bottom sheet)\n   ══════════════════════════════ */\n\n.drawer-overlay {\n  position: fixed;\n  inset: 0;\n  z-index: 150;\n  background: rgba(0,0,0,0.6);\n  opacity: 0;\n  pointer-events: none;\n  transition: opacity .2s;\n}\n.drawer-overlay.show { opacity: 1; pointer-events: auto; }\n\n.drawer {\n  position: fixed;\n  bottom: 0; left: 0; right: 0;\n  max-height: 75vh;\n  background: var(--card);\n  border-top: 2px solid var(--accent3);\n  border-radius: 14px 14px 0 0;\n  transform: translateY(100%);\n  transition: transform .3s ease;\n  display: flex;\n  flex-direction: column;\n  z-index: 160;\n}\n.drawer-overlay.show .drawer { transform: translateY(0); }\n\n.drawer-handle {\n  width: 36px; height: 4px;\n  background: var(--muted);\n  border-radius: 2px;\n  margin: 8px auto 0;\n  flex-shrink: 0;\n}\n\n.drawer-header {\n  display: flex;\n  align-items: center;\n  justify-content: space-between;\n  padding: 8px 16px;\n  border-bottom: 1px solid var(--border);\n  flex-shrink: 0;\n}\n\n.drawer-title {\n  font-weight: 600;\n  font-size: 12px;\n  color: var(--accent2);\n  letter-spacing: 0.8px;\n}\n\n.drawer-actions { display: flex; gap: 6px; align-items: center; }\n\n.drawer-body {\n  overflow-y: auto;\n  flex: 1;\n  min-height: 0;\n  -webkit-overflow-scrolling: touch;\n}\n\n.drawer-widget { display: none; padding: 14px 16px; }\n.drawer-widget.active { display: block; }\n\n/* ══════════════════════════════\n   SHARED COMPONENTS\n   ══════════════════════════════ */\n\n/* Buttons */\nbutton {\n  border: none;\n  border-radius: 6px;\n  cursor: pointer;\n  font-family: var(--font);\n  font-size: 11px;\n  font-weight: 600;\n  padding: 6px 14px;\n  letter-spacing: 0.5px;\n  transition: all .15s;\n  touch-action: manipulation;\n  min-height: 36px;\n}\n\n.btn-green {\n  background: var(--accent-dim);\n  color: var(--accent2);\n  border: 1px solid var(--accent3);\n}\n.btn-green:hover { background: var(--btn-hover); color: var(--accent); }\n\n.btn-red {\n  background: var(--red-dim);\n  color: var(--red);\n  border: 1px solid #5a1a1a;\n}\n.btn-red:hover { background: #5a1a1a; }\n\n.btn-ghost {\n  background: transparent;\n  color: var(--muted);\n  border: 1px solid var(--border);\n}\n.btn-ghost:hover { color: var(--accent2); border-color: var(--accent3); }\n.usage-period-btn.active { color: var(--accent); border-color: var(--accent); text-shadow: var(--glow-sm); }\n\n.btn-sm  { min-height: 28px; padding: 3px 10px; font-size: 10px; }\n.btn-xs  { min-height: 20px; padding: 1px 6px; font-size: 10px; line-height: 1.2; }\n\n.btn-danger-off {\n  border-color: var(--red) !important;\n  box-shadow: 0 0 6px rgba(255,50,50,0.3);\n  font-weight: 700;\n  letter-spacing: 1px;\n}\n.btn-danger-off:hover { box-shadow: 0 0 12px rgba(255,50,50,0.5) !important; }\n\n/* Badge inline */\n.badge { font-size: 9px; font-weight: 700; letter-spacing: 0.5px; border-radius: 3px;\n         padding: 1px 5px; white-space: nowrap; border: 1px solid; }\n.badge-red    { color: var(--red,#f04);   border-color: var(--red,#f04); }\n.badge-green  { color: var(--accent);     border-color: var(--accent); }\n.badge-amber  { color: var(--amber,#fa0); border-color: var(--amber,#fa0); }\n.badge-muted  { color: var(--muted);      border-color: var(--border); }\n\n/* Tracker widget */\n.tracker-item { border: 1px solid var(--border); border-radius: 4px; padding: 8px 10px;\n                margin-bottom: 6px; transition: opacity .2s; }\n.tracker-item.tracker-closed { opacity: 0.45; }\n.tracker-item-head { display: flex; align-items: center; gap: 5px; flex-wrap: wrap; }\n.tracker-title { flex: 1; font-size: 11px; color: var(--text); min-width: 60px; }\n.tracker-item-actions { display: flex; gap: 4px; margin-left: auto; }\n.tracker-body-text { font-size: 10px; color: var(--muted); margin-top: 4px; white-space: pre-wrap; }\n.tracker-item-meta { font-size: 9px; color: var(--muted); margin-top: 4px; opacity: 0.6; }\n\n/* Mono block */\n.mono-block {\n  background: var(--bg2);\n  border: 1px solid var(--border);\n  border-radius: 6px;\n  padding: 10px 12px;\n  font-family: var(--font);\n  font-size: 11px;\n  line-height: 1.7;\n  color: var(--text2);\n  max-height: 200px;\n  overflow-y: auto;\n  white-space: pre-wrap;\n  word-break: break-word;\n  -webkit-overflow-scrolling: touch;\n}\n\n/* Placeholder */\n.widget-placeholder {\n  display: flex;\n  flex-direction: column;\n  align-items: center;\n  justify-content: center;\n  gap: 10px;\n  padding: 24px 12px;\n  color: var(--muted);\n  font-size: 11px;\n  text-align: center;\n  min-height: 60px;\n}\n.widget-placeholder .ph-icon { font-size: 24px; opacity: 0.5; }\n\n.no-items {\n  color: var(--muted);\n  font-size: 11px;\n  text-align: center;\n  padding: 16px;\n}\n\n/* Token grid */\n.token-grid { display: grid; grid-template-columns: repeat(3, 1fr); gap: 7px; margin-bottom: 10px; }\n.token-item { background: var(--bg2); border: 1px solid var(--border); border-radius: 6px; padding: 10px; text-align: center; }\n.token-label { font-size: 9px; color: var(--muted); text-transform: uppercase; letter-spacing: 1px; margin-bottom: 3px; }\n.token-value { font-size: 15px; font-weight: 700; color: var(--amber); text-shadow: 0 0 6px rgba(255,176,0,0.3); }\n\n/* Cron */\n.cron-list { display: flex; flex-direction: column; gap: 6px; }\n.cron-item { background: var(--bg2); border: 1px solid var(--border); border-radius: 6px; padding: 8px 12px; display: flex; align-items: flex-start; gap: 10px; }\n.cron-schedule { font-size: 10px; color: var(--cyan); white-space: nowrap; min-width: 90px; padding-top: 1px; }\n.cron-cmd { font-size: 11px; color: var(--text2); overflow: hidden; text-overflow: ellipsis; white-space: nowrap; }\n.cron-desc { font-size: 10px; color: var(--muted); margin-top: 2px; }\n\n/* ── Modals ── */\n.modal-overlay {\n  position: fixed; inset: 0;\n  background: rgba(0,0,0,0.75);\n  display: flex; align-items: center; justify-content: center;\n  z-index: 200;\n  opacity: 0; pointer-events: none;\n  transition: opacity .2s;\n}\n.modal-overlay.show { opacity: 1; pointer-events: auto; }\n\n.modal-box {\n  background: var(--card);\n  border: 1px solid var(--border2);\n  border-radius: 10px;\n  padding: 24px;\n  max-width: 340px;\n  width: 90%;\n  text-align: center;\n  box-shadow: var(--glow-md);\n}\n\n.modal-wide {\n  max-width: 90%;\n  width: 900px;\n  max-height: 90vh;\n  text-align: left;\n  padding: 16px;\n}\n\n.modal-wide-header {\n  display: flex;\n  justify-content: space-between;\n  align-items: center;\n  margin-bottom: 8px;\n  font-size: 10px;\n  color: var(--muted);\n  text-transform: uppercase;\n  letter-spacing: 1px;\n}\n\n.modal-title { font-size: 14px; font-weight: 700; color: var(--accent); margin-bottom: 8px; text-shadow: var(--glow-text); }\n.modal-text { font-size: 12px; color: var(--text2); margin-bottom: 20px; line-height: 1.6; }\n.modal-btns { display: flex; gap: 10px; justify-content: center; }\n\n/* Help modal */\n.help-modal-box {\n  background: var(--card);\n  border: 1px solid var(--accent3);\n  border-radius: 10px;\n  width: min(720px, 95vw);\n  max-height: 88vh;\n  display: flex;\n  flex-direction: column;\n  box-shadow: var(--glow-md);\n}\n.help-modal-header { display: flex; justify-content: space-between; align-items: center; padding: 12px 16px; border-bottom: 1px solid var(--border2); font-size: 11px; font-weight: 700; letter-spacing: 1.5px; color: var(--accent); flex-shrink: 0; }\n.help-modal-body { overflow-y: auto; padding: 12px 16px 16px; display: flex; flex-direction: column; gap: 14px; }\n.help-section { border: 1px solid var(--border); border-radius: 8px; padding: 12px 14px; }\n.help-section-title { font-size: 9px; font-weight: 700; letter-spacing: 1.5px; color: var(--muted); margin-bottom: 8px; }\n.help-table { display: flex; flex-direction: column; gap: 5px; }\n.help-row { display: flex; align-items: baseline; gap: 8px; font-size: 11px; flex-wrap: wrap; }\n.help-badge { font-size: 9px; font-weight: 700; letter-spacing: 1px; border: 1px solid; border-radius: 3px; padding: 1px 5px; white-space: nowrap; flex-shrink: 0; }\n.help-label { color: var(--accent); font-weight: 700; white-space: nowrap; flex-shrink: 0; min-width: 80px; }\n.help-kw { color: var(--text2); font-size: 11px; flex: 1; }\n.help-mode { font-size: 9px; color: var(--muted); white-space: nowrap; flex-shrink: 0; margin-left: auto; }\n.help-mode.loop { color: #ffaa00; }\n\n/* Reboot overlay */\n.reboot-overlay { position: fixed; inset: 0; background: var(--bg); display: flex; flex-direction: column; align-items: center; justify-content: center; z-index: 300; opacity: 0; pointer-events: none; transition: opacity .3s; gap: 16px; }\n.reboot-overlay.show { opacity: 1; pointer-events: auto; }\n.reboot-spinner { width: 40px; height: 40px; border: 3px solid var(--border2); border-top-color: var(--accent); border-radius: 50%; animation: spin 1s linear infinite; }\n.reboot-text { font-size: 13px; color: var(--accent2); }\n.reboot-status { font-size: 11px; color: var(--muted); }\n\n/* Toast */\n#toast {\n  position: fixed;\n  bottom: calc(70px + var(--safe-bot));\n  right: 16px;\n  background: var(--card);\n  border: 1px solid var(--accent3);\n  border-radius: 6px;\n  padding: 10px 16px;\n  font-size: 12px;\n  color: var(--accent2);\n  box-shadow: var(--glow-md);\n  opacity: 0;\n  transform: translateY(8px);\n  transition: all .25s;\n  pointer-events: none;\n  z-index: 999;\n}\n#toast.show { opacity: 1; transform: translateY(0); }\n\n/* Scrollbar */\n::-webkit-scrollbar { width: 3px; height: 3px; }\n::-webkit-scrollbar-track { background: var(--bg2); }\n::-webkit-scrollbar-thumb { background: var(--border2); border-radius: 2px; }\n\n/* ── Prompt Select ── */\n.prompt-select {\n  font-family: var(--font);\n  font-size: 11px;\n  background: var(--bg2);\n  color: var(--muted);\n  border: 1px solid var(--border);\n  border-radius: 4px;\n  padding: 2px 6px;\n  max-width: 140px;\n  cursor: pointer;\n}\n.prompt-select:focus { border-color: var(--accent3); color: var(--accent); outline: none; }\n.prompt-select option { background: var(--bg2); color: var(--text); }\n\n/* ── Sigil Indicator (Fase 38 → 44) ── */\n.sigil-indicator {\n  display: flex;\n  align-items: center;\n  gap: 5px;\n  margin-left: 8px;\n  font-size: 9px;\n  letter-spacing: 0.8px;\n  color: var(--muted);\n  cursor: pointer;\n}\n.sigil-indicator[data-state=\"HAPPY\"] .sigil-label,\n.sigil-indicator[data-state=\"PROUD\"] .sigil-label { color: var(--accent); }\n.sigil-indicator[data-state=\"THINKING\"] .sigil-label,\n.sigil-indicator[data-state=\"WORKING\"] .sigil-label { color: var(--cyan); }\n.sigil-indicator[data-state=\"CURIOUS\"] .sigil-label { color: var(--amber); }\n.sigil-indicator[data-state=\"ALERT\"] .sigil-label { color: var(--amber); }\n.sigil-indicator[data-state=\"ERROR\"] .sigil-label { color: var(--red); }\n\n/* ── Memory toggle ── */\n.mem-on  { color: var(--accent) !important; border-color: var(--accent) !important; text-shadow: var(--glow-sm); }\n.mem-off { color: var(--muted) !important;  border-color: var(--border) !important; }\n\n/* ── Help tip ── */\n.help-tip {\n  display: inline-block;\n  font-size: 9px;\n  color: var(--muted);\n  border: 1px solid var(--border);\n  border-radius: 50%;\n  width: 14px; height: 14px;\n  text-align: center;\n  line-height: 14px;\n  cursor: help;\n  vertical-align: middle;\n  margin-left: 4px;\n}\n.help-tip:hover { color: var(--accent); border-color: var(--accent); }\n\n/* ── Animations ── */\n@keyframes pulse { 0%, 100% { opacity: 1 } 50% { opacity: .4 } }\n@keyframes blink { 0%, 80%, 100% { opacity: .2 } 40% { opacity: 1 } }\n@keyframes spin { to { transform: rotate(360deg); } }\n\n/* --- 08-responsive.css --- */\n/* ── Ultra-narrow (<375px) — Fase 56D ── */\n@media (max-width: 374px) {\n  .stat-card { flex: 1 1 100%; }\n  .widget-card { flex: 1 1 100%; }\n  .drawer-title { font-size: 11px; }\n  .prof-section { padding: 10px 8px; }\n}\n\n/* ── Mobile-specific ── */\n@media (max-width: 767px) {\n  button { min-height: 44px; }\n  .btn-sm { min-height: 32px; }\n  .btn-send { min-height: 44px; }\n  .mono-block { max-height: 150px; }\n\n  /* Provider menu: apri verso l'alto su mobile — Fix Fase 62 */\n  .provider-menu {\n    bottom: 100%;\n    top: auto;\n    max-height: 50vh;\n    overflow-y: auto;\n  }\n}\n\n/* ── Landscape phones — Fase 56D ── */\n@media (orientation: landscape) and (max-height: 500px) {\n  .drawer { max-height: 90vh; }\n  .bottom-nav { padding-bottom: 0; }\n  .app-header { padding-top: 0; }\n}\n\n/* ═══ DESKTOP — Fase 32c ═══ */\n@media (min-width: 768px) {\n  :root { --safe-bot: 0px; }\n  body { font-size: 14px; }\n\n  /* ── App Layout: sidebar + content ── */\n  .app-layout { flex-direction: row; }\n\n  .app-content { flex: 1; min-width: 0; }\n\n  /* ── Sidebar Nav ── */\n  .bottom-nav {\n    flex-direction: column;\n    width: 70px;\n    order: -1;\n    border-top: none;\n    border-right: 1px solid var(--border2);\n    padding: 12px 0;\n    gap: 4px;\n  }\n\n  .nav-item {\n    padding: 14px 0;\n    font-size: 8px;\n    min-height: auto;\n  }\n\n  .nav-item .nav-icon { font-size: 22px; }\n\n  /* ── Content Area ── */\n  .tab-scroll {\n    padding: 24px 32px;\n    max-width: 1200px;\n    margin: 0 auto;\n  }\n\n  /* ── Dashboard Tab: 2 colonne (Sigil sinistra, resto destra) ── */\n  .app-header { padding: 8px 32px 12px; }\n  .dash-stats { gap: 14px; }\n  .stat-card { flex: 1 1 calc(25% - 12px); }\n  .stat-value { font-size: 26px; }\n\n  #tab-dashboard .tab-scroll {\n    display: grid;\n    grid-template-columns: 1fr 1fr;\n    gap: 14px;\n    align-content: start;\n  }\n  .dash-stats { grid-column: 1 / -1; }\n  .sigil-widget { grid-column: 1; margin-bottom: 0; }\n  .dash-right-col { grid-column: 2; display: flex; flex-direction: column; gap: 14px; }\n  .dash-right-col .dash-chart { margin-bottom: 0; }\n  .dash-right-col .dash-widgets { flex-direction: column; gap: 10px; }\n  .dash-right-col .widget-card { flex: none; width: 100%; }\n\n  #pi-chart { height: 100px; }\n  .dash-chart { margin-bottom: 14px; }\n\n  /* ── Code Tab ── */\n  .code-input-area { padding-bottom: 10px; }\n  #chat-input { font-size: 13px; }\n  .msg { max-width: 75%; }\n  .mono-block { max-height: 300px; }\n\n  /* ── Profile Tab: 2-column grid ── */\n  #tab-profile .tab-scroll {\n    display: grid;\n    grid-template-columns: 1fr 1fr;\n    gap: 14px;\n    align-content: start;\n  }\n\n  .prof-section-mem { grid-column: 1 / -1; }\n  .prof-section:last-child { grid-column: 1 / -1; }\n\n  /* ── Drawer Desktop: side panel destro (Fase 22) ── */\n  .drawer {\n    max-width: none;\n    margin: 0;\n    top: 0;\n    right: 0;\n    bottom: 0;\n    left: auto;\n    width: 420px;\n    max-height: none;\n    height: 100%;\n    border-top: none;\n    border-left: 2px solid var(--accent3);\n    border-radius: 0;\n    transform: translateX(100%);\n  }\n\n  .drawer-overlay.show .drawer {\n    transform: translateX(0);\n  }\n\n  .drawer-handle { display: none; }\n\n  .drawer-overlay {\n    background: rgba(0,0,0,0.35);\n  }\n\n  /* ── Modal Desktop ── */\n  .modal-box { max-width: 420px; }\n\n  /* ── Drawer push content ── */\n  .app-content { transition: margin-right 0.3s ease; }\n  body.drawer-open .app-content { margin-right: 420px; }\n\n  /* ── Misc Desktop ── */\n  button { min-height: 36px; }\n  .btn-sm { min-height: 28px; }\n  .btn-send { min-height: 40px; }\n\n  #toast {\n    bottom: 24px;\n    right: 24px;\n  }\n\n  ::-webkit-scrollbar { width: 5px; height: 5px; }\n}\n\n/* ═══ WIDESCREEN — Fase 22 ═══ */\n@media (min-width: 1400px) {\n\n  /* ── Content: riempie lo schermo ── */\n  .tab-scroll {\n    max-width: none;\n    padding: 24px 48px;\n  }\n\n  .app-header { padding: 8px 48px 12px; }\n\n  /* ── Sidebar più leggibile ── */\n  .bottom-nav { width: 80px; }\n  .nav-item .nav-icon { font-size: 24px; }\n  .nav-item { font-size: 9px; padding: 16px 0; }\n\n  /* ── Dashboard: Sigil + colonna destra proporzionati ── */\n  #tab-dashboard .tab-scroll {\n    grid-template-columns: 3fr 2fr;\n    gap: 18px;\n  }\n\n  #pi-chart { height: 140px; }\n\n  /* ── Stats compatte ── */\n  .stat-value { font-size: 28px; }\n  .stat-card { padding: 14px 18px; }\n\n  /* ── Cron: path visibili ── */\n  .cron-cmd { white-space: normal; word-break: break-word; }\n\n  /* ── Drawer più largo ── */\n  .drawer { width: 480px; }\n  body.drawer-open .app-content { margin-right: 480px; }\n\n  /* ── System/Profile: più respiro ── */\n  .sys-section { padding: 18px 20px; }\n  .prof-section { padding: 18px 20px; }\n\n  /* ── System: colonne più larghe ── */\n  #tab-system .tab-scroll {\n    grid-template-columns: 1fr 1fr;\n    gap: 18px;\n  }\n\n  /* ── Profile: colonne bilanciate ── */\n  #tab-profile .tab-scroll {\n    gap: 18px;\n  }\n}\n\n  </style>\n</head>\n\n<body>\n  <div class=\"app-layout\">\n    <div class=\"app-content\">\n\n      <!-- ═══ TAB: DASHBOARD ═══ -->\n      <div id=\"tab-dashboard\" class=\"tab-view active\">\n        <div class=\"tab-scroll\">\n          <div class=\"dash-header\">\n            <img class=\"logo-icon\"\n              src=\"data:image/jpeg;base64,/9j/4AAQSkZJRgABAQAAAQABAAD/2wBDAAYEBQYFBAYGBQYHBwYIChAKCgkJChQODwwQFxQYGBcUFhYaHSUfGhsjHBYWICwgIyYnKSopGR8tMC0oMCUoKSj/2wBDAQcHBwoIChMKChMoGhYaKCgoKCgoKCgoKCgoKCgoKCgoKCgoKCgoKCgoKCgoKCgoKCgoKCgoKCgoKCgoKCgoKCj/wAARCABAAEADASIAAhEBAxEB/8QAGwAAAgMBAQEAAAAAAAAAAAAAAAQDBQYBAgj/xAAzEAACAQMCAwUGBQUAAAAAAAABAgMABBEFIRIxUQYTFEFhIkJxgZGhMjM0YqIkUsHR4f/EABgBAQEBAQEAAAAAAAAAAAAAAAABAwIE/8QAHxEAAgIBBQEBAAAAAAAAAAAAAAECERIDBCExQcHx/9oADAMBAAIRAxEAPwD5foooqHIAEkAAknYAedMizkH5jRxnozbj5DJFTWscihEgXNzMCQc44Ewd8+WwJJ6fGr9ez8EOlie/MMMUhKxz3DlQxHMKu2PoTQqRmWtJMewUk2zhGyfpzper++0TwyQvaSxnvPy2STiSQjnggnBz8xVXcDvo3lK8M8ZxKMYzvjJ9c7H4g9aBoUooooQK6AWIUczsK5U1mvFdwD965+GcmgNDoAifV7xiMmFfYB3GAcDPpsnyzVz2g0+41Se27+QeGjZymWwFTCYUnkvnz3361R9mTEt3LNNJwRzJMr7kAIEBJyN+Zxt51Z6fdxppd1OyeKhZSixNk96SyjG4OPIEnfpWepdpo921cMXGa7+cjGmaSLF57cujW5mWQSNt7JU5AbqMDl0qg1e0MGslXzifijckjdweEnbrlWq0vrqNotOcq9vaTAKsaEjg3wQMY8s/9pfti8Ul74u2ZQomAQDkR3YwR6ZQfWmnfpN0oKlDz9MmOW/Oipr1Al3Mq/hDnHw5ioa0PEFMWP6kHojn+BpemLDe6Vf7wyD4lSB9zQFlp83dTaR3eULSzIXzsckD/VbWyS/vdVk0/TrKGSGBC8jKgGCB7uOZxvjesHbL4my7iIMLlJBJAVO/H5rj1XhI9Vx50/pvajV9O1gXGl3ipcToglWUDhDqMb8W2ee/7qjVm0Z4x47NzeeI0u6nS9igDwWviY3GzBdxupGzZHpnJrBX3FcdmraZlAMGNwv4svjJP2+VM33aHV+1F5Kt5NCZ5UEGY0CIIwcsxxzGw+u1edWuLaLSFs4JJBJ3iIsLAflpxZc48y2dvWolTE55JWUV9+oz1RD/AAWl6nvz/VyAe7hPoAP8VBXRiFdUlWBU4IOQelcooB/DTsZbRlWRx7UedwfQefUYz08q8a1O1/qcs726wSv+NVJxkbEnPLkc0nz50yLyXbIjZh77Rgn786FsLG7ltobuNSVkkQQ8QXZV4sk/b6E1I7eELcTCW6Jyxb2uA+vVvTcD48o/GSDHAkKMPeVN/vnHypckkkkkk7kmgs4SSSSck+dFFFCH/9k=\"\n              alt=\"V\">\n            <span class=\"dash-title\">VESSEL</span>\n            <div id=\"home-health-dot\" class=\"health-dot health-dot-btn\" title=\"Pi: stato sistema\" onclick=\"openDrawer('system')\"></div>\n            <div id=\"bridge-health-dot\" class=\"health-dot health-dot-btn\" title=\"Bridge PC: connessione Windows\" onclick=\"openDrawer('system')\" style=\"margin-left:4px;\"></div>\n<span class=\"dash-spacer\"></span>\n            <span class=\"dash-weather\" id=\"home-weather-text\"></span>\n            <span class=\"dash-temp\" id=\"home-temp\">--</span>\n            <span class=\"dash-sep\">&middot;</span>\n            <span id=\"home-clock\" class=\"dash-clock\">--:--:--</span>\n            <button class=\"btn-sys-gear\" onclick=\"openDrawer('system')\" title=\"System\">&#x2699;</button>\n          </div>\n\n          <!-- Stats 2x2 -->\n          <div class=\"dash-stats\">\n            <div class=\"stat-card\">\n              <div class=\"stat-icon\">&#x00A7;</div>\n              <div class=\"stat-label\">CPU</div>\n              <div class=\"stat-value\" id=\"hc-cpu-val\">--</div>\n              <div class=\"stat-bar\"><div class=\"stat-bar-fill\" id=\"hc-cpu-bar\"></div></div>\n            </div>\n            <div class=\"stat-card\">\n              <div class=\"stat-icon\">&#x25C8;</div>\n              <div class=\"stat-label\">RAM</div>\n              <div class=\"stat-value\" id=\"hc-ram-val\">--</div>\n              <div class=\"stat-sub\" id=\"hc-ram-sub\"></div>\n              <div class=\"stat-bar\"><div class=\"stat-bar-fill stat-bar-cyan\" id=\"hc-ram-bar\"></div></div>\n            </div>\n            <div class=\"stat-card\">\n              <div class=\"stat-icon\">&#x2321;</div>\n              <div class=\"stat-label\">TEMP</div>\n              <div class=\"stat-value\" id=\"hc-temp-val\">--</div>\n              <div class=\"stat-bar\"><div class=\"stat-bar-fill stat-bar-amber\" id=\"hc-temp-bar\"></div></div>\n            </div>\n            <div class=\"stat-card\">\n              <div class=\"stat-icon\">&#x25A4;</div>\n              <div class=\"stat-label\">DISK</div>\n              <div class=\"stat-value\" id=\"hc-disk-val\">--</div>\n              <div class=\"stat-sub\" id=\"hc-disk-sub\"></div>\n              <div class=\"stat-bar\"><div class=\"stat-bar-fill\" id=\"hc-disk-bar\"></div></div>\n            </div>\n          </div>\n\n          <!-- Sigil Widget -->\n          <div class=\"sigil-widget\" id=\"sigil-widget-wrap\">\n            <div class=\"sigil-widget-header\">\n              <span class=\"sigil-widget-title\">SIGIL</span>\n              <span class=\"sigil-widget-status\">\n                <span class=\"sigil-online-dot\" id=\"sigil-online-dot\"></span>\n                <span id=\"sigil-mood-info\">IDLE</span>\n                <span class=\"sigil-mood-sep\">&middot;</span>\n                <span id=\"sigil-mood-timer\">0s</span>\n              </span>\n            </div>\n            <div class=\"sigil-canvas-wrap\" onclick=\"wakeSigil()\">\n              <canvas id=\"sigil-widget-canvas\" class=\"sigil-widget-canvas\"></canvas>\n              <div class=\"sigil-wake-label\" id=\"sigil-wake-label\">touch to wake</div>\n            </div>\n            <div class=\"sigil-commands\" id=\"sigil-commands\" title=\"Invia stati emotivi al Sigil ESP32. THINK/SLEEP sono persistenti, gli altri tornano a IDLE.\">\n              <button class=\"btn-sigil-term\" onclick=\"sigilCommand('HAPPY')\">HAPPY</button>\n              <button class=\"btn-sigil-term\" onclick=\"sigilCommand('THINKING')\">THINK</button>\n              <button class=\"btn-sigil-term\" onclick=\"sigilCommand('SLEEPING')\">SLEEP</button>\n              <button class=\"btn-sigil-term\" onclick=\"sigilCommand('ALERT')\">ALERT</button>\n              <button class=\"btn-sigil-term\" onclick=\"sigilCommand('PROUD')\">PROUD</button>\n              <button class=\"btn-sigil-term\" onclick=\"sigilCommand('CURIOUS')\">CURIO</button>\n              <button class=\"btn-sigil-term\" onclick=\"sigilCommand('IDLE')\">IDLE</button>\n            </div>\n            <div class=\"sigil-text-row\">\n              <input type=\"text\" id=\"sigil-text-input\" class=\"sigil-text-input\" placeholder=\"messaggio per Sigil&hellip;\" maxlength=\"64\">\n              <button class=\"btn-sigil-send\" onclick=\"sigilSendText()\">&#x21B5;</button>\n            </div>\n            <div class=\"sigil-debug-toggle\">\n              <button class=\"btn-ghost btn-sm\" onclick=\"toggleSigilDebug()\" title=\"Debug controls\">&#x2699;</button>\n            </div>\n            <div class=\"sigil-actions\" id=\"sigil-debug-actions\" style=\"display:none;\">\n              <button class=\"btn-ghost btn-sm\" onclick=\"sigilOTA()\">OTA</button>\n              <button class=\"btn-ghost btn-sm\" onclick=\"sigilCommand('BORED')\">BORED</button>\n              <button class=\"btn-ghost btn-sm\" onclick=\"sigilCommand('ERROR')\">ERROR</button>\n            </div>\n          </div>\n\n          <!-- Right column (desktop: affiancata a Sigil) -->\n          <div class=\"dash-right-col\">\n            <!-- Chart -->\n            <div class=\"dash-chart\">\n              <div class=\"chart-header\">\n                <span class=\"chart-label\">SERVER ACTIVITY (Last 15 Min)</span>\n                <div class=\"chart-legend\">\n                  <span><div class=\"dot-cpu\"></div> <span>CPU</span></span>\n                  <span><div class=\"dot-temp\"></div> <span>Temp</span></span>\n                  <span class=\"chart-scale\">CPU 0&#x2013;100% · Temp 0&#x2013;85°C</span>\n                </div>\n              </div>\n              <canvas id=\"pi-chart\"></canvas>\n            </div>\n\n            <!-- Widget tiles -->\n            <div class=\"dash-widgets\">\n              <div class=\"widget-card\" data-widget=\"briefing\" onclick=\"openDrawer('briefing')\">\n                <div class=\"wc-header\"><span class=\"wc-label\">BRIEFING</span><span class=\"wc-chevron\">&#x203A;</span></div>\n                <div class=\"wc-body\" id=\"wt-briefing-preview\">--</div>\n              </div>\n              <div class=\"widget-card\" data-widget=\"tokens\" onclick=\"openDrawer('tokens')\">\n                <div class=\"wc-header\"><span class=\"wc-label\">TOKEN</span><span class=\"wc-chevron\">&#x203A;</span></div>\n                <div class=\"wc-body\" id=\"wt-tokens-preview\">--</div>\n              </div>\n              <div class=\"widget-card\" data-widget=\"logs\" onclick=\"openDrawer('logs')\">\n                <div class=\"wc-header\"><span class=\"wc-label\">LOGS</span><span class=\"wc-chevron\">&#x203A;</span></div>\n                <div class=\"wc-body\" id=\"wt-logs-preview\">--</div>\n              </div>\n              <div class=\"widget-card\" data-widget=\"cron\" onclick=\"openDrawer('cron')\">\n                <div class=\"wc-header\"><span class=\"wc-label\">JOBS</span><span class=\"wc-chevron\">&#x203A;</span></div>\n                <div class=\"wc-body\" id=\"wt-cron-preview\">--</div>\n              </div>\n              <div class=\"widget-card\" data-widget=\"tracker\" onclick=\"openDrawer('tracker')\">\n                <div class=\"wc-header\"><span class=\"wc-label\">TRACKER</span><span class=\"wc-chevron\">&#x203A;</span></div>\n                <div class=\"wc-body\" id=\"wt-tracker-preview\">nessuno</div>\n              </div>\n            </div>\n          </div>\n        </div>\n      </div>\n\n      <!-- ═══ TAB: CODE ═══ -->\n      <div id=\"tab-code\" class=\"tab-view\">\n        <div id=\"code-chat\" class=\"code-panel\">\n          <div id=\"chat-messages\">\n            <div class=\"chat-welcome\">\n              <div class=\"chat-welcome-sigil\">&#x25CE;</div>\n              <div class=\"chat-welcome-text\">Eyyy, sono Vessel &mdash; dimmi cosa vuoi, psychoSocial.</div>\n              <div class=\"chat-welcome-hint\">Seleziona un provider &darr; e inizia a scrivere</div>\n            </div>\n          </div>\n          <div class=\"code-input-area\">\n            <div class=\"code-input-row\">\n              <textarea id=\"chat-input\" placeholder=\"scrivi qui&hellip;\" rows=\"1\"\n                autocorrect=\"off\" autocapitalize=\"off\" spellcheck=\"false\"></textarea>\n              <div class=\"provider-dropdown\" id=\"provider-dropdown\">\n                <button class=\"provider-btn\" id=\"provider-trigger\" onclick=\"toggleProviderMenu()\" type=\"button\">\n                  <span class=\"provider-dot dot-cloud\" id=\"provider-dot\"></span>\n                  <span id=\"provider-short\">Haiku</span>\n                  <span class=\"provider-arrow\">&#x25BE;</span>\n                </button>\n                <div class=\"provider-menu\" id=\"provider-menu\">\n                  <button type=\"button\" onclick=\"switchProvider('auto')\"><span class=\"dot dot-auto\"></span> Auto</button>\n                  <button type=\"button\" onclick=\"switchProvider('cloud')\"><span class=\"dot dot-cloud\"></span> Haiku</button>\n                  <button type=\"button\" onclick=\"switchProvider('local')\"><span class=\"dot dot-local\"></span> Local (Gemma)</button>\n                  <button type=\"button\" onclick=\"switchProvider('pc')\"><span class=\"dot dot-pc\"></span> PC</button>\n                  <button type=\"button\" onclick=\"switchProvider('deepseek')\"><span class=\"dot dot-deepseek\"></span> OpenRouter</button>\n                  <button type=\"button\" onclick=\"switchProvider('brain')\"><span class=\"dot dot-brain\"></span> Brain</button>\n                </div>\n              </div>\n              <button class=\"btn-send\" id=\"chat-send\" onclick=\"sendChat()\">&#x21B5;</button>\n            </div>\n            <div class=\"code-input-meta\">\n              <select id=\"prompt-select\" class=\"prompt-select\" onchange=\"loadSavedPrompt()\" title=\"Template salvati\">\n                <option value=\"\">Template...</option>\n              </select>\n              <button class=\"btn-icon\" onclick=\"saveCurrentPrompt()\" title=\"Salva come template\">[Salva]</button>\n              <button class=\"btn-icon\" onclick=\"deleteSavedPrompt()\" title=\"Elimina template\">[Elimina]</button>\n              <span style=\"flex:1;\"></span>\n              <button class=\"btn-ghost btn-sm mem-off\" id=\"memory-toggle\" onclick=\"toggleMemory()\" title=\"Memoria contestuale: usa note, knowledge graph e cronologia per arricchire le risposte\">MEM</button>\n              <button class=\"btn-icon\" onclick=\"clearChat()\" title=\"Pulisci chat\">&#x2715;</button>\n            </div>\n          </div>\n        </div>\n      </div>\n\n      <!-- ═══ TAB: PROFILE ═══ -->\n      <div id=\"tab-profile\" class=\"tab-view\">\n        <div class=\"tab-scroll\">\n          <!-- Providers -->\n          <div class=\"prof-section\">\n            <div class=\"prof-section-title\">PROVIDER</div>\n            <div class=\"prof-providers\">\n              <div class=\"prof-prov\"><span class=\"dot dot-cloud\"></span><span class=\"prof-prov-name\">Haiku</span><span class=\"prof-prov-info\">Claude &mdash; cloud</span></div>\n              <div class=\"prof-prov\"><span class=\"dot dot-local\"></span><span class=\"prof-prov-name\">Local</span><span class=\"prof-prov-info\">Gemma 3 4B &mdash; Pi</span></div>\n              <div class=\"prof-prov\"><span class=\"dot dot-pc\"></span><span class=\"prof-prov-name\">PC</span><span class=\"prof-prov-info\">Qwen 14B &mdash; GPU LAN</span></div>\n              <div class=\"prof-prov\"><span class=\"dot dot-deepseek\"></span><span class=\"prof-prov-name\">OpenRouter</span><span class=\"prof-prov-info\">DeepSeek V3 &mdash; cloud</span></div>\n              <div class=\"prof-prov\"><span class=\"dot dot-brain\"></span><span class=\"prof-prov-name\">Brain</span><span class=\"prof-prov-info\">Claude Code CLI &mdash; bridge</span></div>\n            </div>\n          </div>\n\n          <!-- Aspetto -->\n          <div class=\"prof-section\">\n            <div class=\"prof-section-title\" style=\"display:flex;justify-content:space-between;align-items:center;\">\n              ASPETTO\n              <button class=\"btn-ghost btn-sm\" onclick=\"showHelpModal()\" style=\"margin:0;\">? Help</button>\n            </div>\n            <div id=\"theme-selector\" class=\"theme-selector\"></div>\n          </div>\n\n          <!-- Token Usage Report -->\n          <div class=\"prof-section\">\n            <div class=\"prof-section-title\">UTILIZZO TOKEN</div>\n            <div style=\"padding:6px 0;\">\n              <button class=\"btn-ghost btn-sm\" onclick=\"openDrawer('tokens')\">&#x00A4; Apri Report Token</button>\n            </div>\n          </div>\n\n          <!-- Memoria -->\n          <div class=\"prof-section prof-section-mem\">\n            <div class=\"prof-section-title\">MEMORIA <span class=\"help-tip\" title=\"MEMORY: contenuto di SOUL.md (personalit&agrave;). HISTORY: cronologia chat. REF: quick reference. CERCA: ricerca per keyword/data. GRAFO: entit&agrave; estratte automaticamente dalle conversazioni.\">?</span></div>\n            <div class=\"tab-row\">\n              <button class=\"tab active\" onclick=\"switchMemTab('memory', this)\">MEMORY</button>\n              <button class=\"tab\" onclick=\"switchMemTab('history', this)\">HISTORY</button>\n              <button class=\"tab\" onclick=\"switchMemTab('quickref', this)\">REF</button>\n              <button class=\"tab\" onclick=\"switchMemTab('search', this)\">CERCA</button>\n              <button class=\"tab\" onclick=\"switchMemTab('grafo', this)\">ENTITÀ</button>\n            </div>\n            <div class=\"mem-panels\">\n              <div id=\"tab-memory\" class=\"tab-content active\">\n                <div class=\"mono-block\" id=\"memory-content\">Caricamento&hellip;</div>\n                <div class=\"prof-btns\"><button class=\"btn-ghost btn-sm\" onclick=\"refreshMemory()\">&#x21BB;</button><button class=\"btn-ghost btn-sm\" onclick=\"copyToClipboard(document.getElementById('memory-content').textContent)\" title=\"Copia\">&#x2398;</button></div>\n              </div>\n              <div id=\"tab-history\" class=\"tab-content\">\n                <div class=\"mono-block\" id=\"history-content\">Premi Carica&hellip;</div>\n                <div class=\"prof-btns\"><button class=\"btn-ghost btn-sm\" onclick=\"refreshHistory()\">&#x21BB; Carica</button><button class=\"btn-ghost btn-sm\" onclick=\"copyToClipboard(document.getElementById('history-content').textContent)\" title=\"Copia\">&#x2398;</button></div>\n              </div>\n              <div id=\"tab-quickref\" class=\"tab-content\">\n                <div class=\"mono-block\" id=\"quickref-content\">Caricamento&hellip;</div>\n                <div class=\"prof-btns\"><button class=\"btn-ghost btn-sm\" onclick=\"copyToClipboard(document.getElementById('quickref-content').textContent)\" title=\"Copia\">&#x2398;</button></div>\n              </div>\n              <div id=\"tab-search\" class=\"tab-content\">\n                <div class=\"search-row\">\n                  <input type=\"text\" id=\"mem-search-keyword\" placeholder=\"keyword&hellip;\" class=\"input-field\">\n                  <input type=\"date\" id=\"mem-search-date\" class=\"input-field input-date\">\n                  <button class=\"btn-green btn-sm\" onclick=\"searchMemory()\">Cerca</button>\n                </div>\n                <div class=\"mono-block\" id=\"search-results\">Inserisci una keyword</div>\n              </div>\n              <div id=\"tab-grafo\" class=\"tab-content\">\n                <div id=\"grafo-body\">\n                  <div class=\"widget-placeholder\"><span class=\"ph-icon\">&#x25CE;</span><span>Knowledge Graph</span></div>\n                </div>\n              </div>\n            </div>\n          </div>\n\n          <!-- Deep Learn -->\n          <div class=\"prof-section\">\n            <div class=\"prof-section-title\">SELF-LEARNING <span class=\"help-tip\" title=\"Analizza le conversazioni recenti per estrarre entit&agrave;, aggiornare il knowledge graph e arricchire la memoria a lungo termine.\">?</span></div>\n            <div style=\"padding:8px 12px;\">\n              <div style=\"font-size:11px;color:var(--muted);margin-bottom:8px;\">Analizza le conversazioni per estrarre entit&agrave;, aggiornare il knowledge graph e arricchire la memoria.</div>\n              <button class=\"btn-green btn-sm\" onclick=\"triggerDeepLearn()\" id=\"btn-deep-learn\">Avvia Deep Learn</button>\n              <div id=\"deep-learn-result\" style=\"display:none;margin-top:8px;\">\n                <pre id=\"deep-learn-text\" style=\"white-space:pre-wrap;font-size:11px;color:var(--text2);max-height:300px;overflow-y:auto;\"></pre>\n              </div>\n            </div>\n          </div>\n\n          <!-- ── ANALYTICS (Fase 62) ── -->\n          <div class=\"prof-section prof-section-mem\" id=\"analytics-section\">\n            <div class=\"prof-section-title\" style=\"display:flex;justify-content:space-between;align-items:center;\">\n              ANALYTICS\n              <span class=\"anl-period-btns\">\n                <button class=\"btn-sm anl-period-btn active\" data-period=\"day\" onclick=\"loadAnalytics('day')\">24H</button>\n                <button class=\"btn-sm anl-period-btn\" data-period=\"week\" onclick=\"loadAnalytics('week')\">7D</button>\n                <button class=\"btn-sm anl-period-btn\" data-period=\"month\" onclick=\"loadAnalytics('month')\">30D</button>\n              </span>\n            </div>\n            <div id=\"analytics-content\" style=\"padding:8px 12px;\">\n              <div class=\"no-items\">// apri il tab Profile per caricare</div>\n            </div>\n          </div>\n        </div>\n      </div>\n\n    </div><!-- /app-content -->\n\n    <!-- ═══ BOTTOM NAV ═══ -->\n    <nav class=\"bottom-nav\">\n      <button class=\"nav-item active\" data-tab=\"dashboard\" onclick=\"switchView('dashboard')\">\n        <span class=\"nav-icon\">&#x229E;</span><span class=\"nav-label\">Dashboard</span>\n      </button>\n      <button class=\"nav-item\" data-tab=\"code\" onclick=\"switchView('code')\">\n        <span class=\"nav-icon\">&gt;_</span><span class=\"nav-label\">Code</span>\n      </button>\n      <button class=\"nav-item\" data-tab=\"profile\" onclick=\"switchView('profile')\">\n        <span class=\"nav-icon\">&#x25C9;</span><span class=\"nav-label\">Profile</span>\n      </button>\n    </nav>\n\n  </div><!-- /app-layout -->\n\n  <!-- ─── Drawer (bottom sheet per Briefing/Token/Crypto) ─── -->\n  <div class=\"drawer-overlay\" id=\"drawer-overlay\" onclick=\"closeDrawer()\">\n    <div class=\"drawer\" onclick=\"event.stopPropagation()\">\n      <div class=\"drawer-handle\"></div>\n      <div class=\"drawer-header\">\n        <span class=\"drawer-title\" id=\"drawer-title\"></span>\n        <div class=\"drawer-actions\" id=\"drawer-actions\"></div>\n      </div>\n      <div class=\"drawer-body\">\n        <div class=\"drawer-widget\" id=\"dw-briefing\">\n          <div id=\"briefing-body\"><div class=\"widget-placeholder\"><span class=\"ph-icon\">&#x25A4;</span><span>Premi Carica per il briefing</span></div></div>\n        </div>\n        <div class=\"drawer-widget\" id=\"dw-logs\">\n          <div id=\"logs-body\"><div class=\"widget-placeholder\"><span class=\"ph-icon\">&#x2261;</span><span>Premi Carica per i log</span></div></div>\n        </div>\n        <div class=\"drawer-widget\" id=\"dw-cron\">\n          <div id=\"cron-body\"><div class=\"widget-placeholder\"><span class=\"ph-icon\">&#x25C7;</span><span>Premi Carica per i cron</span></div></div>\n        </div>\n        <div class=\"drawer-widget\" id=\"dw-tracker\">\n          <div id=\"tracker-body\"><div class=\"widget-placeholder\"><span class=\"ph-icon\">&#x25C8;</span><span>Premi Carica per il tracker</span></div></div>\n        </div>\n        <div class=\"drawer-widget\" id=\"dw-tokens\">\n          <div id=\"tokens-drawer-body\"><div class=\"widget-placeholder\"><span class=\"ph-icon\">&#x00A4;</span><span>Seleziona un periodo</span></div></div>\n        </div>\n        <div class=\"drawer-widget\" id=\"dw-system\">\n          <div style=\"margin-bottom:12px;\">\n            <div class=\"sys-section-title\" style=\"margin-bottom:8px;\">RASPBERRY PI</div>\n            <div class=\"sys-pi-grid\">\n              <div class=\"sys-pi-row\"><span class=\"sys-pi-label\">Hostname</span><span class=\"sys-pi-value\" id=\"hc-hostname-val\">localhost</span></div>\n              <div class=\"sys-pi-row\"><span class=\"sys-pi-label\">Uptime</span><span class=\"sys-pi-value\" id=\"hc-uptime-val\">--</span></div>\n              <div class=\"sys-pi-row\"><span class=\"sys-pi-label\">Sessions</span><span class=\"sys-pi-value\" id=\"hc-sessions-sub\">--</span></div>\n            </div>\n          </div>\n          <div style=\"margin-bottom:12px;\">\n            <span id=\"version-badge\" class=\"version-badge\">&mdash;</span>\n          </div>\n          <div class=\"sys-section-head\">\n            <span class=\"sys-section-title\">SESSIONI TMUX</span>\n            <button class=\"btn-ghost btn-sm\" onclick=\"gatewayRestart()\">&#x21BA; Gateway</button>\n          </div>\n          <div class=\"session-list\" id=\"session-list\">\n            <div class=\"no-items\">Caricamento&hellip;</div>\n          </div>\n          <div class=\"sys-section-head\" style=\"margin-top:16px;padding-top:12px;border-top:1px solid var(--border);\">\n            <span class=\"sys-section-title\">SIGIL ESP32</span>\n            <button class=\"btn-ghost btn-sm\" onclick=\"flashOTA()\">&#x21C6; Flash OTA</button>\n          </div>\n          <div class=\"sys-actions\" style=\"margin-top:12px;padding-top:12px;border-top:1px solid var(--border);\">\n            <button class=\"btn-ghost\" onclick=\"requestStats()\">&#x21BB; Refresh</button>\n            <button class=\"btn-red\" onclick=\"doLogout()\">&#x23FB; Logout</button>\n            <button class=\"btn-red\" onclick=\"showRebootModal()\">&#x21BA; Reboot</button>\n            <button class=\"btn-red btn-danger-off\" onclick=\"showShutdownModal()\" title=\"Spegne il Pi completamente\">&#x23FB; Off</button>\n          </div>\n        </div>\n      </div>\n    </div>\n  </div>\n\n  <!-- Modale reboot -->\n  <div class=\"modal-overlay\" id=\"reboot-modal\">\n    <div class=\"modal-box\">\n      <div class=\"modal-title\">&#x23FB; Reboot Raspberry Pi</div>\n      <div class=\"modal-text\">Sei sicuro? Il Pi si riavvier&agrave; e la dashboard sar&agrave; offline per circa 30-60 secondi.</div>\n      <div class=\"modal-btns\">\n        <button class=\"btn-ghost\" onclick=\"hideRebootModal()\">Annulla</button>\n        <button class=\"btn-red\" onclick=\"confirmReboot()\">Conferma</button>\n      </div>\n    </div>\n  </div>\n\n  <!-- Modale shutdown -->\n  <div class=\"modal-overlay\" id=\"shutdown-modal\">\n    <div class=\"modal-box\">\n      <div class=\"modal-title\">&#x23FB; Spegnimento</div>\n      <div class=\"modal-text\">Sei sicuro? Il Pi si spegner&agrave; completamente.</div>\n      <div class=\"modal-btns\">\n        <button class=\"btn-ghost\" onclick=\"hideShutdownModal()\">Annulla</button>\n        <button class=\"btn-red\" onclick=\"confirmShutdown()\">Conferma</button>\n      </div>\n    </div>\n  </div>\n\n  <!-- Overlay reboot -->\n  <div class=\"reboot-overlay\" id=\"reboot-overlay\">\n    <div class=\"reboot-spinner\"></div>\n    <div class=\"reboot-text\">Riavvio in corso&hellip;</div>\n    <div class=\"reboot-status\" id=\"reboot-status\">In attesa che il Pi torni online</div>\n  </div>\n\n  <!-- Help modal -->\n  <div class=\"modal-overlay\" id=\"help-modal\" onclick=\"closeHelpModal()\">\n    <div class=\"help-modal-box\" onclick=\"event.stopPropagation()\">\n      <div class=\"help-modal-header\">\n        <span>// GUIDA VESSEL</span>\n        <button class=\"btn-ghost btn-sm\" onclick=\"closeHelpModal()\">&#x2715;</button>\n      </div>\n      <div class=\"help-modal-body\">\n        <div class=\"help-section\">\n          <div class=\"help-section-title\">PROVIDER CHAT</div>\n          <div class=\"help-table\">\n            <div class=\"help-row\"><span class=\"help-badge\" style=\"color:var(--accent);border-color:var(--accent);\">Haiku</span><span class=\"help-kw\">Claude &mdash; cloud, veloce</span></div>\n            <div class=\"help-row\"><span class=\"help-badge\" style=\"color:#888;border-color:#888;\">Local</span><span class=\"help-kw\">Gemma 3 4B &mdash; Pi, lento</span></div>\n            <div class=\"help-row\"><span class=\"help-badge\" style=\"color:#44aaff;border-color:#44aaff;\">PC</span><span class=\"help-kw\">Qwen 14B &mdash; GPU LAN</span></div>\n            <div class=\"help-row\"><span class=\"help-badge\" style=\"color:#ffaa00;border-color:#ffaa00;\">OpenRouter</span><span class=\"help-kw\">DeepSeek V3 &mdash; cloud</span></div>\n            <div class=\"help-row\"><span class=\"help-badge\" style=\"color:#00d4ff;border-color:#00d4ff;\">Brain</span><span class=\"help-kw\">Claude Code CLI &mdash; bridge</span></div>\n          </div>\n        </div>\n        <div class=\"help-section\">\n          <div class=\"help-section-title\">INFRASTRUTTURA</div>\n          <div class=\"help-table\">\n            <div class=\"help-row\"><span class=\"help-label\">Dashboard</span><span class=\"help-kw\">your-pi.local:8090</span></div>\n            <div class=\"help-row\"><span class=\"help-label\">Bridge</span><span class=\"help-kw\">porta 8095 &middot; auto-start</span></div>\n            <div class=\"help-row\"><span class=\"help-label\">Remoto</span><span class=\"help-kw\">Cloudflare Tunnel</span></div>\n            <div class=\"help-row\"><span class=\"help-label\">DB</span><span class=\"help-kw\">~/.nanobot/vessel.db</span></div>\n          </div>\n        </div>\n      </div>\n    </div>\n  </div>\n\n  <div id=\"toast\"></div>\n\n  <script>\n    \n// --- 00-theme.js --- \n  // ── Theme Engine ──\n  const THEMES = [\n    { id: '',      label: 'Terminal Green', accent: '#00ff41' },\n    { id: 'amber', label: 'Amber CRT',     accent: '#ffb000' },\n    { id: 'cyan',  label: 'Cyan Ice',       accent: '#00ffcc' },\n    { id: 'red',   label: 'Red Alert',      accent: '#ff3333' },\n    { id: 'sigil', label: 'Sigil Violet',    accent: '#b44dff' },\n    { id: 'ghost', label: 'Ghost White',    accent: '#e0e0e0' },\n  ];\n\n  function applyTheme(id) {\n    if (id) {\n      document.documentElement.setAttribute('data-theme', id);\n    } else {\n      document.documentElement.removeAttribute('data-theme');\n    }\n    localStorage.setItem('vessel-theme', id || '');\n    const meta = document.querySelector('meta[name=\"theme-color\"]');\n    if (meta) {\n      const cs = getComputedStyle(document.documentElement);\n      meta.setAttribute('content', cs.getPropertyValue('--bg').trim());\n    }\n  }\n\n  function getThemeId() {\n    return localStorage.getItem('vessel-theme') || '';\n  }\n\n  // Applica subito per evitare flash\n  applyTheme(getThemeId());\n\n// --- 01-state.js --- \n  // ═══════════════════════════════════════════\n  // VESSEL DASHBOARD — Global State\n  // ═══════════════════════════════════════════\n\n  let ws = null;\n  let reconnectTimer = null;\n  let memoryEnabled = false;\n  let currentTab = 'dashboard';\n  let chatProvider = 'cloud';\n  let streamDiv = null;\n  let activeDrawer = null;\n\n  function esc(s) {\n    if (typeof s !== 'string') return s == null ? '' : String(s);\n    return s.replace(/&/g,'&amp;').replace(/</g,'&lt;').replace(/>/g,'&gt;').replace(/\"/g,'&quot;').replace(/'/g,'&#39;');\n  }\n\n// --- 02-websocket.js --- \n  // ── WebSocket ──\n  function connect() {\n    const proto = location.protocol === 'https:' ? 'wss' : 'ws';\n    ws = new WebSocket(`${proto}://${location.host}/ws`);\n    ws.onopen = () => {\n      const hhd = document.getElementById('home-health-dot');\n      if (hhd && hhd.classList.contains('ws-offline')) {\n        hhd.classList.remove('ws-offline', 'red');\n        hhd.className = 'health-dot';\n      }\n      if (reconnectTimer) { clearTimeout(reconnectTimer); reconnectTimer = null; }\n      setTimeout(() => {\n        send({ action: 'plugin_weather' });\n        send({ action: 'get_tokens' });\n        send({ action: 'get_briefing' });\n        send({ action: 'get_cron' });\n        send({ action: 'get_logs' });\n        send({ action: 'get_entities' });\n        send({ action: 'get_usage_report', period: 'day' });\n        send({ action: 'get_saved_prompts' });\n        send({ action: 'get_sigil_state' });\n        // Restore memory toggle from localStorage\n        try {\n          if (localStorage.getItem('vessel_memory_enabled') === '1') {\n            send({ action: 'toggle_memory' });\n          }\n        } catch(e) {}\n      }, 500);\n    };\n    ws.onclose = (e) => {\n      const hhd = document.getElementById('home-health-dot');\n      if (hhd) { hhd.className = 'health-dot red ws-offline'; hhd.title = 'Disconnesso'; }\n      if (e.code === 4001) { window.location.href = '/'; return; }\n      reconnectTimer = setTimeout(connect, 3000);\n    };\n    ws.onerror = () => ws.close();\n    ws.onmessage = (e) => handleMessage(JSON.parse(e.data));\n  }\n\n  function send(data) {\n    if (ws && ws.readyState === WebSocket.OPEN) ws.send(JSON.stringify(data));\n  }\n\n  // ── Message handler ──\n  function handleMessage(msg) {\n    if (msg.type === 'init') {\n      updateStats(msg.data.pi);\n      updateSessions(msg.data.tmux);\n      const vb = document.getElementById('version-badge');\n      if (vb) vb.textContent = msg.data.version;\n      const mc = document.getElementById('memory-content');\n      if (mc) mc.textContent = msg.data.memory;\n    }\n    else if (msg.type === 'stats') {\n      updateStats(msg.data.pi);\n      updateSessions(msg.data.tmux);\n      ['home-clock', 'chat-clock'].forEach(id => {\n        const el = document.getElementById(id);\n        if (el) el.textContent = msg.data.time;\n      });\n      const bd = document.getElementById('bridge-health-dot');\n      if (bd && msg.data.bridge !== undefined) {\n        const ok = msg.data.bridge === 'ok';\n        bd.className = 'health-dot ' + (ok ? 'green' : '');\n        bd.title = 'Bridge PC: ' + (ok ? 'online' : 'offline');\n      }\n    }\n    else if (msg.type === 'chat_thinking') { appendThinking(); }\n    else if (msg.type === 'chat_chunk') { removeThinking(); appendChunk(msg.text); }\n    else if (msg.type === 'chat_done') {\n      finalizeStream();\n      document.getElementById('chat-send').disabled = false;\n      if (msg.agent) showAgentBadge(msg.agent);\n    }\n    else if (msg.type === 'chat_reply') { removeThinking(); appendMessage(msg.text, 'bot'); document.getElementById('chat-send').disabled = false; }\n    else if (msg.type === 'memory')   { const el = document.getElementById('memory-content'); if (el) el.textContent = msg.text; }\n    else if (msg.type === 'history')  { const el = document.getElementById('history-content'); if (el) el.textContent = msg.text; }\n    else if (msg.type === 'quickref') { const el = document.getElementById('quickref-content'); if (el) el.textContent = msg.text; }\n    else if (msg.type === 'memory_search') { renderMemorySearch(msg.results); }\n    else if (msg.type === 'knowledge_graph') { renderKnowledgeGraph(msg.entities, msg.relations); }\n    else if (msg.type === 'entity_deleted') { if (msg.success) loadEntities(); }\n    else if (msg.type === 'memory_toggle') {\n      memoryEnabled = msg.enabled;\n      const btn = document.getElementById('memory-toggle');\n      if (btn) {\n        btn.className = msg.enabled ? 'btn-ghost btn-sm mem-on' : 'btn-ghost btn-sm mem-off';\n      }\n      try { localStorage.setItem('vessel_memory_enabled', msg.enabled ? '1' : '0'); } catch(e) {}\n    }\n    else if (msg.type === 'logs')    { renderLogs(msg.data); }\n    else if (msg.type === 'cron')    { renderCron(msg.jobs); }\n    else if (msg.type === 'tokens')  { renderTokens(msg.data); }\n    else if (msg.type === 'usage_report') { renderUsageReport(msg.data); }\n    else if (msg.type === 'briefing') { renderBriefing(msg.data); }\n    else if (msg.type === 'crypto')   { if (typeof renderCrypto === 'function') renderCrypto(msg.data); }\n    else if (msg.type === 'toast')   { showToast(msg.text); }\n    else if (msg.type === 'reboot_ack') { startRebootWait(); }\n    else if (msg.type === 'shutdown_ack') { document.getElementById('reboot-overlay').classList.add('show'); document.getElementById('reboot-status').textContent = 'Il Pi si sta spegnendo…'; document.querySelector('.reboot-text').textContent = 'Spegnimento in corso…'; }\n    else if (msg.type === 'saved_prompts') { renderSavedPrompts(msg.prompts); }\n    else if (msg.type === 'sigil_state') { updateSigilIndicator(msg.state); }\n    else if (msg.type === 'tracker')   { renderTracker(msg.items); }\n    else if (msg.type === 'analytics') { renderAnalytics(msg.data); }\n    else if (msg.type === 'heatmap')   { renderHeatmap(msg.data); }\n    else if (msg.type === 'deep_learn_result') {\n      const el = document.getElementById('deep-learn-text');\n      const wrap = document.getElementById('deep-learn-result');\n      const btn = document.getElementById('btn-deep-learn');\n      if (el) el.textContent = msg.text;\n      if (wrap) wrap.style.display = 'block';\n      if (btn) { btn.disabled = false; btn.textContent = 'Avvia Deep Learn'; }\n    }\n    else if (msg.type && msg.type.startsWith('plugin_')) {\n      const hName = 'pluginRender_' + msg.type.replace('plugin_', '');\n      if (window[hName]) { try { window[hName](msg); } catch(e) { console.error('[Plugin] render:', e); } }\n      if (msg.type === 'plugin_weather' && msg.data) {\n        const hw = document.getElementById('home-weather-text');\n        if (hw) {\n          const d = msg.data;\n          const parts = [];\n          if (d.city) parts.push(d.city);\n          if (d.temp != null) parts.push(d.temp + '°C');\n          if (d.condition) parts.push(d.condition);\n          hw.textContent = parts.join(' · ') || '--';\n        }\n      }\n    }\n  }\n\n// --- 03-nav.js --- \n  // ── Tab Navigation ──\n  function switchView(tabName) {\n    if (currentTab === tabName) return;\n    currentTab = tabName;\n\n    document.querySelectorAll('.tab-view').forEach(v => v.classList.remove('active'));\n    document.querySelectorAll('.nav-item').forEach(n => n.classList.remove('active'));\n\n    const view = document.getElementById('tab-' + tabName);\n    if (view) view.classList.add('active');\n\n    const navBtn = document.querySelector(`.nav-item[data-tab=\"${tabName}\"]`);\n    if (navBtn) navBtn.classList.add('active');\n\n    // Ridisegna chart quando torniamo a dashboard\n    if (tabName === 'dashboard') requestAnimationFrame(() => drawChart());\n    // Carica analytics quando apriamo Profile\n    if (tabName === 'profile') loadAnalytics();\n  }\n\n// ── Memory Tabs ──\n  function switchMemTab(name, btn) {\n    const section = btn.closest('.prof-section');\n    section.querySelectorAll('.tab').forEach(t => t.classList.remove('active'));\n    section.querySelectorAll('.tab-content').forEach(t => t.classList.remove('active'));\n    btn.classList.add('active');\n    document.getElementById('tab-' + name)?.classList.add('active');\n    if (name === 'history') send({ action: 'get_history' });\n    if (name === 'quickref') send({ action: 'get_quickref' });\n    if (name === 'grafo') loadEntities();\n  }\n\n// --- 04-stats.js --- \n  // ── Stats ──\n  const MAX_SAMPLES = 180;\n  const cpuHistory = [];\n  const tempHistory = [];\n\n  function updateStats(pi) {\n    const cpuPct = pi.cpu_val || 0;\n    const tempC = pi.temp_val || 0;\n    const memPct = pi.mem_pct || 0;\n\n    const hcCpu = document.getElementById('hc-cpu-val');\n    if (hcCpu) hcCpu.textContent = pi.cpu ? cpuPct.toFixed(1) + '%' : '--';\n    const hcRam = document.getElementById('hc-ram-val');\n    if (hcRam) hcRam.textContent = memPct + '%';\n    const hcRamSub = document.getElementById('hc-ram-sub');\n    if (hcRamSub) hcRamSub.textContent = pi.mem || '';\n    const hcTemp = document.getElementById('hc-temp-val');\n    if (hcTemp) hcTemp.textContent = pi.temp || '--';\n    const hcUptime = document.getElementById('hc-uptime-val');\n    if (hcUptime) hcUptime.textContent = pi.uptime || '--';\n\n    // Bars\n    const cpuBar = document.getElementById('hc-cpu-bar');\n    if (cpuBar) {\n      cpuBar.style.width = cpuPct + '%';\n      cpuBar.style.background = cpuPct > 80 ? 'var(--red)' : cpuPct > 60 ? 'var(--amber)' : 'var(--accent)';\n    }\n    const ramBar = document.getElementById('hc-ram-bar');\n    if (ramBar) {\n      ramBar.style.width = memPct + '%';\n      ramBar.style.background = memPct > 85 ? 'var(--red)' : memPct > 70 ? 'var(--amber)' : 'var(--cyan)';\n    }\n    const tempBar = document.getElementById('hc-temp-bar');\n    if (tempBar) {\n      const tPct = Math.min(100, (tempC / 85) * 100);\n      tempBar.style.width = tPct + '%';\n      tempBar.style.background = tempC > 70 ? 'var(--red)' : 'var(--amber)';\n    }\n    const diskPct = pi.disk_pct || 0;\n    const hcDisk = document.getElementById('hc-disk-val');\n    if (hcDisk) hcDisk.textContent = diskPct + '%';\n    const hcDiskSub = document.getElementById('hc-disk-sub');\n    if (hcDiskSub) hcDiskSub.textContent = pi.disk || '';\n    const diskBar = document.getElementById('hc-disk-bar');\n    if (diskBar) {\n      diskBar.style.width = diskPct + '%';\n      diskBar.style.background = diskPct > 85 ? 'var(--red)' : diskPct > 70 ? 'var(--amber)' : 'var(--accent)';\n    }\n\n    // Health dots\n    ['home-health-dot', 'chat-health-dot'].forEach(id => {\n      const el = document.getElementById(id);\n      if (el) {\n        el.className = 'health-dot ' + (pi.health || '');\n        el.title = pi.health === 'red' ? 'ATTENZIONE' : pi.health === 'yellow' ? 'Sotto controllo' : 'Tutto OK';\n      }\n    });\n\n    // Temp in headers\n    const chatTemp = document.getElementById('chat-temp');\n    if (chatTemp) chatTemp.textContent = pi.temp || '--';\n    const homeTemp = document.getElementById('home-temp');\n    if (homeTemp) homeTemp.textContent = pi.temp || '--';\n\n    // History\n    cpuHistory.push(cpuPct);\n    tempHistory.push(tempC);\n    if (cpuHistory.length > MAX_SAMPLES) cpuHistory.shift();\n    if (tempHistory.length > MAX_SAMPLES) tempHistory.shift();\n    drawChart();\n  }\n\n  function drawChart() {\n    const canvas = document.getElementById('pi-chart');\n    if (!canvas || canvas.offsetParent === null) return;\n    const ctx = canvas.getContext('2d');\n    const dpr = window.devicePixelRatio || 1;\n    const rect = canvas.getBoundingClientRect();\n    canvas.width = rect.width * dpr;\n    canvas.height = rect.height * dpr;\n    ctx.scale(dpr, dpr);\n    const w = rect.width, h = rect.height;\n    ctx.clearRect(0, 0, w, h);\n    const cs = getComputedStyle(document.documentElement);\n    ctx.strokeStyle = cs.getPropertyValue('--border').trim();\n    ctx.lineWidth = 1;\n    for (let y = 0; y <= h; y += h / 4) {\n      ctx.beginPath(); ctx.moveTo(0, y); ctx.lineTo(w, y); ctx.stroke();\n    }\n    if (cpuHistory.length < 2) {\n      ctx.fillStyle = cs.getPropertyValue('--muted').trim();\n      ctx.font = '10px \"JetBrains Mono\", monospace';\n      ctx.textAlign = 'center'; ctx.textBaseline = 'middle';\n      ctx.fillText('Raccolta dati in corso\\u2026', w/2, h/2);\n      return;\n    }\n    function drawLine(data, maxVal, color) {\n      ctx.strokeStyle = color; ctx.lineWidth = 1.5; ctx.lineJoin = 'round';\n      ctx.beginPath();\n      const step = w / (MAX_SAMPLES - 1);\n      const offset = MAX_SAMPLES - data.length;\n      for (let i = 0; i < data.length; i++) {\n        const x = (offset + i) * step;\n        const y = h - (data[i] / maxVal) * (h - 4) - 2;\n        if (i === 0) ctx.moveTo(x, y); else ctx.lineTo(x, y);\n      }\n      ctx.stroke();\n    }\n    drawLine(cpuHistory, 100, cs.getPropertyValue('--accent').trim());\n    drawLine(tempHistory, 85, cs.getPropertyValue('--amber').trim());\n  }\n\n  function updateSessions(sessions) {\n    const el = document.getElementById('session-list');\n    const countEl = document.getElementById('hc-sessions-sub');\n    if (!sessions || !sessions.length) {\n      const empty = '<div class=\"no-items\">// nessuna sessione attiva</div>';\n      if (el) el.innerHTML = empty;\n      if (countEl) countEl.textContent = '0 sessioni';\n      return;\n    }\n    const html = sessions.map(s => `\n      <div class=\"session-item\">\n        <div class=\"session-name\"><div class=\"session-dot\"></div><code>${esc(s.name)}</code></div>\n        <button class=\"btn-red btn-sm\" onclick=\"killSession('${esc(s.name)}')\">✕</button>\n      </div>`).join('');\n    if (el) el.innerHTML = html;\n    if (countEl) countEl.textContent = sessions.length + ' session' + (sessions.length !== 1 ? 'i' : 'e');\n  }\n\n// --- 05-chat.js --- \n  // ── Chat ──\n  function sendChat() {\n    const input = document.getElementById('chat-input');\n    const text = (input.value || '').trim();\n    if (!text) return;\n    // Auto-switch to Code tab > Chat panel if not there\n    if (currentTab !== 'code') switchView('code');\n    appendMessage(text, 'user');\n    send({ action: 'chat', text, provider: chatProvider });\n    input.value = '';\n    input.style.height = 'auto';\n    document.getElementById('chat-send').disabled = true;\n  }\n\n  function autoResizeInput(el) {\n    el.style.height = 'auto';\n    el.style.height = Math.min(el.scrollHeight, 120) + 'px';\n  }\n\n  function appendMessage(text, role) {\n    const box = document.getElementById('chat-messages');\n    if (role === 'bot') {\n      const wrap = document.createElement('div');\n      wrap.className = 'copy-wrap';\n      wrap.style.cssText = 'align-self:flex-start;max-width:85%;';\n      const div = document.createElement('div');\n      div.className = 'msg msg-bot';\n      div.style.maxWidth = '100%';\n      div.textContent = text;\n      const btn = document.createElement('button');\n      btn.className = 'copy-btn'; btn.textContent = '[cp]'; btn.title = 'Copia';\n      btn.onclick = () => copyToClipboard(div.textContent);\n      wrap.appendChild(div); wrap.appendChild(btn);\n      box.appendChild(wrap);\n    } else {\n      const div = document.createElement('div');\n      div.className = `msg msg-${role}`;\n      div.textContent = text;\n      box.appendChild(div);\n    }\n    box.scrollTop = box.scrollHeight;\n  }\n\n  function appendChunk(text) {\n    const box = document.getElementById('chat-messages');\n    if (!streamDiv) {\n      streamDiv = document.createElement('div');\n      streamDiv.className = 'msg msg-bot';\n      streamDiv.textContent = '';\n      box.appendChild(streamDiv);\n    }\n    streamDiv.textContent += text;\n    box.scrollTop = box.scrollHeight;\n  }\n\n  function showAgentBadge(agentId) {\n    const box = document.getElementById('chat-messages');\n    const wraps = box.querySelectorAll('.copy-wrap');\n    const last = wraps[wraps.length - 1];\n    if (!last) return;\n    const existing = last.querySelector('.agent-badge');\n    if (existing) return;\n    const badge = document.createElement('span');\n    badge.className = 'agent-badge';\n    badge.dataset.agent = agentId;\n    badge.textContent = agentId;\n    const msgDiv = last.querySelector('.msg-bot');\n    if (msgDiv) msgDiv.appendChild(badge);\n  }\n\n  function finalizeStream() {\n    if (streamDiv) {\n      const box = streamDiv.parentNode;\n      const wrap = document.createElement('div');\n      wrap.className = 'copy-wrap';\n      wrap.style.cssText = 'align-self:flex-start;max-width:85%;';\n      streamDiv.style.maxWidth = '100%';\n      box.insertBefore(wrap, streamDiv);\n      wrap.appendChild(streamDiv);\n      const btn = document.createElement('button');\n      btn.className = 'copy-btn'; btn.textContent = '[cp]'; btn.title = 'Copia';\n      btn.onclick = () => copyToClipboard(streamDiv.textContent);\n      wrap.appendChild(btn);\n    }\n    streamDiv = null;\n  }\n\n  function appendThinking() {\n    const box = document.getElementById('chat-messages');\n    const div = document.createElement('div');\n    div.id = 'thinking'; div.className = 'msg-thinking';\n    div.innerHTML = 'elaborazione <span class=\"dots\"><span>.</span><span>.</span><span>.</span></span>';\n    box.appendChild(div); box.scrollTop = box.scrollHeight;\n  }\n  function removeThinking() { const el = document.getElementById('thinking'); if (el) el.remove(); }\n\n  function clearChat() {\n    document.getElementById('chat-messages').innerHTML =\n      '<div class=\"msg msg-bot\">Chat pulita</div>';\n    send({ action: 'clear_chat' });\n  }\n\n  // ── Saved Prompts ──\n  let _savedPrompts = [];\n\n  function renderSavedPrompts(prompts) {\n    _savedPrompts = prompts || [];\n    const sel = document.getElementById('prompt-select');\n    if (!sel) return;\n    sel.innerHTML = '<option value=\"\">Template...</option>';\n    prompts.forEach(p => {\n      const opt = document.createElement('option');\n      opt.value = p.id;\n      opt.textContent = p.title;\n      opt.dataset.prompt = p.prompt;\n      opt.dataset.provider = p.provider || '';\n      sel.appendChild(opt);\n    });\n  }\n\n  function loadSavedPrompt() {\n    const sel = document.getElementById('prompt-select');\n    if (!sel || !sel.value) return;\n    const opt = sel.selectedOptions[0];\n    if (!opt) return;\n    const input = document.getElementById('chat-input');\n    if (input) { input.value = opt.dataset.prompt; autoResizeInput(input); }\n    if (opt.dataset.provider) switchProvider(opt.dataset.provider);\n    sel.value = '';\n  }\n\n  function saveCurrentPrompt() {\n    const input = document.getElementById('chat-input');\n    const text = (input && input.value || '').trim();\n    if (!text) { showToast('Scrivi un prompt prima di salvarlo'); return; }\n    const title = prompt('Nome per il template:');\n    if (!title || !title.trim()) return;\n    send({ action: 'save_prompt', title: title.trim(), prompt: text, provider: chatProvider });\n  }\n\n  function deleteSavedPrompt() {\n    const sel = document.getElementById('prompt-select');\n    if (!sel || !sel.value) { showToast('Seleziona un template da eliminare'); return; }\n    const id = parseInt(sel.value);\n    if (!id) return;\n    if (!confirm('Eliminare questo template?')) return;\n    send({ action: 'delete_saved_prompt', id });\n  }\n\n// --- 06-provider.js --- \n  // ── Provider ──\n  function toggleProviderMenu() {\n    document.getElementById('provider-dropdown').classList.toggle('open');\n  }\n  function switchProvider(provider) {\n    chatProvider = provider;\n    const dot = document.getElementById('provider-dot');\n    const label = document.getElementById('provider-short');\n    const names = { auto: 'Auto', cloud: 'Haiku', local: 'Local', pc: 'PC', deepseek: 'OpenRouter', brain: 'Brain' };\n    const dotClass = { auto: 'dot-auto', cloud: 'dot-cloud', local: 'dot-local', pc: 'dot-pc', deepseek: 'dot-deepseek', brain: 'dot-brain' };\n    dot.className = 'provider-dot ' + (dotClass[provider] || 'dot-local');\n    label.textContent = names[provider] || 'Local';\n    document.getElementById('provider-dropdown').classList.remove('open');\n  }\n  document.addEventListener('click', (e) => {\n    const dd = document.getElementById('provider-dropdown');\n    if (dd && !dd.contains(e.target)) dd.classList.remove('open');\n  });\n\n  // ── Memory toggle ──\n  function toggleMemory() { send({ action: 'toggle_memory' }); }\n\n// --- 07-drawer.js --- \n  // ── Drawer (bottom sheet per Briefing/Token/Crypto) ──\n  const DRAWER_CFG = {\n    briefing: { title: '▤ Morning Briefing', actions: '<button class=\"btn-ghost btn-sm\" onclick=\"loadBriefing(this)\">Carica</button>' },\n    logs:     { title: '≡ Logs', actions: '<button class=\"btn-ghost btn-sm\" onclick=\"loadLogs(this)\">Logs</button><button class=\"btn-ghost btn-sm\" onclick=\"loadChatHistory()\">Chat</button>' },\n    cron:     { title: '◇ Cron Jobs', actions: '<button class=\"btn-ghost btn-sm\" onclick=\"loadCron(this)\">Carica</button>' },\n    system:   { title: '⚙ System', actions: '<button class=\"btn-ghost btn-sm\" onclick=\"requestStats()\">Refresh</button>' },\n    tracker:  { title: '◈ Bug Tracker', actions: '<button class=\"btn-ghost btn-sm\" onclick=\"loadTracker()\">Carica</button><button class=\"btn-green btn-sm\" onclick=\"showTrackerForm()\">+ Aggiungi</button>' },\n    tokens:   { title: '¤ Token Usage', actions: '<button class=\"btn-ghost btn-sm usage-period-btn active\" onclick=\"loadUsageReport(\\'day\\',this)\">Oggi</button><button class=\"btn-ghost btn-sm usage-period-btn\" onclick=\"loadUsageReport(\\'week\\',this)\">7gg</button><button class=\"btn-ghost btn-sm usage-period-btn\" onclick=\"loadUsageReport(\\'month\\',this)\">30gg</button>' },\n  };\n\n  function openDrawer(widgetId) {\n    if (activeDrawer === widgetId) { closeDrawer(); return; }\n    document.querySelectorAll('.drawer-widget').forEach(w => w.classList.remove('active'));\n    const dw = document.getElementById('dw-' + widgetId);\n    if (dw) dw.classList.add('active');\n    const cfg = DRAWER_CFG[widgetId];\n    document.getElementById('drawer-title').textContent = cfg ? cfg.title : widgetId;\n    document.getElementById('drawer-actions').innerHTML =\n      (cfg ? cfg.actions : '') +\n      '<button class=\"btn-ghost btn-sm\" onclick=\"closeDrawer()\">✕</button>';\n    document.getElementById('drawer-overlay').classList.add('show');\n    document.body.classList.add('drawer-open');\n    activeDrawer = widgetId;\n  }\n\n  function closeDrawer() {\n    document.getElementById('drawer-overlay').classList.remove('show');\n    document.body.classList.remove('drawer-open');\n    activeDrawer = null;\n  }\n\n  // Swipe-down to close\n  (function() {\n    const drawer = document.querySelector('.drawer');\n    if (!drawer) return;\n    let touchStartY = 0;\n    drawer.addEventListener('touchstart', function(e) {\n      touchStartY = e.touches[0].clientY;\n    }, { passive: true });\n    drawer.addEventListener('touchmove', function(e) {\n      const dy = e.touches[0].clientY - touchStartY;\n      if (dy > 80) { closeDrawer(); touchStartY = 9999; }\n    }, { passive: true });\n  })();\n\n  // Escape\n  document.addEventListener('keydown', (e) => {\n    if (e.key === 'Escape') {\n      if (activeDrawer) closeDrawer();\n    }\n  });\n\n// --- 08-ui.js --- \n  // ── Toast ──\n  function showToast(text) {\n    const el = document.getElementById('toast');\n    el.textContent = text; el.classList.add('show');\n    setTimeout(() => el.classList.remove('show'), Math.max(2500, Math.min(text.length * 60, 6000)));\n  }\n\n  // ── Clipboard ──\n  function copyToClipboard(text) {\n    if (navigator.clipboard && navigator.clipboard.writeText) {\n      navigator.clipboard.writeText(text).then(() => showToast('[cp] Copiato')).catch(() => _fallbackCopy(text));\n    } else { _fallbackCopy(text); }\n  }\n  function _fallbackCopy(text) {\n    const ta = document.createElement('textarea');\n    ta.value = text; ta.style.cssText = 'position:fixed;left:-9999px;top:-9999px;';\n    document.body.appendChild(ta); ta.select();\n    try { document.execCommand('copy'); showToast('[cp] Copiato'); } catch(e) { showToast('Copia non riuscita'); }\n    document.body.removeChild(ta);\n  }\n\n  // ── Modals ──\n  function showHelpModal() { document.getElementById('help-modal').classList.add('show'); }\n  function closeHelpModal() { document.getElementById('help-modal').classList.remove('show'); }\n  function showRebootModal() { document.getElementById('reboot-modal').classList.add('show'); }\n  function hideRebootModal() { document.getElementById('reboot-modal').classList.remove('show'); }\n  function confirmReboot() { hideRebootModal(); send({ action: 'reboot' }); }\n  function showShutdownModal() { document.getElementById('shutdown-modal').classList.add('show'); }\n  function hideShutdownModal() { document.getElementById('shutdown-modal').classList.remove('show'); }\n  function confirmShutdown() { hideShutdownModal(); send({ action: 'shutdown' }); }\n\n  function startRebootWait() {\n    document.getElementById('reboot-overlay').classList.add('show');\n    const statusEl = document.getElementById('reboot-status');\n    let seconds = 0;\n    const timer = setInterval(() => { seconds++; statusEl.textContent = `Attesa: ${seconds}s`; }, 1000);\n    const tryReconnect = setInterval(() => {\n      fetch('/', { method: 'HEAD', cache: 'no-store' })\n        .then(r => {\n          if (r.ok) {\n            clearInterval(timer); clearInterval(tryReconnect);\n            document.getElementById('reboot-overlay').classList.remove('show');\n            showToast('[ok] Pi riavviato');\n            if (ws) { try { ws.close(); } catch(e) {} }\n            connect();\n          }\n        }).catch(() => {});\n    }, 3000);\n    setTimeout(() => { clearInterval(timer); clearInterval(tryReconnect); statusEl.textContent = 'Timeout — ricarica manualmente.'; }, 120000);\n  }\n\n  // ── Deep Learn ──\n  function triggerDeepLearn() {\n    const btn = document.getElementById('btn-deep-learn');\n    if (btn) { btn.disabled = true; btn.textContent = 'In corso...'; }\n    send({ action: 'deep_learn' });\n  }\n\n  // ── Sigil Indicator → moved to sigil.js (Fase 44) ──\n\n  // ── Logout ──\n  async function doLogout() {\n    try {\n      await fetch('/auth/logout', { method: 'POST', credentials: 'same-origin' });\n    } catch(e) {}\n    window.location.replace('/');\n  }\n\n  // ── Clock ──\n  setInterval(() => {\n    const t = new Date().toLocaleTimeString('it-IT');\n    const el = document.getElementById('home-clock');\n    if (el) el.textContent = t;\n  }, 1000);\n\n  // ── iOS virtual keyboard ──\n  if (window.visualViewport) {\n    const appLayout = document.querySelector('.app-layout');\n    let pendingVV = null;\n    const handleVV = () => {\n      if (pendingVV) return;\n      pendingVV = requestAnimationFrame(() => {\n        pendingVV = null;\n        const vvh = window.visualViewport.height;\n        const vvTop = window.visualViewport.offsetTop;\n        appLayout.style.height = vvh + 'px';\n        appLayout.style.transform = 'translateY(' + vvTop + 'px)';\n        const msgs = document.getElementById('chat-messages');\n        if (msgs) msgs.scrollTop = msgs.scrollHeight;\n      });\n    };\n    window.visualViewport.addEventListener('resize', handleVV);\n    window.visualViewport.addEventListener('scroll', handleVV);\n  }\n\n  // ── Service Worker ──\n  if ('serviceWorker' in navigator) {\n    navigator.serviceWorker.register('/sw.js').then(reg => {\n      // Check for updates every 30 min\n      setInterval(() => reg.update(), 1800000);\n    }).catch(() => {});\n  }\n\n  // ── PWA Install Prompt ──\n  let _deferredInstall = null;\n  window.addEventListener('beforeinstallprompt', (e) => {\n    e.preventDefault();\n    _deferredInstall = e;\n  });\n  function pwaInstall() {\n    if (_deferredInstall) {\n      _deferredInstall.prompt();\n      _deferredInstall.userChoice.then(() => { _deferredInstall = null; });\n    }\n  }\n\n// --- 09-init.js --- \n  // ── Input handlers + Theme selector ──\n  document.addEventListener('DOMContentLoaded', () => {\n    // Move header to global position (visible on all tabs)\n    const hdr = document.querySelector('.dash-header');\n    if (hdr) {\n      hdr.className = 'app-header';\n      document.querySelector('.app-content').prepend(hdr);\n    }\n\n    const chatInput = document.getElementById('chat-input');\n    chatInput.addEventListener('keydown', e => {\n      if (e.key === 'Enter' && !e.shiftKey) { e.preventDefault(); sendChat(); }\n    });\n    chatInput.addEventListener('input', () => autoResizeInput(chatInput));\n    document.getElementById('mem-search-keyword')?.addEventListener('keydown', e => {\n      if (e.key === 'Enter') searchMemory();\n    });\n\n    const sel = document.getElementById('theme-selector');\n    if (sel) {\n      const current = getThemeId();\n      sel.innerHTML = THEMES.map(t =>\n        `<button class=\"theme-chip${t.id === current ? ' active' : ''}\" data-theme=\"${t.id}\" onclick=\"selectTheme(this)\" title=\"${t.label}\">` +\n        `<span class=\"theme-swatch\" style=\"background:${t.accent};box-shadow:0 0 8px ${t.accent};\"></span></button>`\n      ).join('');\n    }\n  });\n\n  function selectTheme(chip) {\n    const id = chip.dataset.theme;\n    applyTheme(id);\n    document.querySelectorAll('.theme-chip').forEach(c => c.classList.remove('active'));\n    chip.classList.add('active');\n    drawChart();\n  }\n\n  // ── Connect ──\n  connect();\n\n  // ── Plugin System ──\n  async function loadPlugins() {\n    try {\n      const resp = await fetch('/api/plugins');\n      if (!resp.ok) return;\n      const plugins = await resp.json();\n      if (!plugins.length) return;\n      plugins.forEach(p => {\n        const pid = 'plugin_' + p.id;\n        const actHtml = p.actions === 'load'\n          ? '<button class=\"btn-ghost btn-sm\" onclick=\"pluginLoad_' + p.id + '(this)\">Carica</button>'\n          : '';\n        DRAWER_CFG[pid] = { title: p.icon + ' ' + p.title, actions: actHtml, wide: p.wide || false };\n        const body = document.querySelector('.drawer-body');\n        if (body) {\n          const dw = document.createElement('div');\n          dw.className = 'drawer-widget';\n          dw.id = 'dw-' + pid;\n          dw.innerHTML = '<div id=\"plugin-' + p.id + '-body\"><div class=\"widget-placeholder\"><span class=\"ph-icon\">' + p.icon + '</span><span>' + p.title + '</span></div></div>';\n          body.appendChild(dw);\n        }\n        if (p.css) { const st = document.createElement('style'); st.textContent = p.css; document.head.appendChild(st); }\n        if (p.js) { try { (new Function(p.js))(); } catch(e) { console.error('[Plugin] ' + p.id + ':', e); } }\n        if (p.actions === 'load' && !window['pluginLoad_' + p.id]) {\n          window['pluginLoad_' + p.id] = function(btn) { if (btn) btn.textContent = '…'; send({ action: pid }); };\n        }\n      });\n    } catch(e) { console.error('[Plugins]', e); }\n  }\n  setTimeout(loadPlugins, 500);\n\n// --- analytics.js --- \n  // ── Widget: Analytics (Fase 62) ──────────────────────────────────────────────\n  const _anlProviderNames = {\n    anthropic: 'Haiku', openrouter: 'OpenRouter', ollama: 'Local',\n    ollama_pc: 'PC', brain: 'Brain', unknown: '?'\n  };\n  const _anlProviderColors = {\n    anthropic: 'var(--accent)', openrouter: 'var(--amber)', ollama: 'var(--muted)',\n    ollama_pc: 'var(--cyan)', brain: 'var(--red)'\n  };\n\n  let _anlPeriod = 'day';\n\n  function loadAnalytics(period) {\n    if (period) _anlPeriod = period;\n    document.querySelectorAll('.anl-period-btn').forEach(b => {\n      b.classList.toggle('active', b.dataset.period === _anlPeriod);\n    });\n    const el = document.getElementById('analytics-content');\n    if (el) el.innerHTML = '<div class=\"no-items\">// caricamento\\u2026</div>';\n    send({ action: 'get_analytics', period: _anlPeriod });\n    send({ action: 'get_heatmap', days: 7 });\n  }\n\n  function renderAnalytics(data) {\n    const el = document.getElementById('analytics-content');\n    if (!el) return;\n    let html = '';\n\n    // ── Token Usage ──\n    const usage = data.token_usage || [];\n    const tot = data.token_total || {};\n    html += '<div class=\"anl-section-label\">TOKEN USAGE</div>';\n    if (!usage.length) {\n      html += '<div class=\"no-items\">// nessun dato nel periodo</div>';\n    } else {\n      const maxTot = Math.max(...usage.map(r => (r.input || 0) + (r.output || 0)), 1);\n      const fmt = n => n >= 1000000 ? (n/1000000).toFixed(1) + 'M' : n >= 1000 ? (n/1000).toFixed(1) + 'K' : String(n);\n      html += '<div class=\"anl-bars\">';\n      usage.forEach(r => {\n        const name = _anlProviderNames[r.provider] || r.provider;\n        const color = _anlProviderColors[r.provider] || 'var(--text2)';\n        const total = (r.input || 0) + (r.output || 0);\n        const pct = Math.round((total / maxTot) * 100);\n        html += `<div class=\"anl-bar-row\">\n          <span class=\"anl-bar-label\" style=\"color:${color};\">${esc(name)}</span>\n          <div class=\"anl-bar-track\"><div class=\"anl-bar-fill\" style=\"width:${pct}%;background:${color};\"></div></div>\n          <span class=\"anl-bar-val\">${fmt(total)}</span>\n        </div>`;\n      });\n      html += '</div>';\n      html += `<div class=\"anl-total\">Totale periodo: <span>${fmt((tot.input||0)+(tot.output||0))} tok · ${tot.calls||0} call</span></div>`;\n    }\n\n    // ── Latency ──\n    const latency = data.latency || [];\n    html += '<div class=\"anl-section-label\" style=\"margin-top:14px;\">LATENZA MEDIA</div>';\n    if (!latency.length) {\n      html += '<div class=\"no-items\">// nessun dato nel periodo</div>';\n    } else {\n      const maxMs = Math.max(...latency.map(r => r.max_ms || 0), 1);\n      html += '<div class=\"anl-bars\">';\n      latency.forEach(r => {\n        const name = _anlProviderNames[r.provider] || r.provider;\n        const color = _anlProviderColors[r.provider] || 'var(--text2)';\n        const pct = Math.round((r.avg_ms / maxMs) * 100);\n        const avgSec = r.avg_ms >= 1000 ? (r.avg_ms / 1000).toFixed(1) + 's' : r.avg_ms + 'ms';\n        html += `<div class=\"anl-bar-row\">\n          <span class=\"anl-bar-label\" style=\"color:${color};\">${esc(name)}</span>\n          <div class=\"anl-bar-track\"><div class=\"anl-bar-fill\" style=\"width:${pct}%;background:${color};opacity:0.7;\"></div></div>\n          <span class=\"anl-bar-val\">${avgSec}</span>\n        </div>`;\n      });\n      html += '</div>';\n    }\n\n    // ── Error Rate ──\n    const errors = (data.errors || []).filter(r => r.total > 0);\n    html += '<div class=\"anl-section-label\" style=\"margin-top:14px;\">ERROR RATE</div>';\n    if (!errors.length) {\n      html += '<div class=\"no-items\">// nessun errore nel periodo</div>';\n    } else {\n      html += '<div class=\"anl-error-row\">';\n      errors.forEach(r => {\n        const name = _anlProviderNames[r.provider] || r.provider;\n        const pct = Math.round((r.rate || 0) * 100);\n        const bad = pct > 5;\n        html += `<div class=\"anl-error-badge ${bad ? 'anl-error-bad' : ''}\">\n          <span class=\"anl-error-name\">${esc(name)}</span>\n          <span class=\"anl-error-pct\">${pct}%</span>\n          <span class=\"anl-error-detail\">${r.count}/${r.total}</span>\n        </div>`;\n      });\n      html += '</div>';\n    }\n\n    // ── Failover Log ──\n    const failovers = data.failovers || [];\n    html += '<div class=\"anl-section-label\" style=\"margin-top:14px;\">FAILOVER RECENTI</div>';\n    if (!failovers.length) {\n      html += '<div class=\"no-items\">// nessun failover registrato</div>';\n    } else {\n      html += '<div class=\"anl-failover-list\">';\n      failovers.forEach(f => {\n        const ts = (f.ts || '').slice(0, 16).replace('T', ' ');\n        const route = f.resource || f.route || '';\n        const reason = (f.details || f.reason || '').slice(0, 80);\n        html += `<div class=\"anl-failover-item\">\n          <span class=\"anl-fail-ts\">${esc(ts)}</span>\n          <span class=\"anl-fail-route\">${esc(route)}</span>\n          ${reason ? `<span class=\"anl-fail-reason\">${esc(reason)}</span>` : ''}\n        </div>`;\n      });\n      html += '</div>';\n    }\n\n    // ── Heatmap placeholder (riempito da renderHeatmap) ──\n    html += '<div class=\"anl-section-label\" style=\"margin-top:14px;\">ATTIVITA\\' ULTIMI 7 GIORNI</div>';\n    html += '<div id=\"anl-heatmap-wrap\"><div class=\"no-items\">// caricamento\\u2026</div></div>';\n\n    el.innerHTML = html;\n  }\n\n  function renderHeatmap(data) {\n    const wrap = document.getElementById('anl-heatmap-wrap');\n    if (!wrap) return;\n    const matrix = data.matrix || [];\n    const maxVal = data.max || 1;\n    const labels = data.labels || [];\n    const days = matrix.length;\n    if (!days) { wrap.innerHTML = '<div class=\"no-items\">// nessun dato</div>'; return; }\n\n    const CELL = 13, GAP = 2;\n    const labelW = 30, labelH = 16;\n    const w = labelW + 24 * (CELL + GAP);\n    const h = labelH + days * (CELL + GAP);\n\n    const canvas = document.createElement('canvas');\n    const dpr = window.devicePixelRatio || 1;\n    canvas.width = w * dpr;\n    canvas.height = h * dpr;\n    canvas.style.width = w + 'px';\n    canvas.style.height = h + 'px';\n    canvas.style.display = 'block';\n    canvas.style.maxWidth = '100%';\n\n    const ctx = canvas.getContext('2d');\n    ctx.scale(dpr, dpr);\n    const cs = getComputedStyle(document.documentElement);\n    const accentRaw = cs.getPropertyValue('--accent').trim();\n    const mutedColor = cs.getPropertyValue('--muted').trim();\n    const borderColor = cs.getPropertyValue('--border').trim();\n\n    // Sfondo\n    ctx.fillStyle = cs.getPropertyValue('--card').trim() || '#111';\n    ctx.fillRect(0, 0, w, h);\n\n    // Label ore (0, 6, 12, 18, 23)\n    ctx.fillStyle = mutedColor;\n    ctx.font = `9px \"JetBrains Mono\", monospace`;\n    ctx.textBaseline = 'top';\n    [0, 6, 12, 18, 23].forEach(hr => {\n      const x = labelW + hr * (CELL + GAP);\n      ctx.fillText(String(hr).padStart(2, '0'), x, 0);\n    });\n\n    // Label giorni + celle\n    for (let d = 0; d < days; d++) {\n      const y = labelH + d * (CELL + GAP);\n      // Label giorno\n      ctx.fillStyle = mutedColor;\n      ctx.textBaseline = 'middle';\n      ctx.font = `9px \"JetBrains Mono\", monospace`;\n      ctx.fillText((labels[d] || '').slice(0, 3), 0, y + CELL / 2);\n      // Celle ore\n      for (let hr = 0; hr < 24; hr++) {\n        const x = labelW + hr * (CELL + GAP);\n        const count = (matrix[d] && matrix[d][hr]) || 0;\n        const intensity = maxVal > 0 ? count / maxVal : 0;\n        if (intensity > 0) {\n          // Interpola colore accent con opacity\n          ctx.globalAlpha = 0.15 + intensity * 0.85;\n          ctx.fillStyle = accentRaw;\n        } else {\n          ctx.globalAlpha = 1;\n          ctx.fillStyle = borderColor;\n        }\n        ctx.fillRect(x, y, CELL, CELL);\n      }\n    }\n    ctx.globalAlpha = 1;\n\n    // Tooltip via mouseenter\n    wrap.innerHTML = '';\n    const container = document.createElement('div');\n    container.style.position = 'relative';\n    container.style.display = 'inline-block';\n    container.style.width = w + 'px';\n\n    const tooltip = document.createElement('div');\n    tooltip.className = 'anl-heatmap-tip';\n    tooltip.style.display = 'none';\n\n    canvas.addEventListener('mousemove', e => {\n      const rect = canvas.getBoundingClientRect();\n      const mx = (e.clientX - rect.left) * (w / rect.width);\n      const my = (e.clientY - rect.top) * (h / rect.height);\n      const col = Math.floor((mx - labelW) / (CELL + GAP));\n      const row = Math.floor((my - labelH) / (CELL + GAP));\n      if (col >= 0 && col < 24 && row >= 0 && row < days) {\n        const count = (matrix[row] && matrix[row][col]) || 0;\n        const day = labels[row] || '';\n        tooltip.style.display = 'block';\n        tooltip.style.left = (e.clientX - rect.left + 8) + 'px';\n        tooltip.style.top = (e.clientY - rect.top - 24) + 'px';\n        tooltip.textContent = `${day} ${String(col).padStart(2,'0')}:00 — ${count} msg`;\n      } else {\n        tooltip.style.display = 'none';\n      }\n    });\n    canvas.addEventListener('mouseleave', () => { tooltip.style.display = 'none'; });\n\n    container.appendChild(canvas);\n    container.appendChild(tooltip);\n    wrap.appendChild(container);\n  }\n\n// --- briefing.js --- \n  // ── Widget: Briefing ──\n  function loadBriefing(btn) { if (btn) btn.textContent = '…'; send({ action: 'get_briefing' }); }\n  function runBriefing(btn) { if (btn) btn.textContent = '…'; send({ action: 'run_briefing' }); }\n\n  function renderBriefing(data) {\n    const bp = document.getElementById('wt-briefing-preview');\n    if (bp) {\n      if (data.last) {\n        const parts = [];\n        const ts = (data.last.ts || '').split('T')[0];\n        if (ts) parts.push(ts);\n        if (data.last.weather) parts.push(data.last.weather.substring(0, 25));\n        const cal = (data.last.calendar_today || []).length;\n        if (cal > 0) parts.push(cal + ' eventi oggi');\n        bp.textContent = parts.join(' · ') || 'Caricato';\n      } else { bp.textContent = 'Nessun briefing'; }\n    }\n    const el = document.getElementById('briefing-body');\n    if (!data.last) {\n      el.innerHTML = '<div class=\"no-items\">// nessun briefing</div><div style=\"margin-top:8px;text-align:center;\"><button class=\"btn-green btn-sm\" onclick=\"runBriefing()\">▶ Genera</button></div>';\n      return;\n    }\n    const b = data.last;\n    const ts = b.ts ? b.ts.replace('T', ' ') : '—';\n    const weather = b.weather || '—';\n    const calToday = b.calendar_today || [];\n    const calTomorrow = b.calendar_tomorrow || [];\n    const calTodayHtml = calToday.length > 0\n      ? calToday.map(e => { const loc = e.location ? ` <span style=\"color:var(--muted)\">@ ${esc(e.location)}</span>` : ''; return `<div style=\"margin:3px 0;font-size:11px;\"><span style=\"color:var(--cyan);font-weight:600\">${esc(e.time)}</span> <span style=\"color:var(--text2)\">${esc(e.summary)}</span>${loc}</div>`; }).join('')\n      : '<div style=\"font-size:11px;color:var(--muted);font-style:italic\">Nessun evento</div>';\n    const calTomorrowHtml = calTomorrow.length > 0\n      ? `<div style=\"font-size:10px;color:var(--muted);margin-top:8px;margin-bottom:4px\">// DOMANI</div>` +\n        calTomorrow.map(e => `<div style=\"margin:2px 0;font-size:10px;color:var(--text2)\"><span style=\"color:var(--cyan)\">${esc(e.time)}</span> ${esc(e.summary)}</div>`).join('')\n      : '';\n    const stories = (b.stories || []).map((s, i) => {\n      const parts = [];\n      if (s.points != null) parts.push(s.points + 'pt');\n      if (s.comments != null) parts.push(s.comments + ' cmt');\n      const meta = parts.length ? ` <span style=\"color:var(--muted);font-size:10px;\">(${parts.join(', ')})</span>` : '';\n      return `<div style=\"margin:4px 0;font-size:11px;color:var(--text2);\">${i+1}. ${esc(s.title)}${meta}</div>`;\n    }).join('');\n    el.innerHTML = `\n      <div style=\"display:flex;justify-content:space-between;margin-bottom:8px;\">\n        <div style=\"font-size:10px;color:var(--muted);\">ULTIMO: <span style=\"color:var(--amber)\">${ts}</span></div>\n        <div style=\"font-size:10px;color:var(--muted);\">PROSSIMO: <span style=\"color:var(--cyan)\">${data.next_run || '07:30'}</span></div>\n      </div>\n      <div style=\"background:var(--bg2);border:1px solid var(--border);border-radius:6px;padding:10px 12px;margin-bottom:8px;\">\n        <div style=\"font-size:11px;color:var(--amber);margin-bottom:8px;\">${esc(weather)}</div>\n        <div style=\"font-size:10px;color:var(--muted);margin-bottom:4px;\">// OGGI</div>\n        ${calTodayHtml}${calTomorrowHtml}\n        <div style=\"font-size:10px;color:var(--muted);margin-top:8px;margin-bottom:4px;\">// NEWS</div>\n        ${stories}\n      </div>\n      <div style=\"display:flex;gap:6px;\">\n        <button class=\"btn-ghost btn-sm\" onclick=\"loadBriefing()\">↻ Aggiorna</button>\n        <button class=\"btn-green btn-sm\" onclick=\"runBriefing()\">▶ Genera</button>\n        <button class=\"btn-ghost btn-sm\" onclick=\"copyToClipboard(document.getElementById('briefing-body').textContent)\">[cp]</button>\n      </div>`;\n  }\n\n// --- code.js --- \n  // ── Widget: Remote Code — RIMOSSO (Fase 47) ──\n  // Bridge task execution rimosso. PC usato come cervello via Ollama LAN.\n\n// --- cron.js --- \n  // ── Widget: Cron Jobs ──\n  function loadCron(btn) { if (btn) btn.textContent = '…'; send({ action: 'get_cron' }); }\n\n  function renderCron(jobs) {\n    const cp = document.getElementById('wt-cron-preview');\n    if (cp) cp.textContent = ((jobs && jobs.length) || 0) + ' job attivi';\n    const el = document.getElementById('cron-body');\n    const jobList = (jobs && jobs.length) ? '<div class=\"cron-list\">' + jobs.map((j, i) => `\n      <div class=\"cron-item\" style=\"align-items:center;\">\n        <div class=\"cron-schedule\">${j.schedule}</div>\n        <div style=\"flex:1;\"><div class=\"cron-cmd\">${j.command}</div>${j.desc?`<div class=\"cron-desc\">// ${j.desc}</div>`:''}</div>\n        <button class=\"btn-red btn-sm\" style=\"padding:3px 8px;\" onclick=\"deleteCron(${i})\">✕</button>\n      </div>`).join('') + '</div>'\n      : '<div class=\"no-items\">// nessun cron job</div>';\n    el.innerHTML = jobList + `\n      <div style=\"margin-top:10px;border-top:1px solid var(--border);padding-top:10px;\">\n        <div style=\"font-size:10px;color:var(--muted);margin-bottom:6px;\">AGGIUNGI</div>\n        <div style=\"display:flex;gap:6px;margin-bottom:6px;\">\n          <input id=\"cron-schedule\" placeholder=\"30 7 * * *\" class=\"input-field\" style=\"width:120px;flex:0;\">\n          <input id=\"cron-command\" placeholder=\"python3.13 /path/script.py\" class=\"input-field\">\n        </div>\n        <div style=\"display:flex;gap:6px;\">\n          <button class=\"btn-green btn-sm\" onclick=\"addCron()\">+ Aggiungi</button>\n          <button class=\"btn-ghost btn-sm\" onclick=\"loadCron()\">↻</button>\n        </div>\n      </div>`;\n  }\n  function addCron() {\n    const sched = document.getElementById('cron-schedule').value.trim();\n    const cmd = document.getElementById('cron-command').value.trim();\n    if (!sched || !cmd) { showToast('[!] Compila schedule e comando'); return; }\n    send({ action: 'add_cron', schedule: sched, command: cmd });\n  }\n  function deleteCron(index) { send({ action: 'delete_cron', index: index }); }\n\n// --- crypto.js --- \n  // ── Widget: Crypto (rimosso — Fase 49B) ──\n\n// --- knowledge.js --- \n  // ── Widget: Knowledge Graph ──\n  function loadEntities(btn) { if (btn) btn.textContent = '...'; send({ action: 'get_entities' }); }\n  function deleteEntity(id) { send({ action: 'delete_entity', id: id }); }\n\n  function renderKnowledgeGraph(entities, relations) {\n    const mp = document.getElementById('wt-mem-preview');\n    if (mp) mp.textContent = (entities ? entities.length : 0) + ' entità · ' + (relations ? relations.length : 0) + ' relazioni';\n    const el = document.getElementById('grafo-body');\n    if (!entities || entities.length === 0) {\n      el.innerHTML = '<div class=\"no-items\">// nessuna entità</div><div style=\"margin-top:8px;\"><button class=\"btn-ghost btn-sm\" onclick=\"loadEntities()\">↻</button></div>';\n      return;\n    }\n    const groups = { tech: [], person: [], place: [] };\n    entities.forEach(e => {\n      if (groups[e.type]) groups[e.type].push(e);\n      else { if (!groups.other) groups.other = []; groups.other.push(e); }\n    });\n    const labels = { tech: 'Tech', person: 'Persone', place: 'Luoghi', other: 'Altro' };\n    const colors = { tech: 'var(--cyan)', person: 'var(--accent)', place: 'var(--amber)', other: 'var(--text2)' };\n    let html = '<div style=\"font-size:10px;color:var(--muted);margin-bottom:8px;\">' + entities.length + ' entità</div>';\n    for (const [type, items] of Object.entries(groups)) {\n      if (!items.length) continue;\n      html += '<div style=\"margin-bottom:12px;\">';\n      html += '<div style=\"font-size:10px;color:' + colors[type] + ';text-transform:uppercase;letter-spacing:1px;margin-bottom:4px;font-weight:700;\">' + labels[type] + ' (' + items.length + ')</div>';\n      items.forEach(e => {\n        const since = e.first_seen ? e.first_seen.split('T')[0] : '';\n        const last = e.last_seen ? e.last_seen.split('T')[0] : '';\n        html += '<div style=\"display:flex;align-items:center;justify-content:space-between;background:var(--bg2);border:1px solid var(--border);border-radius:6px;padding:6px 10px;margin-bottom:3px;\">';\n        html += '<div style=\"flex:1;min-width:0;\"><span style=\"color:var(--text2);font-size:12px;font-weight:600;\">' + esc(e.name) + '</span> <span style=\"color:var(--muted);font-size:10px;\">freq:' + e.frequency + '</span>';\n        html += '<div style=\"font-size:9px;color:var(--muted);\">' + since + ' → ' + last + '</div></div>';\n        html += '<button class=\"btn-red btn-sm\" style=\"padding:2px 6px;font-size:9px;margin-left:6px;flex-shrink:0;\" onclick=\"deleteEntity(' + e.id + ')\">✕</button></div>';\n      });\n      html += '</div>';\n    }\n    html += '<div><button class=\"btn-ghost btn-sm\" onclick=\"loadEntities()\">↻</button></div>';\n    el.innerHTML = html;\n  }\n\n// --- logs.js --- \n  // ── Widget: Logs ──\n  function loadLogs(btn) {\n    if (btn) btn.textContent = '…';\n    const dateEl = document.getElementById('log-date-filter');\n    const searchEl = document.getElementById('log-search-filter');\n    send({ action: 'get_logs', date: dateEl ? dateEl.value : '', search: searchEl ? searchEl.value.trim() : '' });\n  }\n\n  function renderLogs(data) {\n    const lp = document.getElementById('wt-logs-preview');\n    if (lp) {\n      const lines = (typeof data === 'object' && data.lines) ? data.lines : [];\n      const last = lines.length ? lines[lines.length - 1] : '';\n      lp.textContent = last ? last.substring(0, 60) : 'Nessun log';\n    }\n    const el = document.getElementById('logs-body');\n    if (typeof data === 'string') {\n      el.innerHTML = `<div class=\"mono-block\">${esc(data)||'(nessun log)'}</div>\n        <div style=\"margin-top:8px;\"><button class=\"btn-ghost btn-sm\" onclick=\"loadLogs()\">↻</button></div>`;\n      return;\n    }\n    const dateVal = document.getElementById('log-date-filter')?.value || '';\n    const searchVal = document.getElementById('log-search-filter')?.value || '';\n    const lines = data.lines || [];\n    const total = data.total || 0;\n    const filtered = data.filtered || 0;\n    const countInfo = (dateVal || searchVal)\n      ? `<span style=\"color:var(--amber)\">${filtered}</span> / ${total} righe`\n      : `${total} righe`;\n    let content = lines.length ? lines.map(l => {\n      if (searchVal) {\n        const re = new RegExp('(' + searchVal.replace(/[.*+?^${}()|[\\]\\\\]/g, '\\\\$&') + ')', 'gi');\n        return l.replace(/</g, '&lt;').replace(/>/g, '&gt;').replace(re, '<span style=\"background:var(--accent-dim);color:var(--accent);font-weight:700;\">$1</span>');\n      }\n      return l.replace(/</g, '&lt;').replace(/>/g, '&gt;');\n    }).join('\\n') : '(nessun log)';\n    el.innerHTML = `\n      <div style=\"display:flex;gap:6px;margin-bottom:8px;flex-wrap:wrap;\">\n        <input type=\"date\" id=\"log-date-filter\" value=\"${dateVal}\" class=\"input-field input-date\" style=\"min-width:130px;flex:0;\">\n        <input type=\"text\" id=\"log-search-filter\" placeholder=\"> cerca…\" value=\"${searchVal}\" class=\"input-field\">\n        <button class=\"btn-green btn-sm\" onclick=\"loadLogs()\">></button>\n        <button class=\"btn-ghost btn-sm\" onclick=\"clearLogFilters()\">✕</button>\n      </div>\n      <div style=\"font-size:10px;color:var(--muted);margin-bottom:6px;\">${countInfo}</div>\n      <div class=\"mono-block\" style=\"max-height:240px;\">${content}</div>\n      <div style=\"margin-top:8px;display:flex;gap:6px;\"><button class=\"btn-ghost btn-sm\" onclick=\"loadLogs()\">↻</button><button class=\"btn-ghost btn-sm\" onclick=\"copyToClipboard(document.querySelector('#logs-body .mono-block')?.textContent||'')\">[cp]</button></div>`;\n    document.getElementById('log-search-filter')?.addEventListener('keydown', e => {\n      if (e.key === 'Enter') loadLogs();\n    });\n  }\n  function clearLogFilters() {\n    const d = document.getElementById('log-date-filter');\n    const s = document.getElementById('log-search-filter');\n    if (d) d.value = '';\n    if (s) s.value = '';\n    loadLogs();\n  }\n\n  // ── Chat history diagnostica ──\n  async function loadChatHistory(date) {\n    const el = document.getElementById('logs-body');\n    if (!el) return;\n    el.innerHTML = '<div class=\"mono-block\" style=\"color:var(--muted)\">Caricamento…</div>';\n    const d = date || new Date().toISOString().slice(0, 10);\n    try {\n      const r = await fetch('/api/chat/history?channel=dashboard&date=' + d + '&limit=100');\n      const data = await r.json();\n      renderChatHistory(data.messages || [], d);\n    } catch(e) {\n      el.innerHTML = '<div class=\"mono-block\">Errore: ' + esc(String(e)) + '</div>';\n    }\n  }\n\n  function renderChatHistory(messages, date) {\n    const el = document.getElementById('logs-body');\n    if (!el) return;\n    let rows = '';\n    if (!messages.length) {\n      rows = '<div class=\"no-items\">Nessun messaggio per ' + esc(date) + '</div>';\n    } else {\n      rows = messages.map(m => {\n        const roleColor = m.role === 'user' ? 'var(--accent2)' : 'var(--accent)';\n        const pruned = m.ctx_pruned\n          ? ' <span class=\"badge badge-amber\" title=\"Contesto troncato prima dell\\'invio\">prune</span>' : '';\n        const memTags = (m.mem_types || []).map(t =>\n          `<span class=\"badge badge-muted\">${esc(t)}</span>`).join(' ');\n        const meta = m.role === 'assistant' ? `\n          <div style=\"font-size:9px;color:var(--muted);margin-top:3px;display:flex;flex-wrap:wrap;gap:4px;\">\n            ${m.model ? '<span>' + esc(m.model) + '</span>' : ''}\n            ${m.tokens_in ? '<span>' + m.tokens_in + '+' + m.tokens_out + 't</span>' : ''}\n            ${m.latency_ms ? '<span>' + m.latency_ms + 'ms</span>' : ''}\n            ${m.sys_hash ? '<span>sys:' + esc(m.sys_hash) + '</span>' : ''}\n            ${pruned} ${memTags}\n          </div>` : '';\n        const snippet = (m.content || '').slice(0, 280);\n        const more = (m.content || '').length > 280 ? '…' : '';\n        return `<div style=\"border-bottom:1px solid var(--border);padding:6px 0;\">\n          <div style=\"font-size:9px;color:var(--muted);\">\n            ${esc((m.ts||'').replace('T',' '))}\n            <span style=\"color:${roleColor};\">[${esc(m.role)}]</span>\n            ${m.provider ? '· ' + esc(m.provider) : ''}\n          </div>\n          <div style=\"font-size:11px;margin-top:3px;white-space:pre-wrap;word-break:break-word;\">${esc(snippet)}${more}</div>\n          ${meta}\n        </div>`;\n      }).join('');\n    }\n    el.innerHTML = `\n      <div style=\"display:flex;gap:6px;margin-bottom:8px;align-items:center;\">\n        <input type=\"date\" id=\"chat-hist-date\" value=\"${esc(date)}\" class=\"input-field input-date\" style=\"flex:1;min-width:130px;\">\n        <button class=\"btn-green btn-sm\" onclick=\"loadChatHistory(document.getElementById('chat-hist-date').value)\">></button>\n        <button class=\"btn-ghost btn-sm\" onclick=\"loadLogs()\">Logs</button>\n      </div>\n      <div style=\"max-height:280px;overflow-y:auto;\">${rows}</div>`;\n  }\n\n// --- memory.js --- \n  // ── Widget: Memory ──\n  function refreshMemory() { send({ action: 'get_memory' }); }\n  function refreshHistory() { send({ action: 'get_history' }); }\n\n  function searchMemory() {\n    const keyword = document.getElementById('mem-search-keyword')?.value.trim() || '';\n    const date = document.getElementById('mem-search-date')?.value || '';\n    if (!keyword && !date) { showToast('Inserisci almeno una keyword o data'); return; }\n    document.getElementById('search-results').innerHTML = '<span style=\"color:var(--muted)\">Ricerca…</span>';\n    send({ action: 'search_memory', keyword: keyword, date_from: date, date_to: date });\n  }\n\n  function renderMemorySearch(results) {\n    const el = document.getElementById('search-results');\n    if (!results || results.length === 0) { el.innerHTML = '<span style=\"color:var(--muted)\">Nessun risultato</span>'; return; }\n    const keyword = document.getElementById('mem-search-keyword')?.value.trim() || '';\n    el.innerHTML = '<div style=\"color:var(--amber);margin-bottom:6px;\">' + results.length + ' risultati</div>' +\n      results.map(r => {\n        const ts = r.ts.replace('T', ' ');\n        const role = r.role === 'user' ? '<span style=\"color:var(--accent)\">user</span>' : '<span style=\"color:var(--cyan)\">bot</span>';\n        let snippet = (r.content || '').replace(/</g, '&lt;').replace(/>/g, '&gt;');\n        if (snippet.length > 200) snippet = snippet.substring(0, 200) + '…';\n        if (keyword) {\n          const re = new RegExp('(' + keyword.replace(/[.*+?^${}()|[\\]\\\\]/g, '\\\\$&') + ')', 'gi');\n          snippet = snippet.replace(re, '<span style=\"background:var(--accent-dim);color:var(--accent);font-weight:700;\">$1</span>');\n        }\n        return '<div style=\"border-bottom:1px solid var(--border);padding:4px 0;\"><div style=\"display:flex;gap:8px;font-size:10px;color:var(--muted);margin-bottom:2px;\"><span>' + ts + '</span>' + role + '</div><div style=\"font-size:11px;\">' + snippet + '</div></div>';\n      }).join('');\n  }\n\n// --- sigil.js --- \n  // ── Sigil Canvas Engine (Fase 46 — Pixel-Perfect ESP32 Match) ──\n  // Offscreen 320×170 buffer + pixelated scaling = TFT-identical rendering\n\n  const SigilEngine = (() => {\n    // ── ESP32 exact colors (RGB888 from tft.color565 args) ──\n    const C = {\n      bg: [5,2,8], green: [0,255,65], dim: [0,85,21],\n      red: [255,0,64], yellow: [255,170,0], scan: [3,1,5],\n      hood: [61,21,96], hoodLt: [106,45,158], white: [255,255,255]\n    };\n\n    // ── ESP32 exact geometry ──\n    const G = {\n      cx: 160, cy: 85, eyeY: 70, sigilY: 43, mouthY: 115,\n      lx: 130, rx: 190, hw: 19, hh: 10, eyelid: 15\n    };\n\n    // ── Offscreen buffer ──\n    const _off = document.createElement('canvas');\n    _off.width = 320; _off.height = 170;\n\n    // ── Color helpers ──\n    function rgb(c) { return `rgb(${c[0]},${c[1]},${c[2]})`; }\n    function rgba(c, a) { return `rgba(${c[0]},${c[1]},${c[2]},${a})`; }\n    function lerp(c1, c2, t) {\n      if (t <= 0) return c1; if (t >= 1) return c2;\n      return [c1[0]+(c2[0]-c1[0])*t|0, c1[1]+(c2[1]-c1[1])*t|0, c1[2]+(c2[2]-c1[2])*t|0];\n    }\n    // Hex compat for renderMini\n    function hexToRgb(hex) {\n      if (typeof hex !== 'string') return {r:0,g:0,b:0};\n      if (hex.startsWith('rgb')) { const m=hex.match(/(\\d+)/g); return {r:+m[0],g:+m[1],b:+m[2]}; }\n      hex=hex.replace('#','');\n      if (hex.length===3) hex=hex[0]+hex[0]+hex[1]+hex[1]+hex[2]+hex[2];\n      return {r:parseInt(hex.slice(0,2),16),g:parseInt(hex.slice(2,4),16),b:parseInt(hex.slice(4,6),16)};\n    }\n    function lerpHex(c1,c2,t) {\n      const a=hexToRgb(c1),b=hexToRgb(c2);\n      return `rgb(${a.r+(b.r-a.r)*t|0},${a.g+(b.g-a.g)*t|0},${a.b+(b.b-a.b)*t|0})`;\n    }\n    function rgbaHex(hex,alpha) { const c=hexToRgb(hex); return `rgba(${c.r},${c.g},${c.b},${alpha})`; }\n\n    // ── Drawing primitives (ESP32 equivalents) ──\n\n    function fillCircle(ctx, x, y, r, col) {\n      ctx.fillStyle = rgb(col); ctx.beginPath(); ctx.arc(x, y, Math.max(0,r), 0, Math.PI*2); ctx.fill();\n    }\n\n    function fillEllipse(ctx, cx, cy, rx, ry, col) {\n      ctx.fillStyle = rgb(col); ctx.beginPath(); ctx.ellipse(cx, cy, Math.max(0,rx), Math.max(0,ry), 0, 0, Math.PI*2); ctx.fill();\n    }\n\n    function fillTriangle(ctx, x0,y0,x1,y1,x2,y2, col) {\n      ctx.fillStyle = rgb(col); ctx.beginPath();\n      ctx.moveTo(x0,y0); ctx.lineTo(x1,y1); ctx.lineTo(x2,y2);\n      ctx.closePath(); ctx.fill();\n    }\n\n    function drawLine(ctx, x0,y0,x1,y1, w, col) {\n      ctx.strokeStyle = rgb(col); ctx.lineWidth = w; ctx.lineCap = 'round';\n      ctx.beginPath(); ctx.moveTo(x0,y0); ctx.lineTo(x1,y1); ctx.stroke();\n    }\n\n    function drawCircleStroke(ctx, x, y, r, col) {\n      ctx.strokeStyle = rgb(col); ctx.lineWidth = 1;\n      ctx.beginPath(); ctx.arc(x, y, Math.max(0,r), 0, Math.PI*2); ctx.stroke();\n    }\n\n    // ── Scanlines (ESP32: every 2px, COL_SCAN color) ──\n    function drawScanlines(ctx) {\n      ctx.fillStyle = rgb(C.scan);\n      for (let y = 0; y < 170; y += 2) ctx.fillRect(0, y, 320, 1);\n    }\n\n    // ── Hood filled (column-by-column, ESP32 drawHoodFilled port) ──\n    function drawHoodFilled(ctx, col) {\n      const cx = G.cx, cy = G.cy;\n      const shoulder = 78, peakH = 60, baseY = 170, neckMinY = cy + 10;\n\n      const c_center = lerp(col, C.white, 0.04);\n      const c_inner = col;\n      const c_mid = lerp(col, C.bg, 0.25);\n      const c_outer = lerp(col, C.bg, 0.55);\n      const c_edge = lerp(col, C.bg, 0.82);\n\n      for (let dx = -shoulder; dx <= shoulder; dx++) {\n        const x = cx + dx;\n        if (x < 0 || x >= 320) continue;\n        const t = Math.abs(dx) / shoulder;\n\n        let topY = cy - peakH + (peakH * t * t)|0;\n        if (topY < 0) topY = 0;\n\n        let botY;\n        if (t < 0.28) { botY = baseY; }\n        else {\n          const curve = (t - 0.28) / 0.72;\n          const rise = 0.5 * (1 - Math.cos(curve * Math.PI));\n          botY = baseY - (rise * (baseY - neckMinY))|0;\n        }\n\n        const lineH = botY - topY;\n        if (lineH <= 0) continue;\n\n        // Horizontal gradient color\n        let hCol;\n        if (t < 0.12) hCol = lerp(c_center, c_inner, t / 0.12);\n        else if (t < 0.3) hCol = lerp(c_inner, c_mid, (t - 0.12) / 0.18);\n        else if (t < 0.55) hCol = lerp(c_mid, c_outer, (t - 0.3) / 0.25);\n        else if (t < 0.8) hCol = lerp(c_outer, c_edge, (t - 0.55) / 0.25);\n        else hCol = lerp(c_edge, C.bg, (t - 0.8) / 0.2);\n\n        // Vertical gradient: 45% top normal, 55% bottom darker\n        const topH = lineH * 45 / 100 | 0;\n        const botH = lineH - topH;\n        const botCol = lerp(hCol, C.bg, 0.35);\n\n        ctx.fillStyle = rgb(hCol);\n        ctx.fillRect(x, topY, 1, topH);\n        ctx.fillStyle = rgb(botCol);\n        ctx.fillRect(x, topY + topH, 1, botH);\n      }\n\n      // Edge highlight on upper arc\n      const edgeHL = lerp(col, C.white, 0.15);\n      for (let dx = -(shoulder-10); dx <= (shoulder-10); dx++) {\n        const t = Math.abs(dx) / shoulder;\n        const topY = cy - peakH + (peakH * t * t)|0;\n        const alpha = 0.4 * (1 - t * 1.3);\n        if (alpha > 0 && topY > 0) {\n          ctx.fillStyle = rgba(lerp(C.bg, edgeHL, alpha), 1);\n          ctx.fillRect(cx + dx, topY - 1, 1, 1);\n        }\n      }\n    }\n\n    // ── Face shadow (3 nested ellipses, ESP32 drawFaceShadow) ──\n    function drawFaceShadow(ctx) {\n      fillEllipse(ctx, G.cx, G.cy+2, 56, 62, [4,2,6]);\n      fillEllipse(ctx, G.cx, G.cy+5, 46, 54, [2,1,3]);\n      fillEllipse(ctx, G.cx, G.cy+10, 34, 42, [1,0,2]);\n    }\n\n    // ── Eye glow (2 concentric circles, ESP32 drawEyeGlow) ──\n    function drawEyeGlow(ctx, ex, ey, col, intensity) {\n      if (intensity < 0.05) return;\n      fillCircle(ctx, ex, ey, 24, lerp(C.bg, col, Math.min(1, 0.08*intensity)));\n      fillCircle(ctx, ex, ey, 16, lerp(C.bg, col, Math.min(1, 0.18*intensity)));\n    }\n\n    // ── Mandorla eye (2 triangles, ESP32 drawMandorlaEye) ──\n    function drawMandorlaEye(ctx, ex, ey, hw, hh, col) {\n      fillTriangle(ctx, ex-hw,ey, ex,ey-hh, ex+hw,ey, col);\n      fillTriangle(ctx, ex-hw,ey, ex,ey+hh, ex+hw,ey, col);\n    }\n\n    // ── Relaxed mandorla (with upper lid cut) ──\n    function drawMandorlaEyeRelaxed(ctx, ex, ey, hw, hh, col, lidPct) {\n      drawMandorlaEye(ctx, ex, ey, hw, hh, col);\n      if (lidPct > 0) {\n        const cutH = hh * lidPct / 100 | 0;\n        ctx.fillStyle = rgb(C.bg);\n        ctx.fillRect(ex-hw-1, ey-hh-1, hw*2+2, cutH+2);\n      }\n    }\n\n    // ── Happy eye (parabolic arc, 3px thick, ESP32 drawHappyEye) ──\n    function drawHappyEye(ctx, ex, ey, hw, col) {\n      ctx.fillStyle = rgb(col);\n      for (let dx = -hw; dx <= hw; dx++) {\n        const t = dx / hw;\n        const dy = (-8 * (1 - t*t))|0;\n        ctx.fillRect(ex+dx, ey+dy-1, 1, 3);\n      }\n    }\n\n    // ── Sigil symbol (ESP32 drawSigil exact port) ──\n    function drawSigil(ctx, sx, sy, col, scale, rotation) {\n      scale = scale || 1; rotation = rotation || 0;\n      // Glow halo (2 concentric circles)\n      const glowR = (14 * scale)|0;\n      if (glowR > 2) {\n        fillCircle(ctx, sx, sy, glowR+4, lerp(C.bg, col, 0.05));\n        fillCircle(ctx, sx, sy, glowR, lerp(C.bg, col, 0.12));\n      }\n      const cosR = Math.cos(rotation), sinR = Math.sin(rotation);\n      function pt(dx,dy) {\n        return [sx + (scale*(dx*cosR-dy*sinR))|0, sy + (scale*(dx*sinR+dy*cosR))|0];\n      }\n      // Cross (2px wide)\n      const [v0x,v0y]=pt(0,-8),[v1x,v1y]=pt(0,8);\n      const [h0x,h0y]=pt(-8,0),[h1x,h1y]=pt(8,0);\n      drawLine(ctx,v0x,v0y,v1x,v1y,2,col);\n      drawLine(ctx,h0x,h0y,h1x,h1y,2,col);\n      // Diagonals (1px)\n      const [d0x,d0y]=pt(-5,-5),[d1x,d1y]=pt(5,5);\n      const [d2x,d2y]=pt(-5,5),[d3x,d3y]=pt(5,-5);\n      drawLine(ctx,d0x,d0y,d1x,d1y,1,col);\n      drawLine(ctx,d2x,d2y,d3x,d3y,1,col);\n      // Center circle\n      drawCircleStroke(ctx, sx, sy, Math.max(1,(3*scale)|0), col);\n      // Cardinal points\n      ctx.fillStyle = rgb(col);\n      [pt(0,-10),pt(0,10),pt(-10,0),pt(10,0)].forEach(([px,py]) => {\n        ctx.fillRect(px, py, 1, 1);\n      });\n    }\n\n    // ── Mouth (parabolic curve for smiles/frowns) ──\n    function drawMouth(ctx, mx, my, w, col, curve) {\n      ctx.fillStyle = rgb(col);\n      for (let dx = -w; dx <= w; dx++) {\n        const t = dx / w;\n        const dy = (curve * t * t)|0;\n        ctx.fillRect(mx+dx, my+dy, 1, 1);\n        if (Math.abs(curve) > 3) ctx.fillRect(mx+dx, my+dy+1, 1, 1);\n      }\n    }\n\n    // ── Straight mouth line ──\n    function drawMouthLine(ctx, mx, my, hw, col) {\n      drawLine(ctx, mx-hw, my, mx+hw, my, 1, col);\n    }\n\n    // ── Text helper (ESP32 font approximation) ──\n    function drawText(ctx, text, x, y, col, size) {\n      ctx.fillStyle = rgb(col);\n      ctx.font = `${size||10}px \"JetBrains Mono\",monospace`;\n      ctx.textAlign = 'center'; ctx.textBaseline = 'middle';\n      ctx.fillText(text, x, y);\n    }\n\n    // ── State renderer (all 11 states, ESP32-accurate) ──\n    function renderStates(ctx, now, state) {\n      const {cx,cy,eyeY,sigilY,mouthY,lx,rx,hw,hh} = G;\n\n      if (state === 'IDLE') {\n        drawHoodFilled(ctx, C.hood);\n        drawFaceShadow(ctx);\n        const breath = 0.7 + 0.3*Math.sin(now/4000*Math.PI*2);\n        const eyeCol = [0, (255*breath)|0, (65*breath)|0];\n        drawEyeGlow(ctx, lx, eyeY, C.green, 0.8);\n        drawEyeGlow(ctx, rx, eyeY, C.green, 0.8);\n        const dx = (2*Math.sin(now/5000))|0, dy = (1*Math.cos(now/7000))|0;\n        drawMandorlaEyeRelaxed(ctx, lx, eyeY, hw, hh, eyeCol, G.eyelid);\n        drawMandorlaEyeRelaxed(ctx, rx, eyeY, hw, hh, eyeCol, G.eyelid);\n        fillCircle(ctx, lx+dx, eyeY+dy, 4, C.bg);\n        fillCircle(ctx, rx+dx, eyeY+dy, 4, C.bg);\n        const sb = 0.1 + 0.05*Math.sin(now/6000*Math.PI*2);\n        drawSigil(ctx, cx, sigilY, lerp(C.bg, C.red, sb), 0.6);\n        drawLine(ctx, cx-15, mouthY, cx+15, mouthY, 1, eyeCol);\n\n      } else if (state === 'THINKING') {\n        drawHoodFilled(ctx, C.hood);\n        drawFaceShadow(ctx);\n        drawEyeGlow(ctx, lx, eyeY, C.green, 1);\n        drawEyeGlow(ctx, rx, eyeY, C.green, 1);\n        drawMandorlaEyeRelaxed(ctx, lx, eyeY, hw, hh, C.green, 0);\n        drawMandorlaEyeRelaxed(ctx, rx, eyeY, hw, hh, C.green, 0);\n        fillCircle(ctx, lx, eyeY-5, 5, C.bg);\n        fillCircle(ctx, rx, eyeY-5, 5, C.bg);\n        const pulse = 0.7+0.3*Math.sin(now/1000*Math.PI*2);\n        const sigilCol = lerp(C.bg, C.red, pulse);\n        const rot = now/8000*Math.PI*2;\n        drawSigil(ctx, cx, sigilY, sigilCol, 1, rot);\n        drawLine(ctx, cx-12, mouthY, cx+12, mouthY, 1, C.green);\n        const dots = ['','.','..','...'][(now/400|0)%4];\n        if (dots) drawText(ctx, dots, cx, cy+50, C.dim, 14);\n\n      } else if (state === 'WORKING') {\n        drawHoodFilled(ctx, C.hood);\n        drawFaceShadow(ctx);\n        drawEyeGlow(ctx, lx, eyeY, C.green, 0.5);\n        drawEyeGlow(ctx, rx, eyeY, C.green, 0.5);\n        drawMandorlaEye(ctx, lx, eyeY, hw, 4, C.dim);\n        drawMandorlaEye(ctx, rx, eyeY, hw, 4, C.dim);\n        drawLine(ctx, lx-18, eyeY-14, lx+18, eyeY-14, 2, C.dim);\n        drawLine(ctx, rx-18, eyeY-14, rx+18, eyeY-14, 2, C.dim);\n        const rot = now/3000*Math.PI*2;\n        drawSigil(ctx, cx, sigilY, C.dim, 0.9, rot);\n        drawLine(ctx, cx-8, mouthY, cx+8, mouthY, 1, C.dim);\n        const dots = ['','.','..','...'][(now/600|0)%4];\n        if (dots) drawText(ctx, dots, cx, cy+50, C.dim, 14);\n\n      } else if (state === 'PROUD') {\n        drawHoodFilled(ctx, C.hoodLt);\n        drawFaceShadow(ctx);\n        drawEyeGlow(ctx, lx, eyeY, C.green, 1);\n        drawEyeGlow(ctx, rx, eyeY, C.green, 1);\n        drawHappyEye(ctx, lx, eyeY, (hw*0.7)|0, C.green);\n        drawHappyEye(ctx, rx, eyeY, (hw*0.7)|0, C.green);\n        const ss = 1.1+0.1*Math.sin(now/500*Math.PI*2);\n        drawSigil(ctx, cx, sigilY, C.red, ss);\n        const ringT = (now%1500)/1500;\n        const ringR = (15*ringT)|0;\n        const ringCol = lerp(C.red, C.bg, ringT);\n        if (ringR > 0) drawCircleStroke(ctx, cx, sigilY, ringR, ringCol);\n        drawMouth(ctx, cx, mouthY, 18, C.green, 7);\n\n      } else if (state === 'SLEEPING') {\n        drawHoodFilled(ctx, lerp(C.hood, C.bg, 0.4));\n        drawLine(ctx, lx-hw, eyeY, lx+hw, eyeY, 2, C.dim);\n        drawLine(ctx, rx-hw, eyeY, rx+hw, eyeY, 2, C.dim);\n        drawSigil(ctx, cx, sigilY, [40,0,10], 0.5);\n        const yOff = (5*Math.sin(now/800))|0;\n        drawText(ctx, 'z', cx+50, cy-45+yOff, C.dim, 14);\n        drawText(ctx, 'Z', cx+65, cy-60+yOff, C.dim, 24);\n        drawText(ctx, 'z', cx+85, cy-75+yOff, C.dim, 14);\n\n      } else if (state === 'HAPPY') {\n        drawHoodFilled(ctx, C.hoodLt);\n        drawFaceShadow(ctx);\n        drawEyeGlow(ctx, lx, eyeY, C.green, 1);\n        drawEyeGlow(ctx, rx, eyeY, C.green, 1);\n        drawHappyEye(ctx, lx, eyeY, (hw*0.8)|0, C.green);\n        drawHappyEye(ctx, rx, eyeY, (hw*0.8)|0, C.green);\n        const flash = (now/300|0)%2 === 0;\n        const sigilCol = flash ? C.red : [180,0,45];\n        const bounceY = (5*Math.sin(now/300*Math.PI*2))|0;\n        drawSigil(ctx, cx, sigilY+bounceY, sigilCol, 1.1);\n        drawMouth(ctx, cx, mouthY, 22, C.green, 9);\n        const sp = 0.5+0.5*Math.sin(now/600);\n        const starCol = [0,(255*sp)|0,(65*sp)|0];\n        drawText(ctx, '*', cx-60, cy-30, starCol, 14);\n        drawText(ctx, '*', cx+58, cy-30, starCol, 14);\n        drawText(ctx, '*', cx-45, cy-48, starCol, 8);\n        drawText(ctx, '*', cx+48, cy-48, starCol, 8);\n\n      } else if (state === 'CURIOUS') {\n        drawHoodFilled(ctx, C.hoodLt);\n        drawFaceShadow(ctx);\n        drawEyeGlow(ctx, lx, eyeY, C.green, 1);\n        drawEyeGlow(ctx, rx, eyeY, C.green, 1);\n        drawMandorlaEyeRelaxed(ctx, lx, eyeY, hw+2, hh+2, C.green, 0);\n        drawMandorlaEyeRelaxed(ctx, rx, eyeY, hw+2, hh+2, C.green, 0);\n        const scanX = (8*Math.sin(now/1500))|0;\n        fillCircle(ctx, lx+scanX, eyeY, 5, C.bg);\n        fillCircle(ctx, rx+scanX, eyeY, 5, C.bg);\n        drawLine(ctx, lx-20, eyeY-20, lx+15, eyeY-16, 2, C.green);\n        drawLine(ctx, rx-15, eyeY-16, rx+20, eyeY-20, 2, C.green);\n        const sp = 0.5+0.5*Math.sin(now/1000*Math.PI*2);\n        const sigilCol = lerp(C.bg, C.red, sp);\n        const tilt = 0.25*Math.sin(now/1200);\n        const sc = 0.9+0.2*sp;\n        drawSigil(ctx, cx, sigilY, sigilCol, sc, tilt);\n        drawCircleStroke(ctx, cx, mouthY, 5, C.green);\n        const qY = (3*Math.sin(now/800))|0;\n        drawText(ctx, '?', cx+80, cy-30+qY, C.dim, 24);\n\n      } else if (state === 'ALERT') {\n        drawHoodFilled(ctx, C.yellow);\n        drawFaceShadow(ctx);\n        drawEyeGlow(ctx, lx, eyeY, C.yellow, 1);\n        drawEyeGlow(ctx, rx, eyeY, C.yellow, 1);\n        drawMandorlaEye(ctx, lx, eyeY, hw, hh, C.yellow);\n        drawMandorlaEye(ctx, rx, eyeY, hw, hh, C.yellow);\n        fillCircle(ctx, lx, eyeY, 5, C.bg);\n        fillCircle(ctx, rx, eyeY, 5, C.bg);\n        drawLine(ctx, lx-18, eyeY-18, lx+5, eyeY-12, 2, C.yellow);\n        drawLine(ctx, rx-5, eyeY-12, rx+18, eyeY-18, 2, C.yellow);\n        const shakeX = (3*Math.sin(now/80))|0;\n        drawSigil(ctx, cx+shakeX, sigilY, C.red, 1.2);\n        // Zigzag mouth\n        for (let i = 0; i < 4; i++) {\n          const sx0 = cx-20+i*10, sy0 = mouthY+((i%2===0)?0:5);\n          const sx1 = sx0+10, sy1 = mouthY+((i%2===0)?5:0);\n          drawLine(ctx, sx0, sy0, sx1, sy1, 2, C.yellow);\n        }\n        if ((now/500|0)%2===0) drawText(ctx, '!', cx+90, cy-15, C.red, 24);\n\n      } else if (state === 'ERROR') {\n        drawHoodFilled(ctx, C.red);\n        drawFaceShadow(ctx);\n        drawEyeGlow(ctx, lx, eyeY, C.red, 0.6);\n        drawEyeGlow(ctx, rx, eyeY, C.red, 0.6);\n        // X marks\n        [lx, rx].forEach(ex => {\n          drawLine(ctx, ex-12, eyeY-12, ex+12, eyeY+12, 3, C.red);\n          drawLine(ctx, ex-12, eyeY+12, ex+12, eyeY-12, 3, C.red);\n        });\n        if (Math.random()>0.4) {\n          const sc = 0.7+Math.random()*0.3;\n          drawSigil(ctx, cx, sigilY, [120,0,30], sc);\n        }\n        drawLine(ctx, cx-15, mouthY+5, cx, mouthY, 2, C.red);\n        drawLine(ctx, cx, mouthY, cx+15, mouthY+5, 2, C.red);\n        drawText(ctx, 'reconnecting', cx, cy+55, C.red, 8);\n\n      } else if (state === 'BORED') {\n        const elapsed = now;\n        const phase = (elapsed/5000|0)%6;\n        const t = (elapsed%5000)/5000;\n\n        drawHoodFilled(ctx, C.hood);\n        drawFaceShadow(ctx);\n        drawEyeGlow(ctx, lx, eyeY, C.green, 0.7);\n        drawEyeGlow(ctx, rx, eyeY, C.green, 0.7);\n\n        if (phase === 0) {\n          // Eye Roll\n          const edx = (Math.cos(t*Math.PI*2)*12)|0;\n          const edy = (Math.sin(t*Math.PI*2)*12)|0;\n          drawMandorlaEyeRelaxed(ctx, lx, eyeY, hw, hh, C.green, G.eyelid);\n          drawMandorlaEyeRelaxed(ctx, rx, eyeY, hw, hh, C.green, G.eyelid);\n          fillCircle(ctx, lx+edx, eyeY+edy, 4, C.bg);\n          fillCircle(ctx, rx+edx, eyeY+edy, 4, C.bg);\n          drawSigil(ctx, cx, sigilY, [38,0,10], 0.6);\n          drawMouth(ctx, cx, mouthY, 10, C.dim, -2);\n          drawText(ctx, '...', cx, mouthY+18, [0,40,10], 8);\n\n        } else if (phase === 1) {\n          // Wander\n          let pdx=0, pdy=0;\n          if (t<0.25) { pdx=(-25*(t/0.25))|0; }\n          else if (t<0.5) { pdx=(-25+50*((t-0.25)/0.25))|0; }\n          else if (t<0.75) { pdx=(25*(1-(t-0.5)/0.25))|0; pdy=(-15*((t-0.5)/0.25))|0; }\n          else { pdy=(-15*(1-(t-0.75)/0.25))|0; }\n          drawMandorlaEyeRelaxed(ctx, lx, eyeY, hw, hh, C.green, G.eyelid);\n          drawMandorlaEyeRelaxed(ctx, rx, eyeY, hw, hh, C.green, G.eyelid);\n          fillCircle(ctx, lx+pdx, eyeY+pdy, 4, C.bg);\n          fillCircle(ctx, rx+pdx, eyeY+pdy, 4, C.bg);\n          const sb = (t>0.5&&t<0.75) ? 0.5 : 0.15;\n          drawSigil(ctx, cx, sigilY, lerp(C.bg, C.red, sb), 0.7);\n          drawLine(ctx, cx-10, mouthY, cx+10, mouthY, 1, C.dim);\n          if (t>0.6&&t<0.85) drawText(ctx, '?', cx+70, cy-35, [0,40,10], 14);\n\n        } else if (phase === 2) {\n          // Yawn\n          let yawnOpen;\n          if (t<0.3) yawnOpen=t/0.3;\n          else if (t<0.7) yawnOpen=1;\n          else yawnOpen=1-(t-0.7)/0.3;\n          const eyeH = Math.max(2, (hh*(1-yawnOpen*0.7))|0);\n          drawMandorlaEye(ctx, lx, eyeY, hw, eyeH, C.green);\n          drawMandorlaEye(ctx, rx, eyeY, hw, eyeH, C.green);\n          if (eyeH>3) { fillCircle(ctx,lx,eyeY,3,C.bg); fillCircle(ctx,rx,eyeY,3,C.bg); }\n          const mH = Math.max(1,(12*yawnOpen)|0);\n          fillEllipse(ctx, cx, mouthY, 8, mH, C.dim);\n          const sd = 0.15*(1-yawnOpen*0.8);\n          drawSigil(ctx, cx, sigilY, lerp(C.bg, C.red, sd), 0.6);\n\n        } else if (phase === 3) {\n          // Juggle\n          const bounceY = 30 - Math.abs(Math.sin(t*3*Math.PI))*60;\n          const juggleRot = t*4*Math.PI;\n          const juggleSY = sigilY + bounceY|0;\n          drawSigil(ctx, cx, juggleSY, C.red, 0.9, juggleRot);\n          const trackY = (bounceY*0.15)|0;\n          drawMandorlaEyeRelaxed(ctx, lx, eyeY, hw, hh, C.green, G.eyelid);\n          drawMandorlaEyeRelaxed(ctx, rx, eyeY, hw, hh, C.green, G.eyelid);\n          fillCircle(ctx, lx, eyeY+trackY-2, 4, C.bg);\n          fillCircle(ctx, rx, eyeY+trackY-2, 4, C.bg);\n          drawMouth(ctx, cx, mouthY, 12, C.green, 4);\n\n        } else if (phase === 4) {\n          // Doze off\n          let droop;\n          if (t<0.7) droop=t/0.7;\n          else if (t<0.8) droop=1-(t-0.7)/0.1;\n          else droop=0;\n          const eyeH = Math.max(2, (hh*(1-droop*0.85))|0);\n          const eyeCol = lerp(C.green, C.dim, droop*0.6);\n          drawMandorlaEye(ctx, lx, eyeY, hw, eyeH, eyeCol);\n          drawMandorlaEye(ctx, rx, eyeY, hw, eyeH, eyeCol);\n          if (eyeH>3) { fillCircle(ctx,lx,eyeY,3,C.bg); fillCircle(ctx,rx,eyeY,3,C.bg); }\n          if (droop<0.5||Math.random()>(droop*0.8))\n            drawSigil(ctx, cx, sigilY, lerp(C.bg,C.red,0.2*(1-droop)), 0.6);\n          drawLine(ctx, cx-10, mouthY, cx+10, mouthY, 1, C.dim);\n          if (t>0.7&&t<0.9) drawText(ctx, '!', cx+60, cy-30, C.green, 24);\n\n        } else {\n          // Whistle\n          drawMandorlaEyeRelaxed(ctx, lx, eyeY, hw, hh, C.green, G.eyelid);\n          drawMandorlaEyeRelaxed(ctx, rx, eyeY, hw, hh, C.green, G.eyelid);\n          fillCircle(ctx, lx, eyeY-6, 4, C.bg);\n          fillCircle(ctx, rx, eyeY-6, 4, C.bg);\n          const vinylRot = now/4000*Math.PI*2;\n          drawSigil(ctx, cx, sigilY, lerp(C.bg,C.red,0.35), 0.7, vinylRot);\n          drawCircleStroke(ctx, cx, mouthY, 4, C.green);\n          const nt1 = (t*2)%1, nt2 = (t*2+0.5)%1;\n          const ny1 = mouthY-10-(35*nt1)|0, ny2 = mouthY-10-(35*nt2)|0;\n          drawText(ctx, '~', cx+30, ny1, lerp(C.green,C.bg,nt1), 14);\n          drawText(ctx, '*', cx+45, ny2, lerp(C.green,C.bg,nt2), 8);\n        }\n      }\n    }\n\n    // ── Dormant frame (just pulsing sigil symbol) ──\n    function renderDormantFrame(canvas, startTime) {\n      const ctx = _off.getContext('2d');\n      ctx.fillStyle = rgb(C.bg);\n      ctx.fillRect(0, 0, 320, 170);\n      const now = Date.now() - startTime;\n      const pulse = 0.3 + 0.2*Math.sin(now/3000*Math.PI*2);\n      drawSigil(ctx, 160, 85, lerp(C.bg, C.red, pulse), 1.5);\n      drawScanlines(ctx);\n      _blit(canvas);\n    }\n\n    // ── Blit offscreen → visible canvas ──\n    function _blit(canvas) {\n      const vctx = canvas.getContext('2d');\n      const dpr = window.devicePixelRatio || 1;\n      const dw = canvas.clientWidth, dh = canvas.clientHeight;\n      if (canvas.width !== dw*dpr || canvas.height !== dh*dpr) {\n        canvas.width = dw*dpr; canvas.height = dh*dpr;\n      }\n      vctx.imageSmoothingEnabled = false;\n      vctx.drawImage(_off, 0, 0, dw*dpr, dh*dpr);\n    }\n\n    // ── Full frame render (offscreen 320×170 → pixelated blit) ──\n    function renderFrame(canvas, state, startTime) {\n      const ctx = _off.getContext('2d');\n      ctx.fillStyle = rgb(C.bg);\n      ctx.fillRect(0, 0, 320, 170);\n      const now = Date.now() - startTime;\n      renderStates(ctx, now, state);\n      drawScanlines(ctx);\n      _blit(canvas);\n    }\n\n    // ── Mini render (header — smooth, not pixel-art) ──\n    function renderMini(canvas, state, startTime) {\n      const ctx = canvas.getContext('2d');\n      const dpr = window.devicePixelRatio || 1;\n      const dispW = canvas.clientWidth, dispH = canvas.clientHeight;\n      if (canvas.width !== dispW*dpr || canvas.height !== dispH*dpr) {\n        canvas.width = dispW*dpr; canvas.height = dispH*dpr;\n      }\n      const now = Date.now() - startTime;\n      ctx.save(); ctx.scale(dpr, dpr);\n      ctx.clearRect(0, 0, dispW, dispH);\n      const cx = dispW/2, ey = dispH/2;\n      const es = dispH*0.35, gr = dispH*0.6, ed = dispW*0.22;\n      const COL = { eye:'#00ff41', glow:'#00ff41', bg:'#050208' };\n\n      function miniGlowEye(ex, ey2, es2, col, gcol, gr2, inten) {\n        inten = inten ?? 1;\n        const gc = hexToRgb(gcol);\n        const g1 = ctx.createRadialGradient(ex,ey2,0,ex,ey2,gr2*0.7*inten);\n        g1.addColorStop(0, `rgba(${gc.r},${gc.g},${gc.b},${0.18*inten})`);\n        g1.addColorStop(0.5, `rgba(${gc.r},${gc.g},${gc.b},${0.08*inten})`);\n        g1.addColorStop(1, 'rgba(0,0,0,0)');\n        ctx.fillStyle = g1;\n        ctx.beginPath(); ctx.arc(ex,ey2,gr2*0.7*inten,0,Math.PI*2); ctx.fill();\n        const hw2=es2, hh2=es2*0.52;\n        ctx.save(); ctx.beginPath();\n        ctx.moveTo(ex-hw2,ey2); ctx.lineTo(ex,ey2-hh2); ctx.lineTo(ex+hw2,ey2); ctx.lineTo(ex,ey2+hh2);\n        ctx.closePath(); ctx.clip();\n        ctx.fillStyle = col; ctx.fillRect(ex-hw2,ey2-hh2,hw2*2,hh2*2);\n        ctx.fillStyle = 'rgba(0,0,0,0.35)';\n        for (let y2=ey2-hh2;y2<ey2+hh2;y2+=3) ctx.fillRect(ex-hw2,y2,hw2*2,1);\n        ctx.fillStyle = COL.bg;\n        ctx.fillRect(ex-hw2-1,ey2-hh2-1,hw2*2+2,(hh2*0.15|0)+1);\n        ctx.restore();\n        ctx.fillStyle = '#000';\n        ctx.beginPath(); ctx.arc(ex,ey2+1,es2*0.13,0,Math.PI*2); ctx.fill();\n      }\n      function miniHappyEye(ex, ey2, es2, col, gcol, gr2) {\n        const gc = hexToRgb(gcol);\n        const g1=ctx.createRadialGradient(ex,ey2,0,ex,ey2,gr2*0.7);\n        g1.addColorStop(0,`rgba(${gc.r},${gc.g},${gc.b},0.25)`);\n        g1.addColorStop(1,'rgba(0,0,0,0)');\n        ctx.fillStyle=g1; ctx.beginPath(); ctx.arc(ex,ey2,gr2*0.7,0,Math.PI*2); ctx.fill();\n        ctx.strokeStyle=col; ctx.lineWidth=3.5; ctx.lineCap='round';\n        ctx.beginPath(); ctx.arc(ex,ey2+es2*0.3,es2*0.8,Math.PI*1.15,Math.PI*1.85); ctx.stroke();\n      }\n\n      if (state==='SLEEPING') {\n        ctx.strokeStyle=rgbaHex(COL.eye,0.3); ctx.lineWidth=2; ctx.lineCap='round';\n        ctx.beginPath(); ctx.moveTo(cx-ed-es,ey); ctx.lineTo(cx-ed+es,ey); ctx.stroke();\n        ctx.beginPath(); ctx.moveTo(cx+ed-es,ey); ctx.lineTo(cx+ed+es,ey); ctx.stroke();\n      } else if (state==='HAPPY'||state==='PROUD') {\n        miniHappyEye(cx-ed,ey,es,COL.eye,COL.glow,gr);\n        miniHappyEye(cx+ed,ey,es,COL.eye,COL.glow,gr);\n      } else if (state==='ERROR') {\n        ctx.strokeStyle='#ff0040'; ctx.lineWidth=3; ctx.lineCap='round';\n        const xs=es*0.6;\n        [cx-ed,cx+ed].forEach(ex2=>{\n          ctx.beginPath(); ctx.moveTo(ex2-xs,ey-xs); ctx.lineTo(ex2+xs,ey+xs); ctx.stroke();\n          ctx.beginPath(); ctx.moveTo(ex2-xs,ey+xs); ctx.lineTo(ex2+xs,ey-xs); ctx.stroke();\n        });\n      } else if (state==='ALERT') {\n        miniGlowEye(cx-ed,ey,es,'#ffaa00','#ffaa00',gr,1);\n        miniGlowEye(cx+ed,ey,es,'#ffaa00','#ffaa00',gr,1);\n      } else if (state==='THINKING'||state==='WORKING') {\n        const p=0.6+0.4*Math.sin(now/800);\n        miniGlowEye(cx-ed,ey-2,es,COL.eye,COL.glow,gr,p);\n        miniGlowEye(cx+ed,ey-2,es,COL.eye,COL.glow,gr,p);\n      } else {\n        const breath=0.7+0.3*Math.sin(now/4000*Math.PI*2);\n        const ec=lerpHex('#004415',COL.eye,breath);\n        const dx2=2*Math.sin(now/5000), dy2=1*Math.cos(now/7000);\n        miniGlowEye(cx-ed+dx2,ey+dy2,es,ec,COL.glow,gr,breath);\n        miniGlowEye(cx+ed+dx2,ey+dy2,es,ec,COL.glow,gr,breath);\n      }\n      ctx.restore();\n    }\n\n    // Legacy compat\n    const COL = { hood:'#3d1560',hoodEdge:'#6a2d9e',eye:'#00ff41',glow:'#00ff41',sigil:'#ff0040',bg:'#050208' };\n\n    return { renderFrame, renderMini, renderDormantFrame, COL };\n  })();\n\n  // ── Sigil Widget State ──\n  let _sigilState = 'IDLE';\n  let _sigilStartTime = Date.now();\n  let _sigilOnline = false;\n  let _sigilStateTime = Date.now();\n  let _sigilAnimFrame = null;\n  let _sigilDormant = true;\n\n  // Map API state → button text for highlight\n  const _sigilBtnMap = {\n    'HAPPY': 'HAPPY', 'THINKING': 'THINK', 'SLEEPING': 'SLEEP',\n    'ALERT': 'ALERT', 'PROUD': 'PROUD', 'CURIOUS': 'CURIO', 'IDLE': 'IDLE'\n  };\n\n  function _updateSigilBtns(state) {\n    const target = _sigilBtnMap[state];\n    document.querySelectorAll('.btn-sigil-term').forEach(btn => {\n      if (target && btn.textContent.trim() === target) {\n        btn.classList.add('sigil-active');\n      } else {\n        btn.classList.remove('sigil-active');\n      }\n    });\n  }\n\n  function setSigilState(state) {\n    if (state !== _sigilState) {\n      _sigilState = state;\n      _sigilStartTime = Date.now();\n      _sigilStateTime = Date.now();\n    }\n    _sigilOnline = true;\n    const moodEl = document.getElementById('sigil-mood-info');\n    if (moodEl) moodEl.textContent = state;\n    _updateSigilBtns(state);\n  }\n\n  function updateSigilIndicator(state) {\n    const ind = document.getElementById('sigil-indicator');\n    if (ind) {\n      ind.setAttribute('data-state', state);\n      ind.title = 'Sigil: ' + state;\n      const label = document.getElementById('sigil-label');\n      if (label) label.textContent = state;\n    }\n    setSigilState(state);\n    // Auto-wake: quando arriva stato reale dal WS, esci da dormant\n    if (_sigilDormant) wakeSigil();\n  }\n\n  // ── Wake sigil (click to activate) ──\n  function wakeSigil() {\n    if (!_sigilDormant) return;\n    _sigilDormant = false;\n    const label = document.getElementById('sigil-wake-label');\n    if (label) label.style.display = 'none';\n    const cmds = document.getElementById('sigil-commands');\n    if (cmds) cmds.style.display = 'flex';\n    const textRow = document.querySelector('.sigil-text-row');\n    if (textRow) textRow.style.display = 'flex';\n    const dbgToggle = document.querySelector('.sigil-debug-toggle');\n    if (dbgToggle) dbgToggle.style.display = 'flex';\n  }\n\n  // ── Toggle debug controls ──\n  function toggleSigilDebug() {\n    const el = document.getElementById('sigil-debug-actions');\n    if (el) el.style.display = el.style.display === 'none' ? 'flex' : 'none';\n  }\n\n  // ── Animation loop ──\n  function _sigilAnimLoop() {\n    const wc = document.getElementById('sigil-widget-canvas');\n    if (wc && wc.offsetParent !== null) {\n      if (_sigilDormant) {\n        SigilEngine.renderDormantFrame(wc, _sigilStartTime);\n      } else {\n        SigilEngine.renderFrame(wc, _sigilState, _sigilStartTime);\n      }\n    }\n    const mc = document.getElementById('sigil-header-canvas');\n    if (mc && mc.offsetParent !== null) {\n      SigilEngine.renderMini(mc, _sigilState, _sigilStartTime);\n    }\n    if (!_sigilDormant) {\n      const timerEl = document.getElementById('sigil-mood-timer');\n      if (timerEl) {\n        const elapsed = Math.floor((Date.now() - _sigilStateTime) / 1000);\n        if (elapsed < 60) timerEl.textContent = elapsed + 's';\n        else if (elapsed < 3600) timerEl.textContent = Math.floor(elapsed/60) + 'm ' + (elapsed%60) + 's';\n        else timerEl.textContent = Math.floor(elapsed/3600) + 'h ' + Math.floor((elapsed%3600)/60) + 'm';\n      }\n    }\n    _sigilAnimFrame = requestAnimationFrame(_sigilAnimLoop);\n  }\n\n  _sigilAnimLoop();\n\n  // ── Sigil commands ──\n  function sigilCommand(state) {\n    fetch('/api/tamagotchi/state', {\n      method: 'POST',\n      headers: { 'Content-Type': 'application/json' },\n      body: JSON.stringify({ state })\n    }).then(r => r.json()).then(d => {\n      if (d.ok !== false) showToast('Sigil: ' + state);\n    }).catch(() => showToast('Errore invio comando'));\n  }\n\n  function sigilSendText() {\n    const input = document.getElementById('sigil-text-input');\n    if (!input || !input.value.trim()) return;\n    fetch('/api/tamagotchi/text', {\n      method: 'POST',\n      headers: { 'Content-Type': 'application/json' },\n      body: JSON.stringify({ text: input.value.trim() })\n    }).then(r => r.json()).then(d => {\n      if (d.ok !== false) showToast('Messaggio inviato');\n      input.value = '';\n    }).catch(() => showToast('Errore invio messaggio'));\n  }\n\n  function sigilOTA() {\n    if (!confirm('Avviare aggiornamento OTA firmware?')) return;\n    fetch('/api/tamagotchi/ota', { method: 'POST' })\n      .then(r => r.json())\n      .then(d => showToast(d.status || 'OTA avviato'))\n      .catch(() => showToast('Errore OTA'));\n  }\n\n  function scrollToSigilWidget() {\n    switchView('dashboard');\n    setTimeout(() => {\n      const el = document.getElementById('sigil-widget-wrap');\n      if (el) el.scrollIntoView({ behavior: 'smooth', block: 'center' });\n    }, 100);\n  }\n\n// --- system.js --- \n  // ── Widget: System actions ──\n  function killSession(name) { send({ action: 'tmux_kill', session: name }); }\n  function gatewayRestart() { showToast('[..] Riavvio gateway…'); send({ action: 'gateway_restart' }); }\n  function requestStats() { send({ action: 'get_stats' }); }\n  async function flashOTA() {\n    if (!confirm('Aggiornare firmware ESP32 via WiFi?\\nIl Sigil si riavvierà al termine.')) return;\n    showToast('[..] OTA in corso…');\n    try {\n      const r = await fetch('/api/tamagotchi/ota', { method: 'POST' });\n      const d = await r.json();\n      showToast(d.ok ? '[ok] OTA inviato — Sigil si aggiorna' : '[!] OTA fallito: ' + (d.error || '?'));\n    } catch (e) {\n      showToast('[!] Errore OTA: ' + e.message);\n    }\n  }\n\n// --- tokens.js --- \n  // ── Widget: Tokens (preview tile only — detail in Profile) ──\n  function renderTokens(data) {\n    const tp = document.getElementById('wt-tokens-preview');\n    if (tp) {\n      const inTok = (data.today_input || 0);\n      const outTok = (data.today_output || 0);\n      const fmt = n => n >= 1000 ? (n/1000).toFixed(1) + 'K' : n;\n      const model = (data.last_model || '').split('-').pop() || '';\n      tp.textContent = fmt(inTok) + ' in / ' + fmt(outTok) + ' out' + (model ? ' · ' + model : '');\n    }\n  }\n\n  // ── Usage Report ──\n  function loadUsageReport(period, btn) {\n    if (btn) {\n      document.querySelectorAll('.usage-period-btn').forEach(b => b.classList.remove('active'));\n      btn.classList.add('active');\n    }\n    send({ action: 'get_usage_report', period: period || 'day' });\n  }\n\n  const _providerNames = {\n    anthropic: 'Haiku', openrouter: 'OpenRouter', ollama: 'Local',\n    ollama_pc: 'PC', unknown: '?'\n  };\n  const _providerColors = {\n    anthropic: 'var(--accent)', openrouter: 'var(--amber)', ollama: 'var(--muted)',\n    ollama_pc: 'var(--cyan)'\n  };\n\n  function renderUsageReport(data) {\n    const el = document.getElementById('tokens-drawer-body');\n    if (!el) return;\n    const fmt = n => n >= 1000000 ? (n/1000000).toFixed(1) + 'M' : n >= 1000 ? (n/1000).toFixed(1) + 'K' : n;\n    const rows = data.rows || [];\n    const total = data.total || { input: 0, output: 0, calls: 0 };\n    if (!rows.length) {\n      el.innerHTML = '<div class=\"no-items\">// nessun utilizzo nel periodo</div>';\n      return;\n    }\n    let html = '<div style=\"overflow-x:auto;\"><table style=\"width:100%;border-collapse:collapse;font-size:11px;\">';\n    html += '<tr style=\"color:var(--muted);text-align:left;border-bottom:1px solid var(--border);\"><th style=\"padding:4px 6px;\">Provider</th><th style=\"padding:4px 6px;text-align:right;\">In</th><th style=\"padding:4px 6px;text-align:right;\">Out</th><th style=\"padding:4px 6px;text-align:right;\">Tot</th><th style=\"padding:4px 6px;text-align:right;\">Calls</th></tr>';\n    rows.forEach(r => {\n      const name = _providerNames[r.provider] || r.provider;\n      const color = _providerColors[r.provider] || 'var(--text2)';\n      const tot = r.input + r.output;\n      html += `<tr style=\"border-bottom:1px solid var(--border);\">\n        <td style=\"padding:4px 6px;color:${color};font-weight:600;\">${esc(name)}</td>\n        <td style=\"padding:4px 6px;text-align:right;color:var(--text2);\">${fmt(r.input)}</td>\n        <td style=\"padding:4px 6px;text-align:right;color:var(--text2);\">${fmt(r.output)}</td>\n        <td style=\"padding:4px 6px;text-align:right;color:var(--text);\">${fmt(tot)}</td>\n        <td style=\"padding:4px 6px;text-align:right;color:var(--muted);\">${r.calls}</td>\n      </tr>`;\n    });\n    const grandTot = total.input + total.output;\n    html += `<tr style=\"font-weight:700;\">\n      <td style=\"padding:6px;color:var(--accent);\">TOTALE</td>\n      <td style=\"padding:6px;text-align:right;color:var(--accent);\">${fmt(total.input)}</td>\n      <td style=\"padding:6px;text-align:right;color:var(--accent);\">${fmt(total.output)}</td>\n      <td style=\"padding:6px;text-align:right;color:var(--accent);\">${fmt(grandTot)}</td>\n      <td style=\"padding:6px;text-align:right;color:var(--accent);\">${total.calls}</td>\n    </tr>`;\n    html += '</table></div>';\n    el.innerHTML = html;\n  }\n\n// --- tracker.js --- \n  // ── Widget: Bug Tracker ──\n  let _trackerFormVisible = false;\n\n  function loadTracker(statusFilter) {\n    const el = document.getElementById('tracker-status-filter');\n    const status = (statusFilter !== undefined && statusFilter !== null)\n        ? statusFilter\n        : (el ? el.value : 'open');\n    send({ action: 'tracker_get', status });\n  }\n\n  function showTrackerForm() {\n    _trackerFormVisible = !_trackerFormVisible;\n    const form = document.getElementById('tracker-form');\n    if (form) form.style.display = _trackerFormVisible ? 'block' : 'none';\n  }\n\n  function submitTracker() {\n    const title = document.getElementById('tracker-input-title')?.value.trim();\n    if (!title) { showToast('Titolo obbligatorio'); return; }\n    const body     = document.getElementById('tracker-input-body')?.value.trim() || '';\n    const itype    = document.getElementById('tracker-input-type')?.value || 'note';\n    const priority = document.getElementById('tracker-input-priority')?.value || 'P2';\n    send({ action: 'tracker_add', title, body, itype, priority });\n    // Reset form\n    ['tracker-input-title','tracker-input-body'].forEach(id => {\n      const el = document.getElementById(id);\n      if (el) el.value = '';\n    });\n    _trackerFormVisible = false;\n    const form = document.getElementById('tracker-form');\n    if (form) form.style.display = 'none';\n  }\n\n  function trackerUpdateStatus(id, status) {\n    send({ action: 'tracker_update', id, status });\n  }\n\n  function trackerDelete(id) {\n    send({ action: 'tracker_delete', id });\n  }\n\n  function renderTracker(items) {\n    // Aggiorna preview tile\n    const tp = document.getElementById('wt-tracker-preview');\n    if (tp) {\n      const open = (items || []).filter(i => i.status === 'open').length;\n      tp.textContent = open ? open + ' open' : 'nessuno';\n    }\n\n    const el = document.getElementById('tracker-body');\n    if (!el) return;\n\n    const statusFilter = document.getElementById('tracker-status-filter')?.value || 'open';\n    const TYPE_BADGE = { bug: 'badge-red', feature: 'badge-green', note: 'badge-muted' };\n    const PRI_BADGE  = { P0: 'badge-red', P1: 'badge-amber', P2: 'badge-muted', P3: 'badge-muted' };\n\n    let rows = '';\n    if (!items || items.length === 0) {\n      rows = '<div class=\"no-items\">Nessun item ' + statusFilter + '</div>';\n    } else {\n      rows = items.map(it => {\n        const typeCls = TYPE_BADGE[it.type] || 'badge-muted';\n        const priCls  = PRI_BADGE[it.priority] || 'badge-muted';\n        const isClosed = it.status === 'closed';\n        const toggleLabel = isClosed ? '↩' : '✓';\n        const toggleStatus = isClosed ? 'open' : 'closed';\n        return `<div class=\"tracker-item${isClosed ? ' tracker-closed' : ''}\">\n          <div class=\"tracker-item-head\">\n            <span class=\"badge ${typeCls}\">${esc(it.type)}</span>\n            <span class=\"badge ${priCls}\">${esc(it.priority)}</span>\n            <span class=\"tracker-title\">${esc(it.title)}</span>\n            <div class=\"tracker-item-actions\">\n              <button class=\"btn-ghost btn-xs\" title=\"${toggleStatus}\" onclick=\"trackerUpdateStatus(${it.id},'${toggleStatus}')\">${toggleLabel}</button>\n              <button class=\"btn-ghost btn-xs\" title=\"Elimina\" onclick=\"trackerDelete(${it.id})\">×</button>\n            </div>\n          </div>\n          ${it.body ? `<div class=\"tracker-body-text\">${esc(it.body)}</div>` : ''}\n          <div class=\"tracker-item-meta\">${it.ts.substring(0,16).replace('T',' ')}</div>\n        </div>`;\n      }).join('');\n    }\n\n    el.innerHTML = `\n      <div style=\"display:flex;gap:6px;margin-bottom:10px;align-items:center;\">\n        <select id=\"tracker-status-filter\" class=\"input-field\" style=\"flex:1;font-size:11px;\"\n                onchange=\"loadTracker(this.value)\">\n          <option value=\"open\"${statusFilter==='open'?' selected':''}>Open</option>\n          <option value=\"closed\"${statusFilter==='closed'?' selected':''}>Closed</option>\n          <option value=\"\"${statusFilter===''?' selected':''}>Tutti</option>\n        </select>\n        <button class=\"btn-ghost btn-sm\" onclick=\"loadTracker()\">↻</button>\n      </div>\n      <div id=\"tracker-form\" style=\"display:none;margin-bottom:10px;padding:10px;border:1px solid var(--border);border-radius:4px;\">\n        <input type=\"text\" id=\"tracker-input-title\" class=\"input-field\" placeholder=\"Titolo *\" style=\"width:100%;margin-bottom:6px;\">\n        <textarea id=\"tracker-input-body\" class=\"input-field\" placeholder=\"Note (opzionale)\" rows=\"2\" style=\"width:100%;margin-bottom:6px;resize:vertical;\"></textarea>\n        <div style=\"display:flex;gap:6px;margin-bottom:6px;\">\n          <select id=\"tracker-input-type\" class=\"input-field\" style=\"flex:1;font-size:11px;\">\n            <option value=\"bug\">Bug</option>\n            <option value=\"feature\">Feature</option>\n            <option value=\"note\" selected>Note</option>\n          </select>\n          <select id=\"tracker-input-priority\" class=\"input-field\" style=\"flex:1;font-size:11px;\">\n            <option value=\"P0\">P0 critico</option>\n            <option value=\"P1\">P1 alto</option>\n            <option value=\"P2\" selected>P2 medio</option>\n            <option value=\"P3\">P3 basso</option>\n          </select>\n        </div>\n        <div style=\"display:flex;gap:6px;\">\n          <button class=\"btn-green btn-sm\" onclick=\"submitTracker()\">Salva</button>\n          <button class=\"btn-ghost btn-sm\" onclick=\"showTrackerForm()\">Annulla</button>\n        </div>\n      </div>\n      <div id=\"tracker-list\">${rows}</div>`;\n  }\n\n  </script>\n</body>\n\n</html>\n"
+HTML = "<!DOCTYPE html>\n<html lang=\"it\">\n\n<head>\n  <meta charset=\"UTF-8\">\n  <meta name=\"viewport\"\n    content=\"width=device-width, initial-scale=1.0, maximum-scale=1.0, user-scalable=no, viewport-fit=cover\">\n  <meta name=\"apple-mobile-web-app-capable\" content=\"yes\">\n  <meta name=\"apple-mobile-web-app-status-bar-style\" content=\"black-translucent\">\n  <meta name=\"theme-color\" content=\"#020502\">\n  <link rel=\"icon\" type=\"image/jpeg\"\n    href=\"data:image/jpeg;base64,/9j/4AAQSkZJRgABAQAAAQABAAD/2wBDAAYEBQYFBAYGBQYHBwYIChAKCgkJChQODwwQFxQYGBcUFhYaHSUfGhsjHBYWICwgIyYnKSopGR8tMC0oMCUoKSj/2wBDAQcHBwoIChMKChMoGhYaKCgoKCgoKCgoKCgoKCgoKCgoKCgoKCgoKCgoKCgoKCgoKCgoKCgoKCgoKCgoKCgoKCj/wAARCABAAEADASIAAhEBAxEB/8QAGwAAAgMBAQEAAAAAAAAAAAAAAAQDBQYBAgj/xAAzEAACAQMCAwUGBQUAAAAAAAABAgMABBEFIRIxUQYTFEFhIkJxgZGhMjM0YqIkUsHR4f/EABgBAQEBAQEAAAAAAAAAAAAAAAABAwIE/8QAHxEAAgIBBQEBAAAAAAAAAAAAAAECERIDBCExQcHx/9oADAMBAAIRAxEAPwD5foooqHIAEkAAknYAedMizkH5jRxnozbj5DJFTWscihEgXNzMCQc44Ewd8+WwJJ6fGr9ez8EOlie/MMMUhKxz3DlQxHMKu2PoTQqRmWtJMewUk2zhGyfpzper++0TwyQvaSxnvPy2STiSQjnggnBz8xVXcDvo3lK8M8ZxKMYzvjJ9c7H4g9aBoUooooQK6AWIUczsK5U1mvFdwD965+GcmgNDoAifV7xiMmFfYB3GAcDPpsnyzVz2g0+41Se27+QeGjZymWwFTCYUnkvnz3361R9mTEt3LNNJwRzJMr7kAIEBJyN+Zxt51Z6fdxppd1OyeKhZSixNk96SyjG4OPIEnfpWepdpo921cMXGa7+cjGmaSLF57cujW5mWQSNt7JU5AbqMDl0qg1e0MGslXzifijckjdweEnbrlWq0vrqNotOcq9vaTAKsaEjg3wQMY8s/9pfti8Ul74u2ZQomAQDkR3YwR6ZQfWmnfpN0oKlDz9MmOW/Oipr1Al3Mq/hDnHw5ioa0PEFMWP6kHojn+BpemLDe6Vf7wyD4lSB9zQFlp83dTaR3eULSzIXzsckD/VbWyS/vdVk0/TrKGSGBC8jKgGCB7uOZxvjesHbL4my7iIMLlJBJAVO/H5rj1XhI9Vx50/pvajV9O1gXGl3ipcToglWUDhDqMb8W2ee/7qjVm0Z4x47NzeeI0u6nS9igDwWviY3GzBdxupGzZHpnJrBX3FcdmraZlAMGNwv4svjJP2+VM33aHV+1F5Kt5NCZ5UEGY0CIIwcsxxzGw+u1edWuLaLSFs4JJBJ3iIsLAflpxZc48y2dvWolTE55JWUV9+oz1RD/AAWl6nvz/VyAe7hPoAP8VBXRiFdUlWBU4IOQelcooB/DTsZbRlWRx7UedwfQefUYz08q8a1O1/qcs726wSv+NVJxkbEnPLkc0nz50yLyXbIjZh77Rgn786FsLG7ltobuNSVkkQQ8QXZV4sk/b6E1I7eELcTCW6Jyxb2uA+vVvTcD48o/GSDHAkKMPeVN/vnHypckkkkkk7kmgs4SSSSck+dFFFCH/9k=\">\n  <link rel=\"apple-touch-icon\" sizes=\"192x192\"\n    href=\"data:image/jpeg;base64,/9j/4AAQSkZJRgABAQAAAQABAAD/2wBDAAYEBQYFBAYGBQYHBwYIChAKCgkJChQODwwQFxQYGBcUFhYaHSUfGhsjHBYWICwgIyYnKSopGR8tMC0oMCUoKSj/2wBDAQcHBwoIChMKChMoGhYaKCgoKCgoKCgoKCgoKCgoKCgoKCgoKCgoKCgoKCgoKCgoKCgoKCgoKCgoKCgoKCgoKCj/wAARCADAAMADASIAAhEBAxEB/8QAHAABAQADAQEBAQAAAAAAAAAAAAUDBAYCBwEI/8QARRAAAgEDAgMFBQUFBQUJAAAAAQIDAAQRBSEGEjETIkFRYRQycYGRFSNCobEHYnKCwSRSkrKzNmN1ovAlMzRTZKPC0eL/xAAZAQEBAQEBAQAAAAAAAAAAAAAAAQIDBAX/xAAqEQEAAgIBAwEHBQEAAAAAAAAAAQIDESEEEjFBEyJRYXGBoSMykcHw4f/aAAwDAQACEQMRAD8A/l+lKVGSlKUClKUClKUClKUClK/MjxI+tB+0oN+m/wAKUClKUClKUClKUClKUClKUClKUClKUClKUClK2tNsZtRu1t4OQEgszueVI1G7Ox8FA3JoMVrbT3dwkFrDJNM+yxxqWY/IVU+zbCxJ+1r7nmB3trHllYfxSZ5R8uY+le7u9RYpNN0IMloVxPOdnusdWc/hj8k6DbmyajtPBAMQos7/AN9x3R8F8fifpRVaK+th3dM0OBzj37kvcv8A/FB/hrKNc1aJT2dxZ2oA92KKCM48sKua07HRtZ1oqI45OyILKZDyJj0Hj8hWpc6PPbCQvJCyocEo2fpQ0rrqWou2JLPTL0nozWkLnb95QDWJ72wkfk1HRUgJO72cjwuP5XLKfoPjUZtOuVtknMf3TnlVsjc15SWe17kikoRns5FyCP8ArxFDStdaRm1e80ub22zjGZCF5ZYB/vE3wP3gSvr4VKrdtJ2hmW80uWSGeMk8obvJ8D+Ief5giqUkFvrsMk+nwx22pxoXms4xhJlAyzwjwIG5j+JXbKgiBSlKBSlKBSlKBSlKBSlKBSlKBSlKBV3UFbTLJNIiQ+3T8r3uB3geqQ/AbM37xAPuCsPDkUa3E9/cRrJb2EfblG6O+QsaH4uQT6A1OkndUluJCXnmLAOeuT7zfHfHzNB4uJWx7JbEsGI5yoyZG9PQeA+ddFpWnGyMYtbSK61JVMkslxjsrcAE+JAJA69em2DXjQtMh03RG4h1GVBluzsrfYtPIOufJR1J+A6muj0yxk1VrIavHcSSXCe0R2Ma/f33kT4RxA7LnbYkAk0aYbWbVNV7VtOmmu5sHtbps28EA6d3ByfixA9DS60bVZFJs49KnuSVY3Elyk8vpyhu6g9MZ6V1XE9hb8NaHay8QQxSxdsxttHt5R2MbFOf71jlmJ6DPXfpgE8Rc8bWshhSHhPh6O3iDKEMBLMD4MwIJ33zQnhnttG1m1S5WWwilumIUmJd2A6jH/dv06EE+R3qYbM3NuxRM25GHsySWiOd+zzuCD4HruN+gtadrPBmpJ7NqeiTaVI/KBcWs7PEjbd8oSCN89PDzNeOJLCKwuLf7P1OO+mkQCCTmLCSM57jHGGycjzGPhRYjfhwUsMlqY54ZMqTlXXYqw8D4gitmCdudLu0ZobqFhITGcFWByHXHTf6H8uhhuBqQmSURBWXL9scEFfwHb3sDGfE8p65rndVtJNF1iSJTzKh5o2YbOh6H4EUTSlq0UWoWQ1a0jCPzBL2FBhY5D0dR4I+Dt0VgR0K1FqrpV5DY3/NIGbTbtDFPH5xMdx6lSAR6qDWpqllLp2o3FnOQZIXKFl6N5MPQjBHoaMtWlKUClKUClKUClKUClKUClKdNzQWbjmteFbSEBea/uGuCB1KR/dp8uZpfpWh7K19rVtp8OSedbdeUZ3zgn6kmqmthY9T0+1K4Szs4VYZ8eTtX/5nNev2dyG312fVG5SdOtpbwFiR3lHdxjxyRRYdNp0UFxqN7ql3bpc6ToSpp9ja52nmzyqBtuS3M5NdFLqknC8d5d392knEN7g3dyYwRbIR3YkzvzDyA8N8YzUKK1k07Q+GtMti32hdSnUpipyzNjCbeffA+INafGao2jWzW8MqGO6V3Unm5F5AuWPq2friuV7+9FPi+j0/T/oX6mY32+I+8eWtx/cMLW2hWVZIpp3mLY7zlVChsnfBBO1cXGjySLHGrO7kKqqMliegA8TXZcaw3WoXOnQ21q8svZTOFjUkkBsnbyAGfrWHS7FdPuNO1XTZJuzZuzkWdVDIWBVsEdCCDg9RkGpjtFccTK9bitl6u9ax41/UOSYFWIYEEHBBGCDXe8NwWmpcMQJe3Biithc87xqGeLlHaKcZHiTj8q1eJdDRn1HUbmSWBuzR4FEXN7Q+FDsSTkZYkAgHJB8Mms3CxiPCd5DK5Rla551KnYdiuPzBpktFq7j5J0uK2HPNbfC34if7hsW0YEsOqxKXiYImpsWypLNiK4AIBAOVz8W8zUHiVEvLGNk5R2CEwjly/IGwUZvxFTkZ8h610PDD2qroK6kJGsbqA212CSABzycjH90ZHyOaw2gtbDWrzTLhxNZSJJGHBBBAx3xjrlBG3xU10rbfh5MmOaa36xE/y4K1btLWSI7mM9ov6N/Q/KqmrYuNL0u9Gefs2tJdsd6LHL/7bJ9KnrA1jrT206EFJGhdW+amqdiGm4b1a1Ytz20kV2BjpgmJ/wDOn0rTjKNSlKIUpSgUpSgUpSgUpSgV6RDI6xjq5C/XavNb/D6drr+mR5xz3UK58sutBucTSg8Sa84OAss0a5ONg3IB9Km6QUkQ2nMyyXc8URx05MnOfny/nWW+kMz6rMCEDyklTud5CfyxXnSJ/YHtr3kDmJmkVHUFSRgDY0WH0bXiYdf1u8ijaONEkW3kRyW7OJZF5lyehdWPyGK2bNoLaw0ldTaQz31y1sLrtOZVZY4/eVveUl92yMevSp3EJu04d0c6dG91LPpKGU8nNhWeUNhfnv8AHNc3cz3V/BYQXiSSRQTExckXKQWC8y4I32VdvT1rjbH3W5/3D6WLqpwYtU8zH2/c6riGwv7mDTJtOMUd1YPIVSQjv85BJye6cYII8azXF3penyxQ3t8IxMSO8CwUEYLHAJxjxx4eOK0LPVG1PiOwWI3KwSW0kcg5hy847RwGGNsfXbas3E2h6fqIYJexfaUSqGwCDHncBlO5XBGGGeuPSuHbMarfw+n7Wt5yZunj35nWp5ieJ5j5zHoqWWpiWZvsW4t7y4d1SMo5jWRlHcRiQCuT47Z6Z64kaDYT6fHMdSvIo5ZS91O/vCMFO8G8zjOwz1wK9aFokOlWojN0slxcqHlTmwTGGwGVOuAcjJwTvjbNTb3WJLyymgurT+0TI8aRQKFCR5HKMb97bqSTvvTtm2608cJGWuPtz54iL6tERGtbiPX5z406PTNXWOOKWzQJbaniyPtKgu0cgYc37pyqnb4ZO9RuKmjjsdH1fTwFUWkMhjG4EseFkVhjG4c/IVIlu9VtY7WB9PaJYGURK0JPeQEZLbYPe8vGus4isVteBJ0VBzFI5WDH3BKAe6PAAjfbfI3rvijsjUfN8zrck559pbe4isc/TlwX7Q7SG14j57VmMFxbw3EZIwcNGD/0fGv3Rh2uq30AIC3dnP8ADPZGUdPVRWHihQ2mcPTjmPNZdmWPQlJHGB8BgV+aRdpZavpN7LvCpQSYGO6DyOP8Pj612fPlJznfzpWxqNo9hqFzZye/bytEfXlOP6Vr0ZKUpQKUpQKUpQKUpQKrcJJz8S6aScJFMs7nOMLH3yfopqTVfQ/ubHWLvG8dr2KN5NKwT/J2lBMkLNZzynA53XI9Tk1X9kWHgsXVye9M+LcA755sH5YD/PHlUe5z7NbxLuXZpMAfyj9Pzq3xS7w6Zp+nEKFtpJVHL445Af8Am5qNQ72zFz9j6G0RTs5tFdUOAccpkLEjbOxIx8chchLFqEcWm3EsjTcrCaE8rSY91gwwAV25foM1b1XWJ9E0fRVsk7SW0sXtHkbohZic9ckESenh6iuFsrly8EDokqhgidozALkjyI29KxEc7dr5IikU9f8AruLZtUfVra6W3t4FCus8kYDc8feySw8TzEY67eVeuI+IIdCkktrS2jl1WVFaWVh3IsqCu343xjrsPImsltBLpOpwxaVDbGDmft2jkB7QhWHKoPUA9SOpG2QM1zWtWlxrPGt1D3svMqNIkRYIoUDJC+QFcqxu3Pwe/NlnHhmcc7mbeft6cR/LptB1y21OUTW9s0F3HyvLHty82fwP73KSB3T09agXsd9bWqK7WwQFVYJCJJmbJbmcee2fHw65pwMskGsX1tyAP2Y3cY5SsgxsfMmsvFFutnZJdCxtO3lmKXDorAZ5SRjOCAxyfI467Va11eYjwmTNGTpovefe5j68x+fq2dBW4GrO1zqaXzPazPHyOeYZ2yScYHmvU7ZFdVxTPBNHrlg2I5RolrKqhN+aMMW+uxz618s02S9F97fBBJMUfMhWMlTnqDjzGa7q61Y6trnGUkyx2yyaQFWLJOOQIQoLAHOfQV0iurbeO2fvxdk+d7/EQ5rU7J5f2c6feFhiG6kTGPMnx+I6VzcHf05lP4JfTow//IrqFmVOATaEESyiWU7noskfKcfNq5exbNrdpyqThHyRuMNjb61uHnlU4pJl1KK5bPNc2sE7EnOWMShj82BqRVjWyZdM0KbqPZGgO+d0lf8Aoy1HoyUpSgUpSgUpSgUpSgVXt8pwpft07S9t0+OElJH5g1Iqup5eEZAQRz6gpU42OImzv/MPrQaUSM+tWETAoR2I69AcHP55qhxnHLbvpsMzc0ns7Ss2feLyu2f0qfz/APbduzEpyiIEkbjCKM4+VVv2iXHtGq2IJVmj0+3QlRgE8mSfzqtKmkajaXGlqtzDDc3ccZZFktu1d/MEgg4x6+e1WrfR9DsVa5WSGU3jnso54WQBVD8yqcFRk8p6nAB3rmOEjLc2ZtbJGN6ctEYwAcg5Iz54J67bV0800UFjblobmY3aHktYlIM6ZYrzAZA2Hic4yCGGK57er2e9Spm1tl0tWtm5RZW4b2UHvc5L8hx+IMowcbrsehNal3apaWWse2XsEZubogorYD8yqvKcb5X3gPTfFcTrOoXI1BYkkjhZysjXEIJkBx0yDlcbjAx03roNLvpZXLS3eoX9uG+8D2RKy56hmG7bf3h08utZ7ZmNus5K1tGPfES6C2MF3Ck0DPc3CwmG3BJSJwCoK5CnbKryg4zvk1ivtN7WV4ruSWTtATMjzdtyDONmU9AXbxOD8K1dQ03V53kW3fVILcRt24i7kUSoOZe6x9B0x8zU7hDX5tQgFq9tJNf2qk2z2q5cj3jlTsQOXOOm5qdsxGyclb2mk/P/AH4dPY2Nnptm6RWyQ2ckeXcy5Ktg4bCncHBGfM+IzXEcHhdV4m1KAMkYvrG5jRnPunkyvz7uPnXSa1ewTaLNcm2Z2MMoSbmPZybtg4HQjIwT1AxXE8FTOnFWnBZDDI7tEH6Y51K/1rVeZ25ZfdpFYVtchhgNnDGqIj291B3TsSsjL4/wiuL00M87RqMl42GPkT/Su106N7y34W7clg1xcxNzdTl1Jyf5jXEt/Z9QcKfddlz9RXSHllZl+94QtjnPYX0i/ASRof1Q/nUeq8f+x83/ABCP/RepFGSlKUClKUClKUClKUCq1wccI2YH4764J+UcQH+Y1JqrdbcJ6ef/AFtz/pwUGmzq+sSyLl0QMRzHJIC4HSt3jK37OfTLhAOzurCGVcNzdAUPzyp2rWtIjDrNxEwbKpKDjOfcPlVS/hm1DgHT7nvSfZsrwkhfcidsjJ/jz/io08cCXEkN9L2KSGVQHjaLJdG6bAe9kHHL412Ou3EDSXT2k4Fy1oLm0RUK9ieUBjGVx3ioyc97unIzXzTRb86dqEU/LzoGHOv95cjIB8D613es6xJdaDcTXKrIttMgiePuGTnWUCXJyd+pA2J5sgZzWLRy9mG0TXn0aHCOgSzvaapIUmhkfLPk86SA9G6+GDkjffyNfarzhdrjTrZtHvZ7B5B30t3KKzYBYDGx8s4PU/Cvi37NuL10OZ9P1Aj7NuWHO7Z+7O3ex49PzNfZuHeJ+H7eHsDfxzSLzFkLj7xubPP16HGetbeR707SLixseS+uZbw55QlxJzqM+DeB2HjXyqOWzTjy4lS0lhjWcIvJlY3WNT2hwo65KkY6b19nk13Sra1E0FzCrqOZT3W5hnxJHj1PQ7V8Nvrqwm4mttL0GYS2zieN5J2LIDKcnBG+BgVm3iXTDMRkjbc/aHdSjh62hmitUklkSXntWYq5w5bJIGfeXbwxXJcLW9xfcR6bDYnF20qmNsjukb538sVtcd6u2qawCzsVUFivMSAzHJIyBjNZf2eLLbX11rCRNImnwMdjg8zgqoHrvUrHDWbi2l3h+C41G54dgtomWI6pdFXxsEHZs243wACfnXzy+5ZNWuDH7hlYrjyya+jcKzxWOtWlqs4eZFFnGVIKq8hJuJQemAMqD44r53ZvG2pl3BEZ52wBnGxxW4cFSP8A2Qm/4hH/AKL1Hqund4QYMPf1BeU/wwnP+YVIoyUpSgUpSgUpSgUpSgVYGJeD3H4oNQUn4SREfrHUerHDxM8Wpad19rtiyD/eRfeL9Qrr/NQa1pKkOvWs0rckMgXmbyDLyt+ear8G6lFpGs3OmamgfTroPa3II35SMAj1Bww9RXOXAEtijg5aJuX+U7j88/WqEskF7ZxyBJEkgjRe3Azhx4N6Hwbw6b0aaWu6XLo+r3NjOys0LYDr7rqd1YehBB+dV+HFutT0XVdLieM4jFxGsjb5QklV9SM/Styzs5OJrKGwkeKPUrSMLaF2AEsZJPZlvjnlJ6EkHbGIFpcXvDusuWieG7h54pIpAQRkFWBHzp5WJ0mk9wDFfmCMHp5Gv3qnjtV/QbrSuxK6pbFmjGUK47xGdm9MVUQnaQZjkZgAclSfGq/CxNvNd34laI2lu7KVOCWYcgGfmT6gGp99Kt3fyPEuEJwuBjbw2r9SWaG2mtlK9lMylsdW5c4Hw3/SpKxOp3D1YWlxqV5Da2kTz3U7hEjXcsa7m9ay03RE4Z+0YoYY5vadRuIxzGWXGBGgHXlHTwzvtWLSIo+H+Hry9jRftFWVJZTJg4cHlhjx5+852IAA2zvOv9Nht9bMVzCyQabbRm7ZSMmUgE59SzYx6VB1+ladpum8K6jxFa27RLbxMsEtwxaaV2HIp2wqDfpgk+dfKtPGDPLkjkiIB9W7oH5n6VX4h4lfUZbyG0RoNOmZSkDMTy4Oc+WTtn4VKQdnp6kghpHLjPioGP1J+lVJVbzMPC+mREYM9xPcdOqgJGPzV6j1X4o+61JbIYC2MKWwH7wGX+rs5qRRkpSlApSlApSlApSlArPY3Utle291bnE0Eiyp/EpyP0rBSgraxbw2+rXCLiOxugJYSveCxv3kPrjofgRU2CabTLp1whyMHxDKR4HyIP51W0q4XULRdHvZEVS2bOd9uwkJ90n/AMtz18AcN/ezOnhc89pdfc3EDFFEnd5SCeZCfDf6HPnRYbfaG0yUZVMYW4ijbfKn3kz47fpXZ8baU2p6Lpl+cyzXEAazuMZMgVd4H23cAEqfEbdTivnEtrcxDnIDCPqUcPyj1wTgb1Yl4v1SXTLexeXMNvIksONijKSRj60VBwUGGHhkfOv1YzISEUknoBuazzmW8f2l0HKzhDy4AzjYem1YJmw/KmQEJC56gZ/WgzWUsUZYSBtwcFTv02/PFb/Dk5g1iK4SNZblG5oIygdWlJATIPhk5+VRlyWx57Vf4QMCavFM5y8BaVRnGSqMwP1AoLn7Q7qHT9Yt9DjkllTTHLXMjPkz3LYMr+ODnC+PSuV1bV7nULy+mdgq3coldEGFyM4+ma1VWW+uZXlly5DSPI+T6mtiNYbYc0bmWboGK4VPUZ3J+W1Db1BF2McUaQiS7lboV5iufdUDzP8A9VZ9jTSL4z67NFLeQN3bFHEjF16LKR3UUEbrnm2xgdR+JGOHuW4uiza0y88UBH/hSw2kkz+PByq+GQxP4Tz9EZLiaS4uJZ52LyysXdj4sTkn6msdKUQpSlApSlApSlApSlAqu+q294kY1ax7eZAF9pgl7KV1AwA2QyscY72M+ZNSKUFoWWn3DB9K1P2aTG8N+eyYfCRcoR8eX4VjvrW7s7qC21AW4WYCVZI7KRXVsgMHXOR18diPDFSar211aXmnQ2GpO8DwFvZ7pU5wqsclHUb8vNkgjcEnY52CC0ckcrRMjCQHlKkb5+FbsMJs0MkuVuGH3a+K+bHyPkPnVhbLljCLxHpwiG4HazD8uzz8q8RRaDa7Xlxe6g77E2iiFY+vezICXPjjCg+dF2i6iPv1nC4SUBthtzfiH1zWO0iuXdmtI5XZRuY1JIB28Kvx6VKyn7M1LT7qFz7kk6QuT6xykb/DI9aSaXMojTVNRsLSBcHkSZZWGfERxZ3+OPjVNpEcTWsEna4WSVQoXO4XIJJ8ugFXbi8fQrTTobCGGDUGtxcT3XIGmUyElApOeTCch7uD3jvWtFNotj95BFdahcKcoLlFihHqyAszfDIHn5VLu7iW7uZbi5cyTSsXdj4k1EeHdpHZ3Ys7EksxyST4k15pSgUpSgUpSgUpSgUpSgUpSg//2Q==\">\n  <link rel=\"manifest\" href=\"/manifest.json\">\n  <link rel=\"preconnect\" href=\"https://fonts.googleapis.com\">\n  <link rel=\"preconnect\" href=\"https://fonts.gstatic.com\" crossorigin>\n  <link rel=\"stylesheet\" href=\"https://fonts.googleapis.com/css2?family=JetBrains+Mono:wght@300;400;500;600;700&display=swap\">\n  <title>Vessel Dashboard</title>\n  <link rel=\"stylesheet\" href=\"/static/app.c4b8be0a57.css\">\n</head>\n\n<body>\n  <div class=\"app-layout\">\n    <div class=\"app-content\">\n\n      <!-- ═══ TAB: DASHBOARD ═══ -->\n      <div id=\"tab-dashboard\" class=\"tab-view active\">\n        <div class=\"tab-scroll\">\n          <div class=\"dash-header\">\n            <img class=\"logo-icon\"\n              src=\"data:image/jpeg;base64,/9j/4AAQSkZJRgABAQAAAQABAAD/2wBDAAYEBQYFBAYGBQYHBwYIChAKCgkJChQODwwQFxQYGBcUFhYaHSUfGhsjHBYWICwgIyYnKSopGR8tMC0oMCUoKSj/2wBDAQcHBwoIChMKChMoGhYaKCgoKCgoKCgoKCgoKCgoKCgoKCgoKCgoKCgoKCgoKCgoKCgoKCgoKCgoKCgoKCgoKCj/wAARCABAAEADASIAAhEBAxEB/8QAGwAAAgMBAQEAAAAAAAAAAAAAAAQDBQYBAgj/xAAzEAACAQMCAwUGBQUAAAAAAAABAgMABBEFIRIxUQYTFEFhIkJxgZGhMjM0YqIkUsHR4f/EABgBAQEBAQEAAAAAAAAAAAAAAAABAwIE/8QAHxEAAgIBBQEBAAAAAAAAAAAAAAECERIDBCExQcHx/9oADAMBAAIRAxEAPwD5foooqHIAEkAAknYAedMizkH5jRxnozbj5DJFTWscihEgXNzMCQc44Ewd8+WwJJ6fGr9ez8EOlie/MMMUhKxz3DlQxHMKu2PoTQqRmWtJMewUk2zhGyfpzper++0TwyQvaSxnvPy2STiSQjnggnBz8xVXcDvo3lK8M8ZxKMYzvjJ9c7H4g9aBoUooooQK6AWIUczsK5U1mvFdwD965+GcmgNDoAifV7xiMmFfYB3GAcDPpsnyzVz2g0+41Se27+QeGjZymWwFTCYUnkvnz3361R9mTEt3LNNJwRzJMr7kAIEBJyN+Zxt51Z6fdxppd1OyeKhZSixNk96SyjG4OPIEnfpWepdpo921cMXGa7+cjGmaSLF57cujW5mWQSNt7JU5AbqMDl0qg1e0MGslXzifijckjdweEnbrlWq0vrqNotOcq9vaTAKsaEjg3wQMY8s/9pfti8Ul74u2ZQomAQDkR3YwR6ZQfWmnfpN0oKlDz9MmOW/Oipr1Al3Mq/hDnHw5ioa0PEFMWP6kHojn+BpemLDe6Vf7wyD4lSB9zQFlp83dTaR3eULSzIXzsckD/VbWyS/vdVk0/TrKGSGBC8jKgGCB7uOZxvjesHbL4my7iIMLlJBJAVO/H5rj1XhI9Vx50/pvajV9O1gXGl3ipcToglWUDhDqMb8W2ee/7qjVm0Z4x47NzeeI0u6nS9igDwWviY3GzBdxupGzZHpnJrBX3FcdmraZlAMGNwv4svjJP2+VM33aHV+1F5Kt5NCZ5UEGY0CIIwcsxxzGw+u1edWuLaLSFs4JJBJ3iIsLAflpxZc48y2dvWolTE55JWUV9+oz1RD/AAWl6nvz/VyAe7hPoAP8VBXRiFdUlWBU4IOQelcooB/DTsZbRlWRx7UedwfQefUYz08q8a1O1/qcs726wSv+NVJxkbEnPLkc0nz50yLyXbIjZh77Rgn786FsLG7ltobuNSVkkQQ8QXZV4sk/b6E1I7eELcTCW6Jyxb2uA+vVvTcD48o/GSDHAkKMPeVN/vnHypckkkkkk7kmgs4SSSSck+dFFFCH/9k=\"\n              alt=\"V\">\n            <span class=\"dash-title\">VESSEL</span>\n            <div id=\"home-health-dot\" class=\"health-dot health-dot-btn\" title=\"Pi: stato sistema\" onclick=\"openDrawer('system')\"></div>\n            <div id=\"bridge-health-dot\" class=\"health-dot health-dot-btn\" title=\"Bridge PC: connessione Windows\" onclick=\"openDrawer('system')\" style=\"margin-left:4px;\"></div>\n<span class=\"dash-spacer\"></span>\n            <span class=\"dash-weather\" id=\"home-weather-text\"></span>\n            <span class=\"dash-temp\" id=\"home-temp\">--</span>\n            <span class=\"dash-sep\">&middot;</span>\n            <span id=\"home-clock\" class=\"dash-clock\">--:--:--</span>\n            <button class=\"btn-sys-gear\" onclick=\"openDrawer('system')\" title=\"System\">&#x2699;</button>\n          </div>\n\n          <!-- Stats 2x2 -->\n          <div class=\"dash-stats\">\n            <div class=\"stat-card\">\n              <div class=\"stat-icon\">&#x00A7;</div>\n              <div class=\"stat-label\">CPU</div>\n              <div class=\"stat-value\" id=\"hc-cpu-val\">--</div>\n              <div class=\"stat-bar\"><div class=\"stat-bar-fill\" id=\"hc-cpu-bar\"></div></div>\n            </div>\n            <div class=\"stat-card\">\n              <div class=\"stat-icon\">&#x25C8;</div>\n              <div class=\"stat-label\">RAM</div>\n              <div class=\"stat-value\" id=\"hc-ram-val\">--</div>\n              <div class=\"stat-sub\" id=\"hc-ram-sub\"></div>\n              <div class=\"stat-bar\"><div class=\"stat-bar-fill stat-bar-cyan\" id=\"hc-ram-bar\"></div></div>\n            </div>\n            <div class=\"stat-card\">\n              <div class=\"stat-icon\">&#x2321;</div>\n              <div class=\"stat-label\">TEMP</div>\n              <div class=\"stat-value\" id=\"hc-temp-val\">--</div>\n              <div class=\"stat-bar\"><div class=\"stat-bar-fill stat-bar-amber\" id=\"hc-temp-bar\"></div></div>\n            </div>\n            <div class=\"stat-card\">\n              <div class=\"stat-icon\">&#x25A4;</div>\n              <div class=\"stat-label\">DISK</div>\n              <div class=\"stat-value\" id=\"hc-disk-val\">--</div>\n              <div class=\"stat-sub\" id=\"hc-disk-sub\"></div>\n              <div class=\"stat-bar\"><div class=\"stat-bar-fill\" id=\"hc-disk-bar\"></div></div>\n            </div>\n          </div>\n\n          <!-- Sigil Widget -->\n          <div class=\"sigil-widget\" id=\"sigil-widget-wrap\">\n            <div class=\"sigil-widget-header\">\n              <span class=\"sigil-widget-title\">SIGIL</span>\n              <span class=\"sigil-widget-status\">\n                <span class=\"sigil-online-dot\" id=\"sigil-online-dot\"></span>\n                <span id=\"sigil-mood-info\">IDLE</span>\n                <span class=\"sigil-mood-sep\">&middot;</span>\n                <span id=\"sigil-mood-timer\">0s</span>\n              </span>\n            </div>\n            <div class=\"sigil-canvas-wrap\" onclick=\"wakeSigil()\">\n              <canvas id=\"sigil-widget-canvas\" class=\"sigil-widget-canvas\"></canvas>\n              <div class=\"sigil-wake-label\" id=\"sigil-wake-label\">touch to wake</div>\n            </div>\n            <div class=\"sigil-commands\" id=\"sigil-commands\" title=\"Invia stati emotivi al Sigil ESP32. THINK/SLEEP sono persistenti, gli altri tornano a IDLE.\">\n              <button class=\"btn-sigil-term\" onclick=\"sigilCommand('HAPPY')\">HAPPY</button>\n              <button class=\"btn-sigil-term\" onclick=\"sigilCommand('THINKING')\">THINK</button>\n              <button class=\"btn-sigil-term\" onclick=\"sigilCommand('SLEEPING')\">SLEEP</button>\n              <button class=\"btn-sigil-term\" onclick=\"sigilCommand('ALERT')\">ALERT</button>\n              <button class=\"btn-sigil-term\" onclick=\"sigilCommand('PROUD')\">PROUD</button>\n              <button class=\"btn-sigil-term\" onclick=\"sigilCommand('CURIOUS')\">CURIO</button>\n              <button class=\"btn-sigil-term\" onclick=\"sigilCommand('IDLE')\">IDLE</button>\n            </div>\n            <div class=\"sigil-text-row\">\n              <input type=\"text\" id=\"sigil-text-input\" class=\"sigil-text-input\" placeholder=\"messaggio per Sigil&hellip;\" maxlength=\"64\">\n              <button class=\"btn-sigil-send\" onclick=\"sigilSendText()\">&#x21B5;</button>\n            </div>\n            <div class=\"sigil-debug-toggle\">\n              <button class=\"btn-ghost btn-sm\" onclick=\"toggleSigilDebug()\" title=\"Debug controls\">&#x2699;</button>\n            </div>\n            <div class=\"sigil-actions\" id=\"sigil-debug-actions\" style=\"display:none;\">\n              <button class=\"btn-ghost btn-sm\" onclick=\"sigilOTA()\">OTA</button>\n              <button class=\"btn-ghost btn-sm\" onclick=\"sigilCommand('BORED')\">BORED</button>\n              <button class=\"btn-ghost btn-sm\" onclick=\"sigilCommand('ERROR')\">ERROR</button>\n              <span class=\"sigil-ota-status\" id=\"sigil-ota-status\"></span>\n            </div>\n          </div>\n\n          <!-- Right column (desktop: affiancata a Sigil) -->\n          <div class=\"dash-right-col\">\n            <!-- Chart -->\n            <div class=\"dash-chart\">\n              <div class=\"chart-header\">\n                <span class=\"chart-label\">SERVER ACTIVITY (Last 15 Min)</span>\n                <div class=\"chart-legend\">\n                  <span><div class=\"dot-cpu\"></div> <span>CPU</span></span>\n                  <span><div class=\"dot-temp\"></div> <span>Temp</span></span>\n                  <span class=\"chart-scale\">CPU 0&#x2013;100% · Temp 0&#x2013;85°C</span>\n                </div>\n              </div>\n              <canvas id=\"pi-chart\"></canvas>\n            </div>\n\n            <!-- Widget tiles -->\n            <div class=\"dash-widgets\">\n              <div class=\"widget-card\" data-widget=\"briefing\" onclick=\"openDrawer('briefing')\">\n                <div class=\"wc-header\"><span class=\"wc-label\">BRIEFING</span><span class=\"wc-chevron\">&#x203A;</span></div>\n                <div class=\"wc-body\" id=\"wt-briefing-preview\">--</div>\n              </div>\n              <div class=\"widget-card\" data-widget=\"tokens\" onclick=\"openDrawer('tokens')\">\n                <div class=\"wc-header\"><span class=\"wc-label\">TOKEN</span><span class=\"wc-chevron\">&#x203A;</span></div>\n                <div class=\"wc-body\" id=\"wt-tokens-preview\">--</div>\n              </div>\n              <div class=\"widget-card\" data-widget=\"logs\" onclick=\"openDrawer('logs')\">\n                <div class=\"wc-header\"><span class=\"wc-label\">LOGS</span><span class=\"wc-chevron\">&#x203A;</span></div>\n                <div class=\"wc-body\" id=\"wt-logs-preview\">--</div>\n              </div>\n              <div class=\"widget-card\" data-widget=\"cron\" onclick=\"openDrawer('cron')\">\n                <div class=\"wc-header\"><span class=\"wc-label\">JOBS</span><span class=\"wc-chevron\">&#x203A;</span></div>\n                <div class=\"wc-body\" id=\"wt-cron-preview\">--</div>\n              </div>\n              <div class=\"widget-card\" data-widget=\"tracker\" onclick=\"openDrawer('tracker')\">\n                <div class=\"wc-header\"><span class=\"wc-label\">TRACKER</span><span class=\"wc-chevron\">&#x203A;</span></div>\n                <div class=\"wc-body\" id=\"wt-tracker-preview\">nessuno</div>\n              </div>\n            </div>\n          </div>\n        </div>\n      </div>\n\n      <!-- ═══ TAB: CODE ═══ -->\n      <div id=\"tab-code\" class=\"tab-view\">\n        <div id=\"code-chat\" class=\"code-panel\">\n          <div id=\"chat-messages\">\n            <div class=\"chat-welcome\">\n              <div class=\"chat-welcome-sigil\">&#x25CE;</div>\n              <div class=\"chat-welcome-text\">Eyyy, sono Vessel &mdash; dimmi cosa vuoi, psychoSocial.</div>\n              <div class=\"chat-welcome-hint\">Seleziona un provider &darr; e inizia a scrivere</div>\n            </div>\n          </div>\n          <div class=\"code-input-area\">\n            <div class=\"code-input-row\">\n              <textarea id=\"chat-input\" placeholder=\"scrivi qui&hellip;\" rows=\"1\"\n                autocorrect=\"off\" autocapitalize=\"off\" spellcheck=\"false\"></textarea>\n              <div class=\"provider-dropdown\" id=\"provider-dropdown\">\n                <button class=\"provider-btn\" id=\"provider-trigger\" onclick=\"toggleProviderMenu()\" type=\"button\">\n                  <span class=\"provider-dot dot-cloud\" id=\"provider-dot\"></span>\n                  <span id=\"provider-short\">Haiku</span>\n                  <span class=\"provider-arrow\">&#x25BE;</span>\n                </button>\n                <div class=\"provider-menu\" id=\"provider-menu\">\n                  <button type=\"button\" onclick=\"switchProvider('auto')\"><span class=\"dot dot-auto\"></span> Auto</button>\n                  <button type=\"button\" onclick=\"switchProvider('cloud')\"><span class=\"dot dot-cloud\"></span> Haiku</button>\n                  <button type=\"button\" onclick=\"switchProvider('local')\"><span class=\"dot dot-local\"></span> Local (Gemma)</button>\n                  <button type=\"button\" onclick=\"switchProvider('pc')\"><span class=\"dot dot-pc\"></span> PC</button>\n                  <button type=\"button\" onclick=\"switchProvider('deepseek')\"><span class=\"dot dot-deepseek\"></span> OpenRouter</button>\n                  <button type=\"button\" onclick=\"switchProvider('brain')\"><span class=\"dot dot-brain\"></span> Brain</button>\n                </div>\n              </div>\n              <button class=\"btn-send\" id=\"chat-send\" onclick=\"sendChat()\">&#x21B5;</button>\n            </div>\n            <div class=\"code-input-meta\">\n              <select id=\"prompt-select\" class=\"prompt-select\" onchange=\"loadSavedPrompt()\" title=\"Template salvati\">\n                <option value=\"\">Template...</option>\n              </select>\n              <button class=\"btn-icon\" onclick=\"saveCurrentPrompt()\" title=\"Salva come template\">[Salva]</button>\n              <button class=\"btn-icon\" onclick=\"deleteSavedPrompt()\" title=\"Elimina template\">[Elimina]</button>\n              <span style=\"flex:1;\"></span>\n              <button class=\"btn-ghost btn-sm mem-off\" id=\"memory-toggle\" onclick=\"toggleMemory()\" title=\"Memoria contestuale: usa note, knowledge graph e cronologia per arricchire le risposte\">MEM</button>\n              <button class=\"btn-icon\" onclick=\"clearChat()\" title=\"Pulisci chat\">&#x2715;</button>\n            </div>\n          </div>\n        </div>\n      </div>\n\n      <!-- ═══ TAB: PROFILE ═══ -->\n      <div id=\"tab-profile\" class=\"tab-view\">\n        <div class=\"tab-scroll\">\n          <!-- Providers -->\n          <div class=\"prof-section\">\n            <div class=\"prof-section-title\">PROVIDER</div>\n            <div class=\"prof-providers\">\n              <div class=\"prof-prov\"><span class=\"dot dot-cloud\"></span><span class=\"prof-prov-name\">Haiku</span><span class=\"prof-prov-info\">Claude &mdash; cloud</span></div>\n              <div class=\"prof-prov\"><span class=\"dot dot-local\"></span><span class=\"prof-prov-name\">Local</span><span class=\"prof-prov-info\">Gemma 3 4B &mdash; Pi</span></div>\n              <div class=\"prof-prov\"><span class=\"dot dot-pc\"></span><span class=\"prof-prov-name\">PC</span><span class=\"prof-prov-info\">Qwen 14B &mdash; GPU LAN</span></div>\n              <div class=\"prof-prov\"><span class=\"dot dot-deepseek\"></span><span class=\"prof-prov-name\">OpenRouter</span><span class=\"prof-prov-info\">DeepSeek V3 &mdash; cloud</span></div>\n              <div class=\"prof-prov\"><span class=\"dot dot-brain\"></span><span class=\"prof-prov-name\">Brain</span><span class=\"prof-prov-info\">Claude Code CLI &mdash; bridge</span></div>\n            </div>\n          </div>\n\n          <!-- Aspetto -->\n          <div class=\"prof-section\">\n            <div class=\"prof-section-title\" style=\"display:flex;justify-content:space-between;align-items:center;\">\n              ASPETTO\n              <button class=\"btn-ghost btn-sm\" onclick=\"showHelpModal()\" style=\"margin:0;\">? Help</button>\n            </div>\n            <div id=\"theme-selector\" class=\"theme-selector\"></div>\n          </div>\n\n          <!-- Token Usage Report -->\n          <div class=\"prof-section\">\n            <div class=\"prof-section-title\">UTILIZZO TOKEN</div>\n            <div style=\"padding:6px 0;\">\n              <button class=\"btn-ghost btn-sm\" onclick=\"openDrawer('tokens')\">&#x00A4; Apri Report Token</button>\n            </div>\n          </div>\n\n          <!-- Memoria -->\n          <div class=\"prof-section prof-section-mem\">\n            <div class=\"prof-section-title\">MEMORIA <span class=\"help-tip\" title=\"MEMORY: contenuto di SOUL.md (personalit&agrave;). HISTORY: cronologia chat. REF: quick reference. CERCA: ricerca per keyword/data. GRAFO: entit&agrave; estratte automaticamente dalle conversazioni.\">?</span></div>\n            <div class=\"tab-row\">\n              <button class=\"tab active\" onclick=\"switchMemTab('memory', this)\">MEMORY</button>\n              <button class=\"tab\" onclick=\"switchMemTab('history', this)\">HISTORY</button>\n              <button class=\"tab\" onclick=\"switchMemTab('quickref', this)\">REF</button>\n              <button class=\"tab\" onclick=\"switchMemTab('search', this)\">CERCA</button>\n              <button class=\"tab\" onclick=\"switchMemTab('grafo', this)\">ENTITÀ</button>\n            </div>\n            <div class=\"mem-panels\">\n              <div id=\"tab-memory\" class=\"tab-content active\">\n                <div class=\"mono-block\" id=\"memory-content\">Caricamento&hellip;</div>\n                <div class=\"prof-btns\"><button class=\"btn-ghost btn-sm\" onclick=\"refreshMemory()\">&#x21BB;</button><button class=\"btn-ghost btn-sm\" onclick=\"copyToClipboard(document.getElementById('memory-content').textContent)\" title=\"Copia\">&#x2398;</button></div>\n              </div>\n              <div id=\"tab-history\" class=\"tab-content\">\n                <div class=\"mono-block\" id=\"history-content\">Premi Carica&hellip;</div>\n                <div class=\"prof-btns\"><button class=\"btn-ghost btn-sm\" onclick=\"refreshHistory()\">&#x21BB; Carica</button><button class=\"btn-ghost btn-sm\" onclick=\"copyToClipboard(document.getElementById('history-content').textContent)\" title=\"Copia\">&#x2398;</button></div>\n              </div>\n              <div id=\"tab-quickref\" class=\"tab-content\">\n                <div class=\"mono-block\" id=\"quickref-content\">Caricamento&hellip;</div>\n                <div class=\"prof-btns\"><button class=\"btn-ghost btn-sm\" onclick=\"copyToClipboard(document.getElementById('quickref-content').textContent)\" title=\"Copia\">&#x2398;</button></div>\n              </div>\n              <div id=\"tab-search\" class=\"tab-content\">\n                <div class=\"search-row\">\n                  <input type=\"text\" id=\"mem-search-keyword\" placeholder=\"keyword&hellip;\" class=\"input-field\">\n                  <input type=\"date\" id=\"mem-search-date\" class=\"input-field input-date\">\n                  <button class=\"btn-green btn-sm\" onclick=\"searchMemory()\">Cerca</button>\n                </div>\n                <div class=\"mono-block\" id=\"search-results\">Inserisci una keyword</div>\n              </div>\n              <div id=\"tab-grafo\" class=\"tab-content\">\n                <div id=\"grafo-body\">\n                  <div class=\"widget-placeholder\"><span class=\"ph-icon\">&#x25CE;</span><span>Knowledge Graph</span></div>\n                </div>\n              </div>\n            </div>\n          </div>\n\n          <!-- Deep Learn -->\n          <div class=\"prof-section\">\n            <div class=\"prof-section-title\">SELF-LEARNING <span class=\"help-tip\" title=\"Analizza le conversazioni recenti per estrarre entit&agrave;, aggiornare il knowledge graph e arricchire la memoria a lungo termine.\">?</span></div>\n            <div style=\"padding:8px 12px;\">\n              <div style=\"font-size:11px;color:var(--muted);margin-bottom:8px;\">Analizza le conversazioni per estrarre entit&agrave;, aggiornare il knowledge graph e arricchire la memoria.</div>\n              <button class=\"btn-green btn-sm\" onclick=\"triggerDeepLearn()\" id=\"btn-deep-learn\">Avvia Deep Learn</button>\n              <div id=\"deep-learn-result\" style=\"display:none;margin-top:8px;\">\n                <pre id=\"deep-learn-text\" style=\"white-space:pre-wrap;font-size:11px;color:var(--text2);max-height:300px;overflow-y:auto;\"></pre>\n              </div>\n            </div>\n          </div>\n\n          <!-- ── ANALYTICS (Fase 62) ── -->\n          <div class=\"prof-section prof-section-mem\" id=\"analytics-section\">\n            <div class=\"prof-section-title\" style=\"display:flex;justify-content:space-between;align-items:center;\">\n              ANALYTICS\n              <span class=\"anl-period-btns\">\n                <button class=\"btn-sm anl-period-btn active\" data-period=\"day\" onclick=\"loadAnalytics('day')\">24H</button>\n                <button class=\"btn-sm anl-period-btn\" data-period=\"week\" onclick=\"loadAnalytics('week')\">7D</button>\n                <button class=\"btn-sm anl-period-btn\" data-period=\"month\" onclick=\"loadAnalytics('month')\">30D</button>\n              </span>\n            </div>\n            <div id=\"analytics-content\" style=\"padding:8px 12px;\">\n              <div class=\"no-items\">// apri il tab Profile per caricare</div>\n            </div>\n          </div>\n        </div>\n      </div>\n\n    </div><!-- /app-content -->\n\n    <!-- ═══ BOTTOM NAV ═══ -->\n    <nav class=\"bottom-nav\">\n      <button class=\"nav-item active\" data-tab=\"dashboard\" onclick=\"switchView('dashboard')\">\n        <span class=\"nav-icon\">&#x229E;</span><span class=\"nav-label\">Dashboard</span>\n      </button>\n      <button class=\"nav-item\" data-tab=\"code\" onclick=\"switchView('code')\">\n        <span class=\"nav-icon\">&gt;_</span><span class=\"nav-label\">Code</span>\n      </button>\n      <button class=\"nav-item\" data-tab=\"profile\" onclick=\"switchView('profile')\">\n        <span class=\"nav-icon\">&#x25C9;</span><span class=\"nav-label\">Profile</span>\n      </button>\n    </nav>\n\n  </div><!-- /app-layout -->\n\n  <!-- ─── Drawer (bottom sheet per Briefing/Token/Crypto) ─── -->\n  <div class=\"drawer-overlay\" id=\"drawer-overlay\" onclick=\"closeDrawer()\">\n    <div class=\"drawer\" onclick=\"event.stopPropagation()\">\n      <div class=\"drawer-handle\"></div>\n      <div class=\"drawer-header\">\n        <span class=\"drawer-title\" id=\"drawer-title\"></span>\n        <div class=\"drawer-actions\" id=\"drawer-actions\"></div>\n      </div>\n      <div class=\"drawer-body\">\n        <div class=\"drawer-widget\" id=\"dw-briefing\">\n          <div id=\"briefing-body\"><div class=\"widget-placeholder\"><span class=\"ph-icon\">&#x25A4;</span><span>Premi Carica per il briefing</span></div></div>\n        </div>\n        <div class=\"drawer-widget\" id=\"dw-logs\">\n          <div id=\"logs-body\"><div class=\"widget-placeholder\"><span class=\"ph-icon\">&#x2261;</span><span>Premi Carica per i log</span></div></div>\n        </div>\n        <div class=\"drawer-widget\" id=\"dw-cron\">\n          <div id=\"cron-body\"><div class=\"widget-placeholder\"><span class=\"ph-icon\">&#x25C7;</span><span>Premi Carica per i cron</span></div></div>\n        </div>\n        <div class=\"drawer-widget\" id=\"dw-tracker\">\n          <div id=\"tracker-body\"><div class=\"widget-placeholder\"><span class=\"ph-icon\">&#x25C8;</span><span>Premi Carica per il tracker</span></div></div>\n        </div>\n        <div class=\"drawer-widget\" id=\"dw-tokens\">\n          <div id=\"tokens-drawer-body\"><div class=\"widget-placeholder\"><span class=\"ph-icon\">&#x00A4;</span><span>Seleziona un periodo</span></div></div>\n        </div>\n        <div class=\"drawer-widget\" id=\"dw-system\">\n          <div style=\"margin-bottom:12px;\">\n            <div class=\"sys-section-title\" style=\"margin-bottom:8px;\">RASPBERRY PI</div>\n            <div class=\"sys-pi-grid\">\n              <div class=\"sys-pi-row\"><span class=\"sys-pi-label\">Hostname</span><span class=\"sys-pi-value\" id=\"hc-hostname-val\">localhost</span></div>\n              <div class=\"sys-pi-row\"><span class=\"sys-pi-label\">Uptime</span><span class=\"sys-pi-value\" id=\"hc-uptime-val\">--</span></div>\n              <div class=\"sys-pi-row\"><span class=\"sys-pi-label\">Sessions</span><span class=\"sys-pi-value\" id=\"hc-sessions-sub\">--</span></div>\n            </div>\n          </div>\n          <div style=\"margin-bottom:12px;\">\n            <span id=\"version-badge\" class=\"version-badge\">&mdash;</span>\n          </div>\n          <div class=\"sys-section-head\">\n            <span class=\"sys-section-title\">SESSIONI TMUX</span>\n            <button class=\"btn-ghost btn-sm\" onclick=\"gatewayRestart()\">&#x21BA; Gateway</button>\n          </div>\n          <div class=\"session-list\" id=\"session-list\">\n            <div class=\"no-items\">Caricamento&hellip;</div>\n          </div>\n          <div class=\"sys-section-head\" style=\"margin-top:16px;padding-top:12px;border-top:1px solid var(--border);\">\n            <span class=\"sys-section-title\">SIGIL ESP32</span>\n            <button class=\"btn-ghost btn-sm\" onclick=\"flashOTA()\">&#x21C6; Flash OTA</button>\n          </div>\n          <div class=\"sys-actions\" style=\"margin-top:12px;padding-top:12px;border-top:1px solid var(--border);\">\n            <button class=\"btn-ghost\" onclick=\"requestStats()\">&#x21BB; Refresh</button>\n            <button class=\"btn-red\" onclick=\"doLogout()\">&#x23FB; Logout</button>\n            <button class=\"btn-red\" onclick=\"showRebootModal()\">&#x21BA; Reboot</button>\n            <button class=\"btn-red btn-danger-off\" onclick=\"showShutdownModal()\" title=\"Spegne il Pi completamente\">&#x23FB; Off</button>\n          </div>\n        </div>\n      </div>\n    </div>\n  </div>\n\n  <!-- Modale reboot -->\n  <div class=\"modal-overlay\" id=\"reboot-modal\">\n    <div class=\"modal-box\">\n      <div class=\"modal-title\">&#x23FB; Reboot Raspberry Pi</div>\n      <div class=\"modal-text\">Sei sicuro? Il Pi si riavvier&agrave; e la dashboard sar&agrave; offline per circa 30-60 secondi.</div>\n      <div class=\"modal-btns\">\n        <button class=\"btn-ghost\" onclick=\"hideRebootModal()\">Annulla</button>\n        <button class=\"btn-red\" onclick=\"confirmReboot()\">Conferma</button>\n      </div>\n    </div>\n  </div>\n\n  <!-- Modale shutdown -->\n  <div class=\"modal-overlay\" id=\"shutdown-modal\">\n    <div class=\"modal-box\">\n      <div class=\"modal-title\">&#x23FB; Spegnimento</div>\n      <div class=\"modal-text\">Sei sicuro? Il Pi si spegner&agrave; completamente.</div>\n      <div class=\"modal-btns\">\n        <button class=\"btn-ghost\" onclick=\"hideShutdownModal()\">Annulla</button>\n        <button class=\"btn-red\" onclick=\"confirmShutdown()\">Conferma</button>\n      </div>\n    </div>\n  </div>\n\n  <!-- Overlay reboot -->\n  <div class=\"reboot-overlay\" id=\"reboot-overlay\">\n    <div class=\"reboot-spinner\"></div>\n    <div class=\"reboot-text\">Riavvio in corso&hellip;</div>\n    <div class=\"reboot-status\" id=\"reboot-status\">In attesa che il Pi torni online</div>\n  </div>\n\n  <!-- Help modal -->\n  <div class=\"modal-overlay\" id=\"help-modal\" onclick=\"closeHelpModal()\">\n    <div class=\"help-modal-box\" onclick=\"event.stopPropagation()\">\n      <div class=\"help-modal-header\">\n        <span>// GUIDA VESSEL</span>\n        <button class=\"btn-ghost btn-sm\" onclick=\"closeHelpModal()\">&#x2715;</button>\n      </div>\n      <div class=\"help-modal-body\">\n        <div class=\"help-section\">\n          <div class=\"help-section-title\">PROVIDER CHAT</div>\n          <div class=\"help-table\">\n            <div class=\"help-row\"><span class=\"help-badge\" style=\"color:var(--accent);border-color:var(--accent);\">Haiku</span><span class=\"help-kw\">Claude &mdash; cloud, veloce</span></div>\n            <div class=\"help-row\"><span class=\"help-badge\" style=\"color:#888;border-color:#888;\">Local</span><span class=\"help-kw\">Gemma 3 4B &mdash; Pi, lento</span></div>\n            <div class=\"help-row\"><span class=\"help-badge\" style=\"color:#44aaff;border-color:#44aaff;\">PC</span><span class=\"help-kw\">Qwen 14B &mdash; GPU LAN</span></div>\n            <div class=\"help-row\"><span class=\"help-badge\" style=\"color:#ffaa00;border-color:#ffaa00;\">OpenRouter</span><span class=\"help-kw\">DeepSeek V3 &mdash; cloud</span></div>\n            <div class=\"help-row\"><span class=\"help-badge\" style=\"color:#00d4ff;border-color:#00d4ff;\">Brain</span><span class=\"help-kw\">Claude Code CLI &mdash; bridge</span></div>\n          </div>\n        </div>\n        <div class=\"help-section\">\n          <div class=\"help-section-title\">INFRASTRUTTURA</div>\n          <div class=\"help-table\">\n            <div class=\"help-row\"><span class=\"help-label\">Dashboard</span><span class=\"help-kw\">your-pi.local:8090</span></div>\n            <div class=\"help-row\"><span class=\"help-label\">Bridge</span><span class=\"help-kw\">porta 8095 &middot; auto-start</span></div>\n            <div class=\"help-row\"><span class=\"help-label\">Remoto</span><span class=\"help-kw\">Cloudflare Tunnel</span></div>\n            <div class=\"help-row\"><span class=\"help-label\">DB</span><span class=\"help-kw\">~/.nanobot/vessel.db</span></div>\n          </div>\n        </div>\n      </div>\n    </div>\n  </div>\n\n  <div id=\"toast\"></div>\n\n  <script src=\"/static/app.bdd0be2f4f.js\"></script>\n</body>\n\n</html>\n"
 LOGIN_HTML = "<!DOCTYPE html>\n<html lang=\"it\">\n<head>\n<script>(function(){var t=localStorage.getItem('vessel-theme');if(t)document.documentElement.setAttribute('data-theme',t);})()</script>\n<meta charset=\"UTF-8\">\n<meta name=\"viewport\" content=\"width=device-width, initial-scale=1.0, maximum-scale=1.0, user-scalable=no, viewport-fit=cover\">\n<meta name=\"apple-mobile-web-app-capable\" content=\"yes\">\n<meta name=\"apple-mobile-web-app-status-bar-style\" content=\"black-translucent\">\n<meta name=\"theme-color\" content=\"#060a06\">\n<link rel=\"icon\" type=\"image/jpeg\" href=\"data:image/jpeg;base64,/9j/4AAQSkZJRgABAQAAAQABAAD/2wBDAAYEBQYFBAYGBQYHBwYIChAKCgkJChQODwwQFxQYGBcUFhYaHSUfGhsjHBYWICwgIyYnKSopGR8tMC0oMCUoKSj/2wBDAQcHBwoIChMKChMoGhYaKCgoKCgoKCgoKCgoKCgoKCgoKCgoKCgoKCgoKCgoKCgoKCgoKCgoKCgoKCgoKCgoKCj/wAARCABAAEADASIAAhEBAxEB/8QAGwAAAgMBAQEAAAAAAAAAAAAAAAQDBQYBAgj/xAAzEAACAQMCAwUGBQUAAAAAAAABAgMABBEFIRIxUQYTFEFhIkJxgZGhMjM0YqIkUsHR4f/EABgBAQEBAQEAAAAAAAAAAAAAAAABAwIE/8QAHxEAAgIBBQEBAAAAAAAAAAAAAAECERIDBCExQcHx/9oADAMBAAIRAxEAPwD5foooqHIAEkAAknYAedMizkH5jRxnozbj5DJFTWscihEgXNzMCQc44Ewd8+WwJJ6fGr9ez8EOlie/MMMUhKxz3DlQxHMKu2PoTQqRmWtJMewUk2zhGyfpzper++0TwyQvaSxnvPy2STiSQjnggnBz8xVXcDvo3lK8M8ZxKMYzvjJ9c7H4g9aBoUooooQK6AWIUczsK5U1mvFdwD965+GcmgNDoAifV7xiMmFfYB3GAcDPpsnyzVz2g0+41Se27+QeGjZymWwFTCYUnkvnz3361R9mTEt3LNNJwRzJMr7kAIEBJyN+Zxt51Z6fdxppd1OyeKhZSixNk96SyjG4OPIEnfpWepdpo921cMXGa7+cjGmaSLF57cujW5mWQSNt7JU5AbqMDl0qg1e0MGslXzifijckjdweEnbrlWq0vrqNotOcq9vaTAKsaEjg3wQMY8s/9pfti8Ul74u2ZQomAQDkR3YwR6ZQfWmnfpN0oKlDz9MmOW/Oipr1Al3Mq/hDnHw5ioa0PEFMWP6kHojn+BpemLDe6Vf7wyD4lSB9zQFlp83dTaR3eULSzIXzsckD/VbWyS/vdVk0/TrKGSGBC8jKgGCB7uOZxvjesHbL4my7iIMLlJBJAVO/H5rj1XhI9Vx50/pvajV9O1gXGl3ipcToglWUDhDqMb8W2ee/7qjVm0Z4x47NzeeI0u6nS9igDwWviY3GzBdxupGzZHpnJrBX3FcdmraZlAMGNwv4svjJP2+VM33aHV+1F5Kt5NCZ5UEGY0CIIwcsxxzGw+u1edWuLaLSFs4JJBJ3iIsLAflpxZc48y2dvWolTE55JWUV9+oz1RD/AAWl6nvz/VyAe7hPoAP8VBXRiFdUlWBU4IOQelcooB/DTsZbRlWRx7UedwfQefUYz08q8a1O1/qcs726wSv+NVJxkbEnPLkc0nz50yLyXbIjZh77Rgn786FsLG7ltobuNSVkkQQ8QXZV4sk/b6E1I7eELcTCW6Jyxb2uA+vVvTcD48o/GSDHAkKMPeVN/vnHypckkkkkk7kmgs4SSSSck+dFFFCH/9k=\">\n<link rel=\"apple-touch-icon\" sizes=\"192x192\" href=\"data:image/jpeg;base64,/9j/4AAQSkZJRgABAQAAAQABAAD/2wBDAAYEBQYFBAYGBQYHBwYIChAKCgkJChQODwwQFxQYGBcUFhYaHSUfGhsjHBYWICwgIyYnKSopGR8tMC0oMCUoKSj/2wBDAQcHBwoIChMKChMoGhYaKCgoKCgoKCgoKCgoKCgoKCgoKCgoKCgoKCgoKCgoKCgoKCgoKCgoKCgoKCgoKCgoKCj/wAARCADAAMADASIAAhEBAxEB/8QAHAABAQADAQEBAQAAAAAAAAAAAAUDBAYCBwEI/8QARRAAAgEDAgMFBQUFBQUJAAAAAQIDAAQRBSEGEjETIkFRYRQycYGRFSNCobEHYnKCwSRSkrKzNmN1ovAlMzRTZKPC0eL/xAAZAQEBAQEBAQAAAAAAAAAAAAAAAQIDBAX/xAAqEQEAAgIBAwEHBQEAAAAAAAAAAQIDESEEEjFBEyJRYXGBoSMykcHw4f/aAAwDAQACEQMRAD8A/l+lKVGSlKUClKUClKUClKUClK/MjxI+tB+0oN+m/wAKUClKUClKUClKUClKUClKUClKUClKUClKUClK2tNsZtRu1t4OQEgszueVI1G7Ox8FA3JoMVrbT3dwkFrDJNM+yxxqWY/IVU+zbCxJ+1r7nmB3trHllYfxSZ5B8uY+le7u9RYpNN0IMloVxPOdnusdWc/hj8k6DbmyajtPBAMQos7/AN9x3R8F8fifpRVaK+th3dM0OBzj37kvcv8A/FB/hrKNc1aJT2dxZ2oA92KKCM48sKua07HRtZ1oqI45OyILKZDyJj0Hj8hWpc6PPbCQvJCyocEo2fpQ0rrqWou2JLPTL0nozWkLnb95QDWJ72wkfk1HRUgJO72cjwuP5XLKfoPjUZtOuVtknMf3TnlVsjc15SWe17kikoRns5FyCP8ArxFDStdaRm1e80ub22zjGZCF5ZYB/vE3wP3gSvr4VKrdtJ2hmW80uWSGeMk8obvJ8D+Ief5giqUkFvrsMk+nwx22pxoXms4xhJlAyzwjwIG5j+JXbKgiBSlKBSlKBSlKBSlKBSlKBSlKBSlKBV3UFbTLJNIiQ+3T8r3uB3geqQ/AbM37xAPuCsPDkUa3E9/cRrJb2EfblG6O+QsaH4uQT6A1OkndUluJCXnmLAOeuT7zfHfHzNB4uJWx7JbEsGI5yoyZG9PQeA+ddFpWnGyMYtbSK61JVMkslxjsrcAE+JAJA69em2DXjQtMh03RG4h1GVBluzsrfYtPIOufJR1J+A6muj0yxk1VrIavHcSSXCe0R2Ma/f33kT4RxA7LnbYkAk0aYbWbVNV7VtOmmu5sHtbps28EA6d3ByfixA9DS60bVZFJs49KnuSVY3Elyk8vpyhu6g9MZ6V1XE9hb8NaHay8QQxSxdsxttHt5R2MbFOf71jlmJ6DPXfpgE8Rc8bWshhSHhPh6O3iDKEMBLMD4MwIJ33zQnhnttG1m1S5WWwilumIUmJd2A6jH/dv06EE+R3qYbM3NuxRM25GHsySWiOd+zzuCD4HruN+gtadrPBmpJ7NqeiTaVI/KBcWs7PEjbd8oSCN89PDzNeOJLCKwuLf7P1OO+mkQCCTmLCSM57jHGGycjzGPhRYjfhwUsMlqY54ZMqTlXXYqw8D4gitmCdudLu0ZobqFhITGcFWByHXHTf6H8uhhuBqQmSURBWXL9scEFfwHb3sDGfE8p65rndVtJNF1iSJTzKh5o2YbOh6H4EUTSlq0UWoWQ1a0jCPzBL2FBhY5D0dR4I+Dt0VgR0K1FqrpV5DY3/NIGbTbtDFPH5xMdx6lSAR6qDWpqllLp2o3FnOQZIXKFl6N5MPQjBHoaMtWlKUClKUClKUClKUClKUClKdNzQWbjmteFbSEBea/uGuCB1KR/dp8uZpfpWh7K19rVtp8OSedbdeUZ3zgn6kmqmthY9T0+1K4Szs4VYZ8eTtX/5nNev2dyG312fVG5SdOtpbwFiR3lHdxjxyRRYdNp0UFxqN7ql3bpc6ToSpp9ja52nmzyqBtuS3M5NdFLqknC8d5d392knEN7g3dyYwRbIR3YkzvzDyA8N8YzUKK1k07Q+GtMti32hdSnUpipyzNjCbeffA+INafGao2jWzW8MqGO6V3Unm5F5AuWPq2friuV7+9FPi+j0/T/oX6mY32+I+8eWtx/cMLW2hWVZIpp3mLY7zlVChsnfBBO1cXGjySLHGrO7kKqqMliegA8TXZcaw3WoXOnQ21q8svZTOFjUkkBsnbyAGfrWHS7FdPuNO1XTZJuzZuzkWdVDIWBVsEdCCDg9RkGpjtFccTK9bitl6u9ax41/UOSYFWIYEEHBBGCDXe8NwWmpcMQJe3Biithc87xqGeLlHaKcZHiTj8q1eJdDRn1HUbmSWBuzR4FEXN7Q+FDsSTkZYkAgHJB8Mms3CxiPCd5DK5Rla551KnYdiuPzBpktFq7j5J0uK2HPNbfC34if7hsW0YEsOqxKXiYImpsWypLNiK4AIBAOVz8W8zUHiVEvLGNk5R2CEwjly/IGwUZvxFTkZ8h610PDD2qroK6kJGsbqA212CSABzycjH90ZHyOaw2gtbDWrzTLhxNZSJJGHBBBAx3xjrlBG3xU10rbfh5MmOaa36xE/y4K1btLWSI7mM9ov6N/Q/KqmrYuNL0u9Gefs2tJdsd6LHL/7bJ9KnrA1jrT206EFJGhdW+amqdiGm4b1a1Ytz20kV2BjpgmJ/wDOn0rTjKNSlKIUpSgUpSgUpSgUpSgV6RDI6xjq5C/XavNb/D6drr+mR5xz3UK58sutBucTSg8Sa84OAss0a5ONg3IB9Km6QUkQ2nMyyXc8URx05MnOfny/nWW+kMz6rMCEDyklTud5CfyxXnSJ/YHtr3kDmJmkVHUFSRgDY0WH0bXiYdf1u8ijaONEkW3kRyW7OJZF5lyehdWPyGK2bNoLaw0ldTaQz31y1sLrtOZVZY4/eVveUl92yMevSp3EJu04d0c6dG91LPpKGU8nNhWeUNhfnv8AHNc3cz3V/BYQXiSSRQTExckXKQWC8y4I32VdvT1rjbH3W5/3D6WLqpwYtU8zH2/c6riGwv7mDTJtOMUd1YPIVSQjv85BJye6cYII8azXF3penyxQ3t8IxMSO8CwUEYLHAJxjxx4eOK0LPVG1PiOwWI3KwSW0kcg5hy847RwGGNsfXbas3E2h6fqIYJexfaUSqGwCDHncBlO5XBGGGeuPSuHbMarfw+n7Wt5yZunj35nWp5ieJ5j5zHoqWWpiWZvsW4t7y4d1SMo5jWRlHcRiQCuT47Z6Z64kaDYT6fHMdSvIo5ZS91O/vCMFO8G8zjOwz1wK9aFokOlWojN0slxcqHlTmwTGGwGVOuAcjJwTvjbNTb3WJLyymgurT+0TI8aRQKFCR5HKMb97bqSTvvTtm2608cJGWuPtz54iL6tERGtbiPX5z406PTNXWOOKWzQJbaniyPtKgu0cgYc37pyqnb4ZO9RuKmjjsdH1fTwFUWkMhjG4EseFkVhjG4c/IVIlu9VtY7WB9PaJYGURK0JPeQEZLbYPe8vGus4isVteBJ0VBzFI5WDH3BKAe6PAAjfbfI3rvijsjUfN8zrck559pbe4isc/TlwX7Q7SG14j57VmMFxbw3EZIwcNGD/0fGv3Rh2uq30AIC3dnP8ADPZGUdPVRWHihQ2mcPTjmPNZdmWPQlJHGB8BgV+aRdpZavpN7LvCpQSYGO6DyOP8Pj612fPlJznfzpWxqNo9hqFzZye/bytEfXlOP6Vr0ZKUpQKUpQKUpQKUpQKrcJJz8S6aScJFMs7nOMLH3yfopqTVfQ/ubHWLvG8dr2KN5NKwT/J2lBMkLNZzynA53XI9Tk1X9kWHgsXVye9M+LcA755sH5YD/PHlUe5z7NbxLuXZpMAfyj9Pzq3xS7w6Zp+nEKFtpJVHL445Af8Am5qNQ72zFz9j6G0RTs5tFdUOAccpkLEjbOxIx8etchLFqEcWm3EsjTcrCaE8rSY91gwwAV25foM1b1XWJ9E0fRVsk7SW0sXtHkbohZic9ckESenh6iuFsrly8EDokqhgidozALkjyI29KxEc7dr5IikU9f8AruLZtUfVra6W3t4FCus8kYDc8feySw8TzEY67eVeuI+IIdCkktrS2jl1WVFaWVh3IsqCu343xjrsPImsltBLpOpwxaVDbGDmft2jkB7QhWHKoPUA9SOpG2QM1zWtWlxrPGt1D3svMqNIkRYIoUDJC+QFcqxu3Pwe/NlnHhmcc7mbeft6cR/LptB1y21OUTW9s0F3HyvLHty82fwP73KSB3T09agXsd9bWqK7WwQFVYJCJJmbJbmcee2fHw65pwMskGsX1tyAP2Y3cY5SsgxsfMmsvFFutnZJdCxtO3lmKXDorAZ5SRjOCAxyfI467Va11eYjwmTNGTpovefe5j68x+fq2dBW4GrO1zqaXzPazPHyOeYZ2yScYHmvU7ZFdVxTPBNHrlg2I5RolrKqhN+aMMW+uxz618s02S9F97fBBJMUfMhWMlTnqDjzGa7q61Y6trnGUkyx2yyaQFWLJOOQIQoLAHOfQV0iurbeO2fvxdk+d7/EQ5rU7J5f2c6feFhiG6kTGPMnx+I6VzcHf05lP4JfTow//IrqFmVOATaEESyiWU7noskfKcfNq5exbNrdpyqThHyRuMNjb61uHnlU4pJl1KK5bPNc2sE7EnOWMShj82BqRVjWyZdM0KbqPZGgO+d0lf8Aoy1HoyUpSgUpSgUpSgUpSgVXt8pwpft07S9t0+OElJH5g1Iqup5eEZAQRz6gpU42OImzv/MPrQaUSM+tWETAoR2I69AcHP55qhxnHLbvpsMzc0ns7Ss2feLyu2f0qfz/APbduzEpyiIEkbjCKM4+VVv2iXHtGq2IJVmj0+3QlRgE8mSfzqtKmkajaXGlqtzDDc3ccZZFktu1d/MEgg4x6+e1WrfR9DsVa5WSGU3jnso54WQBVD8yqcFRk8p6nAB3rmOEjLc2ZtbJGN6ctEYwAcg5Iz54J67bV0800UFjblobmY3aHktYlIM6ZYrzAZA2Hic4yCGGK57er2e9Spm1tl0tWtm5RZW4b2UHvc5L8hx+IMowcbrsehNal3apaWWse2XsEZubogorYD8yqvKcb5X3gPTfFcTrOoXI1BYkkjhZysjXEIJkBx0yDlcbjAx03roNLvpZXLS3eoX9uG+8D2RKy56hmG7bf3h08utZ7ZmNus5K1tGPfES6C2MF3Ck0DPc3CwmG3BJSJwCoK5CnbKryg4zvk1ivtN7WV4ruSWTtATMjzdtyDONmU9AXbxOD8K1dQ03V53kW3fVILcRt24i7kUSoOZe6x9B0x8zU7hDX5tQgFq9tJNf2qk2z2q5cj3jlTsQOXOOm5qdsxGyclb2mk/P/AH4dPY2Nnptm6RWyQ2ckeXcy5Ktg4bCncHBGfM+IzXEcHhdV4m1KAMkYvrG5jRnPunkyvz7uPnXSa1ewTaLNcm2Z2MMoSbmPZybtg4HQjIwT1AxXE8FTOnFWnBZDDI7tEH6Y51K/1rVeZ25ZfdpFYVtchhgNnDGqIj291B3TsSsjL4/wiuL00M87RqMl42GPkT/Su106N7y34W7clg1xcxNzdTl1Jyf5jXEt/Z9QcKfddlz9RXSHllZl+94QtjnPYX0i/ASRof1Q/nUeq8f+x83/ABCP/RepFGSlKUClKUClKUClKUCq1wccI2YH4764J+UcQH+Y1JqrdbcJ6ef/AFtz/pwUGmzq+sSyLl0QMRzHJIC4HSt3jK37OfTLhAOzurCGVcNzdAUPzyp2rWtIjDrNxEwbKpKDjOfcPlVS/hm1DgHT7nvSfZsrwkhfcidsjJ/jz/io08cCXEkN9L2KSGVQHjaLJdG6bAe9kHHL412Ou3EDSXT2k4Fy1oLm0RUK9ieUBjGVx3ioyc97unIzXzTRb86dqEU/LzoGHOv95cjIB8D613es6xJdaDcTXKrIttMgiePuGTnWUCXJyd+pA2J5sgZzWLRy9mG0TXn0aHCOgSzvaapIUmhkfLPk86SA9G6+GDkjffyNfarzhdrjTrZtHvZ7B5B30t3KKzYBYDGx8s4PU/Cvi37NuL10OZ9P1Aj7NuWHO7Z+7O3ex49PzNfZuHeJ+H7eHsDfxzSLzFkLj7xubPP16HGetbeR707SLixseS+uZbw55QlxJzqM+DeB2HjXyqOWzTjy4lS0lhjWcIvJlY3WNT2hwo65KkY6b19nk13Sra1E0FzCrqOZT3W5hnxJHj1PQ7V8Nvrqwm4mttL0GYS2zieN5J2LIDKcnBG+BgVm3iXTDMRkjbc/aHdSjh62hmitUklkSXntWYq5w5bJIGfeXbwxXJcLW9xfcR6bDYnF20qmNsjukb538sVtcd6u2qawCzsVUFivMSAzHJIyBjNZf2eLLbX11rCRNImnwMdjg8zgqoHrvUrHDWbi2l3h+C41G54dgtomWI6pdFXxsEHZs243wACfnXzy+5ZNWuDH7hlYrjyya+jcKzxWOtWlqs4eZFFnGVIKq8hJuJQemAMqD44r53ZvG2pl3BEZ52wBnGxxW4cFSP8A2Qm/4hH/AKL1Hqund4QYMPf1BeU/wwnP+YVIoyUpSgUpSgUpSgUpSgVYGJeD3H4oNQUn4SREfrHUerHDxM8Wpad19rtiyD/eRfeL9Qrr/NQa1pKkOvWs0rckMgXmbyDLyt+ear8G6lFpGs3OmamgfTroPa3II35SMAj1Bww9RXOXAEtijg5aJuX+U7j88/WqEskF7ZxyBJEkgjRe3Azhx4N6Hwbw6b0aaWu6XLo+r3NjOys0LYDr7rqd1YehBB+dV+HFutT0XVdLieM4jFxGsjb5QklV9SM/Styzs5OJrKGwkeKPUrSMLaF2AEsZJPZlvjnlJ6EkHbGIFpcXvDusuWieG7h54pIpAQRkFWBHzp5WJ0mk9wDFfmCMHp5Gv3qnjtV/QbrSuxK6pbFmjGUK47xGdm9MVUQnaQZjkZgAclSfGq/CxNvNd34laI2lu7KVOCWYcgGfmT6gGp99Kt3fyPEuEJwuBjbw2r9SWaG2mtlK9lMylsdW5c4Hw3/SpKxOp3D1YWlxqV5Da2kTz3U7hEjXcsa7m9ay03RE4Z+0YoYY5vadRuIxzGWXGBGgHXlHTwzvtWLSIo+H+Hry9jRftFWVJZTJg4cHlhjx5+852IAA2zvOv9Nht9bMVzCyQabbRm7ZSMmUgE59SzYx6VB1+ladpum8K6jxFa27RLbxMsEtwxaaV2HIp2wqDfpgk+dfKtPGDPLkjkiIB9W7oH5n6VX4h4lfUZbyG0RoNOmZSkDMTy4Oc+WTtn4VKQdnp6kghpHLjPioGP1J+lVJVbzMPC+mREYM9xPcdOqgJGPzV6j1X4o+61JbIYC2MKWwH7wGX+rs5qRRkpSlApSlApSlApSlArPY3Utle291bnE0Eiyp/EpyP0rBSgraxbw2+rXCLiOxugJYSveCxv3kPrjofgRU2CabTLp1whyMHxDKR4HyIP51W0q4XULRdHvZEVS2bOd9uwkJ90n/AMtz18AcN/ezOnhc89pdfc3EDFFEnd5SCeZCfDf6HPnRYbfaG0yUZVMYW4ijbfKn3kz47fpXZ8baU2p6Lpl+cyzXEAazuMZMgVd4H23cAEqfEbdTivnEtrcxDnIDCPqUcPyj1wTgb1Yl4v1SXTLexeXMNvIksONijKSRj60VBwUGGHhkfOv1YzISEUknoBuazzmW8f2l0HKzhDy4AzjYem1YJmw/KmQEJC56gZ/WgzWUsUZYSBtwcFTv02/PFb/Dk5g1iK4SNZblG5oIygdWlJATIPhk5+VRlyWx57Vf4QMCavFM5y8BaVRnGSqMwP1AoLn7Q7qHT9Yt9DjkllTTHLXMjPkz3LYMr+ODnC+PSuV1bV7nULy+mdgq3coldEGFyM4+ma1VWW+uZXlly5DSPI+T6mtiNYbYc0bmWboGK4VPUZ3J+W1Db1BF2McUaQiS7lboV5iufdUDzP8A9VZ9jTSL4z67NFLeQN3bFHEjF16LKR3UUEbrnm2xgdR+JGOHuW4uiza0y88UBH/hSw2kkz+PByq+GQxP4Tz9EZLiaS4uJZ52LyysXdj4sTkn6msdKUQpSlApSlApSlApSlApSlAqu+q294kY1ax7eZAF9pgl7KV1AwA2QyscY72M+ZNSKUFoWWn3DB9K1P2aTG8N+eyYfCRcoR8eX4VjvrW7s7qC21AW4WYCVZE7KRXVsgMHXOR18diPDFSar211aXmnQ2GpO8DwFvZ7pU5wqsclHUb8vNkgjcEnY52CC0ckcrRMjCQHlKkb5+FbsMJs0MkuVuGH3a+K+bHyPkPnVhbLljCLxHpwiG4HazD8uzz8q8RRaDa7Xlxe6g77E2iiFY+vezICXPjjCg+dF2i6iPv1nC4SUBthtzfiH1zWO0iuXdmtI5XZRuY1JIB28Kvx6VKyn7M1LT7qFz7kk6QuT6xykb/DI9aSaXMojTVNRsLSBcHkSZZWGfERxZ3+OPjVNpEcTWsEna4WSVQoXO4XIJJ8ugFXbi8fQrTTobCGGDUGtxcT3XIGmUyElApOeTCch7uD3jvWtFNotj95BFdahcKcoLlFihHqyAszfDIHn5VLu7iW7uZbi5cyTSsXdj4k1EeHdpHZ3Ys7EksxyST4k15pSgUpSgUpSgUpSgUpSgUpSgUpSgUpSgUpSgUpSgeGPCg2GB0pSgUpSgUpSgUpSgUpSgUpSg//2Q==\">\n<link rel=\"manifest\" href=\"/manifest.json\">\n<link rel=\"preconnect\" href=\"https://fonts.googleapis.com\">\n<link rel=\"preconnect\" href=\"https://fonts.gstatic.com\" crossorigin>\n<link rel=\"stylesheet\" href=\"https://fonts.googleapis.com/css2?family=JetBrains+Mono:wght@300;400;500;600;700&display=swap\">\n<title>Vessel — Login</title>\n<style>\n  :root {\n    --bg: #020502; --bg2: #081208; --card: #0a1a0a; --card2: #0f220f;\n    --border: #162816; --border2: #1e3a1e;\n    --accent: #00ff41; --accent2: #00dd38; --accent3: #00aa2a; --accent-dim: #002a0e;\n    --glow-sm: 0 0 4px rgba(0,255,65,0.4);\n    --glow-md: 0 0 8px rgba(0,255,65,0.3), 0 0 20px rgba(0,255,65,0.12);\n    --red: #ff3333; --muted: #3d6b3d; --text: #c8ffc8; --text2: #7ab87a;\n    --amber: #ffb000; --btn-hover: #004422;\n    --font: 'JetBrains Mono', 'Fira Code', monospace;\n  }\n  [data-theme=\"amber\"] {\n    --bg: #050300; --bg2: #0f0a04; --card: #1a1008; --card2: #22160a;\n    --border: #2e2010; --border2: #3e2e18;\n    --accent: #ffb000; --accent2: #dd9800; --accent3: #aa7400; --accent-dim: #2a1a00;\n    --glow-sm: 0 0 4px rgba(255,176,0,0.4);\n    --glow-md: 0 0 8px rgba(255,176,0,0.3), 0 0 20px rgba(255,176,0,0.12);\n    --red: #ff3333; --muted: #6b5530; --text: #ffe0a0; --text2: #b89860;\n    --amber: #ff8800; --btn-hover: #442200;\n  }\n  [data-theme=\"cyan\"] {\n    --bg: #000305; --bg2: #040a10; --card: #081420; --card2: #0c1c2a;\n    --border: #102838; --border2: #183a4e;\n    --accent: #00ffcc; --accent2: #00ddaa; --accent3: #00aa88; --accent-dim: #002a22;\n    --glow-sm: 0 0 4px rgba(0,255,204,0.4);\n    --glow-md: 0 0 8px rgba(0,255,204,0.3), 0 0 20px rgba(0,255,204,0.12);\n    --red: #ff3333; --muted: #305858; --text: #c0f0f0; --text2: #6aa8a8;\n    --amber: #44aaff; --btn-hover: #003344;\n  }\n  [data-theme=\"red\"] {\n    --bg: #050000; --bg2: #100404; --card: #1a0808; --card2: #220c0c;\n    --border: #2e1414; --border2: #3e1e1e;\n    --accent: #ff3333; --accent2: #dd2828; --accent3: #aa1e1e; --accent-dim: #2a0808;\n    --glow-sm: 0 0 4px rgba(255,51,51,0.4);\n    --glow-md: 0 0 8px rgba(255,51,51,0.3), 0 0 20px rgba(255,51,51,0.12);\n    --red: #ff5555; --muted: #6b3d3d; --text: #ffc8c8; --text2: #b87a7a;\n    --amber: #ff8844; --btn-hover: #440000;\n  }\n  [data-theme=\"sigil\"] {\n    --bg: #050208; --bg2: #0a0614; --card: #120820; --card2: #180c2a;\n    --border: #251440; --border2: #351e58;\n    --accent: #b44dff; --accent2: #9b3de0; --accent3: #6a2d9e; --accent-dim: #1a0a2a;\n    --glow-sm: 0 0 4px rgba(180,77,255,0.4);\n    --glow-md: 0 0 8px rgba(180,77,255,0.3), 0 0 20px rgba(180,77,255,0.12);\n    --red: #ff0040; --muted: #5a3878; --text: #e0d0f0; --text2: #9878b8;\n    --amber: #e0a0ff; --btn-hover: #2a1048;\n  }\n  [data-theme=\"ghost\"] {\n    --bg: #020202; --bg2: #0a0a0a; --card: #111111; --card2: #1a1a1a;\n    --border: #252525; --border2: #333333;\n    --accent: #e0e0e0; --accent2: #bbbbbb; --accent3: #888888; --accent-dim: #1a1a1a;\n    --glow-sm: 0 0 4px rgba(224,224,224,0.3);\n    --glow-md: 0 0 8px rgba(224,224,224,0.2), 0 0 20px rgba(224,224,224,0.08);\n    --red: #cc4444; --muted: #555555; --text: #d0d0d0; --text2: #888888;\n    --amber: #aa9966; --btn-hover: #2a2a2a;\n  }\n  * { box-sizing: border-box; margin: 0; padding: 0; }\n  body {\n    background: var(--bg); color: var(--text); font-family: var(--font);\n    height: 100vh; height: 100dvh; display: flex; align-items: center; justify-content: center;\n    overflow: hidden; position: fixed; inset: 0;\n    background-image: repeating-linear-gradient(0deg, transparent, transparent 2px,\n      rgba(0,0,0,0.03) 2px, rgba(0,0,0,0.03) 4px);\n  }\n  .login-box {\n    background: var(--card); border: 1px solid var(--border2); border-radius: 8px;\n    padding: 36px 32px 28px; width: min(380px, 90vw); text-align: center;\n    box-shadow: 0 0 60px var(--accent-dim);\n  }\n  .login-icon { display: none; }\n  .login-sigil-wrap {\n    width: min(280px, 70vw);\n    aspect-ratio: 320 / 170;\n    margin: 0 auto 14px;\n    border-radius: 6px;\n    overflow: hidden;\n    background: var(--bg);\n  }\n  .login-sigil-canvas {\n    width: 100%; height: 100%; display: block;\n  }\n  .login-title { font-size: 20px; font-weight: 700; color: var(--accent); letter-spacing: 2px;\n    text-shadow: 0 0 10px var(--accent3); margin-bottom: 6px; }\n  .login-sub { font-size: 12px; color: var(--muted); margin-bottom: 24px; }\n  #pin-input { position: absolute; opacity: 0; pointer-events: none; }\n  .pin-display {\n    display: flex; gap: 10px; justify-content: center; margin-bottom: 6px;\n  }\n  .pin-dot {\n    width: 16px; height: 16px; border-radius: 50%; border: 2px solid var(--accent3);\n    background: transparent; transition: background .15s, box-shadow .15s;\n  }\n  .pin-dot.filled {\n    background: var(--accent); box-shadow: 0 0 8px var(--accent3);\n  }\n  .pin-counter {\n    font-size: 11px; color: var(--muted); margin-bottom: 16px; letter-spacing: 1px;\n  }\n  .numpad {\n    display: grid; grid-template-columns: repeat(3, 1fr); gap: 10px;\n    width: min(300px, 80vw); margin: 0 auto;\n  }\n  .numpad-btn {\n    font-family: var(--font); font-size: 24px; font-weight: 600;\n    padding: 16px 0; border: 1px solid var(--border2); border-radius: 8px;\n    background: var(--bg2); color: var(--accent); cursor: pointer;\n    transition: all .15s; -webkit-tap-highlight-color: transparent;\n    user-select: none; min-height: 58px; touch-action: manipulation;\n  }\n  .numpad-btn:active { background: var(--accent-dim); border-color: var(--accent3); }\n  .numpad-btn.fn { font-size: 14px; color: var(--muted); }\n  .numpad-btn.fn:active { color: var(--accent); }\n  .numpad-bottom {\n    width: min(300px, 80vw); margin: 14px auto 0;\n  }\n  .numpad-submit {\n    font-family: var(--font); font-size: 14px; font-weight: 600; letter-spacing: 2px;\n    width: 100%; padding: 16px 0; border: 1px solid var(--accent3); border-radius: 8px;\n    background: var(--accent-dim); color: var(--accent); cursor: pointer;\n    transition: all .15s; -webkit-tap-highlight-color: transparent;\n    user-select: none; text-transform: uppercase; touch-action: manipulation;\n  }\n  .numpad-submit:active { background: var(--btn-hover); }\n  #login-error {\n    margin-top: 12px; font-size: 11px; color: var(--red); min-height: 16px;\n  }\n  @keyframes shake { 0%,100%{transform:translateX(0)} 25%{transform:translateX(-6px)} 75%{transform:translateX(6px)} }\n  .shake { animation: shake .3s; }\n  /* CRT power-on transition */\n  @keyframes crt-on {\n    0% { transform: scaleY(0.005) scaleX(0); opacity: 1; filter: brightness(30); }\n    20% { transform: scaleY(0.005) scaleX(1); opacity: 1; filter: brightness(30); }\n    40% { transform: scaleY(1) scaleX(1); opacity: 1; filter: brightness(2); }\n    60% { transform: scaleY(1) scaleX(1); opacity: 1; filter: brightness(1.2); }\n    100% { transform: scaleY(1) scaleX(1); opacity: 1; filter: brightness(1); }\n  }\n  .crt-on {\n    animation: crt-on 0.6s cubic-bezier(0.2, 0, 0.1, 1) forwards;\n  }\n  @keyframes crt-glow {\n    0% { box-shadow: 0 0 0px transparent; }\n    50% { box-shadow: var(--glow-md), inset 0 0 40px var(--accent-dim); }\n    100% { box-shadow: var(--glow-sm); }\n  }\n  .crt-glow { animation: crt-glow 0.8s ease-out; }\n</style>\n</head>\n<body>\n<div class=\"login-box\" id=\"login-box\">\n  <div class=\"login-sigil-wrap\">\n    <canvas id=\"login-sigil-canvas\" class=\"login-sigil-canvas\"></canvas>\n  </div>\n  <div class=\"login-title\">VESSEL</div>\n  <div class=\"login-sub\" id=\"login-sub\">Inserisci PIN</div>\n  <input id=\"pin-input\" type=\"password\" inputmode=\"none\" pattern=\"[0-9]*\"\n    maxlength=\"4\" autocomplete=\"off\" readonly tabindex=\"-1\">\n  <div class=\"pin-display\" id=\"pin-display\"></div>\n  <div class=\"pin-counter\" id=\"pin-counter\">0 / 6</div>\n  <div class=\"numpad\">\n    <button class=\"numpad-btn\" onclick=\"numpadPress('1')\">1</button>\n    <button class=\"numpad-btn\" onclick=\"numpadPress('2')\">2</button>\n    <button class=\"numpad-btn\" onclick=\"numpadPress('3')\">3</button>\n    <button class=\"numpad-btn\" onclick=\"numpadPress('4')\">4</button>\n    <button class=\"numpad-btn\" onclick=\"numpadPress('5')\">5</button>\n    <button class=\"numpad-btn\" onclick=\"numpadPress('6')\">6</button>\n    <button class=\"numpad-btn\" onclick=\"numpadPress('7')\">7</button>\n    <button class=\"numpad-btn\" onclick=\"numpadPress('8')\">8</button>\n    <button class=\"numpad-btn\" onclick=\"numpadPress('9')\">9</button>\n    <button class=\"numpad-btn fn\" onclick=\"numpadClear()\">C</button>\n    <button class=\"numpad-btn\" onclick=\"numpadPress('0')\">0</button>\n    <button class=\"numpad-btn fn\" onclick=\"numpadDel()\">DEL</button>\n  </div>\n  <div class=\"numpad-bottom\">\n    <button class=\"numpad-submit\" onclick=\"doLogin()\">SBLOCCA</button>\n  </div>\n  <div id=\"login-error\"></div>\n</div>\n<script>\n// ── Sigil Engine (cinematic login) ──\nconst _SC = (function() {\n  const cs = getComputedStyle(document.documentElement);\n  const v = (p, d) => cs.getPropertyValue(p).trim() || d;\n  return {\n    hood: v('--accent3', '#00aa2a'), hoodEdge: v('--accent2', '#00dd38'),\n    eye: v('--accent', '#00ff41'), glow: v('--accent', '#00ff41'),\n    sigil: '#ff0040', bg: v('--bg', '#020502')\n  };\n})();\nfunction _h2r(h){if(typeof h==='string'&&h.startsWith('rgb')){const m=h.match(/(\\d+)/g);return{r:+m[0],g:+m[1],b:+m[2]};}h=h.replace('#','');return{r:parseInt(h.slice(0,2),16),g:parseInt(h.slice(2,4),16),b:parseInt(h.slice(4,6),16)};}\nfunction _lc(c1,c2,t){const a=_h2r(c1),b=_h2r(c2);return`rgb(${a.r+(b.r-a.r)*t|0},${a.g+(b.g-a.g)*t|0},${a.b+(b.b-a.b)*t|0})`;}\nfunction _ra(h,a){const c=_h2r(h);return`rgba(${c.r},${c.g},${c.b},${a})`;}\n\nfunction _drawLoginHood(ctx,W,H){\n  const cx=W/2,r=W*.297,hcy=H*.635,peakY=H*.071,shoulder=W*.328,baseY=H*1.03;\n  const ambG=ctx.createRadialGradient(cx,hcy,r*.6,cx,hcy,r*1.6);\n  ambG.addColorStop(0,_ra(_SC.hoodEdge,.06));ambG.addColorStop(1,'rgba(0,0,0,0)');\n  ctx.fillStyle=ambG;ctx.fillRect(0,0,W,H);\n  function hp(){ctx.beginPath();ctx.moveTo(cx-shoulder,baseY);\n    ctx.bezierCurveTo(cx-shoulder,hcy+r*.15,cx-r*.85,hcy-r*.2,cx-r*.5,peakY+H*.103);\n    ctx.quadraticCurveTo(cx,peakY-H*.024,cx+r*.5,peakY+H*.103);\n    ctx.bezierCurveTo(cx+r*.85,hcy-r*.2,cx+shoulder,hcy+r*.15,cx+shoulder,baseY);ctx.closePath();}\n  hp();const dk=_lc(_SC.hood,'#000',.45),md=_lc(_SC.hood,'#000',.15);\n  const hg=ctx.createLinearGradient(cx-shoulder,0,cx+shoulder,0);\n  hg.addColorStop(0,_ra(dk,.3));hg.addColorStop(.12,dk);hg.addColorStop(.28,md);\n  hg.addColorStop(.4,_SC.hoodEdge);hg.addColorStop(.5,_lc(_SC.hoodEdge,'#fff',.03));\n  hg.addColorStop(.6,_SC.hoodEdge);hg.addColorStop(.72,md);hg.addColorStop(.88,dk);\n  hg.addColorStop(1,_ra(dk,.3));ctx.fillStyle=hg;ctx.fill();\n  hp();const vg=ctx.createLinearGradient(0,peakY,0,baseY);\n  vg.addColorStop(0,'rgba(255,255,255,.03)');vg.addColorStop(.2,'rgba(0,0,0,0)');\n  vg.addColorStop(.55,'rgba(0,0,0,.25)');vg.addColorStop(1,'rgba(0,0,0,.65)');\n  ctx.fillStyle=vg;ctx.fill();\n  hp();const cd=ctx.createRadialGradient(cx,hcy+H*.03,r*.05,cx,hcy+H*.03,r*.95);\n  cd.addColorStop(0,'rgba(0,0,0,.85)');cd.addColorStop(.4,'rgba(0,0,0,.6)');\n  cd.addColorStop(.7,'rgba(0,0,0,.2)');cd.addColorStop(1,'rgba(0,0,0,0)');\n  ctx.fillStyle=cd;ctx.fill();\n  const fow=r*.72,oCY=hcy+H*.07;\n  const sh=ctx.createRadialGradient(cx,oCY,fow*.15,cx,oCY,fow*1.15);\n  sh.addColorStop(0,'rgba(0,0,0,.9)');sh.addColorStop(.45,'rgba(0,0,0,.6)');\n  sh.addColorStop(.75,'rgba(0,0,0,.15)');sh.addColorStop(1,'rgba(0,0,0,0)');\n  ctx.fillStyle=sh;ctx.beginPath();ctx.ellipse(cx,oCY,fow*1.15,fow*.95,0,0,Math.PI*2);ctx.fill();\n}\n\nfunction _drawLoginEye(ctx,ex,ey,sz,col,gCol,gR,int){\n  int=int??1;const gc=_h2r(gCol);\n  const g1=ctx.createRadialGradient(ex,ey,0,ex,ey,gR*int);\n  g1.addColorStop(0,`rgba(${gc.r},${gc.g},${gc.b},${.5*int})`);\n  g1.addColorStop(.3,`rgba(${gc.r},${gc.g},${gc.b},${.25*int})`);\n  g1.addColorStop(.6,`rgba(${gc.r},${gc.g},${gc.b},${.08*int})`);\n  g1.addColorStop(1,'rgba(0,0,0,0)');ctx.fillStyle=g1;\n  ctx.beginPath();ctx.arc(ex,ey,gR*int,0,Math.PI*2);ctx.fill();\n  ctx.fillStyle=col;ctx.beginPath();ctx.moveTo(ex-sz,ey);\n  ctx.bezierCurveTo(ex-sz*.5,ey-sz*.7,ex+sz*.5,ey-sz*.7,ex+sz,ey);\n  ctx.bezierCurveTo(ex+sz*.5,ey+sz*.7,ex-sz*.5,ey+sz*.7,ex-sz,ey);ctx.closePath();ctx.fill();\n  const cr=ctx.createRadialGradient(ex,ey,0,ex,ey,sz*.5);\n  cr.addColorStop(0,'rgba(255,255,255,.9)');cr.addColorStop(.4,col);cr.addColorStop(1,_ra(col,.5));\n  ctx.fillStyle=cr;ctx.beginPath();ctx.ellipse(ex,ey,sz*.55,sz*.38,0,0,Math.PI*2);ctx.fill();\n  ctx.fillStyle='#000';ctx.beginPath();ctx.arc(ex,ey,sz*.18,0,Math.PI*2);ctx.fill();\n}\n\nfunction _drawLoginHappy(ctx,ex,ey,sz,col,gCol,gR){\n  const gc=_h2r(gCol);const g1=ctx.createRadialGradient(ex,ey,0,ex,ey,gR*.7);\n  g1.addColorStop(0,`rgba(${gc.r},${gc.g},${gc.b},.25)`);g1.addColorStop(1,'rgba(0,0,0,0)');\n  ctx.fillStyle=g1;ctx.beginPath();ctx.arc(ex,ey,gR*.7,0,Math.PI*2);ctx.fill();\n  ctx.strokeStyle=col;ctx.lineWidth=3.5;ctx.lineCap='round';ctx.beginPath();\n  ctx.arc(ex,ey+sz*.3,sz*.8,Math.PI*1.15,Math.PI*1.85);ctx.stroke();\n}\n\nfunction _drawLoginEyeClosing(ctx,ex,ey,sz,col,gCol,gR,closeT){\n  const gc=_h2r(gCol);\n  const alpha=closeT<.8?1:(1-(closeT-.8)/.2);\n  const glowInt=Math.max(0,1-closeT*1.2);\n  if(glowInt>0){\n    const g1=ctx.createRadialGradient(ex,ey,0,ex,ey,gR*glowInt);\n    g1.addColorStop(0,`rgba(${gc.r},${gc.g},${gc.b},${.3*glowInt})`);\n    g1.addColorStop(1,'rgba(0,0,0,0)');\n    ctx.fillStyle=g1;ctx.beginPath();ctx.arc(ex,ey,gR*glowInt,0,Math.PI*2);ctx.fill();\n  }\n  ctx.globalAlpha=alpha;\n  if(closeT<.5){\n    const hFactor=1-closeT*2;\n    ctx.fillStyle=col;ctx.beginPath();ctx.moveTo(ex-sz,ey);\n    ctx.bezierCurveTo(ex-sz*.5,ey-sz*.7*hFactor,ex+sz*.5,ey-sz*.7*hFactor,ex+sz,ey);\n    ctx.bezierCurveTo(ex+sz*.5,ey+sz*.7*hFactor,ex-sz*.5,ey+sz*.7*hFactor,ex-sz,ey);\n    ctx.closePath();ctx.fill();\n  } else {\n    ctx.strokeStyle=col;ctx.lineWidth=2.5;ctx.lineCap='round';\n    ctx.beginPath();ctx.moveTo(ex-sz,ey);ctx.lineTo(ex+sz,ey);ctx.stroke();\n  }\n  ctx.globalAlpha=1;\n}\n\nfunction _drawLoginBrainGlyph(ctx,gx,gy,col,scale,rotation,glowInt){\n  ctx.save();ctx.translate(gx,gy);ctx.rotate(rotation);ctx.scale(scale,scale);\n  const gc=_h2r(col);\n  if(glowInt>0){\n    const g1=ctx.createRadialGradient(0,0,0,0,0,22);\n    g1.addColorStop(0,`rgba(${gc.r},${gc.g},${gc.b},${.35*glowInt})`);\n    g1.addColorStop(.5,`rgba(${gc.r},${gc.g},${gc.b},${.12*glowInt})`);\n    g1.addColorStop(1,'rgba(0,0,0,0)');\n    ctx.fillStyle=g1;ctx.beginPath();ctx.arc(0,0,22,0,Math.PI*2);ctx.fill();\n  }\n  ctx.strokeStyle=col;ctx.fillStyle=col;ctx.lineCap='round';\n  ctx.lineWidth=2;ctx.beginPath();ctx.moveTo(0,-9);ctx.lineTo(0,9);ctx.stroke();\n  ctx.beginPath();ctx.moveTo(-9,0);ctx.lineTo(9,0);ctx.stroke();\n  ctx.lineWidth=1;\n  ctx.beginPath();ctx.moveTo(-6,-6);ctx.lineTo(6,6);ctx.stroke();\n  ctx.beginPath();ctx.moveTo(-6,6);ctx.lineTo(6,-6);ctx.stroke();\n  ctx.lineWidth=1.5;ctx.beginPath();ctx.arc(0,0,4,0,Math.PI*2);ctx.stroke();\n  const dp=11;const dr=1.8;\n  ctx.beginPath();ctx.arc(0,-dp,dr,0,Math.PI*2);ctx.fill();\n  ctx.beginPath();ctx.arc(0,dp,dr,0,Math.PI*2);ctx.fill();\n  ctx.beginPath();ctx.arc(-dp,0,dr,0,Math.PI*2);ctx.fill();\n  ctx.beginPath();ctx.arc(dp,0,dr,0,Math.PI*2);ctx.fill();\n  ctx.restore();\n}\n\n// ── State machine ──\nconst DIGIT_POS={'1':{x:-1,y:-1},'2':{x:0,y:-1},'3':{x:1,y:-1},'4':{x:-1,y:0},'5':{x:0,y:0},'6':{x:1,y:0},'7':{x:-1,y:1},'8':{x:0,y:1},'9':{x:1,y:1},'0':{x:0,y:1.5}};\nlet _loginState='ALERT', _loginStart=Date.now(), _loginAnim=null;\nlet _glanceTargetX=0, _glanceTargetY=0, _glanceTime=0;\nlet _firstDigitPressed=false;\n\nfunction _loginLoop(){\n  const c=document.getElementById('login-sigil-canvas');\n  if(!c)return;\n  const ctx=c.getContext('2d');\n  const dpr=window.devicePixelRatio||1;\n  const dW=c.clientWidth,dH=c.clientHeight;\n  if(c.width!==dW*dpr||c.height!==dH*dpr){c.width=dW*dpr;c.height=dH*dpr;}\n  const W=dW,H=dH,now=Date.now()-_loginStart;\n  ctx.save();ctx.scale(dpr,dpr);\n  ctx.fillStyle=_SC.bg;ctx.fillRect(0,0,W,H);\n\n  const sx=W/320,sy=H/170,s=Math.min(sx,sy),cx=W/2;\n  const eyY=82*sy,ed=44*s,es=18*s,gr=28*s,lx=cx-ed,rx=cx+ed;\n\n  // Glance offset (decays over 300ms)\n  const glElapsed=Date.now()-_glanceTime;\n  const glDecay=Math.max(0,1-glElapsed/300);\n  const glX=_glanceTargetX*glDecay*s;\n  const glY=_glanceTargetY*glDecay*s;\n\n  // Scanlines\n  ctx.fillStyle='rgba(0,0,0,.04)';\n  for(let y=0;y<H;y+=2)ctx.fillRect(0,y,W,1);\n\n  if(_loginState==='ALERT'){\n    // Eyes wake up and scan around — someone knocked at the gate\n    const ramp=Math.min(1,now/200);\n    const intensity=.7*ramp;\n    const scanDx=10*Math.sin(now/400*Math.PI)*s*ramp;\n    const scanDy=3*Math.cos(now/600*Math.PI)*s*ramp;\n    const ec=_lc('#001a08',_SC.eye,intensity);\n    _drawLoginEye(ctx,lx+scanDx,eyY+scanDy,es*1.1,ec,_SC.glow,gr*.7,intensity);\n    _drawLoginEye(ctx,rx+scanDx,eyY+scanDy,es*1.1,ec,_SC.glow,gr*.7,intensity);\n    // Auto-transition to WATCHING after 2s\n    if(now>2000){_loginState='WATCHING';_loginStart=Date.now();}\n  } else if(_loginState==='WATCHING'){\n    // Dim eyes in the dark, breathing slowly\n    const breath=.3+.15*Math.sin(now/5000*Math.PI*2);\n    const ec=_lc('#001a08',_SC.eye,breath);\n    const dx=2*Math.sin(now/6000)+glX;\n    const dy=1.5*Math.cos(now/8000)+glY;\n    _drawLoginEye(ctx,lx+dx,eyY+dy,es*.85,ec,_SC.glow,gr*.5,breath*.6);\n    _drawLoginEye(ctx,rx+dx,eyY+dy,es*.85,ec,_SC.glow,gr*.5,breath*.6);\n  } else if(_loginState==='IDLE'){\n    // Eyes in the dark — no hood, just brighter eyes watching\n    const breath=.8+.2*Math.sin(now/4000*Math.PI*2);\n    const ec=_lc('#004415',_SC.eye,breath);\n    const dx=3*Math.sin(now/5000)+glX;\n    const dy=2*Math.cos(now/7000)+glY;\n    _drawLoginEye(ctx,lx+dx,eyY+dy,es,ec,_SC.glow,gr,breath);\n    _drawLoginEye(ctx,rx+dx,eyY+dy,es,ec,_SC.glow,gr,breath);\n  } else if(_loginState==='REJECT'){\n    // Eyes shift sideways in disappointment\n    const t=now;\n    let shiftX=0;\n    if(t<200) shiftX=8*s*(t/200);\n    else if(t<400) shiftX=8*s*(1-(t-200)/200)*-0.6;\n    else shiftX=0;\n    const dimFade=t>800?Math.max(.4,1-(t-800)/400):1;\n    const ec=_lc('#004415',_SC.eye,dimFade*.7);\n    _drawLoginEye(ctx,lx+shiftX,eyY,es,ec,_SC.glow,gr,dimFade*.7);\n    _drawLoginEye(ctx,rx+shiftX,eyY,es,ec,_SC.glow,gr,dimFade*.7);\n  } else if(_loginState==='UNLOCK'){\n    const t=now;\n    if(t<150){\n      // Brief happy flash — eyes smile\n      _drawLoginHappy(ctx,lx,eyY,es,_SC.eye,_SC.glow,gr);\n      _drawLoginHappy(ctx,rx,eyY,es,_SC.eye,_SC.glow,gr);\n    } else if(t<500){\n      // Eyes closing\n      const closeT=(t-150)/350;\n      _drawLoginEyeClosing(ctx,lx,eyY,es,_SC.eye,_SC.glow,gr,closeT);\n      _drawLoginEyeClosing(ctx,rx,eyY,es,_SC.eye,_SC.glow,gr,closeT);\n    } else if(t<900){\n      // Dark pause\n    } else if(t<2500){\n      // Brain glyph fade-in + pulse\n      const glyphY=43*sy;\n      const fadeIn=Math.min(1,(t-900)/800);\n      const pulse=t>1800?1+.12*Math.sin((t-1800)/120*Math.PI*2):1;\n      const rot=(t-900)/8000*Math.PI*2;\n      _drawLoginBrainGlyph(ctx,cx,glyphY,_SC.sigil,pulse*fadeIn,rot,fadeIn);\n    } else if(t<2700){\n      // Flash\n      const glyphY=43*sy;\n      const flashT=(t-2500)/200;\n      _drawLoginBrainGlyph(ctx,cx,glyphY,'#ffffff',1.2,0,1);\n      ctx.fillStyle=`rgba(255,255,255,${.3*(1-flashT)})`;\n      ctx.fillRect(0,0,W,H);\n    }\n    // After 2700ms the login-box fades via JS in doLogin\n  }\n\n  ctx.restore();\n  _loginAnim=requestAnimationFrame(_loginLoop);\n}\n_loginLoop();\n\nconst MAX_PIN = 4;\nlet pinValue = '';\n\nfunction updatePinDisplay() {\n  const display = document.getElementById('pin-display');\n  const counter = document.getElementById('pin-counter');\n  display.innerHTML = '';\n  for (let i = 0; i < MAX_PIN; i++) {\n    const dot = document.createElement('div');\n    dot.className = 'pin-dot' + (i < pinValue.length ? ' filled' : '');\n    display.appendChild(dot);\n  }\n  counter.textContent = '';\n  document.getElementById('pin-input').value = pinValue;\n}\n\nfunction numpadPress(n) {\n  if (pinValue.length >= MAX_PIN) return;\n  // Eye glance toward pressed digit\n  const pos = DIGIT_POS[String(n)];\n  if(pos){ _glanceTargetX=pos.x*4; _glanceTargetY=pos.y*2.5; _glanceTime=Date.now(); }\n  // First digit: transition to IDLE (eyes become brighter)\n  if(!_firstDigitPressed){\n    _firstDigitPressed=true;\n    if(_loginState==='WATCHING'||_loginState==='ALERT'){_loginState='IDLE';_loginStart=Date.now();}\n  }\n  pinValue += n;\n  updatePinDisplay();\n  if (pinValue.length === MAX_PIN) setTimeout(doLogin, 150);\n}\n\nfunction numpadDel() {\n  if (pinValue.length === 0) return;\n  pinValue = pinValue.slice(0, -1);\n  updatePinDisplay();\n}\n\nfunction numpadClear() {\n  pinValue = '';\n  updatePinDisplay();\n}\n\nupdatePinDisplay();\n\n(async function() {\n  const r = await fetch('/auth/check');\n  const d = await r.json();\n  if (d.authenticated) { window.location.href = '/'; return; }\n  if (d.setup) {\n    document.getElementById('login-sub').textContent = 'Imposta il PIN (4 cifre)';\n  }\n})();\n\nasync function doLogin() {\n  const pin = pinValue.trim();\n  if (!pin) return;\n  const errEl = document.getElementById('login-error');\n  errEl.textContent = '';\n  try {\n    const r = await fetch('/auth/login', {\n      method: 'POST', headers: {'Content-Type': 'application/json'},\n      body: JSON.stringify({ pin })\n    });\n    const d = await r.json();\n    if (d.ok) {\n      // UNLOCK cinematic sequence — brain glyph activation\n      _loginState = 'UNLOCK'; _loginStart = Date.now();\n      // Prefetch dashboard while animation plays (~3s of dead time)\n      const pfLink = document.createElement('link');\n      pfLink.rel = 'prefetch'; pfLink.href = '/';\n      document.head.appendChild(pfLink);\n      setTimeout(() => {\n        const box = document.getElementById('login-box');\n        box.style.opacity = '0';\n        box.style.transition = 'opacity 0.4s';\n        document.body.classList.add('crt-glow');\n        setTimeout(() => {\n          document.body.style.background = getComputedStyle(document.documentElement).getPropertyValue('--bg').trim() || '#020502';\n          document.body.classList.add('crt-on');\n          setTimeout(() => { window.location.href = '/'; }, 700);\n        }, 400);\n      }, 2700);\n      return;\n    } else {\n      _loginState = 'REJECT'; _loginStart = Date.now();\n      errEl.textContent = d.error || 'PIN errato';\n      document.getElementById('login-box').classList.add('shake');\n      setTimeout(() => {\n        document.getElementById('login-box').classList.remove('shake');\n        // Return to WATCHING or IDLE based on hood state\n        _loginState = _firstDigitPressed ? 'IDLE' : 'WATCHING';\n        _loginStart = Date.now();\n      }, 1500);\n      pinValue = '';\n      updatePinDisplay();\n    }\n  } catch(e) {\n    errEl.textContent = 'Errore di connessione';\n  }\n}\n\ndocument.addEventListener('keydown', e => {\n  if (e.key >= '0' && e.key <= '9') numpadPress(e.key);\n  else if (e.key === 'Backspace') numpadDel();\n  else if (e.key === 'Escape') numpadClear();\n  else if (e.key === 'Enter') doLogin();\n});\n\n// Warm-up server on page load (primes backend processes)\nfetch('/api/health').catch(()=>{});\n</script>\n</body>\n</html>"
+STATIC_BUNDLES = {
+"analytics.9f451f9369.js": {
+"type": "application/javascript",
+"etag": "\"9f451f93690f7a87\"",
+"raw": "const _anlProviderNames = {\nanthropic: 'Haiku', openrouter: 'OpenRouter', ollama: 'Local',\nollama_pc: 'PC', brain: 'Brain', unknown: '?'\n};\nconst _anlProviderColors = {\nanthropic: 'var(--accent)', openrouter: 'var(--amber)', ollama: 'var(--muted)',\nollama_pc: 'var(--cyan)', brain: 'var(--red)'\n};\nlet _anlPeriod = 'day';\nlet _anlDebugHtml = '';   // ultimo risultato profilo/memoria, sopravvive al refresh\nfunction loadAnalytics(period) {\nif (period) _anlPeriod = period;\ndocument.querySelectorAll('.anl-period-btn').forEach(b => {\nb.classList.toggle('active', b.dataset.period === _anlPeriod);\n});\nconst el = document.getElementById('analytics-content');\nif (el) el.innerHTML = '<div class=\"no-items\">// caricamento\\u2026</div>';\nsend({ action: 'get_analytics', period: _anlPeriod });\nsend({ action: 'get_heatmap', days: 7 });\n}\nfunction renderAnalytics(data) {\nconst el = document.getElementById('analytics-content');\nif (!el) return;\nlet html = '';\nconst usage = data.token_usage || [];\nconst tot = data.token_total || {};\nhtml += '<div class=\"anl-section-label\">TOKEN USAGE</div>';\nif (!usage.length) {\nhtml += '<div class=\"no-items\">// nessun dato nel periodo</div>';\n} else {\nconst maxTot = Math.max(...usage.map(r => (r.input || 0) + (r.output || 0)), 1);\nconst fmt = n => n >= 1000000 ? (n/1000000).toFixed(1) + 'M' : n >= 1000 ? (n/1000).toFixed(1) + 'K' : String(n);\nhtml += '<div class=\"anl-bars\">';\nusage.forEach(r => {\nconst name = _anlProviderNames[r.provider] || r.provider;\nconst color = _anlProviderColors[r.provider] || 'var(--text2)';\nconst total = (r.input || 0) + (r.output || 0);\nconst pct = Math.round((total / maxTot) * 100);\nhtml += `<div class=\"anl-bar-row\">\n          <span class=\"anl-bar-label\" style=\"color:${color};\">${esc(name)}</span>\n          <div class=\"anl-bar-track\"><div class=\"anl-bar-fill\" style=\"width:${pct}%;background:${color};\"></div></div>\n          <span class=\"anl-bar-val\">${fmt(total)}</span>\n        </div>`;\n});\nhtml += '</div>';\nhtml += `<div class=\"anl-total\">Totale periodo: <span>${fmt((tot.input||0)+(tot.output||0))} tok · ${tot.calls||0} call</span></div>`;\n}\nconst latency = data.latency || [];\nhtml += '<div class=\"anl-section-label\" style=\"margin-top:14px;\">LATENZA MEDIA</div>';\nif (!latency.length) {\nhtml += '<div class=\"no-items\">// nessun dato nel periodo</div>';\n} else {\nconst maxMs = Math.max(...latency.map(r => r.max_ms || 0), 1);\nhtml += '<div class=\"anl-bars\">';\nlatency.forEach(r => {\nconst name = _anlProviderNames[r.provider] || r.provider;\nconst color = _anlProviderColors[r.provider] || 'var(--text2)';\nconst pct = Math.round((r.avg_ms / maxMs) * 100);\nconst avgSec = r.avg_ms >= 1000 ? (r.avg_ms / 1000).toFixed(1) + 's' : r.avg_ms + 'ms';\nhtml += `<div class=\"anl-bar-row\">\n          <span class=\"anl-bar-label\" style=\"color:${color};\">${esc(name)}</span>\n          <div class=\"anl-bar-track\"><div class=\"anl-bar-fill\" style=\"width:${pct}%;background:${color};opacity:0.7;\"></div></div>\n          <span class=\"anl-bar-val\">${avgSec}</span>\n        </div>`;\n});\nhtml += '</div>';\n}\nconst errors = (data.errors || []).filter(r => r.total > 0);\nhtml += '<div class=\"anl-section-label\" style=\"margin-top:14px;\">ERROR RATE</div>';\nif (!errors.length) {\nhtml += '<div class=\"no-items\">// nessun errore nel periodo</div>';\n} else {\nhtml += '<div class=\"anl-error-row\">';\nerrors.forEach(r => {\nconst name = _anlProviderNames[r.provider] || r.provider;\nconst pct = Math.round((r.rate || 0) * 100);\nconst bad = pct > 5;\nhtml += `<div class=\"anl-error-badge ${bad ? 'anl-error-bad' : ''}\">\n          <span class=\"anl-error-name\">${esc(name)}</span>\n          <span class=\"anl-error-pct\">${pct}%</span>\n          <span class=\"anl-error-detail\">${r.count}/${r.total}</span>\n        </div>`;\n});\nhtml += '</div>';\n}\nconst failovers = data.failovers || [];\nhtml += '<div class=\"anl-section-label\" style=\"margin-top:14px;\">FAILOVER RECENTI</div>';\nif (!failovers.length) {\nhtml += '<div class=\"no-items\">// nessun failover registrato</div>';\n} else {\nhtml += '<div class=\"anl-failover-list\">';\nfailovers.forEach(f => {\nconst ts = (f.ts || '').slice(0, 16).replace('T', ' ');\nconst route = f.resource || f.route || '';\nconst reason = (f.details || f.reason || '').slice(0, 80);\nhtml += `<div class=\"anl-failover-item\">\n          <span class=\"anl-fail-ts\">${esc(ts)}</span>\n          <span class=\"anl-fail-route\">${esc(route)}</span>\n          ${reason ? `<span class=\"anl-fail-reason\">${esc(reason)}</span>` : ''}\n        </div>`;\n});\nhtml += '</div>';\n}\nconst loop = data.loop;\nif (loop) {\nconst lag = loop.lag || {};\nhtml += '<div class=\"anl-section-label\" style=\"margin-top:14px;\">EVENT LOOP</div>';\nhtml += `<div class=\"anl-total\" style=\"text-align:left;\">Lag 1 min: <span>p50 ${lag.p50}ms \\u00b7 p99 ${lag.p99}ms \\u00b7 max ${lag.max_1m}ms</span>\n        \\u00b7 stalli &gt;${loop.threshold_ms}ms dall'avvio: <span>${loop.stalls}</span>${loop.debug ? ' \\u00b7 <span>debug asyncio</span>' : ''}</div>`;\nconst worst = loop.offenders || [];\nif (!worst.length) {\nhtml += '<div class=\"no-items\">// nessuna chiamata bloccante registrata</div>';\n} else {\nhtml += '<div class=\"anl-failover-list\">';\nworst.forEach(o => {\nhtml += `<div class=\"anl-failover-item\" title=\"${esc((o.stack || []).join('\\n'))}\">\n            <span class=\"anl-fail-ts\">${o.count}\\u00d7 \\u00b7 max ${o.max_ms}ms</span>\n            <span class=\"anl-fail-route\">${esc(o.where)}</span>\n            <span class=\"anl-fail-reason\">totale ${o.total_ms}ms \\u00b7 ultimo ${esc((o.last || '').slice(11, 19))}</span>\n          </div>`;\n});\nhtml += '</div>';\n}\n}\nhtml += '<div class=\"anl-section-label\" style=\"margin-top:14px;\">PROFILO</div>';\nhtml += `<div class=\"anl-debug-actions\">\n      <button class=\"btn-ghost btn-sm\" onclick=\"anlCpuProfile(this, 10)\">CPU 10s</button>\n      <a class=\"btn-ghost btn-sm\" href=\"/api/debug/profile?format=collapsed\" title=\"stack collapsed per flamegraph.pl / speedscope\">↓ flamegraph</a>\n      <button class=\"btn-ghost btn-sm\" onclick=\"anlMemory(this, 'start')\">Mem baseline</button>\n      <button class=\"btn-ghost btn-sm\" onclick=\"anlMemory(this, 'diff')\">Mem diff</button>\n      <button class=\"btn-ghost btn-sm\" onclick=\"anlMemory(this, 'stop')\">Mem stop</button>\n    </div>`;\nhtml += `<div id=\"anl-debug-out\">${_anlDebugHtml || '<div class=\"no-items\">// nessuna cattura</div>'}</div>`;\nhtml += '<div class=\"anl-section-label\" style=\"margin-top:14px;\">ATTIVITA\\' ULTIMI 7 GIORNI</div>';\nhtml += '<div id=\"anl-heatmap-wrap\"><div class=\"no-items\">// caricamento\\u2026</div></div>';\nel.innerHTML = html;\n}\nfunction _anlDebugShow(html) {\n_anlDebugHtml = html;\nconst out = document.getElementById('anl-debug-out');\nif (out) out.innerHTML = html;\n}\nfunction _anlDebugList(rows) {\nif (!rows.length) return '<div class=\"no-items\">// niente da segnalare</div>';\nreturn '<div class=\"anl-failover-list\">' + rows.map(([left, mid, right, title]) =>\n`<div class=\"anl-failover-item\"${title ? ` title=\"${esc(title)}\"` : ''}>\n        <span class=\"anl-fail-ts\">${left}</span>\n        <span class=\"anl-fail-route\">${esc(mid)}</span>\n        <span class=\"anl-fail-reason\">${right}</span>\n      </div>`).join('') + '</div>';\n}\nasync function anlCpuProfile(btn, seconds) {\nbtn.disabled = true;\n_anlDebugShow(`<div class=\"no-items\">// campionamento ${seconds}s in corso…</div>`);\ntry {\nconst r = await fetch('/api/debug/profile', {\nmethod: 'POST', headers: { 'Content-Type': 'application/json' },\nbody: JSON.stringify({ seconds })\n});\nconst d = await r.json();\nif (!r.ok) { _anlDebugShow(`<div class=\"no-items\">// ${esc(d.error || 'errore')}</div>`); return; }\nconst threads = (d.threads || []).filter(t => t.cpu_pct > 0).map(t => `${esc(t.thread)} ${t.cpu_pct}%`).join(' · ');\n_anlDebugShow(`<div class=\"anl-total\" style=\"text-align:left;\">CPU processo: <span>${d.process_cpu_pct}%</span>\n          · ${d.samples} campioni in ${d.seconds}s · overhead ${d.overhead_pct}%</div>`\n+ (threads ? `<div class=\"anl-total\" style=\"text-align:left;\">Thread: <span>${threads}</span></div>` : '')\n+ _anlDebugList((d.top_self || []).map(f => [`${f.pct}%`, f.where, 'self', ''])));\n} catch (e) {\n_anlDebugShow(`<div class=\"no-items\">// ${esc(e.message)}</div>`);\n} finally {\nbtn.disabled = false;\n}\n}\nasync function anlMemory(btn, action) {\nbtn.disabled = true;\ntry {\nconst r = await fetch('/api/debug/memory', {\nmethod: 'POST', headers: { 'Content-Type': 'application/json' },\nbody: JSON.stringify({ action, top: 15, rebase: true })\n});\nconst d = await r.json();\nif (!r.ok) { _anlDebugShow(`<div class=\"no-items\">// ${esc(d.error || 'errore')}</div>`); return; }\nconst kb = n => n >= 1024 ? (n / 1024).toFixed(1) + 'MB' : n + 'KB';\nlet html = `<div class=\"anl-total\" style=\"text-align:left;\">RSS: <span>${kb(d.rss_kb)}</span>\n        · tracemalloc: <span>${d.tracing ? `attivo, ${kb(d.traced_kb)} tracciati (+${kb(d.overhead_kb)} overhead)` : 'spento'}</span></div>`;\nif (action === 'diff') {\nhtml += `<div class=\"anl-total\" style=\"text-align:left;\">Cresciuti dall'ultimo diff: <span>${kb(d.grown_kb)}</span></div>`;\nhtml += _anlDebugList((d.sites || []).map(s =>\n[`+${kb(s.size_diff_kb)}`, s.where, `${s.count} blocchi (+${s.count_diff})`, (s.stack || []).join('\\n')]));\n}\nif (action === 'start') {\nconst m = await (await fetch('/api/debug/memory')).json();\nhtml += _anlDebugList((m.structures || []).map(x => [kb(x.kb), x.name, `${x.len} elementi`, '']));\n}\n_anlDebugShow(html);\n} catch (e) {\n_anlDebugShow(`<div class=\"no-items\">// ${esc(e.message)}</div>`);\n} finally {\nbtn.disabled = false;\n}\n}\nfunction renderHeatmap(data) {\nconst wrap = document.getElementById('anl-heatmap-wrap');\nif (!wrap) return;\nconst matrix = data.matrix || [];\nconst maxVal = data.max || 1;\nconst labels = data.labels || [];\nconst days = matrix.length;\nif (!days) { wrap.innerHTML = '<div class=\"no-items\">// nessun dato</div>'; return; }\nconst CELL = 13, GAP = 2;\nconst labelW = 30, labelH = 16;\nconst w = labelW + 24 * (CELL + GAP);\nconst h = labelH + days * (CELL + GAP);\nconst canvas = document.createElement('canvas');\nconst dpr = window.devicePixelRatio || 1;\ncanvas.width = w * dpr;\ncanvas.height = h * dpr;\ncanvas.style.width = w + 'px';\ncanvas.style.height = h + 'px';\ncanvas.style.display = 'block';\ncanvas.style.maxWidth = '100%';\nconst ctx = canvas.getContext('2d');\nctx.scale(dpr, dpr);\nconst cs = getComputedStyle(document.documentElement);\nconst accentRaw = cs.getPropertyValue('--accent').trim();\nconst mutedColor = cs.getPropertyValue('--muted').trim();\nconst borderColor = cs.getPropertyValue('--border').trim();\nctx.fillStyle = cs.getPropertyValue('--card').trim() || '#111';\nctx.fillRect(0, 0, w, h);\nctx.fillStyle = mutedColor;\nctx.font = `9px \"JetBrains Mono\", monospace`;\nctx.textBaseline = 'top';\n[0, 6, 12, 18, 23].forEach(hr => {\nconst x = labelW + hr * (CELL + GAP);\nctx.fillText(String(hr).padStart(2, '0'), x, 0);\n});\nfor (let d = 0; d < days; d++) {\nconst y = labelH + d * (CELL + GAP);\nctx.fillStyle = mutedColor;\nctx.textBaseline = 'middle';\nctx.font = `9px \"JetBrains Mono\", monospace`;\nctx.fillText((labels[d] || '').slice(0, 3), 0, y + CELL / 2);\nfor (let hr = 0; hr < 24; hr++) {\nconst x = labelW + hr * (CELL + GAP);\nconst count = (matrix[d] && matrix[d][hr]) || 0;\nconst intensity = maxVal > 0 ? count / maxVal : 0;\nif (intensity > 0) {\nctx.globalAlpha = 0.15 + intensity * 0.85;\nctx.fillStyle = accentRaw;\n} else {\nctx.globalAlpha = 1;\nctx.fillStyle = borderColor;\n}\nctx.fillRect(x, y, CELL, CELL);\n}\n}\nctx.globalAlpha = 1;\nwrap.innerHTML = '';\nconst container = document.createElement('div');\ncontainer.style.position = 'relative';\ncontainer.style.display = 'inline-block';\ncontainer.style.width = w + 'px';\nconst tooltip = document.createElement('div');\ntooltip.className = 'anl-heatmap-tip';\ntooltip.style.display = 'none';\ncanvas.addEventListener('mousemove', e => {\nconst rect = canvas.getBoundingClientRect();\nconst mx = (e.clientX - rect.left) * (w / rect.width);\nconst my = (e.clientY - rect.top) * (h / rect.height);\nconst col = Math.floor((mx - labelW) / (CELL + GAP));\nconst row = Math.floor((my - labelH) / (CELL + GAP));\nif (col >= 0 && col < 24 && row >= 0 && row < days) {\nconst count = (matrix[row] && matrix[row][col]) || 0;\nconst day = labels[row] || '';\ntooltip.style.display = 'block';\ntooltip.style.left = (e.clientX - rect.left + 8) + 'px';\ntooltip.style.top = (e.clientY - rect.top - 24) + 'px';\ntooltip.textContent = `${day} ${String(col).padStart(2,'0')}:00 — ${count} msg`;\n} else {\ntooltip.style.display = 'none';\n}\n});\ncanvas.addEventListener('mouseleave', () => { tooltip.style.display = 'none'; });\ncontainer.appendChild(canvas);\ncontainer.appendChild(tooltip);\nwrap.appendChild(container);\n}\n",
+"gz": "H4sIAAAAAAACA91a63IbtxX+r6dAVSe7G5ErUolvkiWPrCixEtvSSErSVvFI4C5IbrRcbHdBSazCmfzqC7TP0Ffo/z5KnqTfAbA3krpYSaaZemxzAZxzcO44uAQyyRU75Ul8kMmLKBTZOz4SOdtk10s8UcNMplGwzpzXPDofOy0mU5FkcqxEhs59NA51g0bimI84et/IgMdOa8l0nKaEfrADiF7GowSNV/SL9jg5T+Ql9bx0lqYbS8EcLzsyltk8Mxc8c9ttHgQiUd4sU3Zw1BOZV2fL9I8AFXoz3JmhYMITr8am6c0InLiLheVNZJEMwZMT8olT9X8ueuPBazWKacjZYIytrrJxrKKRZFmU44srydJM9qNYro7ESGYRb7Fcphm/uIguBOMxy0Q/E/lwqT9OAhXJhMWSh9sJjycqCnI31XN7UEfUZ2WrwZXp3FgKZTAeQT/+X8cimxyJWARKZttx7Do+4NsGrt1TieP5fZnt8mDo9tjmFoj3/CDmef4mypWv5GAQC9fh4OdCkHr8kCueC+Wnds7NzRoL3sbS1CtsKUgZJScDoXZjQZ+vJnshSBZytQGt0O0AkQQTsQdUP0oSkb0+fvuGNPoijC6YZmtzOZHtSIlRvrwFFQc8iwJOVOX347XO2pMXqwDdgmVykYTuNeNakzAo5j8t54Qkhv/1uv6I9UVoQ8HViKdAgtHzdfZUQ04rO2VAElllKdIR2ekX6eEPpIhMqHGWGD8blu5lCY9zPhBEG9PBVOciOTVdP/7ITt4XUEqqJgw64GyAuYZja6IrMyomF8mFlq0d856Il7eO97/efce+Odr+crdUseZSz+jHIhmoIcm8kGDDZonI83FCHEl8x9YSsiQ7hcZyUapvxK+OtQhvuRr6aLm+75tZYRQ3I691M/hLOlYkVcdjK9SBlFD2eC3WLf2yPyJqCeElbGuTdTv6D3vJ3GTVNjzo6ovoSoRul8g5bx22XkFXoLNwXxPckcqiZOAm3i3q7fEM2oC0RpIiBjMTg4bRBI7NNufz80nmp7b9nuSrmoWIAaXOGVSTTmdxbaJT4kqteU7NZzj52l16LeDToDQQUjEiyDUUVq31PPYJKa6mkLMFCmln8nJ5a4mVf17kKU9mgYxDslxNYrG5rCVdf3Stf6cby1uPrkUeuKQ6b/pilQg0KC6YVWU8OF/eWjSEbF1NdRmFaoipIOz0o40ekAZa2PrsxonN/3cJcsFjYhfuaLQ1z6+hc2aSauVKRaDcqEtNDjFLP6KIr3XDhZ2RpjS2/fHHjreim8ay1PamcIFz9p9/s0fXNII1Pc4xMGX0ZdmsuLNeEHPkr2BSZJuiabPRPTNNoe0RzwZRAlHS9e5n6RV0+2b7ePfdX7bZ293P97abSchO9Runobf5TBYqpi3zUEYjp6PcRIdJOnengILM7ywJzAd15vOLAYm3atRRhbXBwOiRCIBUAtYSZg15UebMKXOWMOgY5c7/ebqQKQ8iNVnv+E8fljqMvj80bRThKrLM1Ne6XvFtU0crisIoRkVdeLXJ5lus4/0Kcbx7eLh/yA4Rzc0gNgw8JIY1prg9im9kWyMbXwK8ZeJXDsVFoZQh6u262oyiHtelPFC22ONbQsAwDmhUfI+uCeslcxoDFFKOM709SAw0yXZnNCxGBaeEqf383kihUDzSTpz5AVSipqv0qR3toQ7dB0V5IbRPa5euOn6tNeiL7b03+9/uwn13d3bfHe81Pbic7yFOXCCj5h9g7wX3+BAvLrDbMXC1J1fMFM7crzuz0pHf95VWjoN9YB5HgXA7WLWeeH4m0pij6Rxj2+Mwp/ROvdUGah8guRxngXbivm/6NakSVPAcuyM9jbF3bmHNwOy8z24tEEsJSXO3uzSBtlVe+LPK7+XNGkuLUSDqxiJcuKoR4SX4XExHj5eEdKukdGbi8kP9O5YyLYsrfBuvo69qsxnzAUCoz6fPD9vl3ZKzv4W3szf7+wf3rT4LWlRUtHkcDZL1WPQV1XHgq8tGdMxiKtL0cQcaBbs+vqZY/b8fdzq9pyx9/rzof/681o/aw/ZTtdUdYWjWRBYyBydxxD4eqA0gkFLUkI5YZByiyiCSIQAcOoKp1ccaUKPmhcVsZ0jHPJRmiwkMiunm+SQJImkxbO4tTWvMc4nFRRUGkv2+Pjgo05NOIhrkAQmEs2AY8RGcg/ViGQQ8QTyWuYT/olxieCryiDR55J6RylSkyBFMJLiSNBucF3XGDzJKXOf7xMGeoxHUt4e1tIsGmSF82nQMaYvwBW5xz7iX/uVQZAsj/0Z8G+/K7LmIC/1p3cwyaE8ES1WAiGqmwW4X+fe5tzBh3ZUlpr88zg8O97/ACnd3kGuXb5tjsrw03IveWClZaqenkvZgKKmmwVcOX5BJADHPNY2ddHygD0SFq4ZRDrk73vLWzsE3+IDlDKmSMr+ZKEK6v7m8ytNoVbO1as5ZxUs4LOJhM6Dj3jQXYemLxgXLfqoaWT9G2TPIeDr0Uzq5yFMhwjyQKdzi57//ozb+YpU/SOC3dOw7scI64CFTDiRGN2q+XMRRIubEfjj9MOr3C/L0/SuSzuExBWn6bpIu/bTpPFFY9xyEG0Vb8+ycIuHuLMeVGmdFPpvOzfZg398+Pt77du94+3uHffPmeO/tHnvKvtzbP3y3NxcOTkMiez7cvoRzNDeG9zmrLonPHHrTXI1T5lJXR0N56dIwLQ+ztw8Gzaw2UPLtR881axTHzvj0CPGevNA1Aeqky7y4l/gDNcrly5xf32bVSNA6FXKWi0HCY56JUiGLkBetT2yF6UnpGMY9oSqjhfIibLEsGgzxrYP+vYdVa+mOterRtYalsq65bOkGVihbudW2JrcsUsTJ/F7m7uUHvHv3xSvLTC3rDJaNjWKVdfRBS23B0BULK43azMlIAy0YBZ4UauOi7YdRznuxoP2pysZiY6npk2e3+P4oxRTG+7H+WbrTnEUQCtWF/PmnfxXsbiypbFJWtHSExS95hP2dUKg+nPlEjy3K9dJIqCFd6DgH+0e0aUFUUm21zq6Zs2OuVtrHk1Q4AOFpitTGSerVH6BAh01bSz0ZTtbZV0f771Ci0Al+1J+414UK2NSr3W2FJVOZTwTc4tIm8+U5tMXuqxhj8dCcvugEaA4zHG9aqqO4BWLFRoCKWB6aoxu/aDQPbhTVaMoP0vGpOUnoeDo+dP+ZdWqL603pmLeAnX5UOgwdAFNeuEWY+xT8tKTDUgESeK3KDn3bd1pOPF/z6BPo0M/hPrHIp4UfReQ2eqD0I0BSHJPV9UjRKChrXS6tMLfQ18sP37kca9RKBEtq2jwQ1ynCw1TNJEmmkukp1vl+YSsyiN6Un8Aifd8ov4UNsi4/aaEFMO2/nfeeR1eOtPgFQ+aKRua/l4sJfwRd84GoORYI9iMk3XgyH999jl2CqSrn04QtB3SKMDXgjRnivqGs78Qnv2kkG06xHmDNZ93HWB8E1V3rmtPfU3yf92YuKNc+01eO+uh87bO5y8lX5naS7h9fOY3L4g928cOjo8q/z3vgPEOEnvfmFyQEHB2FixH8Rwb1uKZuKJ0iDLVadCFbzNLSCKEmp5GDCJZj7oodLmNWAxQtT0cUynEsHc509vKJrGIMq98i2LL3tu3pnekqg8miMRjThwN2z0Z0ZzQzQNWR1HUzV4vOZYAcnpHXwz+nquTkzGggx/jfxClNpckiF+RFLkCGyO2m1+zvh0ZxtlMjTT1gEJXFO+z3OofMacxuRKqbrtL33TuC1fPK4LhB4hEF4DiAezfFvtJZDyJf+RC0xa58qg20lFdUPNIhha5UozOb/ojzBRXw/ywpzjz+eG32ADNPP2hHcFcFXt89lG8/qFG9/ihuIJHLrooDQNtqPPUY8atv9b29hdDD3Y3yaBD7n7y6ndWtBj49b8G4IW1reMsQDVHeI8bu+TandsFa1JxzmW5n9w0R6X7aYl9uH+BrrcHtd+j5tNMyjdcE+KQ8SaNTNAOzwpAfP2GuJrZChMo8PiygXmNAi7cYLuDJBc/rpgqwtCthreU6BqA6Bg9TWswuoySUl34oLqJAHCAlx4e0FBVq1zi+vggkYMwNtLJ/KKhkp93VzIDOTDU05PX0ypkZrmEvHIfXpjGny3iH0sX57Di84zs7g9PtdD4qT+0DRT5mYeGwesW9ggrWQi2+uvLzgGODAJZbxHelRFKgxhil9NLuiCZyS40WH1an1a2xfsp3yMmigZ4SW5BUZGoCZx4L1yle+zlY+LJo5JaY+j3fjr3mvgFVw8xh9mRW3IbfjGqA6riQne54tWA342GjX82o1/w/drtdp8I/FIGiCw/8vUR5s4ByJZkdgxFoOX+eXrHlr4TSryhz9lYmchmbXfxgAQrEmYEme72yJ0pkXzqu2Vg6wXRPWqy7hn/PWmzt0/flie6wcc95VQ8tDM2FjGX2mNzCPnYaZp6fcpgca4mLGZyOQ2m9pa+Mqa7CVMylyoTyaGcDPy90QOJrZaXKmJNGwN449U16mpUcW+kQ+8OHKLGU0DWp8iR8P3dj9amnjTgBf5rNVbZWF5XUSrLi9wVyFH3UZb1Tz/YZx1iz7Zq0TGx8/DErGyfD7L12sk6BEFGFjEJjolO5XhGw/UM1ZiitFp3rhELJvUKgbSKxB/EHsezxeDtOh5yE8LuPwVcF+Qm6nj2eN0gZzPUHNHPkuvOItYjUN171UIEbTVpaw+Z/zyzBC+nOL1BVZoP9YXGR3ZLnsU7ZJG9AbbZMJaTWFRNzMhFz/Rx2HqyWdKOEfLBd5t4ZyAXZ3b68k6g307s5tIDmse478zKhUU9g0KnA5vhLZCKqNYGH4e4FyFPVJsCl64zkOEeVp1/9inp2yIR+zFAtEK/oRQNywE5MZ3naYFWGJh9HmRXosT+xtkb3qdKmZw/uJdxR92h9VGiTOtqfCzRFN53AGhZYZhGshUpcPLPox1JmqD+vgGtizANSPb5qN9qXs1iTAuv1AiwKGZoJO7MOhSJ9U3jTN9Eq+unb5Lgq5GeDGTD1cKbmCejNRHTIy7SYGxR7z36jdQu3awKQ2m+0BwR85pXe2ERU+uJ5oUHwiR3pHB4lYrtXp5SLbSGf0DGTXS4gY2O9oOViut7psJ9/+iejB1J6nzPKB2e1PHKXL0/NBv5Wj44F1y7tetqn2R002bSRDHiKXWi4M4zi0DXz3DhsCXs2IzUwCwSdx/4Lb3Ny4oUxAAA="
+},
+"sigil.0363a03e0b.js": {
+"type": "application/javascript",
+"etag": "\"0363a03e0b9fef4a\"",
+"raw": "const SigilEngine = (() => {\nconst C = {\nbg: [5,2,8], green: [0,255,65], dim: [0,85,21],\nred: [255,0,64], yellow: [255,170,0], scan: [3,1,5],\nhood: [61,21,96], hoodLt: [106,45,158], white: [255,255,255]\n};\nconst G = {\ncx: 160, cy: 85, eyeY: 70, sigilY: 43, mouthY: 115,\nlx: 130, rx: 190, hw: 19, hh: 10, eyelid: 15\n};\nconst _off = document.createElement('canvas');\n_off.width = 320; _off.height = 170;\nfunction rgb(c) { return `rgb(${c[0]},${c[1]},${c[2]})`; }\nfunction rgba(c, a) { return `rgba(${c[0]},${c[1]},${c[2]},${a})`; }\nfunction lerp(c1, c2, t) {\nif (t <= 0) return c1; if (t >= 1) return c2;\nreturn [c1[0]+(c2[0]-c1[0])*t|0, c1[1]+(c2[1]-c1[1])*t|0, c1[2]+(c2[2]-c1[2])*t|0];\n}\nfunction hexToRgb(hex) {\nif (typeof hex !== 'string') return {r:0,g:0,b:0};\nif (hex.startsWith('rgb')) { const m=hex.match(/(\\d+)/g); return {r:+m[0],g:+m[1],b:+m[2]}; }\nhex=hex.replace('#','');\nif (hex.length===3) hex=hex[0]+hex[0]+hex[1]+hex[1]+hex[2]+hex[2];\nreturn {r:parseInt(hex.slice(0,2),16),g:parseInt(hex.slice(2,4),16),b:parseInt(hex.slice(4,6),16)};\n}\nfunction lerpHex(c1,c2,t) {\nconst a=hexToRgb(c1),b=hexToRgb(c2);\nreturn `rgb(${a.r+(b.r-a.r)*t|0},${a.g+(b.g-a.g)*t|0},${a.b+(b.b-a.b)*t|0})`;\n}\nfunction rgbaHex(hex,alpha) { const c=hexToRgb(hex); return `rgba(${c.r},${c.g},${c.b},${alpha})`; }\nfunction fillCircle(ctx, x, y, r, col) {\nctx.fillStyle = rgb(col); ctx.beginPath(); ctx.arc(x, y, Math.max(0,r), 0, Math.PI*2); ctx.fill();\n}\nfunction fillEllipse(ctx, cx, cy, rx, ry, col) {\nctx.fillStyle = rgb(col); ctx.beginPath(); ctx.ellipse(cx, cy, Math.max(0,rx), Math.max(0,ry), 0, 0, Math.PI*2); ctx.fill();\n}\nfunction fillTriangle(ctx, x0,y0,x1,y1,x2,y2, col) {\nctx.fillStyle = rgb(col); ctx.beginPath();\nctx.moveTo(x0,y0); ctx.lineTo(x1,y1); ctx.lineTo(x2,y2);\nctx.closePath(); ctx.fill();\n}\nfunction drawLine(ctx, x0,y0,x1,y1, w, col) {\nctx.strokeStyle = rgb(col); ctx.lineWidth = w; ctx.lineCap = 'round';\nctx.beginPath(); ctx.moveTo(x0,y0); ctx.lineTo(x1,y1); ctx.stroke();\n}\nfunction drawCircleStroke(ctx, x, y, r, col) {\nctx.strokeStyle = rgb(col); ctx.lineWidth = 1;\nctx.beginPath(); ctx.arc(x, y, Math.max(0,r), 0, Math.PI*2); ctx.stroke();\n}\nfunction drawScanlines(ctx) {\nctx.fillStyle = rgb(C.scan);\nfor (let y = 0; y < 170; y += 2) ctx.fillRect(0, y, 320, 1);\n}\nfunction drawHoodFilled(ctx, col) {\nconst cx = G.cx, cy = G.cy;\nconst shoulder = 78, peakH = 60, baseY = 170, neckMinY = cy + 10;\nconst c_center = lerp(col, C.white, 0.04);\nconst c_inner = col;\nconst c_mid = lerp(col, C.bg, 0.25);\nconst c_outer = lerp(col, C.bg, 0.55);\nconst c_edge = lerp(col, C.bg, 0.82);\nfor (let dx = -shoulder; dx <= shoulder; dx++) {\nconst x = cx + dx;\nif (x < 0 || x >= 320) continue;\nconst t = Math.abs(dx) / shoulder;\nlet topY = cy - peakH + (peakH * t * t)|0;\nif (topY < 0) topY = 0;\nlet botY;\nif (t < 0.28) { botY = baseY; }\nelse {\nconst curve = (t - 0.28) / 0.72;\nconst rise = 0.5 * (1 - Math.cos(curve * Math.PI));\nbotY = baseY - (rise * (baseY - neckMinY))|0;\n}\nconst lineH = botY - topY;\nif (lineH <= 0) continue;\nlet hCol;\nif (t < 0.12) hCol = lerp(c_center, c_inner, t / 0.12);\nelse if (t < 0.3) hCol = lerp(c_inner, c_mid, (t - 0.12) / 0.18);\nelse if (t < 0.55) hCol = lerp(c_mid, c_outer, (t - 0.3) / 0.25);\nelse if (t < 0.8) hCol = lerp(c_outer, c_edge, (t - 0.55) / 0.25);\nelse hCol = lerp(c_edge, C.bg, (t - 0.8) / 0.2);\nconst topH = lineH * 45 / 100 | 0;\nconst botH = lineH - topH;\nconst botCol = lerp(hCol, C.bg, 0.35);\nctx.fillStyle = rgb(hCol);\nctx.fillRect(x, topY, 1, topH);\nctx.fillStyle = rgb(botCol);\nctx.fillRect(x, topY + topH, 1, botH);\n}\nconst edgeHL = lerp(col, C.white, 0.15);\nfor (let dx = -(shoulder-10); dx <= (shoulder-10); dx++) {\nconst t = Math.abs(dx) / shoulder;\nconst topY = cy - peakH + (peakH * t * t)|0;\nconst alpha = 0.4 * (1 - t * 1.3);\nif (alpha > 0 && topY > 0) {\nctx.fillStyle = rgba(lerp(C.bg, edgeHL, alpha), 1);\nctx.fillRect(cx + dx, topY - 1, 1, 1);\n}\n}\n}\nfunction drawFaceShadow(ctx) {\nfillEllipse(ctx, G.cx, G.cy+2, 56, 62, [4,2,6]);\nfillEllipse(ctx, G.cx, G.cy+5, 46, 54, [2,1,3]);\nfillEllipse(ctx, G.cx, G.cy+10, 34, 42, [1,0,2]);\n}\nconst _layers = new Map();\nfunction _layer(key, draw) {\nlet c = _layers.get(key);\nif (!c) {\nc = document.createElement('canvas');\nc.width = 320; c.height = 170;\ndraw(c.getContext('2d'));\n_layers.set(key, c);\n}\nreturn c;\n}\nfunction drawBase(ctx, hoodCol, shadow) {\nctx.drawImage(_layer('base:' + hoodCol + (shadow ? ':s' : ''), l => {\nl.fillStyle = rgb(C.bg); l.fillRect(0, 0, 320, 170);\ndrawHoodFilled(l, hoodCol);\nif (shadow) drawFaceShadow(l);\n}), 0, 0);\n}\nfunction drawScanlinesCached(ctx) {\nctx.drawImage(_layer('scan', drawScanlines), 0, 0);\n}\nfunction drawEyeGlow(ctx, ex, ey, col, intensity) {\nif (intensity < 0.05) return;\nfillCircle(ctx, ex, ey, 24, lerp(C.bg, col, Math.min(1, 0.08*intensity)));\nfillCircle(ctx, ex, ey, 16, lerp(C.bg, col, Math.min(1, 0.18*intensity)));\n}\nfunction drawMandorlaEye(ctx, ex, ey, hw, hh, col) {\nfillTriangle(ctx, ex-hw,ey, ex,ey-hh, ex+hw,ey, col);\nfillTriangle(ctx, ex-hw,ey, ex,ey+hh, ex+hw,ey, col);\n}\nfunction drawMandorlaEyeRelaxed(ctx, ex, ey, hw, hh, col, lidPct) {\ndrawMandorlaEye(ctx, ex, ey, hw, hh, col);\nif (lidPct > 0) {\nconst cutH = hh * lidPct / 100 | 0;\nctx.fillStyle = rgb(C.bg);\nctx.fillRect(ex-hw-1, ey-hh-1, hw*2+2, cutH+2);\n}\n}\nfunction drawHappyEye(ctx, ex, ey, hw, col) {\nctx.fillStyle = rgb(col);\nfor (let dx = -hw; dx <= hw; dx++) {\nconst t = dx / hw;\nconst dy = (-8 * (1 - t*t))|0;\nctx.fillRect(ex+dx, ey+dy-1, 1, 3);\n}\n}\nfunction drawSigil(ctx, sx, sy, col, scale, rotation) {\nscale = scale || 1; rotation = rotation || 0;\nconst glowR = (14 * scale)|0;\nif (glowR > 2) {\nfillCircle(ctx, sx, sy, glowR+4, lerp(C.bg, col, 0.05));\nfillCircle(ctx, sx, sy, glowR, lerp(C.bg, col, 0.12));\n}\nconst cosR = Math.cos(rotation), sinR = Math.sin(rotation);\nfunction pt(dx,dy) {\nreturn [sx + (scale*(dx*cosR-dy*sinR))|0, sy + (scale*(dx*sinR+dy*cosR))|0];\n}\nconst [v0x,v0y]=pt(0,-8),[v1x,v1y]=pt(0,8);\nconst [h0x,h0y]=pt(-8,0),[h1x,h1y]=pt(8,0);\ndrawLine(ctx,v0x,v0y,v1x,v1y,2,col);\ndrawLine(ctx,h0x,h0y,h1x,h1y,2,col);\nconst [d0x,d0y]=pt(-5,-5),[d1x,d1y]=pt(5,5);\nconst [d2x,d2y]=pt(-5,5),[d3x,d3y]=pt(5,-5);\ndrawLine(ctx,d0x,d0y,d1x,d1y,1,col);\ndrawLine(ctx,d2x,d2y,d3x,d3y,1,col);\ndrawCircleStroke(ctx, sx, sy, Math.max(1,(3*scale)|0), col);\nctx.fillStyle = rgb(col);\n[pt(0,-10),pt(0,10),pt(-10,0),pt(10,0)].forEach(([px,py]) => {\nctx.fillRect(px, py, 1, 1);\n});\n}\nfunction drawMouth(ctx, mx, my, w, col, curve) {\nctx.fillStyle = rgb(col);\nfor (let dx = -w; dx <= w; dx++) {\nconst t = dx / w;\nconst dy = (curve * t * t)|0;\nctx.fillRect(mx+dx, my+dy, 1, 1);\nif (Math.abs(curve) > 3) ctx.fillRect(mx+dx, my+dy+1, 1, 1);\n}\n}\nfunction drawMouthLine(ctx, mx, my, hw, col) {\ndrawLine(ctx, mx-hw, my, mx+hw, my, 1, col);\n}\nfunction drawText(ctx, text, x, y, col, size) {\nctx.fillStyle = rgb(col);\nctx.font = `${size||10}px \"JetBrains Mono\",monospace`;\nctx.textAlign = 'center'; ctx.textBaseline = 'middle';\nctx.fillText(text, x, y);\n}\nfunction renderStates(ctx, now, state) {\nconst {cx,cy,eyeY,sigilY,mouthY,lx,rx,hw,hh} = G;\nif (state === 'IDLE') {\ndrawBase(ctx, C.hood, true);\nconst breath = 0.7 + 0.3*Math.sin(now/4000*Math.PI*2);\nconst eyeCol = [0, (255*breath)|0, (65*breath)|0];\ndrawEyeGlow(ctx, lx, eyeY, C.green, 0.8);\ndrawEyeGlow(ctx, rx, eyeY, C.green, 0.8);\nconst dx = (2*Math.sin(now/5000))|0, dy = (1*Math.cos(now/7000))|0;\ndrawMandorlaEyeRelaxed(ctx, lx, eyeY, hw, hh, eyeCol, G.eyelid);\ndrawMandorlaEyeRelaxed(ctx, rx, eyeY, hw, hh, eyeCol, G.eyelid);\nfillCircle(ctx, lx+dx, eyeY+dy, 4, C.bg);\nfillCircle(ctx, rx+dx, eyeY+dy, 4, C.bg);\nconst sb = 0.1 + 0.05*Math.sin(now/6000*Math.PI*2);\ndrawSigil(ctx, cx, sigilY, lerp(C.bg, C.red, sb), 0.6);\ndrawLine(ctx, cx-15, mouthY, cx+15, mouthY, 1, eyeCol);\n} else if (state === 'THINKING') {\ndrawBase(ctx, C.hood, true);\ndrawEyeGlow(ctx, lx, eyeY, C.green, 1);\ndrawEyeGlow(ctx, rx, eyeY, C.green, 1);\ndrawMandorlaEyeRelaxed(ctx, lx, eyeY, hw, hh, C.green, 0);\ndrawMandorlaEyeRelaxed(ctx, rx, eyeY, hw, hh, C.green, 0);\nfillCircle(ctx, lx, eyeY-5, 5, C.bg);\nfillCircle(ctx, rx, eyeY-5, 5, C.bg);\nconst pulse = 0.7+0.3*Math.sin(now/1000*Math.PI*2);\nconst sigilCol = lerp(C.bg, C.red, pulse);\nconst rot = now/8000*Math.PI*2;\ndrawSigil(ctx, cx, sigilY, sigilCol, 1, rot);\ndrawLine(ctx, cx-12, mouthY, cx+12, mouthY, 1, C.green);\nconst dots = ['','.','..','...'][(now/400|0)%4];\nif (dots) drawText(ctx, dots, cx, cy+50, C.dim, 14);\n} else if (state === 'WORKING') {\ndrawBase(ctx, C.hood, true);\ndrawEyeGlow(ctx, lx, eyeY, C.green, 0.5);\ndrawEyeGlow(ctx, rx, eyeY, C.green, 0.5);\ndrawMandorlaEye(ctx, lx, eyeY, hw, 4, C.dim);\ndrawMandorlaEye(ctx, rx, eyeY, hw, 4, C.dim);\ndrawLine(ctx, lx-18, eyeY-14, lx+18, eyeY-14, 2, C.dim);\ndrawLine(ctx, rx-18, eyeY-14, rx+18, eyeY-14, 2, C.dim);\nconst rot = now/3000*Math.PI*2;\ndrawSigil(ctx, cx, sigilY, C.dim, 0.9, rot);\ndrawLine(ctx, cx-8, mouthY, cx+8, mouthY, 1, C.dim);\nconst dots = ['','.','..','...'][(now/600|0)%4];\nif (dots) drawText(ctx, dots, cx, cy+50, C.dim, 14);\n} else if (state === 'PROUD') {\ndrawBase(ctx, C.hoodLt, true);\ndrawEyeGlow(ctx, lx, eyeY, C.green, 1);\ndrawEyeGlow(ctx, rx, eyeY, C.green, 1);\ndrawHappyEye(ctx, lx, eyeY, (hw*0.7)|0, C.green);\ndrawHappyEye(ctx, rx, eyeY, (hw*0.7)|0, C.green);\nconst ss = 1.1+0.1*Math.sin(now/500*Math.PI*2);\ndrawSigil(ctx, cx, sigilY, C.red, ss);\nconst ringT = (now%1500)/1500;\nconst ringR = (15*ringT)|0;\nconst ringCol = lerp(C.red, C.bg, ringT);\nif (ringR > 0) drawCircleStroke(ctx, cx, sigilY, ringR, ringCol);\ndrawMouth(ctx, cx, mouthY, 18, C.green, 7);\n} else if (state === 'SLEEPING') {\ndrawBase(ctx, lerp(C.hood, C.bg, 0.4), false);\ndrawLine(ctx, lx-hw, eyeY, lx+hw, eyeY, 2, C.dim);\ndrawLine(ctx, rx-hw, eyeY, rx+hw, eyeY, 2, C.dim);\ndrawSigil(ctx, cx, sigilY, [40,0,10], 0.5);\nconst yOff = (5*Math.sin(now/800))|0;\ndrawText(ctx, 'z', cx+50, cy-45+yOff, C.dim, 14);\ndrawText(ctx, 'Z', cx+65, cy-60+yOff, C.dim, 24);\ndrawText(ctx, 'z', cx+85, cy-75+yOff, C.dim, 14);\n} else if (state === 'HAPPY') {\ndrawBase(ctx, C.hoodLt, true);\ndrawEyeGlow(ctx, lx, eyeY, C.green, 1);\ndrawEyeGlow(ctx, rx, eyeY, C.green, 1);\ndrawHappyEye(ctx, lx, eyeY, (hw*0.8)|0, C.green);\ndrawHappyEye(ctx, rx, eyeY, (hw*0.8)|0, C.green);\nconst flash = (now/300|0)%2 === 0;\nconst sigilCol = flash ? C.red : [180,0,45];\nconst bounceY = (5*Math.sin(now/300*Math.PI*2))|0;\ndrawSigil(ctx, cx, sigilY+bounceY, sigilCol, 1.1);\ndrawMouth(ctx, cx, mouthY, 22, C.green, 9);\nconst sp = 0.5+0.5*Math.sin(now/600);\nconst starCol = [0,(255*sp)|0,(65*sp)|0];\ndrawText(ctx, '*', cx-60, cy-30, starCol, 14);\ndrawText(ctx, '*', cx+58, cy-30, starCol, 14);\ndrawText(ctx, '*', cx-45, cy-48, starCol, 8);\ndrawText(ctx, '*', cx+48, cy-48, starCol, 8);\n} else if (state === 'CURIOUS') {\ndrawBase(ctx, C.hoodLt, true);\ndrawEyeGlow(ctx, lx, eyeY, C.green, 1);\ndrawEyeGlow(ctx, rx, eyeY, C.green, 1);\ndrawMandorlaEyeRelaxed(ctx, lx, eyeY, hw+2, hh+2, C.green, 0);\ndrawMandorlaEyeRelaxed(ctx, rx, eyeY, hw+2, hh+2, C.green, 0);\nconst scanX = (8*Math.sin(now/1500))|0;\nfillCircle(ctx, lx+scanX, eyeY, 5, C.bg);\nfillCircle(ctx, rx+scanX, eyeY, 5, C.bg);\ndrawLine(ctx, lx-20, eyeY-20, lx+15, eyeY-16, 2, C.green);\ndrawLine(ctx, rx-15, eyeY-16, rx+20, eyeY-20, 2, C.green);\nconst sp = 0.5+0.5*Math.sin(now/1000*Math.PI*2);\nconst sigilCol = lerp(C.bg, C.red, sp);\nconst tilt = 0.25*Math.sin(now/1200);\nconst sc = 0.9+0.2*sp;\ndrawSigil(ctx, cx, sigilY, sigilCol, sc, tilt);\ndrawCircleStroke(ctx, cx, mouthY, 5, C.green);\nconst qY = (3*Math.sin(now/800))|0;\ndrawText(ctx, '?', cx+80, cy-30+qY, C.dim, 24);\n} else if (state === 'ALERT') {\ndrawBase(ctx, C.yellow, true);\ndrawEyeGlow(ctx, lx, eyeY, C.yellow, 1);\ndrawEyeGlow(ctx, rx, eyeY, C.yellow, 1);\ndrawMandorlaEye(ctx, lx, eyeY, hw, hh, C.yellow);\ndrawMandorlaEye(ctx, rx, eyeY, hw, hh, C.yellow);\nfillCircle(ctx, lx, eyeY, 5, C.bg);\nfillCircle(ctx, rx, eyeY, 5, C.bg);\ndrawLine(ctx, lx-18, eyeY-18, lx+5, eyeY-12, 2, C.yellow);\ndrawLine(ctx, rx-5, eyeY-12, rx+18, eyeY-18, 2, C.yellow);\nconst shakeX = (3*Math.sin(now/80))|0;\ndrawSigil(ctx, cx+shakeX, sigilY, C.red, 1.2);\nfor (let i = 0; i < 4; i++) {\nconst sx0 = cx-20+i*10, sy0 = mouthY+((i%2===0)?0:5);\nconst sx1 = sx0+10, sy1 = mouthY+((i%2===0)?5:0);\ndrawLine(ctx, sx0, sy0, sx1, sy1, 2, C.yellow);\n}\nif ((now/500|0)%2===0) drawText(ctx, '!', cx+90, cy-15, C.red, 24);\n} else if (state === 'ERROR') {\ndrawBase(ctx, C.red, true);\ndrawEyeGlow(ctx, lx, eyeY, C.red, 0.6);\ndrawEyeGlow(ctx, rx, eyeY, C.red, 0.6);\n[lx, rx].forEach(ex => {\ndrawLine(ctx, ex-12, eyeY-12, ex+12, eyeY+12, 3, C.red);\ndrawLine(ctx, ex-12, eyeY+12, ex+12, eyeY-12, 3, C.red);\n});\nif (Math.random()>0.4) {\nconst sc = 0.7+Math.random()*0.3;\ndrawSigil(ctx, cx, sigilY, [120,0,30], sc);\n}\ndrawLine(ctx, cx-15, mouthY+5, cx, mouthY, 2, C.red);\ndrawLine(ctx, cx, mouthY, cx+15, mouthY+5, 2, C.red);\ndrawText(ctx, 'reconnecting', cx, cy+55, C.red, 8);\n} else if (state === 'BORED') {\nconst elapsed = now;\nconst phase = (elapsed/5000|0)%6;\nconst t = (elapsed%5000)/5000;\ndrawBase(ctx, C.hood, true);\ndrawEyeGlow(ctx, lx, eyeY, C.green, 0.7);\ndrawEyeGlow(ctx, rx, eyeY, C.green, 0.7);\nif (phase === 0) {\nconst edx = (Math.cos(t*Math.PI*2)*12)|0;\nconst edy = (Math.sin(t*Math.PI*2)*12)|0;\ndrawMandorlaEyeRelaxed(ctx, lx, eyeY, hw, hh, C.green, G.eyelid);\ndrawMandorlaEyeRelaxed(ctx, rx, eyeY, hw, hh, C.green, G.eyelid);\nfillCircle(ctx, lx+edx, eyeY+edy, 4, C.bg);\nfillCircle(ctx, rx+edx, eyeY+edy, 4, C.bg);\ndrawSigil(ctx, cx, sigilY, [38,0,10], 0.6);\ndrawMouth(ctx, cx, mouthY, 10, C.dim, -2);\ndrawText(ctx, '...', cx, mouthY+18, [0,40,10], 8);\n} else if (phase === 1) {\nlet pdx=0, pdy=0;\nif (t<0.25) { pdx=(-25*(t/0.25))|0; }\nelse if (t<0.5) { pdx=(-25+50*((t-0.25)/0.25))|0; }\nelse if (t<0.75) { pdx=(25*(1-(t-0.5)/0.25))|0; pdy=(-15*((t-0.5)/0.25))|0; }\nelse { pdy=(-15*(1-(t-0.75)/0.25))|0; }\ndrawMandorlaEyeRelaxed(ctx, lx, eyeY, hw, hh, C.green, G.eyelid);\ndrawMandorlaEyeRelaxed(ctx, rx, eyeY, hw, hh, C.green, G.eyelid);\nfillCircle(ctx, lx+pdx, eyeY+pdy, 4, C.bg);\nfillCircle(ctx, rx+pdx, eyeY+pdy, 4, C.bg);\nconst sb = (t>0.5&&t<0.75) ? 0.5 : 0.15;\ndrawSigil(ctx, cx, sigilY, lerp(C.bg, C.red, sb), 0.7);\ndrawLine(ctx, cx-10, mouthY, cx+10, mouthY, 1, C.dim);\nif (t>0.6&&t<0.85) drawText(ctx, '?', cx+70, cy-35, [0,40,10], 14);\n} else if (phase === 2) {\nlet yawnOpen;\nif (t<0.3) yawnOpen=t/0.3;\nelse if (t<0.7) yawnOpen=1;\nelse yawnOpen=1-(t-0.7)/0.3;\nconst eyeH = Math.max(2, (hh*(1-yawnOpen*0.7))|0);\ndrawMandorlaEye(ctx, lx, eyeY, hw, eyeH, C.green);\ndrawMandorlaEye(ctx, rx, eyeY, hw, eyeH, C.green);\nif (eyeH>3) { fillCircle(ctx,lx,eyeY,3,C.bg); fillCircle(ctx,rx,eyeY,3,C.bg); }\nconst mH = Math.max(1,(12*yawnOpen)|0);\nfillEllipse(ctx, cx, mouthY, 8, mH, C.dim);\nconst sd = 0.15*(1-yawnOpen*0.8);\ndrawSigil(ctx, cx, sigilY, lerp(C.bg, C.red, sd), 0.6);\n} else if (phase === 3) {\nconst bounceY = 30 - Math.abs(Math.sin(t*3*Math.PI))*60;\nconst juggleRot = t*4*Math.PI;\nconst juggleSY = sigilY + bounceY|0;\ndrawSigil(ctx, cx, juggleSY, C.red, 0.9, juggleRot);\nconst trackY = (bounceY*0.15)|0;\ndrawMandorlaEyeRelaxed(ctx, lx, eyeY, hw, hh, C.green, G.eyelid);\ndrawMandorlaEyeRelaxed(ctx, rx, eyeY, hw, hh, C.green, G.eyelid);\nfillCircle(ctx, lx, eyeY+trackY-2, 4, C.bg);\nfillCircle(ctx, rx, eyeY+trackY-2, 4, C.bg);\ndrawMouth(ctx, cx, mouthY, 12, C.green, 4);\n} else if (phase === 4) {\nlet droop;\nif (t<0.7) droop=t/0.7;\nelse if (t<0.8) droop=1-(t-0.7)/0.1;\nelse droop=0;\nconst eyeH = Math.max(2, (hh*(1-droop*0.85))|0);\nconst eyeCol = lerp(C.green, C.dim, droop*0.6);\ndrawMandorlaEye(ctx, lx, eyeY, hw, eyeH, eyeCol);\ndrawMandorlaEye(ctx, rx, eyeY, hw, eyeH, eyeCol);\nif (eyeH>3) { fillCircle(ctx,lx,eyeY,3,C.bg); fillCircle(ctx,rx,eyeY,3,C.bg); }\nif (droop<0.5||Math.random()>(droop*0.8))\ndrawSigil(ctx, cx, sigilY, lerp(C.bg,C.red,0.2*(1-droop)), 0.6);\ndrawLine(ctx, cx-10, mouthY, cx+10, mouthY, 1, C.dim);\nif (t>0.7&&t<0.9) drawText(ctx, '!', cx+60, cy-30, C.green, 24);\n} else {\ndrawMandorlaEyeRelaxed(ctx, lx, eyeY, hw, hh, C.green, G.eyelid);\ndrawMandorlaEyeRelaxed(ctx, rx, eyeY, hw, hh, C.green, G.eyelid);\nfillCircle(ctx, lx, eyeY-6, 4, C.bg);\nfillCircle(ctx, rx, eyeY-6, 4, C.bg);\nconst vinylRot = now/4000*Math.PI*2;\ndrawSigil(ctx, cx, sigilY, lerp(C.bg,C.red,0.35), 0.7, vinylRot);\ndrawCircleStroke(ctx, cx, mouthY, 4, C.green);\nconst nt1 = (t*2)%1, nt2 = (t*2+0.5)%1;\nconst ny1 = mouthY-10-(35*nt1)|0, ny2 = mouthY-10-(35*nt2)|0;\ndrawText(ctx, '~', cx+30, ny1, lerp(C.green,C.bg,nt1), 14);\ndrawText(ctx, '*', cx+45, ny2, lerp(C.green,C.bg,nt2), 8);\n}\n}\n}\nfunction renderDormantFrame(canvas, startTime) {\nconst ctx = _off.getContext('2d');\nctx.fillStyle = rgb(C.bg);\nctx.fillRect(0, 0, 320, 170);\nconst now = Date.now() - startTime;\nconst pulse = 0.3 + 0.2*Math.sin(now/3000*Math.PI*2);\ndrawSigil(ctx, 160, 85, lerp(C.bg, C.red, pulse), 1.5);\ndrawScanlinesCached(ctx);\n_blit(canvas);\n}\nfunction _blit(canvas) {\nconst vctx = canvas.getContext('2d');\nconst dpr = window.devicePixelRatio || 1;\nconst dw = canvas.clientWidth, dh = canvas.clientHeight;\nif (canvas.width !== dw*dpr || canvas.height !== dh*dpr) {\ncanvas.width = dw*dpr; canvas.height = dh*dpr;\n}\nvctx.imageSmoothingEnabled = false;\nvctx.drawImage(_off, 0, 0, dw*dpr, dh*dpr);\n}\nfunction renderFrame(canvas, state, startTime) {\nconst ctx = _off.getContext('2d');\nctx.fillStyle = rgb(C.bg);\nctx.fillRect(0, 0, 320, 170);\nconst now = Date.now() - startTime;\nrenderStates(ctx, now, state);\ndrawScanlinesCached(ctx);\n_blit(canvas);\n}\nfunction renderMini(canvas, state, startTime) {\nconst ctx = canvas.getContext('2d');\nconst dpr = window.devicePixelRatio || 1;\nconst dispW = canvas.clientWidth, dispH = canvas.clientHeight;\nif (canvas.width !== dispW*dpr || canvas.height !== dispH*dpr) {\ncanvas.width = dispW*dpr; canvas.height = dispH*dpr;\n}\nconst now = Date.now() - startTime;\nctx.save(); ctx.scale(dpr, dpr);\nctx.clearRect(0, 0, dispW, dispH);\nconst cx = dispW/2, ey = dispH/2;\nconst es = dispH*0.35, gr = dispH*0.6, ed = dispW*0.22;\nconst COL = { eye:'#00ff41', glow:'#00ff41', bg:'#050208' };\nfunction miniGlowEye(ex, ey2, es2, col, gcol, gr2, inten) {\ninten = inten ?? 1;\nconst gc = hexToRgb(gcol);\nconst g1 = ctx.createRadialGradient(ex,ey2,0,ex,ey2,gr2*0.7*inten);\ng1.addColorStop(0, `rgba(${gc.r},${gc.g},${gc.b},${0.18*inten})`);\ng1.addColorStop(0.5, `rgba(${gc.r},${gc.g},${gc.b},${0.08*inten})`);\ng1.addColorStop(1, 'rgba(0,0,0,0)');\nctx.fillStyle = g1;\nctx.beginPath(); ctx.arc(ex,ey2,gr2*0.7*inten,0,Math.PI*2); ctx.fill();\nconst hw2=es2, hh2=es2*0.52;\nctx.save(); ctx.beginPath();\nctx.moveTo(ex-hw2,ey2); ctx.lineTo(ex,ey2-hh2); ctx.lineTo(ex+hw2,ey2); ctx.lineTo(ex,ey2+hh2);\nctx.closePath(); ctx.clip();\nctx.fillStyle = col; ctx.fillRect(ex-hw2,ey2-hh2,hw2*2,hh2*2);\nctx.fillStyle = 'rgba(0,0,0,0.35)';\nfor (let y2=ey2-hh2;y2<ey2+hh2;y2+=3) ctx.fillRect(ex-hw2,y2,hw2*2,1);\nctx.fillStyle = COL.bg;\nctx.fillRect(ex-hw2-1,ey2-hh2-1,hw2*2+2,(hh2*0.15|0)+1);\nctx.restore();\nctx.fillStyle = '#000';\nctx.beginPath(); ctx.arc(ex,ey2+1,es2*0.13,0,Math.PI*2); ctx.fill();\n}\nfunction miniHappyEye(ex, ey2, es2, col, gcol, gr2) {\nconst gc = hexToRgb(gcol);\nconst g1=ctx.createRadialGradient(ex,ey2,0,ex,ey2,gr2*0.7);\ng1.addColorStop(0,`rgba(${gc.r},${gc.g},${gc.b},0.25)`);\ng1.addColorStop(1,'rgba(0,0,0,0)');\nctx.fillStyle=g1; ctx.beginPath(); ctx.arc(ex,ey2,gr2*0.7,0,Math.PI*2); ctx.fill();\nctx.strokeStyle=col; ctx.lineWidth=3.5; ctx.lineCap='round';\nctx.beginPath(); ctx.arc(ex,ey2+es2*0.3,es2*0.8,Math.PI*1.15,Math.PI*1.85); ctx.stroke();\n}\nif (state==='SLEEPING') {\nctx.strokeStyle=rgbaHex(COL.eye,0.3); ctx.lineWidth=2; ctx.lineCap='round';\nctx.beginPath(); ctx.moveTo(cx-ed-es,ey); ctx.lineTo(cx-ed+es,ey); ctx.stroke();\nctx.beginPath(); ctx.moveTo(cx+ed-es,ey); ctx.lineTo(cx+ed+es,ey); ctx.stroke();\n} else if (state==='HAPPY'||state==='PROUD') {\nminiHappyEye(cx-ed,ey,es,COL.eye,COL.glow,gr);\nminiHappyEye(cx+ed,ey,es,COL.eye,COL.glow,gr);\n} else if (state==='ERROR') {\nctx.strokeStyle='#ff0040'; ctx.lineWidth=3; ctx.lineCap='round';\nconst xs=es*0.6;\n[cx-ed,cx+ed].forEach(ex2=>{\nctx.beginPath(); ctx.moveTo(ex2-xs,ey-xs); ctx.lineTo(ex2+xs,ey+xs); ctx.stroke();\nctx.beginPath(); ctx.moveTo(ex2-xs,ey+xs); ctx.lineTo(ex2+xs,ey-xs); ctx.stroke();\n});\n} else if (state==='ALERT') {\nminiGlowEye(cx-ed,ey,es,'#ffaa00','#ffaa00',gr,1);\nminiGlowEye(cx+ed,ey,es,'#ffaa00','#ffaa00',gr,1);\n} else if (state==='THINKING'||state==='WORKING') {\nconst p=0.6+0.4*Math.sin(now/800);\nminiGlowEye(cx-ed,ey-2,es,COL.eye,COL.glow,gr,p);\nminiGlowEye(cx+ed,ey-2,es,COL.eye,COL.glow,gr,p);\n} else {\nconst breath=0.7+0.3*Math.sin(now/4000*Math.PI*2);\nconst ec=lerpHex('#004415',COL.eye,breath);\nconst dx2=2*Math.sin(now/5000), dy2=1*Math.cos(now/7000);\nminiGlowEye(cx-ed+dx2,ey+dy2,es,ec,COL.glow,gr,breath);\nminiGlowEye(cx+ed+dx2,ey+dy2,es,ec,COL.glow,gr,breath);\n}\nctx.restore();\n}\nconst COL = { hood:'#3d1560',hoodEdge:'#6a2d9e',eye:'#00ff41',glow:'#00ff41',sigil:'#ff0040',bg:'#050208' };\nreturn { renderFrame, renderMini, renderDormantFrame, COL };\n})();\nlet _sigilState = 'IDLE';\nlet _sigilStartTime = Date.now();\nlet _sigilOnline = false;\nlet _sigilStateTime = Date.now();\nlet _sigilAnimFrame = null;\nlet _sigilDormant = true;\nconst _sigilBtnMap = {\n'HAPPY': 'HAPPY', 'THINKING': 'THINK', 'SLEEPING': 'SLEEP',\n'ALERT': 'ALERT', 'PROUD': 'PROUD', 'CURIOUS': 'CURIO', 'IDLE': 'IDLE'\n};\nfunction _updateSigilBtns(state) {\nconst target = _sigilBtnMap[state];\ndocument.querySelectorAll('.btn-sigil-term').forEach(btn => {\nif (target && btn.textContent.trim() === target) {\nbtn.classList.add('sigil-active');\n} else {\nbtn.classList.remove('sigil-active');\n}\n});\n}\nfunction setSigilState(state) {\nif (state !== _sigilState) {\n_sigilState = state;\n_sigilStartTime = Date.now();\n_sigilStateTime = Date.now();\n_sigilKick(true);\n}\n_sigilOnline = true;\nconst moodEl = document.getElementById('sigil-mood-info');\nif (moodEl) moodEl.textContent = state;\n_updateSigilBtns(state);\n}\nfunction updateSigilIndicator(state) {\nconst ind = document.getElementById('sigil-indicator');\nif (ind) {\nind.setAttribute('data-state', state);\nind.title = 'Sigil: ' + state;\nconst label = document.getElementById('sigil-label');\nif (label) label.textContent = state;\n}\nsetSigilState(state);\nif (_sigilDormant) wakeSigil();\n}\nfunction wakeSigil() {\nif (!_sigilDormant) return;\n_sigilDormant = false;\n_sigilKick(true);\nconst label = document.getElementById('sigil-wake-label');\nif (label) label.style.display = 'none';\nconst cmds = document.getElementById('sigil-commands');\nif (cmds) cmds.style.display = 'flex';\nconst textRow = document.querySelector('.sigil-text-row');\nif (textRow) textRow.style.display = 'flex';\nconst dbgToggle = document.querySelector('.sigil-debug-toggle');\nif (dbgToggle) dbgToggle.style.display = 'flex';\n}\nfunction toggleSigilDebug() {\nconst el = document.getElementById('sigil-debug-actions');\nif (el) el.style.display = el.style.display === 'none' ? 'flex' : 'none';\n}\nconst SIGIL_FPS = {\nIDLE: 10, THINKING: 15, WORKING: 12, PROUD: 20, SLEEPING: 8, HAPPY: 20,\nCURIOUS: 15, ALERT: 24, ERROR: 10, BORED: 15, DORMANT: 8\n};\nconst SIGIL_MINI_FPS = {\nTHINKING: 12, WORKING: 12, SLEEPING: 0, HAPPY: 0, PROUD: 0, ERROR: 0, ALERT: 0\n};\nconst SIGIL_MINI_FPS_DEFAULT = 8;\nconst _sigilView = {\n'sigil-widget-canvas': { seen: true, frame: -1 },\n'sigil-header-canvas': { seen: true, frame: -1 },\n};\nlet _sigilTimer = null;\nfunction _sigilDraw(id, fps, render) {\nconst v = _sigilView[id];\nconst el = document.getElementById(id);\nif (!el || !v.seen || document.hidden) return Infinity;\nconst frame = fps > 0 ? Math.floor((Date.now() - _sigilStartTime) * fps / 1000) : 0;\nif (frame !== v.frame) {\nv.frame = frame;\nrender(el);\n}\nreturn fps > 0 ? _sigilStartTime + Math.ceil((frame + 1) * 1000 / fps) : Infinity;\n}\nfunction _sigilMoodTimer() {\nconst timerEl = document.getElementById('sigil-mood-timer');\nif (!timerEl) return Infinity;\nconst elapsed = Math.floor((Date.now() - _sigilStateTime) / 1000);\nlet text;\nif (elapsed < 60) text = elapsed + 's';\nelse if (elapsed < 3600) text = Math.floor(elapsed/60) + 'm ' + (elapsed%60) + 's';\nelse text = Math.floor(elapsed/3600) + 'h ' + Math.floor((elapsed%3600)/60) + 'm';\nif (timerEl.textContent !== text) timerEl.textContent = text;\nreturn _sigilStateTime + (elapsed + 1) * 1000;\n}\nfunction _sigilTick() {\n_sigilAnimFrame = null;\nconst state = _sigilState, dormant = _sigilDormant;\nconst fps = dormant ? SIGIL_FPS.DORMANT : (SIGIL_FPS[state] ?? SIGIL_FPS.IDLE);\nlet next = _sigilDraw('sigil-widget-canvas', fps, wc => {\nif (dormant) SigilEngine.renderDormantFrame(wc, _sigilStartTime);\nelse SigilEngine.renderFrame(wc, state, _sigilStartTime);\n});\nnext = Math.min(next, _sigilDraw('sigil-header-canvas', SIGIL_MINI_FPS[state] ?? SIGIL_MINI_FPS_DEFAULT,\nmc => SigilEngine.renderMini(mc, state, _sigilStartTime)));\nif (!dormant && _sigilView['sigil-widget-canvas'].seen && !document.hidden) {\nnext = Math.min(next, _sigilMoodTimer());\n}\nif (next !== Infinity) _sigilTimer = setTimeout(_sigilSchedule, Math.max(0, next - Date.now()));\n}\nfunction _sigilSchedule() {\n_sigilTimer = null;\nif (_sigilAnimFrame === null) _sigilAnimFrame = requestAnimationFrame(_sigilTick);\n}\nfunction _sigilKick(dirty) {\nif (dirty) Object.values(_sigilView).forEach(v => { v.frame = -1; });\nif (_sigilTimer !== null) { clearTimeout(_sigilTimer); _sigilTimer = null; }\n_sigilSchedule();\n}\nif ('IntersectionObserver' in window) {\nconst io = new IntersectionObserver(entries => {\nentries.forEach(e => {\nconst v = _sigilView[e.target.id];\nif (v) v.seen = e.isIntersecting;\n});\n_sigilKick(false);\n});\nObject.keys(_sigilView).forEach(id => {\nconst el = document.getElementById(id);\nif (el) io.observe(el);\n});\n}\ndocument.addEventListener('visibilitychange', () => _sigilKick(false));\nwindow.addEventListener('resize', () => _sigilKick(true));\n_sigilKick(true);\nfunction sigilCommand(state) {\nfetch('/api/tamagotchi/state', {\nmethod: 'POST',\nheaders: { 'Content-Type': 'application/json' },\nbody: JSON.stringify({ state })\n}).then(r => r.json()).then(d => {\nif (d.ok !== false) showToast('Sigil: ' + state);\n}).catch(() => showToast('Errore invio comando'));\n}\nfunction sigilSendText() {\nconst input = document.getElementById('sigil-text-input');\nif (!input || !input.value.trim()) return;\nfetch('/api/tamagotchi/text', {\nmethod: 'POST',\nheaders: { 'Content-Type': 'application/json' },\nbody: JSON.stringify({ text: input.value.trim() })\n}).then(r => r.json()).then(d => {\nif (d.ok !== false) showToast('Messaggio inviato');\ninput.value = '';\n}).catch(() => showToast('Errore invio messaggio'));\n}\nfunction sigilOTA() {\nif (!confirm('Avviare aggiornamento OTA firmware?')) return;\nfetch('/api/tamagotchi/ota', { method: 'POST' })\n.then(r => r.json())\n.then(d => showToast(d.status || 'OTA avviato'))\n.catch(() => showToast('Errore OTA'));\n}\nconst _otaLabels = { downloading: 'download', downloaded: 'flash', interrupted: 'ripresa…',\nok: 'OK, riavvio', skip: 'già aggiornato', error: 'errore' };\nfunction renderOtaProgress(d) {\nconst el = document.getElementById('sigil-ota-status');\nif (!el || !d) return;\nconst label = _otaLabels[d.status] || d.status;\nconst pct = (d.status === 'downloading' || d.status === 'interrupted') ? ' ' + (d.pct || 0) + '%' : '';\nconst retry = d.attempts > 1 ? ' (tent. ' + d.attempts + ')' : '';\nel.textContent = 'OTA v' + (d.version || '?') + ': ' + label + pct + retry + (d.error ? ' — ' + d.error : '');\nif (d.status === 'ok' || d.status === 'skip' || d.status === 'error') showToast('Sigil ' + el.textContent);\n}\nfunction scrollToSigilWidget() {\nswitchView('dashboard');\nsetTimeout(() => {\nconst el = document.getElementById('sigil-widget-wrap');\nif (el) el.scrollIntoView({ behavior: 'smooth', block: 'center' });\n}, 100);\n}\n",
+"gz": "H4sIAAAAAAACA8097XLbRpL/+RTwZhMAJEgD4IdoKrTLsZVYu3bkkpTL5nQqBwQgEmsQ4AKQSK6sq32Ie4D7dS9yb7JPct09M8AABCjala1LVRwCM909PT3dPT2NmZEbR2mmXATzIDyJ5kHkK1NF03Rl+ly5b7lU+QqK7luz+US5Ghq2Mb42lHni+xG8m4Y9HBqjIRR5wZIKxgBjXRutxPfgHatNYzQAgK0fhvGal1lHpmFCYeo6SKdvWAYQaS3iGLFGFtAwno0AAEveZlBmmSNjAIhDbH+9CDKfk+L/rlsPx5zhH4hhdzNRrJFpKO52ogBXir/1f5ko0LCSYnfhedA3lGV8my3g2bKGRitEnD5AJPjwDB4Wa3yA3wX8mkQkDIBHa1i09yG+uYEmvdi9XfpR1nMT38n8k9DHN02FLt45qaoftxCwtw68bAHgfds8JtTewg/miwyKQCrHrZvbyM2COFKS+UxzdeVeSfzsNomUX7Hgj/fulXn9YOCvxX/t6wf912PloYTqaK6hOBV0pwkffp0qkdBPVpprgQBtQ8mAUiu4UbRM+XaqmLqg6lrHCit+DvwXxfZxiz9euRa02NFcG3669KK3s084MBawQBUWVVhShc0qbKqwWcX1cUtib+FvLuNzEAk85MxtV358g1XKk+lUUdMsCaK5mrN1n0xMYw7/ZhMThg9RALaXZk6SpT8H2UJTQUqqjmJjY7ucIsDSydyF9lT7D6+jP53rxxK9zhI6BDThF9R+hr8gTxQkIBJy4q9Cx/U19SvVUFENRLOhH82zxXQ67esKB0ZJST9W6ccWP7lsof2Vk6T+KegZdSQMoCGwSt2wRjpwVVNrGwNWO6urHRgjqn0oyRpV4Y2/QW0AZSBdYOJxpvkwuBaQlF5tPWeTa67TSzrarJd04YEGlNSuN8fCORTOpcIZFs6gcMYKQTdbFQVHhqA5wwlXC6cYMXda0ozjHf3vJaT2vTn7mVGDSKNqADdBGL4KEjf0NTfbGAr8twXXAPoZhySCbNNDmItsG6LfJIOFqmMFa2Y+uNP3DugUL3ASV2Mk3kEp6NQGRirRDcXkJe9P2zaHRbKA16pwcxKGwSrl7Lj4DxmC32T7pVz5giSnJvO20cvvW8bs4fxeJoETzXP5mcbWNDaWsbWMjW1s7S/gmUCX8Z1/GWtEj8OEMHVhERKvFGFLHNEN49SXe1/Dt5c467eAusuzsi4xDM4l/ujXs4xt/8wd/booeuWsoEBN4tvIUxlLOwNyWOdY4zWsM4W9YNWNanso71YDk5+jy42sXsDMiI2lyGeTGrzqYYwAyDdxomihnylbqIGpc6t8SxMmPHSmiq3n43nuuxlwg8zBHGvArLTT8huIKr4HUN/jpsQlwxzIBhr4occMgj1uxVSfLuLb0PMTKD4aG8rKdz6+gWcMM2ZO6v/CJnFDiXz347sgwneg0YHQQVBwP7gQFRAFNsHGoaG86lFEA+LrmQO9AA2iiCABqChcBl4FeTZHTHsoYUJUs9MGAxvKYL4392uhxrYscg9F0hWdP8Z3iALk906nECACgxA7UMwmO4BWTOXTJ6h5ToGPjr46C6JbX7CC4Q8pjjNLNQ+04WlBvoUsZPGKS7PLxd5RNPbQBmz4p38yWXME+i0GKRzJZCRmcfbLsQhiUGBjnDWwFGBo+ND9+2HqF7pwm9xRSJxBswzjKfwe2YLvJEixHsQKLGgWQFEv3BiUmnDbwh50EKjcFoBqhA14okCojU59eeBtoI2glhF2lzrFusEqWDxWCBS7uniFGlN01QL7wLJ8rLkWGkLJIMKjnlk47iSCArlfxeUYpIqGkA02QRTGuxRA5yokCJOraU6izyiQIlcojKsEOCZT4ZwCNlQmUcZiwEzJOQofUju3CpAvSpsJt60MhlBvmaC/Sm7EMBIFCI3IG6lKahFbL4yqP+TzUNXJIZhURR4M3A+ONPgvenjTgMraa0AGG0FUooE864VSoSTevG3yQtZw1/w1YZBdCycm5gN2CmVHsNeoc2EfYtY82sQojaxtIKwNQSxQHKbsDOA5OJtvvmGkn6Nt1M4sjkY9Z2PDpGGwFnQ2Z5QEyv0ZF2sXBWqJqeWhOr18D+H+xcLx4rWY2XaCNza/4NTSgTBoODKUEfxeDWCBPbpG2e9BgLXsABCGA0CwYeXcfwwBF659gB5gExYsyO1rSRM+hM7WT1KQSuSvYbxWOFXn/WG12kcfplPsG/YGdcIFeI7Zm/sZAvBBeOKSxA9aEbvl5bBbWQtjg5qL9F+Be/M3gGt7KnpS0XTKmgZHQD0Sy8+dGf87R8gFMwpklSmNkNAOBDpdOnNf4z1W0SlPVBh2joGayXCUF4o6SVVlosB6zlBCli0Ja2KXGS4Ww1JYYoqw5AgMplWJRsKcPy5MwWRFrbD6gUfjewKrV467YDFOczcxvFKNMl4j5ZOt/0PI1BqMBv+xhYehBDA+URpkW7EWzwvIf5tDsQhnqiqvqwQdG1RUskkiy8LLINIsCo7G7aIdXW8mZY0eI2VVSVV6+s6JvDgJHehxmfRijdmgPGbcXeb4my7AICig+NsuAvubDi+jOPtxrE4dVjOL537obEQ0W8MpSCPw3ru0cj+4dyLIQMTckfKwiOa/xQK8L6+X58jaMB5NoexTqctdCxsGIeHDYt220R8i/Y7NnWs5cndWq20t148tJavT2WIt5jD2VJ24oO4pVvEiD5cCWnecTzztjEVplS51POKp4227bI7o13WDEq6sDyn+E1YExhjCBJzEmYOwyBEVQdvsF4Jo6zivx/6Jx09SfDIHGz1Hfi2cKAkzj45Z3XNcMd3v2I9ghoA6NfZIllxjeCXEOjQID6U5B+LjcxEcYKycdxiTs1FeBc9FlTQprTIIJwyPfI1IM6YbctDY1zbUtrGJrrdtIz0cKeSvDIE1ME4EiRDXBX9Xd+bGuDO319MVOu3uWDeu7iwoskTROI8XrxYAu+Cw3bFhAuwCYBccFkuYo8/TCpy6wUnCpM9UtATEyRqcVg7EW/Wg2hOtDo3uEJr1ANTjzQ6NoQRsQ4WdAxNsH4r6ArY7rDbP6RucJsQZNTxyugYnVgLazUQIJclzBpah9dtCPXXhdZpN+IqNBoSaBj3xBygw2BM9XPfA1E9g6tO0q9XGWG2vxfcM2VShRlltizCuxr/ipwHG+RL/bUUGyGDrws9yN7m3aXY2FV8j1o9SFCzzv2SuZomuJu8FGngecXMmn4MLUhpRO+VIdlcARS5MCEHytuVk2ZLmMIJZ0tRFj1bD9HWJ8RzhYWQn8lTMDQZ/f0S6VAMxIRT++sd7hP/0yTIfVhvlD3/ys+8SJ4hS5V0cxX8wlvD/dAWx068MDVt7GQZz9J4qWwarLFOFNRgohuw7mAqLVC/01ULwxHLBbblPiR/BwuYCvBXLaBlKFIMIUiwoRvseonJ3a+DHKIN9hzLYJygj3BgJWPraWCweMO3EA0BEV6b4NeP09dsTVUi9CGhf9TBkBCkmt35u8TOMuBe0VjoCrwdrz3buUYGtpwPTNNtSpk6sCrc+W71egb/U7OGwzQiR/9RG0us1M/JSQBhu2Fc25Ik+EVImSa+BTJoguQGgyWh2meUhsMwcObMPq51PH1h9xKuPW/tio4JFEemwLuNKiX3b0/cTSA4hUJ0dQxEW+L+QtQ5YTqAGMmmE5AnIGY2pRWNqDssSGlUHtRJq4IKQ65w8Q7/qJT7oTzrDsL83qvp4QOtaQ/GlFF878qslJIDWoORpG0lvL9+c/vjn0x9/eFx3D9Eo60B9svTP1YRCFT9bB0qou6PPwGHiVYZ7Rr4Oio366jbkacajzo4pW/WmTAMtpaJKY00Ec1AIsXD1D7TGJVp7FUjQJw0ACrVqY5fVxi6pDRdaYfVxhlmIK1U11B7+Y//rqddXwmdBlPD14Jp5RgTXKzMJlokvY52hiW14wRJaGzRq589n57+dcpq94cHubrirZXWaOeCdaIJO9kEXoxHCaIy5hlkDckmld7sJMakgJs2IVW3qH65NfJzM3rNGZRqXdGlcUSWZg8cUafQvUaT352c/vW5Uo7fZv9TLldfFBUENltTgNWjaLOxtFyN5BIP7FBSr1bPACVk7k/OhM4+YbtJCY4JofolTOlD62gJS+lP8v1zNVrPDNoFKKWF8Lzk5os18HYNlY8xoUBKjfm0ic0jAhqAtDK9YDSBsrnxjaTSOGpXj4u3Jyft6N8MZZ75GfCoYwFx84zAnvWPIaOhssEIWZrOXfSZcQCV7UBpG7GoAyypYbF0Lt8Vkvz2jfU9aJQoZy3FYYVHq31Uy3CFtyeoOhh3ELxtWBePfGcZoSBgjs4xh12DwNsYM46iujfrxefPy/ftffp/GO/5s4x3XGu9N6KQLbmXomtEF2tR7syZmYNAvmLUquAFvjEowGF4XX7pg5UOfvKsa0C85g1wXarWrw8mUAoqetd/obFuS4rPCPa3Yp1hwT7uRcQGVOUm+yKE1TrpCgeHyhp6ud9SqTWrVZbsJu7hBkBOp19s21/Tx54CDRTDDGEvg40big3E9dL16v/rp/PTsp4v/LwU/JAbHvO9i0bG/MA5vQOdD7jrRX1BRx5XQeSh8Vc2KjZBEA/vi9ibIHb9tmzxuwoeQLaNYHDXirli28XIIJoNCkyVSds1M3WgKX7JcALPIP9gGYUak7SpdW7Yxl2CeQfM2GNWBC4nUNYh+YwJR9gHD3U7/jZxR/7Dp6AWfKoRNd/72S3lqqbekl29Pzi9r7YhtcD7MjgTso4ZUBXxkscDWogzpsAVDBaNp7XrIynWv7hdrhjHpfq7PNtffEtMl3ZdBS6uPcRVVbNJyPvp/qVWFhsmow1B2YlSrV9oGFbCdZ4HyrTKAHzmJm25M2vUE9tgJ2hZ9bcASpq0dTQu+tkF/TP2FOSkiqHRj4ZedjdlhGFYtxnCy8wEBcagJfLIItSqLB4p7RXBOkz2Rqyx01CfMDp4xO7CGeef3GMHJ+fnZea0REOYhFkCARbap0QAkuKuQ6or0vr9hef2yaHyWd8hVxmeJB0qp4UOfk92RqYTYqSB2K4gPcq49QQtbavpzDNsLjXB5wqYEA9FZf3+sDX4U4qw+Ox1B47gnG4dmVAqMmvomA5USeEihgiUpR+JDZyLfzXAbfbEeLpSkOeT47uz8hC2HeWo5dFap77HUQJ7YWjiU2NJ4LSV5UVdH8sZAUfs1pYAJ5vi3yNUcHZyrOeLjzfmdTuWv4T5LV+fZ6EyaXtuWLa1WfZa5zp1SHeQX5iy/OH1dR6EmGvLztLT/aAa7EXaf3vfHxRpz9Miau8jHdO1dpcVMj4xAMwbE+gNOv6KzxZhaYnPTyttMoY2Vt52KPaXf0qZC5Z7qtC5EP1r2lMpw1MS+UQFagoQlb1vTsi5BN+McFUhI3eoSSgkDGdLA/Dm5Omr3EhAncVSB+51q2CrXmtWjGtYIK30l0TJwyMNvvhGyfUG7dCe0u/HLPo0c1ea4zbJnNWsTkzTIwM+I8TMe7szDPB494vHosKSy1cxFobO20Nmts47OVn5U6GtfzwunqKv944rCSfUWrysKuO7oDDH/PPhG7M3A7/c2ZhwWqGgCj1KH+DH/oHAV6VWXPY/Eq1UU7AyWPe+j9VRUJdywD619g2/Fq9Qn1Xqx/2NZ6qZlaJbdFl1kvas9jiMGHpPTb6pZ6dRjn+6GFXmNP/tDnZd/qKtViX4xNRU5mr4p9qbj1gBpBuq38w3q7VE+U/31dj4P/XNK5WftgYApV18gYcan0hFtNWR7BIYU0z0zimaK9WXiuB9pHcfptWk38u93ZuR+iPHdtfc7rj3A++Y7OavR6AkGwhN4SRyvCjdwpLMS8gFHFR8wFpWyvQtnwGrMx62fANvk1ph1VHYTcB3mPeBTt0AafY6vyD81H+wqcozf2lPQpyPsA873nz6VlwJaLhJdP8y6mVlgvkQIVN/zPf6zJp0jNuk8a1r7SXnNfJDk1d/979r0uqNDbK4MxfTzLoi24Xn+uXJw+OfK3WHrD1mIYORUD8piDXazWFFmUfQCa4KvYTCjzOavmMuDohxOSheAQnS1/rANuJT7j7Z2TZ1dlwf7T6YDfcKyjLKtUheR6N5EN2auIzzOWYdr6zziLu8vY7ulXsfJ0omy7xNnCcKhYwEsn51dBktp1xQ0h+cN8LR89TDA4fuNdzbfcznGa0B6DQvXHjxqOsyTOQe7GzD6tPPG3vngsffzJ91DgB+lmnZiYKpJ7Aeo271/3PowC4OMi6i876xUk0vsjomMFdcJjX0pX+EhwXUAdrnuef5d4Prvg40fnuOWW7bZWECuC2puGPhRRmdEwY0vqhVv6AwHcz+8gp3ywDP53rqNjQJpXsVPfFDdAuuoDzKaQDquoAgElAZ2txfgwYaLZRxniyCan0TOLKSEA31IPWYw0gGIGD8NMqVgDRiCg5p9fTsqigelfleaunf/4ZepFiP5LoiCg3v+2ylckK5+btI5qHvzeWqH1PZoHhJsUj6BWqN/Aq3YOf6IN8Hz0M6dL85R095njake6R07pe47iaQHxADvdHF2dyNYe0o5SsHN0/xoqp/mHOL0hLe2SAUjPPSW9w48Wo736gyPBd7jrDlRvzLNm5uBpbKd/fL7bI5vQ9M2x6ryIG3OX4K6YDoNozJ2QAMZTG2+t3fO/p/Y/MwQnRfCB2iU/b54UWjBHLOo+YUOc3kH/BynP5IXnS47d7zACX9I4AcPmdEpGtswDf4ADeLalB36ARpzq+d4eNAqBpOJVyhqcUPEnF8RMed3RMz5JRHFoaEH/dc6Er3hIUTMvUQszLoiCcwC4272Or8x33cuv67DQKnpygYmzMXantIYLRb0AKhDe1dfm65ioKM8NrZbvrKA8dIFotXyzh74DsHX39gAtr7SakSCR+SV3eNFtmjfgOc2/H9ht+0a9JLMMZhT5RsHQCSMyvHW/pYzCI+daXVnPW9zK5qzapoC+wKXX3cWyu5agl14Igod29CQZ1wEw8qqIwgmfprFiV8nCbRRU31UQTrQFo2z1d+jHQ9lu873newz7GJK2Gu908+13Vqr3W9vlPasN7NHrGwKNqYcaGP7rKt82cY0V9P8lo1pvzcs3RAy3X8/iDSCbPz6fBzHORMWKIv0Aqvy3Zs48q810+m0vDutyrK4awf1FuYENI/qTSFT+3N6wH0GLGN9r+unBp4clp0AVXTkioLx/QQ7TQQ7jQSrH69QHGwz2KdPeUGxtbNkBMQons8E0kI6+ItTJegGUK+Adx4Br2Om+NZaHRj1q5sb0xyY6o5GNY0Gu54jBQePEcBx64r1gBiTP6va0+f3e0UNIN0NyhP+X/XgdodqOnnNYaOXk+w0kuzWkHxoEFuxT0OOR+QRQ/E5DrhK6WmekMsuo3QOQanjIT/4IKmSvN2cry2nMBawth/s7ls5rmW+azdokLFq4H0/Rp7lkY8OTWvPGjQdG3Kn4oownH0GA2uo5s3xI0PF2R57WneyB4/12NO6Qz01UugAFYNO2VLPfLfUqbzFHVkciPdQnWMfKrExXVSoftX3rOEIdABfT7w5xssjx/ae+apRjp4rwTOlkSa5/RrVWFpc7yavPQ1pNWbUpE8MYg7vbdORY4xbPlA7F+ybPD8/VqlhC5PSikWGOIv4WTi+hK5Q3Yv7MgqWxBmm127DUK7jjOPHhaS4BIjVfZdF7+ierPsW98QTsT/XkA4TTfgzFubz14Q/q0aLe4CJ2LJliB36E/FgFPsiJ/wRy0hME/7bklc2H25XHnT1gnOZapWzfSBOWPfi8l/qyBUB4Z5ScRvG3279ZHvhhxD3xclLiBPU3iyLuoTTzfxkqeq5L4YKtseFcrmM/jffKFBMpxVpjQ0ksyRY4q2dsJRlQMgUArmhk6ZvgzTD8EdTWRsOdOfOV2XTL8MmPjrlGvDqMdnUzy5ybSjEUWwFwcW1pDBYWdZKAjtu7VfI/SrHav8cuB81vv3joVVRX1nLlmisoXw9CciL303y3fY0lxLCdYPoJhZ3NjJEnROQ5S/1o15FSkKTQE4jL3AdUIOqKgWR9ziHgcAWHEIBW057eDHKywzUYnYLA6NCg06XmlCLjBCCZUHGFg3EDmi90hFd4ZdPOTP/AGERmGCDXnSGWi+mh1ad5jDskofQlbXzkcmqshyRyrnGPalgivtGqi6H+7JdtfmsHmP7e7qdYojWw+xK6GByRo3iyM9jMHfppY834cZLYNlLRQOIpRPuLvmb0N/k5FHm55SIqnc64HGEt9lk3SReixY4oi4oPNKON5tfxvgF9/GWPH92O+9mBC1ay9H1glJji9LQMyo0+K+RrCbvMntcrIwVh2jlssWRqxm23aKpGEu8BYh4w3uA+OiKOOHi9IfTtx++f39B0xjOJOz6YDF74QXChsJjwQl94KU5aaJgzldMZxPcSEAzH5W3+GzFkGlWm9ClObREYA3QrjsG8Prs/N3LHwFkXFxVzPh6d/rjac6cxJJdYangw8z5MHNOzbxhM+fGbGrqw+uT71/+9BZPeY3L0/2/Bf6aTfbcrgIIpLIuvyNqAkFQSpdNo40ayg0GFBOlaykPhsBY+A5eQHYIxoMchOBUkuTBSTHLM3eBV0/hJXU3q1SEW9LXlXySR/avAi8/FbNXAek7JrkqAPv0SXly10NW8TFHWQSeh1lRHgOeRjcQ8GX5DZQ3PKICtuiisxfse/xNGIOxaaW8c2VO1ZU2YdFNPaaOO6EYM4wkztR3PXrGfvJHbAl/xecFtBPpoq2Ci+oE3uGXu/jgoHkLHdxg16bWgQlARR6K/j1Uh+AdzLM0RpJ9Z/h+8OxN0MLCn3DcRtEWO1QfFykLRHQhTH5HJThN4U0YqW+VkcmcKfkSVthR1FSV9mEUwH08pyTAJSbE7lgkBthLmqbzXbG8NKfZjM/oA+yCKMjdFMQIJG9I5dMCk1xpLkd9wXddqaudcmFwUVcDuIJ7WStqdOASp+ciatxdU+RnuiialNrBM7xixi9FALklrdgUzIBeFD67xz0naKeWF/IwHj9OFIDo2PnYR0zokvOo9Wfcn6zdIqr3RLwi3cLfq/k8vnaNHZPmI76LWaDwD3a7mBjKR5Kq4NVoEd1tstuJsos1Ks59RzZVr2+0ltThXT7p2+KymU1dGK8YJ1j8SI63VsbXzKkC5JMdr3q/t8uSx8mTpASPyi7chV6ZPiCSxcf4NuOh6wV+W73Fe7yky5GZgnSlhUvl0rkyrqTz5WmqiJAlW5iyWr1m5Z34EI+lGRbRNVpMMQrjqmOCYmIvSIrL/PjL2eyvENX17pwQaGrFOBTr1TvSa6WYPbrWsfJQiuxZf57kPN8r9MGzLEMC0o/rZmpFrO4KWYmxUk/xNp/Up86czVI/uQP/D4sp/sVZWl/F/L7LOgwNNCYJ8Psp2ih/KdKj8h/HqAQCfo8tv3sUESBLd7rCJ3mYAHpBWrQXzZkNSjIXJ76xmMv6o7+tlzTeAv38sLg3DzswyA3iXsz6yedydsZEoDqed3IHD5gH8CO8IPIuSINZEILmuwsnmuMKkv2BkB3GgRL/sr9LJfHxkqY6XFp81S7jizQDOyJIq6FipXzj419lUJ86q+Bp5iydeQzvwVOxzL1vLf1sgX9QRH1/dnGpGi3mxVKMEFU+UXUvtysfsz3OahXiYhqae/rXNI5UDBdnsbedKH+6OPuxx/6URHCz1e75bPOgg+x62cKPtAS7lPQQD+yalXmSh+/FH0nhmZjwEtz1Zeykmbaz7KYB6bn09yaYpCTgkySJE4gZojtQX1gc4nY6teJGmGWAb6VtWnJCYXWbPR420YKQYPOwiWFitEpPzPp5xkm61LN+MJDev3QssIGJssvZbzM87/w0deZzEDcK3clYLqhoDNen6sFDthTUagft7PJlkcqAQbsJkqWmvryDdoEC4SWRgwMWKwCrYP0aql6ojw9DnDk4Ckp5FFBGdRJqSSIq+uLh30nJblNUBRUZcO64SABhf/cBWpWvf/wA/LzFNElK2XTwGFEYOx4MKrAm3vBSWv6If0tIpRsJVLZrJEluVxmVJsEKXIvzz3/8DyhV/BFKzv6MV3cgczEmuz4GKyicB//737kMM6zwkTWooV+/vIWFxSZnmfM+iedAPtW8z0sxxDzddpvnF8SKzyvGqpxuKmRyJSR9TQtD/pJvRXTpSFw+GpSQkCSoykisVpKYiudgVLZ+8HpIC+8NpWD/a3ahcX6zip8ltKuo52SZv1xluNKzCFujnDMRkWqBhC5I7OT9SGHueLMwxab8ylIVtBcxmQtksuhQHzucA8KgQaK2//mP/+INszK6g5mnk0qdjj/WSAK1oaaYSKm7jplaKvelYrhuEofhZUzQP1MUSjacrgOwB5ywMfeaLmaxk9AuOClYLP+VrYNSjizMXSfOqpq2Ij4gtoipzXtl5i8cMABU8JQ2ROKOrTB20UD4nYcUlj3gaTp20fP/AYU2zJULbAAA"
+},
+"tracker.758dac5af6.js": {
+"type": "application/javascript",
+"etag": "\"758dac5af64e02d3\"",
+"raw": "let _trackerFormVisible = false;\nfunction loadTracker(statusFilter) {\nconst el = document.getElementById('tracker-status-filter');\nconst status = (statusFilter !== undefined && statusFilter !== null)\n? statusFilter\n: (el ? el.value : 'open');\nsend({ action: 'tracker_get', status });\n}\nfunction showTrackerForm() {\n_trackerFormVisible = !_trackerFormVisible;\nconst form = document.getElementById('tracker-form');\nif (form) form.style.display = _trackerFormVisible ? 'block' : 'none';\n}\nfunction submitTracker() {\nconst title = document.getElementById('tracker-input-title')?.value.trim();\nif (!title) { showToast('Titolo obbligatorio'); return; }\nconst body     = document.getElementById('tracker-input-body')?.value.trim() || '';\nconst itype    = document.getElementById('tracker-input-type')?.value || 'note';\nconst priority = document.getElementById('tracker-input-priority')?.value || 'P2';\nsend({ action: 'tracker_add', title, body, itype, priority });\n['tracker-input-title','tracker-input-body'].forEach(id => {\nconst el = document.getElementById(id);\nif (el) el.value = '';\n});\n_trackerFormVisible = false;\nconst form = document.getElementById('tracker-form');\nif (form) form.style.display = 'none';\n}\nfunction trackerUpdateStatus(id, status) {\nsend({ action: 'tracker_update', id, status });\n}\nfunction trackerDelete(id) {\nsend({ action: 'tracker_delete', id });\n}\nfunction renderTracker(items) {\nconst tp = document.getElementById('wt-tracker-preview');\nif (tp) {\nconst open = (items || []).filter(i => i.status === 'open').length;\ntp.textContent = open ? open + ' open' : 'nessuno';\n}\nconst el = document.getElementById('tracker-body');\nif (!el) return;\nconst statusFilter = document.getElementById('tracker-status-filter')?.value || 'open';\nconst TYPE_BADGE = { bug: 'badge-red', feature: 'badge-green', note: 'badge-muted' };\nconst PRI_BADGE  = { P0: 'badge-red', P1: 'badge-amber', P2: 'badge-muted', P3: 'badge-muted' };\nlet rows = '';\nif (!items || items.length === 0) {\nrows = '<div class=\"no-items\">Nessun item ' + statusFilter + '</div>';\n} else {\nrows = items.map(it => {\nconst typeCls = TYPE_BADGE[it.type] || 'badge-muted';\nconst priCls  = PRI_BADGE[it.priority] || 'badge-muted';\nconst isClosed = it.status === 'closed';\nconst toggleLabel = isClosed ? '↩' : '✓';\nconst toggleStatus = isClosed ? 'open' : 'closed';\nreturn `<div class=\"tracker-item${isClosed ? ' tracker-closed' : ''}\">\n          <div class=\"tracker-item-head\">\n            <span class=\"badge ${typeCls}\">${esc(it.type)}</span>\n            <span class=\"badge ${priCls}\">${esc(it.priority)}</span>\n            <span class=\"tracker-title\">${esc(it.title)}</span>\n            <div class=\"tracker-item-actions\">\n              <button class=\"btn-ghost btn-xs\" title=\"${toggleStatus}\" onclick=\"trackerUpdateStatus(${it.id},'${toggleStatus}')\">${toggleLabel}</button>\n              <button class=\"btn-ghost btn-xs\" title=\"Elimina\" onclick=\"trackerDelete(${it.id})\">×</button>\n            </div>\n          </div>\n          ${it.body ? `<div class=\"tracker-body-text\">${esc(it.body)}</div>` : ''}\n          <div class=\"tracker-item-meta\">${it.ts.substring(0,16).replace('T',' ')}</div>\n        </div>`;\n}).join('');\n}\nel.innerHTML = `\n      <div style=\"display:flex;gap:6px;margin-bottom:10px;align-items:center;\">\n        <select id=\"tracker-status-filter\" class=\"input-field\" style=\"flex:1;font-size:11px;\"\n                onchange=\"loadTracker(this.value)\">\n          <option value=\"open\"${statusFilter==='open'?' selected':''}>Open</option>\n          <option value=\"closed\"${statusFilter==='closed'?' selected':''}>Closed</option>\n          <option value=\"\"${statusFilter===''?' selected':''}>Tutti</option>\n        </select>\n        <button class=\"btn-ghost btn-sm\" onclick=\"loadTracker()\">↻</button>\n      </div>\n      <div id=\"tracker-form\" style=\"display:none;margin-bottom:10px;padding:10px;border:1px solid var(--border);border-radius:4px;\">\n        <input type=\"text\" id=\"tracker-input-title\" class=\"input-field\" placeholder=\"Titolo *\" style=\"width:100%;margin-bottom:6px;\">\n        <textarea id=\"tracker-input-body\" class=\"input-field\" placeholder=\"Note (opzionale)\" rows=\"2\" style=\"width:100%;margin-bottom:6px;resize:vertical;\"></textarea>\n        <div style=\"display:flex;gap:6px;margin-bottom:6px;\">\n          <select id=\"tracker-input-type\" class=\"input-field\" style=\"flex:1;font-size:11px;\">\n            <option value=\"bug\">Bug</option>\n            <option value=\"feature\">Feature</option>\n            <option value=\"note\" selected>Note</option>\n          </select>\n          <select id=\"tracker-input-priority\" class=\"input-field\" style=\"flex:1;font-size:11px;\">\n            <option value=\"P0\">P0 critico</option>\n            <option value=\"P1\">P1 alto</option>\n            <option value=\"P2\" selected>P2 medio</option>\n            <option value=\"P3\">P3 basso</option>\n          </select>\n        </div>\n        <div style=\"display:flex;gap:6px;\">\n          <button class=\"btn-green btn-sm\" onclick=\"submitTracker()\">Salva</button>\n          <button class=\"btn-ghost btn-sm\" onclick=\"showTrackerForm()\">Annulla</button>\n        </div>\n      </div>\n      <div id=\"tracker-list\">${rows}</div>`;\n}\n",
+"gz": "H4sIAAAAAAACA7VYTXLbNhTe6xQIJw2pRqIlp5OFZEmTHyfNTJpqarcznUwmhkiIQgMBHAL0Txxtc4EuuukFeoYuexOfpA8ASZEUrdCZVhvT4Hsf3u/3nsSIQu9VgoMPJHkhkvUvVNIFI2iClphJMu4sUx4oKjhiAoenVtCTCqtUvqBMkaSLrjuB4FIhwkAtFEG6Jlz5EVHHjOjHp1evQs/NLulb3f7SKLvdcaZsjwGgAo7uTSYo5SFZUk5C9OAB2nnLU8a6nVnlRWeEPLBmBib555ilBI2QK2LC9X2S8NC7Rti4BeeZYe/BYLeX27EBwc3WebkSF6fbKHna6eaw3Ws4zn1cwlGbEGk5bSldIk8/d42mL9UVI35IZczwFeA0GTBD7oKJ4IOrPeaCE7fqR7pYU5WncZs6RZWx/oumUR6nqm/E3e7MBtdXCYWQWHvvmXeAbGMmsFSee0qVYAKJxYLRCCuRUAH+oYSoNOFjtMmsWIjwCulPa0O0Rt0O9OkTct085lRdxeROmFqhwDRgXChSAMZgfAKo7QFzjSro/NC9vRZxGEItmlD2TFh61pHe9npdoW8b89JrCtI7H2roGAcrj4ZoMm3XtDTMskpYd9tLExNeff9e5vhfar6hpjOEn+MQK3Ji2hcMzztZ1/htUU6NCgR6K15v/Ez0OWFEER2PPXChETJwdZgEVEiS9x1VZC1LzRfvC9AFpDWLUZyQc0ou8jCpeIuhyU2Tp4HW9fX2Xde3HOtRnW/q5wwLnJlxoc8Ij9Rq3FGxr8ileia4gnsBx8DN7J+HyDUPllKIlCkXJgN3YX3bqBlF6GrKer/C/hmr332IlPvKmJrjnv46P37/9Mnzl8eAeo0WaQQ+LHAYkX5CdIstCQAlpDiNEgLqPaRbvjhcpwqE0SZHnf/0KgM1qPNBDXQ+LA7wegEGwtFhDQ2OHjVcABWEEnEhsyYz4Spyah6ypJk8DnQB5OJHIT1HAcNSThwu+kbYmb4xCTOqkMeH1UhDao8OQG2q8wmZlGSLZy9b4xhqqkwYmoaeMS2xDe5bqnx9/s5koOxTiTW1EmgVwdNKOZvdrkjlMyYkzH5tUaWGA3NeCCoRRYy8xgtTkIUaDMSbz3+Z2r358/ea9Em+dJTFi1ovLrC1is7KES4oFsJ0/7qsn3NGP9PXUO7GmXZQ8bkNqL8iOKxIgqyMMc+FTYTQ/essCYB6/5rIwMvi390cHWjxFgg2IWWAPBctQHKbzbwp22Bmf7P+bS5bGpU1r0FhkSoltnYr3o9WQm8J8HQpHTsdJw4Eo5TLjYMEDxgNPhTXVAYDpEr5NNz03Jqe29V+lIoIvLAWfK1hx4yuKce7BmXDJDcFLv7nj+bLbHN29hwYELM3zZrrU7/ra3IvpUmf6SxprDNbnm2Kc00U1ig60dKHVVLCwsUjb9AbPu76CYERHRBY9mABQW6O36mafqYXB/83QbnnumZGwlpBOSfJ96c/vIZOPOuUrDDTf+Jk43+0ZORyHOF49Di+HK9xElEO/kHY1qPhAI4wbJfcEt8ogJlBknGprI4kxD0ARgm3flXmiJN7bdemJSUsdHIb9N2j4XgJI7Iv6UcyGg7hRqdWG0gne4V5BBrlL0xqRaWdUd0qEYjY7Afm1cTR1AMFXeZooDrLSDMXWQeAUkaQsemPcHp0YAH2YFoWakDN6GkH1zJZC+QGzF20UyhrugsGFGHESif72kquS21UDiyE8+bz3/XuqZSeqaRy0vVi6dRrS++VTTUVwyoORW7/WYgE1rgRZB5JwWDNO8eJ1+/b4272up/gkKZy9J2uj5J/pqrM+ARTdENWjCot8M11aLprJRjcMHGyL1TfFm5c0FCtwMjBNzUnHtes0DfjhOCGyzUttLj7DaxGyBPxR0goBrp3zMIycQ7bGZMQ0z7nJFE0wAyMOzrIjSrZebf2r3nZ3Ozbr3df0+k1Zq62AiyWzvRpGjV1zY5wtnM60xf2oZWSXkidoremOgmNLbrTV/tikY/8/zwe84EznQ9QAOA0EK0cnA9BZYgwUy3lD0vhmB+iNQlpS81HcNMjtACPRbsY1kfZl4qzWooNxKa/ZewSW+3XGWd6gtk5bloN2pPlzi9XzvQJ17+ZNeBWaXMvhzIqzUahW3+zHe2dfwGY+cIcUBQAAA=="
+},
+"app.c4b8be0a57.css": {
+"type": "text/css",
+"etag": "\"c4b8be0a57decf5e\"",
+"raw": ":root {\n--bg: #020502;\n--bg2: #081208;\n--card: #0a1a0a;\n--card2: #0f220f;\n--border: #162816;\n--border2: #1e3a1e;\n--accent: #00ff41;\n--accent2: #00dd38;\n--accent3: #00aa2a;\n--accent-dim: #002a0e;\n--glow-sm: 0 0 4px rgba(0,255,65,0.4);\n--glow-md: 0 0 8px rgba(0,255,65,0.3), 0 0 20px rgba(0,255,65,0.12);\n--glow-text: 0 0 6px rgba(0,255,65,0.5), 0 0 14px rgba(0,255,65,0.2);\n--amber: #ffb000;\n--red: #ff3333;\n--red-dim: #3a0808;\n--cyan: #00ffcc;\n--text: #c8ffc8;\n--text2: #7ab87a;\n--muted: #3d6b3d;\n--btn-hover: #004422;\n--font: 'JetBrains Mono', 'Fira Code', monospace;\n--safe-top: env(safe-area-inset-top, 0px);\n--safe-bot: env(safe-area-inset-bottom, 0px);\n}\n[data-theme=\"amber\"] {\n--bg: #050300;\n--bg2: #0f0a04;\n--card: #1a1008;\n--card2: #22160a;\n--border: #2e2010;\n--border2: #3e2e18;\n--accent: #ffb000;\n--accent2: #dd9800;\n--accent3: #aa7400;\n--accent-dim: #2a1a00;\n--glow-sm: 0 0 4px rgba(255,176,0,0.4);\n--glow-md: 0 0 8px rgba(255,176,0,0.3), 0 0 20px rgba(255,176,0,0.12);\n--glow-text: 0 0 6px rgba(255,176,0,0.5), 0 0 14px rgba(255,176,0,0.2);\n--amber: #ff8800;\n--cyan: #ffcc44;\n--text: #ffe0a0;\n--text2: #b89860;\n--muted: #6b5530;\n--btn-hover: #442200;\n}\n[data-theme=\"cyan\"] {\n--bg: #000305;\n--bg2: #040a10;\n--card: #081420;\n--card2: #0c1c2a;\n--border: #102838;\n--border2: #183a4e;\n--accent: #00ffcc;\n--accent2: #00ddaa;\n--accent3: #00aa88;\n--accent-dim: #002a22;\n--glow-sm: 0 0 4px rgba(0,255,204,0.4);\n--glow-md: 0 0 8px rgba(0,255,204,0.3), 0 0 20px rgba(0,255,204,0.12);\n--glow-text: 0 0 6px rgba(0,255,204,0.5), 0 0 14px rgba(0,255,204,0.2);\n--amber: #44aaff;\n--cyan: #00ff88;\n--text: #c0f0f0;\n--text2: #6aa8a8;\n--muted: #305858;\n--btn-hover: #003344;\n}\n[data-theme=\"red\"] {\n--bg: #050000;\n--bg2: #100404;\n--card: #1a0808;\n--card2: #220c0c;\n--border: #2e1414;\n--border2: #3e1e1e;\n--accent: #ff3333;\n--accent2: #dd2828;\n--accent3: #aa1e1e;\n--accent-dim: #2a0808;\n--glow-sm: 0 0 4px rgba(255,51,51,0.4);\n--glow-md: 0 0 8px rgba(255,51,51,0.3), 0 0 20px rgba(255,51,51,0.12);\n--glow-text: 0 0 6px rgba(255,51,51,0.5), 0 0 14px rgba(255,51,51,0.2);\n--amber: #ff8844;\n--red: #ff5555;\n--red-dim: #3a0808;\n--cyan: #ff6688;\n--text: #ffc8c8;\n--text2: #b87a7a;\n--muted: #6b3d3d;\n--btn-hover: #440000;\n}\n[data-theme=\"sigil\"] {\n--bg: #050208;\n--bg2: #0a0614;\n--card: #120820;\n--card2: #180c2a;\n--border: #251440;\n--border2: #351e58;\n--accent: #b44dff;\n--accent2: #9b3de0;\n--accent3: #6a2d9e;\n--accent-dim: #1a0a2a;\n--glow-sm: 0 0 4px rgba(180,77,255,0.4);\n--glow-md: 0 0 8px rgba(180,77,255,0.3), 0 0 20px rgba(180,77,255,0.12);\n--glow-text: 0 0 6px rgba(180,77,255,0.5), 0 0 14px rgba(180,77,255,0.2);\n--amber: #e0a0ff;\n--red: #ff0040;\n--red-dim: #2a0018;\n--cyan: #8866ff;\n--text: #e0d0f0;\n--text2: #9878b8;\n--muted: #5a3878;\n--btn-hover: #2a1048;\n}\n[data-theme=\"ghost\"] {\n--bg: #020202;\n--bg2: #0a0a0a;\n--card: #111111;\n--card2: #1a1a1a;\n--border: #252525;\n--border2: #333333;\n--accent: #e0e0e0;\n--accent2: #bbbbbb;\n--accent3: #888888;\n--accent-dim: #1a1a1a;\n--glow-sm: 0 0 4px rgba(224,224,224,0.3);\n--glow-md: 0 0 8px rgba(224,224,224,0.2), 0 0 20px rgba(224,224,224,0.08);\n--glow-text: 0 0 6px rgba(224,224,224,0.4), 0 0 14px rgba(224,224,224,0.15);\n--amber: #aa9966;\n--red: #cc4444;\n--red-dim: #2a0808;\n--cyan: #99bbcc;\n--text: #d0d0d0;\n--text2: #888888;\n--muted: #555555;\n--btn-hover: #2a2a2a;\n}\n* { box-sizing: border-box; margin: 0; padding: 0; -webkit-tap-highlight-color: transparent; }\nhtml, body {\nheight: 100%;\noverscroll-behavior: none;\n-webkit-overflow-scrolling: touch;\noverflow: hidden;\nposition: fixed;\nwidth: 100%;\n}\nbody {\nbackground: var(--bg);\ncolor: var(--text);\nfont-family: var(--font);\nfont-size: 13px;\n}\nbody::after {\ncontent: '';\nposition: fixed;\ninset: 0;\npointer-events: none;\nbackground: repeating-linear-gradient(0deg, transparent 0px, transparent 2px, rgba(0,0,0,0.04) 2px, rgba(0,0,0,0.04) 4px);\nz-index: 9999;\n}\n.app-layout {\ndisplay: flex;\nflex-direction: column;\nheight: 100dvh;\noverflow: hidden;\n}\n.app-content {\nflex: 1;\ndisplay: flex;\nflex-direction: column;\nmin-height: 0;\noverflow: hidden;\n}\n.tab-view {\ndisplay: none;\nflex-direction: column;\nflex: 1;\nmin-height: 0;\noverflow: hidden;\n}\n.tab-view.active {\ndisplay: flex;\n}\n.tab-scroll {\nflex: 1;\noverflow-y: auto;\noverflow-x: hidden;\n-webkit-overflow-scrolling: touch;\npadding: 0 14px;\npadding-top: 10px;\npadding-bottom: 12px;\n}\n.bottom-nav {\ndisplay: flex;\nbackground: var(--card);\nborder-top: 1px solid var(--border2);\npadding-bottom: var(--safe-bot);\nflex-shrink: 0;\n}\n.nav-item {\nflex: 1;\ndisplay: flex;\nflex-direction: column;\nalign-items: center;\ngap: 2px;\npadding: 10px 0 8px;\nbackground: none;\nborder: none;\ncolor: var(--muted);\nfont-family: var(--font);\nfont-size: 9px;\ncursor: pointer;\ntransition: color .15s;\nmin-height: 0;\nletter-spacing: 0.5px;\n}\n.nav-item .nav-icon {\nfont-size: 24px;\nline-height: 1;\ntransition: text-shadow .2s;\n}\n.nav-item.active {\ncolor: var(--accent);\nbackground: linear-gradient(180deg, rgba(var(--accent-rgb, 0,255,65), 0.06) 0%, transparent 100%);\nbox-shadow: inset 0 2px 0 var(--accent);\n}\n.nav-item.active .nav-icon {\ntext-shadow: var(--glow-text);\n}\n.app-header {\ndisplay: flex;\nalign-items: center;\ngap: 8px;\npadding: 6px 14px 10px;\npadding-top: calc(6px + var(--safe-top));\nflex-shrink: 0;\n}\n.logo-icon {\nwidth: 26px;\nheight: 26px;\nborder-radius: 50%;\nobject-fit: cover;\nborder: 1px solid var(--accent3);\nfilter: drop-shadow(0 0 8px var(--accent3));\n}\n.dash-title {\nfont-weight: 700;\ncolor: var(--accent);\nletter-spacing: 2px;\nfont-size: 16px;\ntext-shadow: var(--glow-text);\n}\n.dash-spacer { flex: 1; }\n.dash-temp {\ncolor: var(--amber);\nfont-size: 12px;\ntext-shadow: 0 0 6px rgba(255,176,0,0.4);\n}\n.dash-clock {\nfont-size: 12px;\ncolor: var(--amber);\ntext-shadow: 0 0 6px rgba(255,176,0,0.4);\nletter-spacing: 1px;\nwhite-space: nowrap;\n}\n.dash-weather {\nfont-size: 11px;\ncolor: var(--text2);\nwhite-space: nowrap;\noverflow: hidden;\ntext-overflow: ellipsis;\nmax-width: 120px;\n}\n.btn-sys-gear {\nbackground: none;\nborder: 1px solid var(--border);\nborder-radius: 6px;\ncolor: var(--muted);\nfont-size: 16px;\npadding: 2px 6px;\ncursor: pointer;\nfont-family: var(--font);\ntransition: all .15s;\nmin-height: 28px;\nmin-width: 28px;\ndisplay: flex;\nalign-items: center;\njustify-content: center;\nflex-shrink: 0;\n}\n.btn-sys-gear:hover,\n.btn-sys-gear:active {\ncolor: var(--accent);\nborder-color: var(--accent3);\n}\n.dash-sep {\ncolor: var(--muted);\nfont-size: 10px;\nopacity: 0.5;\nmargin: 0 2px;\n}\n.health-dot {\nwidth: 10px;\nheight: 10px;\nborder-radius: 50%;\nbackground: var(--muted);\ntransition: all .5s;\nflex-shrink: 0;\n}\n.health-dot.green { background: var(--accent); box-shadow: var(--glow-sm); }\n.health-dot.yellow { background: var(--amber); box-shadow: 0 0 8px var(--amber); }\n.health-dot.red { background: var(--red); box-shadow: 0 0 8px var(--red); animation: pulse 1s infinite; }\n.health-dot-btn {\ncursor: pointer;\ntransition: all .15s, background .5s;\n}\n.health-dot-btn:hover { transform: scale(1.4); }\n.sigil-header-canvas {\nwidth: 40px;\nheight: 16px;\ndisplay: block;\ncursor: pointer;\n}\n.sigil-indicator {\ncursor: pointer;\n}\n.sigil-widget {\nbackground: var(--card);\nborder: 1px solid var(--border2);\nborder-radius: 10px;\npadding: 14px 16px;\nmargin-bottom: 14px;\nposition: relative;\noverflow: visible;\n}\n.sigil-widget::before {\ncontent: '';\nposition: absolute;\ntop: 0; left: 0; right: 0;\nheight: 2px;\nbackground: linear-gradient(90deg, transparent, #6a2d9e, #b44dff, #6a2d9e, transparent);\n}\n.sigil-widget-header {\ndisplay: flex;\njustify-content: space-between;\nalign-items: center;\nmargin-bottom: 10px;\n}\n.sigil-widget-title {\nfont-size: 10px;\nfont-weight: 700;\ncolor: #b44dff;\nletter-spacing: 1.5px;\ntext-shadow: 0 0 8px rgba(180,77,255,0.4);\n}\n.sigil-widget-status {\nfont-size: 10px;\ncolor: var(--muted);\ndisplay: flex;\nalign-items: center;\ngap: 5px;\n}\n.sigil-online-dot {\nwidth: 6px; height: 6px;\nborder-radius: 50%;\nbackground: var(--accent);\nbox-shadow: 0 0 6px var(--accent);\ndisplay: inline-block;\n}\n.sigil-mood-sep { opacity: 0.4; }\n.sigil-canvas-wrap {\nposition: relative;\nwidth: 100%;\naspect-ratio: 320 / 170;\nborder-radius: 6px;\noverflow: hidden;\nbackground: #050208;\nmargin-bottom: 10px;\ncursor: pointer;\n}\n.sigil-widget-canvas {\nwidth: 100%;\nheight: 100%;\ndisplay: block;\nimage-rendering: pixelated;\nimage-rendering: crisp-edges;\n}\n.sigil-wake-label {\nposition: absolute;\nbottom: 12px;\nleft: 50%;\ntransform: translateX(-50%);\nfont-size: 9px;\ncolor: var(--muted);\nletter-spacing: 1.5px;\ntext-transform: uppercase;\npointer-events: none;\nanimation: sigilPulse 3s ease-in-out infinite;\n}\n@keyframes sigilPulse {\n0%,100% { opacity: 0.4; }\n50% { opacity: 0.8; }\n}\n.sigil-commands {\ndisplay: none;\ngap: 6px;\nflex-wrap: wrap;\nmargin-bottom: 8px;\n}\n.btn-sigil-term {\nflex: 1 1 auto;\nmin-width: 44px;\nmin-height: 28px;\npadding: 3px 6px;\nfont-family: var(--font);\nfont-size: 9px;\nfont-weight: 600;\nletter-spacing: 1px;\ncolor: var(--muted);\nbackground: transparent;\nborder: 1px solid var(--border);\nborder-radius: 4px;\ncursor: pointer;\ntransition: all .15s;\ntext-transform: uppercase;\n}\n.btn-sigil-term:hover,\n.btn-sigil-term:active {\ncolor: var(--accent);\nborder-color: var(--accent3);\ntext-shadow: var(--glow-sm);\n}\n.btn-sigil-term.sigil-active {\ncolor: var(--accent);\nborder-color: var(--accent3);\nbackground: var(--accent-dim);\ntext-shadow: var(--glow-sm);\n}\n.sigil-debug-toggle {\ndisplay: none;\njustify-content: flex-end;\nmargin-bottom: 4px;\n}\n.sigil-debug-toggle .btn-ghost { min-width: 28px; min-height: 24px; font-size: 14px; padding: 2px; }\n.sigil-text-row {\ndisplay: none;\ngap: 6px;\nmargin-bottom: 8px;\n}\n.sigil-text-input {\nflex: 1;\nfont-family: var(--font);\nfont-size: 11px;\nbackground: var(--bg2);\ncolor: var(--text);\nborder: 1px solid var(--border);\nborder-radius: 6px;\npadding: 6px 10px;\noutline: none;\n}\n.sigil-text-input:focus { border-color: #6a2d9e; }\n.sigil-text-input::placeholder { color: var(--muted); }\n.btn-sigil-send {\nmin-width: 36px;\nmin-height: 32px;\nfont-size: 14px;\nbackground: var(--bg2);\ncolor: #b44dff;\nborder: 1px solid #6a2d9e;\nborder-radius: 6px;\ncursor: pointer;\nfont-family: var(--font);\ntransition: all .15s;\n}\n.btn-sigil-send:active { background: #1a0a2a; }\n.sigil-actions {\ndisplay: flex;\ngap: 6px;\n}\n.sigil-ota-status {\nalign-self: center;\nfont-size: 10px;\ncolor: var(--muted);\nwhite-space: nowrap;\noverflow: hidden;\ntext-overflow: ellipsis;\n}\n.dash-stats {\ndisplay: flex;\nflex-wrap: wrap;\ngap: 10px;\nmargin-bottom: 14px;\n}\n.stat-card {\nflex: 1 1 calc(50% - 5px);\nmin-width: 0;\nbackground: var(--card);\nborder: 1px solid var(--border2);\nborder-radius: 10px;\npadding: 14px 16px;\nposition: relative;\noverflow: hidden;\n}\n.stat-card::before {\ncontent: '';\nposition: absolute;\ntop: 0; left: 0; right: 0;\nheight: 2px;\nbackground: linear-gradient(90deg, transparent, var(--accent3), transparent);\n}\n.stat-icon {\nfont-size: 14px;\ncolor: var(--muted);\nmargin-bottom: 4px;\n}\n.stat-label {\nfont-size: 10px;\ncolor: var(--muted);\ntext-transform: uppercase;\nletter-spacing: 1.5px;\nmargin-bottom: 6px;\n}\n.stat-value {\nfont-size: 22px;\nfont-weight: 700;\ncolor: var(--accent);\ntext-shadow: var(--glow-text);\nline-height: 1.2;\n}\n.stat-sub {\nfont-size: 9px;\ncolor: var(--text2);\nmargin-top: 2px;\n}\n.stat-bar {\nmargin-top: 10px;\nheight: 4px;\nbackground: var(--bg2);\nborder-radius: 2px;\noverflow: hidden;\n}\n.stat-bar-fill {\nheight: 100%;\nbackground: var(--accent);\nborder-radius: 2px;\ntransition: width .5s ease;\nwidth: 0%;\nbox-shadow: var(--glow-sm);\n}\n.stat-bar-fill.stat-bar-cyan { background: var(--cyan); box-shadow: 0 0 4px rgba(0,255,204,0.4); }\n.stat-bar-fill.stat-bar-amber { background: var(--amber); box-shadow: 0 0 4px rgba(255,176,0,0.4); }\n.dash-chart {\nbackground: var(--card);\nborder: 1px solid var(--border2);\nborder-radius: 10px;\npadding: 14px 16px;\nmargin-bottom: 14px;\n}\n.chart-header {\ndisplay: flex;\njustify-content: space-between;\nalign-items: center;\nmargin-bottom: 8px;\n}\n.chart-label {\nfont-size: 10px;\ncolor: var(--muted);\ntext-transform: uppercase;\nletter-spacing: 1px;\n}\n.chart-legend {\ndisplay: flex;\ngap: 12px;\n}\n.chart-legend > span {\nfont-size: 10px;\ndisplay: flex;\nalign-items: center;\ngap: 4px;\ncolor: var(--text2);\n}\n.dot-cpu { width: 6px; height: 6px; border-radius: 50%; background: var(--accent); box-shadow: var(--glow-sm); }\n.dot-temp { width: 6px; height: 6px; border-radius: 50%; background: var(--amber); }\n.chart-scale {\nfont-size: 9px;\ncolor: var(--muted);\nletter-spacing: 0.04em;\nopacity: 0.8;\nmargin-left: auto;\n}\n#pi-chart {\nwidth: 100%;\nheight: 60px;\ndisplay: block;\n}\n.dash-widgets {\ndisplay: flex;\nflex-wrap: wrap;\ngap: 10px;\n}\n.widget-card {\nflex: 1 1 calc(50% - 5px);\nmin-width: 0;\nbackground: var(--card);\nborder: 1px solid var(--border2);\nborder-radius: 10px;\npadding: 14px 16px;\ncursor: pointer;\ntransition: border-color .2s, box-shadow .2s;\nposition: relative;\noverflow: hidden;\n}\n.widget-card::before {\ncontent: '';\nposition: absolute;\ntop: 0; left: 0; right: 0;\nheight: 2px;\nbackground: linear-gradient(90deg, transparent, var(--accent3), transparent);\nopacity: 0;\ntransition: opacity .2s;\n}\n.widget-card:hover::before,\n.widget-card:active::before { opacity: 1; }\n.widget-card:hover,\n.widget-card:active {\nborder-color: var(--accent3);\nbox-shadow: var(--glow-md);\n}\n.wc-header {\ndisplay: flex;\njustify-content: space-between;\nalign-items: center;\nmargin-bottom: 8px;\n}\n.wc-label {\nfont-size: 10px;\ncolor: var(--accent2);\ntext-transform: uppercase;\nletter-spacing: 1.5px;\nfont-weight: 600;\n}\n.wc-icon {\nfont-size: 16px;\ncolor: var(--muted);\n}\n.wc-chevron {\nfont-size: 18px;\ncolor: var(--text2);\nopacity: 0.6;\ntransition: opacity .15s, color .15s;\nline-height: 1;\n}\n.widget-card:hover .wc-chevron,\n.widget-card:active .wc-chevron {\ncolor: var(--accent);\nopacity: 1;\n}\n.wc-body {\nfont-size: 11px;\ncolor: var(--text2);\nline-height: 1.4;\noverflow: hidden;\ntext-overflow: ellipsis;\ndisplay: -webkit-box;\n-webkit-line-clamp: 4;\n-webkit-box-orient: vertical;\n}\n#tab-code {\ndisplay: none;\nflex-direction: column;\n}\n#tab-code.active { display: flex; }\n.code-panel {\ndisplay: flex;\nflex-direction: column;\nflex: 1;\nmin-height: 0;\n}\n#chat-messages {\nflex: 1;\noverflow-y: auto;\npadding: 12px 14px;\ndisplay: flex;\nflex-direction: column;\ngap: 8px;\nposition: relative;\n-webkit-overflow-scrolling: touch;\nmin-height: 0;\n}\n.chat-spacer { flex-shrink: 0; }\n.msg {\nmax-width: 85%;\npadding: 10px 14px;\nborder-radius: 8px;\nline-height: 1.5;\nfont-size: 12px;\n}\n.msg-user {\nalign-self: flex-end;\nbackground: var(--accent-dim);\ncolor: var(--accent);\nborder: 1px solid var(--accent3);\n}\n.msg-bot {\nalign-self: flex-start;\nbackground: var(--card2);\nborder: 1px solid var(--border);\ncolor: var(--text2);\nwhite-space: pre-wrap;\n}\n.md-p + .md-p, .md-p + .md-code, .md-code + .md-p { margin-top: 8px; }\n.md-h { color: var(--text); }\n.md-ic {\nbackground: var(--bg2); border: 1px solid var(--border);\nborder-radius: 3px; padding: 0 4px; font-size: 11px;\n}\n.md-code {\nbackground: var(--bg2); border: 1px solid var(--border); border-radius: 6px;\npadding: 8px 10px; margin: 0; font-size: 11px; line-height: 1.45;\noverflow-x: auto; white-space: pre; color: var(--text);\n}\n.md-code[data-lang]::before {\ncontent: attr(data-lang); display: block; margin-bottom: 4px;\nfont-size: 9px; color: var(--muted); text-transform: uppercase;\n}\n.copy-wrap { position: relative; }\n.copy-btn {\nposition: absolute; top: 4px; right: 4px;\nbackground: var(--card2); border: 1px solid var(--border); border-radius: 3px;\ncolor: var(--muted); font-size: 12px; cursor: pointer; padding: 2px 6px;\nopacity: 0; transition: opacity .15s; z-index: 2; min-height: 0; font-family: var(--font);\n}\n.copy-btn:hover { color: var(--accent2); border-color: var(--accent3); }\n.copy-wrap:hover .copy-btn { opacity: 1; }\n@media (hover: none) { .copy-btn { opacity: 0.5; } }\n.msg-thinking {\nalign-self: flex-start;\ncolor: var(--muted);\nfont-style: italic;\nfont-size: 11px;\ndisplay: flex;\nalign-items: center;\ngap: 6px;\n}\n.dots span { animation: blink 1.2s infinite; display: inline-block; color: var(--accent); }\n.dots span:nth-child(2) { animation-delay: .2s; }\n.dots span:nth-child(3) { animation-delay: .4s; }\n.chat-welcome {\ndisplay: flex;\nflex-direction: column;\nalign-items: center;\njustify-content: center;\nflex: 1;\ngap: 12px;\npadding: 40px 20px;\ntext-align: center;\nmin-height: 200px;\n}\n.chat-welcome-sigil {\nfont-size: 36px;\ncolor: var(--accent3);\ntext-shadow: var(--glow-text);\nanimation: sigilPulse 3s ease-in-out infinite;\n}\n.chat-welcome-text {\nfont-size: 13px;\ncolor: var(--text2);\nline-height: 1.5;\n}\n.chat-welcome-hint {\nfont-size: 10px;\ncolor: var(--muted);\nletter-spacing: 0.8px;\ntext-transform: uppercase;\nopacity: 0.6;\n}\n.code-input-area {\npadding: 10px 14px;\npadding-bottom: calc(10px + var(--safe-bot));\nborder-top: 1px solid var(--border);\nbackground: var(--card);\nflex-shrink: 0;\n}\n.code-input-row {\ndisplay: flex;\ngap: 8px;\nalign-items: stretch;\n}\n#chat-input {\nflex: 1;\nbackground: var(--bg2);\nborder: 1px solid var(--border2);\nborder-radius: 8px;\ncolor: var(--accent);\npadding: 10px 14px;\nmin-height: 40px;\nmax-height: 120px;\nfont-family: var(--font);\nfont-size: 16px;\noutline: none;\ncaret-color: var(--accent);\n-webkit-appearance: none;\nappearance: none;\noverflow-y: auto;\nresize: none;\nline-height: 1.4;\n}\n#chat-input::placeholder { color: var(--muted); font-size: 13px; }\n#chat-input:focus { border-color: var(--accent3); box-shadow: var(--glow-md); }\n.btn-send {\nbackground: var(--accent-dim);\nborder: 1px solid var(--accent3);\nborder-radius: 8px;\ncolor: var(--accent);\nfont-family: var(--font);\nfont-size: 18px;\nfont-weight: 700;\ncursor: pointer;\npadding: 0 16px;\nmin-height: 40px;\nmin-width: 48px;\ntransition: all .15s;\ntext-shadow: var(--glow-text);\n}\n.btn-send:hover { background: var(--btn-hover); }\n.btn-send:disabled { opacity: 0.4; cursor: default; }\n.code-input-meta {\ndisplay: flex;\ngap: 6px;\nmargin-top: 6px;\n}\n.btn-icon {\nbackground: none;\nborder: 1px solid var(--border2);\nborder-radius: 6px;\ncolor: var(--text2);\nfont-size: 14px;\ncursor: pointer;\npadding: 4px 8px;\nmin-height: 28px;\nfont-family: var(--font);\ntransition: all .15s;\n}\n.btn-icon:hover { border-color: var(--accent3); color: var(--accent2); }\n.provider-dropdown { position: relative; flex-shrink: 0; }\n.provider-btn {\ndisplay: flex;\nalign-items: center;\ngap: 5px;\npadding: 8px 10px;\nmin-height: 40px;\nbackground: var(--card2);\nborder: 1px solid var(--border2);\nborder-radius: 8px;\ncolor: var(--text2);\nfont-family: var(--font);\nfont-size: 11px;\nfont-weight: 600;\ncursor: pointer;\nwhite-space: nowrap;\ntransition: border-color .15s;\n}\n.provider-btn:hover { border-color: var(--accent3); }\n.provider-dot { width: 7px; height: 7px; border-radius: 50%; flex-shrink: 0; }\n.provider-arrow { font-size: 10px; color: var(--muted); transition: transform .15s; }\n.provider-dropdown.open .provider-arrow { transform: rotate(180deg); }\n.provider-menu {\nposition: absolute;\nbottom: 100%;\nleft: 0;\nmargin-bottom: 4px;\nmin-width: 200px;\nbackground: var(--card);\nborder: 1px solid var(--border2);\nborder-radius: 8px;\noverflow: hidden;\nbox-shadow: 0 -4px 20px rgba(0,0,0,0.5);\ndisplay: none;\nz-index: 50;\n}\n.provider-dropdown.open .provider-menu { display: block; }\n.provider-menu button {\ndisplay: flex;\nalign-items: center;\ngap: 8px;\nwidth: 100%;\npadding: 10px 14px;\nmin-height: 40px;\nbackground: none;\nborder: none;\nborder-bottom: 1px solid var(--border);\ncolor: var(--text2);\nfont-family: var(--font);\nfont-size: 12px;\ncursor: pointer;\ntext-align: left;\n}\n.provider-menu button:last-child { border-bottom: none; }\n.provider-menu button:hover { background: var(--accent-dim); color: var(--accent); }\n.provider-menu .dot,\n.dot {\nwidth: 7px; height: 7px; border-radius: 50%; flex-shrink: 0;\n}\n.dot-auto { background: var(--accent); box-shadow: 0 0 4px var(--accent); }\n.dot-cloud { background: #ffb300; box-shadow: 0 0 4px #ffb300; }\n.dot-local { background: #00ffcc; box-shadow: 0 0 4px #00ffcc; }\n.dot-deepseek { background: #6c5ce7; box-shadow: 0 0 4px #6c5ce7; }\n.dot-pc { background: #ff006e; box-shadow: 0 0 4px #ff006e; }\n.dot-brain { background: #00d4ff; box-shadow: 0 0 6px #00d4ff; }\n.agent-badge {\ndisplay: inline-block;\nfont-size: 10px;\npadding: 1px 6px;\nborder-radius: 3px;\nmargin-left: 6px;\nfont-family: var(--font);\nletter-spacing: 0.5px;\ntext-transform: uppercase;\nopacity: 0.85;\n}\n.agent-badge[data-agent=\"vessel\"]     { color: var(--accent); border: 1px solid var(--accent3); }\n.agent-badge[data-agent=\"coder\"]      { color: #00e5ff; border: 1px solid #00e5ff44; }\n.agent-badge[data-agent=\"sysadmin\"]   { color: #ffab00; border: 1px solid #ffab0044; }\n.agent-badge[data-agent=\"researcher\"] { color: #aa00ff; border: 1px solid #aa00ff44; }\n.sys-header {\ndisplay: flex;\nalign-items: center;\njustify-content: space-between;\npadding: 6px 0 14px;\n}\n.sys-title {\nfont-size: 16px;\nfont-weight: 700;\ncolor: var(--accent);\nletter-spacing: 2px;\ntext-shadow: var(--glow-text);\n}\n.version-badge {\nfont-size: 10px;\nbackground: var(--accent-dim);\nborder: 1px solid var(--accent3);\nborder-radius: 4px;\npadding: 2px 8px;\ncolor: var(--accent2);\n}\n.sys-section {\nbackground: var(--card);\nborder: 1px solid var(--border2);\nborder-radius: 10px;\npadding: 14px 16px;\nmargin-bottom: 12px;\n}\n.sys-section-head {\ndisplay: flex;\nalign-items: center;\njustify-content: space-between;\nmargin-bottom: 10px;\n}\n.sys-section-title {\nfont-size: 10px;\ncolor: var(--muted);\ntext-transform: uppercase;\nletter-spacing: 1.5px;\nfont-weight: 700;\n}\n.sys-actions {\ndisplay: flex;\ngap: 8px;\npadding: 8px 0;\n}\n.session-list { display: flex; flex-direction: column; gap: 6px; }\n.session-item {\ndisplay: flex;\nalign-items: center;\njustify-content: space-between;\nbackground: var(--card2);\nborder: 1px solid var(--border);\nborder-radius: 6px;\npadding: 8px 12px;\n}\n.session-name {\nfont-size: 12px;\ndisplay: flex;\nalign-items: center;\ngap: 8px;\ncolor: var(--text);\n}\n.session-dot {\nwidth: 7px; height: 7px; border-radius: 50%;\nbackground: var(--accent); box-shadow: var(--glow-sm);\nanimation: pulse 2s infinite;\n}\n.sys-pi-grid { display: flex; flex-direction: column; gap: 4px; }\n.sys-pi-row { display: flex; justify-content: space-between; align-items: center; padding: 4px 0; border-bottom: 1px solid var(--border); font-size: 11px; }\n.sys-pi-row:last-child { border-bottom: none; }\n.sys-pi-label { color: var(--muted); }\n.sys-pi-value { color: var(--accent); font-weight: 600; text-shadow: var(--glow-text); }\n.prof-section {\nbackground: var(--card);\nborder: 1px solid var(--border2);\nborder-radius: 10px;\npadding: 14px 16px;\nmargin-bottom: 12px;\n}\n.prof-section-mem { padding: 14px 0 0; }\n.prof-section-mem .prof-section-title { padding: 0 16px; }\n.prof-section-title {\nfont-size: 10px;\ncolor: var(--muted);\ntext-transform: uppercase;\nletter-spacing: 1.5px;\nfont-weight: 700;\nmargin-bottom: 10px;\n}\n.prof-grid {\ndisplay: flex;\nflex-direction: column;\ngap: 6px;\n}\n.prof-item {\ndisplay: flex;\njustify-content: space-between;\nalign-items: center;\npadding: 6px 0;\nborder-bottom: 1px solid var(--border);\n}\n.prof-item:last-child { border-bottom: none; }\n.prof-label { font-size: 11px; color: var(--muted); }\n.prof-value { font-size: 12px; color: var(--accent); font-weight: 600; text-shadow: var(--glow-text); }\n.prof-providers { display: flex; flex-direction: column; gap: 6px; }\n.prof-prov {\ndisplay: flex;\nalign-items: center;\ngap: 10px;\npadding: 8px 0;\nborder-bottom: 1px solid var(--border);\n}\n.prof-prov:last-child { border-bottom: none; }\n.prof-prov-name { font-size: 12px; color: var(--text); font-weight: 600; }\n.prof-prov-info { font-size: 10px; color: var(--muted); margin-left: auto; }\n.prof-btns {\ndisplay: flex;\ngap: 6px;\nmargin-top: 8px;\n}\n.tab-row {\ndisplay: flex;\ngap: 4px;\npadding: 8px 16px;\nborder-bottom: 1px solid var(--border);\noverflow-x: auto;\nflex-shrink: 0;\n}\n.tab {\npadding: 5px 10px;\nborder-radius: 4px;\nfont-size: 10px;\ncursor: pointer;\nbackground: transparent;\ncolor: var(--muted);\nborder: 1px solid transparent;\nfont-family: var(--font);\nfont-weight: 600;\nmin-height: 28px;\nwhite-space: nowrap;\ntransition: all .15s;\n}\n.tab.active {\nbackground: var(--accent-dim);\ncolor: var(--accent);\nborder-color: var(--accent3);\n}\n.tab-content { display: none; }\n.tab-content.active { display: block; }\n.mem-panels { padding: 12px 16px; }\n.search-row {\ndisplay: flex;\ngap: 6px;\nmargin-bottom: 8px;\nflex-wrap: wrap;\n}\n.input-field {\nflex: 1;\nmin-width: 100px;\nbackground: var(--bg2);\nborder: 1px solid var(--border2);\nborder-radius: 6px;\ncolor: var(--accent);\npadding: 6px 10px;\nfont-family: var(--font);\nfont-size: 11px;\noutline: none;\nmin-height: 32px;\n}\n.input-field:focus { border-color: var(--accent3); }\n.input-date { color: var(--amber); min-width: 130px; }\n.theme-selector { display: flex; gap: 8px; flex-wrap: wrap; }\n.theme-chip {\ndisplay: flex; align-items: center; justify-content: center;\nwidth: 44px; height: 44px; padding: 0; border-radius: 8px;\nbackground: var(--bg2); border: 1px solid var(--border2);\ncursor: pointer; transition: all .15s; flex-shrink: 0;\n}\n.theme-chip:hover { border-color: var(--accent3); transform: scale(1.08); }\n.theme-chip.active { border-color: var(--accent); box-shadow: var(--glow-sm); transform: scale(1.05); }\n.theme-swatch { width: 20px; height: 20px; border-radius: 50%; flex-shrink: 0; }\n.anl-period-btns { display: flex; gap: 4px; }\n.anl-period-btn {\nbackground: transparent; border: 1px solid var(--border2);\ncolor: var(--muted); padding: 2px 8px; border-radius: 4px;\nfont-size: 10px; cursor: pointer; min-height: 22px; line-height: 1;\n}\n.anl-period-btn.active { border-color: var(--accent); color: var(--accent); }\n.anl-period-btn:hover:not(.active) { border-color: var(--border); color: var(--text2); }\n.anl-section-label {\nfont-size: 10px; color: var(--muted); letter-spacing: 1px;\nfont-weight: 700; margin-bottom: 8px; text-transform: uppercase;\n}\n.anl-bars { display: flex; flex-direction: column; gap: 5px; margin-bottom: 6px; }\n.anl-bar-row { display: flex; align-items: center; gap: 8px; }\n.anl-bar-label { width: 72px; font-size: 11px; flex-shrink: 0; }\n.anl-bar-track {\nflex: 1; height: 8px; background: var(--bg2);\nborder-radius: 4px; overflow: hidden; min-width: 40px;\n}\n.anl-bar-fill { height: 100%; border-radius: 4px; transition: width .3s ease; }\n.anl-bar-val { width: 48px; text-align: right; font-size: 11px; color: var(--text2); flex-shrink: 0; }\n.anl-total { font-size: 11px; color: var(--muted); text-align: right; }\n.anl-total span { color: var(--text2); }\n.anl-error-row { display: flex; flex-wrap: wrap; gap: 8px; margin-bottom: 4px; }\n.anl-error-badge {\ndisplay: flex; flex-direction: column; align-items: center;\nbackground: var(--bg2); border: 1px solid var(--border2);\nborder-radius: 6px; padding: 6px 10px; min-width: 56px;\n}\n.anl-error-badge.anl-error-bad { border-color: var(--red); }\n.anl-error-name { font-size: 10px; color: var(--muted); }\n.anl-error-pct { font-size: 15px; font-weight: 700; color: var(--text); }\n.anl-error-badge.anl-error-bad .anl-error-pct { color: var(--red); }\n.anl-error-detail { font-size: 9px; color: var(--muted); }\n.anl-failover-list { display: flex; flex-direction: column; gap: 4px; }\n.anl-failover-item {\ndisplay: flex; align-items: baseline; gap: 8px; flex-wrap: wrap;\nfont-size: 11px; padding: 4px 0; border-bottom: 1px solid var(--border);\n}\n.anl-fail-ts { color: var(--muted); flex-shrink: 0; font-size: 10px; }\n.anl-fail-route { color: var(--amber); font-weight: 600; }\n.anl-fail-reason { color: var(--text2); font-size: 10px; opacity: 0.8; }\n.anl-debug-actions { display: flex; flex-wrap: wrap; gap: 6px; margin-bottom: 6px; }\n.anl-debug-actions a { text-decoration: none; }\n#anl-debug-out .anl-total { margin-bottom: 4px; }\n.anl-heatmap-tip {\nposition: absolute; pointer-events: none;\nbackground: var(--card); border: 1px solid var(--border2);\npadding: 3px 7px; border-radius: 4px; font-size: 10px;\ncolor: var(--text); white-space: nowrap; z-index: 10;\nbox-shadow: 0 2px 8px rgba(0,0,0,0.4);\n}\n.drawer-overlay {\nposition: fixed;\ninset: 0;\nz-index: 150;\nbackground: rgba(0,0,0,0.6);\nopacity: 0;\npointer-events: none;\ntransition: opacity .2s;\n}\n.drawer-overlay.show { opacity: 1; pointer-events: auto; }\n.drawer {\nposition: fixed;\nbottom: 0; left: 0; right: 0;\nmax-height: 75vh;\nbackground: var(--card);\nborder-top: 2px solid var(--accent3);\nborder-radius: 14px 14px 0 0;\ntransform: translateY(100%);\ntransition: transform .3s ease;\ndisplay: flex;\nflex-direction: column;\nz-index: 160;\n}\n.drawer-overlay.show .drawer { transform: translateY(0); }\n.drawer-handle {\nwidth: 36px; height: 4px;\nbackground: var(--muted);\nborder-radius: 2px;\nmargin: 8px auto 0;\nflex-shrink: 0;\n}\n.drawer-header {\ndisplay: flex;\nalign-items: center;\njustify-content: space-between;\npadding: 8px 16px;\nborder-bottom: 1px solid var(--border);\nflex-shrink: 0;\n}\n.drawer-title {\nfont-weight: 600;\nfont-size: 12px;\ncolor: var(--accent2);\nletter-spacing: 0.8px;\n}\n.drawer-actions { display: flex; gap: 6px; align-items: center; }\n.drawer-body {\noverflow-y: auto;\nflex: 1;\nmin-height: 0;\n-webkit-overflow-scrolling: touch;\n}\n.drawer-widget { display: none; padding: 14px 16px; }\n.drawer-widget.active { display: block; }\nbutton {\nborder: none;\nborder-radius: 6px;\ncursor: pointer;\nfont-family: var(--font);\nfont-size: 11px;\nfont-weight: 600;\npadding: 6px 14px;\nletter-spacing: 0.5px;\ntransition: all .15s;\ntouch-action: manipulation;\nmin-height: 36px;\n}\n.btn-green {\nbackground: var(--accent-dim);\ncolor: var(--accent2);\nborder: 1px solid var(--accent3);\n}\n.btn-green:hover { background: var(--btn-hover); color: var(--accent); }\n.btn-red {\nbackground: var(--red-dim);\ncolor: var(--red);\nborder: 1px solid #5a1a1a;\n}\n.btn-red:hover { background: #5a1a1a; }\n.btn-ghost {\nbackground: transparent;\ncolor: var(--muted);\nborder: 1px solid var(--border);\n}\n.btn-ghost:hover { color: var(--accent2); border-color: var(--accent3); }\n.usage-period-btn.active { color: var(--accent); border-color: var(--accent); text-shadow: var(--glow-sm); }\n.btn-sm  { min-height: 28px; padding: 3px 10px; font-size: 10px; }\n.btn-xs  { min-height: 20px; padding: 1px 6px; font-size: 10px; line-height: 1.2; }\n.btn-danger-off {\nborder-color: var(--red) !important;\nbox-shadow: 0 0 6px rgba(255,50,50,0.3);\nfont-weight: 700;\nletter-spacing: 1px;\n}\n.btn-danger-off:hover { box-shadow: 0 0 12px rgba(255,50,50,0.5) !important; }\n.badge { font-size: 9px; font-weight: 700; letter-spacing: 0.5px; border-radius: 3px;\npadding: 1px 5px; white-space: nowrap; border: 1px solid; }\n.badge-red    { color: var(--red,#f04);   border-color: var(--red,#f04); }\n.badge-green  { color: var(--accent);     border-color: var(--accent); }\n.badge-amber  { color: var(--amber,#fa0); border-color: var(--amber,#fa0); }\n.badge-muted  { color: var(--muted);      border-color: var(--border); }\n.tracker-item { border: 1px solid var(--border); border-radius: 4px; padding: 8px 10px;\nmargin-bottom: 6px; transition: opacity .2s; }\n.tracker-item.tracker-closed { opacity: 0.45; }\n.tracker-item-head { display: flex; align-items: center; gap: 5px; flex-wrap: wrap; }\n.tracker-title { flex: 1; font-size: 11px; color: var(--text); min-width: 60px; }\n.tracker-item-actions { display: flex; gap: 4px; margin-left: auto; }\n.tracker-body-text { font-size: 10px; color: var(--muted); margin-top: 4px; white-space: pre-wrap; }\n.tracker-item-meta { font-size: 9px; color: var(--muted); margin-top: 4px; opacity: 0.6; }\n.mono-block {\nbackground: var(--bg2);\nborder: 1px solid var(--border);\nborder-radius: 6px;\npadding: 10px 12px;\nfont-family: var(--font);\nfont-size: 11px;\nline-height: 1.7;\ncolor: var(--text2);\nmax-height: 200px;\noverflow-y: auto;\nwhite-space: pre-wrap;\nword-break: break-word;\n-webkit-overflow-scrolling: touch;\n}\n.widget-placeholder {\ndisplay: flex;\nflex-direction: column;\nalign-items: center;\njustify-content: center;\ngap: 10px;\npadding: 24px 12px;\ncolor: var(--muted);\nfont-size: 11px;\ntext-align: center;\nmin-height: 60px;\n}\n.widget-placeholder .ph-icon { font-size: 24px; opacity: 0.5; }\n.no-items {\ncolor: var(--muted);\nfont-size: 11px;\ntext-align: center;\npadding: 16px;\n}\n.token-grid { display: grid; grid-template-columns: repeat(3, 1fr); gap: 7px; margin-bottom: 10px; }\n.token-item { background: var(--bg2); border: 1px solid var(--border); border-radius: 6px; padding: 10px; text-align: center; }\n.token-label { font-size: 9px; color: var(--muted); text-transform: uppercase; letter-spacing: 1px; margin-bottom: 3px; }\n.token-value { font-size: 15px; font-weight: 700; color: var(--amber); text-shadow: 0 0 6px rgba(255,176,0,0.3); }\n.cron-list { display: flex; flex-direction: column; gap: 6px; }\n.cron-item { background: var(--bg2); border: 1px solid var(--border); border-radius: 6px; padding: 8px 12px; display: flex; align-items: flex-start; gap: 10px; }\n.cron-schedule { font-size: 10px; color: var(--cyan); white-space: nowrap; min-width: 90px; padding-top: 1px; }\n.cron-cmd { font-size: 11px; color: var(--text2); overflow: hidden; text-overflow: ellipsis; white-space: nowrap; }\n.cron-desc { font-size: 10px; color: var(--muted); margin-top: 2px; }\n.job-line { font-size: 10px; color: var(--accent); margin-top: 2px; white-space: nowrap; overflow: hidden; text-overflow: ellipsis; }\n.job-line:empty, .job-runs:empty { display: none; }\n.job-runs { margin-top: 4px; border-left: 1px solid var(--border); padding-left: 6px; }\n.job-run { display: flex; gap: 8px; font-size: 10px; color: var(--muted); }\n.job-run-err { color: var(--red); overflow: hidden; text-overflow: ellipsis; white-space: nowrap; }\n.modal-overlay {\nposition: fixed; inset: 0;\nbackground: rgba(0,0,0,0.75);\ndisplay: flex; align-items: center; justify-content: center;\nz-index: 200;\nopacity: 0; pointer-events: none;\ntransition: opacity .2s;\n}\n.modal-overlay.show { opacity: 1; pointer-events: auto; }\n.modal-box {\nbackground: var(--card);\nborder: 1px solid var(--border2);\nborder-radius: 10px;\npadding: 24px;\nmax-width: 340px;\nwidth: 90%;\ntext-align: center;\nbox-shadow: var(--glow-md);\n}\n.modal-wide {\nmax-width: 90%;\nwidth: 900px;\nmax-height: 90vh;\ntext-align: left;\npadding: 16px;\n}\n.modal-wide-header {\ndisplay: flex;\njustify-content: space-between;\nalign-items: center;\nmargin-bottom: 8px;\nfont-size: 10px;\ncolor: var(--muted);\ntext-transform: uppercase;\nletter-spacing: 1px;\n}\n.modal-title { font-size: 14px; font-weight: 700; color: var(--accent); margin-bottom: 8px; text-shadow: var(--glow-text); }\n.modal-text { font-size: 12px; color: var(--text2); margin-bottom: 20px; line-height: 1.6; }\n.modal-btns { display: flex; gap: 10px; justify-content: center; }\n.help-modal-box {\nbackground: var(--card);\nborder: 1px solid var(--accent3);\nborder-radius: 10px;\nwidth: min(720px, 95vw);\nmax-height: 88vh;\ndisplay: flex;\nflex-direction: column;\nbox-shadow: var(--glow-md);\n}\n.help-modal-header { display: flex; justify-content: space-between; align-items: center; padding: 12px 16px; border-bottom: 1px solid var(--border2); font-size: 11px; font-weight: 700; letter-spacing: 1.5px; color: var(--accent); flex-shrink: 0; }\n.help-modal-body { overflow-y: auto; padding: 12px 16px 16px; display: flex; flex-direction: column; gap: 14px; }\n.help-section { border: 1px solid var(--border); border-radius: 8px; padding: 12px 14px; }\n.help-section-title { font-size: 9px; font-weight: 700; letter-spacing: 1.5px; color: var(--muted); margin-bottom: 8px; }\n.help-table { display: flex; flex-direction: column; gap: 5px; }\n.help-row { display: flex; align-items: baseline; gap: 8px; font-size: 11px; flex-wrap: wrap; }\n.help-badge { font-size: 9px; font-weight: 700; letter-spacing: 1px; border: 1px solid; border-radius: 3px; padding: 1px 5px; white-space: nowrap; flex-shrink: 0; }\n.help-label { color: var(--accent); font-weight: 700; white-space: nowrap; flex-shrink: 0; min-width: 80px; }\n.help-kw { color: var(--text2); font-size: 11px; flex: 1; }\n.help-mode { font-size: 9px; color: var(--muted); white-space: nowrap; flex-shrink: 0; margin-left: auto; }\n.help-mode.loop { color: #ffaa00; }\n.reboot-overlay { position: fixed; inset: 0; background: var(--bg); display: flex; flex-direction: column; align-items: center; justify-content: center; z-index: 300; opacity: 0; pointer-events: none; transition: opacity .3s; gap: 16px; }\n.reboot-overlay.show { opacity: 1; pointer-events: auto; }\n.reboot-spinner { width: 40px; height: 40px; border: 3px solid var(--border2); border-top-color: var(--accent); border-radius: 50%; animation: spin 1s linear infinite; }\n.reboot-text { font-size: 13px; color: var(--accent2); }\n.reboot-status { font-size: 11px; color: var(--muted); }\n#toast {\nposition: fixed;\nbottom: calc(70px + var(--safe-bot));\nright: 16px;\nbackground: var(--card);\nborder: 1px solid var(--accent3);\nborder-radius: 6px;\npadding: 10px 16px;\nfont-size: 12px;\ncolor: var(--accent2);\nbox-shadow: var(--glow-md);\nopacity: 0;\ntransform: translateY(8px);\ntransition: all .25s;\npointer-events: none;\nz-index: 999;\n}\n#toast.show { opacity: 1; transform: translateY(0); }\n::-webkit-scrollbar { width: 3px; height: 3px; }\n::-webkit-scrollbar-track { background: var(--bg2); }\n::-webkit-scrollbar-thumb { background: var(--border2); border-radius: 2px; }\n.prompt-select {\nfont-family: var(--font);\nfont-size: 11px;\nbackground: var(--bg2);\ncolor: var(--muted);\nborder: 1px solid var(--border);\nborder-radius: 4px;\npadding: 2px 6px;\nmax-width: 140px;\ncursor: pointer;\n}\n.prompt-select:focus { border-color: var(--accent3); color: var(--accent); outline: none; }\n.prompt-select option { background: var(--bg2); color: var(--text); }\n.sigil-indicator {\ndisplay: flex;\nalign-items: center;\ngap: 5px;\nmargin-left: 8px;\nfont-size: 9px;\nletter-spacing: 0.8px;\ncolor: var(--muted);\ncursor: pointer;\n}\n.sigil-indicator[data-state=\"HAPPY\"] .sigil-label,\n.sigil-indicator[data-state=\"PROUD\"] .sigil-label { color: var(--accent); }\n.sigil-indicator[data-state=\"THINKING\"] .sigil-label,\n.sigil-indicator[data-state=\"WORKING\"] .sigil-label { color: var(--cyan); }\n.sigil-indicator[data-state=\"CURIOUS\"] .sigil-label { color: var(--amber); }\n.sigil-indicator[data-state=\"ALERT\"] .sigil-label { color: var(--amber); }\n.sigil-indicator[data-state=\"ERROR\"] .sigil-label { color: var(--red); }\n.mem-on  { color: var(--accent) !important; border-color: var(--accent) !important; text-shadow: var(--glow-sm); }\n.mem-off { color: var(--muted) !important;  border-color: var(--border) !important; }\n.help-tip {\ndisplay: inline-block;\nfont-size: 9px;\ncolor: var(--muted);\nborder: 1px solid var(--border);\nborder-radius: 50%;\nwidth: 14px; height: 14px;\ntext-align: center;\nline-height: 14px;\ncursor: help;\nvertical-align: middle;\nmargin-left: 4px;\n}\n.help-tip:hover { color: var(--accent); border-color: var(--accent); }\n@keyframes pulse { 0%, 100% { opacity: 1 } 50% { opacity: .4 } }\n@keyframes blink { 0%, 80%, 100% { opacity: .2 } 40% { opacity: 1 } }\n@keyframes spin { to { transform: rotate(360deg); } }\n@media (max-width: 374px) {\n.stat-card { flex: 1 1 100%; }\n.widget-card { flex: 1 1 100%; }\n.drawer-title { font-size: 11px; }\n.prof-section { padding: 10px 8px; }\n}\n@media (max-width: 767px) {\nbutton { min-height: 44px; }\n.btn-sm { min-height: 32px; }\n.btn-send { min-height: 44px; }\n.mono-block { max-height: 150px; }\n.provider-menu {\nbottom: 100%;\ntop: auto;\nmax-height: 50vh;\noverflow-y: auto;\n}\n}\n@media (orientation: landscape) and (max-height: 500px) {\n.drawer { max-height: 90vh; }\n.bottom-nav { padding-bottom: 0; }\n.app-header { padding-top: 0; }\n}\n@media (min-width: 768px) {\n:root { --safe-bot: 0px; }\nbody { font-size: 14px; }\n.app-layout { flex-direction: row; }\n.app-content { flex: 1; min-width: 0; }\n.bottom-nav {\nflex-direction: column;\nwidth: 70px;\norder: -1;\nborder-top: none;\nborder-right: 1px solid var(--border2);\npadding: 12px 0;\ngap: 4px;\n}\n.nav-item {\npadding: 14px 0;\nfont-size: 8px;\nmin-height: auto;\n}\n.nav-item .nav-icon { font-size: 22px; }\n.tab-scroll {\npadding: 24px 32px;\nmax-width: 1200px;\nmargin: 0 auto;\n}\n.app-header { padding: 8px 32px 12px; }\n.dash-stats { gap: 14px; }\n.stat-card { flex: 1 1 calc(25% - 12px); }\n.stat-value { font-size: 26px; }\n#tab-dashboard .tab-scroll {\ndisplay: grid;\ngrid-template-columns: 1fr 1fr;\ngap: 14px;\nalign-content: start;\n}\n.dash-stats { grid-column: 1 / -1; }\n.sigil-widget { grid-column: 1; margin-bottom: 0; }\n.dash-right-col { grid-column: 2; display: flex; flex-direction: column; gap: 14px; }\n.dash-right-col .dash-chart { margin-bottom: 0; }\n.dash-right-col .dash-widgets { flex-direction: column; gap: 10px; }\n.dash-right-col .widget-card { flex: none; width: 100%; }\n#pi-chart { height: 100px; }\n.dash-chart { margin-bottom: 14px; }\n.code-input-area { padding-bottom: 10px; }\n#chat-input { font-size: 13px; }\n.msg { max-width: 75%; }\n.mono-block { max-height: 300px; }\n#tab-profile .tab-scroll {\ndisplay: grid;\ngrid-template-columns: 1fr 1fr;\ngap: 14px;\nalign-content: start;\n}\n.prof-section-mem { grid-column: 1 / -1; }\n.prof-section:last-child { grid-column: 1 / -1; }\n.drawer {\nmax-width: none;\nmargin: 0;\ntop: 0;\nright: 0;\nbottom: 0;\nleft: auto;\nwidth: 420px;\nmax-height: none;\nheight: 100%;\nborder-top: none;\nborder-left: 2px solid var(--accent3);\nborder-radius: 0;\ntransform: translateX(100%);\n}\n.drawer-overlay.show .drawer {\ntransform: translateX(0);\n}\n.drawer-handle { display: none; }\n.drawer-overlay {\nbackground: rgba(0,0,0,0.35);\n}\n.modal-box { max-width: 420px; }\n.app-content { transition: margin-right 0.3s ease; }\nbody.drawer-open .app-content { margin-right: 420px; }\nbutton { min-height: 36px; }\n.btn-sm { min-height: 28px; }\n.btn-send { min-height: 40px; }\n#toast {\nbottom: 24px;\nright: 24px;\n}\n::-webkit-scrollbar { width: 5px; height: 5px; }\n}\n@media (min-width: 1400px) {\n.tab-scroll {\nmax-width: none;\npadding: 24px 48px;\n}\n.app-header { padding: 8px 48px 12px; }\n.bottom-nav { width: 80px; }\n.nav-item .nav-icon { font-size: 24px; }\n.nav-item { font-size: 9px; padding: 16px 0; }\n#tab-dashboard .tab-scroll {\ngrid-template-columns: 3fr 2fr;\ngap: 18px;\n}\n#pi-chart { height: 140px; }\n.stat-value { font-size: 28px; }\n.stat-card { padding: 14px 18px; }\n.cron-cmd { white-space: normal; word-break: break-word; }\n.drawer { width: 480px; }\nbody.drawer-open .app-content { margin-right: 480px; }\n.sys-section { padding: 18px 20px; }\n.prof-section { padding: 18px 20px; }\n#tab-system .tab-scroll {\ngrid-template-columns: 1fr 1fr;\ngap: 18px;\n}\n#tab-profile .tab-scroll {\ngap: 18px;\n}\n}",
+"gz": "H4sIAAAAAAACA809a3PjuJHf/StwO7W19sX0URQl03blKrlc7pJ7ZLfmkrqkrvIBEiGLGUlUkZQf2Zr/fmi8iMaDpOyZZMf7GJNAowE0+o3mfVPXHfnxIklWj/fkQ5qlizR7EL9m8Hsxy9ICfl/TpoQHdEZTqh+IJpssSzeiS92UrOGPZsusmC37R9BsxuZ0xuAZXa/ZoYOe6WaTz/pHAlpalvOifzYXzyjNaP8sKau9eJzRVEB83NXPScufpfwnP76Q5nFFL9PrbLG4Xi6u05v8yjTbl7JZEWg2v7oW77I08HKW9UA69tJJMMtAy4UCMwuhIqHQ/Uqs1GazStMUnjSsFL/P+R/1u5rnnKaF2oNXelDrtl7DA4nHh3XBHxT6ASzjLV0Vt2LJ9qdOQJ6Xy9W8FHvSHZJt/STGT9M8z8R+b2rYk+/+g3X/0tDq0JL/rg/1d9fku3+rGkp+VZeM/7Lnz9ojXYtVb+mGJV19vCfs8HQpfqMNownvzDp4wVfh+HJlmq7qLtyUv+jqvW79+eL/StrRpNuyPfv5N2KlvvmzRaKLdC6XTJHoJqVpbpHojM7SnmahSZbNlpJoDYlmLEtnKSbROcvYrEAk2u9PT6JleVfYz4BEKb3N7Wdq6zI4LWmcRIEqZrfL63SERu12PpHab0eo1G7qk6n91qXTQs1Z0SBQYJ5bNLjZML4PNg2uirtimdo0uFwtFvPUpUGgQIDtbDwMhPY95fu+sPY957wotVlTMcuzFLGm9Wyd4X2fpVkh+YvFmoo5zX3WJI8YZk2U+qypKIKsSR6rIdaUpfkk3iTbxZiTfDuJO8mmMfYk3+J9z3NKNxuH9xSFzXv4+dugfV/yJaEF4j3polgUPu+Zz4GEnH3njM857ql93PnZzp3jbtijOe7pOl07x32Wz3L3uM+YI5F69msf96zICve4467muGtU4sd9MYN/xo+7bhc+7vrthOOum4aPu37rH3d5urVYWvA/I2Jps1kuEWmAUMJiCYQSFksglHyxlOdy0x3SaKvHaucQh1JPFE+g6XKGiIO/xjxhVqQuT8gWMz6gQxyLGVtgWbDK81KehZ447jj6zJEFS5qVdz5xgN4kBw4TB0fs+vZWnMRh6kANffJAr0foA7X1CQS9xhQCzF4uhqYQOJeYQvhxSGc2hRTFcik7KQphaekwj7vitlgh5rGgc/7MpRAuWdO88CjkcVu3HaKQDH4QhVj6K2yL+IMohMKPQyHw41DIHPMKMR34wRSyEn8whRTiT4BC9MAR9pHl1/pf2PkBBoJaZj4LQe/TYpiJoMa5z0bQ+9kC0Qmld3fLZU8noDUYzuKxTUUnd3erFVJwyxR+bDrpl9DQyULzKEwnmTh1ny/+kfxIVvVL0lZ/rQ6cNORO8g19eSB72jxWfOT0gRxpWYr3/O/JM1t9qrguS4/Jtnrc7vi/XbKudzUH3TX0wHXhhu/fA/l8se32u2sOtHzlxLdl0PKecGH17cMFoNKum3q3S1ZsS58q6H6oD8Aj1AjQZCM2XbQTCHT1ab2VveHVPdlWZckODxfHuq26qub4bqoXxpnnc1V2Wz3a5wuFxIquPz029enAV+eJNpdwBPjeKPTlE1hO/gyU/2RD99XuVb+BR/oNXzLGwc+PLxr8/T3ddKzho6x5A0H9330XwEwo+LCW/FXFGzYJe+KtWz1/G8eGHRnt+NQTPn9Gm+SxoWXFW1+mJXu8thccTAX8IIMHSpkRPzdpfhV5mgs746/c+ijZyz25439gXjf0eEx29LU+gUFcVu2R/8JnsmN82vBfTq4NW8v58VU87fleWDtdPgV3SwFW68QhAyje4WHqEPuKk7MaJo2M0NFV8lSxZxtxucIxqAaLc8DfUA7lifnLo9pI6rXnaAibN6WnrraevPRDTDgG/bkUrMc8kBboLLUfSYOSP80kxd7IB8mBPvmo+8cEBAEnEMUgJHzO7Np6V5X6JEkxcOWPKd9rg/dKbUC7barDJ7HAHB2OR1J1bP8GYqCcBx1EZ36GQHaw5uHikXIUM2sF5IJIiYBnqI6dEmzyN8QRBDudyhLuAPz61LTQX53whwtxLiuDd90QLhVaj9J2rAOGAP4EubE3C7VdZn3k3/jRgZXqh80EAQCXMPBmeFjga3zRaVk/k5usRVB7IkYTl6L4Ci+Xy4m4RiR4keApdr+EP+GCUfl5QEbepMsrkn6L2RSwaEFaLwq7eyJYJEhnsWEOLgG07TWxpqmnYaT4lWE9W0ZLwasdGovTUoFoCTQBIe7xKRMHY01360to8DOb8vmrqzDp7+rHWmOvxFa2BKh6I+Vv6uzBsp84cgshRld/4ach2VQdkNUTIKvp2D2eStUCFKpdBy3Kpj6qlbrUqhJuK9erpO026apuxzTJPSvEbsEgCVOMS8niKNqSU8xpfLPE4MK/xneLaNZADFpsf/SoFvQsR05n3mhRH1BuDbze1etP+KBJUMEBp8N3V2cGMJ+3nO7kXIENPTf02GPyzPWAraBYG5eZh4tQBq8iwHxBJlDuHzMuYI5tBYyJviRah8pSLTO4Ftm+tskjZwCONoWZaFg2XHlEvPTwR7zWJhVz9IApLINMNs6fbT5IuTT2mW8mzjc80UdQPJjCHv5yartq85oYtU+/CJx1ewXvhUJ+7Twc48RyAQMv5/aBYd6pCC2s2NcaiLB7FcIG9l2p/UQrCpxV7rptUoqYiFGrbf4kfwvxJ1+R0Gh4OwIbEliwfvSbx4axA1gsHlC9OsQWIhY7afdXgmVYwF45qXNBGIQmjzMC5vBH1QKD5NZbEF4DEx6AJt/TQ7Wncj2Op13LyKzlcnBTHTi1OSOBNQfbO6RkaCq/thCSi+yBknTIURf9N3XDVbaWCzF2OQNmBWMLL5MSmlwXPDzRtieGHBPDEp2bFXDQwFk1QLnFUa1pVzehGZlWfKhH1gUtOKSaDqmlDoEiyX2vpLlAXp6BXmWWurWx4xq2o3BGbX76VLXVasc8jO/vV4yvKItbhXTFseWHgm8fKA/cxN6xjdAGSWP0QsOlXN3VVcbuPLvwWnvfrrW7znpitbvycI8qSR7DE2KGG/LdM2MxhdxdVC1T0IhIy7CZVFTtMC5IT6RK1dmTyUXUuegi03a0O7UhbIKMdbImuUAzrw9CaUfsFaiQ6D1fTmeulpR48RQRp4lBt5IIqINq8NrXdSnlCLEkRG6xA8kHElAtOOqh84GcMLQ9gq7aAJO7J/MsJf9EZrdpWCfwNRV7tsbJHSSqMS7iMTCJH3ZQuQyMM+dHxln1gaMq6OtYvcA8hUfHfbdueO+E8cFae3T6iSU7umI7tFw9A8A2umQDYqctxiz+CuP+8TJZCMPJsz1DxDl0Oizop+ORNWvasphzypJSYlI/CFE1bwnjnTgvT8BTZMQWn/svPrHXTUP3rLU7/HjBrUBY6AB1LdynBTztqa7e7+mhbH23jjhcgnqEHgF0eU+k4uvQSWHrswIqn6nleuA/0jFj6YN5rhVErDIaATLXeul0NwHiass0jRgGwR21z4Ptdz1bB89HHRa9xjxAL95yYvW2f/wuBTdmMIKG56OgSOZdI8a4LDjqJyAkMSjZ6gTegcfHHfMJ15Ongn45O/EIN0eiA0EVUxexHn56XDuGILoFKMQWauKBbWBZXF5MsKmfh85b5HhZAKrD8YQcvdPc67Nj0Bu5eswiXvs3GaDYqyONolMHUlFPNTCZ+029Bu2AYPLRoU4S6nLPl2/NtvVOqFUkdK4JIuKWEwFfNWs750uXDc0910o+YdWM3uSvmInWBo319xrd3vwMQ0Cmk44N9+tIhdu39dXRng57paqjvfomNbGW7TaWaT5JpXuvE8WY4xyVNhJAscWUmInEJ2iDwPw4KGHyIGklXI4gOBPQLq+Q4Eof/iZG07B9ZAVOzAx+CrYR5vYhgwiw9d3tcj+CRBNj2QBIa3/TyG9A2kb0OWfspT32E92dHNsqywZtK0dOjjhrcezhJutHbk8rPO5d1G2pJiC2O7OxXwmPo/0a+6AGeZ5DxFnYwrCGSjaViNlhm2DQ4PJHsPmfOIvgfxGKsrGMBNS4z8pDqf8N0gKC3iZ4EXA3xfLsSHwI4eU6y0MWS+I07vr1ljZ/Vy8OR0Tg8FV9GwUa6eudeTwMe5TKQkg6mqgvavvPMLlDCLXJvow8epJhy2vO6I8nTkIxvwYJ+DXe4d+FAWVE6N0j9h5euWTCITrGxWLWNuRYsD1ytffOCynSpL35+eLDsTKnJOieWKYh/6oJEwkPx5m6Bu9sPCM/PcVi0DS1lW+Ial9bJCKj3JP1EmsJfvqaSU9JeD3UcxPgtycl87/U1K7xO6mD9/Pu/S8y2OrBCfYHzj5sTIfP776UDON5/Tfhy3yYaUxZpSy+SRXzfTty5IAuGY+Cyi7rLXtqvF5FlPVabGYZIQ8RGbITUdzMkdCeEwuZ8P5jbMNqpEVZan4qOW9aYNtRM/OzDDJDVDq7ClIdTaqVAL3e0T0Itv4xEG3dVILqOMyu4kxRsGpI71rXJZueYWZ1Mik3BFO6EDn8fcJFsyDRiVlQseQ1PiSXJ12yZ21LH1k7nInWM+BMZbhMTsOysmQCLHdCOpuH+I1AHCV/WNFhWKh9+yisApOrUCy+dTO+lDsEi5vCz5aC6LeX5yHHSE6t4Em2J6H30Y14CIecjkNpOmrolQgMeSNzLb3pYgI4m+IJG08bOTYsMVko+zI5kp8R8f9rYv8K1Hpt/qbbgBfSstYK5VTkr7au60sakOpttY7k6WZXWnmb7t6bI8emMFCw51Pr0Br5tw9NBj2LhfYs2nnVLiLE5W0LnBoqjihxt+ghtJjWnORlgB09PP45pNfQrmsuTRM+D0e1JCF/hqMFhz2Zw8GCdX18VbFDEmAYRDeRuQ4BzYsIuhI72gz6ANSJOHsH5zGxTFw2QVwdlfjZSpbGRmIi+YGYDOwM++w1tQQdrdZSmVyOsB5DBtUzYm+LFvn9Jjg64S/2rKwouVTXCkDwXfFGwQ6QWkQ+K46ddFvOwvnqDPC1gdSl7nXH173qeNd1IFow2XTVzjFuNLbKELaTcFb8MH4CP5adhhMOmpMgiyc27PtDB96PaldeZlf2QEnJBEBQ2GM95uEeeavtU1A0d+t6z6arC+dnsgmNwfImGBKH/B8icwTFkRegLSXcDj2lae+IMFjLYADWAOfLiDY+H/dEnh2kxtgAFEcdnU9VRxc+OE7s3WT3j+85KEbi9FjZ18qjiDeJC+XAPAP6kJujLwx98f5nbr7+pLz/qwFnQCCtz0LSiS1aXisxdUSobdewDnRFrdV6ccVhF/AZDokiQn9XYf3SpvJcRXBeesLI0smZAdIcdAKQfCVZl4TR0ao15URBOY2sTS//ia/xN0wOK9/71hVa6UkRTPfgEAwiHDd1RdGAp8CESKW/c0T9Hle0p2/8tP0rIkEV149lX99ZRmjIyj8p3JiCk5YxmEav18voB4Fzoq8I4hW+5yeTrnYitxWn6ugJlWxDT7uut1zlud6zjg4Fa23rYGkl5CgHybnJ5dmU7HLNtf1IXnRzwBFZhFN/3hj6hgn2+zB4CiJaHAd0bOqnCnrCLQ6+74eIGh0wmk1XqVqfl7foWzQBsn2rVTqJDaM9nJZB4vvivP0Ohvrjnma9n/ZaTtxTtHlg3OtYxa0dq7iNxSqGNpQ2QpgSV9eI2Gf25TCtWyg7JERhN/WRHYg/mqWXNHVHO6auhDlz3bPDaSzxUUQ6tCc9GEm3M5vSAWJ7M60FMk9RlDPJlbaLL9Eu7JRaya+MLbdIMa3EFlSukGeAe4u4OvEFOZx9eQ2Fk6bpMGPXJM2FcbV/Z/maph3gLBwDsgwNoBe8wNYq3e9o20k7qj+ZGl8xidj6DohKW8GIG38YKFh218K+6yN7bzrxOrIK6tv02zA6PB+0UeGe28m9vAKFnqCqVBCMeakAcEqlOxeAqhgUBqBfKgAlY8eWsU8ujOV6sWa3ERj6pYJxXPtTSNMli05BvlS9V1Djy59CmW82PoClnIJ8CXdKH4EgVrR8RDY4zq33TMD+EGovUcgFheLEIxnGkQvE0+zHQlqv1lyk71A8+Pk3T6xtGdSagT8/Ruh+VN0mAyOA9tioAfoR+DqzhdwEL1VRvsrzQbDta0tLztwE5B7sZkNXkr49sPLVCFhuOXHrar2VtdgMWEqBtINg5SsFFm78nXUNeSwEitJYUytlkA8UulizPCf5K3ifd9zugDIf4LPSJ8M7Al/aesu9u6LFQFhXrU4rvWN/p8SkzNonhYkgjC9EFtGLV9Zw0XtXXygv0acyhcBwUm/hWRyqJ+dEgPauEtnuTgA14vIkxvQkFghVc+JLLPQ7YnHjsSNDJArvA92z0MX081TCSORID3K+snLxtuStC+/2q+1218RyrJLHpirP3PFc77iEIG0WB8DI1pLQMhLkIjByZFQZ9sN+CLlpCqtqr9JYojcJVDOV+hsR2Z51TIb5utJtNz8RtmmjwlXtPThCUPe0N5NxQ/xE8UDiuuW8rn97Zhlj4QIteSTOytJY2v3DHPBN+VZYA5luHtqoTDbYNob6vQMVOw6ilz4MfhD3y54Obf61b5RQBsg5hr5zfIq37QOMesY+QHMlkEZWVS2Rv6YIFGf89WQvlp9Fa4CtuuHrQm5+ii7ZFY9I5b5gts220QX2sjlCsTGOgh20WxhHa0jV9ZmQ6yqJXhQNXyv1GDbqM+KzQT5W32E+6mRFvnK+Dn1dqnckWQ0US5HJeKoKHcH+O4LfB/L1ev8clyYyX69F0ifTBCI1TjAWB4grepXSy93m0GSMZVOxXWmHPy336CzmHn1jQHQ5ISDaX6A8wzvvhDr9u414uhMDiKYTN9l93Uel99vLNU/VRom6qZCTwtkzlCVxubdRn4m7MX1vzjeP3jaH1cho0oV98dwo3jm+q5t6WngxsOlkfNO9TKbg8Qz5JPuJTwyEBMrNQNlVvIj9sYsDG7kYEhpnYY/TPtNuve0DMSJYT/qclTNCMfSwS7h+V9Wlkj5B4tEmCW7tcDlUTHXCxoWEo+cIIVNkiJ/Ohlh55qcqSr8hms3EjYt6zzE0dXnhUHeXCvBVBLIxs0IxBw1Yq/KxawBhVSN4AcvT1kmAhY/kQgJKK3q2prjo80nRlU/Sgwybu0E+1LM1q7tWsbUPIAsl0MYOAgDgc5YV9HTlPk0zkhqnXdgU58ULzNncO9cmkR5XXuAk6AJniPhJ4JamyhRD83ii1jLk/Z6qGJTIQH0YsUQ0EUaWq6s7Ot2cCYyO4KiMxqFTwJqmjlCIJ9l66ghEZTFALwoyTMpBY+btAiygtRBfP7FpZ7G0aMeaAv49wm4abVv2jQOWUDpklfY9j+vO6bgw5w2xmEj6/PAEvIHGJlKyjlYORd6NzWTDu8BRfYtz1qYlAyfon8BUs+KnFQTSkG7m6Z1v9d9dWAgmcNUykgXnHHKPHGwwnNLjSmrQWu67clZVR0+6N6pbV0kAkoVkjC9+GjNYjkgfDJRCogiwrJKt60a5erWd9aFvD6m5iBsOsJsto92eHpOuOkauCIxXWLe9lRO4C6r2dBtRqMiwZ1Cd15Ax3Of/z1I38USpcDjtRBerbegzRwLOC983tBhe1fl+iIVzgxdBXjq3TMNLOXT3FCN1026FoLEvEbgwjftGdg3NQ9NB+MatnXN7u4Di85NKmWdTo4vSHa2dysG6bH+6VAWtI+lVWrmY6rDtt2uZRpfVLBgJo5ReWcuabOmhFB5su6YQGamkgR1EuNKFvtME5CnSUtKgY0sP/1WC3uc74+IYBotdC5/WSCFoE1iO5PH3Q0SZbc9bg1p6D0HdmvUzumM3QSdcweyh64KrrlMsEJkhbq8hV5nJXQsmkr211NSEjE+vdHs8WSacYw0rpLbtnkulQ3U87YQcc1xWdi6zKln8Bu9lNvWOqBlmYmp31OCGRqKE8UWwhHEI1SbiMv6wUJ/t6cEGsdPt9PCqfN27Xda+wmagv/uC3AluUQf9HEMJURHvx1D1QJOEvyeqoh9yphOkikjlLqRjAoiX1gORIhA6/8yH4FV10jBLengEMbTZRKo+AHGQf6j2x7rpqCxM+RKvjr9I4R/5CSc/ABorfYMRsfyOeCThiPeGWiD0xLyk5erZO74BFmYdwRukaJFFq6Dm51Fxj5E4ln7OHX96/WGTQn0lErNNdQMDSnKkKLWSCCjEKAQgWR0qaLPwQWkaI327gQEmjjKJmVJRrIyvD1y54Ggy5uLZl32xW9263BAwcGJKr4uG+WW9q1vvAs3Ca6+yvqZ76xbRIISCqnMajPdt3EGFoyJLExSx8RxWXnLLMHTCshoK6C7qnuV5Yd7+zne4UoGHqryFNM2D4Y2B7laKOF99qGU2b7xSwDuzvWQ+fnZmDM1h07fR8nov7l1cX3+M1IB45lgnq4ZRri2L/yXwZKpaqYrFoOuDX+eucigPIsvNoo5+FGM25SLz0imcZc/r5rhVl9iI+4Em90b8xQ2nJzGxKZ/riGLWE49WPrv6Ezt42XLw+4P4ryiTBrZhIhe51d+au5xfk9kGGKRYx9uAk8eoFnIQzXC/YN0Mgk4D9nVbhpAcP5AF9JaaFMHojjv1OZp5KJNoisNWO/amfS9IF2Zo3pfwKvp/1b0yeaqDAsyq8kD6o2owbNdbVp524w50VecyqEtZAuzOVnTNBfZ+vPW+HA25aGeqH4GKFZoKo6XHLFm7fpPg05W5/1KvRLGqUSBGbfOgBBE8Y4IWFveclXSv10Q8aE6cl4gHwYQa3cSpDpRbyrNUGaIkqLeyvw5jwR1M1pgaj1GwIAgSDpJ8ATrY1yXdDfhrSe+vjXpobxfeV0fOzDDpq82AkWVXqDnf24tmdJazV/bkNtvXTCSW30e0KoXNZcjYsIlvw6J1pGKhxJ0DYbgOmYBn/u7Vg7hLwTftX2L0BXk/wNcvjfjVKtTKSRhjxP3ywJi4dJiYn1gxmIyrBveNjSzK6J2BspAnZGnTbjzVR7Ka2AmU3/XaHZN3nYF4uMImcS4UL28z8ZXgu8XTs2MNFAVQ5ESFfORQWDPSNPtlL1xYiZWTnP1Z6NbFuFNH5uPH8sL9JA60k+CcJ55xFZiDmsg5Ot1MR0HFiOYaxtn6G/Yj9iUfXdCho3v39jV0VBt0nvXIHdQceUs+lAYwnvgUzBoIpjY53hUB/+2+wllPt8jdN1i7cNh5GCPG4P2g8NUGgeok4JZ2XaT2kn96npKGYJZV1xbWx4ZNNeKmYRl0QJmxbnZ1fcSXgalKrWjYqq67XjkjceWMhD8oT96R+hSXFUZbExfvR7W1sJty3moeolVnPN2zNDfVtT1Wh4Pg8nY2HkGlJAzBz6Mcuo/IJ4OhFJSDa9d642jAVzNldW388UyFaUALmEdYvMqT01NUH5OZfNfoQ1dTEcuKZjCIimu3sYprjf01zS+nEYR8jUtX9xsKbA+Jfq8ouZeHUIga8l6ANVu0sQQTQ/R3d3eyfjKsa4hKhzIf7u+1l1I6J8XXRDS1zm1iVR6eQAedyhr1nkR6bU/7VbiXS/l2ToW6xMQNaXUTQacjfMFvZk0OoI7esV86xtUsj36JEU1q4l2OMDvA90b8BauPWi2KbFgki9L/Lu15JbKQ5CkC5XJj2SHBzZnw5VxZlQJYFPv5N7/55Q8//OmbPxPVSGgA18Ndfvj4/R/+1ekSVRpGhv/9b377u//87e/+/TwM/vf7j4FOLg7K5TeCwa/+8PG33//hf8bm03/gYwjYL//r1x9//2VA/frjx+8/joAySbhwoayOxmlR3HogXIvajeUaiCEhmh8SaQjSUCzWDalLZR5fhopWxYl/UeVcFrWw/C8zdIFKpv6EXD3YwEdlAWEWDxe6+L/uuK/KEr75jA58bj6bLic+lHAylh6CPp8q6yL8SNJvr4n76dQZ+Uyc76be5KLgsgVAVjSWAIoQlJuMd8l9yPgrrkdRJUnUnvIrv82XuvKbVSHa9rrd8vW54sRgf8iO9N+bkfc03A/ShBrgVL1gUQVcpAAHlbS1GcTydnkrsdTZaih3Js+t1Jp277ydZ/ZbUaI03NuOJRNULHaR9hNAtfNwnTzhOVffqbW6L4Rv0Q/r2nOVn7NQevMOPqe7pkd2xbXpUi5EDyxV+2UyTD0/ppiswCw50Kd+oRMrVxcyto/H3h2EAjKpsxG9fXm7LOTw900tSiX2SjLvJldJuVo8r6IaknMcyCn/0TPCmvrZNOrvABvDFH3oyJ1i1DOm8ZahdcmzkhnONsYZj2rPxzPOhXsmtS+iQ/iYPukLEk7RC8RYvQKmmiR6APJvfthakzNchZZarT2WCKzPM1f9y9LUzgtO+/FCVCBDh/PMxA+d72Y6Tq8w5xDmVLaAL1UBEOvLdoEwbaaMX/E1FhhqVQM8PEkcNr+IhM1nmwb+1XkHeV+zuvdtypr23qwAoIQDU/gnIBTifKvca+Z5zdJ+uQQtQVO3V/ZG96IDFX3DbxIezkfJRoZNI8OGZIHU+e2SlgR9PM2++WeDjWBvpuxVT/e4mUYTFSAPFb2WX6chtlxZfDvM+ucaWUGYIL8q+LTz1ybLQAmdGHHaTXGJkFgPc5fDWgh10998CkV/Re2iv8rR09WF/YU87WHKvJiahOl8sTPGdiXIyfc+Ig6NP+q7HmPXMiK9U9RVX8sIhM29+z3RoPB8YQcmRUDJpkC5br7Ys10y6miIreCmqXUbFkStwUXUrsVQ7J7WWEEtar4c0qKyYkSLMudEudlMrE5QemN96fxixP2zsK2DhacVWhUicqMMoQPp0TWWjrm++REXfXlhiz6kS7mO9lF5nbsNfac6ijJLxj0oCCMsZs5ZTNazGDXNIA/W2xUXyEVAuDt3TQo/b8eJBDR7uuNCIZyoaPOi/iK3pUSeQdlmO1D1SAvhQn8SZdAOsVuJHeDgxN5OWX6Hw+vljwsO1O7z/wM7lmq95qQAAA=="
+},
+"app.bdd0be2f4f.js": {
+"type": "application/javascript",
+"etag": "\"bdd0be2f4fcae25a\"",
+"raw": "const _CHUNKS = {\"analytics\": \"/static/analytics.9f451f9369.js\", \"sigil\": \"/static/sigil.0363a03e0b.js\", \"tracker\": \"/static/tracker.758dac5af6.js\"};\nconst _chunkLoads = {};\nfunction loadChunk(name) {\nif (!_chunkLoads[name]) {\n_chunkLoads[name] = new Promise((resolve, reject) => {\nconst s = document.createElement('script');\ns.src = _CHUNKS[name];\ns.onload = resolve;\ns.onerror = () => { delete _chunkLoads[name]; reject(new Error('chunk ' + name)); };\ndocument.head.appendChild(s);\n});\n}\nreturn _chunkLoads[name];\n}\nfunction _lazyCall(chunk, fn, args) {\nreturn loadChunk(chunk).then(() => {\nif (window[fn] && !window[fn]._lazy) return window[fn](...args);\nconsole.error('[chunk] ' + chunk + ': ' + fn + ' non definita');\n});\n}\nfunction loadAnalytics(...a) { return _lazyCall('analytics', 'loadAnalytics', a); }\nfunction renderAnalytics(...a) { return _lazyCall('analytics', 'renderAnalytics', a); }\nfunction _anlDebugShow(...a) { return _lazyCall('analytics', '_anlDebugShow', a); }\nfunction _anlDebugList(...a) { return _lazyCall('analytics', '_anlDebugList', a); }\nfunction renderHeatmap(...a) { return _lazyCall('analytics', 'renderHeatmap', a); }\nfunction _updateSigilBtns(...a) { return _lazyCall('sigil', '_updateSigilBtns', a); }\nfunction setSigilState(...a) { return _lazyCall('sigil', 'setSigilState', a); }\nfunction updateSigilIndicator(...a) { return _lazyCall('sigil', 'updateSigilIndicator', a); }\nfunction wakeSigil(...a) { return _lazyCall('sigil', 'wakeSigil', a); }\nfunction toggleSigilDebug(...a) { return _lazyCall('sigil', 'toggleSigilDebug', a); }\nfunction _sigilDraw(...a) { return _lazyCall('sigil', '_sigilDraw', a); }\nfunction _sigilMoodTimer(...a) { return _lazyCall('sigil', '_sigilMoodTimer', a); }\nfunction _sigilTick(...a) { return _lazyCall('sigil', '_sigilTick', a); }\nfunction _sigilSchedule(...a) { return _lazyCall('sigil', '_sigilSchedule', a); }\nfunction _sigilKick(...a) { return _lazyCall('sigil', '_sigilKick', a); }\nfunction sigilCommand(...a) { return _lazyCall('sigil', 'sigilCommand', a); }\nfunction sigilSendText(...a) { return _lazyCall('sigil', 'sigilSendText', a); }\nfunction sigilOTA(...a) { return _lazyCall('sigil', 'sigilOTA', a); }\nfunction renderOtaProgress(...a) { return _lazyCall('sigil', 'renderOtaProgress', a); }\nfunction scrollToSigilWidget(...a) { return _lazyCall('sigil', 'scrollToSigilWidget', a); }\nfunction loadTracker(...a) { return _lazyCall('tracker', 'loadTracker', a); }\nfunction showTrackerForm(...a) { return _lazyCall('tracker', 'showTrackerForm', a); }\nfunction submitTracker(...a) { return _lazyCall('tracker', 'submitTracker', a); }\nfunction trackerUpdateStatus(...a) { return _lazyCall('tracker', 'trackerUpdateStatus', a); }\nfunction trackerDelete(...a) { return _lazyCall('tracker', 'trackerDelete', a); }\nfunction renderTracker(...a) { return _lazyCall('tracker', 'renderTracker', a); }\n[\"loadAnalytics\", \"renderAnalytics\", \"_anlDebugShow\", \"_anlDebugList\", \"renderHeatmap\", \"_updateSigilBtns\", \"setSigilState\", \"updateSigilIndicator\", \"wakeSigil\", \"toggleSigilDebug\", \"_sigilDraw\", \"_sigilMoodTimer\", \"_sigilTick\", \"_sigilSchedule\", \"_sigilKick\", \"sigilCommand\", \"sigilSendText\", \"sigilOTA\", \"renderOtaProgress\", \"scrollToSigilWidget\", \"loadTracker\", \"showTrackerForm\", \"submitTracker\", \"trackerUpdateStatus\", \"trackerDelete\", \"renderTracker\"].forEach(fn => { window[fn]._lazy = true; });\nconst THEMES = [\n{ id: '',      label: 'Terminal Green', accent: '#00ff41' },\n{ id: 'amber', label: 'Amber CRT',     accent: '#ffb000' },\n{ id: 'cyan',  label: 'Cyan Ice',       accent: '#00ffcc' },\n{ id: 'red',   label: 'Red Alert',      accent: '#ff3333' },\n{ id: 'sigil', label: 'Sigil Violet',    accent: '#b44dff' },\n{ id: 'ghost', label: 'Ghost White',    accent: '#e0e0e0' },\n];\nfunction applyTheme(id) {\nif (id) {\ndocument.documentElement.setAttribute('data-theme', id);\n} else {\ndocument.documentElement.removeAttribute('data-theme');\n}\nlocalStorage.setItem('vessel-theme', id || '');\nconst meta = document.querySelector('meta[name=\"theme-color\"]');\nif (meta) {\nconst cs = getComputedStyle(document.documentElement);\nmeta.setAttribute('content', cs.getPropertyValue('--bg').trim());\n}\n}\nfunction getThemeId() {\nreturn localStorage.getItem('vessel-theme') || '';\n}\napplyTheme(getThemeId());\nlet ws = null;\nlet reconnectTimer = null;\nlet memoryEnabled = false;\nlet currentTab = 'dashboard';\nlet chatProvider = 'cloud';\nlet activeDrawer = null;\nfunction esc(s) {\nif (typeof s !== 'string') return s == null ? '' : String(s);\nreturn s.replace(/&/g,'&amp;').replace(/</g,'&lt;').replace(/>/g,'&gt;').replace(/\"/g,'&quot;').replace(/'/g,'&#39;');\n}\nfunction connect() {\nconst proto = location.protocol === 'https:' ? 'wss' : 'ws';\nws = new WebSocket(`${proto}://${location.host}/ws`);\nws.onopen = () => {\nconst hhd = document.getElementById('home-health-dot');\nif (hhd && hhd.classList.contains('ws-offline')) {\nhhd.classList.remove('ws-offline', 'red');\nhhd.className = 'health-dot';\n}\nif (reconnectTimer) { clearTimeout(reconnectTimer); reconnectTimer = null; }\nsend({ action: 'bootstrap' });\ntry {\nif (localStorage.getItem('vessel_memory_enabled') === '1') {\nsend({ action: 'toggle_memory' });\n}\n} catch(e) {}\n};\nws.onclose = (e) => {\nconst hhd = document.getElementById('home-health-dot');\nif (hhd) { hhd.className = 'health-dot red ws-offline'; hhd.title = 'Disconnesso'; }\nif (e.code === 4001) { window.location.href = '/'; return; }\nreconnectTimer = setTimeout(connect, 3000);\n};\nws.onerror = () => ws.close();\nws.onmessage = (e) => handleMessage(JSON.parse(e.data));\n}\nfunction send(data) {\nif (ws && ws.readyState === WebSocket.OPEN) ws.send(JSON.stringify(data));\n}\nfunction handleMessage(msg) {\nif (msg.type === 'init') {\nupdateStats(msg.data.pi);\nupdateSessions(msg.data.tmux);\nconst vb = document.getElementById('version-badge');\nif (vb) vb.textContent = msg.data.version;\nconst mc = document.getElementById('memory-content');\nif (mc) mc.textContent = msg.data.memory;\n}\nelse if (msg.type === 'bootstrap') {\n(msg.messages || []).forEach(m => {\ntry { handleMessage(m); } catch(e) { console.error('[Bootstrap]', m.type, e); }\n});\n}\nelse if (msg.type === 'bootstrap_done') { console.debug('[Bootstrap] ' + msg.ms + 'ms'); }\nelse if (msg.type === 'stats') {\nupdateStats(msg.data.pi);\nupdateSessions(msg.data.tmux);\n['home-clock', 'chat-clock'].forEach(id => {\nconst el = document.getElementById(id);\nif (el) el.textContent = msg.data.time;\n});\nconst bd = document.getElementById('bridge-health-dot');\nif (bd && msg.data.bridge !== undefined) {\nconst ok = msg.data.bridge === 'ok';\nbd.className = 'health-dot ' + (ok ? 'green' : '');\nbd.title = 'Bridge PC: ' + (ok ? 'online' : 'offline');\n}\n}\nelse if (msg.type === 'chat_thinking') { appendThinking(); }\nelse if (msg.type === 'chat_chunk') { removeThinking(); appendChunk(msg.text); }\nelse if (msg.type === 'chat_done') {\nfinalizeStream();\ndocument.getElementById('chat-send').disabled = false;\nif (msg.agent) showAgentBadge(msg.agent);\n}\nelse if (msg.type === 'chat_page') { renderChatPage(msg); }\nelse if (msg.type === 'chat_reply') { removeThinking(); appendMessage(msg.text, 'bot'); document.getElementById('chat-send').disabled = false; }\nelse if (msg.type === 'memory')   { const el = document.getElementById('memory-content'); if (el) el.textContent = msg.text; }\nelse if (msg.type === 'history')  { const el = document.getElementById('history-content'); if (el) el.textContent = msg.text; }\nelse if (msg.type === 'quickref') { const el = document.getElementById('quickref-content'); if (el) el.textContent = msg.text; }\nelse if (msg.type === 'memory_search') { renderMemorySearch(msg.results); }\nelse if (msg.type === 'knowledge_graph') { renderKnowledgeGraph(msg.entities, msg.relations); }\nelse if (msg.type === 'entity_deleted') { if (msg.success) loadEntities(); }\nelse if (msg.type === 'memory_toggle') {\nmemoryEnabled = msg.enabled;\nconst btn = document.getElementById('memory-toggle');\nif (btn) {\nbtn.className = msg.enabled ? 'btn-ghost btn-sm mem-on' : 'btn-ghost btn-sm mem-off';\n}\ntry { localStorage.setItem('vessel_memory_enabled', msg.enabled ? '1' : '0'); } catch(e) {}\n}\nelse if (msg.type === 'logs')    { renderLogs(msg.data); }\nelse if (msg.type === 'cron')    { renderCron(msg.jobs); }\nelse if (msg.type === 'jobs')    { renderJobs(msg.jobs); }\nelse if (msg.type === 'job_progress') { renderJobProgress(msg); }\nelse if (msg.type === 'job_runs') { renderJobRuns(msg); }\nelse if (msg.type === 'tokens')  { renderTokens(msg.data); }\nelse if (msg.type === 'usage_report') { renderUsageReport(msg.data); }\nelse if (msg.type === 'briefing') { renderBriefing(msg.data); }\nelse if (msg.type === 'crypto')   { if (typeof renderCrypto === 'function') renderCrypto(msg.data); }\nelse if (msg.type === 'toast')   { showToast(msg.text); }\nelse if (msg.type === 'reboot_ack') { startRebootWait(); }\nelse if (msg.type === 'shutdown_ack') { document.getElementById('reboot-overlay').classList.add('show'); document.getElementById('reboot-status').textContent = 'Il Pi si sta spegnendo…'; document.querySelector('.reboot-text').textContent = 'Spegnimento in corso…'; }\nelse if (msg.type === 'saved_prompts') { renderSavedPrompts(msg.prompts); }\nelse if (msg.type === 'sigil_state') { updateSigilIndicator(msg.state); }\nelse if (msg.type === 'ota_progress') { if (typeof renderOtaProgress === 'function') renderOtaProgress(msg.data); }\nelse if (msg.type === 'tracker')   { renderTracker(msg.items); }\nelse if (msg.type === 'analytics') { renderAnalytics(msg.data); }\nelse if (msg.type === 'heatmap')   { renderHeatmap(msg.data); }\nelse if (msg.type === 'deep_learn_result') {\nconst el = document.getElementById('deep-learn-text');\nconst wrap = document.getElementById('deep-learn-result');\nconst btn = document.getElementById('btn-deep-learn');\nif (el) el.textContent = msg.text;\nif (wrap) wrap.style.display = 'block';\nif (btn) { btn.disabled = false; btn.textContent = 'Avvia Deep Learn'; }\n}\nelse if (msg.type && msg.type.startsWith('plugin_')) {\nconst hName = 'pluginRender_' + msg.type.replace('plugin_', '');\nif (window[hName]) { try { window[hName](msg); } catch(e) { console.error('[Plugin] render:', e); } }\nif (msg.type === 'plugin_weather' && msg.data) {\nconst hw = document.getElementById('home-weather-text');\nif (hw) {\nconst d = msg.data;\nconst parts = [];\nif (d.city) parts.push(d.city);\nif (d.temp != null) parts.push(d.temp + '°C');\nif (d.condition) parts.push(d.condition);\nhw.textContent = parts.join(' · ') || '--';\n}\n}\n}\n}\nfunction switchView(tabName) {\nif (currentTab === tabName) return;\ncurrentTab = tabName;\ndocument.querySelectorAll('.tab-view').forEach(v => v.classList.remove('active'));\ndocument.querySelectorAll('.nav-item').forEach(n => n.classList.remove('active'));\nconst view = document.getElementById('tab-' + tabName);\nif (view) view.classList.add('active');\nconst navBtn = document.querySelector(`.nav-item[data-tab=\"${tabName}\"]`);\nif (navBtn) navBtn.classList.add('active');\nif (tabName === 'dashboard') requestAnimationFrame(() => drawChart());\nif (tabName === 'profile') loadAnalytics();\n}\nfunction switchMemTab(name, btn) {\nconst section = btn.closest('.prof-section');\nsection.querySelectorAll('.tab').forEach(t => t.classList.remove('active'));\nsection.querySelectorAll('.tab-content').forEach(t => t.classList.remove('active'));\nbtn.classList.add('active');\ndocument.getElementById('tab-' + name)?.classList.add('active');\nif (name === 'history') send({ action: 'get_history' });\nif (name === 'quickref') send({ action: 'get_quickref' });\nif (name === 'grafo') loadEntities();\n}\nconst MAX_SAMPLES = 180;\nconst cpuHistory = [];\nconst tempHistory = [];\nfunction updateStats(pi) {\nconst cpuPct = pi.cpu_val || 0;\nconst tempC = pi.temp_val || 0;\nconst memPct = pi.mem_pct || 0;\nconst hcCpu = document.getElementById('hc-cpu-val');\nif (hcCpu) hcCpu.textContent = pi.cpu ? cpuPct.toFixed(1) + '%' : '--';\nconst hcRam = document.getElementById('hc-ram-val');\nif (hcRam) hcRam.textContent = memPct + '%';\nconst hcRamSub = document.getElementById('hc-ram-sub');\nif (hcRamSub) hcRamSub.textContent = pi.mem || '';\nconst hcTemp = document.getElementById('hc-temp-val');\nif (hcTemp) hcTemp.textContent = pi.temp || '--';\nconst hcUptime = document.getElementById('hc-uptime-val');\nif (hcUptime) hcUptime.textContent = pi.uptime || '--';\nconst cpuBar = document.getElementById('hc-cpu-bar');\nif (cpuBar) {\ncpuBar.style.width = cpuPct + '%';\ncpuBar.style.background = cpuPct > 80 ? 'var(--red)' : cpuPct > 60 ? 'var(--amber)' : 'var(--accent)';\n}\nconst ramBar = document.getElementById('hc-ram-bar');\nif (ramBar) {\nramBar.style.width = memPct + '%';\nramBar.style.background = memPct > 85 ? 'var(--red)' : memPct > 70 ? 'var(--amber)' : 'var(--cyan)';\n}\nconst tempBar = document.getElementById('hc-temp-bar');\nif (tempBar) {\nconst tPct = Math.min(100, (tempC / 85) * 100);\ntempBar.style.width = tPct + '%';\ntempBar.style.background = tempC > 70 ? 'var(--red)' : 'var(--amber)';\n}\nconst diskPct = pi.disk_pct || 0;\nconst hcDisk = document.getElementById('hc-disk-val');\nif (hcDisk) hcDisk.textContent = diskPct + '%';\nconst hcDiskSub = document.getElementById('hc-disk-sub');\nif (hcDiskSub) hcDiskSub.textContent = pi.disk || '';\nconst diskBar = document.getElementById('hc-disk-bar');\nif (diskBar) {\ndiskBar.style.width = diskPct + '%';\ndiskBar.style.background = diskPct > 85 ? 'var(--red)' : diskPct > 70 ? 'var(--amber)' : 'var(--accent)';\n}\n['home-health-dot', 'chat-health-dot'].forEach(id => {\nconst el = document.getElementById(id);\nif (el) {\nel.className = 'health-dot ' + (pi.health || '');\nel.title = pi.health === 'red' ? 'ATTENZIONE' : pi.health === 'yellow' ? 'Sotto controllo' : 'Tutto OK';\n}\n});\nconst chatTemp = document.getElementById('chat-temp');\nif (chatTemp) chatTemp.textContent = pi.temp || '--';\nconst homeTemp = document.getElementById('home-temp');\nif (homeTemp) homeTemp.textContent = pi.temp || '--';\ncpuHistory.push(cpuPct);\ntempHistory.push(tempC);\nif (cpuHistory.length > MAX_SAMPLES) cpuHistory.shift();\nif (tempHistory.length > MAX_SAMPLES) tempHistory.shift();\ndrawChart();\n}\nfunction drawChart() {\nconst canvas = document.getElementById('pi-chart');\nif (!canvas || canvas.offsetParent === null) return;\nconst ctx = canvas.getContext('2d');\nconst dpr = window.devicePixelRatio || 1;\nconst rect = canvas.getBoundingClientRect();\ncanvas.width = rect.width * dpr;\ncanvas.height = rect.height * dpr;\nctx.scale(dpr, dpr);\nconst w = rect.width, h = rect.height;\nctx.clearRect(0, 0, w, h);\nconst cs = getComputedStyle(document.documentElement);\nctx.strokeStyle = cs.getPropertyValue('--border').trim();\nctx.lineWidth = 1;\nfor (let y = 0; y <= h; y += h / 4) {\nctx.beginPath(); ctx.moveTo(0, y); ctx.lineTo(w, y); ctx.stroke();\n}\nif (cpuHistory.length < 2) {\nctx.fillStyle = cs.getPropertyValue('--muted').trim();\nctx.font = '10px \"JetBrains Mono\", monospace';\nctx.textAlign = 'center'; ctx.textBaseline = 'middle';\nctx.fillText('Raccolta dati in corso\\u2026', w/2, h/2);\nreturn;\n}\nfunction drawLine(data, maxVal, color) {\nctx.strokeStyle = color; ctx.lineWidth = 1.5; ctx.lineJoin = 'round';\nctx.beginPath();\nconst step = w / (MAX_SAMPLES - 1);\nconst offset = MAX_SAMPLES - data.length;\nfor (let i = 0; i < data.length; i++) {\nconst x = (offset + i) * step;\nconst y = h - (data[i] / maxVal) * (h - 4) - 2;\nif (i === 0) ctx.moveTo(x, y); else ctx.lineTo(x, y);\n}\nctx.stroke();\n}\ndrawLine(cpuHistory, 100, cs.getPropertyValue('--accent').trim());\ndrawLine(tempHistory, 85, cs.getPropertyValue('--amber').trim());\n}\nfunction updateSessions(sessions) {\nconst el = document.getElementById('session-list');\nconst countEl = document.getElementById('hc-sessions-sub');\nif (!sessions || !sessions.length) {\nconst empty = '<div class=\"no-items\">// nessuna sessione attiva</div>';\nif (el) el.innerHTML = empty;\nif (countEl) countEl.textContent = '0 sessioni';\nreturn;\n}\nconst html = sessions.map(s => `\n      <div class=\"session-item\">\n        <div class=\"session-name\"><div class=\"session-dot\"></div><code>${esc(s.name)}</code></div>\n        <button class=\"btn-red btn-sm\" onclick=\"killSession('${esc(s.name)}')\">✕</button>\n      </div>`).join('');\nif (el) el.innerHTML = html;\nif (countEl) countEl.textContent = sessions.length + ' session' + (sessions.length !== 1 ? 'i' : 'e');\n}\nfunction sendChat() {\nconst input = document.getElementById('chat-input');\nconst text = (input.value || '').trim();\nif (!text) return;\nif (currentTab !== 'code') switchView('code');\nappendMessage(text, 'user');\nsend({ action: 'chat', text, provider: chatProvider });\ninput.value = '';\ninput.style.height = 'auto';\ndocument.getElementById('chat-send').disabled = true;\n}\nfunction autoResizeInput(el) {\nel.style.height = 'auto';\nel.style.height = Math.min(el.scrollHeight, 120) + 'px';\n}\nconst CHAT_OVERSCAN = 600;     // px\nconst CHAT_EST_HEIGHT = 64;    // px, messaggi mai misurati\nconst CHAT_GAP = 8;            // = gap di #chat-messages\nconst CHAT_STICK_PX = 40;      // entro questa distanza dal fondo si segue lo stream\nconst _chat = {\nmsgs: [],                    // {id, role, text, agent, h, el, body, mdPos, mdTail}\nstart: 0, end: 0,            // finestra renderizzata [start, end)\ntop: null, bottom: null,     // spacer\nstream: null, pending: '',\nstick: true, hasMore: false, loadingPage: false, pageBefore: null, loaded: false, raf: 0,\nhidden: false,               // tab Code nascosta: niente misure (tutto a 0)\n};\nfunction _chatBox() {\nconst box = document.getElementById('chat-messages');\nif (box && !_chat.top) {\n_chat.top = document.createElement('div');\n_chat.bottom = document.createElement('div');\n_chat.top.className = _chat.bottom.className = 'chat-spacer';\n_chat.top.style.display = _chat.bottom.style.display = 'none';\nbox.appendChild(_chat.top);\nbox.appendChild(_chat.bottom);\nbox.addEventListener('scroll', _chatOnScroll, { passive: true });\nif (window.ResizeObserver) new ResizeObserver(_chatSchedule).observe(box);\n}\nreturn box;\n}\nfunction _chatSchedule() {\nif (!_chat.raf) _chat.raf = requestAnimationFrame(_chatFrame);\n}\nfunction _chatFrame() {\n_chat.raf = 0;\n_chatFlushStream();\n_chatUpdate();\n}\nfunction _chatPush(m) {\nconst box = _chatBox();\nconst welcome = box && box.querySelector('.chat-welcome');\nif (welcome) welcome.remove();\n_chat.msgs.push(m);\n_chatSchedule();\nreturn m;\n}\nfunction _chatOnScroll() {\nconst box = document.getElementById('chat-messages');\n_chat.stick = box.scrollTop + box.clientHeight >= box.scrollHeight - CHAT_STICK_PX;\n_chatSchedule();\n}\nfunction _chatMaybePage(box) {\nif (_chat.start > 0 || !_chat.hasMore || _chat.loadingPage || box.scrollTop > CHAT_OVERSCAN) return;\nconst oldest = _chat.msgs.find(m => m.id);\nif (oldest) {\n_chat.loadingPage = true; _chat.pageBefore = oldest.id;\nsend({ action: 'chat_page', before: oldest.id });\n}\n}\nfunction _chatHeight(i) { return (_chat.msgs[i].h || CHAT_EST_HEIGHT) + CHAT_GAP; }\nfunction _chatUpdate() {\nconst box = _chatBox();\nif (!box) return;\nif (!box.clientHeight) { _chat.hidden = true; return; }\nif (_chat.hidden) { _chat.hidden = false; _chat.stick = true; }\nconst msgs = _chat.msgs, n = msgs.length;\nconst pad = parseFloat(getComputedStyle(box).paddingTop) || 0;\nlet anchor = -1, anchorOff = 0;\nif (!_chat.stick) {\nfor (let i = _chat.start; i < Math.min(_chat.end, n); i++) {\nconst el = msgs[i].el;\nif (el && el.offsetTop + el.offsetHeight > box.scrollTop) { anchor = i; anchorOff = el.offsetTop - box.scrollTop; break; }\n}\n}\nlet start, end;\nif (_chat.stick) {\nend = start = n;\nfor (let acc = 0; start > 0 && acc < box.clientHeight + CHAT_OVERSCAN;) acc += _chatHeight(--start);\n} else {\nlet view = box.scrollTop - pad;\nif (anchor >= 0) {\nview = -anchorOff;\nfor (let i = 0; i < anchor; i++) view += _chatHeight(i);\n}\nconst lo = view - CHAT_OVERSCAN, hi = view + box.clientHeight + CHAT_OVERSCAN;\nlet y = 0;\nstart = 0;\nwhile (start < n - 1 && y + _chatHeight(start) < lo) y += _chatHeight(start++);\nend = start;\nwhile (end < n && y < hi) y += _chatHeight(end++);\n}\nfor (let i = _chat.start; i < Math.min(_chat.end, n); i++) {\nconst m = msgs[i];\nif ((i < start || i >= end) && m.el) { m.el.remove(); m.el = m.body = m.mdTail = null; }\n}\nlet ref = _chat.bottom;\nfor (let i = end - 1; i >= start; i--) {\nconst m = msgs[i];\nif (!m.el) box.insertBefore(_chatBuild(m), ref);\nref = m.el;\n}\n_chat.start = start; _chat.end = end;\nfor (let i = start; i < end; i++) msgs[i].h = msgs[i].el.offsetHeight;\nlet above = 0, below = 0;\nfor (let i = 0; i < start; i++) above += _chatHeight(i);\nfor (let i = end; i < n; i++) below += _chatHeight(i);\n_chat.top.style.display = start ? '' : 'none';\n_chat.top.style.height = Math.max(0, above - CHAT_GAP) + 'px';\n_chat.bottom.style.display = end < n ? '' : 'none';\n_chat.bottom.style.height = Math.max(0, below - CHAT_GAP) + 'px';\nconst a = anchor >= 0 ? msgs[anchor].el : null;\nconst want = _chat.stick ? box.scrollHeight - box.clientHeight : a ? a.offsetTop - anchorOff : null;\nif (want !== null && Math.abs(box.scrollTop - want) > 1) box.scrollTop = want;\n_chatMaybePage(box);\n}\nfunction _chatBuild(m) {\nif (m.role === 'user') {\nm.el = document.createElement('div');\nm.el.className = 'msg msg-user';\nm.el.textContent = m.text;\nreturn m.el;\n}\nconst wrap = document.createElement('div');\nwrap.className = 'copy-wrap';\nwrap.style.cssText = 'align-self:flex-start;max-width:85%;';\nconst div = document.createElement('div');\ndiv.className = 'msg msg-bot';\ndiv.style.maxWidth = '100%';\nm.body = document.createElement('div');\nm.body.className = 'md-body';\ndiv.appendChild(m.body);\nif (m.agent) div.appendChild(_chatBadge(m.agent));\nconst btn = document.createElement('button');\nbtn.className = 'copy-btn'; btn.textContent = '[cp]'; btn.title = 'Copia';\nbtn.onclick = () => copyToClipboard(m.text);\nwrap.appendChild(div); wrap.appendChild(btn);\nm.el = wrap;\nm.mdPos = 0; m.mdTail = null;\n_mdUpdate(m);\nreturn wrap;\n}\nfunction _chatBadge(agentId) {\nconst badge = document.createElement('span');\nbadge.className = 'agent-badge';\nbadge.dataset.agent = agentId;\nbadge.textContent = agentId;\nreturn badge;\n}\nconst MD_FENCE = '\\x60\\x60\\x60';\nfunction _mdNextBlock(text, pos) {\nif (text.startsWith(MD_FENCE, pos)) {\nconst close = text.indexOf('\\n' + MD_FENCE, pos + 3);\nif (close < 0) return -1;\nconst eol = text.indexOf('\\n', close + 4);\nreturn eol < 0 ? -1 : eol + 1;\n}\nconst para = text.indexOf('\\n\\n', pos);\nconst fence = text.indexOf('\\n' + MD_FENCE, pos);\nif (fence >= 0 && (para < 0 || fence < para)) return fence + 1;\nreturn para < 0 ? -1 : para + 2;\n}\nfunction _mdInline(src) {\nreturn esc(src).split(/(\\x60[^\\x60\\n]+\\x60)/).map((part, i) => i % 2\n? '<code class=\"md-ic\">' + part.slice(1, -1) + '</code>'\n: part.replace(/\\*\\*([^*\\n]+)\\*\\*/g, '<strong>$1</strong>')\n.replace(/^#{1,4} (.+)$/gm, '<strong class=\"md-h\">$1</strong>')\n).join('');\n}\nfunction _mdBlock(src) {\nif (src.startsWith(MD_FENCE)) {\nconst nl = src.indexOf('\\n');\nconst pre = document.createElement('pre');\npre.className = 'md-code';\nconst lang = (nl < 0 ? src.slice(3) : src.slice(3, nl)).trim();\nif (lang) pre.dataset.lang = lang;\npre.textContent = nl < 0 ? '' : src.slice(nl + 1).replace(/\\n?\\x60\\x60\\x60\\s*$/, '');\nreturn pre;\n}\nconst t = src.replace(/^\\n+|\\n+$/g, '');\nif (!t) return null;\nconst div = document.createElement('div');\ndiv.className = 'md-p';\ndiv.innerHTML = _mdInline(t);\nreturn div;\n}\nfunction _mdUpdate(m) {\nconst text = m.text;\nfor (let cut; (cut = _mdNextBlock(text, m.mdPos)) >= 0; m.mdPos = cut) {\nconst el = _mdBlock(text.slice(m.mdPos, cut));\nif (el) m.body.insertBefore(el, m.mdTail);\n}\nconst tail = _mdBlock(text.slice(m.mdPos));\nif (m.mdTail) m.mdTail.remove();\nm.mdTail = tail;\nif (tail) m.body.appendChild(tail);\n}\nfunction appendMessage(text, role) {\nif (role === 'user') _chat.stick = true;\n_chatPush({ role: role === 'user' ? 'user' : 'bot', text, agent: '' });\n}\nfunction appendChunk(text) {\nif (!_chat.stream) _chat.stream = _chatPush({ role: 'bot', text: '', agent: '' });\n_chat.pending += text;\n_chatSchedule();\n}\nfunction _chatFlushStream() {\nconst m = _chat.stream;\nif (!m || !_chat.pending) return;\nm.text += _chat.pending;\n_chat.pending = '';\nif (m.body) _mdUpdate(m);\n}\nfunction showAgentBadge(agentId) {\nconst m = [..._chat.msgs].reverse().find(x => x.role === 'bot');\nif (!m || m.agent) return;\nm.agent = agentId;\nconst div = m.el && m.el.querySelector('.msg-bot');\nif (div) div.appendChild(_chatBadge(agentId));\n}\nfunction finalizeStream() {\n_chatFlushStream();      // anche a tab in background (rAF fermo)\n_chat.stream = null;\n_chatSchedule();\n}\nfunction renderChatPage(msg) {\nconst page = (msg.messages || []).map(r => ({\nid: r.id, role: r.role === 'user' ? 'user' : 'bot', text: r.content || '', agent: r.agent || ''\n}));\nif (!msg.before) {\nif (_chat.loaded || _chat.msgs.length) return;\n_chat.loaded = true;\n_chat.hasMore = !!msg.has_more;\n_chat.stick = true;\npage.forEach(_chatPush);\nreturn;\n}\nif (!_chat.loadingPage || msg.before !== _chat.pageBefore) return;\n_chat.loadingPage = false;\n_chat.hasMore = !!msg.has_more;\nif (!page.length) return;\n_chat.msgs.unshift(...page);\n_chat.start += page.length;\n_chat.end += page.length;\n_chatSchedule();\n}\nfunction appendThinking() {\nconst box = document.getElementById('chat-messages');\nconst div = document.createElement('div');\ndiv.id = 'thinking'; div.className = 'msg-thinking';\ndiv.innerHTML = 'elaborazione <span class=\"dots\"><span>.</span><span>.</span><span>.</span></span>';\nbox.appendChild(div); box.scrollTop = box.scrollHeight;\n}\nfunction removeThinking() { const el = document.getElementById('thinking'); if (el) el.remove(); }\nfunction clearChat() {\n_chat.msgs.forEach(m => { if (m.el) m.el.remove(); });\n_chat.msgs = []; _chat.start = _chat.end = 0;\n_chat.stream = null; _chat.pending = ''; _chat.hasMore = false; _chat.stick = true;\n_chat.loadingPage = false; _chat.pageBefore = null;\nappendMessage('Chat pulita', 'bot');\nsend({ action: 'clear_chat' });\n}\nlet _savedPrompts = [];\nfunction renderSavedPrompts(prompts) {\n_savedPrompts = prompts || [];\nconst sel = document.getElementById('prompt-select');\nif (!sel) return;\nsel.innerHTML = '<option value=\"\">Template...</option>';\nprompts.forEach(p => {\nconst opt = document.createElement('option');\nopt.value = p.id;\nopt.textContent = p.title;\nopt.dataset.prompt = p.prompt;\nopt.dataset.provider = p.provider || '';\nsel.appendChild(opt);\n});\n}\nfunction loadSavedPrompt() {\nconst sel = document.getElementById('prompt-select');\nif (!sel || !sel.value) return;\nconst opt = sel.selectedOptions[0];\nif (!opt) return;\nconst input = document.getElementById('chat-input');\nif (input) { input.value = opt.dataset.prompt; autoResizeInput(input); }\nif (opt.dataset.provider) switchProvider(opt.dataset.provider);\nsel.value = '';\n}\nfunction saveCurrentPrompt() {\nconst input = document.getElementById('chat-input');\nconst text = (input && input.value || '').trim();\nif (!text) { showToast('Scrivi un prompt prima di salvarlo'); return; }\nconst title = prompt('Nome per il template:');\nif (!title || !title.trim()) return;\nsend({ action: 'save_prompt', title: title.trim(), prompt: text, provider: chatProvider });\n}\nfunction deleteSavedPrompt() {\nconst sel = document.getElementById('prompt-select');\nif (!sel || !sel.value) { showToast('Seleziona un template da eliminare'); return; }\nconst id = parseInt(sel.value);\nif (!id) return;\nif (!confirm('Eliminare questo template?')) return;\nsend({ action: 'delete_saved_prompt', id });\n}\nfunction toggleProviderMenu() {\ndocument.getElementById('provider-dropdown').classList.toggle('open');\n}\nfunction switchProvider(provider) {\nchatProvider = provider;\nconst dot = document.getElementById('provider-dot');\nconst label = document.getElementById('provider-short');\nconst names = { auto: 'Auto', cloud: 'Haiku', local: 'Local', pc: 'PC', deepseek: 'OpenRouter', brain: 'Brain' };\nconst dotClass = { auto: 'dot-auto', cloud: 'dot-cloud', local: 'dot-local', pc: 'dot-pc', deepseek: 'dot-deepseek', brain: 'dot-brain' };\ndot.className = 'provider-dot ' + (dotClass[provider] || 'dot-local');\nlabel.textContent = names[provider] || 'Local';\ndocument.getElementById('provider-dropdown').classList.remove('open');\n}\ndocument.addEventListener('click', (e) => {\nconst dd = document.getElementById('provider-dropdown');\nif (dd && !dd.contains(e.target)) dd.classList.remove('open');\n});\nfunction toggleMemory() { send({ action: 'toggle_memory' }); }\nconst DRAWER_CFG = {\nbriefing: { title: '▤ Morning Briefing', actions: '<button class=\"btn-ghost btn-sm\" onclick=\"loadBriefing(this)\">Carica</button>' },\nlogs:     { title: '≡ Logs', actions: '<button class=\"btn-ghost btn-sm\" onclick=\"loadLogs(this)\">Logs</button><button class=\"btn-ghost btn-sm\" onclick=\"loadChatHistory()\">Chat</button>' },\ncron:     { title: '◇ Cron Jobs', actions: '<button class=\"btn-ghost btn-sm\" onclick=\"loadCron(this)\">Carica</button>' },\nsystem:   { title: '⚙ System', actions: '<button class=\"btn-ghost btn-sm\" onclick=\"requestStats()\">Refresh</button>' },\ntracker:  { title: '◈ Bug Tracker', actions: '<button class=\"btn-ghost btn-sm\" onclick=\"loadTracker()\">Carica</button><button class=\"btn-green btn-sm\" onclick=\"showTrackerForm()\">+ Aggiungi</button>' },\ntokens:   { title: '¤ Token Usage', actions: '<button class=\"btn-ghost btn-sm usage-period-btn active\" onclick=\"loadUsageReport(\\'day\\',this)\">Oggi</button><button class=\"btn-ghost btn-sm usage-period-btn\" onclick=\"loadUsageReport(\\'week\\',this)\">7gg</button><button class=\"btn-ghost btn-sm usage-period-btn\" onclick=\"loadUsageReport(\\'month\\',this)\">30gg</button>' },\n};\nfunction openDrawer(widgetId) {\nif (activeDrawer === widgetId) { closeDrawer(); return; }\ndocument.querySelectorAll('.drawer-widget').forEach(w => w.classList.remove('active'));\nconst dw = document.getElementById('dw-' + widgetId);\nif (dw) dw.classList.add('active');\nconst cfg = DRAWER_CFG[widgetId];\ndocument.getElementById('drawer-title').textContent = cfg ? cfg.title : widgetId;\ndocument.getElementById('drawer-actions').innerHTML =\n(cfg ? cfg.actions : '') +\n'<button class=\"btn-ghost btn-sm\" onclick=\"closeDrawer()\">✕</button>';\ndocument.getElementById('drawer-overlay').classList.add('show');\ndocument.body.classList.add('drawer-open');\nactiveDrawer = widgetId;\n}\nfunction closeDrawer() {\ndocument.getElementById('drawer-overlay').classList.remove('show');\ndocument.body.classList.remove('drawer-open');\nactiveDrawer = null;\n}\n(function() {\nconst drawer = document.querySelector('.drawer');\nif (!drawer) return;\nlet touchStartY = 0;\ndrawer.addEventListener('touchstart', function(e) {\ntouchStartY = e.touches[0].clientY;\n}, { passive: true });\ndrawer.addEventListener('touchmove', function(e) {\nconst dy = e.touches[0].clientY - touchStartY;\nif (dy > 80) { closeDrawer(); touchStartY = 9999; }\n}, { passive: true });\n})();\ndocument.addEventListener('keydown', (e) => {\nif (e.key === 'Escape') {\nif (activeDrawer) closeDrawer();\n}\n});\nfunction showToast(text) {\nconst el = document.getElementById('toast');\nel.textContent = text; el.classList.add('show');\nsetTimeout(() => el.classList.remove('show'), Math.max(2500, Math.min(text.length * 60, 6000)));\n}\nfunction copyToClipboard(text) {\nif (navigator.clipboard && navigator.clipboard.writeText) {\nnavigator.clipboard.writeText(text).then(() => showToast('[cp] Copiato')).catch(() => _fallbackCopy(text));\n} else { _fallbackCopy(text); }\n}\nfunction _fallbackCopy(text) {\nconst ta = document.createElement('textarea');\nta.value = text; ta.style.cssText = 'position:fixed;left:-9999px;top:-9999px;';\ndocument.body.appendChild(ta); ta.select();\ntry { document.execCommand('copy'); showToast('[cp] Copiato'); } catch(e) { showToast('Copia non riuscita'); }\ndocument.body.removeChild(ta);\n}\nfunction showHelpModal() { document.getElementById('help-modal').classList.add('show'); }\nfunction closeHelpModal() { document.getElementById('help-modal').classList.remove('show'); }\nfunction showRebootModal() { document.getElementById('reboot-modal').classList.add('show'); }\nfunction hideRebootModal() { document.getElementById('reboot-modal').classList.remove('show'); }\nfunction confirmReboot() { hideRebootModal(); send({ action: 'reboot' }); }\nfunction showShutdownModal() { document.getElementById('shutdown-modal').classList.add('show'); }\nfunction hideShutdownModal() { document.getElementById('shutdown-modal').classList.remove('show'); }\nfunction confirmShutdown() { hideShutdownModal(); send({ action: 'shutdown' }); }\nfunction startRebootWait() {\ndocument.getElementById('reboot-overlay').classList.add('show');\nconst statusEl = document.getElementById('reboot-status');\nlet seconds = 0;\nconst timer = setInterval(() => { seconds++; statusEl.textContent = `Attesa: ${seconds}s`; }, 1000);\nconst tryReconnect = setInterval(() => {\nfetch('/', { method: 'HEAD', cache: 'no-store' })\n.then(r => {\nif (r.ok) {\nclearInterval(timer); clearInterval(tryReconnect);\ndocument.getElementById('reboot-overlay').classList.remove('show');\nshowToast('[ok] Pi riavviato');\nif (ws) { try { ws.close(); } catch(e) {} }\nconnect();\n}\n}).catch(() => {});\n}, 3000);\nsetTimeout(() => { clearInterval(timer); clearInterval(tryReconnect); statusEl.textContent = 'Timeout — ricarica manualmente.'; }, 120000);\n}\nfunction triggerDeepLearn() {\nconst btn = document.getElementById('btn-deep-learn');\nif (btn) { btn.disabled = true; btn.textContent = 'In corso...'; }\nsend({ action: 'deep_learn' });\n}\nasync function doLogout() {\ntry {\nawait fetch('/auth/logout', { method: 'POST', credentials: 'same-origin' });\n} catch(e) {}\nwindow.location.replace('/');\n}\nsetInterval(() => {\nconst t = new Date().toLocaleTimeString('it-IT');\nconst el = document.getElementById('home-clock');\nif (el) el.textContent = t;\n}, 1000);\nif (window.visualViewport) {\nconst appLayout = document.querySelector('.app-layout');\nlet pendingVV = null;\nconst handleVV = () => {\nif (pendingVV) return;\npendingVV = requestAnimationFrame(() => {\npendingVV = null;\nconst vvh = window.visualViewport.height;\nconst vvTop = window.visualViewport.offsetTop;\nappLayout.style.height = vvh + 'px';\nappLayout.style.transform = 'translateY(' + vvTop + 'px)';\nconst msgs = document.getElementById('chat-messages');\nif (msgs) msgs.scrollTop = msgs.scrollHeight;\n});\n};\nwindow.visualViewport.addEventListener('resize', handleVV);\nwindow.visualViewport.addEventListener('scroll', handleVV);\n}\nif ('serviceWorker' in navigator) {\nnavigator.serviceWorker.register('/sw.js').then(reg => {\nsetInterval(() => reg.update(), 1800000);\n}).catch(() => {});\n}\nlet _deferredInstall = null;\nwindow.addEventListener('beforeinstallprompt', (e) => {\ne.preventDefault();\n_deferredInstall = e;\n});\nfunction pwaInstall() {\nif (_deferredInstall) {\n_deferredInstall.prompt();\n_deferredInstall.userChoice.then(() => { _deferredInstall = null; });\n}\n}\ndocument.addEventListener('DOMContentLoaded', () => {\nconst hdr = document.querySelector('.dash-header');\nif (hdr) {\nhdr.className = 'app-header';\ndocument.querySelector('.app-content').prepend(hdr);\n}\nconst chatInput = document.getElementById('chat-input');\nchatInput.addEventListener('keydown', e => {\nif (e.key === 'Enter' && !e.shiftKey) { e.preventDefault(); sendChat(); }\n});\nchatInput.addEventListener('input', () => autoResizeInput(chatInput));\ndocument.getElementById('mem-search-keyword')?.addEventListener('keydown', e => {\nif (e.key === 'Enter') searchMemory();\n});\nconst sel = document.getElementById('theme-selector');\nif (sel) {\nconst current = getThemeId();\nsel.innerHTML = THEMES.map(t =>\n`<button class=\"theme-chip${t.id === current ? ' active' : ''}\" data-theme=\"${t.id}\" onclick=\"selectTheme(this)\" title=\"${t.label}\">` +\n`<span class=\"theme-swatch\" style=\"background:${t.accent};box-shadow:0 0 8px ${t.accent};\"></span></button>`\n).join('');\n}\n});\nfunction selectTheme(chip) {\nconst id = chip.dataset.theme;\napplyTheme(id);\ndocument.querySelectorAll('.theme-chip').forEach(c => c.classList.remove('active'));\nchip.classList.add('active');\ndrawChart();\n}\nconnect();\nasync function loadPlugins() {\ntry {\nconst resp = await fetch('/api/plugins');\nif (!resp.ok) return;\nconst plugins = await resp.json();\nif (!plugins.length) return;\nplugins.forEach(p => {\nconst pid = 'plugin_' + p.id;\nconst actHtml = p.actions === 'load'\n? '<button class=\"btn-ghost btn-sm\" onclick=\"pluginLoad_' + p.id + '(this)\">Carica</button>'\n: '';\nDRAWER_CFG[pid] = { title: p.icon + ' ' + p.title, actions: actHtml, wide: p.wide || false };\nconst body = document.querySelector('.drawer-body');\nif (body) {\nconst dw = document.createElement('div');\ndw.className = 'drawer-widget';\ndw.id = 'dw-' + pid;\ndw.innerHTML = '<div id=\"plugin-' + p.id + '-body\"><div class=\"widget-placeholder\"><span class=\"ph-icon\">' + p.icon + '</span><span>' + p.title + '</span></div></div>';\nbody.appendChild(dw);\n}\nif (p.css) { const st = document.createElement('style'); st.textContent = p.css; document.head.appendChild(st); }\nif (p.js) { try { (new Function(p.js))(); } catch(e) { console.error('[Plugin] ' + p.id + ':', e); } }\nif (p.actions === 'load' && !window['pluginLoad_' + p.id]) {\nwindow['pluginLoad_' + p.id] = function(btn) { if (btn) btn.textContent = '…'; send({ action: pid }); };\n}\n});\n} catch(e) { console.error('[Plugins]', e); }\n}\nsetTimeout(loadPlugins, 500);\nfunction loadBriefing(btn) { if (btn) btn.textContent = '…'; send({ action: 'get_briefing' }); }\nfunction runBriefing(btn) { if (btn) btn.textContent = '…'; send({ action: 'run_briefing' }); }\nfunction renderBriefing(data) {\nconst bp = document.getElementById('wt-briefing-preview');\nif (bp) {\nif (data.last) {\nconst parts = [];\nconst ts = (data.last.ts || '').split('T')[0];\nif (ts) parts.push(ts);\nif (data.last.weather) parts.push(data.last.weather.substring(0, 25));\nconst cal = (data.last.calendar_today || []).length;\nif (cal > 0) parts.push(cal + ' eventi oggi');\nbp.textContent = parts.join(' · ') || 'Caricato';\n} else { bp.textContent = 'Nessun briefing'; }\n}\nconst el = document.getElementById('briefing-body');\nif (!data.last) {\nel.innerHTML = '<div class=\"no-items\">// nessun briefing</div><div style=\"margin-top:8px;text-align:center;\"><button class=\"btn-green btn-sm\" onclick=\"runBriefing()\">▶ Genera</button></div>';\nreturn;\n}\nconst b = data.last;\nconst ts = b.ts ? b.ts.replace('T', ' ') : '—';\nconst weather = b.weather || '—';\nconst calToday = b.calendar_today || [];\nconst calTomorrow = b.calendar_tomorrow || [];\nconst calTodayHtml = calToday.length > 0\n? calToday.map(e => { const loc = e.location ? ` <span style=\"color:var(--muted)\">@ ${esc(e.location)}</span>` : ''; return `<div style=\"margin:3px 0;font-size:11px;\"><span style=\"color:var(--cyan);font-weight:600\">${esc(e.time)}</span> <span style=\"color:var(--text2)\">${esc(e.summary)}</span>${loc}</div>`; }).join('')\n: '<div style=\"font-size:11px;color:var(--muted);font-style:italic\">Nessun evento</div>';\nconst calTomorrowHtml = calTomorrow.length > 0\n? `<div style=\"font-size:10px;color:var(--muted);margin-top:8px;margin-bottom:4px\">// DOMANI</div>` +\ncalTomorrow.map(e => `<div style=\"margin:2px 0;font-size:10px;color:var(--text2)\"><span style=\"color:var(--cyan)\">${esc(e.time)}</span> ${esc(e.summary)}</div>`).join('')\n: '';\nconst stories = (b.stories || []).map((s, i) => {\nconst parts = [];\nif (s.points != null) parts.push(s.points + 'pt');\nif (s.comments != null) parts.push(s.comments + ' cmt');\nconst meta = parts.length ? ` <span style=\"color:var(--muted);font-size:10px;\">(${parts.join(', ')})</span>` : '';\nreturn `<div style=\"margin:4px 0;font-size:11px;color:var(--text2);\">${i+1}. ${esc(s.title)}${meta}</div>`;\n}).join('');\nel.innerHTML = `\n      <div style=\"display:flex;justify-content:space-between;margin-bottom:8px;\">\n        <div style=\"font-size:10px;color:var(--muted);\">ULTIMO: <span style=\"color:var(--amber)\">${ts}</span></div>\n        <div style=\"font-size:10px;color:var(--muted);\">PROSSIMO: <span style=\"color:var(--cyan)\">${data.next_run || '07:30'}</span></div>\n      </div>\n      <div style=\"background:var(--bg2);border:1px solid var(--border);border-radius:6px;padding:10px 12px;margin-bottom:8px;\">\n        <div style=\"font-size:11px;color:var(--amber);margin-bottom:8px;\">${esc(weather)}</div>\n        <div style=\"font-size:10px;color:var(--muted);margin-bottom:4px;\">// OGGI</div>\n        ${calTodayHtml}${calTomorrowHtml}\n        <div style=\"font-size:10px;color:var(--muted);margin-top:8px;margin-bottom:4px;\">// NEWS</div>\n        ${stories}\n      </div>\n      <div style=\"display:flex;gap:6px;\">\n        <button class=\"btn-ghost btn-sm\" onclick=\"loadBriefing()\">↻ Aggiorna</button>\n        <button class=\"btn-green btn-sm\" onclick=\"runBriefing()\">▶ Genera</button>\n        <button class=\"btn-ghost btn-sm\" onclick=\"copyToClipboard(document.getElementById('briefing-body').textContent)\">[cp]</button>\n      </div>`;\n}\nlet _jobsData = null;\nconst JOB_ICON = { ok: '✓', error: '✕', timeout: '⏱', running: '…', interrupted: '↯' };\nfunction loadCron(btn) { if (btn) btn.textContent = '…'; send({ action: 'get_cron' }); send({ action: 'get_jobs' }); }\nfunction renderCron(jobs) {\nconst cp = document.getElementById('wt-cron-preview');\nif (cp) cp.textContent = ((jobs && jobs.length) || 0) + ' job attivi';\nconst el = document.getElementById('cron-body');\nconst jobList = (jobs && jobs.length) ? '<div class=\"cron-list\">' + jobs.map((j, i) => `\n      <div class=\"cron-item\" style=\"align-items:center;\">\n        <div class=\"cron-schedule\">${j.schedule}</div>\n        <div style=\"flex:1;\"><div class=\"cron-cmd\">${j.command}</div>${j.desc?`<div class=\"cron-desc\">// ${j.desc}</div>`:''}</div>\n        <button class=\"btn-red btn-sm\" style=\"padding:3px 8px;\" onclick=\"deleteCron(${i})\">✕</button>\n      </div>`).join('') + '</div>'\n: '<div class=\"no-items\">// nessun cron job</div>';\nel.innerHTML = jobList + '<div id=\"jobs-body\"></div>' + `\n      <div style=\"margin-top:10px;border-top:1px solid var(--border);padding-top:10px;\">\n        <div style=\"font-size:10px;color:var(--muted);margin-bottom:6px;\">AGGIUNGI</div>\n        <div style=\"display:flex;gap:6px;margin-bottom:6px;\">\n          <input id=\"cron-schedule\" placeholder=\"30 7 * * *\" class=\"input-field\" style=\"width:120px;flex:0;\">\n          <input id=\"cron-command\" placeholder=\"python3.13 /path/script.py\" class=\"input-field\">\n        </div>\n        <div style=\"display:flex;gap:6px;\">\n          <button class=\"btn-green btn-sm\" onclick=\"addCron()\">+ Aggiungi</button>\n          <button class=\"btn-ghost btn-sm\" onclick=\"loadCron()\">↻</button>\n        </div>\n      </div>`;\nrenderJobs(_jobsData);\n}\nfunction addCron() {\nconst sched = document.getElementById('cron-schedule').value.trim();\nconst cmd = document.getElementById('cron-command').value.trim();\nif (!sched || !cmd) { showToast('[!] Compila schedule e comando'); return; }\nsend({ action: 'add_cron', schedule: sched, command: cmd });\n}\nfunction deleteCron(index) { send({ action: 'delete_cron', index: index }); }\nfunction renderJobs(jobs) {\n_jobsData = jobs;\nconst el = document.getElementById('jobs-body');\nif (!el || !jobs) return;\nel.innerHTML = '<div style=\"font-size:10px;color:var(--muted);margin:10px 0 6px;\">JOB</div><div class=\"cron-list\">' +\njobs.map(j => {\nconst last = j.last ? `${JOB_ICON[j.last.status] || '?'} ${j.last.started_at.slice(5, 16).replace('T', ' ')} · ${Math.round(j.last.duration_ms / 1000)}s` : 'mai eseguito';\nconst when = !j.exists ? 'script assente' : j.external ? 'via crontab' : !j.enabled ? 'disabilitato' : 'prossimo ' + j.next;\nreturn `\n      <div class=\"cron-item\" style=\"align-items:center;\">\n        <div class=\"cron-schedule\">${esc(j.cron)}</div>\n        <div style=\"flex:1;cursor:pointer;\" onclick=\"loadJobRuns('${j.name}')\">\n          <div class=\"cron-cmd\">${esc(j.name)}</div>\n          <div class=\"cron-desc\">// ${esc(when)} · ${esc(last)}</div>\n          <div class=\"job-line\" id=\"job-line-${j.name}\">${j.running ? '… in corso' : ''}</div>\n          <div class=\"job-runs\" id=\"job-runs-${j.name}\"></div>\n        </div>\n        <button class=\"btn-green btn-sm\" style=\"padding:3px 8px;\" onclick=\"runJob('${j.name}', this)\" ${j.running || !j.exists ? 'disabled' : ''}>▶</button>\n      </div>`; }).join('') + '</div>';\n}\nfunction runJob(name, btn) { if (btn) btn.disabled = true; send({ action: 'run_job', name: name }); }\nfunction loadJobRuns(name) {\nconst el = document.getElementById('job-runs-' + name);\nif (el && el.innerHTML) { el.innerHTML = ''; return; }\nsend({ action: 'get_job_runs', name: name });\n}\nfunction renderJobProgress(msg) {\nconst el = document.getElementById('job-line-' + msg.job);\nif (!el) return;\nif (msg.status === 'running') { if (msg.line) el.textContent = '… ' + msg.line; else el.textContent = '… in corso'; return; }\nel.textContent = (JOB_ICON[msg.status] || '?') + ' ' + msg.status + (msg.line ? ': ' + msg.line : '') +\n(msg.duration_ms != null ? ' (' + Math.round(msg.duration_ms / 1000) + 's)' : '');\n}\nfunction renderJobRuns(msg) {\nconst el = document.getElementById('job-runs-' + msg.job);\nif (!el) return;\nel.innerHTML = (msg.runs || []).map(r => `\n      <div class=\"job-run\"><span>${JOB_ICON[r.status] || '?'} ${esc(r.started_at.slice(5, 16).replace('T', ' '))}</span>\n        <span>${esc(r.trigger)}</span><span>${Math.round(r.duration_ms / 1000)}s</span>\n        ${r.error ? `<span class=\"job-run-err\">${esc(r.error)}</span>` : ''}</div>`).join('') || '<div class=\"job-run\">// nessuna esecuzione</div>';\n}\nfunction loadEntities(btn) { if (btn) btn.textContent = '...'; send({ action: 'get_entities' }); }\nfunction deleteEntity(id) { send({ action: 'delete_entity', id: id }); }\nfunction renderKnowledgeGraph(entities, relations) {\nconst mp = document.getElementById('wt-mem-preview');\nif (mp) mp.textContent = (entities ? entities.length : 0) + ' entità · ' + (relations ? relations.length : 0) + ' relazioni';\nconst el = document.getElementById('grafo-body');\nif (!entities || entities.length === 0) {\nel.innerHTML = '<div class=\"no-items\">// nessuna entità</div><div style=\"margin-top:8px;\"><button class=\"btn-ghost btn-sm\" onclick=\"loadEntities()\">↻</button></div>';\nreturn;\n}\nconst groups = { tech: [], person: [], place: [] };\nentities.forEach(e => {\nif (groups[e.type]) groups[e.type].push(e);\nelse { if (!groups.other) groups.other = []; groups.other.push(e); }\n});\nconst labels = { tech: 'Tech', person: 'Persone', place: 'Luoghi', other: 'Altro' };\nconst colors = { tech: 'var(--cyan)', person: 'var(--accent)', place: 'var(--amber)', other: 'var(--text2)' };\nlet html = '<div style=\"font-size:10px;color:var(--muted);margin-bottom:8px;\">' + entities.length + ' entità</div>';\nfor (const [type, items] of Object.entries(groups)) {\nif (!items.length) continue;\nhtml += '<div style=\"margin-bottom:12px;\">';\nhtml += '<div style=\"font-size:10px;color:' + colors[type] + ';text-transform:uppercase;letter-spacing:1px;margin-bottom:4px;font-weight:700;\">' + labels[type] + ' (' + items.length + ')</div>';\nitems.forEach(e => {\nconst since = e.first_seen ? e.first_seen.split('T')[0] : '';\nconst last = e.last_seen ? e.last_seen.split('T')[0] : '';\nhtml += '<div style=\"display:flex;align-items:center;justify-content:space-between;background:var(--bg2);border:1px solid var(--border);border-radius:6px;padding:6px 10px;margin-bottom:3px;\">';\nhtml += '<div style=\"flex:1;min-width:0;\"><span style=\"color:var(--text2);font-size:12px;font-weight:600;\">' + esc(e.name) + '</span> <span style=\"color:var(--muted);font-size:10px;\">freq:' + e.frequency + '</span>';\nhtml += '<div style=\"font-size:9px;color:var(--muted);\">' + since + ' → ' + last + '</div></div>';\nhtml += '<button class=\"btn-red btn-sm\" style=\"padding:2px 6px;font-size:9px;margin-left:6px;flex-shrink:0;\" onclick=\"deleteEntity(' + e.id + ')\">✕</button></div>';\n});\nhtml += '</div>';\n}\nhtml += '<div><button class=\"btn-ghost btn-sm\" onclick=\"loadEntities()\">↻</button></div>';\nel.innerHTML = html;\n}\nfunction loadLogs(btn) {\nif (btn) btn.textContent = '…';\nconst dateEl = document.getElementById('log-date-filter');\nconst searchEl = document.getElementById('log-search-filter');\nsend({ action: 'get_logs', date: dateEl ? dateEl.value : '', search: searchEl ? searchEl.value.trim() : '' });\n}\nfunction renderLogs(data) {\nconst lp = document.getElementById('wt-logs-preview');\nif (lp) {\nconst lines = (typeof data === 'object' && data.lines) ? data.lines : [];\nconst last = lines.length ? lines[lines.length - 1] : '';\nlp.textContent = last ? last.substring(0, 60) : 'Nessun log';\n}\nconst el = document.getElementById('logs-body');\nif (typeof data === 'string') {\nel.innerHTML = `<div class=\"mono-block\">${esc(data)||'(nessun log)'}</div>\n        <div style=\"margin-top:8px;\"><button class=\"btn-ghost btn-sm\" onclick=\"loadLogs()\">↻</button></div>`;\nreturn;\n}\nconst dateVal = document.getElementById('log-date-filter')?.value || '';\nconst searchVal = document.getElementById('log-search-filter')?.value || '';\nconst lines = data.lines || [];\nconst total = data.total || 0;\nconst filtered = data.filtered || 0;\nconst countInfo = (dateVal || searchVal)\n? `<span style=\"color:var(--amber)\">${filtered}</span> / ${total} righe`\n: `${total} righe`;\nlet content = lines.length ? lines.map(l => {\nif (searchVal) {\nconst re = new RegExp('(' + searchVal.replace(/[.*+?^${}()|[\\]\\\\]/g, '\\\\$&') + ')', 'gi');\nreturn l.replace(/</g, '&lt;').replace(/>/g, '&gt;').replace(re, '<span style=\"background:var(--accent-dim);color:var(--accent);font-weight:700;\">$1</span>');\n}\nreturn l.replace(/</g, '&lt;').replace(/>/g, '&gt;');\n}).join('\\n') : '(nessun log)';\nel.innerHTML = `\n      <div style=\"display:flex;gap:6px;margin-bottom:8px;flex-wrap:wrap;\">\n        <input type=\"date\" id=\"log-date-filter\" value=\"${dateVal}\" class=\"input-field input-date\" style=\"min-width:130px;flex:0;\">\n        <input type=\"text\" id=\"log-search-filter\" placeholder=\"> cerca…\" value=\"${searchVal}\" class=\"input-field\">\n        <button class=\"btn-green btn-sm\" onclick=\"loadLogs()\">></button>\n        <button class=\"btn-ghost btn-sm\" onclick=\"clearLogFilters()\">✕</button>\n      </div>\n      <div style=\"font-size:10px;color:var(--muted);margin-bottom:6px;\">${countInfo}</div>\n      <div class=\"mono-block\" style=\"max-height:240px;\">${content}</div>\n      <div style=\"margin-top:8px;display:flex;gap:6px;\"><button class=\"btn-ghost btn-sm\" onclick=\"loadLogs()\">↻</button><button class=\"btn-ghost btn-sm\" onclick=\"copyToClipboard(document.querySelector('#logs-body .mono-block')?.textContent||'')\">[cp]</button></div>`;\ndocument.getElementById('log-search-filter')?.addEventListener('keydown', e => {\nif (e.key === 'Enter') loadLogs();\n});\n}\nfunction clearLogFilters() {\nconst d = document.getElementById('log-date-filter');\nconst s = document.getElementById('log-search-filter');\nif (d) d.value = '';\nif (s) s.value = '';\nloadLogs();\n}\nasync function loadChatHistory(date) {\nconst el = document.getElementById('logs-body');\nif (!el) return;\nel.innerHTML = '<div class=\"mono-block\" style=\"color:var(--muted)\">Caricamento…</div>';\nconst d = date || new Date().toISOString().slice(0, 10);\ntry {\nconst r = await fetch('/api/chat/history?channel=dashboard&date=' + d + '&limit=100');\nconst data = await r.json();\nrenderChatHistory(data.messages || [], d);\n} catch(e) {\nel.innerHTML = '<div class=\"mono-block\">Errore: ' + esc(String(e)) + '</div>';\n}\n}\nfunction renderChatHistory(messages, date) {\nconst el = document.getElementById('logs-body');\nif (!el) return;\nlet rows = '';\nif (!messages.length) {\nrows = '<div class=\"no-items\">Nessun messaggio per ' + esc(date) + '</div>';\n} else {\nrows = messages.map(m => {\nconst roleColor = m.role === 'user' ? 'var(--accent2)' : 'var(--accent)';\nconst pruned = m.ctx_pruned\n? ' <span class=\"badge badge-amber\" title=\"Contesto troncato prima dell\\'invio\">prune</span>' : '';\nconst memTags = (m.mem_types || []).map(t =>\n`<span class=\"badge badge-muted\">${esc(t)}</span>`).join(' ');\nconst meta = m.role === 'assistant' ? `\n          <div style=\"font-size:9px;color:var(--muted);margin-top:3px;display:flex;flex-wrap:wrap;gap:4px;\">\n            ${m.model ? '<span>' + esc(m.model) + '</span>' : ''}\n            ${m.tokens_in ? '<span>' + m.tokens_in + '+' + m.tokens_out + 't</span>' : ''}\n            ${m.latency_ms ? '<span>' + m.latency_ms + 'ms</span>' : ''}\n            ${m.sys_hash ? '<span>sys:' + esc(m.sys_hash) + '</span>' : ''}\n            ${pruned} ${memTags}\n          </div>` : '';\nconst snippet = (m.content || '').slice(0, 280);\nconst more = (m.content || '').length > 280 ? '…' : '';\nreturn `<div style=\"border-bottom:1px solid var(--border);padding:6px 0;\">\n          <div style=\"font-size:9px;color:var(--muted);\">\n            ${esc((m.ts||'').replace('T',' '))}\n            <span style=\"color:${roleColor};\">[${esc(m.role)}]</span>\n            ${m.provider ? '· ' + esc(m.provider) : ''}\n          </div>\n          <div style=\"font-size:11px;margin-top:3px;white-space:pre-wrap;word-break:break-word;\">${esc(snippet)}${more}</div>\n          ${meta}\n        </div>`;\n}).join('');\n}\nel.innerHTML = `\n      <div style=\"display:flex;gap:6px;margin-bottom:8px;align-items:center;\">\n        <input type=\"date\" id=\"chat-hist-date\" value=\"${esc(date)}\" class=\"input-field input-date\" style=\"flex:1;min-width:130px;\">\n        <button class=\"btn-green btn-sm\" onclick=\"loadChatHistory(document.getElementById('chat-hist-date').value)\">></button>\n        <button class=\"btn-ghost btn-sm\" onclick=\"loadLogs()\">Logs</button>\n      </div>\n      <div style=\"max-height:280px;overflow-y:auto;\">${rows}</div>`;\n}\nfunction refreshMemory() { send({ action: 'get_memory' }); }\nfunction refreshHistory() { send({ action: 'get_history' }); }\nfunction searchMemory() {\nconst keyword = document.getElementById('mem-search-keyword')?.value.trim() || '';\nconst date = document.getElementById('mem-search-date')?.value || '';\nif (!keyword && !date) { showToast('Inserisci almeno una keyword o data'); return; }\ndocument.getElementById('search-results').innerHTML = '<span style=\"color:var(--muted)\">Ricerca…</span>';\nsend({ action: 'search_memory', keyword: keyword, date_from: date, date_to: date });\n}\nfunction renderMemorySearch(results) {\nconst el = document.getElementById('search-results');\nif (!results || results.length === 0) { el.innerHTML = '<span style=\"color:var(--muted)\">Nessun risultato</span>'; return; }\nconst keyword = document.getElementById('mem-search-keyword')?.value.trim() || '';\nel.innerHTML = '<div style=\"color:var(--amber);margin-bottom:6px;\">' + results.length + ' risultati</div>' +\nresults.map(r => {\nconst ts = r.ts.replace('T', ' ');\nconst role = r.role === 'user' ? '<span style=\"color:var(--accent)\">user</span>' : '<span style=\"color:var(--cyan)\">bot</span>';\nlet snippet = (r.content || '').replace(/</g, '&lt;').replace(/>/g, '&gt;');\nif (snippet.length > 200) snippet = snippet.substring(0, 200) + '…';\nif (keyword) {\nconst re = new RegExp('(' + keyword.replace(/[.*+?^${}()|[\\]\\\\]/g, '\\\\$&') + ')', 'gi');\nsnippet = snippet.replace(re, '<span style=\"background:var(--accent-dim);color:var(--accent);font-weight:700;\">$1</span>');\n}\nreturn '<div style=\"border-bottom:1px solid var(--border);padding:4px 0;\"><div style=\"display:flex;gap:8px;font-size:10px;color:var(--muted);margin-bottom:2px;\"><span>' + ts + '</span>' + role + '</div><div style=\"font-size:11px;\">' + snippet + '</div></div>';\n}).join('');\n}\nfunction killSession(name) { send({ action: 'tmux_kill', session: name }); }\nfunction gatewayRestart() { showToast('[..] Riavvio gateway…'); send({ action: 'gateway_restart' }); }\nfunction requestStats() { send({ action: 'get_stats' }); }\nasync function flashOTA() {\nif (!confirm('Aggiornare firmware ESP32 via WiFi?\\nIl Sigil si riavvierà al termine.')) return;\nshowToast('[..] OTA in corso…');\ntry {\nconst r = await fetch('/api/tamagotchi/ota', { method: 'POST' });\nconst d = await r.json();\nshowToast(d.ok ? '[ok] OTA inviato — Sigil si aggiorna' : '[!] OTA fallito: ' + (d.error || '?'));\n} catch (e) {\nshowToast('[!] Errore OTA: ' + e.message);\n}\n}\nfunction renderTokens(data) {\nconst tp = document.getElementById('wt-tokens-preview');\nif (tp) {\nconst inTok = (data.today_input || 0);\nconst outTok = (data.today_output || 0);\nconst fmt = n => n >= 1000 ? (n/1000).toFixed(1) + 'K' : n;\nconst model = (data.last_model || '').split('-').pop() || '';\ntp.textContent = fmt(inTok) + ' in / ' + fmt(outTok) + ' out' + (model ? ' · ' + model : '');\n}\n}\nfunction loadUsageReport(period, btn) {\nif (btn) {\ndocument.querySelectorAll('.usage-period-btn').forEach(b => b.classList.remove('active'));\nbtn.classList.add('active');\n}\nsend({ action: 'get_usage_report', period: period || 'day' });\n}\nconst _providerNames = {\nanthropic: 'Haiku', openrouter: 'OpenRouter', ollama: 'Local',\nollama_pc: 'PC', unknown: '?'\n};\nconst _providerColors = {\nanthropic: 'var(--accent)', openrouter: 'var(--amber)', ollama: 'var(--muted)',\nollama_pc: 'var(--cyan)'\n};\nfunction renderUsageReport(data) {\nconst el = document.getElementById('tokens-drawer-body');\nif (!el) return;\nconst fmt = n => n >= 1000000 ? (n/1000000).toFixed(1) + 'M' : n >= 1000 ? (n/1000).toFixed(1) + 'K' : n;\nconst rows = data.rows || [];\nconst total = data.total || { input: 0, output: 0, calls: 0 };\nif (!rows.length) {\nel.innerHTML = '<div class=\"no-items\">// nessun utilizzo nel periodo</div>';\nreturn;\n}\nlet html = '<div style=\"overflow-x:auto;\"><table style=\"width:100%;border-collapse:collapse;font-size:11px;\">';\nhtml += '<tr style=\"color:var(--muted);text-align:left;border-bottom:1px solid var(--border);\"><th style=\"padding:4px 6px;\">Provider</th><th style=\"padding:4px 6px;text-align:right;\">In</th><th style=\"padding:4px 6px;text-align:right;\">Out</th><th style=\"padding:4px 6px;text-align:right;\">Tot</th><th style=\"padding:4px 6px;text-align:right;\">Calls</th></tr>';\nrows.forEach(r => {\nconst name = _providerNames[r.provider] || r.provider;\nconst color = _providerColors[r.provider] || 'var(--text2)';\nconst tot = r.input + r.output;\nhtml += `<tr style=\"border-bottom:1px solid var(--border);\">\n        <td style=\"padding:4px 6px;color:${color};font-weight:600;\">${esc(name)}</td>\n        <td style=\"padding:4px 6px;text-align:right;color:var(--text2);\">${fmt(r.input)}</td>\n        <td style=\"padding:4px 6px;text-align:right;color:var(--text2);\">${fmt(r.output)}</td>\n        <td style=\"padding:4px 6px;text-align:right;color:var(--text);\">${fmt(tot)}</td>\n        <td style=\"padding:4px 6px;text-align:right;color:var(--muted);\">${r.calls}</td>\n      </tr>`;\n});\nconst grandTot = total.input + total.output;\nhtml += `<tr style=\"font-weight:700;\">\n      <td style=\"padding:6px;color:var(--accent);\">TOTALE</td>\n      <td style=\"padding:6px;text-align:right;color:var(--accent);\">${fmt(total.input)}</td>\n      <td style=\"padding:6px;text-align:right;color:var(--accent);\">${fmt(total.output)}</td>\n      <td style=\"padding:6px;text-align:right;color:var(--accent);\">${fmt(grandTot)}</td>\n      <td style=\"padding:6px;text-align:right;color:var(--accent);\">${total.calls}</td>\n    </tr>`;\nhtml += '</table></div>';\nel.innerHTML = html;\n}\n",
+"gz": "H4sIAAAAAAACA8V9XXMbSZLYO35Fi6udBoYECEoazSwoUSdRmhnu6CtE7sytKS7VQDeAlhrd2O4GP4bLiH1a20+OsO/OYcc9nCMu/Gr7xX7w290/mV/i/KjvbjRASRue3Rmi6yMrqyorKzMrK2uUpUXpne5//7uXPxx6D72rjSANkssyHhUbA29juygD+L2tEnu/Gd/7amf8m7v3f9N7X2xseRtFPIkTsywl9Pp3798N+nej/lCUK/Ng9CHKzZIiqff1V9+EweirYHwfy17vtkaM1Wi6SD88z4KwQMwgfbxIR2WcpV4CifuY206DWdTxrlrx2GvfMmocY8YJ5lQSAVganXuv82wWF1G7nUdFlpxFW14evY9GZcd7uAfVGAdsOcxGi1mUlr1RHgVl9CyJ8KvtF6M8npd+Z7dV9Ip8BCXFOHIzmJyliCnkiDY4LcrzLIfENjflhVESlZFXQXRXYNRGdJ9hpbZPZTzf2/So551dD8ZFYTiNgrAXzOdRCsMTJ2G7AOyu8d9WHpWLPK1pBPLUuJ4mwc+X+0GStKnYljdOt7wgnxQ4kAKCHnsq0+mV0yhti77QPJzHaZidH4/TE++LL7xb+rNH8DuegKQz2r1ej5rhuc+SqBdxf4+pkRPqMfd90/MH9DlO8beXAt5hNI7TuAx81V2LVB5L8qV2oC8SA91fX5G4v+X5ViVICHCcNcwcxjfKbwzVqVaFexqkydNouJgcTrPzdaFalRpgPo+L8sYwsdKy/n8Pq2EWzG/We1GpBs/FPITVdYjc40mZNg0qcRhC06lThVpEJeUeAseJ1gFpVajCMxo8SMN4FJRApGuAratXhX4efOAy64BUhatwymwySTiTZnEdcG6dmhmisk/z4HytuVGll0F6kWXhUTyL8vXBqSrLYB7Fow/rg8PSyyAdjqZRuEii9aHJGssg/nAj3H6oxY2y9rPZLEjDtcjZKL8E2iGsy6PoolwbnKywBN6ro8drg4Kyy7jLqzKAHXoCG+darKBSqQa7UZ4lyVFGNP5THE6i9fpcrVaFjRvGEYszDTCFwCN3mCP16WIKnFxkfpvls/UgOpVqoC6Gs7i8EZZWlRo+wxm/Y+YGHHNRrAe3puJS6E9JOroRXK6yjLJuNAJWFQXxeMOSEFC+dTZ3TLJ2ZisBt1VdSeyJVMLZ0UjCNrckTKjbTDBd7Qgkbzv8nKArnqy/FEvVScgW9ZdkazrlB5FvMhf1LbmDSoA1rrtqLFAqUF1bmGwsDiplUzYlmYRpqBcmRRnJTBAaDVnxpDfO8mfBaNoGYZJkcVdYBTG9zBcRTHpH6iVH3z978QyVpePWlReHIIwCXdA/STCMEvg+ivJZDJTgfZdHUYpUMxqBeA45v+r3x+N7O753vSUrB7MhUZas/Bi/vf03RwKqrjseD/v9vll3dBkgeFV3H769g1EkEXIaHo3MynkUUjlZ+U0Ueo+TKC9lbbPlu/CPWVmyR1mZZtD7MQbRXdTXtYf37oXjsVl7Ms1IrpS1v8Nv76dpXEZu5aiP/6PKJ4YGCEpOcnk0BVWsHYdSAeRfShuSP4TG1oOF9Lgs83i4AH7iA6EE3RIhQJNQE7QGL0qKqAlCHs2ys6geCKkdSTYKYKFmeTCJsL2DMpq1/TMg9ygxGvP+9CegGkVRs6gMTEXzj4sovzwEmh2heOljNilrDzcIRHeUJbDiTxAAdhvzO0plHaHOCgsJFuYccAwPy0uQYpZ1CUBgdWdsAFIJmYArqPwAC9bsHAjj8scgWUB2tzuc+KD45fGs3aF+G0wWitO8HIRtS2s0BmZSOzAdHhUEZ8yuCQ6aAvLyzrGH6SJJ+DOPAN0UxorYmJU1g/nKL5+lwTCJUA0fBzDBnDVa5MALyqNgCOkwj8V0mAV56IvcaYCdPotDguiPkmwh8wLo51mEXNRoTXU/KkbtQhJkeTmPsrFXeLceApACBiyFgZM7DnSDq3uPoN/ewDukAqS0yyJAcvMkGEXt7S+2J1v+F8FsvgtDr1IfUGpSWol7lDixEzco8Y+LzE72KflXd3+z69uKsxjUtqaseZ6VGfQY5xKL9CgBiBH6Ad2bluW8GPjYmXOQv6A/8BfGjKcrOvd+ioaHGfDdsv3u9hXVvR5sb9++UvCQC1xvnxfvOlirl6VAdak2lAg0ptPQXCxAIIKWn1wCkfjTDFbINAqSctoNs1IuEqz1xRdYuTdKgqLALbiHdB7EoGwCpt1sPE7iFOgQe2yX43VvldpiBgrQVdGXsESRWIzGcUSxdZtGUeoYJVGQ41e2KN3s3SU0DZJHAftX+4poMEthhIdZVgJdgUZNO1SZXwrSa1pwp7wuTiNeGECRNIE7PvbcbYEFCVGFW4H17sGUwbaJtjf4EtMFq6TAEcDkzzFhOE4NowujFHrGlOxS4TIuEyr4NC5oEIsi83HoEGgEUx5G1N17/f5OR+34PU2EeTTG6tv+rlioWLkyIcAw5eyJnC3vLmzPODxiOGw7HyTR+LQlcc8AM5gcPV5TkKOS6AUnt397+Oplbx7kUCPq4T7TsdcnzROlS7NbgQR+jiwjCC9JWqSOqmXXe/X62csOlqC61ADzpHh82a5pwkZoVkxkU/Czh7yN6QZNb0Q6CyV9FVQEQfbmMQAVOQAJ4BqZ5WxxobbBs2ETmZxFOVbuDgMQEyWRnA07UK1XgsC5z3sWgFDQRRW1zY6a4DOBd+XWJ/fWUQfqLWuA6+CYkeRQHRq9PHF8KFNMe4G73fFJR0mgM14ytILdkUelw1hxnmskfSKbOQG+NKP2t7yIVBVer6vQOw0z5HwG6JAMRyZoMrpSDwo0vM4KnxpYAhpt/MWnUcUxswZYNWQK8XFTFl9acAdhymA1UdIwxSTkERdIOlBy2aSWsKzZjMwwh43ca5ij2lLDv4a03yioXI4EgUVK9uoo1Ftr9sHEQJSlccw+wCYyXM4DcVLaUB123QlpG7jvIg5DgxU+YYCv9wdm+SwltokV1N7HwtySOcUJOC2ncfqB5Zgrj88ajkRSu4kgqDKZ8H3WunFLNWvKcws8WqCqMD0rAUq6bY1R4Yp/BjoD9jdDJrt0yoiOkAWCHBTGhSMcyoZg4YF4TLaYx/jzCfIdI2d3xTjNg0kkeooq5z5KlJKNruoVSmeXjcNkMGUaqC1czEh73sd1ezlCYuPvgFbG3GHFKqsyUq9xzWFKQ/NTkL9E++s1Lyp8rvb/uIhHH0AkUMxxVfuywudCQMhqBYiLo6lBUC8o/ZCSqUoeFYukLJqI60OancOsT6LTCXB0E9oPMuc7zKBqgGFcxlGx5TH0hOSjRvhU5fKUDzRDAi8LFQtQ6QvQjNC480yAbmQYouMsf9Iad9U5xpK+FLMu0zVoU8IUnLpMETr8sbisAR25JWR3yW6BbXSLGSqX3Yz5bX3eeEzyP+/oTZYBVx7fctveoVb6viMHNLDqJJsUtGbVDD+HFLXFNnKgHHplVd2HFCr0Phs2zj/m21V/CynrVj2dS9t9x6yvjgFWcE6EkC9Sp/abRbqyZpl9iKieqnhEKWsN1wL5MHLsLC+Npn+HyW8odS0wsOejUDAxQDwRSWvO2uW8zASbNmwPcgYxl0tK8Z4METpzrVbKLChK0QiZZfF7rd06j1DYPA1GvP2DeJiXbyjtpyAuGxlBMV2UoKKlqvLS5c2NdGHHzJMA9gxDhQ9CyEeUG/dIAaDgI4mOw639g8R7HXtFjOh7xTyapDCA2S9//u/+7lLrXU/ARFBViIcIJMZ6mRej0SUvBLzlwxGcRSGuldm8NIn9ENNfczJVEUUahxbNtqcFHXYjpNrzbWLfWKQJUlYG9vqt0KBh+19CiOaZ31rUKI5lOgbDkac7WDIGHtvYfe2goIdRu3Wsg8JU+DOYKEjHiHXqh1E0P0VTUHrK+7ffWU+ZoZpdqilIS26B57CDr1lRNrnm7ombm67tr9KmSLBh0wSg1CHEgJAuUbuMizmsUFwBQ1LozJ0Y0aiRUDHVWT2Pz87iwHsKKHnPCSXSeGvGWmhi+LtHrKf4KS6nbX+eLCZxeso2P2GtkkoW572hKT2Vui9BkMZTVX2LVS7D+YmgoP+Zx9u/lSz3oyaV/jWBPhEkNfCFPi/sWDYRCTTOge6msBxMvdPo1/lKI5wAoOiJzHDnGkRoKKmSZOY4mHgYdsLlQVMFEbDD6b35opjKJJkPi3IOejCZNJ1ylLXp+f/yP/d9VR7aCWPkEy5Qlb7bmp47pMEl32dx2va9f/k/njhd6HZ91nCtI4viPIZ5+DGOzttlMHxpuBSapwQw0ipXGAZb1imCyDU0T2sreIxHyz0o1D2Dlnxt+TlDC8ZZjbmZTxr8TqcZZBqcdZHVGSDpNDNtBimMboBLE2Egvkj8suvC7ga1OlTX3WJlAxI+IPfE5ir2/vhOoX/Mh2nB8OHG7SvR3PXGyTvRJAPqCIDLm6V9h2sLFqvOdnDeoPWifAxbLmkz3+ZQTDgvhnlwDlo6yGudOjCwuY1jUkRsl0LHKkukBLoZkAQ5p255Qr0QDqURl3vosbqRFYAOzCFC74pMcinln0soyJjpElEvm2e6GZhWVG8EdNg0CSvJibxXHzXPYqrGXhsB3NMJgH8qc+lswq5oaO91NVV2TVXQkMeZX9FXYbJ5Jl88/tvTw8cvXj8nX4Cdb/qS4kfzxfeMkWCLnIy8zU53vQrJQjqPjaPc+eL1iLhZ3IPfp2dBglysb4Lc52z8WckHtVLVh9+nc/gw86ej/fmicVcYdaHdLsBV2wFW6XBNl+USkqCuMtq9Mvs2vojC9k4HWfqvSYUl/isbfxPMVjQOq9NuHKp0uKYrb3BXqSGrhcPFcI1GisXQagRqdVT9aj+hNXlYLZs6wq2ruSGcI7s7WKkjKldbod1Q7Vqyod/N0UC9oqkFFbIb44odBaLaINdym4TpfBLka5DJMMhla1yHKJl+CbHvPA7LKUAShC1nyywyBPF9kmeLNNTl9rxv+mgGOQvydheE1rCDxKQy7xuZ5E1D2TKBPEk6vl64MN+r+4NEYfSH65A/A/1y+mNTn1XE6o8oB/35qtoflfl1U3/Q5cfsDRLJ6u4Q6Rn9EbU0qymZUbwAAbA3A6Fpp9/f4mL73jag2/G+9HbodFNUdUagNPpvl7AGgAHaXZT9t3usewiawAfFxvCjho89heQVQ4A17QWBlTqisrMYZJsOP8GSqxkKtWRxFFGvo0FUFx/WspkKpqyeWmrNmFpRizyh+KczVU7f7ELWbMmS9fSqc79edwEeVw775bGekfTpZ3tXoAE2H5jBeHOS8sRCDVYcl+lMYbkKyanl8dHRs5f/5uDVy2fYO6fQZZQk2TmVO8zKMkN9rkTnxoyG4miBaa9+YO1DCcfY9VUbBw0PrhvFW0Wljqq+5tYBQ79yl8LpMRuTlTqq+srGlPjDihqzacE4rBxiBnrDkHlJlE5gWPdMCatjSFW9YhqP0WKoOFlzTbOEqmoI+5b8bqRrMSxIz4KiadjmcXeEleSo3RJVYFD4Vy8bj4uofB3kNGoPpfar9EhuqLzATY9rkAtfioPd9u+EWqEK58gRhNdKGJ3Fo+g1yFnJG1RosMUdWTKPiGtqeE9wXcfpZD+JAY035N0FhTlfsgesJT6+xMZUgWkUT6alLCG+ZJHyoleMAnQ0nOdbmKbNURbMLW9qQ+C65A1FCMG2A/8/h3J6ldzUo5GwgdX3IaKiOAZL3BizPET7oXBl5Jp4EP6TGAwYS2BGXhv9/lBs7+/CnwcPvSn+3YS/sDneI0qBisNoEqevYQdFazYm0NFthl26FCkIG1LOdQrjyVRYvxAeeHdkC6CAJiu6NFvQyZvVo3HG5rKd/vzC2/gtEEKOXm/eiyzNNra8Gfwp5sEo8rk40tzjJJ6k5PkIQwpDxMhizpOgiLAbmDmLwzCR1RA5ukjivwGenyVl4IFaEyuz9tvFnf6d+8Dxz7fvwPRu31FujpUV+Bzgk0MSIBdcQN+2PPJ5lePgTC5m6fFVc9f7Sif+NoupO7S1CYTN+ZLqeRkhfzyHaW2bCl7X21FleCmjsGQVIM8NnjKDaGImmhhm0SzgxZubmsHgqm8LsJtejLIWIiIbRMKbQgs0IsfxCSDHo4IF25gDJNj17jDviYm99DsmBV4wvZFd1CBDTkZByyFENQeaGrc8EgmXUB1v8qZPsAJhsN8tkCOWgyA/eMur2FWQpaNQIX6sayoX5bsJ3mbUbAVIAcqtEK9kW6ZAd0smIrtVH2JuDaRm85JM3A/C+MwjeeThRpqRsavY2Nve9tA5cZEGngAReUFZxmfBg22osOdb5vU4TaP8+6MXzwEgARb7JneiI3vjWsj7Enbsm6tNSATlLCFXRtEBPLQoUOR61+IbACbichAR+409UaC+CBpRNvbqckAAgwzq3gP0xNy7fUUO0z2yB10/2KZELqCbGKL0lEpYeAqBnp981L7hod9pPPrwcOMDckduqO3bgP3Oxt4v//j3D7YZlITNDb3rCEOxc6JhDjkO1Voj7lADXVEWaSR5uvnoELaDYmNMgmLkV7080XXIEEfiFHbBlRIjldLEjkgil6Hk3hkuOiH6qp2CKJuOcZVY4pjAyYsdZwjNadpmLpJ2W7ZrknBLWhRRzhZN2/6GWMJmwKXmwtd+YHvek1XOwPghaUecwvqKEkr8YFFm/s29vuh2jzniCOdNVMQ/RwfYjlYoljRYzVFKNGbRDafvKQtY6J0+GcPmF4Z+u//946PTVz8+e3O4//glVL/fhw0D/wEGMb8wCz07PDr9/tnBd98fYbF7u6oQbJM06JMYdgb4Ny4WOWy9Zt3vHr+GSt/sesY/UBcEq2AOqpz3Kxof6Zxq1jw8Otj/4fT133roM72rakao33hkTg9QFyyD9Gfc8RMPxI0wo1PyaAKTlsBvcsrTcR0CHKar1qyYFAPv+GTLq/kHmriKwy0Pxi+SZEKedyA7bMHy3PKGWQhbyix8naGPUngUxMl1i073BihDwlTTXxsmOl6iP6s4WIt//hk2Ve+YqlGdTqvM5gOSz7EJYBcz+SVAkKyUt7hTMg8pH0Rrug0GWcCQBkRbgG1QvMjyaMDnmFtkUIaS6Ayo0tBZ8Ek0pmIMD0tFoSqQB2PsTGsKEleUquTKkJWwTPfRxT0NilEGvQJ4KOxHTBQRKEykigYgIbTMkBo0K0+yC4PRDLOLlWxGEozypYI6GPSBwPVgJEUIDv5oiKYBjBhhcFEe9nVLA2BL2zdh2GYA5gE0fb5Z2z2UtiBUTqxT9DndbUFXrVgbusvL8higzA7DZ2fQGTz9iGCjaYubxsATqfSr9JC+t7wrIA/YNM4ipih1ViF0QGZWr4bAZ8/wbgletbHTuHl5kbPTyzgdJ8uMDQKfdjQQs1bbjLICfQGC7HjqJ+l0dUdrVIJ+dqqwuYimEAbUFzPzbbIoptqdl9L4fme7BtZrtCjMXOLVVK3U0SgZZUQNglRxLlyXHaITUVId7PNnR0KQZ2KKDJGbsWFjJtP04KkbXbMq6nKmP2HpMQbEdrhnPXm1Fs/T8XtEOj9vRN6eWUakdW1uX9MDF+8XweUwIp9mJCRBHhITYKfentcnCZnTBB/EFE4wGCEm2ljv2fuiayrJkhCITS1VGntg7SFfo5j1lD2QC2oaMxuVd3s5R/NgyOBqAKZecGHvbtgfBM9WxeX9KGeoeIzbsXHfvK0xB52uR5ZIZ5dHWUFu3nZACXMtNJA8rVeaHFOiu+XSA2Il5oi2FzUw+v6TnlouUlNFuOnYpCguT8sDSeisNWdbXso+JYVSnaVbScheHEX0LUxZ2a7Yf7BbMGchzuYR7jN8IkA3NNPRlG5edXe2xMersWAtBgsjHOnugKmtGwTMersS5zgHqAGw7jgqPCmgci6jROoRyGBACmTdnhej+pRr0SZ8ulUh8Y93LfQtSF273q43BE75gR2grmkYtEyzay1N0euIbPy8Uh96qWG0AG2ezRZ6GUM/MPVBlZds2gt1t0MFNx9ahN/tEijzkjU2JJxP7JXfxclnjMVA7JE946olinfVmNQbWjhbTBDVcbCJjWP8BG+0UqGu3REQ3GKZtbm62y1tImzJMYWf57D9g9DFKQ+A2rug7cFgXgIAEyUeHiiRZB02LVZyoTe75qQp4JiGoAnsA0C7BgKUofrXn4PYZ5rWeZ7aWJX7CKswxglDSZoc0XqkQNFfvWXSJ0LpoRBPP1iAN666Xovb3WNHIHMmHXsPg7rLzcqudLsN6N5ipHBO4xREoZLZPvf5yQIFtlkH48GNad8eE364qK9b5vamWlNjxeg4CBqji5k8lJrtm2zD4gyClw1hxJCWcLNJsnMmqzqyl+0geK5VQ/bu0HHVVFTjFmqqLReVeSjEBXYpGrvFHdU4uECbOOPYVTuc1owbxW9J7bVNWnVqW+Uu1rXKxIKBGAy2A83Q9HASzpE3EFf+hTwZpKWxkHDXe1QnXFUYyACaeuQFFkfXzF42QpInNnFLxgqANUX9CYZF22WcWLID/Hqn4/DUh5QlRsmW26pynVwB8rJvD1VwedmB3K1Bde/ZJtd6/YwWvaWBwWDigHYJkCjgePIIv2EpL4uFV+/bXN8sORrbil82v+xisi9ymUJGRXHEhjE/wAOPbhEl48E4iS54v9oFounSudXgm69+vWuczJ+txgL+1Pd9SIEBMJuxgEbkmYW/0+//msZF8MWVA4zlnGbCLiaKJkwtlEvLm83yhqNbimmAbzuKMsscxB2k2Ljqm86B1gRAql/rx308mp/IHHlndT+bx4HPoISJV92lR2hH2X4Sz8mxsz0T1094bs3OQOdgt6kko0/mriRizMUPsiQxP3W3o9bpLBTy9kzrclyxsnxo6GjgDowrvnRvvSmc6DzgocNy9uARLHHxXRbAsyDgGzxByLO4PZltD7DKlJo+ljFcGZ+efvvs5f4zbOvtxf2+/Nc37UOz8CWe/qG3vjDtzjMd6AQSTMd6CZELGUfpIkIElQd1Lbp4NW77b8k0btWB77vSNYDqPEARUKDfVUfcEQYfqULbEg1tevf0bGHZB8TRuzvAX/FzEw94r7Une1ADjMBhL2Sb4ygdrdUHgT+Xp80EeHebmnnAmjFnPaCmO6p7nEq4iRRVR+BO35t44ndtzdAB3ehuF/nICL1D5yCQ0oMdNC7b222c2uM/0CSnJ5v4t7PdocMfRA4mNqZFFnu/9u60YJulkxp5+gLcJR5t7GFnsXCvgIUZtUHP6rKfpzjC8VsDzleBZt5++fbL9vEfvsQ2O/ixPdmC4njsmE72bu882BY//U5L1/rDr652tu5de+3eZuf29mSmqxgITTec+uaBjj1CTL9igHB24Gcd4Ro0m9IZGRQz51pRwzxvWtSQi0XhT4VH06GJhJIE0CHgbqkkUUKLhvZuBybc+AR5POnYpzZYu4OYKK4g4OEfbt3mB6oZEqE08JSWhBEd6G36yGQIb4svb2+Lyy6SNHODkZRipPT0vU03/wT/3qbJVuen6ojJEqU+clcNu3Ox15kHdno1lBpZKOQShOLq2hWSJQIphyiJebQA6bo9orO3Gm4o9g8gnD21hfB+AlUcQ4EiROabNPai/BYVNw4ixRZvKSp4+iG3KEOXLXnHaoDeUZu/qKzAGOZMY/NDiPIuRKyRMbfSUuJgxmarHAOiCCmXXEWcrDEZtbRR94oqDzynGlIv/xhw7APrkAjPYbzrOrw4wASfc17Z5iA0NWts8EtK9hYiRmsc/M9uUVgT+TwIlSmmo5XmVMvebSmvJkZSgzUMq6IpbeRj0lV6nCzgoiZOU4kcSDD0bCnHiUhqRMGoCDeI5XGv19OWvRMgKIy/A11lw+wF7ikXhi4x1LFSuDtKItX9qEg3Jqcg8U2YGComfCloK6/Ys0ZJV/bI7rYbVERake2jCXX4hupbBGodHsLFKGUpX9p2/vhb2NfzWdZpOfQl5MsG6qgJIKJjsokIUnWRhXBHz3HU20DnISygnjxPxd/rLScsKe4Hsb+AovZcTA6ltq47aioBEzaL20cCfKCprf+G0VfPuFXUYgXq+OChd4vagO/TWZZH7uEH18FxUX7EaglbHmfG0ndOInQXSO12jwfq0NVHCiKMzCqkqXXCsn4MaHgWKTuswsrCosZBDxpdNh96BgCZh/aR2pwl1OWG8PnoM6gbbuLo3O35KprQrlenL3d1fmWH96MkGGZ58DN5Tj1A/UnKhGFWFht7lLTXA8EQ/zZ+8Z+aQ13WH11jimvfcZarHbJnzbgxOq6SFS9Gm0zN2IzoLqvcgswjMCuYGN+B7rEUYcOyTi35Pppn2zZNo2Z/t5ZreTX7iecS/vJjoYblU3ckx4zSFi58HARvvkjw8QcVA6l6ZIfjRSClUIAC3WlhRExw7+TVxFSQ8RRwyJ2qIos5r3ImbZ5wroMmJ9izDNdCwy28cLzQ/AfZnLAjd6iHGxt76JGfwAoDDvFgmzORjAU+ih7m5kUKKNawRBkI4gO/lN/VnI5CMcVx/2eDDWdJ7YNbp1z+WcmWgVXn+kNcfcEumwsQKtY/6mFMTdu8X/txYy48ORPucOW0ec6ufUmPa0bhKxql4rgvjxQQT6fWDR31yHkXPyh6huX1Vh3c3YqfGleVZ7V14y2d9qR7XX0hngLT386UA2HQ99khsDL0n+6XiMLceg6KZvQZ/3CUx2ext0jFMoQ/8Qx90gDd5CzIk8zvmGfZomV524f74b9Er5A5ECIoPqVYVQOtsVJpJBL6Jb2UjZVqcxwcKBGjBSUprDPwzKpbouHBag9I0zmeImv9dUnfHlsojhtsgMMrh8ULA9iaYoxxTvaNytjG6vD+AFiKhi0axTjdlkMC1BrH+aztP5NQ2bEwU00+8hsGm0fl1AyMw2G2ndHjsF9ybF9E6aJtBQyvGTIq2Q3zbI4RiKyIQgwNGWaU+nVRANQ60wsQ5sqOLC2zlPiUlSsmUWCUGYuIwqivVQ1mNi/N4AwgwKErJnETDD6PPq1kPV1gnPbvg/jDAuO0Y/Ay+H6Of9EcOoKP1/vwC8PBFFH0Ab5fwTi8yRYlRbMf4g2TAUaehL++d230bx9H0GwU0rqB3TAmccxt3TimJSYCmDAf2Uhgmvw00MDkoUIFvmxJ0xxWviAo8TyWWSfEjTQOGIsch921rOGIOpV41HY/ls5k7AVNZwpQ1YeQzkmg404I5jBcj6pU+0Jrphimt8JQR8oG/hXkAACWYxg2YdnZdRceRywkgXh1kGnFS56+efzTszen+99+Rz7DMk7aAEPrMFv1f/mHf/ZA2kxRCJVB0+jVBdqjoUDNDQIzXJ9xhwAlCxV3DUTyorOxtx/k8ShQdwfoLQKMrzfwONKdQuPf/zcPo+x9QtMUpE80i79VozcDg1KxuHPTxg7Ap40+xviroP+f/62Hkf48jNn3CX2gaIENQ1dcArHOBnbb//W/eIeU/pENC+9TjqEBDb+JxnlUTO2WRbywgd3rf+c9WUw844mXj+y3jDxW7XYdHIzVW4XjvvwDsDa9x5NJvEgnsdMZClFoD+O//LNHkQs9ij54k754FMawC/JPnIV4UCueOXD6aEY1fOuHweVbf0tM9auJgeFNW2ts5hx4uW7n68nkr9PMDFjcVLdzt280RCNuussjm+MnINrn9G7NgXqFxH4f4iHe1VUF+FxSVLQEp6YATyGV7zIcI0zPOcWVXyfKU9gY4yk8p5g8Ck/B/M+Bxa+M7zQao+KvmfSxhHLSsOGJDhHZVmIiIsRH+F/hCzBQiK2GKOgdYBpqc6utQYoCHCTb22zdYI1bU2dfJ/NXY7YqJqUGoD06dCEJRGyuzhMkenwsG5GBbpOU24CgpKdVOMpyzWiyAee61ZY4GspLKAstDaPJJZTiwp9aJ0CDTpktRtNDtF/9no1WXKhGTKKSZOkCJqnQIYu1DQTEHfyOUNMX/lu/hz7UX8pobg6HqNKa6P3lkqa8rtkpsS4vKSBODTexUf8N/EN+lPXIXnesIOlVpD9ElyQLGsIkP6EBGXxw8KwYBXMOzewyvo6Dmwh7YT9xRyqmPIlby0bK4Wc5WofFNDiItvQ2q64u47kOdiGyitp0vqUdBu98hZeelVMsHaiKi5tfevch6z4++dFxX86xvZPMs8Y0OIsnGFUVZ5jzUcSuSe6d53EZHYm6jQW4BfMhXkODR98qj5ypMDwwrG6KOcnFTsdBkuAxFeRfMhTDRbsumx1z9cFltYQ+Rw8arIxYFNR8erEXX+oQ5iaeRnyPyvXPm2cFBXscjDGo2G4SjctBF0l8frGLF/bkb9/lUvZZdYehE1tpywdzNJbRRTSSz2uSzxpaN5YOphPC0yhHRehp4jxeFCN+mtjc5Qk1JjuNmnvi+n2UzF9kYUA3gxpuqUOx7gzLLY947G4Mnwba2Rfctys5rvMa4EVo5PVxn4Ka+unQG9AXlihug8BXmtytaK/ckFRbraE4FLGr10BXhrm+4XB8nhZWD4lsRw2K03B1WGRz1YFxg383iSdrxvRWATwwcndzVAcnyDfLDgU+8BSy+6eyEKunng4wCAowKfnOuSy+ubmrmnR2pHePyzIqgoF3+0oUvi7ewTBQII2+NoDnl2/k21L1bbXGEbIYf9vHjXwWldOMbHPPHj9FixkoAhG5wXdR349wsFu8FeR60857Gd35oYMw1UApXhtzUg2MmkJ5NkyMKzeaHDT7cIJB1PM4wODNxEbF81VGtGT9Vpb94AFbhVLBvFGmsPazKxJs1ENclU3/yrv5ACybX1+A9n758995qO7jvx7sHIsgwUGKej7P9p2+eBbMfNo2nkzwWdJoTnGrzVP3jwnBXR83m+/e1bhbH4iIPL0e4VhjT5dByeVxaVBcpiNPH0Nkz7MJDmtHvljVCs5hJXuSVINFOd1OqIxNta9fHeLDpiANhPhYSJAUdFgyi7oZjEksG7QeuXBfaFPht7fZHFq3ZrQ/Il6HfkoXJUG+JlNshDMn3lr047J7cKT5x4q3ZfR7VE3Bz0siQrHMjZvaZ3EBxIExM9DkoOccRJTnwWVmn565+g8U6iZUSrIsce7+449KtxJhXejxMEpuG4K7Kq6VJhNCU2jkq9ayts7Opjoamd0/HeBLlBQXUWrLqlswdMLPo+Fe48G25GUdt1CZB2kxzvKZx+8CpAWeGv2+jXYNbplqdpTHrfB7uFl0A6zEd7csdxAjQfmDiHcAaztb1bVyOsj1t9Tcddavq8IGGHX5ENjHa/7xKPopy9G0iT5pSo+wlQqrICywCUIH2NvFee89PYRBG0o0YWqorjjI6i3EheQtjIYsmV4dg2bvizAaRznwgQOYDtAiFGGJflc7yi5ZMRdXx3xKOY16c3Q5TMun0ThYJLRD1DQSOWcT8/NAZKoQB24t8vhw0sQ5fF0jPfSj259mMKCmTna1tMvq0niDNv701QvBYJ6Tdxz23H5lM2w2nwTFFKNshtqGAjXoqdMwd66bAKcRJZcFnhf8SEcOh6FHFkEwtUMyLqKDG7oFyCqNFomo3h5BoeroyCriUI8/RJe4MdaQhhFZST6T2NQ04yfH3PW9UDU7TQITPgrFz3h1AeXzDCPSP/robmJEc4QlT9XMJwuLVa5m+Ip0IeZSkkPBkY7EzLGTBwdeVA8wVz2S+DF0cjXFoPGtd449VTxYPY3nt68oPgL2QAJ/5PnimIFfLbze8PSD2vQKANS4No9HCGV+GJrN9Hz0wWXpPPZ6Y++dtwl4mP6AosPnyIk2PNoxHm5o99wB1uYQdte7w+yiW0wDmIFB3+t738wvPDN7Y0/5DArj7zvnuolt5zIwxlEw3GUowDUkKRccwnK3ZT9tvuI1CTW8xrHAiK7IrTgWwIaXh++3o6MaIrcjCOIpCr9UUhiyoAw/WuDm6AiG83ibnytRm+otLEj6ie0+JYopEFTsfYFmY+k+yyUqHrQyvdb7bc6Op/LpFrzHRL5tQhQbld9zVLy5OisQD6oFoU+3odY+MOAmkF2rZlAKWXY22hqQt5VxlAKonpCjhDjfAwiAJYWUY4CUbpzyCey38ESAyuNfumiGXpXaC8O9XFpva+drpCqwE14QuKo9T1ri5Htubyv2KRbl81SI46c5zgImWg6P6E8ch3Iwu+ZAEn52nEEG3iX9YIpBWXLhBiwLzKddHENxgU2Np+UVbIytmcdRC2VoxoptMTxXctccDZfa77docrckZkRWxqprJUAx3hXDLdlqsdDufrgwtPrcRp3nW3nOQHmd9roPDpkj7D47VLcmaLsVzxv5NSSPjyC1mvLR6VfiKhRZpdPWKK/8Opqjss7Z2QspXDx5vLqrxYmvHkk2TQUGT9vyviIp1uJ3yj3kY5Glp0fUe3+ucSxfpJ/eAgBpaMF+XdB+JmrYGB/8HN2ouF4XRSp6yEgwiLkUnznQbVCU5jUV/UqUUM3xUxftsfM0unvyNVUflHLlXYtO18bbT6W8Wquri6er7Cei3NxesRjyg+cYCeLOV/p8fBQkNjpoJkjDID8tszC4lDdq5H0KupYMVfbwUrLRIqYhdyZZM/ayySSmK93z9V6n4h2BokqqM5hKXf8lBY311PQyAa9jvlBTZzL2W9Z0VRzOm0PXKiwEd8TSQryaBTkybDyb+QbPaKATXQqyMOCQ0ihJre0XYy4KPHv/h//tfYfCsuFjIxmzG+SWXmuQXbSob4hE94j+aJsSWqd8nBD0Dfrz3/k6bhyREFWTv3HOzDIw/UdELliojoKsgiC25xTPxSorUqvFAYiQTOSnjnffB8FEpaIsHglrpwhxNKLjZWlAgz6/E/dlxFxRBO0Bv9dAAcRhjP/G4xC6uh7G56Wt8B1J69J7xXtXnfbBXRCb+7sYeLyLatJgZwdoQO7FNa3SsyZc/pxMKIP7/f7GnkSBXq6RzS/HHYnsTkdXKxYzwOdS1bx9BX25FlF/Ue1WgjsKX2Y3HMyrAyT6hqUHMSjzeClerExa/ZkiyMqUm9PIKfZMvluCSL8eEWehiU8RufTe/IKW69NXLx6/PBA9B/3IbFwRTN1E3nEn0sVCjnnz1C6bypqZckIyC7FYilIZsAHaOoY9+WFcd2wXMnrB1ZL3CYFTA2BIqnuBUGWisVA5yRe9UTZDLrqskspG3j+aGQ7Ws4hOwbm0mOQ1Vp873ht77dtX5qYBPKpz3bGXY6thOd6rW47VWdzFaYo3d657noyfTWJw5/r2FXZFLZ3WtanzOpuGFT1c4CHiN1Fsnd33i6KMx+qJ9gFFZO0Oo/IcmL9DwN9Q9+1w42svjY293z0/OnjxarB8wPm9Gux3WVxbov5Ht/n6zavDw+ZW1ZqgnSmFwcenq2lD6X89uNv3a1GxPwysDFMGwx9OYDL5dYsBTLUH4i9IyCKPkmV2Nw/CeFEM7kNvRDRF6pq3c6fCTNabC5e0eIRrQTGRSdnt+pPGvcL3donxvfruuwMH7u0rc0O9Fp+aN19/GgZLGTEj9PLZT4cVhAQru1410dYymgRzmraNxlD56zi6o0j1l/9LjsZZngZumPx6uB8rqX0Esq5H1boSrik6AzLovbPkCQB1KoHv1D8NiGub51y/ffXk9GD/1Usyx2R40+SXf/xPqD+iSklff0/3vEiFxO//8L/gGwYj5aDgqKbB1oSCb76YlxjZ2//lL/+DrqNY2iV5z3+SZom+/azz1eVi/5ZohNQ05psvUK7QBrExVxMc4dNUrtrSJshoLMC/ymSHQVspbhAm8/MXsb/eYSw1LTUZrgAw0JyJzdW29shWaAgCPgrC5iAqSlLEeylF1D2EQbXoFQy5Kjl2HOlGWrmpfSGD6hbiIj7yv/c9+dXI/WC5D3Z2bVsXwRrNQgYzYq81AQVTQuCtj95VamAyMSJZRm7qA9+/vtnLGwI7uW2gzE98XS9cvplHhAWCxfWar3Cw1Y3EZyWXN+ig2C2cPCVxO/KIpIpNw5yIcy3th1wNsusEF4OpE98XuyZ9L9lYxXjoOhufZ09jXv8YNrTfvaxsait3iTpYLf12wAO+gYtjYxOpZxhTH27c7Xtfe1/i/zbklFDF7jiOklCRBMdM3LmD/SLi7Te3JqjXaWx+WU6z9G5v5663PQcZYbsY5fG87M0vaxs3BuOGY2PjtvZeB/NMpF1/S2cFyBUXqHhLrtk0qwLhOxT9kYHjxa222sGcMB8SV31fGGd4JYOVdACbKTnp6ofFeIOYrQYhJrcCgS8gExZ4BRlAOV60x7fQ2XY2j5PAk3h4kQfwAJxzqdvd66C/vBNuqaoD/oVviRFCA8K+9oY1DRXFe6u7rSjuGwvwVGzAf+o3VpoXubGaEgb+XG+zU/xKme3ExW0GK41etea7G7IbFv/7Hi8MEHwM217txtlSG+d7U/NGexv2kQxvqPXevpJS1DEn9ti1jm/JPvKvaUuSGTmgdBrI+GVfbXk79ztVM901mk9vX5GHPilAbQEhpBdwsvR0Vnjb7It1XZCmjC/kRPg0TUyWVmHem1IM+1vve9EF9Avtgj5zGw96jHs6HlFjLuzuaZDQg6dxQHsPPsgOmVg3Zd87yCQ/vBjjkpT8BOg8z4oinmV0wPKedD6tsv+1xQxUs0BGyNmIt0rOGC3yAmiDbCHYiM2egJrfLNICn9h6T89r0etaJrdbIqQwEvKlLwuJmkqGnEJKIkyQnG38JoN1Mxggyy5GANyQOz59dRXaLDgJGR3nDGRq9Vqh8EhY2QBUL3QD+GU24I71SvHK3mlWC1jQIMyHOReghbBnhNk54hQGaUsvUdFLVNOWKUamldQQzOyQR4wFIrDl1SkvFa/UugMrGEDAHoEM6L8uMzWJj6hozVtDamJw5aX8FI31PINimeQr5LBQv2mXERoVGm+KCu6tuo3gdZ7BHBeFHcZtdQeIdLEDGEYMEvQ2YMfSwGxmq+L1YqYAX04J5iOsGrdVon/ZBJYRL0bWF1QLxRyfStG2YvkaMcnvO8qTwUB6U6OIhDqwEFLXNqmMyeKFYZZcisjp09gR3LJiO8DWC36p2l8yWURqN5woRWkNE+XQGGGI9SqR++o2BtGIjG9m7Kp5zYaKvDJffz9VlnnNpEQrDEh4rqtiMtcY7rx+73Xh3r7K+UAeRQPLR0N0sAu5G6phKuqcQFUPC6jjtYNlvLYJm/9oQVHj6ngZcplnaRmXcVSsY4hhJ/o6xhAJKBVzC8uP1Mgl+ngtFzEJxCUFsxl40sfBJdQf0uwceOsk+i4P5tO2bBYfsEhoHgyDzmyVQQedFB17Dr7+XXn3WzUD0yd/yhOOgbTpUMa//hMdcePKVghBJfW7UgtzfhZPlq6z6iZ5MM4c4VgiB/TgYieex73xWXcgu7PyrHvjhuE6FLk5St/SM2209c85hk4Zjab8huI8Am6cit+4qvEn2hfVAEh/OMOtlCEdg1J2OY9OOp79zQdcER3xkDcCDS6X6WXscGF+iUCCZpIC4ZkP35OrptkB/wj++LoT/mv6gS7xoi/+80U2mcaQQHAxWFFS5pkRW4g0GguocdhiwhbnEuTR2TFaMM8rjHbMEzJqDg3F4u1c/1MMOkwruDJcGjUWjyICCkTNPT3G2QGmgBR64mVj79XwPT6pjm9yIh3xBHRUgGMqqKygeOwWpxiAkTqx6fTCxpGOgTaw/drCtV3GHvFkEKIn2B12AFHXNAaLOUzHKCiiXRjNEkNTzYMRHT7VHp2YngFf9/ti2JiMdCO89Zu9xdSOfk+ZcpxlIKwhMUf1j3rjOC/K0wLl8EfWp+2Z5Jnn0kLXjUj31HXVV23V2gG17FM1Gl/z2elnPgi8j+eA/cqE3G0mCVYiZ1CezYD9JscPcfBs0NEdZ7rvq+lmVwEW/bVj5s0P08d59EciUphduvaUji4NgKtp/TfLjn4RKFMSUuMvf/mPHpOpsD7bLqS6kRuZ2dEj474cI4WOmCG6F39fWF27xTSP0w84Aa5JXggfPAjs7OkY57Vs1DFR1RKTNUafe8erfX7bkdIoWBZLaK2VR2XScZl8b5ukiSSbdLFUdxwnJV+WkZcq8LrF6sriioeuXicbJhwnDBsaSKQeiR8iGgLHlmdoA936I/XTMqd6dRHvWT6kcbK9PJNVYiDi58qBiXF7AbUxcsNB3gsbUEgGTVQ4M9qKyC2Y3e6wZIc7J768geHcJlgnZWgXGfo8thK73o7knIkrjQoTI9sOTSfP+30aGeGZBb0yHt6OVk2lbXGt9JRb8WtESevUbZaBMDnES6NSm6G5+NOf/Haq0Or4TXa5T5QviQBqV9q7qmyJNPhjcLMl8sgM2GqvlzVAOQumFpikN4OILBfJMiu5IcznD34PVLzZQ7D5uANLqG+z0Aj2zfIgHWfCFZiGAQqojnRaSlVt9CSS0JWXGxoxCalrD/TnafSuNUBzuJXEYuVIk3TNgiDDQKKld42ZcetG3Hl+E02eXczbPvF4VVA/zXLc+3Lz0R9uX123O386fnvy9u0JvdHy9u3tL9gygyKwzw7Mwkxt1H5Ahb9Iyl3feC5mj1MnVmoe0aM9xqhVpBQWxbthPOvYrkMsotdIf/TeD23W5gvWN0LQcGLDB32QTVgL8uZ+bfVHrd/I3RifCxvQm2Gm2Z5PQpG5ADQgOjYmO0tsQ0b8Jo8xJMzruiNQjp7cZTCSdyg5bOdu/XGshQLyVY2CtTSd09k9b4QSPOyuBnaK0K5XHdGufcpqcrC9T/IiwpAGAOlb6k3RbvJGaH2u4/rbV4qtXFdBV7cIzfIvunzzfXDnXl+BIu5wvRRHZ6NYctj9GXaPT3fdcu6c/Urtt15PDwfuBsZOD3um7/pxqY3sZnvMx1+71WNSiUtfoTB9Ye7jRM4by5p0K6bjhVYAd9oqOl5hJVrdqLvXaQaRRezWNYJXBKcm07e/YhnU3UzgazLYYAbMx/GzF1s8iQ9W6I+Dw1ci5kdH2MD7GKNDxgCT22ftjVW837095bF4BB/QgeQh3qgnmv4C23uI2yzpUV9gDPPy4U6/b7yKwuf94iKrusWqX/YxBjpwHvIBLcG50LbuIO49Q6N5xGcoKHiKAYg67kle7WtDEieJDqsrn4cM6Gnn7LwwKPSWbEcZqq5aski9aVZI9VxvEmcUvl/2lXG1uimfHhdQVXsoVc1MYxC+jbSPlEevTNW8lGSKJ3f4DMk2KurnARcpiZ2z3qi8OOVPvEZsP1jDj4PSf1mOVBfbifNRJPwceGoAP8TrBlGSvPXj9CzONvYIrBSILMPULJodBRTpBN98i2anuMtb50zi2v4ybGjRScWl1AcwUnTyKpcdzAHDqJNFGaQljto79xh9XbuKsavddXc1R7LCTe6e69GFh03Q+wzGjFxA1S1f7JPIMC1K4lS8AoFDLp/GqQ3FzAAgm1YaRvWBxHIFaIxWk44u8cTMgW3kbOKbSCsAFZfF6RQ4kwYDKQPdWZm/ur9Mq3iGKIjILCBvElmXc9J4Po9KpjXr0TCD4975Rsc+m/HDPtXS6joUlBaOGX7DJRdhwJQW62a3TDJquu6IN7PyOQOFA4tPEBcknlhnqnykapWv0R9vXymGgwEmjhkkr6PO9Yl7ciqnWj2dAyMkTti4nn5vwp3XeneW+jsczqo7nwLXJSt9NJjnEa25XQxi0h3mUfBhQP/tYoK62CEIgm4PwVRXnWnErSLHP8a9XnT9GRWxFT5U9coYRajB7V9oVkrbUfvM2tpYxTjOStlHK0aW7NAYYUfhL/0wP1WdMnUD662CVYqUqdp8g73HEILjJDvvXg4wsg7RD+7RxnUzUz6hyP4Nj0mgfdV+ScKtrN5GWFJbiHrVwJVWxB0lLohoPk3SUH3sH8uAa9m7SIRdDx7PqWM1I4FK4kVveLDoZrrXHuCTsnExij2KWJh5eMYt62Qks/r1MeorgUUZExjaRVI60dcd20+dQP8mlpYEfQJTCSZKTch53ZJ4DuQPFk5PxzksdPopEvCFGRrMWtM4T+UhwW4L9NcVcN1O62g2+I0TIX66jgcVF7OVAyQEXZgsgBfg3WIxTJWXlz4rKTZ5E6+84XdfHW47w0AuHqInsbp80ZKllO/TlXlXP6+9pL9ryOtUqEZUX26vZVF9Yw+LmpLQqlub0EFNpxQ7Vgs+uSvK3MggSYo6AzNkIPRV003IfDuWhfBn46MuBCOmdpVhWBT7OLNwFan/DzZf/+MlwXtCEmyUI76xjlrXM/3d0cEOaAXw1XBFY5tMsPpEeLkQJo6UxUBXz5Cvlzx1/yFOkkPgGhhUR/jKVh9dmi0uTrEgHTNS2XrH2wnwz/Pg8k1EboRt95ZGr3fivaFwvpksinRYdwGRc09zhlSzPZuv+CzZnNHHUfnUOXarMUgt01dHj1UoR/20nLzcCusAE87xx7PD13fveOjH/1P8bfzobXqQeIfxJE68QkYojvJ//SfYHz2QFEFoi3rWO3TOIEDDyi2WR2AN21IZzIJJBt/xdkaPmLrRcj3tNhXW2JA0EmEv+4Acj0IsMy4UYZkiFKtuBWIciNXhDRssiWH8Y3qMjR4/E46Zwk1XW588Nj85V3TYyoRwhKVJGrA6taYleqHIPZAuVx1IszrtHkmXZkC9FCCrKD4UdeWU5Xm6ZKre8lyU1XKQWCk4nlH4YNyKUm/vIfmxwvC2023yaIWa3+JTBO0dYos/4HimWrMNIzui0Ckn2TGOuhg5M5vrHbd0D7YBiTZ1jF0jgbq2aYwxnXvCGRgWmHynpZFD+lxygvJxdlwozBeQ+Jkk6b9vxJVujEDoPrFkxCEc4tANm+MQorvG0jCE9f721CKwEESavfpiXCz8l1/pCy6lKwRPx6nUiF/KBw9bQVpO82wej4xnDvHdmpxeMHSfM8ySBJapfgGxxQmn+iHERfohzc4Rx0d+S7kkqob3lW+i1bLriWhh4LojShzMjcdBxXR4tN6r4qVnTre9/la9u0KLryYsoGXUXb5urKVTs3pe0Oq56SoTdlxaY/R7DZcA8bTuwAOpiVc9/YRZxVDkfXTvZDEe4BmG6JvGxVqUcRL//HMG34kgzazGnXeZJ6nSiC+kRvygxAs0zv3afv/X0ntvhGQwL6KB/FENvmS5nJV5g8ecEawLHcp21xOrEMmp6612T3irbezJV08fbJfTppJG4zkF097YO0g/otKrRfkRtY6yj6m1j+TD9bbLnOYY6UdyQkufSTkeps2TjvOe9Wio/rS8m816zFLcira3srEWSD/i/RDkzx7TvqaIdwZFrDvd2mhUhssGS1o4R2zdrDp2shVN3gosw7WgVqZgSSwj3CZFr/9q0HkkPyd4DR3m7XMBVtZrvHhD7M4CTHT7zgwiPcmDNDwiwiHuqYiHv5oIqKq7tZYif98NFyT0P1iKIFE+f2YhWV+9sd8anhpS2Rd7aD8f8DqK+BzQ5Yx8XsiMs0sRkh4Mz1/agVa66P4/zZlnBlPmAAA="
+}
+}
 
-# Inject variables that were previously in the HTML f-string
-HTML = HTML.replace("{VESSEL_ICON}", VESSEL_ICON) if "VESSEL_ICON" in globals() else HTML.replace("{VESSEL_ICON}", "")
-HTML = HTML.replace("{VESSEL_ICON_192}", VESSEL_ICON_192) if "VESSEL_ICON_192" in globals() else HTML.replace("{VESSEL_ICON_192}", "")
-LOGIN_HTML = LOGIN_HTML.replace("{VESSEL_ICON}", VESSEL_ICON) if "VESSEL_ICON" in globals() else LOGIN_HTML.replace("{VESSEL_ICON}", "")
-LOGIN_HTML = LOGIN_HTML.replace("{VESSEL_ICON_192}", VESSEL_ICON_192) if "VESSEL_ICON_192" in globals() else LOGIN_HTML.replace("{VESSEL_ICON_192}", "")
+_boot_mark("frontend")
 
 
 # --- src/backend/database.py ---
 # ─── Database SQLite ──────────────────────────────────────────────────────────
 DB_PATH = Path.home() / ".nanobot" / "vessel.db"
-SCHEMA_VERSION = 4
+SCHEMA_VERSION = 8
+
+
+class _TimedConnection(sqlite3.Connection):
+    """`with _db_conn() as conn:` misura la transazione; se ha scritto qualcosa
+    la durata (attesa del lock compresa) va in vessel_db_write_seconds."""
+
+    def __enter__(self):
+        self._t0, self._changes = time.perf_counter(), self.total_changes
+        return super().__enter__()
+
+    def __exit__(self, *exc):
+        result = super().__exit__(*exc)
+        if self.total_changes != self._changes:
+            DB_WRITE.observe(time.perf_counter() - self._t0)
+        return result
 
 
 def _db_conn():
     """Crea connessione SQLite con row_factory dict-like."""
-    conn = sqlite3.connect(str(DB_PATH), timeout=5)
+    conn = sqlite3.connect(str(DB_PATH), timeout=5, factory=_TimedConnection)
     conn.execute("PRAGMA journal_mode=WAL")
     conn.row_factory = sqlite3.Row
     return conn
 
 
+_SCHEMA_DDL = """
+CREATE TABLE IF NOT EXISTS schema_version (version INTEGER NOT NULL);
+
+CREATE TABLE IF NOT EXISTS usage (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    ts TEXT NOT NULL,
+    input INTEGER NOT NULL DEFAULT 0,
+    output INTEGER NOT NULL DEFAULT 0,
+    model TEXT NOT NULL DEFAULT '',
+    provider TEXT NOT NULL DEFAULT '',
+    response_time_ms INTEGER NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS idx_usage_ts ON usage(ts);
+
+CREATE TABLE IF NOT EXISTS briefings (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    ts TEXT NOT NULL,
+    weather TEXT DEFAULT '',
+    stories TEXT DEFAULT '[]',
+    calendar_today TEXT DEFAULT '[]',
+    calendar_tomorrow TEXT DEFAULT '[]',
+    text TEXT DEFAULT ''
+);
+CREATE INDEX IF NOT EXISTS idx_briefings_ts ON briefings(ts);
+
+CREATE TABLE IF NOT EXISTS claude_tasks (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    ts TEXT NOT NULL,
+    prompt TEXT DEFAULT '',
+    status TEXT DEFAULT '',
+    exit_code INTEGER DEFAULT 0,
+    duration_ms INTEGER DEFAULT 0,
+    output_preview TEXT DEFAULT ''
+);
+
+CREATE TABLE IF NOT EXISTS chat_messages (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    ts TEXT NOT NULL,
+    provider TEXT NOT NULL,
+    channel TEXT NOT NULL DEFAULT 'dashboard',
+    role TEXT NOT NULL,
+    content TEXT NOT NULL DEFAULT ''
+);
+CREATE INDEX IF NOT EXISTS idx_chat_pct ON chat_messages(provider, channel, ts);
+CREATE INDEX IF NOT EXISTS idx_chat_channel_id ON chat_messages(channel, id);
+
+CREATE TABLE IF NOT EXISTS chat_messages_archive (
+    id INTEGER PRIMARY KEY,
+    ts TEXT NOT NULL,
+    provider TEXT NOT NULL,
+    channel TEXT NOT NULL,
+    role TEXT NOT NULL,
+    content TEXT NOT NULL DEFAULT ''
+);
+
+CREATE TABLE IF NOT EXISTS audit_log (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    ts TEXT NOT NULL,
+    action TEXT NOT NULL,
+    actor TEXT DEFAULT '',
+    resource TEXT DEFAULT '',
+    status TEXT DEFAULT 'ok',
+    details TEXT DEFAULT ''
+);
+CREATE INDEX IF NOT EXISTS idx_audit_ts ON audit_log(ts);
+CREATE INDEX IF NOT EXISTS idx_audit_action ON audit_log(action);
+
+CREATE TABLE IF NOT EXISTS entities (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    type TEXT NOT NULL,
+    name TEXT NOT NULL UNIQUE,
+    description TEXT DEFAULT '',
+    first_seen TEXT NOT NULL,
+    last_seen TEXT NOT NULL,
+    frequency INTEGER DEFAULT 1
+);
+CREATE INDEX IF NOT EXISTS idx_entities_type ON entities(type);
+
+CREATE TABLE IF NOT EXISTS relations (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    entity_a INTEGER NOT NULL,
+    entity_b INTEGER NOT NULL,
+    relation TEXT NOT NULL,
+    frequency INTEGER DEFAULT 1,
+    ts TEXT NOT NULL,
+    FOREIGN KEY(entity_a) REFERENCES entities(id),
+    FOREIGN KEY(entity_b) REFERENCES entities(id)
+);
+
+CREATE TABLE IF NOT EXISTS weekly_summaries (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    ts TEXT NOT NULL,
+    week_start TEXT NOT NULL,
+    week_end TEXT NOT NULL,
+    summary TEXT NOT NULL DEFAULT '',
+    stats TEXT NOT NULL DEFAULT '{}'
+);
+CREATE INDEX IF NOT EXISTS idx_weekly_ts ON weekly_summaries(ts);
+
+CREATE TABLE IF NOT EXISTS saved_prompts (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    ts TEXT NOT NULL,
+    title TEXT NOT NULL,
+    prompt TEXT NOT NULL,
+    provider TEXT NOT NULL DEFAULT '',
+    use_loop INTEGER NOT NULL DEFAULT 0
+);
+
+CREATE TABLE IF NOT EXISTS notes (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    ts TEXT NOT NULL,
+    content TEXT NOT NULL,
+    tags TEXT DEFAULT ''
+);
+CREATE INDEX IF NOT EXISTS idx_notes_ts ON notes(ts);
+
+CREATE TABLE IF NOT EXISTS events (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    ts DATETIME DEFAULT (datetime('now', 'localtime')),
+    category TEXT NOT NULL,
+    action TEXT NOT NULL,
+    provider TEXT,
+    status TEXT DEFAULT 'ok',
+    latency_ms INTEGER DEFAULT 0,
+    payload TEXT DEFAULT '{}',
+    error TEXT DEFAULT ''
+);
+CREATE INDEX IF NOT EXISTS idx_events_ts ON events(ts);
+CREATE INDEX IF NOT EXISTS idx_events_cat ON events(category);
+CREATE INDEX IF NOT EXISTS idx_events_cat_action ON events(category, action);
+
+CREATE TABLE IF NOT EXISTS tracker (
+    id       INTEGER PRIMARY KEY AUTOINCREMENT,
+    ts       TEXT NOT NULL,
+    title    TEXT NOT NULL,
+    body     TEXT DEFAULT '',
+    type     TEXT NOT NULL DEFAULT 'note',
+    priority TEXT NOT NULL DEFAULT 'P2',
+    status   TEXT NOT NULL DEFAULT 'open',
+    tags     TEXT DEFAULT ''
+);
+CREATE INDEX IF NOT EXISTS idx_tracker_status ON tracker(status, type);
+
+CREATE TABLE IF NOT EXISTS job_runs (
+    id          INTEGER PRIMARY KEY AUTOINCREMENT,
+    job         TEXT NOT NULL,
+    trigger     TEXT NOT NULL DEFAULT 'cron',
+    started_at  TEXT NOT NULL,
+    finished_at TEXT DEFAULT '',
+    status      TEXT NOT NULL DEFAULT 'running',
+    duration_ms INTEGER DEFAULT 0,
+    output      TEXT DEFAULT '',
+    error       TEXT DEFAULT ''
+);
+CREATE INDEX IF NOT EXISTS idx_job_runs_job ON job_runs(job, started_at);
+
+CREATE TABLE IF NOT EXISTS summary_checkpoints (
+    kind         TEXT NOT NULL,
+    period_start TEXT NOT NULL,
+    period_end   TEXT NOT NULL,
+    ts           TEXT NOT NULL,
+    summary      TEXT NOT NULL DEFAULT '',
+    stats        TEXT NOT NULL DEFAULT '{}',
+    status       TEXT NOT NULL DEFAULT 'ok',
+    attempts     INTEGER NOT NULL DEFAULT 1,
+    PRIMARY KEY (kind, period_start)
+);
+
+CREATE TABLE IF NOT EXISTS bench_runs (
+    id          INTEGER PRIMARY KEY AUTOINCREMENT,
+    ts          TEXT NOT NULL,
+    provider    TEXT NOT NULL,
+    model       TEXT NOT NULL DEFAULT '',
+    endpoint    TEXT NOT NULL DEFAULT '',
+    label       TEXT NOT NULL DEFAULT '',
+    config      TEXT NOT NULL DEFAULT '{}',
+    levels      TEXT NOT NULL DEFAULT '{}',
+    regressions TEXT NOT NULL DEFAULT '[]',
+    samples     TEXT NOT NULL DEFAULT '[]'
+);
+CREATE INDEX IF NOT EXISTS idx_bench_runs_key ON bench_runs(provider, model, endpoint, label);
+"""
+
+# Impronta di versione + DDL salvata in PRAGMA user_version: se combacia lo
+# schema è già aggiornato e l'avvio salta DDL, migrazioni e check JSONL.
+SCHEMA_STAMP = int(hashlib.sha256(f"{SCHEMA_VERSION}\n{_SCHEMA_DDL}".encode()).hexdigest()[:7], 16)
+
+
+def _schema_is_current() -> bool:
+    """Legge solo l'header del DB (PRAGMA user_version), nessuna DDL."""
+    if not DB_PATH.exists():
+        return False
+    try:
+        conn = sqlite3.connect(str(DB_PATH), timeout=5)
+        try:
+            return conn.execute("PRAGMA user_version").fetchone()[0] == SCHEMA_STAMP
+        finally:
+            conn.close()
+    except sqlite3.Error:
+        return False
+
+
 def init_db():
-    """Crea tabelle + indici. Migra JSONL se presenti e tabelle vuote."""
+    """Crea tabelle + indici. Migra JSONL se presenti e tabelle vuote.
+    Se lo schema risulta già aggiornato (SCHEMA_STAMP) non fa nulla."""
+    if _schema_is_current():
+        print(f"[DB] Schema v{SCHEMA_VERSION} già aggiornato: {DB_PATH}")
+        return
     DB_PATH.parent.mkdir(parents=True, exist_ok=True)
     with _db_conn() as conn:
-        conn.executescript("""
-            CREATE TABLE IF NOT EXISTS schema_version (version INTEGER NOT NULL);
-
-            CREATE TABLE IF NOT EXISTS usage (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                ts TEXT NOT NULL,
-                input INTEGER NOT NULL DEFAULT 0,
-                output INTEGER NOT NULL DEFAULT 0,
-                model TEXT NOT NULL DEFAULT '',
-                provider TEXT NOT NULL DEFAULT '',
-                response_time_ms INTEGER NOT NULL DEFAULT 0
-            );
-            CREATE INDEX IF NOT EXISTS idx_usage_ts ON usage(ts);
-
-            CREATE TABLE IF NOT EXISTS briefings (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                ts TEXT NOT NULL,
-                weather TEXT DEFAULT '',
-                stories TEXT DEFAULT '[]',
-                calendar_today TEXT DEFAULT '[]',
-                calendar_tomorrow TEXT DEFAULT '[]',
-                text TEXT DEFAULT ''
-            );
-            CREATE INDEX IF NOT EXISTS idx_briefings_ts ON briefings(ts);
-
-            CREATE TABLE IF NOT EXISTS claude_tasks (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                ts TEXT NOT NULL,
-                prompt TEXT DEFAULT '',
-                status TEXT DEFAULT '',
-                exit_code INTEGER DEFAULT 0,
-                duration_ms INTEGER DEFAULT 0,
-                output_preview TEXT DEFAULT ''
-            );
-
-            CREATE TABLE IF NOT EXISTS chat_messages (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                ts TEXT NOT NULL,
-                provider TEXT NOT NULL,
-                channel TEXT NOT NULL DEFAULT 'dashboard',
-                role TEXT NOT NULL,
-                content TEXT NOT NULL DEFAULT ''
-            );
-            CREATE INDEX IF NOT EXISTS idx_chat_pct ON chat_messages(provider, channel, ts);
-
-            CREATE TABLE IF NOT EXISTS chat_messages_archive (
-                id INTEGER PRIMARY KEY,
-                ts TEXT NOT NULL,
-                provider TEXT NOT NULL,
-                channel TEXT NOT NULL,
-                role TEXT NOT NULL,
-                content TEXT NOT NULL DEFAULT ''
-            );
-
-            CREATE TABLE IF NOT EXISTS audit_log (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                ts TEXT NOT NULL,
-                action TEXT NOT NULL,
-                actor TEXT DEFAULT '',
-                resource TEXT DEFAULT '',
-                status TEXT DEFAULT 'ok',
-                details TEXT DEFAULT ''
-            );
-            CREATE INDEX IF NOT EXISTS idx_audit_ts ON audit_log(ts);
-            CREATE INDEX IF NOT EXISTS idx_audit_action ON audit_log(action);
-
-            CREATE TABLE IF NOT EXISTS entities (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                type TEXT NOT NULL,
-                name TEXT NOT NULL UNIQUE,
-                description TEXT DEFAULT '',
-                first_seen TEXT NOT NULL,
-                last_seen TEXT NOT NULL,
-                frequency INTEGER DEFAULT 1
-            );
-            CREATE INDEX IF NOT EXISTS idx_entities_type ON entities(type);
-
-            CREATE TABLE IF NOT EXISTS relations (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                entity_a INTEGER NOT NULL,
-                entity_b INTEGER NOT NULL,
-                relation TEXT NOT NULL,
-                frequency INTEGER DEFAULT 1,
-                ts TEXT NOT NULL,
-                FOREIGN KEY(entity_a) REFERENCES entities(id),
-                FOREIGN KEY(entity_b) REFERENCES entities(id)
-            );
-
-            CREATE TABLE IF NOT EXISTS weekly_summaries (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                ts TEXT NOT NULL,
-                week_start TEXT NOT NULL,
-                week_end TEXT NOT NULL,
-                summary TEXT NOT NULL DEFAULT '',
-                stats TEXT NOT NULL DEFAULT '{}'
-            );
-            CREATE INDEX IF NOT EXISTS idx_weekly_ts ON weekly_summaries(ts);
-
-            CREATE TABLE IF NOT EXISTS saved_prompts (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                ts TEXT NOT NULL,
-                title TEXT NOT NULL,
-                prompt TEXT NOT NULL,
-                provider TEXT NOT NULL DEFAULT '',
-                use_loop INTEGER NOT NULL DEFAULT 0
-            );
-
-            CREATE TABLE IF NOT EXISTS notes (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                ts TEXT NOT NULL,
-                content TEXT NOT NULL,
-                tags TEXT DEFAULT ''
-            );
-            CREATE INDEX IF NOT EXISTS idx_notes_ts ON notes(ts);
-
-            CREATE TABLE IF NOT EXISTS events (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                ts DATETIME DEFAULT (datetime('now', 'localtime')),
-                category TEXT NOT NULL,
-                action TEXT NOT NULL,
-                provider TEXT,
-                status TEXT DEFAULT 'ok',
-                latency_ms INTEGER DEFAULT 0,
-                payload TEXT DEFAULT '{}',
-                error TEXT DEFAULT ''
-            );
-            CREATE INDEX IF NOT EXISTS idx_events_ts ON events(ts);
-            CREATE INDEX IF NOT EXISTS idx_events_cat ON events(category);
-            CREATE INDEX IF NOT EXISTS idx_events_cat_action ON events(category, action);
-
-            CREATE TABLE IF NOT EXISTS tracker (
-                id       INTEGER PRIMARY KEY AUTOINCREMENT,
-                ts       TEXT NOT NULL,
-                title    TEXT NOT NULL,
-                body     TEXT DEFAULT '',
-                type     TEXT NOT NULL DEFAULT 'note',
-                priority TEXT NOT NULL DEFAULT 'P2',
-                status   TEXT NOT NULL DEFAULT 'open',
-                tags     TEXT DEFAULT ''
-            );
-            CREATE INDEX IF NOT EXISTS idx_tracker_status ON tracker(status, type);
-        """)
+        conn.executescript(_SCHEMA_DDL)
         # Schema version + migrations
         row = conn.execute("SELECT version FROM schema_version LIMIT 1").fetchone()
         current_ver = row[0] if row else 0
@@ -698,10 +998,24 @@ def init_db():
         if current_ver < 4:
             # tracker table già creata dal CREATE IF NOT EXISTS sopra
             print("[DB] Migrazione v4: tabella 'tracker' per bug/note tracking")
+        if current_ver < 5:
+            # job_runs table già creata dal CREATE IF NOT EXISTS sopra
+            print("[DB] Migrazione v5: tabella 'job_runs' per lo scheduler in-process")
+        if current_ver < 6:
+            # summary_checkpoints table già creata dal CREATE IF NOT EXISTS sopra
+            print("[DB] Migrazione v6: tabella 'summary_checkpoints' per i riassunti incrementali")
+        if current_ver < 7:
+            # bench_runs table già creata dal CREATE IF NOT EXISTS sopra
+            print("[DB] Migrazione v7: tabella 'bench_runs' per lo storico benchmark")
+        if current_ver < 8:
+            # idx_chat_channel_id già creato dal CREATE IF NOT EXISTS sopra
+            print("[DB] Migrazione v8: indice (channel, id) per la chat a pagine")
         if current_ver < SCHEMA_VERSION:
             conn.execute("UPDATE schema_version SET version = ?", (SCHEMA_VERSION,))
 
     _migrate_jsonl()
+    with _db_conn() as conn:
+        conn.execute(f"PRAGMA user_version = {SCHEMA_STAMP}")
     print(f"[DB] SQLite inizializzato: {DB_PATH}")
 
 
@@ -927,6 +1241,18 @@ def db_load_chat_history(provider: str, channel: str = "dashboard", limit: int =
         return [{"role": r["role"], "content": r["content"]} for r in reversed(rows)]
 
 
+def db_get_chat_page(channel: str = "dashboard", before_id: int = 0, limit: int = 30) -> dict:
+    """Pagina di messaggi del channel (tutti i provider) con id < before_id, dal più
+    vecchio al più recente. before_id=0 → ultima pagina. has_more: ce ne sono di più vecchi."""
+    with _db_conn() as conn:
+        rows = conn.execute(
+            "SELECT id, ts, provider, role, content, agent FROM chat_messages "
+            "WHERE channel = ? AND id < ? ORDER BY id DESC LIMIT ?",
+            (channel, before_id or 2**63 - 1, limit + 1)
+        ).fetchall()
+    return {"messages": [dict(r) for r in reversed(rows[:limit])], "has_more": len(rows) > limit}
+
+
 def db_clear_chat_history(channel: str = "dashboard"):
     """Cancella tutta la chat history per un channel."""
     with _db_conn() as conn:
@@ -1281,6 +1607,111 @@ def db_cleanup_old_events(days: int = 90) -> int:
         return cur.rowcount
 
 
+# ─── Job runs (scheduler in-process) ─────────────────────────────────────────
+
+def db_job_run_start(job: str, trigger: str = "cron") -> int:
+    with _db_conn() as conn:
+        cur = conn.execute(
+            "INSERT INTO job_runs (job, trigger, started_at) VALUES (?, ?, ?)",
+            (job, trigger, time.strftime("%Y-%m-%dT%H:%M:%S")))
+        return cur.lastrowid
+
+
+def db_job_run_finish(run_id: int, status: str, duration_ms: int,
+                      output: str = "", error: str = ""):
+    with _db_conn() as conn:
+        conn.execute(
+            "UPDATE job_runs SET finished_at = ?, status = ?, duration_ms = ?, output = ?, error = ? "
+            "WHERE id = ?",
+            (time.strftime("%Y-%m-%dT%H:%M:%S"), status, duration_ms,
+             output[-4000:], error[:500], run_id))
+
+
+def db_job_runs_interrupt() -> int:
+    """Righe rimaste 'running' da un processo precedente (riavvio a job in corso) → 'interrupted'."""
+    with _db_conn() as conn:
+        cur = conn.execute(
+            "UPDATE job_runs SET status = 'interrupted', finished_at = ?, error = 'server riavviato' "
+            "WHERE status = 'running'", (time.strftime("%Y-%m-%dT%H:%M:%S"),))
+        return cur.rowcount
+
+
+def db_get_job_runs(job: str = "", limit: int = 20) -> list:
+    query = "SELECT id, job, trigger, started_at, finished_at, status, duration_ms, output, error FROM job_runs"
+    params: list = []
+    if job:
+        query += " WHERE job = ?"
+        params.append(job)
+    query += " ORDER BY id DESC LIMIT ?"
+    params.append(limit)
+    with _db_conn() as conn:
+        return [dict(r) for r in conn.execute(query, params).fetchall()]
+
+
+def db_get_last_job_runs() -> dict:
+    """Ultima esecuzione per ogni job: {job: {status, started_at, duration_ms, ...}}."""
+    with _db_conn() as conn:
+        rows = conn.execute(
+            "SELECT job, trigger, started_at, status, duration_ms, error FROM job_runs "
+            "WHERE id IN (SELECT MAX(id) FROM job_runs GROUP BY job)").fetchall()
+    return {r["job"]: dict(r) for r in rows}
+
+
+# ─── Benchmark provider ──────────────────────────────────────────────────────
+
+def db_save_bench_run(provider: str, model: str, endpoint: str, label: str, config: dict,
+                      levels: dict, regressions: list, samples: list) -> int:
+    with _db_conn() as conn:
+        cur = conn.execute(
+            "INSERT INTO bench_runs (ts, provider, model, endpoint, label, config, levels, regressions, samples) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            (time.strftime("%Y-%m-%dT%H:%M:%S"), provider, model, endpoint, label,
+             json.dumps(config), json.dumps(levels), json.dumps(regressions, ensure_ascii=False),
+             json.dumps(samples, ensure_ascii=False)))
+        return cur.lastrowid
+
+
+def _bench_row(r) -> dict:
+    out = dict(r)
+    for k in ("config", "levels", "regressions"):
+        out[k] = json.loads(out[k] or "null")
+    return out
+
+
+def db_get_bench_runs(provider: str = "", limit: int = 20) -> list:
+    """Storico run (senza i campioni singoli), dal più recente."""
+    query = "SELECT id, ts, provider, model, endpoint, label, config, levels, regressions FROM bench_runs"
+    params: list = []
+    if provider:
+        query += " WHERE provider = ?"
+        params.append(provider)
+    query += " ORDER BY id DESC LIMIT ?"
+    params.append(limit)
+    with _db_conn() as conn:
+        return [_bench_row(r) for r in conn.execute(query, params).fetchall()]
+
+
+def db_get_last_bench_run(provider: str, model: str, endpoint: str = "", label: str = "") -> dict | None:
+    """Run precedente confrontabile: stesso provider, modello, endpoint ed etichetta.
+    Salta i run in cui ogni richiesta è fallita: metriche tutte null, non fanno da baseline."""
+    with _db_conn() as conn:
+        rows = conn.execute(
+            "SELECT id, ts, provider, model, endpoint, label, config, levels, regressions FROM bench_runs "
+            "WHERE provider = ? AND model = ? AND endpoint = ? AND label = ? ORDER BY id DESC LIMIT 50",
+            (provider, model, endpoint, label)).fetchall()
+    for r in rows:
+        run = _bench_row(r)
+        if not bench_all_failed(run["levels"]):
+            return run
+    return None
+
+
+def bench_all_failed(levels: dict | None) -> bool:
+    """True se nessuna richiesta del run è andata a buon fine."""
+    levels = (levels or {}).values()
+    return sum(lv.get("errors", 0) for lv in levels) >= sum(lv.get("requests", 0) for lv in levels)
+
+
 # ─── Analytics (Fase 62) ─────────────────────────────────────────────────────
 
 def db_get_failover_log(limit: int = 20) -> list:
@@ -1454,14 +1885,24 @@ class BaseChatProvider:
         self.parser_type = "json_lines"
         self.is_valid = True
         self.error_msg = ""
-    
+        self.endpoint = ""   # mock/benchmark: sostituisce host e porta, credenziali fittizie
+
     def setup(self):
         pass
 
+    def credential(self, real: str) -> str:
+        """Con un endpoint alternativo la chiave vera non parte mai: al suo posto "mock"."""
+        return "mock" if self.endpoint else real
+
+    def redirect(self):
+        u = urllib.parse.urlsplit(self.endpoint)
+        self.host, self.use_https = u.hostname or "127.0.0.1", u.scheme == "https"
+        self.port = u.port or (443 if self.use_https else 80)
+
 class AnthropicProvider(BaseChatProvider):
     def setup(self):
         cfg = _get_config("config.json")
-        api_key = cfg.get("providers", {}).get("anthropic", {}).get("apiKey", "")
+        api_key = self.credential(cfg.get("providers", {}).get("anthropic", {}).get("apiKey", ""))
         if not api_key:
             self.is_valid = False
             self.error_msg = "(nessuna API key Anthropic)"
@@ -1475,7 +1916,7 @@ class AnthropicProvider(BaseChatProvider):
 class OpenRouterProvider(BaseChatProvider):
     def setup(self):
         or_cfg = _get_config("openrouter.json")
-        api_key = os.environ.get("OPENROUTER_API_KEY", or_cfg.get("apiKey", ""))
+        api_key = self.credential(os.environ.get("OPENROUTER_API_KEY", or_cfg.get("apiKey", "")))
         if not api_key:
             self.is_valid = False
             self.error_msg = "(nessuna API key OpenRouter)"
@@ -1521,7 +1962,7 @@ class OllamaProvider(BaseChatProvider):
 class BrainProvider(BaseChatProvider):
     """Claude Code CLI via bridge — ragionamento con memoria cross-sessione."""
     def setup(self):
-        if not CLAUDE_BRIDGE_TOKEN:
+        if not CLAUDE_BRIDGE_TOKEN and not self.endpoint:
             self.is_valid = False
             self.error_msg = "(Bridge token mancante)"
             return
@@ -1539,14 +1980,16 @@ class BrainProvider(BaseChatProvider):
                 last_user_msg = msg["content"]
                 break
         self.payload = json.dumps({
-            "token": CLAUDE_BRIDGE_TOKEN,
+            "token": self.credential(CLAUDE_BRIDGE_TOKEN),
             "prompt": last_user_msg,
             "system_prompt": self.system_prompt,
         })
         self.timeout = 120
         self.parser_type = "ndjson_brain"
 
-def get_provider(provider_id: str, model: str, system_prompt: str, history: list) -> BaseChatProvider:
+def get_provider(provider_id: str, model: str, system_prompt: str, history: list,
+                 endpoint: str = "") -> BaseChatProvider:
+    """endpoint (o MOCK_URL): stesso payload e parser, host/porta del mock."""
     if provider_id == "brain":
         p = BrainProvider(model, system_prompt, history)
     elif provider_id == "anthropic":
@@ -1557,7 +2000,10 @@ def get_provider(provider_id: str, model: str, system_prompt: str, history: list
         p = OllamaPCProvider(model, system_prompt, history)
     else:
         p = OllamaProvider(model, system_prompt, history)
+    p.endpoint = endpoint or MOCK_URL
     p.setup()
+    if p.endpoint and p.is_valid:
+        p.redirect()
     return p
 
 
@@ -1576,7 +2022,22 @@ def _inject_date(system_prompt: str) -> str:
 # ─── Helpers ──────────────────────────────────────────────────────────────────
 async def bg(fn, *args):
     """Esegue una funzione sincrona in un thread executor (non blocca l'event loop)."""
-    return await asyncio.get_running_loop().run_in_executor(None, fn, *args)
+    return await _bg_submit(fn, *args)
+
+def _bg_submit(fn, *args) -> asyncio.Future:
+    """run_in_executor senza await (fire-and-forget o worker di lunga durata), con le
+    metriche del pool: attesa in coda e worker occupati (services/metrics.py)."""
+    EXECUTOR_QUEUED.inc()
+    return asyncio.get_running_loop().run_in_executor(None, _bg_call, time.perf_counter(), fn, args)
+
+def _bg_call(queued_at: float, fn, args):
+    EXECUTOR_QUEUED.dec()
+    EXECUTOR_WAIT.observe(time.perf_counter() - queued_at)
+    EXECUTOR_BUSY.inc()
+    try:
+        return fn(*args)
+    finally:
+        EXECUTOR_BUSY.dec()
 
 def run(cmd: str) -> str:
     """Esegue un comando shell. SAFETY: usare SOLO con comandi hardcoded interni,
@@ -1607,6 +2068,536 @@ def format_uptime(raw: str) -> str:
     return " ".join(parts) if parts else raw
 
 
+# --- src/backend/services/metrics.py ---
+# ─── Metriche in-process (OpenMetrics) ──────────────────────────────────────
+# Contatori, gauge e istogrammi in memoria, esposti da GET /metrics in formato
+# testo OpenMetrics per un Prometheus in LAN. Registrare costa un lock non
+# conteso e una somma su un dict (gli istogrammi anche un bisect): va bene nei
+# percorsi caldi. Le grandezze che esistono già altrove (connessioni WS, code,
+# SIGIL_STATS, bus) non si duplicano: una funzione `fn` le legge allo scrape.
+METRICS_PREFIX = "vessel_"
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120)
+_METRICS: dict[str, "Metric"] = {}
+_METRICS_STARTED = time.time()
+
+
+def _metric_escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace("\"", "\\\"").replace("\n", "\\n")
+
+def _metric_labels(names: tuple, values: tuple, extra: str = "") -> str:
+    parts = [f'{n}="{_metric_escape(v)}"' for n, v in zip(names, values)]
+    if extra:
+        parts.append(extra)
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+def _metric_num(v) -> str:
+    if isinstance(v, float):
+        return "+Inf" if v == float("inf") else repr(round(v, 6))
+    return str(v)
+
+
+class Metric:
+    """Base: nome, help, nomi delle label; i valori per tupla di label."""
+    kind = "unknown"
+
+    def __init__(self, name: str, help: str, labels: tuple = (), fn=None):
+        self.name = METRICS_PREFIX + name
+        self.help = help
+        self.labels = tuple(labels)
+        self.fn = fn                       # () → numero oppure {tupla label: numero}
+        self._values: dict = {}
+        self._lock = threading.Lock()
+        _METRICS[self.name] = self
+
+    def series(self) -> dict:
+        if self.fn is None:
+            with self._lock:
+                return dict(self._values)
+        v = self.fn()
+        return v if isinstance(v, dict) else {(): v}
+
+    def expose(self) -> list[str]:
+        return [f"{self.name}{_metric_labels(self.labels, k)} {_metric_num(v)}"
+                for k, v in self.series().items()]
+
+
+class CounterMetric(Metric):
+    kind = "counter"
+
+    def inc(self, *labels, n=1):
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0) + n
+
+    def expose(self) -> list[str]:
+        return [f"{self.name}_total{_metric_labels(self.labels, k)} {_metric_num(v)}"
+                for k, v in self.series().items()]
+
+
+class GaugeMetric(Metric):
+    kind = "gauge"
+
+    def set(self, value, *labels):
+        self._values[labels] = value
+
+    def inc(self, *labels, n=1):
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0) + n
+
+    def dec(self, *labels, n=1):
+        self.inc(*labels, n=-n)
+
+
+class HistogramMetric(Metric):
+    """Bucket fissi; per tupla di label [conteggi per bucket..., somma, totale]."""
+    kind = "histogram"
+
+    def __init__(self, name: str, help: str, labels: tuple = (), buckets: tuple = LATENCY_BUCKETS):
+        super().__init__(name, help, labels)
+        self.buckets = tuple(buckets)
+
+    def observe(self, value: float, *labels):
+        i = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            row = self._values.get(labels)
+            if row is None:
+                row = self._values[labels] = [0] * (len(self.buckets) + 3)
+            row[i] += 1
+            row[-2] += value
+            row[-1] += 1
+
+    def expose(self) -> list[str]:
+        out = []
+        with self._lock:
+            rows = {k: list(v) for k, v in self._values.items()}
+        for k, row in rows.items():
+            acc = 0
+            for le, n in zip(self.buckets + (float("inf"),), row):
+                acc += n
+                le_label = 'le="' + _metric_num(float(le)) + '"'
+                out.append(f"{self.name}_bucket{_metric_labels(self.labels, k, le_label)} {acc}")
+            lbl = _metric_labels(self.labels, k)
+            out.append(f"{self.name}_count{lbl} {row[-1]}")
+            out.append(f"{self.name}_sum{lbl} {_metric_num(float(row[-2]))}")
+        return out
+
+
+def metrics_render() -> str:
+    """Tutte le metriche in formato testo OpenMetrics (termina con # EOF).
+    Una fn che fallisce (es. servizio non ancora inizializzato) salta solo la sua metrica."""
+    lines = []
+    for m in _METRICS.values():
+        try:
+            samples = m.expose()
+        except Exception:
+            continue
+        lines.append(f"# HELP {m.name} {_metric_escape(m.help)}")
+        lines.append(f"# TYPE {m.name} {m.kind}")
+        lines.extend(samples)
+    lines.append("# EOF")
+    return "\n".join(lines) + "\n"
+
+
+# ─── Catalogo ────────────────────────────────────────────────────────────────
+# Chat (services/chat.py: _execute_chat)
+CHAT_REQUESTS = CounterMetric("chat_requests", "Risposte chat per provider effettivo, canale ed esito",
+                              ("provider", "channel", "status"))
+CHAT_LATENCY = HistogramMetric("chat_latency_seconds", "Durata completa di una risposta chat", ("provider",))
+CHAT_TTFT = HistogramMetric("chat_ttft_seconds", "Dalla richiesta al primo token ricevuto", ("provider",))
+CHAT_TOKENS = CounterMetric("chat_tokens", "Token per provider e direzione", ("provider", "direction"))
+CHAT_FAILOVERS = CounterMetric("chat_failovers", "Failover riusciti verso il provider di riserva", ("from", "to"))
+PROVIDER_ERRORS = CounterMetric("provider_errors", "Tentativi falliti (nessun testo) per provider", ("provider",))
+
+# Executor (services/helpers.py: bg) e SQLite (database.py: _TimedConnection)
+EXECUTOR_QUEUED = GaugeMetric("executor_queued", "Chiamate bg() in coda in attesa di un worker del pool")
+EXECUTOR_BUSY = GaugeMetric("executor_busy", "Worker del pool occupati da chiamate bg()")
+EXECUTOR_WAIT = HistogramMetric("executor_wait_seconds", "Attesa in coda prima che un worker del pool parta",
+                                buckets=(0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1, 5))
+DB_WRITE = HistogramMetric("db_write_seconds", "Transazioni SQLite con scritture (with _db_conn())",
+                           buckets=(0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 1, 5))
+
+
+def _executor_workers():
+    pool = getattr(asyncio.get_running_loop(), "_default_executor", None)   # creato al primo bg()
+    return getattr(pool, "_max_workers", 0)
+
+def _queue_depths() -> dict:
+    out = {("telegram_send",): sum(q.qsize() for q in tg_client._queues.values())}
+    out[("sigil_unacked",)] = sum(max(0, _sigil_seq - p["acked"]) for p in list(_sigil_peers.values())
+                                  if p["proto"] >= 2)
+    return out
+
+# Letture allo scrape
+GaugeMetric("executor_workers", "Worker massimi del thread pool di default", fn=_executor_workers)
+GaugeMetric("ws_connections", "WebSocket aperti per tipo", ("kind",),
+            fn=lambda: {("dashboard",): len(manager.connections), ("sigil",): len(_sigil_peers)})
+GaugeMetric("queue_depth", "Messaggi in attesa per coda", ("queue",), fn=_queue_depths)
+GaugeMetric("event_loop_lag_seconds", "Ultimo ritardo misurato del battito dell'event loop",
+            fn=lambda: round(_loop_lags[-1] / 1000, 4) if _loop_lags else 0.0)
+CounterMetric("event_loop_stalls", "Stalli dell'event loop oltre soglia", fn=lambda: _loop_state["stalls"])
+CounterMetric("sigil_frames", "Frame Sigil per esito", ("kind",),
+              fn=lambda: {(k,): v for k, v in SIGIL_STATS.items()})
+CounterMetric("telegram_retries_429", "Risposte 429 della Bot API", fn=lambda: tg_client.retries_429)
+CounterMetric("bus_events", "Eventi pubblicati sul bus in-process", ("status",),
+              fn=lambda: {("published",): bus.published, ("error",): bus.errors})
+GaugeMetric("process_resident_memory_bytes", "RSS del processo", fn=lambda: _mem_rss_kb() * 1024)
+GaugeMetric("process_start_time_seconds", "Avvio del processo (epoch)", fn=lambda: round(_METRICS_STARTED, 3))
+
+
+# --- src/backend/services/cache.py ---
+# ─── Service Cache (TTL + single-flight + stale-while-revalidate) ────────────
+# Le funzioni di servizio sono sincrone e girano nei thread dell'executor (bg):
+# la cache è quindi thread-safe e coalizza i chiamanti concorrenti sulla stessa chiave.
+
+_CACHE_REGISTRY: dict = {}
+
+class ServiceCache:
+    """Wrapper per una funzione sincrona: risultato in cache per `ttl` secondi.
+    - single-flight: chiamanti concorrenti con gli stessi argomenti attendono un'unica esecuzione
+    - stale-while-revalidate: scaduto da meno di `stale` secondi → valore vecchio subito,
+      refresh in background
+    - invalidate(*args) / invalidate() per svuotare una chiave o tutto
+    Le eccezioni non vengono messe in cache."""
+
+    def __init__(self, fn, ttl: float, stale: float = 0, name: str = "", maxsize: int = 64):
+        self.fn = fn
+        self.ttl = ttl
+        self.stale = stale
+        self.name = name or fn.__name__
+        self.maxsize = maxsize
+        self._lock = threading.Lock()
+        self._entries: dict = {}   # key → (value, ts monotonic)
+        self._inflight: dict = {}  # key → concurrent.futures.Future
+        self.hits = 0
+        self.misses = 0
+        self.stale_hits = 0
+        self.coalesced = 0
+        self.errors = 0
+        _CACHE_REGISTRY[self.name] = self
+
+    @staticmethod
+    def _key(args, kwargs):
+        return (args, tuple(sorted(kwargs.items()))) if kwargs else args
+
+    def __call__(self, *args, **kwargs):
+        key = self._key(args, kwargs)
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                age = now - entry[1]
+                if age < self.ttl:
+                    self.hits += 1
+                    return entry[0]
+                if age < self.ttl + self.stale:
+                    self.stale_hits += 1
+                    if key not in self._inflight:
+                        fut = concurrent.futures.Future()
+                        self._inflight[key] = fut
+                        threading.Thread(target=self._refresh, args=(key, fut, args, kwargs),
+                                         daemon=True, name=f"cache-{self.name}").start()
+                    return entry[0]
+            fut = self._inflight.get(key)
+            if fut is None:
+                fut = concurrent.futures.Future()
+                self._inflight[key] = fut
+                self.misses += 1
+                owner = True
+            else:
+                self.coalesced += 1
+                owner = False
+        if owner:
+            return self._compute(key, fut, args, kwargs)
+        return fut.result()
+
+    def _compute(self, key, fut, args, kwargs):
+        try:
+            value = self.fn(*args, **kwargs)
+        except BaseException as e:
+            with self._lock:
+                self._inflight.pop(key, None)
+                self.errors += 1
+            fut.set_exception(e)
+            raise
+        with self._lock:
+            self._entries[key] = (value, time.monotonic())
+            if len(self._entries) > self.maxsize:
+                self._entries.pop(next(iter(self._entries)))
+            self._inflight.pop(key, None)
+        fut.set_result(value)
+        return value
+
+    def _refresh(self, key, fut, args, kwargs):
+        try:
+            self._compute(key, fut, args, kwargs)
+        except Exception as e:
+            print(f"[Cache] {self.name}: refresh fallito: {e}")
+
+    def invalidate(self, *args, **kwargs):
+        """Invalida la chiave per questi argomenti; senza argomenti svuota tutto."""
+        with self._lock:
+            if args or kwargs:
+                self._entries.pop(self._key(args, kwargs), None)
+            else:
+                self._entries.clear()
+
+    def peek(self, *args, **kwargs):
+        """Valore in cache (anche scaduto) senza eseguire la funzione. None se assente."""
+        entry = self._entries.get(self._key(args, kwargs))
+        return entry[0] if entry else None
+
+    def stats(self) -> dict:
+        total = self.hits + self.stale_hits + self.coalesced + self.misses
+        return {"hits": self.hits, "misses": self.misses, "stale_hits": self.stale_hits,
+                "coalesced": self.coalesced, "errors": self.errors,
+                "entries": len(self._entries), "ttl": self.ttl, "stale": self.stale,
+                "hit_rate": round((total - self.misses) / total, 3) if total else 0}
+
+
+def cached(ttl: float, stale: float = 0, name: str = "", maxsize: int = 64):
+    """Decorator dichiarativo: @cached(ttl=60, stale=300)."""
+    def deco(fn):
+        cache = ServiceCache(fn, ttl, stale, name, maxsize)
+        functools.update_wrapper(cache, fn)
+        return cache
+    return deco
+
+
+def cache_invalidate(name: str) -> bool:
+    """Invalida per nome (es. da handler dopo una scrittura). True se la cache esiste."""
+    cache = _CACHE_REGISTRY.get(name)
+    if cache is None:
+        return False
+    cache.invalidate()
+    return True
+
+
+def cache_stats() -> dict:
+    """Contatori hit/miss per tutte le cache registrate."""
+    return {name: c.stats() for name, c in _CACHE_REGISTRY.items()}
+
+
+# --- src/backend/services/bus.py ---
+# ─── Event bus in-process (Sigil: stato, mood, crypto, alert) ───────────────
+# I servizi pubblicano eventi tipizzati; routes/tamagotchi.py si iscrive e fa il
+# broadcast verso ESP32 e dashboard. Niente HTTP loopback né lookup in globals().
+# Gli script cron (goodnight, check_in, task_reminder, briefing) pubblicano dallo
+# stesso bus via Unix socket: una riga JSON per messaggio.
+BUS_SOCKET = os.environ.get("VESSEL_BUS_SOCKET", str(Path.home() / ".nanobot" / "vessel_bus.sock"))
+SIGIL_STATES = frozenset({"IDLE", "THINKING", "WORKING", "PROUD", "SLEEPING", "ERROR", "BOOTING",
+                          "HAPPY", "ALERT", "CURIOUS", "BORED", "PEEKING"})
+
+@dataclass(frozen=True)
+class SigilState:
+    topic: ClassVar[str] = "sigil.state"
+    state: str
+    detail: str = ""
+    text: str = ""
+    mood: dict | None = None
+
+    def __post_init__(self):
+        if self.state not in SIGIL_STATES:
+            raise ValueError(f"Stato non valido: {self.state}")
+
+@dataclass(frozen=True)
+class SigilText:
+    topic: ClassVar[str] = "sigil.text"
+    text: str
+
+    def __post_init__(self):
+        if not self.text or len(self.text) > 64:
+            raise ValueError("Testo vuoto o troppo lungo (max 64)")
+
+@dataclass(frozen=True)
+class CryptoUpdate:
+    topic: ClassVar[str] = "crypto.update"
+    btc: float
+    eth: float = 0
+    btc_change: float = 0
+    eth_change: float = 0
+
+@dataclass(frozen=True)
+class Alert:
+    topic: ClassVar[str] = "alert"
+    source: str
+    message: str
+    key: str = ""
+
+BUS_EVENTS = {cls.topic: cls for cls in (SigilState, SigilText, CryptoUpdate, Alert)}
+
+
+class EventBus:
+    """Pub/sub per tipo di evento. Gli handler sono coroutine; un handler che
+    fallisce viene loggato e non blocca gli altri."""
+
+    def __init__(self):
+        self._subs: dict[type, list] = {}
+        self._queries: dict = {}
+        self.published = 0
+        self.errors = 0
+
+    def subscribe(self, event_type: type, handler):
+        self._subs.setdefault(event_type, []).append(handler)
+        return handler
+
+    def on(self, event_type: type):
+        """Decorator: @bus.on(SigilState)."""
+        return lambda handler: self.subscribe(event_type, handler)
+
+    def provide(self, name: str, fn):
+        """Registra una lettura sincrona esposta al socket (es. "sigil.mood")."""
+        self._queries[name] = fn
+
+    async def publish(self, event):
+        self.published += 1
+        for handler in self._subs.get(type(event), ()):
+            try:
+                await handler(event)
+            except Exception as e:
+                self.errors += 1
+                print(f"[Bus] {event.topic}: handler {getattr(handler, '__name__', handler)} fallito: {e}")
+
+    def query(self, name: str):
+        fn = self._queries.get(name)
+        if fn is None:
+            raise ValueError(f"Query sconosciuta: {name}")
+        return fn()
+
+    def stats(self) -> dict:
+        return {"published": self.published, "errors": self.errors,
+                "subscribers": {t.topic: len(h) for t, h in self._subs.items()}}
+
+
+bus = EventBus()
+
+
+def bus_event(topic: str, data: dict):
+    """Evento tipizzato da topic + dict (socket, REST). ValueError se non valido."""
+    cls = BUS_EVENTS.get(topic)
+    if cls is None:
+        raise ValueError(f"Topic sconosciuto: {topic}")
+    if data is not None and not isinstance(data, dict):
+        raise ValueError(f"{topic}: data deve essere un oggetto")
+    names = {f.name for f in dataclass_fields(cls)}
+    try:
+        return cls(**{k: v for k, v in (data or {}).items() if k in names})
+    except TypeError as e:
+        raise ValueError(f"{topic}: {e}")
+
+
+async def bus_dispatch(msg: dict) -> dict:
+    """Un messaggio nel formato del socket (usato anche dai job in-process):
+    {"topic": "sigil.state", "data": {...}} → {"ok": true}
+    {"query": "sigil.mood"}                 → {"ok": true, "data": {...}}"""
+    if not isinstance(msg, dict):
+        return {"ok": False, "error": "messaggio non valido: atteso un oggetto JSON"}
+    try:
+        if "query" in msg:
+            return {"ok": True, "data": bus.query(msg["query"])}
+        await bus.publish(bus_event(msg.get("topic", ""), msg.get("data")))
+        return {"ok": True}
+    except ValueError as e:
+        return {"ok": False, "error": str(e)}
+
+
+async def _bus_client(reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+    """Una riga JSON per messaggio (vedi bus_dispatch)."""
+    try:
+        while line := await reader.readline():
+            try:
+                reply = await bus_dispatch(json.loads(line))
+            except ValueError as e:
+                reply = {"ok": False, "error": str(e)}
+            writer.write((json.dumps(reply) + "\n").encode("utf-8"))
+            await writer.drain()
+    except ConnectionError:
+        pass
+    finally:
+        writer.close()
+
+
+async def start_bus_socket():
+    """Socket per gli script locali (solo utente: 0600)."""
+    path = Path(BUS_SOCKET)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    if path.exists():
+        path.unlink()
+    server = await asyncio.start_unix_server(_bus_client, path=str(path))
+    os.chmod(path, 0o600)
+    print(f"[Bus] Socket pronto su {path}")
+    return server
+
+
+# --- src/backend/services/assets.py ---
+# ─── Static assets (bundle precompressi + ETag + 304) ────────────────────────
+# build.py genera STATIC_BUNDLES: nome content-hashed → testo + gzip/br in base64.
+# Qui si decodificano una volta sola; le pagine (HTML, login, sw.js, manifest)
+# vengono compresse al primo accesso e poi servite sempre dalla stessa entry.
+
+STATIC_CACHE_CONTROL = "private, max-age=31536000, immutable"  # nome cambia a ogni build
+PAGE_CACHE_CONTROL = "no-cache"  # sempre rivalidata via ETag
+
+def _asset_entry(body, content_type: str, gz: bytes | None = None, br: bytes | None = None,
+                 etag: str = "") -> dict:
+    if isinstance(body, str):
+        body = body.encode("utf-8")
+    if gz is None:
+        gz = gzip.compress(body, 9, mtime=0)
+    if br is None and brotli is not None:
+        br = brotli.compress(body)
+    return {
+        "type": content_type,
+        "etag": etag or f'"{hashlib.sha256(body).hexdigest()[:16]}"',
+        "identity": body,
+        "gzip": gz,
+        "br": br,
+    }
+
+STATIC_ASSETS: dict[str, dict] = {
+    name: _asset_entry(a["raw"], a["type"],
+                       gz=base64.b64decode(a["gz"]),
+                       br=base64.b64decode(a["br"]) if "br" in a else None,
+                       etag=a["etag"])
+    for name, a in STATIC_BUNDLES.items()
+}
+
+_PAGE_ASSETS: dict[str, dict] = {}
+
+def page_asset(key: str, body, content_type: str) -> dict:
+    """Entry precompressa per una pagina generata in-process (calcolata una volta)."""
+    entry = _PAGE_ASSETS.get(key)
+    if entry is None:
+        entry = _asset_entry(body, content_type)
+        _PAGE_ASSETS[key] = entry
+    return entry
+
+def _accepted_encodings(request: Request) -> set[str]:
+    accepted = set()
+    for part in request.headers.get("accept-encoding", "").split(","):
+        token, _, params = part.strip().partition(";")
+        if token and params.replace(" ", "") not in ("q=0", "q=0.0"):
+            accepted.add(token.lower())
+    return accepted
+
+def serve_asset(request: Request, entry: dict, cache_control: str,
+                vary: str = "Accept-Encoding") -> Response:
+    """Risposta con ETag/Cache-Control; 304 se If-None-Match combacia,
+    altrimenti la variante già compressa migliore accettata dal client."""
+    headers = {"ETag": entry["etag"], "Cache-Control": cache_control, "Vary": vary}
+    if_none_match = request.headers.get("if-none-match", "")
+    if if_none_match:
+        tags = {t.strip().removeprefix("W/") for t in if_none_match.split(",")}
+        if "*" in tags or entry["etag"] in tags:
+            return Response(status_code=304, headers=headers)
+    accepted = _accepted_encodings(request)
+    if entry["br"] is not None and "br" in accepted:
+        body, headers["Content-Encoding"] = entry["br"], "br"
+    elif "gzip" in accepted:
+        body, headers["Content-Encoding"] = entry["gzip"], "gzip"
+    else:
+        body = entry["identity"]
+    return Response(content=body, media_type=entry["type"], headers=headers)
+
+
 # --- src/backend/services/system.py ---
 # ─── System Stats ────────────────────────────────────────────────────────────
 async def get_pi_stats() -> dict:
@@ -1663,14 +2654,34 @@ def get_tmux_sessions() -> list[dict]:
             sessions.append({"name": name, "info": line.strip()})
     return sessions
 
+_version_cache: dict = {"text": "", "ts": 0}
+VERSION_CACHE_TTL = 3600  # la CLI nanobot cambia solo con un upgrade
+
 def get_nanobot_version() -> str:
-    return run("nanobot --version 2>/dev/null | head -1") or "N/A"
+    """Versione nanobot CLI. Cache 1h (evita un subprocess ad ogni connessione WS)."""
+    now = time.time()
+    if _version_cache["text"] and now - _version_cache["ts"] < VERSION_CACHE_TTL:
+        return _version_cache["text"]
+    version = run("nanobot --version 2>/dev/null | head -1") or "N/A"
+    _version_cache["text"] = version
+    _version_cache["ts"] = now
+    return version
+
+_memory_preview_cache: dict = {"text": "", "mtime": 0.0}
 
 def get_memory_preview() -> str:
-    if MEMORY_FILE.exists():
-        lines = [l for l in MEMORY_FILE.read_text(encoding="utf-8").splitlines() if l.strip()]
-        return "\n".join(lines[:30]) if lines else "(vuota)"
-    return "(file non trovato)"
+    """Anteprima MEMORY.md. Riletta solo se il file cambia (mtime)."""
+    try:
+        mtime = MEMORY_FILE.stat().st_mtime
+    except OSError:
+        return "(file non trovato)"
+    if _memory_preview_cache["text"] and _memory_preview_cache["mtime"] == mtime:
+        return _memory_preview_cache["text"]
+    lines = [l for l in MEMORY_FILE.read_text(encoding="utf-8").splitlines() if l.strip()]
+    text = "\n".join(lines[:30]) if lines else "(vuota)"
+    _memory_preview_cache["text"] = text
+    _memory_preview_cache["mtime"] = mtime
+    return text
 
 def get_quickref_preview() -> str:
     if QUICKREF_FILE.exists():
@@ -1720,6 +2731,7 @@ def get_nanobot_logs(n: int = 80, search: str = "", date_filter: str = "") -> di
     return {"lines": result_lines, "total": total, "filtered": filtered}
 
 # ─── Cron ────────────────────────────────────────────────────────────────────
+@cached(ttl=300)
 def get_cron_jobs() -> list[dict]:
     HUMAN = {
         "0 * * * *": "ogni ora",  "*/5 * * * *": "ogni 5 min",
@@ -1779,6 +2791,7 @@ def add_cron_job(schedule: str, command: str) -> str:
     result = subprocess.run(
         ["crontab", "-"], input=new_crontab, capture_output=True, text=True
     )
+    get_cron_jobs.invalidate()
     if result.returncode == 0:
         return "ok"
     return f"Errore: {result.stderr[:100]}"
@@ -1797,6 +2810,7 @@ def delete_cron_job(line_index: int) -> str:
     result = subprocess.run(
         ["crontab", "-"], input=new_crontab, capture_output=True, text=True
     )
+    get_cron_jobs.invalidate()
     if result.returncode == 0:
         return "ok"
     return f"Errore: {result.stderr[:100]}"
@@ -1806,20 +2820,14 @@ BRIEFING_LOG = Path.home() / ".nanobot" / "briefing_log.jsonl"
 BRIEFING_SCRIPT = Path.home() / ".nanobot" / "workspace" / "skills" / "morning-briefing" / "briefing.py"
 BRIEFING_CRON = "30 7 * * *"  # 07:30 ogni giorno
 
+@cached(ttl=60)
 def get_briefing_data() -> dict:
     """Legge ultimo briefing da SQLite."""
     return db_get_briefing()
 
-def run_briefing() -> dict:
-    """Esegue briefing.py e restituisce il risultato."""
-    safe_parent = shlex.quote(str(BRIEFING_SCRIPT.parent))
-    safe_name = shlex.quote(str(BRIEFING_SCRIPT.name))
-    result = run(f"cd {safe_parent} && python3.13 {safe_name} 2>&1")
-    return get_briefing_data()
-
 # ─── Ollama Health ───────────────────────────────────────────────────────────
 def check_ollama_health() -> bool:
-    """Verifica se Ollama è raggiungibile."""
+    """Verifica se Ollama è raggiungibile (probe del health registry)."""
     try:
         req = urllib.request.Request(f"{OLLAMA_BASE}/api/tags")
         with urllib.request.urlopen(req, timeout=3) as resp:
@@ -1856,34 +2864,140 @@ def warmup_ollama():
         print(f"[Ollama] Warmup fallito: {e}")
 
 
+# --- src/backend/services/fetch.py ---
+# ─── Fetch HTTP condiviso (GET condizionali + cache su disco) ───────────────
+# Feed e API esterne (CoinGecko, HN, open-meteo, GitHub, PyPI, Reddit) passano
+# da qui: ETag/Last-Modified salvati su disco → richieste condizionali (304 =
+# niente corpo da scaricare), al massimo HTTP_HOST_LIMIT richieste per host,
+# contenuto vecchio servito se la fonte non risponde, latenza per fonte.
+# I job dello scheduler lo ricevono al posto del loro _fetch_url.
+HTTP_CACHE_DIR = Path.home() / ".nanobot" / "http_cache"
+HTTP_HOST_LIMIT = 2
+HTTP_USER_AGENT = "Vessel/1.0"
+
+_http_host_sems: dict[str, threading.BoundedSemaphore] = {}
+_http_lock = threading.Lock()
+_http_stats: dict[str, dict] = {}
+
+def _http_sem(host: str) -> threading.BoundedSemaphore:
+    with _http_lock:
+        sem = _http_host_sems.get(host)
+        if sem is None:
+            sem = _http_host_sems[host] = threading.BoundedSemaphore(HTTP_HOST_LIMIT)
+        return sem
+
+def _http_cache_key(url: str) -> Path:
+    return HTTP_CACHE_DIR / hashlib.sha256(url.encode("utf-8")).hexdigest()[:32]
+
+def _http_cache_read(url: str) -> tuple[dict, bytes | None]:
+    key = _http_cache_key(url)
+    try:
+        meta = json.loads(key.with_suffix(".json").read_text(encoding="utf-8"))
+        return meta, key.with_suffix(".body").read_bytes()
+    except (OSError, ValueError):
+        return {}, None
+
+def _http_cache_write(url: str, meta: dict, body: bytes | None = None):
+    """Il corpo si scrive prima dei metadati: un meta senza corpo non esiste mai."""
+    key = _http_cache_key(url)
+    try:
+        HTTP_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        if body is not None:
+            tmp = key.with_suffix(".tmp")
+            tmp.write_bytes(body)
+            tmp.replace(key.with_suffix(".body"))
+        key.with_suffix(".json").write_text(json.dumps(meta), encoding="utf-8")
+    except OSError as e:
+        print(f"[HTTP] cache {url[:60]}: {e}")
+
+def _http_record(source: str, status: str, latency_ms: int, error: str = ""):
+    with _http_lock:
+        s = _http_stats.setdefault(source, {"requests": 0, "not_modified": 0, "stale": 0, "errors": 0,
+                                            "total_ms": 0})
+        s["requests"] += 1
+        s["total_ms"] += latency_ms
+        s["not_modified"] += status == "not_modified"
+        s["stale"] += status == "stale"
+        s["errors"] += status == "error"
+        s.update(last_status=status, last_ms=latency_ms, last_error=error, at=time.time())
+
+def http_get(url: str, timeout: float = 10, source: str = "", headers: dict | None = None,
+             max_age: float = 0) -> dict:
+    """GET con validatori su disco. Ritorna {"body", "status", "latency_ms", "error"}:
+    status "ok" (200), "not_modified" (304, corpo dalla cache), "fresh" (cache più giovane
+    di max_age, nessuna richiesta), "stale" (fonte in errore, corpo vecchio), "error" (body None)."""
+    parts = urllib.parse.urlsplit(url)
+    source = source or (parts.netloc + parts.path)[:60]
+    meta, cached_body = _http_cache_read(url)
+    if max_age and cached_body is not None and time.time() - meta.get("fetched_at", 0) < max_age:
+        return {"body": cached_body, "status": "fresh", "latency_ms": 0, "error": ""}
+    req_headers = {"User-Agent": HTTP_USER_AGENT, **(headers or {})}
+    if cached_body is not None:
+        if meta.get("etag"):
+            req_headers["If-None-Match"] = meta["etag"]
+        if meta.get("last_modified"):
+            req_headers["If-Modified-Since"] = meta["last_modified"]
+    t0 = time.time()
+    body, status, error = None, "ok", ""
+    try:
+        with _http_sem(parts.netloc):
+            with urllib.request.urlopen(urllib.request.Request(url, headers=req_headers), timeout=timeout) as r:
+                body = r.read()
+                validators = {"etag": r.headers.get("ETag", ""), "last_modified": r.headers.get("Last-Modified", "")}
+        _http_cache_write(url, {**validators, "fetched_at": time.time()}, body)
+    except urllib.error.HTTPError as e:
+        if e.code == 304 and cached_body is not None:
+            body, status = cached_body, "not_modified"
+            _http_cache_write(url, {**meta, "fetched_at": time.time()})
+        else:
+            error = f"HTTP {e.code}"
+    except Exception as e:
+        error = str(e)[:120] or type(e).__name__
+    if error:
+        body, status = cached_body, "stale" if cached_body is not None else "error"
+    latency = int((time.time() - t0) * 1000)
+    _http_record(source, status, latency, error)
+    return {"body": body, "status": status, "latency_ms": latency, "error": error}
+
+def http_fetch(url: str, timeout: float = 10, source: str = "", **kwargs) -> bytes | None:
+    """Solo il corpo (anche stale), None se la fonte è giù e non c'è cache."""
+    return http_get(url, timeout, source, **kwargs)["body"]
+
+def http_fetch_stats() -> dict:
+    """Per fonte: richieste, 304, stale, errori, latenza ultima/media."""
+    with _http_lock:
+        return {src: {**{k: v for k, v in s.items() if k != "total_ms"},
+                      "avg_ms": round(s["total_ms"] / s["requests"]) if s["requests"] else 0}
+                for src, s in _http_stats.items()}
+
+
 # --- src/backend/services/crypto.py ---
 # ─── Crypto ──────────────────────────────────────────────────────────────────
-_crypto_cache: dict = {}
-
+@cached(ttl=60, stale=240)
 def get_crypto_prices() -> dict:
-    """Fetch BTC/ETH prezzi da CoinGecko API pubblica, con cache fallback."""
-    global _crypto_cache
+    """Fetch BTC/ETH prezzi da CoinGecko API pubblica (http_get: stale da disco se giù)."""
     data = {"btc": None, "eth": None, "error": None}
+    url = "https://api.coingecko.com/api/v3/simple/price?ids=bitcoin,ethereum&vs_currencies=usd,eur&include_24hr_change=true"
+    res = http_get(url, timeout=10, source="coingecko")
+    if res["body"] is None:
+        data["error"] = res["error"][:100]
+        return data
     try:
-        url = "https://api.coingecko.com/api/v3/simple/price?ids=bitcoin,ethereum&vs_currencies=usd,eur&include_24hr_change=true"
-        req = urllib.request.Request(url, headers={"User-Agent": "Vessel-Dashboard/1.0"})
-        with urllib.request.urlopen(req, timeout=10) as resp:
-            raw = json.loads(resp.read())
-        if "bitcoin" in raw:
-            b = raw["bitcoin"]
-            data["btc"] = {"usd": b.get("usd", 0), "eur": b.get("eur", 0),
-                           "change_24h": round(b.get("usd_24h_change", 0), 2)}
-        if "ethereum" in raw:
-            e = raw["ethereum"]
-            data["eth"] = {"usd": e.get("usd", 0), "eur": e.get("eur", 0),
-                           "change_24h": round(e.get("usd_24h_change", 0), 2)}
-        _crypto_cache = {"btc": data["btc"], "eth": data["eth"], "ts": time.time()}
-    except Exception as ex:
+        raw = json.loads(res["body"])
+    except ValueError as ex:
         data["error"] = str(ex)[:100]
-        if _crypto_cache:
-            data["btc"] = _crypto_cache.get("btc")
-            data["eth"] = _crypto_cache.get("eth")
-            data["error"] = f"cached ({data['error']})"
+        return data
+    if "bitcoin" in raw:
+        b = raw["bitcoin"]
+        data["btc"] = {"usd": b.get("usd", 0), "eur": b.get("eur", 0),
+                       "change_24h": round(b.get("usd_24h_change", 0), 2)}
+    if "ethereum" in raw:
+        e = raw["ethereum"]
+        data["eth"] = {"usd": e.get("usd", 0), "eur": e.get("eur", 0),
+                       "change_24h": round(e.get("usd_24h_change", 0), 2)}
+    if res["status"] == "stale":
+        # CoinGecko giù: ultimi prezzi salvati su disco (sopravvivono ai restart)
+        data["error"] = f"cached ({res['error'][:100]})"
     return data
 
 
@@ -1967,24 +3081,6 @@ def _provider_defaults(provider_id: str) -> tuple:
         return BRAIN_MODEL, BRAIN_SYSTEM
     return OLLAMA_MODEL, OLLAMA_SYSTEM
 
-# ─── Tamagotchi helper (REST locale, evita import circolari) ──────────────────
-def _set_tamagotchi_local(state: str, detail: str = "", text: str = ""):
-    """Imposta stato tamagotchi via REST locale (non importa routes)."""
-    try:
-        payload: dict = {"state": state}
-        if detail:
-            payload["detail"] = detail
-        if text:
-            payload["text"] = text
-        data = json.dumps(payload).encode("utf-8")
-        req = urllib.request.Request(
-            "http://127.0.0.1:8090/api/tamagotchi/state",
-            data=data, headers={"Content-Type": "application/json"}, method="POST"
-        )
-        urllib.request.urlopen(req, timeout=3)
-    except Exception:
-        pass
-
 
 # --- src/backend/services/knowledge.py ---
 # ─── Entity Extraction (Fase 17A — auto-popola Knowledge Graph) ──────────────
@@ -2224,12 +3320,497 @@ def build_context(chat_history: list, provider_id: str, system_prompt: str) -> l
     return selected
 
 
+# --- src/backend/services/google.py ---
+# ─── Google Workspace (worker google_helper persistente) ────────────────────
+# google_helper.py gira nel venv google-workspace-mcp. Invece di un interprete
+# nuovo per comando (import librerie + credenziali: 2-4s) si parla via Unix
+# socket con un worker `google_helper.py serve` sempre caldo, avviato al primo
+# uso. Se il worker non risponde si ripiega sul subprocess one-shot.
+GOOGLE_HELPER_PY = str(Path.home() / ".local/share/google-workspace-mcp/bin/python")
+GOOGLE_HELPER_SCRIPT = str(Path.home() / "scripts/google_helper.py")
+GOOGLE_HELPER_SOCKET = os.environ.get("GOOGLE_HELPER_SOCKET",
+                                      str(Path.home() / ".nanobot" / "google_helper.sock"))
+GOOGLE_SPAWN_COOLDOWN = 60  # secondi tra due tentativi di avvio del worker
+
+_google_spawn_lock = threading.Lock()
+_google_spawned_at = 0.0
+
+def _google_rpc(argv: list, timeout: float) -> str:
+    """Una richiesta JSON-RPC al worker. OSError se non raggiungibile."""
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as s:
+        s.settimeout(timeout)
+        s.connect(GOOGLE_HELPER_SOCKET)
+        s.sendall((json.dumps({"jsonrpc": "2.0", "id": 1, "method": "call",
+                               "params": {"argv": argv}}) + "\n").encode("utf-8"))
+        buf = b""
+        while not buf.endswith(b"\n"):
+            chunk = s.recv(65536)
+            if not chunk:
+                break
+            buf += chunk
+    resp = json.loads(buf)
+    if "error" in resp:
+        return resp["error"].get("message", "errore google_helper")
+    return resp.get("result", {}).get("output", "")
+
+def _google_spawn():
+    """Avvia il worker in background (sessione separata: sopravvive ai restart)."""
+    global _google_spawned_at
+    with _google_spawn_lock:
+        if time.time() - _google_spawned_at < GOOGLE_SPAWN_COOLDOWN:
+            return
+        _google_spawned_at = time.time()
+    try:
+        subprocess.Popen([GOOGLE_HELPER_PY, GOOGLE_HELPER_SCRIPT, "serve", "--socket", GOOGLE_HELPER_SOCKET],
+                         stdin=subprocess.DEVNULL, stdout=subprocess.DEVNULL,
+                         stderr=subprocess.DEVNULL, start_new_session=True)
+        print(f"[Google] Worker avviato su {GOOGLE_HELPER_SOCKET}")
+    except Exception as e:
+        print(f"[Google] Avvio worker fallito: {e}")
+
+def google_call(argv: list, timeout: float = 30) -> str:
+    """Esegue un comando google_helper (es. ["tasks", "list"]) e ritorna l'output.
+    Sincrona: chiamare via bg() dagli handler async."""
+    if not Path(GOOGLE_HELPER_SCRIPT).exists():
+        return ""
+    try:
+        return _google_rpc(argv, timeout).strip()
+    except (OSError, ValueError):
+        pass
+    if Path(GOOGLE_HELPER_PY).exists():
+        _google_spawn()
+    try:
+        r = subprocess.run([GOOGLE_HELPER_PY, GOOGLE_HELPER_SCRIPT] + argv,
+                           capture_output=True, text=True, timeout=timeout)
+        return (r.stdout + r.stderr).strip()
+    except Exception as e:
+        print(f"[Google] {' '.join(argv)}: {e}")
+        return ""
+
+
 # --- src/backend/services/telegram.py ---
 # ─── Telegram ────────────────────────────────────────────────────────────────
+TELEGRAM_API_HOST = "api.telegram.org"
+TELEGRAM_MAX_MESSAGE = 4096
+TELEGRAM_CHAT_INTERVAL = 1.0     # max ~1 msg/s per chat (limite Telegram)
+TELEGRAM_GLOBAL_INTERVAL = 1 / 30  # max ~30 msg/s complessivi
+TELEGRAM_MAX_INFLIGHT = 4        # update in ingresso gestiti in parallelo
+TELEGRAM_SEND_RETRIES = 5
+TELEGRAM_EDIT_INTERVAL = 1.5     # streaming: edit dello stesso messaggio al più ogni 1.5s
+TELEGRAM_STREAM_PLACEHOLDER = "…"
+
+
+class _KeepAliveHTTPS:
+    """Connessione HTTP/1.1 keep-alive su asyncio streams: una richiesta alla volta,
+    riconnessione trasparente se il server ha chiuso la connessione inattiva."""
+
+    def __init__(self, host: str, port: int = 443, tls: bool = True):
+        self.host = host
+        self.port = port
+        self.tls = tls
+        self._reader = None
+        self._writer = None
+        self._lock = asyncio.Lock()
+        self.requests = 0
+        self.connects = 0
+
+    async def _connect(self):
+        self._reader, self._writer = await asyncio.open_connection(
+            self.host, self.port, ssl=ssl.create_default_context() if self.tls else None)
+        self.connects += 1
+
+    def close(self):
+        if self._writer is not None:
+            self._writer.close()
+        self._reader = self._writer = None
+
+    async def request(self, method: str, path: str, body: bytes | list = b"",
+                      content_type: str = "application/json", timeout: float = 15) -> tuple[int, bytes]:
+        async with self._lock:
+            for attempt in range(2):
+                reused = self._writer is not None
+                try:
+                    if not reused:
+                        try:
+                            # Stesso timeout della richiesta: un handshake lento non
+                            # deve tenere il lock (e tutti gli invii in coda) all'infinito
+                            await asyncio.wait_for(self._connect(), timeout)
+                        except (OSError, asyncio.TimeoutError) as e:
+                            e._not_sent = True   # niente è partito: ritentare è sicuro
+                            raise
+                    return await asyncio.wait_for(self._roundtrip(method, path, body, content_type), timeout)
+                except (ConnectionError, asyncio.IncompleteReadError, ssl.SSLError) as e:
+                    self.close()
+                    # Connessione riusata chiusa dal server mentre era inattiva:
+                    # la richiesta non è stata elaborata, si riprova su una nuova
+                    if attempt or not reused or not getattr(e, "_no_response", False):
+                        raise
+                except BaseException:
+                    self.close()
+                    raise
+
+    async def _roundtrip(self, method: str, path: str, body: bytes | list, content_type: str) -> tuple[int, bytes]:
+        # body può essere una lista di buffer (multipart): scritti uno per uno, senza join
+        chunks = body if isinstance(body, list) else [body]
+        length = sum(len(c) for c in chunks)
+        head = (f"{method} {path} HTTP/1.1\r\nHost: {self.host}\r\n"
+                f"User-Agent: Vessel-Dashboard/1.0\r\nConnection: keep-alive\r\n")
+        if length or method == "POST":
+            head += f"Content-Type: {content_type}\r\nContent-Length: {length}\r\n"
+        try:
+            self._writer.write(head.encode() + b"\r\n")
+            for chunk in chunks:
+                if chunk:
+                    self._writer.write(chunk)
+            await self._writer.drain()
+            status_line = await self._reader.readline()
+        except ConnectionError as e:
+            e._no_response = True
+            raise
+        if not status_line:
+            err = ConnectionResetError("connessione chiusa dal server")
+            err._no_response = True
+            raise err
+        self.requests += 1
+        status = int(status_line.split()[1])
+        headers = {}
+        while True:
+            line = await self._reader.readline()
+            if line in (b"\r\n", b"\n", b""):
+                break
+            k, _, v = line.decode("latin-1").partition(":")
+            headers[k.strip().lower()] = v.strip()
+        if headers.get("transfer-encoding", "").lower() == "chunked":
+            data = bytearray()
+            while True:
+                size = int((await self._reader.readline()).split(b";")[0], 16)
+                if size == 0:
+                    await self._reader.readline()
+                    break
+                data += await self._reader.readexactly(size)
+                await self._reader.readline()
+            data = bytes(data)
+        elif "content-length" in headers:
+            data = await self._reader.readexactly(int(headers["content-length"]))
+        else:
+            data = await self._reader.read()
+            self.close()
+        if headers.get("connection", "").lower() == "close":
+            self.close()
+        return status, data
+
+
+def _split_message(text: str, limit: int = TELEGRAM_MAX_MESSAGE) -> list[str]:
+    """Divide un testo lungo in parti <= limit, preferendo paragrafi, righe, spazi.
+    Markdown-safe: un blocco ``` spezzato viene chiuso a fine parte e riaperto
+    all'inizio della successiva, così ogni messaggio resta ben formato."""
+    parts = []
+    fence = "```"
+    while len(text) > limit:
+        room = limit - len(fence) - 1  # spazio per un'eventuale chiusura del blocco
+        cut = -1
+        for sep in ("\n\n", "\n", " "):
+            cut = text.rfind(sep, room // 2, room)
+            if cut != -1:
+                break
+        if cut == -1:
+            cut = room
+        part, text = text[:cut].rstrip(), text[cut:].lstrip()
+        if part.count(fence) % 2:
+            part += "\n" + fence
+            text = fence + "\n" + text
+        parts.append(part)
+    if text:
+        parts.append(text)
+    return parts
+
+
+def _multipart(fields: dict, files: dict, boundary: str = "----VesselTelegramBoundary") -> tuple[list, int, str]:
+    """Body multipart/form-data come lista di buffer, senza concatenarli: i file
+    entrano come memoryview (zero copie). Ritorna (parti, lunghezza, content-type).
+    files: nome → (filename, content_type, bytes)."""
+    parts = []
+    for name, value in fields.items():
+        parts.append(f'--{boundary}\r\nContent-Disposition: form-data; name="{name}"\r\n\r\n{value}\r\n'.encode())
+    for name, (filename, ctype, data) in files.items():
+        parts.append(f'--{boundary}\r\nContent-Disposition: form-data; name="{name}"; filename="{filename}"\r\n'
+                     f"Content-Type: {ctype}\r\n\r\n".encode())
+        parts.append(memoryview(data))
+        parts.append(b"\r\n")
+    parts.append(f"--{boundary}--\r\n".encode())
+    return parts, sum(len(p) for p in parts), f"multipart/form-data; boundary={boundary}"
+
+
+class TelegramRetryAfter(Exception):
+    def __init__(self, retry_after: float, description: str = ""):
+        super().__init__(description or f"retry after {retry_after}s")
+        self.retry_after = retry_after
+
+
+class TelegramClient:
+    """Client Bot API asincrono.
+    - due connessioni keep-alive: una per il long polling, una per gli invii
+    - coda di uscita per chat: ordine garantito, ~1 msg/s per chat, ~30 msg/s globali
+    - 429 → attende `retry_after` e ritenta lo stesso messaggio (l'ordine resta)
+    - errori di rete: ritenta solo se la richiesta non è partita (niente doppioni)
+    - testi > 4096 caratteri divisi in più messaggi consecutivi"""
+
+    def __init__(self, token: str):
+        self.token = token
+        api = (TELEGRAM_API_HOST, 443, True)
+        if MOCK_URL:  # test di carico: Bot API servita da mock_llm.py
+            u = urllib.parse.urlsplit(MOCK_URL)
+            api = (u.hostname or "127.0.0.1", u.port or 80, u.scheme == "https")
+        self._send_conn = _KeepAliveHTTPS(*api)
+        self._poll_conn = _KeepAliveHTTPS(*api)
+        self._queues: dict[str, asyncio.Queue] = {}
+        self._workers: dict[str, asyncio.Task] = {}
+        self._chat_next: dict[str, float] = {}
+        self._global_next = 0.0
+        self._global_lock = asyncio.Lock()
+        self.loop: asyncio.AbstractEventLoop | None = None
+        self.sent = 0
+        self.retries_429 = 0
+        self.errors = 0
+
+    async def api(self, method: str, payload: dict | None = None, files: dict | None = None,
+                  poll: bool = False, timeout: float = 15):
+        """Chiama un metodo Bot API e ritorna `result`. Solleva TelegramRetryAfter su 429."""
+        if files:
+            body, _length, ctype = _multipart(payload or {}, files)
+        else:
+            body, ctype = json.dumps(payload or {}).encode("utf-8"), "application/json"
+        conn = self._poll_conn if poll else self._send_conn
+        status, raw = await conn.request("POST", f"/bot{self.token}/{method}", body, ctype, timeout=timeout)
+        try:
+            data = json.loads(raw)
+        except ValueError:
+            raise RuntimeError(f"{method}: HTTP {status}, risposta non JSON")
+        if status == 429 or data.get("error_code") == 429:
+            raise TelegramRetryAfter(data.get("parameters", {}).get("retry_after", 1), data.get("description", ""))
+        if not data.get("ok"):
+            raise RuntimeError(f"{method}: {data.get('description', f'HTTP {status}')}")
+        return data.get("result")
+
+    def _enqueue(self, chat_id: str, method: str, payload: dict, files: dict | None) -> asyncio.Future:
+        self.loop = asyncio.get_running_loop()
+        fut = self.loop.create_future()
+        queue = self._queues.get(chat_id)
+        if queue is None:
+            queue = self._queues[chat_id] = asyncio.Queue()
+        queue.put_nowait((method, payload, files, fut))
+        worker = self._workers.get(chat_id)
+        if worker is None or worker.done():
+            self._workers[chat_id] = asyncio.create_task(self._chat_worker(chat_id, queue))
+        return fut
+
+    async def _throttle(self, chat_id: str):
+        wait = self._chat_next.get(chat_id, 0) - time.monotonic()
+        if wait > 0:
+            await asyncio.sleep(wait)
+        async with self._global_lock:
+            wait = self._global_next - time.monotonic()
+            if wait > 0:
+                await asyncio.sleep(wait)
+            self._global_next = time.monotonic() + TELEGRAM_GLOBAL_INTERVAL
+
+    async def _chat_worker(self, chat_id: str, queue: asyncio.Queue):
+        """Un worker per chat: invia in ordine FIFO, un messaggio alla volta."""
+        while True:
+            try:
+                method, payload, files, fut = await asyncio.wait_for(queue.get(), timeout=300)
+            except asyncio.TimeoutError:
+                if queue.empty():
+                    self._workers.pop(chat_id, None)
+                    return
+                continue
+            t0 = time.time()
+            result, error = None, None
+            for _attempt in range(TELEGRAM_SEND_RETRIES):
+                await self._throttle(chat_id)
+                try:
+                    result = await self.api(method, payload, files, timeout=30 if files else 15)
+                    error = None
+                    break
+                except TelegramRetryAfter as e:
+                    self.retries_429 += 1
+                    print(f"[Telegram] 429 su {method}: attendo {e.retry_after}s")
+                    self._chat_next[chat_id] = time.monotonic() + e.retry_after
+                    error = e
+                except RuntimeError as e:
+                    error = e  # rifiutato da Telegram (400/403): inutile ritentare
+                    break
+                except Exception as e:
+                    error = e
+                    # Si ritenta solo se la richiesta non è arrivata a Telegram (connect
+                    # fallita, connessione chiusa prima di qualunque risposta). Un timeout
+                    # o un reset dopo l'invio può nascondere un messaggio già consegnato:
+                    # sendMessage/sendVoice non sono idempotenti, meglio perderlo che doppio
+                    if not (getattr(e, "_not_sent", False) or getattr(e, "_no_response", False)):
+                        break
+                    await asyncio.sleep(1)
+                finally:
+                    self._chat_next[chat_id] = max(self._chat_next.get(chat_id, 0),
+                                                   time.monotonic() + TELEGRAM_CHAT_INTERVAL)
+            latency = int((time.time() - t0) * 1000)
+            if error is None:
+                self.sent += 1
+                db_log_event("telegram", "send", status="ok", latency_ms=latency,
+                             payload={"method": method,
+                                      "chars": len(payload.get("text", payload.get("caption", "")))})
+            else:
+                self.errors += 1
+                print(f"[Telegram] {method} error: {error}")
+                db_log_event("telegram", "send", status="error", latency_ms=latency,
+                             payload={"method": method}, error=str(error)[:200])
+            if not fut.done():
+                fut.set_result(result if error is None else None)
+
+    async def send_message(self, text: str, chat_id: str = "", wait: bool = True, **extra) -> list:
+        """Accoda un testo (diviso se > 4096). Con wait=True attende l'invio e
+        ritorna i Message inviati (None per le parti fallite)."""
+        chat_id = chat_id or TELEGRAM_CHAT_ID
+        futs = [self._enqueue(chat_id, "sendMessage", {"chat_id": chat_id, "text": part, **extra}, None)
+                for part in _split_message(text or "(vuoto)")]
+        if not wait:
+            return []
+        return list(await asyncio.gather(*futs))
+
+    async def edit_message(self, message_id: int, text: str, chat_id: str = "", **extra):
+        """Sostituisce il testo di un messaggio già inviato (stessa coda della chat)."""
+        chat_id = chat_id or TELEGRAM_CHAT_ID
+        return await self._enqueue(chat_id, "editMessageText",
+                                   {"chat_id": chat_id, "message_id": message_id, "text": text, **extra}, None)
+
+    async def send_voice(self, ogg_bytes: bytes, caption: str = "", chat_id: str = ""):
+        chat_id = chat_id or TELEGRAM_CHAT_ID
+        fields = {"chat_id": chat_id}
+        if caption:
+            fields["caption"] = caption[:1024]
+        return await self._enqueue(chat_id, "sendVoice", fields,
+                                   {"voice": ("voice.ogg", "audio/ogg", ogg_bytes)})
+
+    async def get_updates(self, offset: int, timeout: int = 30) -> list:
+        """Long polling sulla connessione dedicata (non blocca gli invii)."""
+        self.loop = asyncio.get_running_loop()
+        return await self.api("getUpdates", {"offset": offset, "timeout": timeout,
+                                             "allowed_updates": ["message", "edited_message"]},
+                              poll=True, timeout=timeout + 10) or []
+
+    def stats(self) -> dict:
+        return {"sent": self.sent, "errors": self.errors, "retries_429": self.retries_429,
+                "queued": sum(q.qsize() for q in self._queues.values()),
+                "send_conn": {"requests": self._send_conn.requests, "connects": self._send_conn.connects},
+                "poll_conn": {"requests": self._poll_conn.requests, "connects": self._poll_conn.connects}}
+
+
+tg_client = TelegramClient(TELEGRAM_TOKEN)
+
+
+async def tg_send(text: str, wait: bool = True) -> bool:
+    """Invio asincrono alla chat configurata (via coda). True se tutte le parti sono partite."""
+    if not TELEGRAM_TOKEN or not TELEGRAM_CHAT_ID:
+        return False
+    sent = await tg_client.send_message(text, wait=wait)
+    return not wait or all(m is not None for m in sent)
+
+
+async def tg_send_voice(ogg_bytes: bytes, caption: str = "") -> bool:
+    if not TELEGRAM_TOKEN or not TELEGRAM_CHAT_ID or not ogg_bytes:
+        return False
+    return await tg_client.send_voice(ogg_bytes, caption) is not None
+
+
+class TelegramStreamer:
+    """Risposta progressiva: placeholder subito, poi editMessageText man mano
+    che arrivano i chunk (`on_chunk` di _execute_chat).
+    - al massimo un edit ogni TELEGRAM_EDIT_INTERVAL, uno solo in volo
+    - oltre 4096 caratteri la parte piena resta com'è e si continua in un nuovo messaggio
+    - finish() fa l'edit finale col testo definitivo
+    Se il placeholder non parte, ripiega su un invio normale a fine generazione."""
+
+    def __init__(self, chat_id: str = ""):
+        self.chat_id = chat_id or TELEGRAM_CHAT_ID
+        self.text = ""
+        self._ids: list = []     # message_id per parte
+        self._shown: list = []   # testo richiesto per parte (evita edit identici → 400)
+        self._dirty = asyncio.Event()
+        self._task: asyncio.Task | None = None
+        self.edits = 0
+
+    async def start(self, placeholder: str = TELEGRAM_STREAM_PLACEHOLDER):
+        sent = await tg_client.send_message(placeholder, chat_id=self.chat_id)
+        if sent and sent[0]:
+            self._ids.append(sent[0].get("message_id"))
+            self._shown.append(placeholder)
+            self._task = asyncio.create_task(self._flusher())
+
+    async def on_chunk(self, chunk: str):
+        self.text += chunk
+        self._dirty.set()
+
+    async def _flusher(self):
+        while True:
+            await self._dirty.wait()
+            self._dirty.clear()
+            await self._sync()
+            await asyncio.sleep(TELEGRAM_EDIT_INTERVAL)
+
+    async def _sync(self):
+        # Le parti già piene hanno un taglio stabile: si modifica solo quella che cresce
+        for i, part in enumerate(_split_message(self.text)):
+            if i < len(self._ids):
+                if self._shown[i] != part:
+                    self._shown[i] = part
+                    self.edits += 1
+                    await tg_client.edit_message(self._ids[i], part, chat_id=self.chat_id)
+            else:
+                sent = await tg_client.send_message(part, chat_id=self.chat_id)
+                self._ids.append(sent[0].get("message_id") if sent and sent[0] else None)
+                self._shown.append(part)
+
+    async def finish(self, final: str = "") -> str:
+        """Edit finale (testo definitivo, o quello accumulato se vuoto)."""
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+        self.text = final or self.text or "(vuoto)"
+        if not self._ids:
+            await tg_client.send_message(self.text, chat_id=self.chat_id)
+        else:
+            await self._sync()
+        return self.text
+
+
 def telegram_send(text: str) -> bool:
-    """Invia un messaggio al bot Telegram. Restituisce True se successo."""
+    """Versione sincrona per codice che gira nei thread dell'executor.
+    Se il client è attivo passa dalla sua coda; dal thread dell'event loop accoda
+    senza attendere (attendere qui bloccherebbe il loop)."""
     if not TELEGRAM_TOKEN or not TELEGRAM_CHAT_ID:
         return False
+    loop = tg_client.loop
+    if loop is not None and loop.is_running():
+        try:
+            running = asyncio.get_running_loop()
+        except RuntimeError:
+            running = None
+        if running is loop:
+            asyncio.ensure_future(tg_send(text, wait=False))
+            return True
+        fut = asyncio.run_coroutine_threadsafe(tg_send(text), loop)
+        try:
+            return fut.result(timeout=60)
+        except Exception as e:
+            print(f"[Telegram] send error: {e}")
+            return False
+    return _telegram_send_blocking(text)
+
+
+def _telegram_send_blocking(text: str) -> bool:
+    """Fallback urllib quando il client asincrono non è attivo (es. prima del lifespan)."""
     t0 = time.time()
     try:
         url = f"https://api.telegram.org/bot{TELEGRAM_TOKEN}/sendMessage"
@@ -2285,39 +3866,19 @@ def transcribe_voice(audio_bytes: bytes, filename: str = "voice.ogg") -> str:
     if not audio_bytes:
         return ""
     try:
-        boundary = "----VesselSTTBoundary"
-        body = b""
-        # Campo: file
-        body += f"--{boundary}\r\n".encode()
-        body += f'Content-Disposition: form-data; name="file"; filename="{filename}"\r\n'.encode()
-        body += b"Content-Type: audio/ogg\r\n\r\n"
-        body += audio_bytes
-        body += b"\r\n"
-        # Campo: model
-        body += f"--{boundary}\r\n".encode()
-        body += b'Content-Disposition: form-data; name="model"\r\n\r\n'
-        body += f"{GROQ_WHISPER_MODEL}\r\n".encode()
-        # Campo: language
-        body += f"--{boundary}\r\n".encode()
-        body += b'Content-Disposition: form-data; name="language"\r\n\r\n'
-        body += f"{GROQ_WHISPER_LANGUAGE}\r\n".encode()
-        # Campo: response_format
-        body += f"--{boundary}\r\n".encode()
-        body += b'Content-Disposition: form-data; name="response_format"\r\n\r\n'
-        body += b"json\r\n"
-        # Campo: temperature
-        body += f"--{boundary}\r\n".encode()
-        body += b'Content-Disposition: form-data; name="temperature"\r\n\r\n'
-        body += b"0\r\n"
-        # Chiudi boundary
-        body += f"--{boundary}--\r\n".encode()
-
+        parts, length, ctype = _multipart(
+            {"model": GROQ_WHISPER_MODEL, "language": GROQ_WHISPER_LANGUAGE,
+             "response_format": "json", "temperature": "0"},
+            {"file": (filename, "audio/ogg", audio_bytes)},
+            boundary="----VesselSTTBoundary")
+        # data iterabile: http.client invia le parti in sequenza (l'audio non viene copiato)
         req = urllib.request.Request(
             "https://api.groq.com/openai/v1/audio/transcriptions",
-            data=body, method="POST"
+            data=parts, method="POST"
         )
         req.add_header("Authorization", f"Bearer {GROQ_API_KEY}")
-        req.add_header("Content-Type", f"multipart/form-data; boundary={boundary}")
+        req.add_header("Content-Type", ctype)
+        req.add_header("Content-Length", str(length))
         req.add_header("User-Agent", "Vessel-Dashboard/1.0")
 
         with urllib.request.urlopen(req, timeout=30) as resp:
@@ -2331,110 +3892,268 @@ def transcribe_voice(audio_bytes: bytes, filename: str = "voice.ogg") -> str:
         return ""
 
 
-def text_to_voice(text: str) -> bytes:
-    """Converte testo in audio OGG Opus via Edge TTS + ffmpeg.
-    Restituisce bytes OGG pronti per Telegram sendVoice, bytes vuoti su errore."""
-    if not text or not text.strip():
-        return b""
-    # Tronca testo troppo lungo
-    if len(text) > TTS_MAX_CHARS:
-        text = text[:TTS_MAX_CHARS]
+# ─── TTS: Edge TTS → ffmpeg via pipe, cache content-addressed in RAM ─────────
+# L'MP3 di Edge TTS entra nello stdin di ffmpeg man mano che arriva e l'OGG Opus
+# si legge dallo stdout: nessun file temporaneo sulla SD. Le frasi ripetute
+# (saluti, conferme, briefing) escono dalla cache senza rete né ffmpeg.
+TTS_CACHE_MAX_BYTES = 8 * 1024 * 1024
+_FFMPEG_OPUS = ["ffmpeg", "-hide_banner", "-loglevel", "error", "-f", "mp3", "-i", "pipe:0",
+                "-c:a", "libopus", "-b:a", "48k", "-application", "voip", "-f", "ogg", "pipe:1"]
+_tts_cache: OrderedDict = OrderedDict()  # sha256(voce + testo) → bytes OGG
+_tts_cache_lock = threading.Lock()
+_tts_cache_size = 0
+TTS_STATS = {"hits": 0, "misses": 0, "errors": 0}
+
+def _tts_key(text: str) -> str:
+    return hashlib.sha256(f"{TTS_VOICE}\0{text}".encode("utf-8")).hexdigest()
+
+def _tts_cache_get(key: str) -> bytes | None:
+    with _tts_cache_lock:
+        ogg = _tts_cache.get(key)
+        if ogg is not None:
+            _tts_cache.move_to_end(key)
+        return ogg
+
+def _tts_cache_put(key: str, ogg: bytes):
+    global _tts_cache_size
+    if len(ogg) > TTS_CACHE_MAX_BYTES // 4:
+        return  # vocali lunghi: raramente ripetuti, non vale la pena
+    with _tts_cache_lock:
+        if key in _tts_cache:
+            return
+        _tts_cache[key] = ogg
+        _tts_cache_size += len(ogg)
+        while _tts_cache_size > TTS_CACHE_MAX_BYTES:
+            _, old = _tts_cache.popitem(last=False)
+            _tts_cache_size -= len(old)
+
+async def _edge_mp3_stream(text: str):
+    """Chunk MP3 di Edge TTS man mano che arrivano."""
+    import edge_tts
+    async for chunk in edge_tts.Communicate(text, TTS_VOICE).stream():
+        if chunk["type"] == "audio":
+            yield chunk["data"]
+
+async def _edge_mp3(text: str) -> bytes:
+    return b"".join([c async for c in _edge_mp3_stream(text)])
+
+async def _ffmpeg_opus(source) -> bytes:
+    """MP3 (iteratore asincrono di chunk) → ffmpeg stdin; OGG Opus letto da stdout.
+    Più segmenti MP3 in sequenza diventano un unico OGG. bytes vuoti su errore."""
     try:
-        import edge_tts
-        import tempfile
-        # Edge TTS genera MP3 — scriviamo su temp file
-        with tempfile.NamedTemporaryFile(suffix=".mp3", delete=False) as mp3_f:
-            mp3_path = mp3_f.name
-        ogg_path = mp3_path.replace(".mp3", ".ogg")
-        # Esegui edge-tts in modo sincrono (asyncio.run in thread separato)
-        async def _generate():
-            comm = edge_tts.Communicate(text, TTS_VOICE)
-            await comm.save(mp3_path)
-        # Usa un nuovo event loop (siamo in un thread executor)
-        import asyncio
-        try:
-            loop = asyncio.get_running_loop()
-        except RuntimeError:
-            loop = None
-        if loop and loop.is_running():
-            # Siamo già in un event loop — usa asyncio.run_coroutine_threadsafe
-            # Non dovrebbe succedere, ma gestiamo il caso
-            new_loop = asyncio.new_event_loop()
-            new_loop.run_until_complete(_generate())
-            new_loop.close()
-        else:
-            asyncio.run(_generate())
-        # Converti MP3 → OGG Opus via ffmpeg
-        result = subprocess.run(
-            ["ffmpeg", "-y", "-i", mp3_path, "-c:a", "libopus", "-b:a", "48k",
-             "-application", "voip", ogg_path],
-            capture_output=True, timeout=30
-        )
-        if result.returncode != 0:
-            print(f"[TTS] ffmpeg error: {result.stderr.decode()[:200]}")
-            return b""
-        with open(ogg_path, "rb") as f:
-            ogg_bytes = f.read()
-        try:
-            os.unlink(mp3_path)
-        except Exception:
-            pass
-        try:
-            os.unlink(ogg_path)
-        except Exception:
-            pass
-        if ogg_bytes:
-            print(f"[TTS] Generato vocale: {len(ogg_bytes)} bytes, {len(text)} chars")
-        return ogg_bytes
+        proc = await asyncio.create_subprocess_exec(
+            *_FFMPEG_OPUS, stdin=subprocess.PIPE, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
     except Exception as e:
         print(f"[TTS] Error: {e}")
         return b""
-
-
-def telegram_send_voice(ogg_bytes: bytes, caption: str = "") -> bool:
-    """Invia un messaggio vocale OGG Opus a Telegram via sendVoice API (multipart).
-    Restituisce True se successo."""
-    if not TELEGRAM_TOKEN or not TELEGRAM_CHAT_ID:
-        return False
-    if not ogg_bytes:
-        return False
+    # stdout/stderr letti in parallelo alla scrittura: nessun deadlock sui buffer delle pipe
+    out = asyncio.create_task(proc.stdout.read())
+    err = asyncio.create_task(proc.stderr.read())
     try:
-        boundary = "----VesselTTSBoundary"
-        body = b""
-        # Campo: chat_id
-        body += f"--{boundary}\r\n".encode()
-        body += b'Content-Disposition: form-data; name="chat_id"\r\n\r\n'
-        body += f"{TELEGRAM_CHAT_ID}\r\n".encode()
-        # Campo: voice (file OGG)
-        body += f"--{boundary}\r\n".encode()
-        body += b'Content-Disposition: form-data; name="voice"; filename="voice.ogg"\r\n'
-        body += b"Content-Type: audio/ogg\r\n\r\n"
-        body += ogg_bytes
-        body += b"\r\n"
-        # Campo: caption (opzionale)
-        if caption:
-            body += f"--{boundary}\r\n".encode()
-            body += b'Content-Disposition: form-data; name="caption"\r\n\r\n'
-            body += f"{caption[:1024]}\r\n".encode()
-        # Chiudi boundary
-        body += f"--{boundary}--\r\n".encode()
-
-        url = f"https://api.telegram.org/bot{TELEGRAM_TOKEN}/sendVoice"
-        req = urllib.request.Request(url, data=body, method="POST")
-        req.add_header("Content-Type", f"multipart/form-data; boundary={boundary}")
-        req.add_header("User-Agent", "Vessel-Dashboard/1.0")
-        with urllib.request.urlopen(req, timeout=30) as resp:
-            result = json.loads(resp.read().decode())
-        if result.get("ok"):
-            print("[TTS] Vocale inviato su Telegram")
-            return True
-        print(f"[TTS] sendVoice failed: {result}")
+        async for chunk in source:
+            proc.stdin.write(chunk)
+            await proc.stdin.drain()
+        proc.stdin.close()
+        ogg = await asyncio.wait_for(out, 30)
+        await asyncio.wait_for(proc.wait(), 5)
+    except BaseException as e:
+        if proc.returncode is None:
+            proc.kill()
+        out.cancel()
+        err.cancel()
+        if not isinstance(e, Exception):
+            raise
+        print(f"[TTS] Error: {e}")
+        return b""
+    stderr = await err
+    if proc.returncode != 0 or not ogg:
+        print(f"[TTS] ffmpeg error: {stderr.decode(errors='replace')[:200]}")
+        return b""
+    return ogg
+
+async def tts_ogg(text: str) -> bytes:
+    """Testo → OGG Opus pronto per sendVoice, tutto in memoria. bytes vuoti su errore.
+    Asincrona: si può attendere direttamente dall'event loop (solo I/O)."""
+    text = (text or "").strip()[:TTS_MAX_CHARS]
+    if not text:
+        return b""
+    key = _tts_key(text)
+    ogg = _tts_cache_get(key)
+    if ogg is not None:
+        TTS_STATS["hits"] += 1
+        return ogg
+    TTS_STATS["misses"] += 1
+    ogg = await _ffmpeg_opus(_edge_mp3_stream(text))
+    if not ogg:
+        TTS_STATS["errors"] += 1
+        return b""
+    _tts_cache_put(key, ogg)
+    print(f"[TTS] Generato vocale: {len(ogg)} bytes, {len(text)} chars")
+    return ogg
+
+
+def text_to_voice(text: str) -> bytes:
+    """Versione sincrona di tts_ogg() per codice nei thread dell'executor."""
+    try:
+        return asyncio.run(tts_ogg(text))
+    except Exception as e:
+        print(f"[TTS] Error: {e}")
+        return b""
+
+
+# ─── Vocale a frasi (pipeline durante la generazione) ────────────────────────
+_SENTENCE_END = re.compile(r"[.!?…]+[\"')\]»]*\s+|\n+")
+TTS_MIN_SEGMENT = 60  # frasi più corte si accorpano alla successiva
+_tts_slots = asyncio.Semaphore(TTS_WORKERS)
+
+class VoicePipeline:
+    """Sintesi vocale a frasi mentre la risposta è ancora in generazione.
+    on_chunk() riceve lo stream del modello; ogni frase completa (accorpata fino a
+    TTS_MIN_SEGMENT caratteri) parte subito nel pool di TTS_WORKERS sintesi.
+    - "segments": ogni segmento è inviato appena pronto, nell'ordine del testo
+    - "single": gli MP3 delle frasi confluiscono in un unico ffmpeg → un solo OGG
+    finish() chiude l'ultima frase e attende gli invii."""
+
+    def __init__(self, mode: str = "", chat_id: str = ""):
+        self.mode = mode or TTS_PIPELINE
+        self.chat_id = chat_id or TELEGRAM_CHAT_ID
+        self._buf = ""
+        self._chars = 0
+        self._jobs: list[asyncio.Task] = []
+        self._ready: asyncio.Queue = asyncio.Queue()
+        self._sender: asyncio.Task | None = None
+        self._t0 = time.monotonic()
+        self.first_audio_ms = None
+        self.sent = 0
+
+    async def on_chunk(self, chunk: str):
+        self._buf += chunk
+        for sentence in self._take_sentences():
+            self._schedule(sentence)
+
+    def _take_sentences(self, final: bool = False) -> list[str]:
+        out = []
+        while True:
+            m = _SENTENCE_END.search(self._buf, TTS_MIN_SEGMENT)
+            if not m:
+                break
+            out.append(self._buf[:m.end()].strip())
+            self._buf = self._buf[m.end():]
+        if final:
+            out.append(self._buf.strip())
+            self._buf = ""
+        return [s for s in out if s]
+
+    def _schedule(self, sentence: str):
+        if self._chars >= TTS_MAX_CHARS:
+            return
+        sentence = sentence[:TTS_MAX_CHARS - self._chars]
+        self._chars += len(sentence)
+        job = asyncio.create_task(self._synth(sentence))
+        self._jobs.append(job)
+        self._ready.put_nowait(job)
+        if self.mode == "segments" and self._sender is None:
+            self._sender = asyncio.create_task(self._send_in_order())
+
+    async def _synth(self, sentence: str) -> bytes:
+        async with _tts_slots:
+            if self.mode == "single":
+                return await _edge_mp3(sentence)
+            return await tts_ogg(sentence)
+
+    async def _send(self, ogg: bytes):
+        if not ogg:
+            return
+        if self.first_audio_ms is None:
+            self.first_audio_ms = int((time.monotonic() - self._t0) * 1000)
+        if await tg_client.send_voice(ogg, chat_id=self.chat_id) is not None:
+            self.sent += 1
+
+    async def _send_in_order(self):
+        while True:
+            job = await self._ready.get()
+            if job is None:
+                return
+            try:
+                await self._send(await job)
+            except Exception as e:
+                print(f"[TTS] Segmento fallito: {e}")
+
+    async def _mp3_in_order(self):
+        for job in self._jobs:
+            try:
+                yield await job
+            except Exception as e:
+                print(f"[TTS] Segmento fallito: {e}")
+
+    async def finish(self, final: str = ""):
+        """Ultima frase + attesa invii. Se non è arrivato alcun chunk usa `final`."""
+        if not self._jobs and not self._buf.strip():
+            self._buf = final or ""
+        for sentence in self._take_sentences(final=True):
+            self._schedule(sentence)
+        if self.mode == "single":
+            if self._jobs:
+                await self._send(await _ffmpeg_opus(self._mp3_in_order()))
+        elif self._sender is not None:
+            self._ready.put_nowait(None)
+            await self._sender
+        if not self.sent:
+            print("[TTS] Generazione vocale fallita, risposta solo testo")
+        db_log_event("telegram", "voice_pipeline", status="ok" if self.sent else "error",
+                     latency_ms=self.first_audio_ms or 0,
+                     payload={"mode": self.mode, "segments": len(self._jobs), "sent": self.sent})
+
+
+def telegram_send_voice(ogg_bytes: bytes, caption: str = "") -> bool:
+    """Versione sincrona (thread executor) di tg_send_voice."""
+    loop = tg_client.loop
+    if not ogg_bytes or loop is None or not loop.is_running():
         return False
+    fut = asyncio.run_coroutine_threadsafe(tg_send_voice(ogg_bytes, caption), loop)
+    try:
+        return fut.result(timeout=120)
     except Exception as e:
         print(f"[TTS] sendVoice error: {e}")
         return False
 
 
+# --- src/backend/services/conversations.py ---
+# ─── Conversation Store (stato chat condiviso tra connessioni) ───────────────
+class ConversationStore:
+    """Storia chat per processo, chiave (channel, provider_id).
+    Caricata da SQLite solo al primo uso del provider; tutte le connessioni
+    (tab dashboard, Telegram) condividono la stessa lista in memoria."""
+
+    def __init__(self):
+        self._histories: dict[tuple[str, str], list] = {}
+        self._locks: dict[tuple[str, str], asyncio.Lock] = {}
+
+    async def get(self, provider_id: str, channel: str = "dashboard") -> list:
+        """Ritorna la lista condivisa (mutabile). Lazy load al primo accesso."""
+        key = (channel, provider_id)
+        history = self._histories.get(key)
+        if history is not None:
+            return history
+        lock = self._locks.setdefault(key, asyncio.Lock())
+        async with lock:
+            if key not in self._histories:
+                self._histories[key] = await bg(db_load_chat_history, provider_id, channel)
+        return self._histories[key]
+
+    def clear(self, channel: str = "dashboard"):
+        """Svuota in-place le history del channel (le connessioni aperte vedono il reset)."""
+        for (ch, _), history in self._histories.items():
+            if ch == channel:
+                history.clear()
+
+    def stats(self) -> dict:
+        """Numero messaggi in memoria per channel:provider (diagnostica)."""
+        return {f"{ch}:{pid}": len(h) for (ch, pid), h in self._histories.items()}
+
+conversations = ConversationStore()
+
+
 # --- src/backend/services/chat.py ---
 # ─── Emotion Detection for Sigil (Fase 38) ──────────────────────────────────
 EMOTION_PATTERNS: dict[str, list[str]] = {
@@ -2519,6 +4238,7 @@ def _provider_worker(provider, queue):
     """Worker thread: HTTP request a un provider, streamma chunk via queue.
     Protocollo queue: ("chunk", text), ("meta", dict), ("error", str), ("end", None)."""
     input_tokens = output_tokens = 0
+    timing = {}  # Ollama: durate server-side di prompt eval e generazione (per il benchmark)
     try:
         conn_class = http.client.HTTPSConnection if provider.use_https else http.client.HTTPConnection
         conn = conn_class(provider.host, provider.port, timeout=provider.timeout)
@@ -2530,7 +4250,7 @@ def _provider_worker(provider, queue):
             return
         buf = ""
         while True:
-            raw = resp.read(512)
+            raw = resp.read1(512)  # read1: ritorna appena arriva qualcosa, non attende 512 byte (TTFT)
             if not raw:
                 break
             buf += raw.decode("utf-8", errors="replace")
@@ -2548,6 +4268,8 @@ def _provider_worker(provider, queue):
                         if data.get("done"):
                             input_tokens = data.get("prompt_eval_count", 0)
                             output_tokens = data.get("eval_count", 0)
+                            timing = {"prompt_eval_ms": data.get("prompt_eval_duration", 0) / 1e6,
+                                      "eval_ms": data.get("eval_duration", 0) / 1e6}
                             conn.close()
                             return
                     except Exception:
@@ -2609,7 +4331,7 @@ def _provider_worker(provider, queue):
     except Exception as e:
         queue.put_nowait(("error", str(e)))
     finally:
-        queue.put_nowait(("meta", {"input_tokens": input_tokens, "output_tokens": output_tokens}))
+        queue.put_nowait(("meta", {"input_tokens": input_tokens, "output_tokens": output_tokens, **timing}))
         queue.put_nowait(("end", None))
 
 
@@ -2674,13 +4396,14 @@ async def _execute_chat(message, chat_history, provider_id, system_prompt, model
     actual_model = model
     last_error = ""
     trimmed = []
-    loop = asyncio.get_running_loop()
+    first_token_at = 0.0
 
     for attempt, (try_pid, try_model) in enumerate(providers_chain):
         trimmed = build_context(chat_history, try_pid, system)
         provider = get_provider(try_pid, try_model, system, trimmed)
         if not provider.is_valid:
             last_error = provider.error_msg
+            PROVIDER_ERRORS.inc(try_pid)
             if attempt < len(providers_chain) - 1:
                 continue
             # Nessun provider disponibile
@@ -2693,12 +4416,14 @@ async def _execute_chat(message, chat_history, provider_id, system_prompt, model
             await on_chunk(f"\n⚡ Failover → {try_pid}\n")
 
         queue: asyncio.Queue = asyncio.Queue()
-        loop.run_in_executor(None, _provider_worker, provider, queue)
+        _bg_submit(_provider_worker, provider, queue)
 
         while True:
             kind, val = await queue.get()
             if kind == "chunk":
                 if val:
+                    if not first_token_at:
+                        first_token_at = time.time()
                     full_reply += val
                     if on_chunk:
                         await on_chunk(val)
@@ -2713,11 +4438,12 @@ async def _execute_chat(message, chat_history, provider_id, system_prompt, model
             actual_pid = try_pid
             actual_model = try_model
             if attempt > 0:
-                loop.run_in_executor(None, telegram_send,
-                    f"⚠️ Provider failover: {provider_id} → {try_pid}")
+                CHAT_FAILOVERS.inc(provider_id, try_pid)
+                asyncio.create_task(tg_send(f"⚠️ Provider failover: {provider_id} → {try_pid}", wait=False))
                 db_log_audit("failover", resource=f"{provider_id} → {try_pid}",
                              details=last_error[:200])
             break
+        PROVIDER_ERRORS.inc(try_pid)
 
         if attempt == len(providers_chain) - 1:
             err = f"(errore {try_pid}: {last_error})"
@@ -2736,6 +4462,12 @@ async def _execute_chat(message, chat_history, provider_id, system_prompt, model
                     provider=actual_pid, response_time_ms=elapsed)
     # Observability: log evento chat
     evt_status = "ok" if full_reply and not full_reply.startswith("(errore") else "error"
+    CHAT_REQUESTS.inc(actual_pid, channel, evt_status)
+    CHAT_LATENCY.observe(elapsed / 1000, actual_pid)
+    if first_token_at:
+        CHAT_TTFT.observe(first_token_at - start_time, actual_pid)
+    CHAT_TOKENS.inc(actual_pid, "in", n=in_tok)
+    CHAT_TOKENS.inc(actual_pid, "out", n=out_tok)
     db_log_event("chat", "response", provider=actual_pid, status=evt_status,
                  latency_ms=elapsed,
                  payload={"model": actual_model, "tokens_in": in_tok,
@@ -2749,7 +4481,7 @@ async def _execute_chat(message, chat_history, provider_id, system_prompt, model
     global _last_chat_ts
     _last_chat_ts = time.time()
     if full_reply:
-        loop.run_in_executor(None, _bg_extract_and_store, message, full_reply)
+        _bg_submit(_bg_extract_and_store, message, full_reply)
     return full_reply, actual_pid, elapsed
 
 
@@ -2777,11 +4509,13 @@ async def _chat_response(
     provider_id: str, system_prompt: str, model: str,
     channel: str = "telegram",
     memory_enabled: bool = True,
+    on_chunk=None,
 ) -> str:
-    """Chat non-streaming (wrapper sottile). Usata da Telegram."""
+    """Chat con risposta completa (wrapper sottile). Usata da Telegram;
+    con on_chunk riceve anche i chunk man mano (streaming via edit)."""
     full_reply, *_ = await _execute_chat(
         message, chat_history, provider_id, system_prompt, model,
-        memory_enabled=memory_enabled, channel=channel)
+        memory_enabled=memory_enabled, channel=channel, on_chunk=on_chunk)
     return full_reply
 
 
@@ -2799,26 +4533,253 @@ def chat_with_nanobot(message: str) -> str:
         return f"(errore CLI: {e})"
 
 
+# --- src/backend/services/bench.py ---
+# ─── Benchmark provider ─────────────────────────────────────────────────────
+# Misura i provider sullo stesso percorso della chat vera: _enrich_system_prompt
+# (memoria, weekly, topic recall) → build_context → get_provider → _provider_worker.
+# Per ogni livello di concorrenza (1..N richieste in parallelo): TTFT, latenza
+# end-to-end, token/s di prompt eval e di generazione, throughput aggregato.
+# Ogni run finisce in SQLite (bench_runs) e viene confrontato col precedente
+# dello stesso provider/modello/endpoint: oltre BENCH_REGRESSION è regressione.
+BENCH_REGRESSION = 0.15   # peggioramento relativo che conta come regressione
+BENCH_PROVIDERS = ("ollama", "ollama_pc", "anthropic", "openrouter", "brain")
+BENCH_PROMPTS = [
+    {"id": "chat", "message": "Ciao! Come va oggi? Rispondi in due frasi."},
+    {"id": "code", "message": "Questo codice Python ha un errore, correggilo e rispondi solo con il codice:\n"
+                              "def total(xs):\n    s = 0\n    for x on xs:\n        s += x\n    return s"},
+    {"id": "long", "message": "Spiegami cos'è un buco nero in tre paragrafi dettagliati."},
+]
+_bench_running = False
+
+
+class _BenchSink:
+    """Prende il posto della queue di _provider_worker e annota i tempi dei chunk."""
+    def __init__(self):
+        self.t0 = time.perf_counter()
+        self.first = self.end = None
+        self.text = ""
+        self.meta: dict = {}
+        self.error = ""
+
+    def put_nowait(self, item):
+        kind, val = item
+        if kind == "chunk" and val:
+            if self.first is None:
+                self.first = time.perf_counter()
+            self.text += val
+        elif kind == "meta":
+            self.meta = val
+        elif kind == "error":
+            self.error = val
+        elif kind == "end":
+            self.end = time.perf_counter()
+
+
+def _bench_provider(provider_id: str, model: str, message: str, memory: bool, endpoint: str):
+    """Provider pronto come lo costruirebbe _execute_chat; endpoint = host/porta di un mock."""
+    default_model, system_prompt = _provider_defaults(provider_id)
+    system = _enrich_system_prompt(system_prompt, memory, message, provider_id)
+    trimmed = build_context([{"role": "user", "content": message}], provider_id, system)
+    return get_provider(provider_id, model or default_model, system, trimmed, endpoint)
+
+def _bench_once(provider_id: str, model: str, prompt: dict, memory: bool, endpoint: str) -> dict:
+    """Una richiesta completa (sincrona, nel thread pool)."""
+    provider = _bench_provider(provider_id, model, prompt["message"], memory, endpoint)
+    if not provider.is_valid:
+        return {"prompt": prompt["id"], "error": provider.error_msg}
+    sink = _BenchSink()
+    _provider_worker(provider, sink)
+    end = sink.end or time.perf_counter()
+    m = sink.meta
+    out_tok = m.get("output_tokens") or (estimate_tokens(sink.text) if sink.text else 0)
+    in_tok = m.get("input_tokens") or estimate_tokens(provider.payload)
+    ttft = (sink.first - sink.t0) * 1000 if sink.first else None
+    # Ollama riporta le durate server-side; per gli altri si usa il tempo dal primo token
+    gen_ms = m.get("eval_ms") or ((end - sink.first) * 1000 if sink.first else 0)
+    return {"prompt": prompt["id"], "ttft_ms": round(ttft, 1) if ttft is not None else None,
+            "total_ms": round((end - sink.t0) * 1000, 1), "in_tokens": in_tok, "out_tokens": out_tok,
+            "prompt_tps": round(in_tok / (m["prompt_eval_ms"] / 1000), 1) if m.get("prompt_eval_ms") else None,
+            "gen_tps": round(out_tok / (gen_ms / 1000), 1) if gen_ms > 0 and out_tok else None,
+            "error": sink.error if not sink.text else ""}
+
+def _pct(values: list, q: float):
+    values = sorted(v for v in values if v is not None)
+    if not values:
+        return None
+    return round(values[min(len(values) - 1, int(q * len(values)))], 1)
+
+def _bench_level(samples: list, wall_ms: float) -> dict:
+    ok = [s for s in samples if not s["error"]]
+    gen = [s["gen_tps"] for s in ok if s.get("gen_tps")]
+    pe = [s["prompt_tps"] for s in ok if s.get("prompt_tps")]
+    return {"requests": len(samples), "errors": len(samples) - len(ok),
+            "ttft_p50": _pct([s["ttft_ms"] for s in ok], 0.5), "ttft_p95": _pct([s["ttft_ms"] for s in ok], 0.95),
+            "total_p50": _pct([s["total_ms"] for s in ok], 0.5), "total_p95": _pct([s["total_ms"] for s in ok], 0.95),
+            "gen_tps": round(statistics.mean(gen), 1) if gen else None,
+            "prompt_tps": round(statistics.mean(pe), 1) if pe else None,
+            "throughput_tps": round(sum(s["out_tokens"] for s in ok) / (wall_ms / 1000), 1) if wall_ms else None}
+
+def bench_regressions(levels: dict, previous: dict | None) -> list[str]:
+    """Confronta per livello di concorrenza: latenze su = peggio, token/s giù = peggio."""
+    if not previous:
+        return []
+    out = []
+    for c, cur in levels.items():
+        old = previous.get(c) or previous.get(str(c))
+        if not old:
+            continue
+        for key, higher_is_worse in (("ttft_p50", True), ("total_p50", True), ("gen_tps", False),
+                                     ("throughput_tps", False)):
+            a, b = old.get(key), cur.get(key)
+            if not a or b is None:
+                continue
+            delta = (b - a) / a
+            if (delta > BENCH_REGRESSION) if higher_is_worse else (delta < -BENCH_REGRESSION):
+                out.append(f"c={c} {key}: {a} → {b} ({delta:+.0%})")
+    return out
+
+async def bench_run(provider_id: str, model: str = "", concurrency=(1, 2, 4), rounds: int = 1,
+                    prompts: list | None = None, endpoint: str = "", memory: bool = True,
+                    label: str = "", on_progress=None) -> dict:
+    """Sweep di concorrenza: per ogni livello c, `rounds` ondate di c richieste insieme
+    (prompt a rotazione). Salva il run e ritorna riepilogo + regressioni."""
+    global _bench_running
+    if _bench_running:
+        raise RuntimeError("benchmark già in corso")
+    _bench_running = True
+    try:
+        prompts = prompts or BENCH_PROMPTS
+        model = model or _provider_defaults(provider_id)[0]
+        levels, samples = {}, []
+        for c in concurrency:
+            level_samples, wall = [], 0.0
+            for r in range(rounds):
+                batch = [prompts[(r * c + i) % len(prompts)] for i in range(c)]
+                t0 = time.perf_counter()
+                level_samples += await asyncio.gather(
+                    *(bg(_bench_once, provider_id, model, p, memory, endpoint) for p in batch))
+                wall += (time.perf_counter() - t0) * 1000
+            levels[c] = _bench_level(level_samples, wall)
+            samples += [{**s, "concurrency": c} for s in level_samples]
+            if on_progress:
+                await on_progress(c, levels[c])
+        previous = await bg(db_get_last_bench_run, provider_id, model, endpoint, label)
+        regressions = bench_regressions(levels, previous["levels"] if previous else None)
+        config = {"concurrency": list(concurrency), "rounds": rounds, "memory": memory,
+                  "prompts": [p["id"] for p in prompts]}
+        run_id = await bg(db_save_bench_run, provider_id, model, endpoint, label, config, levels,
+                          regressions, samples)
+        db_log_event("bench", "run", provider=provider_id,
+                     status="error" if regressions or bench_all_failed(levels) else "ok",
+                     payload={"run_id": run_id, "model": model, "regressions": len(regressions)})
+        return {"id": run_id, "provider": provider_id, "model": model, "endpoint": endpoint,
+                "label": label, "config": config, "levels": levels, "regressions": regressions,
+                "failed": bench_all_failed(levels), "previous_id": previous["id"] if previous else None}
+    finally:
+        _bench_running = False
+
+
 # --- src/backend/services/bridge.py ---
 # ─── Claude Bridge (PC Monitoring) ────────────────────────────────────────────
 def check_bridge_health() -> dict:
-    """Verifica se il Claude Bridge su Windows è raggiungibile."""
-    t0 = time.time()
+    """Verifica se il Claude Bridge su Windows è raggiungibile. Probe grezzo:
+    va letto dal health registry (health_get/health_state), che logga solo i cambi di stato."""
     try:
         req = urllib.request.Request(f"{CLAUDE_BRIDGE_URL}/health")
         with urllib.request.urlopen(req, timeout=3) as resp:
-            data = json.loads(resp.read())
-            db_log_event("bridge", "ping", status="ok",
-                         latency_ms=int((time.time() - t0) * 1000))
-            return data
+            return json.loads(resp.read())
     except Exception:
-        db_log_event("bridge", "ping", status="error",
-                     latency_ms=int((time.time() - t0) * 1000),
-                     error="unreachable")
         return {"status": "offline"}
 
 
 # --- src/backend/services/monitor.py ---
+# ─── Health registry ──────────────────────────────────────────────────────────
+# Un solo posto che sonda i servizi: heartbeat, broadcaster, handler WS, ESP32 e
+# /api/health leggono l'ultimo risultato (con età) invece di rifare la richiesta.
+# Ogni check ha intervallo con jitter e timeout; negli eventi finisce solo il
+# cambio di stato (online ↔ offline), non ogni ping.
+HEALTH_JITTER = 0.1          # ±10% sull'intervallo, evita che i check si allineino
+HEALTH_ON_DEMAND_AGE = 10    # s: un check esplicito dell'utente riusa risultati più freschi di così
+_health: dict[str, dict] = {}
+
+def register_health_check(name: str, probe, interval: float, timeout: float = 5.0):
+    """Registra un probe sincrono (gira via bg). Il risultato è ok se truthy;
+    per i dict, se status non è "offline"."""
+    _health[name] = {"probe": probe, "interval": interval, "timeout": timeout,
+                     "ok": None, "value": None, "error": "", "checked_at": 0.0, "changed_at": 0.0,
+                     "latency_ms": 0, "runs": 0, "next_at": 0.0, "lock": asyncio.Lock()}
+
+def _health_ok(value) -> bool:
+    if isinstance(value, dict):
+        return value.get("status") != "offline"
+    return bool(value)
+
+async def _health_run(name: str) -> dict:
+    c = _health[name]
+    if c["lock"].locked():
+        # Probe già in corso: si aspetta quello (single-flight)
+        async with c["lock"]:
+            return c
+    async with c["lock"]:
+        t0 = time.time()
+        try:
+            value = await asyncio.wait_for(bg(c["probe"]), timeout=c["timeout"])
+            error = ""
+        except asyncio.TimeoutError:
+            value, error = None, "timeout"
+        except Exception as e:
+            value, error = None, str(e)[:120]
+        ok = _health_ok(value) and not error
+        latency = int((time.time() - t0) * 1000)
+        prev = c["ok"]
+        c.update(ok=ok, value=value, error=error, checked_at=time.time(), latency_ms=latency, runs=c["runs"] + 1,
+                 next_at=time.time() + c["interval"] * random.uniform(1 - HEALTH_JITTER, 1 + HEALTH_JITTER))
+        if ok != prev:
+            c["changed_at"] = c["checked_at"]
+            db_log_event("health", name, status="ok" if ok else "error", latency_ms=latency,
+                         payload={"from": prev, "to": ok}, error=error or None)
+    return c
+
+def health_state(name: str) -> dict:
+    """Ultimo risultato noto, senza sondare. ok=None se il check non ha ancora girato."""
+    c = _health.get(name)
+    if c is None:
+        return {"ok": None, "value": None, "age": None, "error": "check non registrato"}
+    return {"ok": c["ok"], "value": c["value"], "error": c["error"], "latency_ms": c["latency_ms"],
+            "age": round(time.time() - c["checked_at"], 1) if c["checked_at"] else None,
+            "since": c["changed_at"], "interval": c["interval"], "runs": c["runs"]}
+
+async def health_get(name: str, max_age: float | None = None) -> dict:
+    """Come health_state, ma sonda se il check non ha mai girato o è più vecchio di max_age
+    (per le richieste esplicite dell'utente: "Check Ollama" dal menu ESP32, dashboard)."""
+    c = _health.get(name)
+    if c is not None and (not c["checked_at"] or (max_age is not None and time.time() - c["checked_at"] > max_age)):
+        await _health_run(name)
+    return health_state(name)
+
+def health_report() -> dict:
+    return {name: health_state(name) for name in _health}
+
+def bridge_status() -> str:
+    """Stato bridge per stats/dashboard ("offline" finché il primo check non gira)."""
+    st = health_state("bridge")
+    return st["value"].get("status", "online") if st["ok"] else "offline"
+
+async def health_scheduler():
+    """Loop background: lancia i check scaduti, poi dorme fino al prossimo."""
+    print(f"[Health] Scheduler avviato ({', '.join(_health)})")
+    while True:
+        now = time.time()
+        for name, c in _health.items():
+            if c["next_at"] <= now and not c["lock"].locked():
+                asyncio.create_task(_health_run(name))
+        next_at = min((c["next_at"] for c in _health.values()), default=now + 60)
+        await asyncio.sleep(max(1.0, next_at - time.time()))
+
+register_health_check("ollama", check_ollama_health, interval=60, timeout=5)
+register_health_check("bridge", check_bridge_health, interval=60, timeout=5)
+
+
 # ─── Heartbeat Monitor (Fase 17B) ────────────────────────────────────────────
 _heartbeat_last_alert: dict[str, float] = {}
 _heartbeat_known_down: set[str] = set()  # servizi noti come down (no re-alert)
@@ -2846,20 +4807,13 @@ async def heartbeat_task():
             if mem_pct > 90:
                 alerts.append(("mem_high", f"💾 RAM Pi: {mem_pct}% (critica)"))
 
-            # 3) Ollama + Bridge — check paralleli
-            checks = [bg(check_ollama_health)]
-            if CLAUDE_BRIDGE_TOKEN:
-                checks.append(bg(check_bridge_health))
-            results = await asyncio.gather(*checks, return_exceptions=True)
-
-            ollama_ok = results[0] if not isinstance(results[0], Exception) else False
-            if not ollama_ok:
+            # 3) Ollama + Bridge — dal registry (sondati da health_scheduler)
+            ollama, bridge = await asyncio.gather(health_get("ollama"), health_get("bridge"))
+            if not ollama["ok"]:
                 alerts.append(("ollama_down", "🔴 Ollama locale non raggiungibile"))
 
-            if CLAUDE_BRIDGE_TOKEN and len(results) > 1:
-                bridge = results[1] if not isinstance(results[1], Exception) else {"status": "offline"}
-                if bridge.get("status") == "offline":
-                    alerts.append(("bridge_down", "🔴 Claude Bridge offline"))
+            if CLAUDE_BRIDGE_TOKEN and not bridge["ok"]:
+                alerts.append(("bridge_down", "🔴 Claude Bridge offline"))
 
             # Invia alert con logica differenziata
             active_keys = {k for k, _ in alerts}
@@ -2868,7 +4822,7 @@ async def heartbeat_task():
                     # Servizi: notifica solo al cambio stato (up → down)
                     if alert_key not in _heartbeat_known_down:
                         _heartbeat_known_down.add(alert_key)
-                        telegram_send(f"[Heartbeat] {alert_msg}")
+                        await tg_send(f"[Heartbeat] {alert_msg}")
                         db_log_audit("heartbeat_alert", resource=alert_key, details=alert_msg)
                         db_log_event("system", "alert", status="error",
                                      payload={"key": alert_key, "msg": alert_msg})
@@ -2878,7 +4832,7 @@ async def heartbeat_task():
                     last = _heartbeat_last_alert.get(alert_key, 0)
                     if now - last >= HEARTBEAT_ALERT_COOLDOWN:
                         _heartbeat_last_alert[alert_key] = now
-                        telegram_send(f"[Heartbeat] {alert_msg}")
+                        await tg_send(f"[Heartbeat] {alert_msg}")
                         db_log_audit("heartbeat_alert", resource=alert_key, details=alert_msg)
                         db_log_event("system", "alert", status="error",
                                      payload={"key": alert_key, "msg": alert_msg})
@@ -2889,18 +4843,18 @@ async def heartbeat_task():
                 if key not in active_keys:
                     _heartbeat_known_down.discard(key)
                     label = key.replace("_down", "").replace("_", " ").title()
-                    telegram_send(f"[Heartbeat] ✅ {label} tornato online")
+                    await tg_send(f"[Heartbeat] ✅ {label} tornato online")
                     db_log_audit("heartbeat_recovery", resource=key)
                     db_log_event("system", "recovery", payload={"key": key, "service": label})
                     print(f"[Heartbeat] RECOVERY: {label} online")
 
             # Tamagotchi: ALERT se ci sono problemi, IDLE se risolti
             if alerts:
-                _set_tamagotchi_local("ALERT")
+                await bus.publish(Alert("heartbeat", alerts[0][1], key=alerts[0][0]))
             elif _heartbeat_last_alert or _heartbeat_known_down:
                 pass  # ancora problemi noti, mantieni stato corrente
             else:
-                _set_tamagotchi_local("IDLE")
+                await bus.publish(SigilState("IDLE"))
 
             # Pulisci cooldown soglie risolte
             for key in list(_heartbeat_last_alert.keys()):
@@ -2913,46 +4867,664 @@ async def heartbeat_task():
 
 
 async def crypto_push_task():
-    """Loop background: push prezzi BTC/ETH all'ESP32 ogni 15 minuti via broadcast_raw.
-    Usa globals() per accedere a broadcast_tamagotchi_raw definita in routes.py
-    (nel file compilato unico tutto è nello stesso namespace globale).
-    """
+    """Loop background: pubblica prezzi BTC/ETH sul bus ogni 15 minuti
+    (il Sigil li riceve via subscriber). Niente fetch se nessun ESP32 è connesso."""
     print("[Crypto] Push task avviato")
     await asyncio.sleep(60)  # attendi boot completo
     while True:
         try:
-            _conns    = globals().get("_tamagotchi_connections", set())
-            _bcast    = globals().get("broadcast_tamagotchi_raw")
-            if _conns and _bcast:
+            if bus.query("sigil.clients"):
                 data = await bg(get_crypto_prices)
                 btc  = data.get("btc")
                 eth  = data.get("eth")
                 if not data.get("error") and btc and btc.get("usd", 0) > 0:
-                    payload = {
-                        "action":     "crypto_update",
-                        "btc":        btc["usd"],
-                        "eth":        eth["usd"]        if eth else 0,
-                        "btc_change": btc["change_24h"] if btc else 0,
-                        "eth_change": eth["change_24h"] if eth else 0,
-                    }
-                    await _bcast(payload)
+                    await bus.publish(CryptoUpdate(
+                        btc=btc["usd"],
+                        eth=eth["usd"]        if eth else 0,
+                        btc_change=btc["change_24h"],
+                        eth_change=eth["change_24h"] if eth else 0,
+                    ))
                     print(f"[Crypto] Push → BTC ${btc['usd']:.0f} ({btc['change_24h']:+.1f}%)")
         except Exception as e:
             print(f"[Crypto] Push error: {e}")
         await asyncio.sleep(900)  # 15 minuti
 
 
+# --- src/backend/services/debug.py ---
+# ─── Event loop: lag e chiamate bloccanti ───────────────────────────────────
+# loop_monitor() si sveglia ogni LOOP_TICK e misura di quanto arriva in ritardo
+# (lag). Un thread watchdog guarda il battito: se il loop è fermo oltre
+# LOOP_BLOCK_MS campiona lo stack del thread del loop, cioè la chiamata che sta
+# bloccando in quel momento, e a fine stallo lo somma ai "peggiori" per punto
+# del codice. Costo a regime: un timer ogni 250ms e un thread che dorme 50ms.
+# VESSEL_LOOP_DEBUG=1 accende anche il debug mode di asyncio: ogni callback oltre
+# soglia (slow_callback_duration) viene registrato con l'ultimo stack campionato.
+LOOP_TICK = 0.25
+LOOP_BLOCK_MS = 100
+LOOP_WATCHDOG_POLL = 0.05
+LOOP_STALL_LOG_MS = 1000        # stalli così lunghi finiscono anche negli eventi
+LOOP_DEBUG = os.environ.get("VESSEL_LOOP_DEBUG", "").lower() in ("1", "true", "yes")
+
+_loop_lags: deque = deque(maxlen=240)          # ultimo minuto di campioni (ms)
+_loop_offenders: dict[str, dict] = {}
+_loop_slow_callbacks: deque = deque(maxlen=30)
+_loop_state = {"beat": 0.0, "thread": 0, "stall": None, "stalls": 0, "max_ms": 0.0, "since": 0.0}
+
+
+def _loop_stack(thread_id: int) -> list[str]:
+    """Stack del thread del loop, dal frame più esterno; solo le ultime righe utili."""
+    frame = sys._current_frames().get(thread_id)
+    if frame is None:
+        return []
+    return [f"{f.name} ({Path(f.filename).name}:{f.lineno})" for f in traceback.extract_stack(frame)][-12:]
+
+def _loop_culprit(stack: list[str]) -> str:
+    """Il punto più interno del nostro codice (non stdlib) nello stack campionato."""
+    here = Path(__file__).name
+    for line in reversed(stack):
+        if f"({here}:" in line:
+            return line
+    return stack[-1] if stack else "?"
+
+def _loop_watchdog():
+    while True:
+        time.sleep(LOOP_WATCHDOG_POLL)
+        late = (time.monotonic() - _loop_state["beat"] - LOOP_TICK) * 1000
+        if late > LOOP_BLOCK_MS and _loop_state["stall"] is None:
+            stack = _loop_stack(_loop_state["thread"])
+            _loop_state["stall"] = {"stack": stack, "where": _loop_culprit(stack)}
+
+def _loop_stall_end(stall: dict, lag_ms: float):
+    _loop_state["stalls"] += 1
+    o = _loop_offenders.setdefault(stall["where"], {"where": stall["where"], "count": 0,
+                                                     "total_ms": 0.0, "max_ms": 0.0})
+    o["count"] += 1
+    o["total_ms"] += lag_ms
+    o["max_ms"] = max(o["max_ms"], lag_ms)
+    o["stack"], o["last"] = stall["stack"], time.strftime("%Y-%m-%dT%H:%M:%S")
+    if lag_ms >= LOOP_STALL_LOG_MS:
+        # nel thread pool: una scrittura SQLite qui sarebbe a sua volta uno stallo
+        asyncio.get_running_loop().run_in_executor(None, functools.partial(
+            db_log_event, "loop", "stall", status="error", latency_ms=int(lag_ms),
+            payload={"where": stall["where"]}))
+
+
+class _SlowCallbackHandler(logging.Handler):
+    """Intercetta "Executing <Handle ...> took 0.3 seconds" del debug mode di asyncio."""
+    def emit(self, record):
+        msg = record.getMessage()
+        if msg.startswith("Executing"):
+            stall = _loop_state["stall"]
+            took = re.search(r" took ([\d.]+) seconds$", msg)
+            _loop_slow_callbacks.append({"ts": time.strftime("%H:%M:%S"), "callback": msg[10:170],
+                                         "ms": round(float(took.group(1)) * 1000) if took else 0,
+                                         "where": stall["where"] if stall else ""})
+
+
+async def loop_monitor():
+    """Task del lifespan: battito + misura del lag, avvia il watchdog."""
+    loop = asyncio.get_running_loop()
+    _loop_state.update(beat=time.monotonic(), thread=threading.get_ident(), since=time.time())
+    threading.Thread(target=_loop_watchdog, name="loop-watchdog", daemon=True).start()
+    if LOOP_DEBUG:
+        loop.set_debug(True)
+        loop.slow_callback_duration = LOOP_BLOCK_MS / 1000
+        logging.getLogger("asyncio").addHandler(_SlowCallbackHandler())
+        print(f"[Loop] debug asyncio attivo, soglia {LOOP_BLOCK_MS}ms")
+    while True:
+        t0 = time.monotonic()
+        await asyncio.sleep(LOOP_TICK)
+        now = time.monotonic()
+        lag = max(0.0, (now - t0 - LOOP_TICK) * 1000)
+        _loop_state["beat"] = now
+        _loop_lags.append(lag)
+        _loop_state["max_ms"] = max(_loop_state["max_ms"], lag)
+        stall, _loop_state["stall"] = _loop_state["stall"], None
+        if stall:
+            _loop_stall_end(stall, lag)
+
+def loop_stats(top: int = 10) -> dict:
+    """Lag dell'ultimo minuto, stalli dall'avvio, i punti che hanno bloccato di più."""
+    lags = sorted(_loop_lags)
+    pick = lambda q: round(lags[min(len(lags) - 1, int(q * len(lags)))], 1) if lags else 0.0
+    worst = sorted(_loop_offenders.values(), key=lambda o: o["total_ms"], reverse=True)[:top]
+    return {"tick_ms": LOOP_TICK * 1000, "threshold_ms": LOOP_BLOCK_MS, "debug": LOOP_DEBUG,
+            "lag": {"current": round(_loop_lags[-1], 1) if _loop_lags else 0.0,
+                    "p50": pick(0.5), "p99": pick(0.99), "max_1m": round(lags[-1], 1) if lags else 0.0,
+                    "max": round(_loop_state["max_ms"], 1)},
+            "stalls": _loop_state["stalls"], "since": _loop_state["since"],
+            "offenders": [{**o, "total_ms": round(o["total_ms"]), "max_ms": round(o["max_ms"])} for o in worst],
+            "slow_callbacks": list(_loop_slow_callbacks)[-10:]}
+
+
+# ─── Profilo CPU on-demand (campionamento) ──────────────────────────────────
+# Per N secondi un thread dedicato legge gli stack di tutti i thread
+# (sys._current_frames) ogni PROFILE_INTERVAL e conta gli stack uguali: ne esce
+# un profilo "collapsed" (frame;frame;frame conteggio) che flamegraph.pl o
+# speedscope trasformano in flamegraph. Costo limitato: se un campione costa
+# più di un decimo dell'intervallo il thread dorme di più (≤ ~10% di un core).
+# Il tempo CPU reale per thread viene da /proc (Linux), per distinguere chi
+# lavora da chi aspetta su select/queue/socket.
+PROFILE_MAX_S = 60
+PROFILE_INTERVAL = 0.01          # 100 Hz
+PROFILE_MAX_DEPTH = 64
+PROFILE_IDLE = {("selectors.py", "select"), ("threading.py", "wait"), ("thread.py", "_worker"),
+                ("queue.py", "get"), ("socket.py", "readinto"), ("socket.py", "accept"),
+                ("ssl.py", "read"), ("ssl.py", "recv_into")}
+_profile_state: dict = {"running": False, "last": None}
+
+
+def _profile_frame(code) -> str:
+    return f"{code.co_name} ({Path(code.co_filename).name}:{code.co_firstlineno})"
+
+def _profile_idle(code) -> bool:
+    """Foglia dello stack in attesa (select, lock, socket, il nostro watchdog): non è CPU."""
+    return code.co_name == "_loop_watchdog" or (Path(code.co_filename).name, code.co_name) in PROFILE_IDLE
+
+def _thread_cpu_ticks() -> dict[int, int]:
+    """utime+stime per thread nativo da /proc/self/task; vuoto fuori da Linux."""
+    ticks = {}
+    try:
+        for task in os.scandir("/proc/self/task"):
+            stat = Path(task.path, "stat").read_text()
+            fields = stat[stat.rindex(")") + 2:].split()
+            ticks[int(task.name)] = int(fields[11]) + int(fields[12])
+    except (OSError, ValueError, IndexError):
+        pass
+    return ticks
+
+def _profile_sample(seconds: float, interval: float) -> dict:
+    """Gira nel suo thread: campiona, poi aggrega. Gli stack sono tuple di code object
+    (economiche da confrontare); i nomi si formattano una volta sola alla fine."""
+    me = threading.get_ident()
+    stacks: Counter = Counter()
+    samples, cost = 0, 0.0
+    cpu0, proc0, t0 = _thread_cpu_ticks(), os.times(), time.monotonic()
+    deadline = t0 + seconds
+    while time.monotonic() < deadline:
+        s = time.perf_counter()
+        for tid, frame in sys._current_frames().items():
+            if tid == me:
+                continue
+            codes = []
+            while frame is not None and len(codes) < PROFILE_MAX_DEPTH:
+                codes.append(frame.f_code)
+                frame = frame.f_back
+            stacks[(tid, tuple(reversed(codes)))] += 1
+        samples += 1
+        spent = time.perf_counter() - s
+        cost += spent
+        time.sleep(max(interval - spent, spent * 9))
+    wall = time.monotonic() - t0
+    cpu1, proc1 = _thread_cpu_ticks(), os.times()
+
+    threads = {t.ident: t for t in threading.enumerate()}
+    tick = os.sysconf("SC_CLK_TCK") if hasattr(os, "sysconf") else 100
+    cpu = sorted(({"thread": threads[i].name if i in threads else f"tid-{i}",
+                   "cpu_pct": round((cpu1[n] - cpu0.get(n, 0)) / tick / wall * 100, 1)}
+                  for i, n in ((t.ident, t.native_id) for t in threads.values()) if n in cpu1),
+                 key=lambda x: x["cpu_pct"], reverse=True)
+
+    lines, self_c, total_c = [], Counter(), Counter()
+    busy = 0
+    for (tid, codes), n in stacks.most_common():
+        name = threads[tid].name if tid in threads else f"tid-{tid}"
+        frames = [_profile_frame(c) for c in codes]
+        lines.append(f"{name};{';'.join(frames)} {n}" if frames else f"{name} {n}")
+        if not codes or _profile_idle(codes[-1]):
+            continue
+        busy += n
+        self_c[frames[-1]] += n
+        for f in set(frames):
+            total_c[f] += n
+    pct = lambda n: round(n / busy * 100, 1) if busy else 0.0
+    proc_cpu = (proc1.user + proc1.system) - (proc0.user + proc0.system)
+    return {"ts": time.strftime("%Y-%m-%dT%H:%M:%S"), "seconds": round(wall, 1),
+            "interval_ms": interval * 1000, "samples": samples, "stacks": len(stacks),
+            "busy_samples": busy, "overhead_pct": round(cost / wall * 100, 2),
+            "process_cpu_pct": round(proc_cpu / wall * 100, 1), "threads": cpu,
+            "top_self": [{"where": f, "pct": pct(n)} for f, n in self_c.most_common(15)],
+            "top_total": [{"where": f, "pct": pct(n)} for f, n in total_c.most_common(15)],
+            "collapsed": "\n".join(lines) + "\n"}
+
+async def cpu_profile(seconds: float, interval: float = PROFILE_INTERVAL) -> dict:
+    """Cattura un profilo di `seconds` (max PROFILE_MAX_S) in un thread dedicato, non nel
+    pool: un worker occupato per un minuto toglierebbe posto alle chiamate bg()."""
+    if _profile_state["running"]:
+        raise RuntimeError("profilo già in corso")
+    _profile_state["running"] = True
+    loop = asyncio.get_running_loop()
+    done = loop.create_future()
+
+    def run():
+        try:
+            result = _profile_sample(min(max(seconds, 1.0), PROFILE_MAX_S), max(interval, 0.002))
+            loop.call_soon_threadsafe(done.set_result, result)
+        except Exception as e:
+            loop.call_soon_threadsafe(done.set_exception, e)
+
+    try:
+        threading.Thread(target=run, name="cpu-profiler", daemon=True).start()
+        result = await done
+    finally:
+        _profile_state["running"] = False
+    _profile_state["last"] = result
+    db_log_event("debug", "cpu_profile", latency_ms=int(result["seconds"] * 1000),
+                 payload={"samples": result["samples"], "process_cpu_pct": result["process_cpu_pct"],
+                          "top": result["top_self"][:3]})
+    return result
+
+
+# ─── Memoria: tracemalloc + strutture longeve ───────────────────────────────
+# tracemalloc costa (RAM per ogni blocco tracciato, allocazioni più lente):
+# si accende solo su richiesta, con una baseline, e si spegne da solo dopo
+# MEM_TRACE_MAX_S. Ogni diff confronta lo stato attuale con la baseline (o con
+# il diff precedente se rebase) → i punti del codice che continuano ad allocare.
+MEM_TRACE_FRAMES = 8
+MEM_TRACE_MAX_S = 1800
+MEM_SIZE_MAX_OBJS = 50_000       # tetto alla visita di _deep_size
+_mem_state: dict = {"baseline": None, "started": 0.0, "stop_handle": None, "diffs": 0}
+_MEM_FILTERS = [tracemalloc.Filter(False, tracemalloc.__file__),
+                tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+                tracemalloc.Filter(False, "<frozen importlib._bootstrap_external>"),
+                tracemalloc.Filter(False, "<unknown>")]
+
+
+def _mem_snapshot():
+    return tracemalloc.take_snapshot().filter_traces(_MEM_FILTERS)
+
+def _mem_rss_kb() -> int:
+    try:
+        for line in Path("/proc/self/status").read_text().splitlines():
+            if line.startswith("VmRSS:"):
+                return int(line.split()[1])
+    except (OSError, ValueError):
+        pass
+    return 0
+
+def _deep_size(obj) -> int:
+    """Byte approssimati di un oggetto e di ciò che contiene (dict/list/tuple/set), visita limitata."""
+    seen, stack, total = set(), [obj], 0
+    while stack and len(seen) < MEM_SIZE_MAX_OBJS:
+        o = stack.pop()
+        if id(o) in seen:
+            continue
+        seen.add(id(o))
+        total += sys.getsizeof(o)
+        # list(...) copia in un colpo solo: il loop può modificarle mentre si visita
+        if isinstance(o, dict):
+            for k, v in list(o.items()):
+                stack += (k, v)
+        elif isinstance(o, (list, tuple, set, frozenset, deque)):
+            stack.extend(list(o))
+    return total
+
+def mem_suspects() -> dict:
+    """Dimensione delle strutture che vivono quanto il processo (sospette di crescita lenta)."""
+    items = {"SESSIONS": SESSIONS, "RATE_LIMITS": RATE_LIMITS._entries,
+             "manager.connections": manager.connections, "_sigil_peers": _sigil_peers,
+             "_ota_progress": _ota_progress, "_http_stats": _http_stats,
+             "_loop_offenders": _loop_offenders}
+    out = [{"name": k, "len": len(v), "kb": round(_deep_size(v) / 1024, 1)} for k, v in items.items()]
+    # history chat (dashboard e Telegram): una lista per channel:provider
+    for (ch, pid), h in list(conversations._histories.items()):
+        out.append({"name": f"conversations[{ch}:{pid}]", "len": len(h), "kb": round(_deep_size(h) / 1024, 1)})
+    return {"rss_kb": _mem_rss_kb(), "structures": sorted(out, key=lambda x: x["kb"], reverse=True)}
+
+def mem_trace_start(frames: int = MEM_TRACE_FRAMES) -> dict:
+    """Accende tracemalloc e prende la baseline (nel thread pool: lo snapshot costa)."""
+    if not tracemalloc.is_tracing():
+        tracemalloc.start(min(max(frames, 1), 25))
+    _mem_state.update(baseline=_mem_snapshot(), started=time.time(), diffs=0)
+    return mem_trace_status()
+
+async def mem_trace_begin(frames: int = MEM_TRACE_FRAMES) -> dict:
+    status = await bg(mem_trace_start, frames)
+    if _mem_state["stop_handle"]:
+        _mem_state["stop_handle"].cancel()
+    _mem_state["stop_handle"] = asyncio.get_running_loop().call_later(MEM_TRACE_MAX_S, mem_trace_stop)
+    return status
+
+def mem_trace_stop() -> dict:
+    if tracemalloc.is_tracing():
+        tracemalloc.stop()
+    _mem_state.update(baseline=None, started=0.0)
+    handle, _mem_state["stop_handle"] = _mem_state["stop_handle"], None
+    if handle:
+        handle.cancel()
+    return mem_trace_status()
+
+def mem_trace_status() -> dict:
+    tracing = tracemalloc.is_tracing()
+    current, peak = tracemalloc.get_traced_memory() if tracing else (0, 0)
+    return {"tracing": tracing, "since": _mem_state["started"], "diffs": _mem_state["diffs"],
+            "auto_stop_s": MEM_TRACE_MAX_S, "traced_kb": current // 1024, "peak_kb": peak // 1024,
+            "overhead_kb": tracemalloc.get_tracemalloc_memory() // 1024 if tracing else 0,
+            "rss_kb": _mem_rss_kb()}
+
+def mem_trace_diff(top: int = 20, group: str = "lineno", rebase: bool = False) -> dict:
+    """Top punti di allocazione cresciuti dalla baseline. group="traceback" tiene lo stack
+    completo (MEM_TRACE_FRAMES) per capire da dove arriva una riga stdlib."""
+    if _mem_state["baseline"] is None:
+        raise RuntimeError("tracemalloc non attivo: avvialo prima")
+    snap = _mem_snapshot()
+    stats = snap.compare_to(_mem_state["baseline"], group)
+    stats.sort(key=lambda s: s.size_diff, reverse=True)
+    sites = [{"where": f"{Path(s.traceback[-1].filename).name}:{s.traceback[-1].lineno}" if group == "traceback"
+              else f"{Path(s.traceback[0].filename).name}:{s.traceback[0].lineno}",
+              "size_kb": round(s.size / 1024, 1), "size_diff_kb": round(s.size_diff / 1024, 1),
+              "count": s.count, "count_diff": s.count_diff,
+              "stack": [f"{Path(f.filename).name}:{f.lineno}" for f in s.traceback] if group == "traceback" else []}
+             for s in stats[:top] if s.size_diff > 0]
+    _mem_state["diffs"] += 1
+    if rebase:
+        _mem_state["baseline"] = snap
+    return {**mem_trace_status(), "group": group, "sites": sites,
+            "grown_kb": round(sum(s.size_diff for s in stats if s.size_diff > 0) / 1024, 1)}
+
+
+# --- src/backend/services/scheduler.py ---
+# ─── Job scheduler in-process (sostituisce i cron degli script) ─────────────
+# Ogni voce di crontab avviava un interprete nuovo: import, config e connessioni
+# rifatti da zero per pochi secondi di lavoro vero. Qui gli script sono moduli
+# caricati una volta (ricaricati se il file cambia) e il loro main() gira in un
+# pool dedicato con gli helper del server iniettati al posto dei duplicati locali:
+# Telegram sul client keep-alive, Sigil sul bus, Google sul worker, stesso DB.
+# Le print del job diventano progresso live sulla dashboard e storico in job_runs.
+JOB_JITTER = 30          # s casuali aggiunti a ogni esecuzione (i job delle :00 non partono insieme)
+JOB_OUTPUT_LINES = 200   # righe di output tenute per esecuzione
+JOB_WORKERS = 2          # thread dei job, separati dal pool di bg()
+
+# Un job dura fino a 30 min e un thread in timeout non si può interrompere: nel
+# pool di default toglierebbe worker a chat, DB e health probe per minuti
+_job_pool = concurrent.futures.ThreadPoolExecutor(max_workers=JOB_WORKERS, thread_name_prefix="job")
+
+# nome: (cron, script, timeout s, telegram in HTML)
+JOB_DEFAULTS = {
+    "ai_monitor":     ("30 6 * * *",      "ai_monitor.py",            300,  False),
+    "briefing":       ("30 7 * * *",      str(BRIEFING_SCRIPT),       300,  False),
+    "task_reminder":  ("*/15 7-22 * * *", "scripts/task_reminder.py", 120,  True),
+    "check_in":       ("0 20 * * *",      "check_in.py",              120,  True),
+    "goodnight":      ("0 22 * * *",      "scripts/goodnight.py",     120,  True),
+    "deep_learn":     ("0 2 1 * *",       "deep_learn.py",            1800, False),
+    "self_evolve":    ("0 3 * * 0",       "self_evolve.py",           1800, False),
+    "backup_db":      ("0 4 * * 0",       "backup_db.py",             900,  False),
+    "daily_summary":  ("20 0-6 * * *",    "daily_summary.py",         900,  False),
+    "weekly_summary": ("0 5-8 * * 0",     "weekly_summary.py",        900,  False),
+}
+
+# ─── Espressioni cron ────────────────────────────────────────────────────────
+_CRON_ALIASES = {"@hourly": "0 * * * *", "@daily": "0 0 * * *", "@midnight": "0 0 * * *",
+                 "@weekly": "0 0 * * 0", "@monthly": "0 0 1 * *"}
+_CRON_BOUNDS = ((0, 59), (0, 23), (1, 31), (1, 12), (0, 7))
+
+def _cron_field(expr: str, lo: int, hi: int) -> frozenset:
+    values = set()
+    for part in expr.split(","):
+        rng, _, step = part.partition("/")
+        step = int(step) if step else 1
+        if rng == "*":
+            a, b = lo, hi
+        elif "-" in rng:
+            a, b = (int(x) for x in rng.split("-", 1))
+        else:
+            a = int(rng)
+            b = hi if step > 1 else a   # "5/15" = dal 5 ogni 15
+        if step < 1 or not lo <= a <= b <= hi:
+            raise ValueError(f"campo fuori intervallo: {part}")
+        values.update(range(a, b + 1, step))
+    return frozenset(values)
+
+def parse_cron(expr: str) -> tuple:
+    """"m h dom mon dow" (o @daily/@hourly/...) → insiemi di valori ammessi.
+    ValueError se l'espressione non è valida."""
+    expr = _CRON_ALIASES.get(expr.strip(), expr.strip())
+    parts = expr.split()
+    if len(parts) != 5:
+        raise ValueError(f"Cron non valido: {expr!r}")
+    try:
+        fields = [_cron_field(p, lo, hi) for p, (lo, hi) in zip(parts, _CRON_BOUNDS)]
+    except ValueError as e:
+        raise ValueError(f"Cron non valido: {expr!r} ({e})")
+    fields[4] = frozenset(d % 7 for d in fields[4])   # 7 = domenica
+    # Regola cron: se giorno del mese e della settimana sono entrambi ristretti, basta uno dei due
+    return (*fields, parts[2].startswith("*"), parts[4].startswith("*"))
+
+def cron_next(spec: tuple, after: _dt) -> _dt:
+    """Prima esecuzione strettamente successiva ad `after` (salta per mese/giorno/ora)."""
+    minutes, hours, doms, months, dows, dom_any, dow_any = spec
+    t = after.replace(second=0, microsecond=0) + timedelta(minutes=1)
+    limit = t + timedelta(days=366 * 4)
+    while t < limit:
+        if t.month not in months:
+            t = (t.replace(day=1, hour=0, minute=0) + timedelta(days=32)).replace(day=1)
+            continue
+        dom_ok, dow_ok = t.day in doms, (t.weekday() + 1) % 7 in dows
+        if not (dom_ok and dow_ok if dom_any or dow_any else dom_ok or dow_ok):
+            t = t.replace(hour=0, minute=0) + timedelta(days=1)
+            continue
+        if t.hour not in hours:
+            t = t.replace(minute=0) + timedelta(hours=1)
+            continue
+        if t.minute not in minutes:
+            t += timedelta(minutes=1)
+            continue
+        return t
+    raise ValueError("nessuna esecuzione nei prossimi 4 anni")
+
+# ─── Registro job ────────────────────────────────────────────────────────────
+_jobs: dict[str, dict] = {}
+_jobs_loop: asyncio.AbstractEventLoop | None = None
+_print_builtin = print
+
+def _job_script(path: str) -> Path:
+    """Lo script può stare in ~/<path>, ~/scripts/<nome> o ~/<nome>: il primo che esiste."""
+    p = Path(path).expanduser()
+    if p.is_absolute():
+        return p
+    home = Path.home()
+    for cand in (home / p, home / "scripts" / p.name, home / p.name):
+        if cand.exists():
+            return cand
+    return home / p
+
+def load_jobs():
+    """Registro da JOB_DEFAULTS + override in ~/.nanobot/jobs.json
+    ({"briefing": {"cron": "0 8 * * *", "enabled": false, "script": "...", "timeout": 600}})."""
+    overrides = _get_config("jobs.json")
+    for name, (cron, script, timeout, html) in JOB_DEFAULTS.items():
+        o = overrides.get(name, {}) if isinstance(overrides.get(name), dict) else {}
+        cron = o.get("cron", cron)
+        try:
+            spec = parse_cron(cron)
+        except ValueError as e:
+            print(f"[Jobs] {name}: {e} — disabilitato")
+            spec = None
+        prev = _jobs.get(name, {})
+        _jobs[name] = {"name": name, "cron": cron, "spec": spec,
+                       "script": _job_script(o.get("script", script)),
+                       "timeout": int(o.get("timeout", timeout)), "html": html,
+                       "enabled": bool(o.get("enabled", True)) and spec is not None,
+                       "next_at": 0.0, "running": prev.get("running", False),
+                       "module": prev.get("module"), "mtime": prev.get("mtime", 0)}
+
+def _crontab_text() -> str:
+    try:
+        r = subprocess.run(["crontab", "-l"], capture_output=True, text=True, timeout=10)
+        return r.stdout if r.returncode == 0 else ""
+    except Exception:
+        return ""
+
+def _job_external(job: dict, crontab: str) -> bool:
+    """True se lo script è ancora nel crontab: lo lancia cron, lo scheduler non lo duplica."""
+    return any(job["script"].name in line for line in crontab.splitlines()
+               if line.strip() and not line.lstrip().startswith("#"))
+
+def _schedule_next(job: dict):
+    if not job["enabled"]:
+        job["next_at"] = 0.0
+        return
+    job["next_at"] = cron_next(job["spec"], _dt.now()).timestamp() + random.uniform(0, JOB_JITTER)
+
+# ─── Helper condivisi iniettati negli script ────────────────────────────────
+def _job_await(coro, timeout: float = 60):
+    """Dal thread del job: esegue una coroutine sul loop del server e ne attende il risultato."""
+    return asyncio.run_coroutine_threadsafe(coro, _jobs_loop).result(timeout)
+
+def _job_telegram(html: bool):
+    def telegram_send(text: str) -> bool:
+        if not TELEGRAM_TOKEN or not TELEGRAM_CHAT_ID:
+            print("Telegram non configurato")
+            return False
+        extra = {"parse_mode": "HTML"} if html else {}
+        sent = _job_await(tg_client.send_message(text, **extra))
+        return all(m is not None for m in sent)
+    return telegram_send
+
+def _job_bus_send(msg: dict) -> dict:
+    return _job_await(bus_dispatch(msg), timeout=5)
+
+def _job_call_google(args: list) -> str | None:
+    return google_call(args, timeout=15) or None
+
+def _job_fetch_url(url: str, timeout: float = 10) -> bytes | None:
+    return http_fetch(url, timeout)
+
+def _job_printer(name: str, out: list):
+    """print() del job: output catturato + riga di progresso sulla dashboard."""
+    def _print(*args, sep=" ", end="\n", file=None, flush=False):
+        line = sep.join(str(a) for a in args)
+        out.append(line)
+        del out[:-JOB_OUTPUT_LINES]
+        _print_builtin(f"[Job:{name}] {line}")
+        _jobs_loop.call_soon_threadsafe(
+            asyncio.ensure_future,
+            manager.broadcast({"type": "job_progress", "job": name, "status": "running", "line": line[:300]}))
+    return _print
+
+def _job_module(job: dict):
+    """Importa lo script come modulo (una volta, o di nuovo se il file è cambiato)."""
+    path = job["script"]
+    mtime = path.stat().st_mtime_ns
+    if job["module"] is None or job["mtime"] != mtime:
+        spec = importlib.util.spec_from_file_location(f"vessel_job_{job['name']}", path)
+        module = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(module)
+        job["module"], job["mtime"] = module, mtime
+    return job["module"]
+
+def _job_exec(job: dict, out: list):
+    """Gira in _job_pool. SystemExit con codice != 0 diventa un errore."""
+    module = _job_module(job)
+    shared = {"telegram_send": _job_telegram(job["html"]), "send_to_telegram": _job_telegram(False),
+              "_bus_send": _job_bus_send, "_call_google": _job_call_google, "_db_conn": _db_conn,
+              "_fetch_url": _job_fetch_url}
+    for attr, fn in shared.items():
+        if hasattr(module, attr):   # si sostituiscono solo gli helper che lo script definisce
+            setattr(module, attr, fn)
+    module.print = _job_printer(job["name"], out)
+    try:
+        module.main()
+    except SystemExit as e:
+        if e.code not in (None, 0):
+            raise RuntimeError(f"exit {e.code}")
+
+# ─── Esecuzione ──────────────────────────────────────────────────────────────
+def _job_done(job: dict, fut: asyncio.Future):
+    job["running"] = False
+    # exception() va letta comunque (altrimenti "exception never retrieved")
+    if not fut.cancelled() and fut.exception() is not None and job.pop("timed_out", False):
+        print(f"[Jobs] {job['name']} terminato dopo il timeout: {fut.exception()}")
+
+async def run_job(name: str, trigger: str = "cron") -> dict:
+    """Esegue un job (cron o manuale). Un job già in corso non parte una seconda volta."""
+    job = _jobs.get(name)
+    if job is None:
+        return {"ok": False, "error": f"Job sconosciuto: {name}"}
+    if job["running"]:
+        db_log_event("scheduler", "skip", status="error", payload={"job": name, "trigger": trigger},
+                     error="già in esecuzione")
+        return {"ok": False, "error": "già in esecuzione"}
+    if not job["script"].exists():
+        return {"ok": False, "error": f"script non trovato: {job['script']}"}
+    job["running"] = True
+    out: list[str] = []
+    run_id = await bg(db_job_run_start, name, trigger)
+    await manager.broadcast({"type": "job_progress", "job": name, "status": "running", "line": ""})
+    t0 = time.time()
+    fut = asyncio.get_running_loop().run_in_executor(_job_pool, _job_exec, job, out)
+    # Il thread non si può interrompere: il flag si libera solo quando finisce davvero
+    fut.add_done_callback(lambda f: _job_done(job, f))
+    try:
+        await asyncio.wait_for(asyncio.shield(fut), timeout=job["timeout"])
+        status, error = "ok", ""
+    except asyncio.TimeoutError:
+        status, error = "timeout", f"oltre {job['timeout']}s"
+        job["timed_out"] = True
+    except Exception as e:
+        status, error = "error", str(e)[:300]
+    duration = int((time.time() - t0) * 1000)
+    await bg(db_job_run_finish, run_id, status, duration, "\n".join(out), error)
+    db_log_event("scheduler", name, status="ok" if status == "ok" else "error", latency_ms=duration,
+                 payload={"trigger": trigger}, error=error)
+    await manager.broadcast({"type": "job_progress", "job": name, "status": status,
+                             "line": error, "duration_ms": duration})
+    return {"ok": status == "ok", "status": status, "error": error, "duration_ms": duration}
+
+async def run_briefing() -> dict:
+    """Briefing manuale (dashboard, ESP32): stesso job dello scheduler, poi i dati aggiornati."""
+    await run_job("briefing", "manual")
+    get_briefing_data.invalidate()
+    return await bg(get_briefing_data)
+
+async def job_scheduler():
+    """Loop dello scheduler: dorme fino al prossimo job in scadenza (max 60s)."""
+    global _jobs_loop
+    _jobs_loop = asyncio.get_running_loop()
+    load_jobs()
+    # Al boot nessun job è in corso: le righe 'running' sono di un processo interrotto
+    stale = await bg(db_job_runs_interrupt)
+    if stale:
+        print(f"[Jobs] {stale} esecuzioni interrotte dal riavvio")
+    for job in _jobs.values():
+        _schedule_next(job)
+    print(f"[Jobs] Scheduler attivo: {sum(j['enabled'] for j in _jobs.values())} job")
+    while True:
+        now = time.time()
+        due = [j for j in _jobs.values() if j["next_at"] and j["next_at"] <= now]
+        if due:
+            crontab = await bg(_crontab_text)
+            for job in due:
+                _schedule_next(job)
+                if _job_external(job, crontab):
+                    continue
+                asyncio.create_task(run_job(job["name"], "cron"))
+        pending = [j["next_at"] for j in _jobs.values() if j["next_at"]]
+        await asyncio.sleep(min(60.0, max(1.0, min(pending, default=now + 60) - time.time())))
+
+def job_list() -> list[dict]:
+    """Stato dei job per il widget Cron (sincrona: via bg)."""
+    last = db_get_last_job_runs()
+    crontab = _crontab_text()
+    return [{"name": j["name"], "cron": j["cron"], "script": str(j["script"]),
+             "exists": j["script"].exists(), "enabled": j["enabled"],
+             "external": _job_external(j, crontab), "running": j["running"],
+             "next": _dt.fromtimestamp(j["next_at"]).strftime("%d/%m %H:%M") if j["next_at"] else "",
+             "last": last.get(j["name"])}
+            for j in _jobs.values()]
+
+
 # --- src/backend/services/cleanup.py ---
 # ─── Cleanup ─────────────────────────────────────────────────────────────────
 def _cleanup_expired():
+    global _sessions_dirty
     now = time.time()
-    for key in list(RATE_LIMITS.keys()):
-        RATE_LIMITS[key] = [t for t in RATE_LIMITS[key] if now - t < 600]
-        if not RATE_LIMITS[key]:
-            del RATE_LIMITS[key]
+    RATE_LIMITS.purge()
+    _ensure_sessions()
     for token in list(SESSIONS.keys()):
         if now - SESSIONS[token] > SESSION_TIMEOUT:
             del SESSIONS[token]
+            _sessions_dirty = True
 
 
 def cleanup_old_data():
@@ -2962,6 +5534,8 @@ def cleanup_old_data():
     purged_events = db_cleanup_old_events(90)
     print(f"[Cleanup] Archiviati {archived} chat, purged {purged_usage} usage, {purged_events} events")
 
+_boot_mark("services")
+
 
 # --- src/backend/routes/tamagotchi.py ---
 # ─── Tamagotchi ESP32 ─────────────────────────────────────────────────────────
@@ -2969,36 +5543,106 @@ _tamagotchi_connections: set = set()
 _tamagotchi_state: str = "IDLE"
 _mood_counter: dict = {"happy": 0, "alert": 0, "error": 0}
 
-async def broadcast_tamagotchi(state: str, detail: str = "", text: str = "", mood: dict | None = None):
-    global _tamagotchi_state, _mood_counter
-    _tamagotchi_state = state
-    # Aggiorna mood counter
-    if state in ("HAPPY", "PROUD"): _mood_counter["happy"] += 1
-    elif state == "ALERT":         _mood_counter["alert"] += 1
-    elif state == "ERROR":         _mood_counter["error"] += 1
-    elif state == "SLEEPING":
-        # Reset counter dopo invio (fine giornata)
-        pass
-    payload: dict = {"state": state}
-    if detail:
-        payload["detail"] = detail
-    if text:
-        payload["text"] = text
-    if mood is not None:
-        payload["mood"] = mood
+# ─── Consegna stato: coalescing, seq/ack, resync ─────────────────────────────
+# Una chat produce THINKING → emozione in pochi ms, più heartbeat e timer: ogni
+# transizione era un frame radio e un'animazione sul T-Display. Le richieste
+# dentro la finestra TAMAGOTCHI_DEBOUNCE si fondono in un solo frame (vince
+# l'ultimo stato, detail/text/mood si uniscono) con numero di sequenza.
+# Protocollo v2 (il device lo annuncia con {"hello": {"proto": 2, "last_seq": N,
+# "binary": true}}): ack per frame, al reconnect e a ack mancanti si rimanda solo
+# lo snapshot corrente. I device v1 ricevono lo stesso frame JSON ("seq" ignorato).
+TAMAGOTCHI_DEBOUNCE = 0.25
+TAMAGOTCHI_HELLO_WAIT = 2.0  # attesa del primo messaggio (hello) dopo accept
+# Indice = codice di stato nei frame binari: allineato a STATE_CODES nel firmware
+SIGIL_STATE_CODES = ("IDLE", "THINKING", "WORKING", "PROUD", "SLEEPING", "ERROR", "BOOTING",
+                     "HAPPY", "ALERT", "CURIOUS", "BORED", "PEEKING")
+SIGIL_FRAME_MAGIC = 0x53  # 'S'
+SIGIL_FRAME_HEAD = struct.Struct("<BBIBBBB")  # magic, flags, seq, stato, happy, alert, error
+
+_sigil_seq = 0
+_sigil_state_sent = "IDLE"   # stato dell'ultimo frame consegnato (snapshot per resync)
+_sigil_pending: dict | None = None
+_sigil_flush_task: asyncio.Task | None = None
+_sigil_peers: dict = {}      # ws → {"proto": 1|2, "binary": bool, "acked": int}
+SIGIL_STATS = {"requested": 0, "frames": 0, "coalesced": 0, "resyncs": 0, "acks": 0}
+
+def _sigil_pack(frame: dict) -> bytes:
+    """Frame binario: header 10 byte + detail/text con prefisso di lunghezza (max 255 byte)."""
+    mood = frame.get("mood") or {}
+    head = SIGIL_FRAME_HEAD.pack(
+        SIGIL_FRAME_MAGIC, 1 if "mood" in frame else 0, frame["seq"] & 0xFFFFFFFF,
+        SIGIL_STATE_CODES.index(frame["state"]),
+        *(min(int(mood.get(k, 0) or 0), 255) for k in ("happy", "alert", "error")))
+    out = [head]
+    for key in ("detail", "text"):
+        raw = frame.get(key, "").encode("utf-8")[:255].decode("utf-8", "ignore").encode("utf-8")
+        out.append(bytes((len(raw),)) + raw)
+    return b"".join(out)
+
+async def _sigil_send(ws, frame: dict):
+    if _sigil_peers.get(ws, {}).get("binary"):
+        await ws.send_bytes(_sigil_pack(frame))
+    else:
+        await ws.send_json(frame)
+
+async def _sigil_send_snapshot(ws):
+    """Resync: solo lo stato corrente, non la coda delle transizioni perse."""
+    SIGIL_STATS["resyncs"] += 1
+    await _sigil_send(ws, {"state": _sigil_state_sent, "seq": _sigil_seq})
+
+async def _sigil_flush_later():
+    global _sigil_seq, _sigil_pending, _sigil_state_sent
+    await asyncio.sleep(TAMAGOTCHI_DEBOUNCE)
+    frame, _sigil_pending = _sigil_pending, None
+    if not frame:
+        return
+    _sigil_seq += 1
+    frame["seq"] = _sigil_seq
+    _sigil_state_sent = frame["state"]
+    SIGIL_STATS["frames"] += 1
     dead = set()
     for ws in _tamagotchi_connections.copy():
         try:
-            await ws.send_json(payload)
+            await _sigil_send(ws, frame)
         except Exception:
             dead.add(ws)
     _tamagotchi_connections.difference_update(dead)
     # Notifica dashboard WS clients (Fase 38 — Emotion Bridge)
     try:
-        await manager.broadcast({"type": "sigil_state", "state": state})
+        await manager.broadcast({"type": "sigil_state", "state": frame["state"]})
     except Exception:
         pass
 
+def _sigil_enqueue(state: str, detail: str = "", text: str = "", mood: dict | None = None):
+    """Fonde la transizione nel frame in attesa e pianifica il flush."""
+    global _sigil_pending, _sigil_flush_task
+    SIGIL_STATS["requested"] += 1
+    if _sigil_pending is None:
+        _sigil_pending = {}
+    else:
+        SIGIL_STATS["coalesced"] += 1
+    _sigil_pending["state"] = state
+    if detail:
+        _sigil_pending["detail"] = detail
+    if text:
+        _sigil_pending["text"] = text
+    if mood is not None:
+        _sigil_pending["mood"] = mood
+    if _sigil_flush_task is None or _sigil_flush_task.done():
+        _sigil_flush_task = asyncio.create_task(_sigil_flush_later())
+
+async def broadcast_tamagotchi(state: str, detail: str = "", text: str = "", mood: dict | None = None):
+    global _tamagotchi_state, _mood_counter
+    _tamagotchi_state = state
+    # Aggiorna mood counter
+    if state in ("HAPPY", "PROUD"): _mood_counter["happy"] += 1
+    elif state == "ALERT":         _mood_counter["alert"] += 1
+    elif state == "ERROR":         _mood_counter["error"] += 1
+    elif state == "SLEEPING":
+        # Reset counter dopo invio (fine giornata)
+        pass
+    _sigil_enqueue(state, detail, text, mood)
+
 async def broadcast_tamagotchi_raw(payload: dict):
     """Invia payload arbitrario (es. crypto_update) all'ESP32 senza modificare _tamagotchi_state."""
     dead = set()
@@ -3009,6 +5653,33 @@ async def broadcast_tamagotchi_raw(payload: dict):
             dead.add(ws)
     _tamagotchi_connections.difference_update(dead)
 
+# ─── Subscriber del bus: unico punto che parla con ESP32 e dashboard ─────────
+@bus.on(SigilState)
+async def _on_sigil_state(e: SigilState):
+    global _mood_counter
+    await broadcast_tamagotchi(e.state, e.detail, e.text, e.mood)
+    if e.state == "SLEEPING":
+        _mood_counter = {"happy": 0, "alert": 0, "error": 0}
+
+@bus.on(SigilText)
+async def _on_sigil_text(e: SigilText):
+    # Il firmware si aspetta "state" per processare il payload — manteniamo lo stato corrente
+    _sigil_enqueue(_tamagotchi_state, text=e.text)
+
+@bus.on(CryptoUpdate)
+async def _on_crypto_update(e: CryptoUpdate):
+    await broadcast_tamagotchi_raw({"action": "crypto_update", "btc": e.btc, "eth": e.eth,
+                                    "btc_change": e.btc_change, "eth_change": e.eth_change})
+
+@bus.on(Alert)
+async def _on_alert(e: Alert):
+    await broadcast_tamagotchi("ALERT")
+
+bus.provide("sigil.mood", lambda: dict(_mood_counter))
+bus.provide("sigil.state", lambda: {"state": _tamagotchi_state, "seq": _sigil_seq,
+                                    "clients": len(_tamagotchi_connections)})
+bus.provide("sigil.clients", lambda: len(_tamagotchi_connections))
+
 async def _handle_tamagotchi_cmd(ws: WebSocket, cmd: str, req_id: int):
     """Gestisce un comando inviato dall'ESP32 e risponde."""
     try:
@@ -3048,19 +5719,19 @@ async def _handle_tamagotchi_cmd(ws: WebSocket, cmd: str, req_id: int):
             subprocess.run(["sudo", "shutdown", "-h", "now"])
 
         elif cmd == "run_briefing":
-            await bg(run_briefing)
+            await run_briefing()
             await ws.send_json({"resp": "run_briefing", "req_id": req_id, "ok": True,
                                 "data": {"msg": "Briefing generato"}})
 
         elif cmd == "check_ollama":
-            alive = await bg(check_ollama_health)
+            ollama = await health_get("ollama", max_age=HEALTH_ON_DEMAND_AGE)
             await ws.send_json({"resp": "check_ollama", "req_id": req_id, "ok": True,
-                                "data": {"alive": alive}})
+                                "data": {"alive": bool(ollama["ok"])}})
 
         elif cmd == "check_bridge":
-            health = await bg(check_bridge_health)
+            await health_get("bridge", max_age=HEALTH_ON_DEMAND_AGE)
             await ws.send_json({"resp": "check_bridge", "req_id": req_id, "ok": True,
-                                "data": health})
+                                "data": {"status": bridge_status()}})
 
         elif cmd == "warmup_ollama":
             await bg(warmup_ollama)
@@ -3079,55 +5750,93 @@ async def _handle_tamagotchi_cmd(ws: WebSocket, cmd: str, req_id: int):
         except Exception:
             pass
 
+def _sigil_int(value, default=None):
+    """Intero dal device; stringhe, float, bool o null valgono default (mai eccezioni)."""
+    return value if isinstance(value, int) and not isinstance(value, bool) else default
+
+async def _handle_tamagotchi_msg(ws: WebSocket, data: str):
+    """hello (protocollo v2), ack di un frame di stato, comandi menu."""
+    try:
+        msg = json.loads(data)
+    except (json.JSONDecodeError, ValueError):
+        return
+    if not isinstance(msg, dict):
+        return
+    peer = _sigil_peers.setdefault(ws, {"proto": 1, "binary": False, "acked": 0})
+    if "hello" in msg:
+        hello = msg["hello"] if isinstance(msg["hello"], dict) else {}
+        peer["proto"] = _sigil_int(hello.get("proto"), 1) or 1
+        peer["binary"] = bool(hello.get("binary")) and peer["proto"] >= 2
+        peer["acked"] = _sigil_int(hello.get("last_seq"), 0)
+        peer["id"] = str(hello.get("id", ""))[:32] or ws.client.host
+        peer["fw"] = str(hello.get("fw", ""))[:32]
+        db_log_event("esp32", "hello", payload={"proto": peer["proto"], "binary": peer["binary"],
+                                                 "last_seq": peer["acked"], "seq": _sigil_seq,
+                                                 "id": peer["id"], "fw": peer["fw"]})
+        await _sigil_send_snapshot(ws)
+    elif "ack" in msg:
+        ack = _sigil_int(msg["ack"])
+        if ack is not None:        # ack malformato: ignorato, il socket resta su
+            SIGIL_STATS["acks"] += 1
+            peer["acked"] = max(peer["acked"], ack)
+    elif isinstance(msg.get("ota"), dict):
+        # Esito OTA dal device: ok (riavvio), skip (versione già installata), error
+        ota = msg["ota"]
+        status = str(ota.get("status", ""))[:16]
+        await _ota_update(peer.get("id") or ws.client.host, status=status,
+                          version=str(ota.get("version", ""))[:32], error=str(ota.get("error", ""))[:80])
+        db_log_event("esp32", "ota_result", status="ok" if status in ("ok", "skip") else "error", payload=ota)
+    elif msg.get("cmd"):
+        await _handle_tamagotchi_cmd(ws, msg["cmd"], msg.get("req_id", 0))
+
 @app.websocket("/ws/tamagotchi")
 async def tamagotchi_ws(websocket: WebSocket):
     await websocket.accept()
     _tamagotchi_connections.add(websocket)
+    peer = _sigil_peers.setdefault(websocket, {"proto": 1, "binary": False, "acked": 0})
     db_log_event("esp32", "connect", payload={"ip": websocket.client.host})
     print(f"[Tamagotchi] ESP32 connesso da {websocket.client.host}")
     try:
-        await websocket.send_json({"state": _tamagotchi_state})
+        # Il firmware v2 si presenta con hello; i v1 mandano "Connected" o nulla
+        try:
+            first = await asyncio.wait_for(websocket.receive_text(), timeout=TAMAGOTCHI_HELLO_WAIT)
+            await _handle_tamagotchi_msg(websocket, first)
+        except asyncio.TimeoutError:
+            pass
+        if peer["proto"] < 2:
+            await websocket.send_json({"state": _sigil_state_sent, "seq": _sigil_seq})
         while True:
             try:
                 data = await asyncio.wait_for(websocket.receive_text(), timeout=30.0)
-                try:
-                    msg = json.loads(data)
-                    cmd = msg.get("cmd")
-                    if cmd:
-                        req_id = msg.get("req_id", 0)
-                        await _handle_tamagotchi_cmd(websocket, cmd, req_id)
-                        continue
-                except (json.JSONDecodeError, ValueError):
-                    pass
+                await _handle_tamagotchi_msg(websocket, data)
             except asyncio.TimeoutError:
                 await websocket.send_json({"ping": True})
+                # Frame non confermato (perso in radio): rimanda lo snapshot
+                if peer["proto"] >= 2 and peer["acked"] < _sigil_seq:
+                    await _sigil_send_snapshot(websocket)
     except WebSocketDisconnect:
-        _tamagotchi_connections.discard(websocket)
         db_log_event("esp32", "disconnect")
         print("[Tamagotchi] ESP32 disconnesso")
     except Exception:
-        _tamagotchi_connections.discard(websocket)
         db_log_event("esp32", "disconnect", status="error")
+    finally:
+        _tamagotchi_connections.discard(websocket)
+        _sigil_peers.pop(websocket, None)
 
 @app.post("/api/tamagotchi/state")
 async def set_tamagotchi_state(request: Request):
-    """Aggiorna lo stato del tamagotchi ESP32. Chiamabile da cron/script locali."""
+    """Aggiorna lo stato del tamagotchi ESP32 (pubblica sul bus). Gli script locali
+    usano il socket del bus; l'endpoint resta per client esterni."""
     try:
         data = await request.json()
     except Exception:
         return JSONResponse({"ok": False, "error": "JSON non valido"}, status_code=400)
-    global _mood_counter
-    state  = data.get("state", "")
-    detail = data.get("detail", "")
-    text   = data.get("text", "")
-    mood   = data.get("mood", None)
-    valid_states = {"IDLE", "THINKING", "WORKING", "PROUD", "SLEEPING", "ERROR", "BOOTING", "HAPPY", "ALERT", "CURIOUS", "BORED", "PEEKING"}
-    if state not in valid_states:
-        return JSONResponse({"ok": False, "error": f"Stato non valido. Validi: {valid_states}"}, status_code=400)
-    await broadcast_tamagotchi(state, detail, text, mood)
-    if state == "SLEEPING":
-        _mood_counter = {"happy": 0, "alert": 0, "error": 0}
-    return {"ok": True, "state": state, "clients": len(_tamagotchi_connections)}
+    try:
+        event = bus_event("sigil.state", data)
+    except ValueError:
+        return JSONResponse({"ok": False, "error": f"Stato non valido. Validi: {set(SIGIL_STATES)}"}, status_code=400)
+    await bus.publish(event)
+    return {"ok": True, "state": event.state, "clients": len(_tamagotchi_connections)}
 
 @app.post("/api/tamagotchi/text")
 async def send_tamagotchi_text(request: Request):
@@ -3136,39 +5845,159 @@ async def send_tamagotchi_text(request: Request):
         data = await request.json()
     except Exception:
         return JSONResponse({"ok": False, "error": "JSON non valido"}, status_code=400)
-    text = data.get("text", "").strip()
-    if not text or len(text) > 64:
-        return JSONResponse({"ok": False, "error": "Testo vuoto o troppo lungo (max 64)"}, status_code=400)
-    # Il firmware si aspetta "state" per processare il payload — manteniamo lo stato corrente
-    await broadcast_tamagotchi_raw({"state": _tamagotchi_state, "text": text})
-    return {"ok": True, "text": text, "clients": len(_tamagotchi_connections)}
+    try:
+        event = SigilText(str(data.get("text", "")).strip())
+    except ValueError as e:
+        return JSONResponse({"ok": False, "error": str(e)}, status_code=400)
+    await bus.publish(event)
+    return {"ok": True, "text": event.text, "clients": len(_tamagotchi_connections)}
+
+# ─── OTA firmware: manifest, download a range, progresso per device ──────────
+# Sul 2.4 GHz il download cadeva a metà e ripartiva da zero. Il device legge il
+# manifest (versione, dimensione, sha256), salta l'update se ha già quella
+# versione e riprende da dove si è interrotto con Range + If-Range (ETag = sha256:
+# se il .bin cambia nel frattempo riparte da capo invece di mischiare due build).
+TAMAGOTCHI_FW_DIR = Path.home() / ".nanobot" / "firmware"
+TAMAGOTCHI_FW_CHUNK = 16 * 1024
+TAMAGOTCHI_OTA_NOTIFY = 1.0  # intervallo minimo tra due ota_progress alla dashboard (s)
+_RANGE_RE = re.compile(r"bytes=(\d*)-(\d*)$")
+_fw_manifest_cache: dict = {}
+_ota_progress: dict = {}     # device → {version, offset, size, pct, status, attempts, updated}
+
+def _firmware_manifest() -> dict | None:
+    """Manifest del firmware corrente; sha256 ricalcolato solo se il file cambia.
+    La versione arriva da tamagotchi.json (scritto da build.py), altrimenti dallo sha."""
+    fw = TAMAGOTCHI_FW_DIR / "tamagotchi.bin"
+    try:
+        st = fw.stat()
+    except FileNotFoundError:
+        return None
+    key = (st.st_mtime_ns, st.st_size)
+    if _fw_manifest_cache.get("key") == key:
+        return _fw_manifest_cache["manifest"]
+    h = hashlib.sha256()
+    with open(fw, "rb") as f:
+        while chunk := f.read(1 << 16):
+            h.update(chunk)
+    sha = h.hexdigest()
+    version = sha[:12]
+    try:
+        version = json.loads((TAMAGOTCHI_FW_DIR / "tamagotchi.json").read_text()).get("version") or version
+    except (OSError, ValueError):
+        pass
+    manifest = {"version": version, "size": st.st_size, "sha256": sha,
+                "chunk": TAMAGOTCHI_FW_CHUNK, "url": "/api/tamagotchi/firmware"}
+    _fw_manifest_cache.update(key=key, manifest=manifest)
+    return manifest
+
+def _parse_range(header: str, size: int) -> tuple[int, int] | None:
+    """"bytes=a-b" / "bytes=a-" / "bytes=-n" → (start, end) inclusivo. None se non soddisfacibile."""
+    m = _RANGE_RE.match(header.strip())
+    if not m or not (m.group(1) or m.group(2)):
+        return None
+    if not m.group(1):
+        start, end = max(size - int(m.group(2)), 0), size - 1
+    else:
+        start = int(m.group(1))
+        end = min(int(m.group(2)), size - 1) if m.group(2) else size - 1
+    return (start, end) if start <= end < size else None
+
+async def _ota_update(device: str, **fields):
+    """Aggiorna il progresso di un device e lo notifica alla dashboard."""
+    p = _ota_progress.setdefault(device, {"device": device, "attempts": 0, "status": "idle"})
+    p.update(fields, updated=time.time())
+    try:
+        await manager.broadcast({"type": "ota_progress", "data": dict(p)})
+    except Exception:
+        pass
+
+@app.get("/api/tamagotchi/firmware/manifest")
+async def get_tamagotchi_firmware_manifest():
+    manifest = await bg(_firmware_manifest)
+    if not manifest:
+        return JSONResponse({"error": "Firmware non trovato. Esegui il deploy prima."}, status_code=404)
+    return manifest
 
 @app.get("/api/tamagotchi/firmware")
-async def get_tamagotchi_firmware():
-    """Serve il firmware .bin per OTA update ESP32."""
-    from pathlib import Path as _Path
-    from fastapi.responses import FileResponse
-    fw = _Path.home() / ".nanobot" / "firmware" / "tamagotchi.bin"
-    if not fw.exists():
+async def get_tamagotchi_firmware(request: Request):
+    """Serve il firmware .bin per OTA update ESP32, a pezzi e con supporto Range."""
+    manifest = await bg(_firmware_manifest)
+    if not manifest:
         return JSONResponse({"error": "Firmware non trovato. Esegui il deploy prima."}, status_code=404)
-    return FileResponse(str(fw), media_type="application/octet-stream", filename="tamagotchi.bin")
+    size, etag = manifest["size"], f'"{manifest["sha256"]}"'
+    headers = {"Accept-Ranges": "bytes", "ETag": etag, "X-Firmware-Version": manifest["version"]}
+    start, end, status = 0, size - 1, 200
+    range_h = request.headers.get("range")
+    if range_h and request.headers.get("if-range", etag) == etag:
+        rng = _parse_range(range_h, size)
+        if rng is None:
+            return Response(status_code=416, headers={"Content-Range": f"bytes */{size}", **headers})
+        start, end, status = rng[0], rng[1], 206
+        headers["Content-Range"] = f"bytes {start}-{end}/{size}"
+    headers["Content-Length"] = str(end - start + 1)
+    device = request.headers.get("x-sigil-id") or request.client.host
+    prev = _ota_progress.get(device, {})
+    await _ota_update(device, version=manifest["version"], size=size, offset=start,
+                      pct=start * 100 // size, status="downloading",
+                      attempts=prev.get("attempts", 0) + 1 if start else 1)
+    fw_path = TAMAGOTCHI_FW_DIR / "tamagotchi.bin"
+
+    async def _stream():
+        pos, last_notify = start, 0.0
+        with open(fw_path, "rb") as f:
+            f.seek(start)
+            try:
+                while pos <= end:
+                    chunk = await bg(f.read, min(TAMAGOTCHI_FW_CHUNK, end - pos + 1))
+                    if not chunk:
+                        break
+                    pos += len(chunk)
+                    yield chunk
+                    if time.time() - last_notify >= TAMAGOTCHI_OTA_NOTIFY or pos > end:
+                        last_notify = time.time()
+                        await _ota_update(device, offset=pos, pct=pos * 100 // size,
+                                          status="downloaded" if pos >= size else "downloading")
+            finally:
+                if pos <= end or _ota_progress.get(device, {}).get("status") == "downloading":
+                    # Connessione caduta: il device riprenderà da qui con Range
+                    _ota_progress.get(device, {}).update(offset=pos, pct=pos * 100 // size,
+                                                         status="interrupted", updated=time.time())
+                    db_log_event("esp32", "ota_interrupted", status="error",
+                                 payload={"device": device, "offset": pos, "size": size})
+
+    return StreamingResponse(_stream(), status_code=status, headers=headers,
+                             media_type="application/octet-stream")
 
 @app.post("/api/tamagotchi/ota")
 async def trigger_tamagotchi_ota(request: Request):
-    """Invia comando OTA all'ESP32 via WebSocket."""
+    """Invia comando OTA all'ESP32 via WebSocket (con la versione del manifest)."""
+    manifest = await bg(_firmware_manifest)
+    if not manifest:
+        return JSONResponse({"ok": False, "error": "Firmware non trovato. Esegui il deploy prima."},
+                            status_code=404)
     dead = set()
     for ws in _tamagotchi_connections.copy():
         try:
-            await ws.send_json({"action": "ota_update"})
+            await ws.send_json({"action": "ota_update", "version": manifest["version"]})
         except Exception:
             dead.add(ws)
     _tamagotchi_connections.difference_update(dead)
-    clients = len(_tamagotchi_connections) - len(dead)
-    return {"ok": True, "notified": clients}
+    clients = len(_tamagotchi_connections)
+    db_log_event("esp32", "ota_trigger", payload={"version": manifest["version"], "clients": clients})
+    return {"ok": True, "notified": clients, "version": manifest["version"],
+            "status": f"OTA {manifest['version']} → {clients} device"}
+
+@app.get("/api/tamagotchi/ota")
+async def get_tamagotchi_ota():
+    """Progresso OTA per device + manifest corrente."""
+    return {"manifest": await bg(_firmware_manifest), "devices": list(_ota_progress.values())}
 
 @app.get("/api/tamagotchi/state")
 async def get_tamagotchi_state():
-    return {"state": _tamagotchi_state, "clients": len(_tamagotchi_connections)}
+    return {"state": _tamagotchi_state, "clients": len(_tamagotchi_connections), "seq": _sigil_seq,
+            "peers": [{"id": p.get("id", ""), "fw": p.get("fw", ""), "proto": p["proto"],
+                       "binary": p["binary"], "acked": p["acked"]} for p in _sigil_peers.values()],
+            "delivery": dict(SIGIL_STATS)}
 
 @app.get("/api/tamagotchi/mood")
 async def get_tamagotchi_mood():
@@ -3178,8 +6007,6 @@ async def get_tamagotchi_mood():
 
 # --- src/backend/routes/telegram.py ---
 # ─── Telegram polling ────────────────────────────────────────────────────────
-_tg_histories: dict[str, list] = {}
-
 _BRAINSTORM_SYSTEM = (
     "Sei in modalità BRAINSTORMING. Il tuo compito è:\n"
     "- Generare 10-15 idee diverse, creative e inaspettate sull'argomento dato\n"
@@ -3198,50 +6025,51 @@ _TELEGRAM_BREVITY = (
 )
 
 # ─── Prefetch: esecuzione comandi reali per arricchire il contesto Telegram ──
-_GHELPER_PY = str(Path.home() / ".local/share/google-workspace-mcp/bin/python")
-_GHELPER_SCRIPT = str(Path.home() / "scripts/google_helper.py")
-_GHELPER = f"{_GHELPER_PY} {_GHELPER_SCRIPT}"
+def _run_local(argv: list) -> str:
+    r = subprocess.run(argv, capture_output=True, text=True, timeout=30)
+    return (r.stdout + r.stderr).strip()
 
 async def _prefetch_context(text: str) -> str:
     """Rileva intent e esegue comandi reali sul Pi. Ritorna output da iniettare nel contesto."""
     low = text.lower()
-    cmds = []
+    cmds = []  # argomenti google_helper
+    local = []  # comandi di sistema (lista argomenti, niente shell)
     # Google Tasks
     if any(k in low for k in ["google task", "i miei task", "le mie task", "task di oggi",
                                "leggi i task", "mostra i task", "lista task",
                                "quali task", "ho da fare", "cosa devo fare", "task da fare",
                                "i task", "to do", "todo", "cose da fare"]):
-        cmds.append(f"{_GHELPER} tasks list")
+        cmds.append(["tasks", "list"])
     # Calendario domani (prima di oggi per priorità match)
     if "domani" in low and any(k in low for k in ["calendario", "agenda", "eventi", "appuntamenti", "impegni"]):
-        cmds.append(f"{_GHELPER} calendar tomorrow")
+        cmds.append(["calendar", "tomorrow"])
     # Calendario oggi (o generico senza "domani/settimana")
     elif any(k in low for k in ["calendario", "agenda oggi", "eventi di oggi",
                                  "appuntamenti oggi", "impegni oggi",
                                  "in calendario", "in agenda", "ho appuntamenti"]):
-        cmds.append(f"{_GHELPER} calendar today")
+        cmds.append(["calendar", "today"])
     # Briefing (calendario + tasks combo)
     if "briefing" in low:
-        if not any("calendar" in c for c in cmds):
-            cmds.append(f"{_GHELPER} calendar today")
-        if not any("tasks" in c for c in cmds):
-            cmds.append(f"{_GHELPER} tasks list")
+        if not any(c[0] == "calendar" for c in cmds):
+            cmds.append(["calendar", "today"])
+        if not any(c[0] == "tasks" for c in cmds):
+            cmds.append(["tasks", "list"])
     # Crontab
     if any(k in low for k in ["cron", "crontab"]):
-        cmds.append("crontab -l")
+        local.append(["crontab", "-l"])
     # Spazio disco
     if any(k in low for k in ["spazio disco", "quanto spazio", "spazio su disco"]):
-        cmds.append("df -h /")
+        local.append(["df", "-h", "/"])
     # Gmail
     if any(k in low for k in ["gmail", "mail non lette", "email non lette", "la posta", "le mail",
                                "email nuov", "mail nuov", "ho email", "ho mail", "le email",
                                "controlla email", "controlla mail", "check mail", "la mail",
                                "posta elettronica", "inbox"]):
-        cmds.append(f"{_GHELPER} gmail unread")
+        cmds.append(["gmail", "unread"])
     # Google Docs
     if any(k in low for k in ["google doc", "i miei doc", "i miei documenti", "lista doc",
                                "documenti recenti", "ultimi doc", "apri doc"]):
-        cmds.append(f"{_GHELPER} docs list 8")
+        cmds.append(["docs", "list", "8"])
     # Note rapide (query sincrona DB, non serve executor)
     notes_part = ""
     if any(k in low for k in ["le mie note", "mie note", "ho scritto", "appunti", "ricordami cosa", "cosa ho annotato"]):
@@ -3250,20 +6078,16 @@ async def _prefetch_context(text: str) -> str:
             notes_text = "\n".join(f"[{n['ts'][:10]}] #{n['id']}: {n['content'][:120]}" for n in notes)
             notes_part = f"Note recenti:\n{notes_text}"
 
-    if not cmds and not notes_part:
+    if not cmds and not local and not notes_part:
         return ""
-    loop = asyncio.get_running_loop()
+    # Tutte le letture partono insieme: il tempo è quello della più lenta
+    jobs = [bg(google_call, c) for c in cmds] + [bg(_run_local, c) for c in local]
     parts = []
-    for cmd in cmds:
-        try:
-            def _run(c=cmd):
-                r = subprocess.run(c, shell=True, capture_output=True, text=True, timeout=30)
-                return (r.stdout + r.stderr).strip()
-            out = await loop.run_in_executor(None, _run)
-            if out:
-                parts.append(out)
-        except Exception as e:
-            print(f"[Telegram] Prefetch error: {e}")
+    for out in await asyncio.gather(*jobs, return_exceptions=True):
+        if isinstance(out, Exception):
+            print(f"[Telegram] Prefetch error: {out}")
+        elif out:
+            parts.append(out)
     if notes_part:
         parts.append(notes_part)
     if not parts:
@@ -3271,11 +6095,6 @@ async def _prefetch_context(text: str) -> str:
     print(f"[Telegram] Prefetch: {len(parts)} risultati per '{text[:50]}'")
     return "\n\n".join(parts)
 
-def _tg_history(provider_id: str) -> list:
-    if provider_id not in _tg_histories:
-        _tg_histories[provider_id] = db_load_chat_history(provider_id, channel="telegram")
-    return _tg_histories[provider_id]
-
 def _resolve_telegram_provider(text: str) -> tuple[str, str, str, str]:
     """Risolve prefisso provider dal testo Telegram. Ritorna (provider_id, system, model, clean_text)."""
     low = text.lower()
@@ -3306,7 +6125,7 @@ async def _handle_telegram_message(text: str):
             f"Uptime: {pi['uptime']}\n"
             f"Tmux: {sessions}"
         )
-        telegram_send(reply)
+        await tg_send(reply)
         return
 
     if text.strip() == "/help":
@@ -3333,7 +6152,7 @@ async def _handle_telegram_message(text: str):
             "  /voice <msg> - risposta vocale\n"
             "  /help - questo messaggio"
         )
-        telegram_send(reply)
+        await tg_send(reply)
         return
 
     low = text.strip().lower()
@@ -3347,9 +6166,9 @@ async def _handle_telegram_message(text: str):
             tags = " ".join(_re.findall(r'#\w+', content))
             note_id = db_add_note(content, tags=tags)
             tag_str = f" [{tags}]" if tags else ""
-            telegram_send(f"📌 Nota #{note_id} salvata{tag_str}.")
+            await tg_send(f"📌 Nota #{note_id} salvata{tag_str}.")
         else:
-            telegram_send("Uso: /nota <testo>")
+            await tg_send("Uso: /nota <testo>")
         return
 
     if low == "/note" or low.startswith("/note "):
@@ -3360,38 +6179,37 @@ async def _handle_telegram_message(text: str):
             n = 5
         notes = db_get_notes(n)
         if not notes:
-            telegram_send("Nessuna nota salvata.")
+            await tg_send("Nessuna nota salvata.")
             return
         lines = [f"#{n_['id']} [{n_['ts'][:10]}] {n_['content'][:90]}" for n_ in notes]
-        telegram_send(f"📌 Ultime {len(notes)} note:\n" + "\n".join(lines))
+        await tg_send(f"📌 Ultime {len(notes)} note:\n" + "\n".join(lines))
         return
 
     if low.startswith("/cerca "):
         kw = text[7:].strip()
         results = db_search_notes(kw)
         if not results:
-            telegram_send(f"Nessuna nota per '{kw}'.")
+            await tg_send(f"Nessuna nota per '{kw}'.")
             return
         lines = [f"#{n['id']} [{n['ts'][:10]}] {n['content'][:80]}" for n in results]
-        telegram_send(f"🔍 '{kw}':\n" + "\n".join(lines))
+        await tg_send(f"🔍 '{kw}':\n" + "\n".join(lines))
         return
 
     if low.startswith("/delnota "):
         try:
             note_id = int(text[9:].strip())
             if db_delete_note(note_id):
-                telegram_send(f"🗑 Nota #{note_id} eliminata.")
+                await tg_send(f"🗑 Nota #{note_id} eliminata.")
             else:
-                telegram_send(f"Nota #{note_id} non trovata.")
+                await tg_send(f"Nota #{note_id} non trovata.")
         except ValueError:
-            telegram_send("Uso: /delnota <id>")
+            await tg_send("Uso: /delnota <id>")
         return
 
     # ─── Fase 42: Google Docs ─────────────────────────────────────────────────
     if low.startswith("/docs"):
         args_raw = text.strip()[5:].strip()   # tutto dopo "/docs"
         args_low = args_raw.lower()
-        loop = asyncio.get_running_loop()
 
         if not args_raw or args_low == "list" or args_low.startswith("list"):
             n = 8
@@ -3399,52 +6217,34 @@ async def _handle_telegram_message(text: str):
                 n = min(int(args_low.split()[1]), 15)
             except (ValueError, IndexError):
                 pass
-            def _docs_list(n=n):
-                r = subprocess.run(
-                    f"{_GHELPER} docs list {n}",
-                    shell=True, capture_output=True, text=True, timeout=30
-                )
-                return (r.stdout + r.stderr).strip()
-            out = await loop.run_in_executor(None, _docs_list)
-            telegram_send(out or "Nessun documento trovato.")
+            out = await bg(google_call, ["docs", "list", str(n)])
+            await tg_send(out or "Nessun documento trovato.")
 
         elif args_low.startswith("read "):
             title = args_raw[5:].strip()
             if not title:
-                telegram_send("Uso: /docs read <titolo>")
+                await tg_send("Uso: /docs read <titolo>")
             else:
-                def _docs_read(t=title):
-                    r = subprocess.run(
-                        [_GHELPER_PY, _GHELPER_SCRIPT, "docs", "read", t],
-                        capture_output=True, text=True, timeout=30
-                    )
-                    return (r.stdout + r.stderr).strip()
-                out = await loop.run_in_executor(None, _docs_read)
+                out = await bg(google_call, ["docs", "read", title])
                 if len(out) > 3800:
                     out = out[:3800] + "\n[...troncato]"
-                telegram_send(out or "Documento non trovato.")
+                await tg_send(out or "Documento non trovato.")
 
         elif args_low.startswith("append "):
             rest = args_raw[7:].strip()
             if "|" not in rest:
-                telegram_send("Uso: /docs append <titolo> | <testo da aggiungere>")
+                await tg_send("Uso: /docs append <titolo> | <testo da aggiungere>")
             else:
                 title, testo = rest.split("|", 1)
                 title, testo = title.strip(), testo.strip()
                 if not title or not testo:
-                    telegram_send("Uso: /docs append <titolo> | <testo da aggiungere>")
+                    await tg_send("Uso: /docs append <titolo> | <testo da aggiungere>")
                 else:
-                    def _docs_append(t=title, tx=testo):
-                        r = subprocess.run(
-                            [_GHELPER_PY, _GHELPER_SCRIPT, "docs", "append", t, tx],
-                            capture_output=True, text=True, timeout=30
-                        )
-                        return (r.stdout + r.stderr).strip()
-                    out = await loop.run_in_executor(None, _docs_append)
-                    telegram_send(out or "✅ Testo aggiunto.")
+                    out = await bg(google_call, ["docs", "append", title, testo])
+                    await tg_send(out or "✅ Testo aggiunto.")
 
         else:
-            telegram_send(
+            await tg_send(
                 "📄 Google Docs:\n"
                 "  /docs list [N] — lista documenti\n"
                 "  /docs read <titolo> — leggi documento\n"
@@ -3459,9 +6259,9 @@ async def _handle_telegram_message(text: str):
         kg_desc = parts[1].strip()
         if kg_name and kg_desc:
             eid = db_upsert_entity("memo", kg_name, kg_desc)
-            telegram_send(f"🧠 Ricordato: {kg_name} (#{eid})")
+            await tg_send(f"🧠 Ricordato: {kg_name} (#{eid})")
         else:
-            telegram_send("Uso: /ricorda <nome> = <descrizione>")
+            await tg_send("Uso: /ricorda <nome> = <descrizione>")
         return
 
     if low.startswith("/chi "):
@@ -3474,7 +6274,7 @@ async def _handle_telegram_message(text: str):
         else:
             kg_query = rest.strip()
         if not kg_query:
-            telegram_send("Uso: /chi è <nome>")
+            await tg_send("Uso: /chi è <nome>")
             return
         entity = db_search_entity(kg_query)
         if entity:
@@ -3488,7 +6288,7 @@ async def _handle_telegram_message(text: str):
                     for r in entity["relations"][:3]
                 )
                 lines.append(f"Relazioni: {rels_str}")
-            telegram_send("\n".join(lines))
+            await tg_send("\n".join(lines))
             return
         # Non trovato nel KG → fallthrough all'LLM (usa FRIENDS.md + context)
         text = f"Chi è {kg_query}?"
@@ -3500,7 +6300,7 @@ async def _handle_telegram_message(text: str):
     if low.startswith("/brainstorm "):
         text = text[12:].strip()
         if not text:
-            telegram_send("Uso: /brainstorm <argomento>")
+            await tg_send("Uso: /brainstorm <argomento>")
             return
         brainstorm_mode = True
         system = _BRAINSTORM_SYSTEM
@@ -3508,7 +6308,7 @@ async def _handle_telegram_message(text: str):
         text = text[7:].strip()
         send_voice = True
     elif low == "/voice":
-        telegram_send("Uso: /voice <messaggio>")
+        await tg_send("Uso: /voice <messaggio>")
         return
 
     # Prefetch: esecui comandi reali se il messaggio matcha pattern noti
@@ -3517,31 +6317,61 @@ async def _handle_telegram_message(text: str):
     if context:
         enriched_text = f"[DATI REALI DAL SISTEMA — usa questi per rispondere:]\n{context}\n\n[RICHIESTA:] {text}"
 
-    history = _tg_history(provider_id)
-    await broadcast_tamagotchi("THINKING")
+    history = await conversations.get(provider_id, channel="telegram")
+    await bus.publish(SigilState("THINKING"))
     if send_voice:
         voice_prefix = (
             "[L'utente ha richiesto risposta vocale — rispondi in modo conciso e naturale, "
             "come in una conversazione parlata. Niente emoji, asterischi, elenchi, "
             "formattazione markdown o roleplay. Max 2-3 frasi.] "
         )
-        reply = await _chat_response(voice_prefix + enriched_text, history, provider_id, system, model, channel="telegram")
-        telegram_send(reply)
-        await broadcast_tamagotchi(detect_emotion(reply or ""), detail="Telegram", text=text[:40])
-        loop = asyncio.get_running_loop()
-        def _tts_send():
-            ogg = text_to_voice(reply)
-            if ogg:
-                telegram_send_voice(ogg)
-        loop.run_in_executor(None, _tts_send)
+        reply = await _telegram_reply(voice_prefix + enriched_text, history, provider_id, system, model,
+                                      voice=True)
+        await bus.publish(SigilState(detect_emotion(reply or ""), detail="Telegram", text=text[:40]))
     else:
-        reply = await _chat_response(enriched_text, history, provider_id, system, model, channel="telegram")
-        telegram_send(reply)
-        await broadcast_tamagotchi(detect_emotion(reply or ""), detail="Telegram", text=text[:40])
+        reply = await _telegram_reply(enriched_text, history, provider_id, system, model)
+        await bus.publish(SigilState(detect_emotion(reply or ""), detail="Telegram", text=text[:40]))
         # Brainstorm: salva sessione come nota #brainstorm silenziosamente
         if brainstorm_mode and reply:
             db_add_note(f"[Brainstorm: {text[:60]}]\n{reply}", tags="#brainstorm")
 
+async def _telegram_reply(message: str, history: list, provider_id: str,
+                          system: str, model: str, voice: bool = False) -> str:
+    """Genera e invia la risposta. In streaming il telefono vede il testo crescere
+    (placeholder + edit throttled) come la dashboard; altrimenti un invio unico.
+    Con voice=True il vocale segue: a frasi durante la generazione (TTS_PIPELINE)
+    oppure sintetizzato a risposta completa."""
+    streamer = TelegramStreamer() if TELEGRAM_STREAMING else None
+    speaker = VoicePipeline() if voice and TTS_PIPELINE != "off" else None
+    sinks = [x.on_chunk for x in (streamer, speaker) if x is not None]
+
+    async def on_chunk(chunk: str):
+        for sink in sinks:
+            await sink(chunk)
+
+    if streamer:
+        await streamer.start()
+    reply = await _chat_response(message, history, provider_id, system, model,
+                                 channel="telegram", on_chunk=on_chunk if sinks else None)
+    if streamer:
+        await streamer.finish(reply)
+    else:
+        await tg_send(reply, wait=False)
+    if speaker:
+        asyncio.create_task(speaker.finish(reply))
+    elif voice:
+        asyncio.create_task(_send_voice_reply(reply))
+    return reply
+
+async def _send_voice_reply(reply: str):
+    """TTS (pipe Edge TTS → ffmpeg, solo I/O: resta sul loop), poi sendVoice
+    accodato dopo il testo (stessa coda chat)."""
+    ogg = await tts_ogg(reply)
+    if ogg:
+        await tg_send_voice(ogg)
+    else:
+        print("[TTS] Generazione vocale fallita, risposta solo testo")
+
 VOICE_MAX_DURATION = 180
 
 async def _handle_telegram_voice(voice: dict):
@@ -3551,21 +6381,21 @@ async def _handle_telegram_voice(voice: dict):
     if not file_id:
         return
     if duration > VOICE_MAX_DURATION:
-        telegram_send(f"Il vocale è troppo lungo ({duration}s, max {VOICE_MAX_DURATION}s). Prova con uno più breve.")
+        await tg_send(f"Il vocale è troppo lungo ({duration}s, max {VOICE_MAX_DURATION}s). Prova con uno più breve.")
         return
 
     file_path = await bg(telegram_get_file, file_id)
     if not file_path:
-        telegram_send("Non riesco a recuperare il vocale. Riprova.")
+        await tg_send("Non riesco a recuperare il vocale. Riprova.")
         return
     audio_bytes = await bg(telegram_download_file, file_path)
     if not audio_bytes:
-        telegram_send("Non riesco a scaricare il vocale. Riprova.")
+        await tg_send("Non riesco a scaricare il vocale. Riprova.")
         return
 
     text = await bg(transcribe_voice, audio_bytes)
     if not text:
-        telegram_send("Non sono riuscito a trascrivere il vocale. Prova a scrivere.")
+        await tg_send("Non sono riuscito a trascrivere il vocale. Prova a scrivere.")
         return
 
     print(f"[Telegram] Vocale trascritto ({duration}s): {text[:80]}...")
@@ -3580,73 +6410,65 @@ async def _handle_telegram_voice(voice: dict):
     )
     voice_text = voice_prefix + text
 
-    history = _tg_history(provider_id)
-    await broadcast_tamagotchi("THINKING")
-    reply = await _chat_response(voice_text, history, provider_id, system, model, channel="telegram")
+    history = await conversations.get(provider_id, channel="telegram")
+    await bus.publish(SigilState("THINKING"))
+    reply = await _telegram_reply(voice_text, history, provider_id, system, model, voice=True)
+    await bus.publish(SigilState(detect_emotion(reply or ""), detail="Telegram", text=text[:40]))
 
-    telegram_send(reply)
-    await broadcast_tamagotchi(detect_emotion(reply or ""), detail="Telegram", text=text[:40])
 
-    loop = asyncio.get_running_loop()
-    def _tts_and_send():
-        ogg = text_to_voice(reply)
-        if ogg:
-            telegram_send_voice(ogg)
-        else:
-            print("[TTS] Generazione vocale fallita, risposta solo testo")
-    loop.run_in_executor(None, _tts_and_send)
+async def _dispatch_update(upd: dict, slots: asyncio.Semaphore):
+    """Gestisce un update col limite di concorrenza (il polling non si ferma)."""
+    async with slots:
+        try:
+            msg = upd.get("message") or upd.get("edited_message")
+            if not msg:
+                return
+            chat_id = str(msg.get("chat", {}).get("id", ""))
+            if chat_id != TELEGRAM_CHAT_ID:
+                print(f"[Telegram] Messaggio da chat non autorizzata: {chat_id}")
+                return
+            voice = msg.get("voice")
+            if voice:
+                db_log_event("telegram", "receive", payload={"type": "voice", "duration": voice.get("duration", 0)})
+                await _handle_telegram_voice(voice)
+                return
+            text = msg.get("text", "").strip()
+            if not text:
+                return
+            db_log_event("telegram", "receive", payload={"type": "text", "chars": len(text)})
+            await _handle_telegram_message(text)
+        except Exception as e:
+            print(f"[Telegram] Errore gestione update: {e}")
 
 
 async def telegram_polling_task():
-    """Long polling Telegram. Avviato nel lifespan se token configurato."""
+    """Long polling Telegram su connessione keep-alive. Avviato nel lifespan se token configurato.
+    Gli update sono gestiti in task separati, al massimo TELEGRAM_MAX_INFLIGHT alla volta."""
     offset = 0
+    slots = asyncio.Semaphore(TELEGRAM_MAX_INFLIGHT)
     print("[Telegram] Polling avviato")
     while True:
         try:
-            url = f"https://api.telegram.org/bot{TELEGRAM_TOKEN}/getUpdates?offset={offset}&timeout=30"
-
-            def _poll():
-                req = urllib.request.Request(url)
-                with urllib.request.urlopen(req, timeout=35) as resp:
-                    return json.loads(resp.read())
-
-            updates = await asyncio.get_running_loop().run_in_executor(None, _poll)
-            for upd in updates.get("result", []):
+            updates = await tg_client.get_updates(offset)
+            for upd in updates:
                 offset = upd["update_id"] + 1
-                msg = upd.get("message") or upd.get("edited_message")
-                if not msg:
-                    continue
-                chat_id = str(msg.get("chat", {}).get("id", ""))
-                if chat_id != TELEGRAM_CHAT_ID:
-                    print(f"[Telegram] Messaggio da chat non autorizzata: {chat_id}")
-                    continue
-                voice = msg.get("voice")
-                if voice:
-                    db_log_event("telegram", "receive", payload={"type": "voice", "duration": voice.get("duration", 0)})
-                    asyncio.create_task(_handle_telegram_voice(voice))
-                    continue
-                text = msg.get("text", "").strip()
-                if not text:
-                    continue
-                db_log_event("telegram", "receive", payload={"type": "text", "chars": len(text)})
-                asyncio.create_task(_handle_telegram_message(text))
+                asyncio.create_task(_dispatch_update(upd, slots))
+        except TelegramRetryAfter as e:
+            await asyncio.sleep(e.retry_after)
         except Exception as e:
             print(f"[Telegram] Polling error: {e}")
             await asyncio.sleep(10)
 
 
 # --- src/backend/routes/ws_handlers.py ---
-# ─── Auto-routing helper (Fase 39C) ──────────────────────────────────────────
-def _resolve_auto_params(provider_id: str) -> tuple:
-    """Risolve (ctx_key, model) per il routing automatico agente."""
-    _map = {
-        "anthropic": ("cloud", ANTHROPIC_MODEL),
-        "ollama": ("ollama", OLLAMA_MODEL),
-        "ollama_pc": ("pc", OLLAMA_PC_MODEL),
-        "openrouter": ("deepseek", OPENROUTER_MODEL),
-        "brain": ("brain", BRAIN_MODEL),
-    }
-    return _map.get(provider_id, ("cloud", ANTHROPIC_MODEL))
+# ─── Chat routing (provider UI → provider_id, system, model) ─────────────────
+_DASHBOARD_PROVIDERS = {
+    "local":    ("ollama", OLLAMA_SYSTEM, OLLAMA_MODEL),
+    "pc":       ("ollama_pc", OLLAMA_PC_SYSTEM, OLLAMA_PC_MODEL),
+    "deepseek": ("openrouter", OPENROUTER_SYSTEM, OPENROUTER_MODEL),
+    "brain":    ("brain", BRAIN_SYSTEM, BRAIN_MODEL),
+    "cloud":    ("anthropic", ANTHROPIC_SYSTEM, ANTHROPIC_MODEL),
+}
 
 # ─── WebSocket Handlers ──────────────────────────────────────────────────────
 async def handle_chat(websocket, msg, ctx):
@@ -3658,42 +6480,42 @@ async def handle_chat(websocket, msg, ctx):
         await websocket.send_json({"type": "chat_reply", "text": "[!] Troppi messaggi. Attendi un momento."})
         return
     await websocket.send_json({"type": "chat_thinking"})
-    await broadcast_tamagotchi("THINKING")
+    await bus.publish(SigilState("THINKING"))
     mem = ctx.get("_memory_enabled", False)
-    reply = ""
+    agent_id = ""
     if provider == "auto":
         agent_id = detect_agent(text)
         agent_cfg = get_agent_config(agent_id)
         pid = agent_cfg.get("default_provider", "anthropic")
         system = build_agent_prompt(agent_id, pid)
-        ctx_key, default_model = _resolve_auto_params(pid)
-        model = agent_cfg.get("model", default_model)
-        reply = await _stream_chat(websocket, text, ctx[ctx_key], pid, system, model, memory_enabled=mem, agent_id=agent_id)
-    elif provider == "local":
-        reply = await _stream_chat(websocket, text, ctx["ollama"], "ollama", OLLAMA_SYSTEM, OLLAMA_MODEL, memory_enabled=mem)
-    elif provider == "pc":
-        reply = await _stream_chat(websocket, text, ctx["pc"], "ollama_pc", OLLAMA_PC_SYSTEM, OLLAMA_PC_MODEL, memory_enabled=mem)
-    elif provider == "deepseek":
-        reply = await _stream_chat(websocket, text, ctx["deepseek"], "openrouter", OPENROUTER_SYSTEM, OPENROUTER_MODEL, memory_enabled=mem)
-    elif provider == "brain":
-        reply = await _stream_chat(websocket, text, ctx["brain"], "brain", BRAIN_SYSTEM, BRAIN_MODEL, memory_enabled=mem)
+        model = agent_cfg.get("model", _provider_defaults(pid)[0])
     else:
-        reply = await _stream_chat(websocket, text, ctx["cloud"], "anthropic", ANTHROPIC_SYSTEM, ANTHROPIC_MODEL, memory_enabled=mem)
+        pid, system, model = _DASHBOARD_PROVIDERS.get(provider, _DASHBOARD_PROVIDERS["cloud"])
+    # History condivisa tra tutte le connessioni dashboard (lazy load da SQLite)
+    history = await conversations.get(pid)
+    reply = await _stream_chat(websocket, text, history, pid, system, model,
+                               memory_enabled=mem, agent_id=agent_id)
     emotion = detect_emotion(reply or "")
-    await broadcast_tamagotchi(emotion)
+    await bus.publish(SigilState(emotion))
 
 async def handle_clear_chat(websocket, msg, ctx):
-    for val in list(ctx.values()):
-        if isinstance(val, list):
-            val.clear()
-    db_clear_chat_history("dashboard")
+    conversations.clear("dashboard")
+    await bg(db_clear_chat_history, "dashboard")
+
+async def handle_chat_page(websocket, msg, ctx):
+    """Storico chat dashboard a pagine (la lista virtualizzata chiede le più vecchie scorrendo)."""
+    before = msg.get("before", 0)
+    if not isinstance(before, int) or before < 0:
+        before = 0
+    page = await bg(db_get_chat_page, "dashboard", before, 30)
+    await websocket.send_json({"type": "chat_page", "before": before, **page})
 
 async def handle_check_ollama(websocket, msg, ctx):
-    alive = await bg(check_ollama_health)
-    await websocket.send_json({"type": "ollama_status", "alive": alive})
+    ollama = await health_get("ollama", max_age=HEALTH_ON_DEMAND_AGE)
+    await websocket.send_json({"type": "ollama_status", "alive": bool(ollama["ok"])})
 
 async def handle_get_memory(websocket, msg, ctx):
-    await websocket.send_json({"type": "memory", "text": get_memory_preview()})
+    await websocket.send_json({"type": "memory", "text": await bg(get_memory_preview)})
 
 async def handle_get_history(websocket, msg, ctx):
     await websocket.send_json({"type": "history", "text": get_history_preview()})
@@ -3702,11 +6524,11 @@ async def handle_get_quickref(websocket, msg, ctx):
     await websocket.send_json({"type": "quickref", "text": get_quickref_preview()})
 
 async def handle_get_stats(websocket, msg, ctx):
-    bridge = await bg(check_bridge_health)
+    await health_get("bridge")
     await websocket.send_json({
         "type": "stats",
         "data": {"pi": await get_pi_stats(), "tmux": await bg(get_tmux_sessions), "time": time.strftime("%H:%M:%S"),
-                 "bridge": bridge.get("status", "offline")}
+                 "bridge": bridge_status()}
     })
 
 async def handle_get_logs(websocket, msg, ctx):
@@ -3719,6 +6541,34 @@ async def handle_get_cron(websocket, msg, ctx):
     jobs = await bg(get_cron_jobs)
     await websocket.send_json({"type": "cron", "jobs": jobs})
 
+async def handle_get_jobs(websocket, msg, ctx):
+    await websocket.send_json({"type": "jobs", "jobs": await bg(job_list)})
+
+async def handle_run_job(websocket, msg, ctx):
+    """Trigger manuale di un job dello scheduler (progresso via job_progress)."""
+    ip = websocket.client.host
+    name = msg.get("name", "")
+    if name not in JOB_DEFAULTS:
+        await websocket.send_json({"type": "toast", "text": "[!] Job sconosciuto"})
+        return
+    if not _rate_limit(ip, "run_job", 5, 60):
+        await websocket.send_json({"type": "toast", "text": "[!] Troppi tentativi"})
+        return
+    db_log_audit("job_run", actor=ip, resource=name)
+    await websocket.send_json({"type": "toast", "text": f"[..] {name} avviato"})
+    # Un job dura fino al suo timeout (30 min per deep_learn/self_evolve): gira in un task
+    # così il loop di ricezione del socket resta libero; l'esito arriva con job_progress
+    asyncio.create_task(_run_job_manual(name))
+
+async def _run_job_manual(name: str):
+    await run_job(name, "manual")
+    await manager.broadcast({"type": "jobs", "jobs": await bg(job_list)})
+
+async def handle_get_job_runs(websocket, msg, ctx):
+    name = msg.get("name", "")
+    runs = await bg(db_get_job_runs, name, 10)
+    await websocket.send_json({"type": "job_runs", "job": name, "runs": runs})
+
 async def handle_add_cron(websocket, msg, ctx):
     ip = websocket.client.host
     if not _rate_limit(ip, "cron", 10, 60):
@@ -3767,10 +6617,13 @@ async def handle_get_briefing(websocket, msg, ctx):
 
 async def handle_run_briefing(websocket, msg, ctx):
     await websocket.send_json({"type": "toast", "text": "[..] Generazione briefing…"})
-    bd = await bg(run_briefing)
-    await websocket.send_json({"type": "briefing", "data": bd})
-    await websocket.send_json({"type": "toast", "text": "[ok] Briefing generato con successo", "notify": True})
-    await broadcast_tamagotchi("PROUD", detail="Briefing", text="Briefing completato")
+    asyncio.create_task(_run_briefing_manual())
+
+async def _run_briefing_manual():
+    bd = await run_briefing()
+    await manager.broadcast({"type": "briefing", "data": bd})
+    await manager.broadcast({"type": "toast", "text": "[ok] Briefing generato con successo", "notify": True})
+    await bus.publish(SigilState("PROUD", detail="Briefing", text="Briefing completato"))
 
 async def handle_tmux_kill(websocket, msg, ctx):
     session = msg.get("session", "")
@@ -3876,31 +6729,24 @@ async def handle_deep_learn(websocket, msg, ctx):
         await websocket.send_json({"type": "toast", "text": "Deep Learn gia' eseguito di recente (max 1/h)"})
         return
     await websocket.send_json({"type": "toast", "text": "Deep Learn in corso... (1-2 minuti)"})
-    await broadcast_tamagotchi("THINKING")
-    try:
-        def _run():
-            r = subprocess.run(
-                ["python3.13", str(Path.home() / "deep_learn.py")],
-                capture_output=True, text=True, timeout=300
-            )
-            return (r.stdout + r.stderr).strip()
-        output = await bg(_run)
-        notes = db_get_notes(1)
+    await bus.publish(SigilState("THINKING"))
+    asyncio.create_task(_run_deep_learn_manual())
+
+async def _run_deep_learn_manual():
+    res = await run_job("deep_learn", "manual")
+    if res["ok"]:
+        notes = await bg(db_get_notes, 1)
         if notes and "#deep_learn" in (notes[0].get("tags") or ""):
             result_text = notes[0]["content"][:500]
         else:
-            result_text = output[-500:] if output else "Nessun output"
-        await websocket.send_json({"type": "deep_learn_result", "text": result_text})
-        await websocket.send_json({"type": "toast", "text": "Deep Learn completato"})
-        await broadcast_tamagotchi("PROUD", detail="Deep Learn", text="Apprendimento completato")
-    except subprocess.TimeoutExpired:
-        await websocket.send_json({"type": "deep_learn_result", "text": "Timeout (5 min)"})
-        await websocket.send_json({"type": "toast", "text": "Deep Learn: timeout"})
-        await broadcast_tamagotchi("ERROR")
-    except Exception as e:
-        await websocket.send_json({"type": "deep_learn_result", "text": f"Errore: {e}"})
-        await websocket.send_json({"type": "toast", "text": f"Deep Learn errore: {e}"})
-        await broadcast_tamagotchi("ERROR")
+            result_text = "Nessun output"
+        await manager.broadcast({"type": "deep_learn_result", "text": result_text})
+        await manager.broadcast({"type": "toast", "text": "Deep Learn completato"})
+        await bus.publish(SigilState("PROUD", detail="Deep Learn", text="Apprendimento completato"))
+    else:
+        await manager.broadcast({"type": "deep_learn_result", "text": f"Errore: {res['error']}"})
+        await manager.broadcast({"type": "toast", "text": f"Deep Learn: {res['error']}"})
+        await bus.publish(SigilState("ERROR"))
 
 async def handle_get_sigil_state(websocket, msg, ctx):
     await websocket.send_json({"type": "sigil_state", "state": _tamagotchi_state})
@@ -3970,6 +6816,7 @@ async def handle_get_analytics(websocket, msg, ctx):
             "latency": analytics.get("latency", []),
             "errors": analytics.get("errors", []),
             "failovers": failovers,
+            "loop": loop_stats(5),
         }
     })
 
@@ -3980,9 +6827,94 @@ async def handle_get_heatmap(websocket, msg, ctx):
     data = await bg(db_get_activity_heatmap, days)
     await websocket.send_json({"type": "heatmap", "data": data})
 
+# ─── Bootstrap (snapshot iniziale dashboard in un solo round trip) ───────────
+
+async def _bs_stats():
+    snap = await _get_stats_snapshot()
+    return {"type": "stats", "data": {"pi": snap["pi"], "tmux": snap["tmux"],
+                                      "time": time.strftime("%H:%M:%S"),
+                                      "bridge": bridge_status()}}
+
+async def _bs_sigil_state():
+    return {"type": "sigil_state", "state": _tamagotchi_state}
+
+async def _bs_briefing():
+    return {"type": "briefing", "data": await bg(get_briefing_data)}
+
+async def _bs_tokens():
+    return {"type": "tokens", "data": await bg(get_token_stats)}
+
+async def _bs_usage_report():
+    return {"type": "usage_report", "data": await bg(db_get_usage_report, "day")}
+
+async def _bs_cron():
+    return {"type": "cron", "jobs": await bg(get_cron_jobs)}
+
+async def _bs_jobs():
+    return {"type": "jobs", "jobs": await bg(job_list)}
+
+async def _bs_logs():
+    return {"type": "logs", "data": await bg(get_nanobot_logs, 80, "", "")}
+
+async def _bs_entities():
+    entities, relations = await asyncio.gather(bg(db_get_entities, ""), bg(db_get_relations))
+    return {"type": "knowledge_graph", "entities": entities, "relations": relations}
+
+async def _bs_chat_page():
+    return {"type": "chat_page", "before": 0, **await bg(db_get_chat_page, "dashboard", 0, 30)}
+
+async def _bs_saved_prompts():
+    return {"type": "saved_prompts", "prompts": await bg(db_get_saved_prompts)}
+
+_BOOTSTRAP_SECTIONS = {
+    "stats": _bs_stats,
+    "sigil_state": _bs_sigil_state,
+    "briefing": _bs_briefing,
+    "tokens": _bs_tokens,
+    "usage_report": _bs_usage_report,
+    "cron": _bs_cron,
+    "jobs": _bs_jobs,
+    "logs": _bs_logs,
+    "entities": _bs_entities,
+    "saved_prompts": _bs_saved_prompts,
+    "chat_page": _bs_chat_page,
+}
+# Above the fold (header + card Home): fonti locali/cache, spedite in un unico frame
+_BOOTSTRAP_CRITICAL = ("stats", "sigil_state", "briefing")
+
+async def handle_bootstrap(websocket, msg, ctx):
+    """Snapshot iniziale: tutte le sezioni partono in parallelo, le critical escono
+    insieme in un frame 'bootstrap', le altre in streaming appena pronte."""
+    t0 = time.time()
+    tasks = {name: asyncio.create_task(fn()) for name, fn in _BOOTSTRAP_SECTIONS.items()}
+    weather = WS_DISPATCHER.get("plugin_weather")
+    if weather:
+        # Il plugin invia da sé la propria risposta: gira in parallelo e basta
+        tasks["plugin_weather"] = asyncio.create_task(
+            weather(websocket, {"action": "plugin_weather"}, ctx))
+    critical = []
+    for name in _BOOTSTRAP_CRITICAL:
+        try:
+            critical.append(await tasks.pop(name))
+        except Exception as e:
+            print(f"[Bootstrap] {name}: {e}")
+    await websocket.send_json({"type": "bootstrap", "messages": critical})
+    for fut in asyncio.as_completed(list(tasks.values())):
+        try:
+            out = await fut
+        except Exception as e:
+            print(f"[Bootstrap] sezione fallita: {e}")
+            continue
+        if out:
+            await websocket.send_json(out)
+    await websocket.send_json({"type": "bootstrap_done",
+                               "ms": int((time.time() - t0) * 1000)})
+
 WS_DISPATCHER = {
+    "bootstrap": handle_bootstrap,
     "chat": handle_chat,
     "clear_chat": handle_clear_chat,
+    "chat_page": handle_chat_page,
     "check_ollama": handle_check_ollama,
     "get_memory": handle_get_memory,
     "get_history": handle_get_history,
@@ -3992,6 +6924,9 @@ WS_DISPATCHER = {
     "get_cron": handle_get_cron,
     "add_cron": handle_add_cron,
     "delete_cron": handle_delete_cron,
+    "get_jobs": handle_get_jobs,
+    "run_job": handle_run_job,
+    "get_job_runs": handle_get_job_runs,
     "get_tokens": handle_get_tokens,
     "get_usage_report": handle_get_usage_report,
     "get_crypto": handle_get_crypto,
@@ -4023,49 +6958,54 @@ WS_DISPATCHER = {
 # ─── Background broadcaster ───────────────────────────────────────────────────
 _PEEKING_THRESHOLD = 300   # secondi di idle prima di inviare PEEKING (5 min)
 _BORED_THRESHOLD   = 1800  # secondi di idle prima di inviare BORED (30 min)
-_bridge_status_cache = "offline"  # cache bridge check
+_stats_snapshot: dict = {"pi": None, "tmux": [], "ts": 0}
+STATS_SNAPSHOT_MAX_AGE = 10  # secondi: l'init WS riusa l'ultimo giro del broadcaster
+
+async def _get_stats_snapshot() -> dict:
+    """Ultime stats Pi+tmux. Ricalcola solo se lo snapshot è più vecchio di STATS_SNAPSHOT_MAX_AGE."""
+    if _stats_snapshot["pi"] and time.time() - _stats_snapshot["ts"] < STATS_SNAPSHOT_MAX_AGE:
+        return _stats_snapshot
+    pi, tmux = await asyncio.gather(get_pi_stats(), bg(get_tmux_sessions))
+    _stats_snapshot.update({"pi": pi, "tmux": tmux, "ts": time.time()})
+    return _stats_snapshot
 
 async def stats_broadcaster():
-    global _bridge_status_cache
     cycle = 0
     while True:
         await asyncio.sleep(5)
         cycle += 1
         if cycle % 60 == 0:
             _cleanup_expired()
-        # Bridge check ogni 30 cicli (150s) — non blocca ogni 5s
-        if cycle % 30 == 0:
-            try:
-                result = await bg(check_bridge_health)
-                _bridge_status_cache = result.get("status", "offline")
-            except Exception:
-                _bridge_status_cache = "offline"
+        if cycle % 12 == 0 and _sessions_flush_due():
+            # snapshot sul loop, solo la scrittura su file va nel thread
+            await bg(_write_sessions, _sessions_snapshot())
         # BORED/PEEKING trigger: ogni 60s controlla idle ESP32
         if cycle % 12 == 0 and _tamagotchi_connections:
             idle_secs = time.time() - get_last_chat_ts()
             if (idle_secs > _BORED_THRESHOLD
                     and _tamagotchi_state not in ("BORED", "ALERT", "WORKING", "THINKING", "SLEEPING")):
-                await broadcast_tamagotchi("BORED")
+                await bus.publish(SigilState("BORED"))
             elif (idle_secs > _PEEKING_THRESHOLD
                     and _tamagotchi_state not in ("PEEKING", "SLEEPING", "THINKING", "WORKING", "BORED")):
-                await broadcast_tamagotchi("PEEKING")
+                await bus.publish(SigilState("PEEKING"))
         if manager.connections:
             pi = await get_pi_stats()
             tmux = await bg(get_tmux_sessions)
+            _stats_snapshot.update({"pi": pi, "tmux": tmux, "ts": time.time()})
             await manager.broadcast({
                 "type": "stats",
                 "data": {
                     "pi": pi,
                     "tmux": tmux,
                     "time": time.strftime("%H:%M:%S"),
-                    "bridge": _bridge_status_cache,
+                    "bridge": bridge_status(),
                 }
             })
 
 # ─── Plugin Handler Registration ────────────────────────────────────────────
 def _load_plugin_handlers():
     """Carica handler.py dei plugin e li registra nel WS_DISPATCHER."""
-    for plugin in PLUGINS:
+    for plugin in get_plugins():
         plugin_id = plugin["id"]
         handler_path = Path(plugin["_path"]) / "handler.py"
         if not handler_path.exists():
@@ -4094,7 +7034,14 @@ def _load_plugin_handlers():
         except Exception as e:
             print(f"[Plugin] {plugin_id}: errore caricamento: {e}")
 
-_load_plugin_handlers()
+_plugin_handlers_loaded = False
+
+def _ensure_plugin_handlers():
+    """exec degli handler plugin rimandato alla prima connessione WS (non all'import)."""
+    global _plugin_handlers_loaded
+    if not _plugin_handlers_loaded:
+        _plugin_handlers_loaded = True
+        _load_plugin_handlers()
 
 @app.websocket("/ws")
 async def websocket_endpoint(websocket: WebSocket):
@@ -4102,23 +7049,22 @@ async def websocket_endpoint(websocket: WebSocket):
     if not _is_authenticated(token):
         await websocket.close(code=4001, reason="Non autenticato")
         return
+    _ensure_plugin_handlers()
     await manager.connect(websocket)
-    provider_map = {
-        "ollama": "ollama", "cloud": "anthropic", "deepseek": "openrouter",
-        "pc": "ollama_pc", "brain": "brain"
-    }
-    ctx = {k: db_load_chat_history(pid) for k, pid in provider_map.items()}
+    # Stato per-socket: solo flag. Le history chat sono nel ConversationStore condiviso.
+    ctx = {"_memory_enabled": False}
+    snapshot = await _get_stats_snapshot()
     await websocket.send_json({
         "type": "init",
         "data": {
-            "pi": await get_pi_stats(),
-            "tmux": await bg(get_tmux_sessions),
-            "version": get_nanobot_version(),
-            "memory": get_memory_preview(),
+            "pi": snapshot["pi"],
+            "tmux": snapshot["tmux"],
+            "version": await bg(get_nanobot_version),
+            "memory": await bg(get_memory_preview),
             "time": time.strftime("%H:%M:%S"),
         }
     })
-    await broadcast_tamagotchi("CURIOUS")
+    await bus.publish(SigilState("CURIOUS"))
     try:
         while True:
             msg = await websocket.receive_json()
@@ -4140,17 +7086,17 @@ async def auth_login(request: Request):
     if not PIN_FILE.exists():
         if len(pin) != 4 or not pin.isdigit():
             return JSONResponse({"error": "Il PIN deve essere 4 cifre"}, status_code=400)
-        _set_pin(pin)
+        await bg(_set_pin, pin)  # PBKDF2: ~200ms di CPU, fuori dal loop
         token = _create_session()
         resp = JSONResponse({"ok": True, "setup": True})
         is_secure = request.url.scheme == "https"
         resp.set_cookie("vessel_session", token, max_age=SESSION_TIMEOUT,
                         httponly=True, samesite="lax", secure=is_secure)
         return resp
-    if not _verify_pin(pin):
+    if not await bg(_verify_pin, pin):
         db_log_audit("login_fail", actor=ip)
         return JSONResponse({"error": "PIN errato"}, status_code=401)
-    RATE_LIMITS.pop(f"{ip}:auth", None)
+    RATE_LIMITS.reset(f"{ip}:auth")
     token = _create_session()
     db_log_audit("login", actor=ip)
     resp = JSONResponse({"ok": True})
@@ -4162,9 +7108,7 @@ async def auth_login(request: Request):
 @app.post("/auth/logout")
 async def auth_logout(request: Request):
     token = request.cookies.get("vessel_session", "")
-    if token in SESSIONS:
-        del SESSIONS[token]
-        _save_sessions()
+    _revoke_session(token)
     db_log_audit("logout", actor=request.client.host)
     resp = JSONResponse({"ok": True})
     is_secure = request.url.scheme == "https"
@@ -4182,31 +7126,46 @@ async def auth_check(request: Request):
 async def root(request: Request):
     token = request.cookies.get("vessel_session", "")
     if _is_authenticated(token):
-        return HTML
-    return LOGIN_HTML
+        entry = page_asset("html", HTML, "text/html")
+    else:
+        entry = page_asset("login", LOGIN_HTML, "text/html")
+    return serve_asset(request, entry, PAGE_CACHE_CONTROL, vary="Accept-Encoding, Cookie")
 
-@app.get("/manifest.json")
-async def manifest():
-    return {
-        "name": "Vessel Dashboard",
-        "short_name": "Vessel",
-        "description": "Vessel — AI Dashboard for Raspberry Pi",
-        "start_url": "/",
-        "display": "standalone",
-        "orientation": "any",
-        "background_color": "#060a06",
-        "theme_color": "#060a06",
-        "categories": ["utilities", "productivity"],
-        "icons": [
-            {"src": VESSEL_ICON, "sizes": "64x64", "type": "image/jpeg"},
-            {"src": VESSEL_ICON_192, "sizes": "192x192", "type": "image/jpeg"}
-        ]
-    }
+@app.get("/static/{name}")
+async def static_bundle(request: Request, name: str):
+    """Bundle CSS/JS content-hashed: cache immutabile, 304 su If-None-Match."""
+    if not _is_authenticated(request.cookies.get("vessel_session", "")):
+        return JSONResponse({"error": "Non autenticato"}, status_code=401)
+    entry = STATIC_ASSETS.get(name)
+    if entry is None:
+        return JSONResponse({"error": "Not found"}, status_code=404)
+    return serve_asset(request, entry, STATIC_CACHE_CONTROL)
+
+MANIFEST = {
+    "name": "Vessel Dashboard",
+    "short_name": "Vessel",
+    "description": "Vessel — AI Dashboard for Raspberry Pi",
+    "start_url": "/",
+    "display": "standalone",
+    "orientation": "any",
+    "background_color": "#060a06",
+    "theme_color": "#060a06",
+    "categories": ["utilities", "productivity"],
+    "icons": [
+        {"src": VESSEL_ICON, "sizes": "64x64", "type": "image/jpeg"},
+        {"src": VESSEL_ICON_192, "sizes": "192x192", "type": "image/jpeg"}
+    ]
+}
 
-@app.get("/sw.js")
-async def service_worker():
-    sw_code = """
-const CACHE = 'vessel-v4';
+@app.get("/manifest.json")
+async def manifest(request: Request):
+    entry = page_asset("manifest", json.dumps(MANIFEST, ensure_ascii=False), "application/manifest+json")
+    return serve_asset(request, entry, PAGE_CACHE_CONTROL)
+
+# Navigazioni: network-first con fallback offline. Bundle /static/: cache-first
+# (sono immutabili); quando arriva un hash nuovo si eliminano le versioni vecchie.
+SW_CODE = """
+const CACHE = 'vessel-v5';
 const OFFLINE_URL = '/';
 
 self.addEventListener('install', e => {
@@ -4222,6 +7181,7 @@ self.addEventListener('activate', e => {
 });
 
 self.addEventListener('fetch', e => {
+  const url = new URL(e.request.url);
   if (e.request.mode === 'navigate') {
     e.respondWith(
       fetch(e.request).then(r => {
@@ -4230,31 +7190,49 @@ self.addEventListener('fetch', e => {
         return r;
       }).catch(() => caches.match(OFFLINE_URL))
     );
+  } else if (url.origin === location.origin && url.pathname.startsWith('/static/')) {
+    e.respondWith(caches.open(CACHE).then(c => c.match(e.request).then(hit => hit ||
+      fetch(e.request).then(r => {
+        if (r.ok) {
+          const prefix = url.pathname.split('.')[0] + '.';
+          c.keys().then(keys => keys.forEach(k => {
+            const p = new URL(k.url).pathname;
+            if (p.startsWith(prefix) && p !== url.pathname) c.delete(k);
+          }));
+          c.put(e.request, r.clone());
+        }
+        return r;
+      })
+    )));
   }
 });
 """
-    return Response(content=sw_code, media_type="application/javascript",
-                    headers={"Service-Worker-Allowed": "/"})
+
+@app.get("/sw.js")
+async def service_worker(request: Request):
+    resp = serve_asset(request, page_asset("sw", SW_CODE, "application/javascript"), PAGE_CACHE_CONTROL)
+    resp.headers["Service-Worker-Allowed"] = "/"
+    return resp
 
 # ─── API endpoints ───────────────────────────────────────────────────────────
 @app.get("/api/health")
 async def api_health():
     pi = await get_pi_stats()
-    ollama = await bg(check_ollama_health)
-    bridge = await bg(check_bridge_health)
+    ollama, _ = await asyncio.gather(health_get("ollama"), health_get("bridge"))
     return {
         "status": "ok",
         "timestamp": time.time(),
         "services": {
             "pi": pi["health"],
-            "ollama": "online" if ollama else "offline",
-            "bridge": bridge.get("status", "offline")
+            "ollama": "online" if ollama["ok"] else "offline",
+            "bridge": bridge_status()
         },
         "details": {
             "pi_temp": pi.get("temp_val"),
             "pi_cpu": pi.get("cpu_val"),
             "pi_mem": pi.get("mem_pct")
-        }
+        },
+        "checks": health_report()
     }
 
 @app.get("/api/plugins")
@@ -4264,7 +7242,7 @@ async def api_plugins(request: Request):
     if not _is_authenticated(token):
         return JSONResponse({"error": "Non autenticato"}, status_code=401)
     result = []
-    for plugin in PLUGINS:
+    for plugin in get_plugins():
         p_path = Path(plugin["_path"])
         entry = {"id": plugin["id"], "title": plugin["title"], "icon": plugin["icon"],
                  "tab_label": plugin["tab_label"], "actions": plugin.get("actions", "load"),
@@ -4320,6 +7298,167 @@ async def api_events_stats(request: Request, since: str = ""):
         return JSONResponse({"error": "Non autenticato"}, status_code=401)
     return db_get_event_stats(since=since)
 
+@app.get("/api/cache/stats")
+async def api_cache_stats(request: Request):
+    """Contatori hit/miss/stale delle cache di servizio (@cached)."""
+    token = request.cookies.get("vessel_session", "")
+    if not _is_authenticated(token):
+        return JSONResponse({"error": "Non autenticato"}, status_code=401)
+    return cache_stats()
+
+@app.get("/api/http/stats")
+async def api_http_stats(request: Request):
+    """Fetch esterni per fonte: latenza, 304, stale, errori (services/fetch.py)."""
+    token = request.cookies.get("vessel_session", "")
+    if not _is_authenticated(token):
+        return JSONResponse({"error": "Non autenticato"}, status_code=401)
+    return http_fetch_stats()
+
+@app.get("/api/debug/loop")
+async def api_debug_loop(request: Request, top: int = 10):
+    """Lag dell'event loop e chiamate che l'hanno bloccato di più (services/debug.py)."""
+    token = request.cookies.get("vessel_session", "")
+    if not _is_authenticated(token):
+        return JSONResponse({"error": "Non autenticato"}, status_code=401)
+    return loop_stats(min(max(top, 1), 50))
+
+@app.get("/metrics")
+async def metrics(request: Request):
+    """Metriche in-process in formato OpenMetrics (services/metrics.py) per lo scrape Prometheus."""
+    # Niente fiducia in localhost: dietro cloudflared ogni richiesta arriva da 127.0.0.1
+    auth = request.headers.get("authorization", "")
+    allowed = bool(METRICS_TOKEN) and secrets.compare_digest(auth, f"Bearer {METRICS_TOKEN}")
+    if not allowed and not _is_authenticated(request.cookies.get("vessel_session", "")):
+        return JSONResponse({"error": "Non autenticato"}, status_code=401)
+    return Response(metrics_render(), media_type="application/openmetrics-text; version=1.0.0; charset=utf-8")
+
+@app.post("/api/debug/profile")
+async def api_debug_profile_run(request: Request):
+    """Profilo CPU a campionamento di N secondi su tutti i thread (services/debug.py)."""
+    token = request.cookies.get("vessel_session", "")
+    if not _is_authenticated(token):
+        return JSONResponse({"error": "Non autenticato"}, status_code=401)
+    ip = request.client.host if request.client else "unknown"
+    if not _rate_limit(ip, "debug_profile", 6, 600):
+        return JSONResponse({"error": "Troppi profili, riprova più tardi"}, status_code=429)
+    if _profile_state["running"]:
+        return JSONResponse({"error": "Profilo già in corso"}, status_code=409)
+    try:
+        body = await request.json()
+        seconds = float(body.get("seconds", 10))
+        interval_ms = float(body.get("interval_ms", PROFILE_INTERVAL * 1000))
+    except (ValueError, TypeError, AttributeError):
+        return JSONResponse({"error": "Parametri non validi"}, status_code=400)
+    if not 1 <= seconds <= PROFILE_MAX_S or not 2 <= interval_ms <= 100:
+        return JSONResponse({"error": f"seconds 1..{PROFILE_MAX_S}, interval_ms 2..100"}, status_code=400)
+    db_log_audit("debug_profile", actor=ip, resource=f"{seconds:g}s")
+    try:
+        result = await cpu_profile(seconds, interval_ms / 1000)
+    except RuntimeError as e:
+        return JSONResponse({"error": str(e)}, status_code=409)
+    return {k: v for k, v in result.items() if k != "collapsed"}
+
+@app.get("/api/debug/profile")
+async def api_debug_profile(request: Request, format: str = "json"):
+    """Ultimo profilo CPU; format=collapsed → stack "collapsed" per flamegraph.pl/speedscope."""
+    token = request.cookies.get("vessel_session", "")
+    if not _is_authenticated(token):
+        return JSONResponse({"error": "Non autenticato"}, status_code=401)
+    last = _profile_state["last"]
+    if not last:
+        return JSONResponse({"error": "Nessun profilo catturato"}, status_code=404)
+    if format == "collapsed":
+        name = "vessel-cpu-" + last["ts"].replace(":", "").replace("-", "") + ".folded"
+        return Response(last["collapsed"], media_type="text/plain; charset=utf-8",
+                        headers={"Content-Disposition": f'attachment; filename="{name}"'})
+    return {**{k: v for k, v in last.items() if k != "collapsed"}, "running": _profile_state["running"]}
+
+@app.get("/api/debug/memory")
+async def api_debug_memory(request: Request):
+    """RSS, stato tracemalloc e dimensione delle strutture longeve."""
+    token = request.cookies.get("vessel_session", "")
+    if not _is_authenticated(token):
+        return JSONResponse({"error": "Non autenticato"}, status_code=401)
+    return {**mem_trace_status(), **await bg(mem_suspects)}
+
+@app.post("/api/debug/memory")
+async def api_debug_memory_action(request: Request):
+    """tracemalloc: action=start (baseline) | diff (top punti cresciuti) | stop."""
+    token = request.cookies.get("vessel_session", "")
+    if not _is_authenticated(token):
+        return JSONResponse({"error": "Non autenticato"}, status_code=401)
+    ip = request.client.host if request.client else "unknown"
+    if not _rate_limit(ip, "debug_memory", 20, 600):
+        return JSONResponse({"error": "Troppe richieste, riprova più tardi"}, status_code=429)
+    try:
+        body = await request.json()
+        action = str(body.get("action", ""))
+        top = min(max(int(body.get("top", 20)), 1), 100)
+        frames = int(body.get("frames", MEM_TRACE_FRAMES))
+    except (ValueError, TypeError, AttributeError):
+        return JSONResponse({"error": "Parametri non validi"}, status_code=400)
+    group = "traceback" if body.get("group") == "traceback" else "lineno"
+    if action == "start":
+        db_log_audit("debug_memory_start", actor=ip)
+        return await mem_trace_begin(frames)
+    if action == "stop":
+        return mem_trace_stop()
+    if action == "diff":
+        try:
+            return await bg(mem_trace_diff, top, group, bool(body.get("rebase", False)))
+        except RuntimeError as e:
+            return JSONResponse({"error": str(e)}, status_code=409)
+    return JSONResponse({"error": "action: start | diff | stop"}, status_code=400)
+
+@app.get("/api/bench/runs")
+async def api_bench_runs(request: Request, provider: str = "", limit: int = 20):
+    """Storico benchmark provider (services/bench.py), dal più recente."""
+    token = request.cookies.get("vessel_session", "")
+    if not _is_authenticated(token):
+        return JSONResponse({"error": "Non autenticato"}, status_code=401)
+    return {"runs": await bg(db_get_bench_runs, provider, min(max(limit, 1), 100)),
+            "running": _bench_running}
+
+@app.post("/api/bench/run")
+async def api_bench_run(request: Request):
+    """Avvia un benchmark in background; il risultato arriva via WS (bench_result) e in /api/bench/runs."""
+    token = request.cookies.get("vessel_session", "")
+    if not _is_authenticated(token):
+        return JSONResponse({"error": "Non autenticato"}, status_code=401)
+    ip = request.client.host if request.client else "unknown"
+    if not _rate_limit(ip, "bench", 3, 600):
+        return JSONResponse({"error": "Troppi benchmark, riprova più tardi"}, status_code=429)
+    if _bench_running:
+        return JSONResponse({"error": "Benchmark già in corso"}, status_code=409)
+    try:
+        body = await request.json()
+        provider_id = str(body.get("provider", "ollama"))
+        concurrency = tuple(int(c) for c in body.get("concurrency", [1, 2, 4]))
+        rounds = int(body.get("rounds", 1))
+    except (ValueError, TypeError, AttributeError):
+        return JSONResponse({"error": "Parametri non validi"}, status_code=400)
+    endpoint = str(body.get("endpoint", ""))
+    if provider_id not in BENCH_PROVIDERS:
+        return JSONResponse({"error": "Provider sconosciuto"}, status_code=400)
+    if not concurrency or not all(1 <= c <= 16 for c in concurrency) or not 1 <= rounds <= 5:
+        return JSONResponse({"error": "concurrency 1..16, rounds 1..5"}, status_code=400)
+    if endpoint and not re.match(r"^https?://[\w.\-]+(:\d+)?/?$", endpoint):
+        return JSONResponse({"error": "endpoint non valido"}, status_code=400)
+    db_log_audit("bench_run", actor=ip, resource=provider_id)
+
+    async def _run():
+        async def _progress(c, level):
+            await manager.broadcast({"type": "bench_progress", "concurrency": c, "level": level})
+        try:
+            run = await bench_run(provider_id, str(body.get("model", ""))[:80], concurrency, rounds,
+                                  endpoint=endpoint, memory=bool(body.get("memory", True)),
+                                  label=str(body.get("label", ""))[:40], on_progress=_progress)
+            await manager.broadcast({"type": "bench_result", "run": run})
+        except Exception as e:
+            await manager.broadcast({"type": "bench_result", "error": str(e)[:200]})
+    asyncio.create_task(_run())
+    return {"started": True}
+
 @app.get("/api/chat/history")
 async def api_chat_history(request: Request, channel: str = "dashboard",
                            provider: str = "", date: str = "today", limit: int = 50):
@@ -4408,6 +7547,8 @@ async def export_data(request: Request):
     }
     return Response(zip_buffer.getvalue(), headers=headers, media_type="application/x-zip-compressed")
 
+_boot_mark("routes")
+
 
 # --- src/backend/main.py ---
 if __name__ == "__main__":
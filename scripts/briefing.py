@@ -14,12 +14,15 @@ Configuration via environment variables:
   NANOBOT_DIR       Base config directory (default: ~/.nanobot)
   GOOGLE_HELPER     Path to google_helper.py (default: ~/scripts/google_helper.py)
   GOOGLE_PYTHON     Python binary for Google scripts (default: python3)
+  GOOGLE_HELPER_SOCKET  google_helper worker socket (default: ~/.nanobot/google_helper.sock)
 """
 import urllib.request
 import xml.etree.ElementTree as ET
 import json
 import os
+import socket
 import subprocess
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from pathlib import Path
 
@@ -41,12 +44,26 @@ NANOBOT_DIR = Path(os.environ.get("NANOBOT_DIR", str(Path.home() / ".nanobot")))
 BRIEFING_LOG = NANOBOT_DIR / "briefing_log.jsonl"
 GOOGLE_HELPER = Path(os.environ.get("GOOGLE_HELPER", str(Path.home() / "scripts" / "google_helper.py")))
 GOOGLE_PYTHON = os.environ.get("GOOGLE_PYTHON", "python3")
+GOOGLE_SOCKET = Path(os.environ.get("GOOGLE_HELPER_SOCKET", str(Path.home() / ".nanobot" / "google_helper.sock")))
+
+
+def _fetch_url(url, timeout=10):
+    """Plain GET. When run as a Vessel job this is replaced by the server's
+    http_fetch (conditional requests, on-disk cache, per-host limit)."""
+    try:
+        with urllib.request.urlopen(url, timeout=timeout) as r:
+            return r.read()
+    except Exception as e:
+        print(f"Fetch error {url[:60]}: {e}")
+        return None
 
 
 def fetch_hn_stories():
+    data = _fetch_url(HNRSS_URL)
+    if not data:
+        return []
     try:
-        with urllib.request.urlopen(HNRSS_URL, timeout=10) as r:
-            root = ET.fromstring(r.read())
+        root = ET.fromstring(data)
         stories = []
         for item in root.findall('.//item')[:5]:
             t = item.find('title')
@@ -60,9 +77,11 @@ def fetch_hn_stories():
 
 
 def fetch_weather():
+    data = _fetch_url(WEATHER_URL)
+    if not data:
+        return "Weather unavailable"
     try:
-        with urllib.request.urlopen(WEATHER_URL, timeout=10) as r:
-            data = json.loads(r.read())
+        data = json.loads(data)
         temp = data['current']['temperature_2m']
         code = data['current']['weathercode']
         codes = {
@@ -91,8 +110,37 @@ def send_to_discord(message):
         print(f"Discord error: {e}")
 
 
+def _google_rpc(args: list) -> str | None:
+    """Ask the google_helper worker (Unix socket, warm credentials).
+    Returns None when no worker is running, so callers fall back to subprocess."""
+    try:
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as s:
+            s.settimeout(15)
+            s.connect(str(GOOGLE_SOCKET))
+            s.sendall((json.dumps({"jsonrpc": "2.0", "id": 1, "method": "call",
+                                   "params": {"argv": args}}) + "\n").encode("utf-8"))
+            buf = b""
+            while not buf.endswith(b"\n"):
+                chunk = s.recv(65536)
+                if not chunk:
+                    break
+                buf += chunk
+        resp = json.loads(buf)
+    except (OSError, ValueError):
+        return None
+    if "error" in resp:
+        return None
+    return resp.get("result", {}).get("output", "").strip() or None
+
+
 def fetch_calendar_events(period="today"):
     """Call google_helper.py to get calendar events (requires Google OAuth setup)."""
+    out = _google_rpc(["calendar", period, "--json"])
+    if out is not None:
+        try:
+            return json.loads(out).get("events", [])
+        except ValueError:
+            pass
     if not GOOGLE_HELPER.exists():
         return []
     try:
@@ -124,10 +172,14 @@ def save_to_log(briefing_text, weather, stories, events_today=None, events_tomor
 
 def main():
     print("Generating morning briefing...")
-    stories = fetch_hn_stories()
-    weather = fetch_weather()
-    events_today = fetch_calendar_events("today")
-    events_tomorrow = fetch_calendar_events("tomorrow")
+    # Independent sources: fetch in parallel
+    with ThreadPoolExecutor(max_workers=4) as pool:
+        f_stories = pool.submit(fetch_hn_stories)
+        f_weather = pool.submit(fetch_weather)
+        f_today = pool.submit(fetch_calendar_events, "today")
+        f_tomorrow = pool.submit(fetch_calendar_events, "tomorrow")
+        stories, weather = f_stories.result(), f_weather.result()
+        events_today, events_tomorrow = f_today.result(), f_tomorrow.result()
     now = datetime.now()
 
     lines = [
@@ -7,6 +7,12 @@ Usage:
   python3 google_helper.py calendar add "title" "2026-02-21T10:00" "2026-02-21T11:00"
   python3 google_helper.py tasks [list|add "title"|done TASK_ID]
   python3 google_helper.py gmail [recent N|unread]
+  python3 google_helper.py serve [--socket PATH] [--stub]
+  python3 google_helper.py rpc <command...>
+
+`serve` keeps a long-lived worker behind a Unix socket (newline-delimited
+JSON-RPC 2.0): credentials and API clients stay warm and read-only commands
+are cached for a few seconds. `rpc` sends one command to a running worker.
 
 Requires Google OAuth credentials. See docs/GOOGLE_WORKSPACE.md for setup.
 
@@ -15,17 +21,29 @@ Environment variables:
   GOOGLE_CREDS_PATH   Path to client credentials (default: ~/.config/google-workspace-mcp/credentials.json)
   GOOGLE_USER_EMAIL   Google account email (used to find token file)
   CALENDAR_TIMEZONE   Timezone for calendar events (default: Europe/Rome)
+  GOOGLE_HELPER_SOCKET  Worker socket (default: ~/.nanobot/google_helper.sock)
+  GOOGLE_HELPER_STUB  1 = in-memory stub backend, no Google libraries (tests)
 """
 import sys, json, os
+import signal
+import socket
+import socketserver
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
-from google.oauth2.credentials import Credentials
-from google.auth.transport.requests import Request
-from googleapiclient.discovery import build
 
 GOOGLE_EMAIL = os.environ.get("GOOGLE_USER_EMAIL", "")
 CREDS_PATH = os.environ.get("GOOGLE_CREDS_PATH",
     os.path.expanduser("~/.config/google-workspace-mcp/credentials.json"))
 CALENDAR_TZ = os.environ.get("CALENDAR_TIMEZONE", "Europe/Rome")
+SOCKET_PATH = os.environ.get("GOOGLE_HELPER_SOCKET",
+    os.path.expanduser("~/.nanobot/google_helper.sock"))
+WORKERS = 4  # chiamate Google in parallelo nel worker
+
+# TTL (secondi) per i comandi di sola lettura; le scritture invalidano il gruppo
+CACHE_TTL = {"calendar": 60, "tasks": 30, "gmail": 30}
+WRITE_COMMANDS = {("calendar", "add"), ("tasks", "add"), ("tasks", "done")}
 
 # Token path: explicit env var > email-based default > error
 if os.environ.get("GOOGLE_TOKEN_PATH"):
@@ -38,32 +56,152 @@ else:
     _tokens = [f for f in os.listdir(_token_dir) if f.endswith(".json")] if os.path.isdir(_token_dir) else []
     TOKEN_PATH = os.path.join(_token_dir, _tokens[0]) if _tokens else ""
 
-def get_creds():
-    with open(TOKEN_PATH) as f:
-        data = json.load(f)
-    creds = Credentials(
-        token=data.get("token"),
-        refresh_token=data.get("refresh_token"),
-        token_uri=data.get("token_uri"),
-        client_id=data.get("client_id"),
-        client_secret=data.get("client_secret"),
-        scopes=data.get("scopes"),
-    )
-    if creds.expired and creds.refresh_token:
-        creds.refresh(Request())
-        # Save refreshed token
+
+# --- BACKENDS ---
+class GoogleBackend:
+    """Google API reali. Le librerie si importano al primo uso; le credenziali
+    restano in memoria e si rinfrescano solo alla scadenza. I client API
+    (httplib2, non thread-safe) sono uno per thread."""
+
+    def __init__(self):
+        self._creds = None
+        self._lock = threading.Lock()
+        self._local = threading.local()
+
+    def creds(self):
+        from google.auth.transport.requests import Request
+        with self._lock:
+            if self._creds is None:
+                self._creds = self._load_creds()
+            if self._creds.expired and self._creds.refresh_token:
+                self._creds.refresh(Request())
+                self._save_token(self._creds)
+            return self._creds
+
+    @staticmethod
+    def _load_creds():
+        from google.oauth2.credentials import Credentials
+        with open(TOKEN_PATH) as f:
+            data = json.load(f)
+        return Credentials(
+            token=data.get("token"),
+            refresh_token=data.get("refresh_token"),
+            token_uri=data.get("token_uri"),
+            client_id=data.get("client_id"),
+            client_secret=data.get("client_secret"),
+            scopes=data.get("scopes"),
+        )
+
+    @staticmethod
+    def _save_token(creds):
+        with open(TOKEN_PATH) as f:
+            data = json.load(f)
         data["token"] = creds.token
         if creds.expiry:
             data["expiry"] = creds.expiry.isoformat()
         with open(TOKEN_PATH, "w") as f:
             json.dump(data, f, indent=2)
-    return creds
+
+    def service(self, name, version):
+        from googleapiclient.discovery import build
+        services = getattr(self._local, "services", None)
+        if services is None:
+            services = self._local.services = {}
+        creds = self.creds()  # refresh (se scadute) prima di ogni uso
+        svc = services.get(name)
+        if svc is None:
+            svc = services[name] = build(name, version, credentials=creds, cache_discovery=False)
+        return svc
+
+    def calendar_list(self, t_min, t_max):
+        result = self.service("calendar", "v3").events().list(
+            calendarId="primary", timeMin=t_min, timeMax=t_max,
+            maxResults=20, singleEvents=True, orderBy="startTime"
+        ).execute()
+        return result.get("items", [])
+
+    def calendar_insert(self, event):
+        return self.service("calendar", "v3").events().insert(calendarId="primary", body=event).execute()
+
+    def tasklists(self):
+        return self.service("tasks", "v1").tasklists().list().execute().get("items", [])
+
+    def tasks(self, tasklist_id):
+        return self.service("tasks", "v1").tasks().list(
+            tasklist=tasklist_id, showCompleted=False).execute().get("items", [])
+
+    def task_insert(self, tasklist_id, title):
+        return self.service("tasks", "v1").tasks().insert(tasklist=tasklist_id, body={"title": title}).execute()
+
+    def task_complete(self, tasklist_id, task_id):
+        self.service("tasks", "v1").tasks().patch(
+            tasklist=tasklist_id, task=task_id, body={"status": "completed"}
+        ).execute()
+
+    def gmail_headers(self, query, count, names):
+        service = self.service("gmail", "v1")
+        result = service.users().messages().list(userId="me", maxResults=count, q=query).execute()
+        out = []
+        for msg in result.get("messages", []):
+            detail = service.users().messages().get(userId="me", id=msg["id"], format="metadata",
+                metadataHeaders=names).execute()
+            out.append({h["name"]: h["value"] for h in detail.get("payload", {}).get("headers", [])})
+        return out
+
+
+class StubBackend:
+    """Backend in memoria con la stessa interfaccia: niente rete né librerie
+    Google. Per test e sviluppo (GOOGLE_HELPER_STUB=1 o `serve --stub`)."""
+
+    def __init__(self):
+        today = datetime.now().replace(hour=0, minute=0, second=0, microsecond=0)
+        self._events = [
+            {"summary": "Stand-up", "start": {"dateTime": (today + timedelta(hours=9, minutes=30)).isoformat()},
+             "end": {"dateTime": (today + timedelta(hours=10)).isoformat()}},
+            {"summary": "Dentista", "location": "Via Roma 1",
+             "start": {"dateTime": (today + timedelta(days=1, hours=15)).isoformat()},
+             "end": {"dateTime": (today + timedelta(days=1, hours=16)).isoformat()}},
+        ]
+        self._tasks = {"stub": [{"id": "t1", "title": "Comprare il pane", "due": ""}]}
+        self._mail = [{"From": "Stub <stub@example.com>", "Subject": "Benvenuto", "Date": "Mon, 1 Jan 2026 08:00"}]
+        self._lock = threading.Lock()
+
+    def calendar_list(self, t_min, t_max):
+        lo, hi = t_min.rstrip("Z"), t_max.rstrip("Z")
+        return [e for e in self._events if lo <= e["start"]["dateTime"] < hi]
+
+    def calendar_insert(self, event):
+        with self._lock:
+            created = dict(event, id=f"e{len(self._events) + 1}")
+            self._events.append(created)
+        return created
+
+    def tasklists(self):
+        return [{"id": "stub", "title": "Stub"}]
+
+    def tasks(self, tasklist_id):
+        return list(self._tasks.get(tasklist_id, []))
+
+    def task_insert(self, tasklist_id, title):
+        with self._lock:
+            task = {"id": f"t{sum(len(v) for v in self._tasks.values()) + 1}", "title": title}
+            self._tasks.setdefault(tasklist_id, []).append(task)
+        return task
+
+    def task_complete(self, tasklist_id, task_id):
+        with self._lock:
+            self._tasks[tasklist_id] = [t for t in self._tasks.get(tasklist_id, []) if t["id"] != task_id]
+
+    def gmail_headers(self, query, count, names):
+        return [{k: v for k, v in m.items() if k in names} for m in self._mail[:count]]
+
+
+BACKEND = StubBackend() if os.environ.get("GOOGLE_HELPER_STUB") == "1" else GoogleBackend()
+
 
 # --- CALENDAR ---
 def _fetch_calendar_events(period="today"):
     """Fetch eventi calendario e ritorna (lista_dict, label)."""
-    creds = get_creds()
-    service = build("calendar", "v3", credentials=creds)
     now = datetime.now()
     if period == "today":
         t_min = now.replace(hour=0, minute=0, second=0).isoformat() + "Z"
@@ -81,12 +219,8 @@ def _fetch_calendar_events(period="today"):
     else:
         return [], period
 
-    result = service.events().list(
-        calendarId="primary", timeMin=t_min, timeMax=t_max,
-        maxResults=20, singleEvents=True, orderBy="startTime"
-    ).execute()
     events = []
-    for e in result.get("items", []):
+    for e in BACKEND.calendar_list(t_min, t_max):
         start_raw = e["start"].get("dateTime", e["start"].get("date", ""))
         end_raw = e["end"].get("dateTime", e["end"].get("date", ""))
         time_str = start_raw[11:16] if "T" in start_raw else "all day"
@@ -103,145 +237,292 @@ def calendar_events(period="today"):
     """Output human-readable degli eventi calendario."""
     events, label = _fetch_calendar_events(period)
     if not events:
-        print(f"No events {label}.")
-        return
-    print(f"Events {label} ({len(events)}):")
+        return f"No events {label}."
+    lines = [f"Events {label} ({len(events)}):"]
     for e in events:
         loc = f" @ {e['location']}" if e.get("location") else ""
-        print(f"  {e['time']} - {e['summary']}{loc}")
+        lines.append(f"  {e['time']} - {e['summary']}{loc}")
+    return "\n".join(lines)
 
 def calendar_events_json(period="today"):
     """Output JSON strutturato degli eventi calendario."""
     events, label = _fetch_calendar_events(period)
-    print(json.dumps({"events": events, "label": label, "period": period}, ensure_ascii=False))
+    return json.dumps({"events": events, "label": label, "period": period}, ensure_ascii=False)
 
 def calendar_add(title, start, end):
-    creds = get_creds()
-    service = build("calendar", "v3", credentials=creds)
     event = {
         "summary": title,
         "start": {"dateTime": start, "timeZone": CALENDAR_TZ},
         "end": {"dateTime": end, "timeZone": CALENDAR_TZ},
     }
-    created = service.events().insert(calendarId="primary", body=event).execute()
-    print(f"Event created: {created.get('summary')} ({created.get('start', {}).get('dateTime', '')})")
-    print(f"ID: {created['id']}")
+    created = BACKEND.calendar_insert(event)
+    return (f"Event created: {created.get('summary')} ({created.get('start', {}).get('dateTime', '')})\n"
+            f"ID: {created['id']}")
 
 # --- TASKS ---
+def _first_tasklist():
+    lists = BACKEND.tasklists()
+    return lists[0]["id"] if lists else None
+
 def tasks_list():
-    creds = get_creds()
-    service = build("tasks", "v1", credentials=creds)
-    lists = service.tasklists().list().execute().get("items", [])
-    for tl in lists:
-        print(f"Lista: {tl['title']} (ID: {tl['id']})")
-        tasks = service.tasks().list(tasklist=tl["id"], showCompleted=False).execute().get("items", [])
+    lines = []
+    for tl in BACKEND.tasklists():
+        lines.append(f"Lista: {tl['title']} (ID: {tl['id']})")
+        tasks = BACKEND.tasks(tl["id"])
         if not tasks:
-            print("  (empty)")
+            lines.append("  (empty)")
         for t in tasks:
             due = t.get("due", "")[:10] if t.get("due") else ""
             due_str = f" [due: {due}]" if due else ""
-            print(f"  - {t['title']}{due_str} (ID: {t['id']})")
+            lines.append(f"  - {t['title']}{due_str} (ID: {t['id']})")
+    return "\n".join(lines)
 
 def tasks_add(title, tasklist_id=None):
-    creds = get_creds()
-    service = build("tasks", "v1", credentials=creds)
-    if not tasklist_id:
-        lists = service.tasklists().list().execute().get("items", [])
-        tasklist_id = lists[0]["id"] if lists else None
+    tasklist_id = tasklist_id or _first_tasklist()
     if not tasklist_id:
-        print("Error: no task list found")
-        return
-    task = service.tasks().insert(tasklist=tasklist_id, body={"title": title}).execute()
-    print(f"Task created: {task['title']} (ID: {task['id']})")
+        return "Error: no task list found"
+    task = BACKEND.task_insert(tasklist_id, title)
+    return f"Task created: {task['title']} (ID: {task['id']})"
 
 def tasks_done(task_id, tasklist_id=None):
-    creds = get_creds()
-    service = build("tasks", "v1", credentials=creds)
-    if not tasklist_id:
-        lists = service.tasklists().list().execute().get("items", [])
-        tasklist_id = lists[0]["id"] if lists else None
-    service.tasks().patch(
-        tasklist=tasklist_id, task=task_id, body={"status": "completed"}
-    ).execute()
-    print(f"Task {task_id} completed.")
+    BACKEND.task_complete(tasklist_id or _first_tasklist(), task_id)
+    return f"Task {task_id} completed."
 
 # --- GMAIL ---
 def gmail_recent(count=5):
-    creds = get_creds()
-    service = build("gmail", "v1", credentials=creds)
-    result = service.users().messages().list(userId="me", maxResults=count, q="in:inbox").execute()
-    messages = result.get("messages", [])
+    messages = BACKEND.gmail_headers("in:inbox", count, ["From", "Subject", "Date"])
     if not messages:
-        print("No recent emails.")
-        return
-    print(f"Recent {len(messages)} emails:")
-    for msg in messages:
-        detail = service.users().messages().get(userId="me", id=msg["id"], format="metadata",
-            metadataHeaders=["From", "Subject", "Date"]).execute()
-        headers = {h["name"]: h["value"] for h in detail.get("payload", {}).get("headers", [])}
+        return "No recent emails."
+    lines = [f"Recent {len(messages)} emails:"]
+    for headers in messages:
         frm = headers.get("From", "?")
         subj = headers.get("Subject", "(no subject)")
         date = headers.get("Date", "")[:16]
-        print(f"  [{date}] {frm[:40]} — {subj}")
+        lines.append(f"  [{date}] {frm[:40]} — {subj}")
+    return "\n".join(lines)
 
 def gmail_unread():
-    creds = get_creds()
-    service = build("gmail", "v1", credentials=creds)
-    result = service.users().messages().list(userId="me", maxResults=10, q="is:unread in:inbox").execute()
-    messages = result.get("messages", [])
+    messages = BACKEND.gmail_headers("is:unread in:inbox", 10, ["From", "Subject"])
     if not messages:
-        print("No unread emails.")
-        return
-    print(f"Unread emails ({len(messages)}):")
-    for msg in messages:
-        detail = service.users().messages().get(userId="me", id=msg["id"], format="metadata",
-            metadataHeaders=["From", "Subject"]).execute()
-        headers = {h["name"]: h["value"] for h in detail.get("payload", {}).get("headers", [])}
-        print(f"  {headers.get('From', '?')[:40]} — {headers.get('Subject', '(no subject)')}")
+        return "No unread emails."
+    lines = [f"Unread emails ({len(messages)}):"]
+    for headers in messages:
+        lines.append(f"  {headers.get('From', '?')[:40]} — {headers.get('Subject', '(no subject)')}")
+    return "\n".join(lines)
 
-# --- MAIN ---
-if __name__ == "__main__":
-    if len(sys.argv) < 2:
-        print(__doc__)
-        sys.exit(1)
+# --- DISPATCH ---
+class UsageError(Exception):
+    pass
 
-    cmd = sys.argv[1]
+def run_command(argv):
+    """Esegue un comando CLI (senza nome script) e ritorna l'output testuale."""
+    if not argv:
+        raise UsageError(__doc__)
+    cmd = argv[0]
 
     if cmd == "calendar":
-        sub = sys.argv[2] if len(sys.argv) > 2 else "today"
+        sub = argv[1] if len(argv) > 1 else "today"
         if sub == "--json":
             sub = "today"
         if sub == "add":
-            if len(sys.argv) < 5:
-                print("Usage: google_helper.py calendar add \"title\" \"start\" \"end\"")
-                sys.exit(1)
-            calendar_add(sys.argv[3], sys.argv[4], sys.argv[5] if len(sys.argv) > 5 else "")
-        elif "--json" in sys.argv:
-            calendar_events_json(sub)
-        else:
-            calendar_events(sub)
+            if len(argv) < 4:
+                raise UsageError("Usage: google_helper.py calendar add \"title\" \"start\" \"end\"")
+            return calendar_add(argv[2], argv[3], argv[4] if len(argv) > 4 else "")
+        if "--json" in argv:
+            return calendar_events_json(sub)
+        return calendar_events(sub)
 
-    elif cmd == "tasks":
-        sub = sys.argv[2] if len(sys.argv) > 2 else "list"
+    if cmd == "tasks":
+        sub = argv[1] if len(argv) > 1 else "list"
         if sub == "list":
-            tasks_list()
-        elif sub == "add":
-            tasks_add(sys.argv[3] if len(sys.argv) > 3 else "New task")
-        elif sub == "done":
-            tasks_done(sys.argv[3] if len(sys.argv) > 3 else "")
-        else:
-            print(f"Unknown tasks subcommand: {sub}")
+            return tasks_list()
+        if sub == "add":
+            return tasks_add(argv[2] if len(argv) > 2 else "New task")
+        if sub == "done":
+            return tasks_done(argv[2] if len(argv) > 2 else "")
+        return f"Unknown tasks subcommand: {sub}"
 
-    elif cmd == "gmail":
-        sub = sys.argv[2] if len(sys.argv) > 2 else "recent"
+    if cmd == "gmail":
+        sub = argv[1] if len(argv) > 1 else "recent"
         if sub == "recent":
-            count = int(sys.argv[3]) if len(sys.argv) > 3 else 5
-            gmail_recent(count)
-        elif sub == "unread":
-            gmail_unread()
+            return gmail_recent(int(argv[2]) if len(argv) > 2 else 5)
+        if sub == "unread":
+            return gmail_unread()
+        return f"Unknown gmail subcommand: {sub}"
+
+    raise UsageError(f"Unknown command: {cmd}\n{__doc__}")
+
+
+# --- WORKER (Unix socket, JSON-RPC 2.0 una riga per messaggio) ---
+class _ResultCache:
+    """Cache TTL dei comandi di lettura; chiamate concorrenti identiche
+    condividono un'unica esecuzione."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._entries = {}   # argv tuple → (output, ts)
+        self._inflight = {}  # argv tuple → Future
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, argv, pool):
+        key = tuple(argv)
+        ttl = CACHE_TTL.get(key[0], 0) if key else 0
+        if not ttl or tuple(key[:2]) in WRITE_COMMANDS:
+            self.invalidate(key[0] if key else "")
+            return pool.submit(run_command, list(argv)).result()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry and time.monotonic() - entry[1] < ttl:
+                self.hits += 1
+                return entry[0]
+            fut = self._inflight.get(key)
+            if fut is None:
+                self.misses += 1
+                fut = self._inflight[key] = pool.submit(self._compute, key)
+        return fut.result()
+
+    def _compute(self, key):
+        try:
+            out = run_command(list(key))
+            with self._lock:
+                self._entries[key] = (out, time.monotonic())
+            return out
+        finally:
+            with self._lock:
+                self._inflight.pop(key, None)
+
+    def invalidate(self, group=""):
+        with self._lock:
+            for key in [k for k in self._entries if not group or k[0] == group]:
+                del self._entries[key]
+
+
+class _RPCHandler(socketserver.StreamRequestHandler):
+    def handle(self):
+        for line in self.rfile:
+            try:
+                req = json.loads(line)
+            except ValueError:
+                self._reply(None, error={"code": -32700, "message": "parse error"})
+                continue
+            if not isinstance(req, dict):
+                self._reply(None, error={"code": -32600, "message": "invalid request"})
+                continue
+            rid = req.get("id")
+            method, params = req.get("method"), req.get("params") or {}
+            try:
+                if method == "call":
+                    result = {"output": self.server.cache.get(params.get("argv") or [], self.server.pool)}
+                elif method == "ping":
+                    result = {"pid": os.getpid(), "uptime": round(time.time() - self.server.started, 1)}
+                elif method == "stats":
+                    result = {"hits": self.server.cache.hits, "misses": self.server.cache.misses,
+                              "backend": type(BACKEND).__name__}
+                elif method == "invalidate":
+                    self.server.cache.invalidate(params.get("group", ""))
+                    result = {"ok": True}
+                else:
+                    self._reply(rid, error={"code": -32601, "message": f"unknown method: {method}"})
+                    continue
+                self._reply(rid, result=result)
+            except UsageError as e:
+                self._reply(rid, error={"code": -32602, "message": str(e)})
+            except Exception as e:
+                self._reply(rid, error={"code": -32000, "message": f"{type(e).__name__}: {e}"})
+
+    def _reply(self, rid, result=None, error=None):
+        msg = {"jsonrpc": "2.0", "id": rid}
+        if error is not None:
+            msg["error"] = error
         else:
-            print(f"Unknown gmail subcommand: {sub}")
+            msg["result"] = result
+        self.wfile.write((json.dumps(msg, ensure_ascii=False) + "\n").encode("utf-8"))
+        self.wfile.flush()
 
-    else:
-        print(f"Unknown command: {cmd}")
+
+class _RPCServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+
+
+def serve(path=SOCKET_PATH):
+    """Avvia il worker. Le credenziali vengono caricate subito (warm start)."""
+    if os.path.exists(path):
+        try:
+            rpc_call(["ping"], socket_path=path, method="ping", timeout=1)
+            print(f"google_helper: worker already running on {path}")
+            return
+        except OSError:
+            os.unlink(path)  # socket orfano di un worker terminato
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    if isinstance(BACKEND, GoogleBackend) and TOKEN_PATH:
+        try:
+            BACKEND.creds()
+        except Exception as e:
+            print(f"google_helper: credentials not ready ({e}), retry on first call")
+    old_umask = os.umask(0o077)  # socket accessibile solo all'utente
+    try:
+        server = _RPCServer(path, _RPCHandler)
+    finally:
+        os.umask(old_umask)
+    server.pool = ThreadPoolExecutor(max_workers=WORKERS, thread_name_prefix="google")
+    server.cache = _ResultCache()
+    server.started = time.time()
+    print(f"google_helper: serving on {path} ({type(BACKEND).__name__})")
+    signal.signal(signal.SIGTERM, lambda *_: sys.exit(0))  # systemd stop → pulizia socket
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        if os.path.exists(path):
+            os.unlink(path)
+
+
+def rpc_call(argv, socket_path=SOCKET_PATH, method="call", timeout=15):
+    """Client minimo: invia un comando al worker e ritorna l'output testuale.
+    OSError se il worker non è raggiungibile, RuntimeError se il comando fallisce."""
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as s:
+        s.settimeout(timeout)
+        s.connect(socket_path)
+        s.sendall((json.dumps({"jsonrpc": "2.0", "id": 1, "method": method,
+                               "params": {"argv": list(argv)}}) + "\n").encode("utf-8"))
+        buf = b""
+        while not buf.endswith(b"\n"):
+            chunk = s.recv(65536)
+            if not chunk:
+                break
+            buf += chunk
+    resp = json.loads(buf)
+    if "error" in resp:
+        raise RuntimeError(resp["error"].get("message", "rpc error"))
+    result = resp.get("result") or {}
+    return result.get("output", "") if method == "call" else json.dumps(result)
+
+
+# --- MAIN ---
+if __name__ == "__main__":
+    args = sys.argv[1:]
+    if not args:
         print(__doc__)
+        sys.exit(1)
+
+    if args[0] == "serve":
+        if "--stub" in args:
+            BACKEND = StubBackend()
+        path = args[args.index("--socket") + 1] if "--socket" in args[:-1] else SOCKET_PATH
+        serve(path)
+        sys.exit(0)
+
+    try:
+        if args[0] == "rpc":
+            print(rpc_call(args[1:]))
+        else:
+            print(run_command(args))
+    except UsageError as e:
+        print(e)
+        sys.exit(1)
+    except (OSError, RuntimeError) as e:
+        print(f"rpc error: {e}", file=sys.stderr)
+        sys.exit(1)
@@ -62,6 +62,49 @@ def _call_ollama(prompt: str) -> str:
     return data.get("message", {}).get("content", "").strip()
 
 
+REDUCE_FANIN = 8  # riassunti per chiamata di reduce: prompt piccoli anche su mesi di storico
+
+
+def load_checkpoints(start: str, end: str) -> list[tuple[str, str]]:
+    """Checkpoint nel periodo: le settimane già riassunte + i giorni non coperti da una settimana."""
+    try:
+        with _db_conn() as conn:
+            rows = conn.execute(
+                "SELECT kind, period_start, period_end, summary FROM summary_checkpoints "
+                "WHERE period_start >= ? AND period_end < ? ORDER BY period_start",
+                (start, end)).fetchall()
+    except sqlite3.OperationalError:
+        return []  # tabella non ancora creata (daily_summary mai girato)
+    weeks = [(r["period_start"], r["period_end"]) for r in rows if r["kind"] == "week"]
+    items = []
+    for r in rows:
+        if r["kind"] == "day" and any(a <= r["period_start"] <= b for a, b in weeks):
+            continue
+        label = r["period_start"] if r["kind"] == "day" else f"settimana {r['period_start']}"
+        items.append((label, r["summary"]))
+    return items
+
+
+def reduce_summaries(items: list[tuple[str, str]], what: str) -> str:
+    """Riduce (etichetta, riassunto) a gruppi di REDUCE_FANIN finché ne resta uno."""
+    level = 0
+    while len(items) > 1 or level == 0:
+        groups = [items[i:i + REDUCE_FANIN] for i in range(0, len(items), REDUCE_FANIN)]
+        reduced = []
+        for group in groups:
+            block = "\n".join(f"  - {label}: {text[:400]}" for label, text in group)
+            text = _call_ollama(f"""Sei Vessel, assistente personale di Filippo.
+Questi sono i riassunti di {what}, che stanno per essere archiviati.
+Uniscili in un unico riassunto (max 100 parole, italiano). Non inventare dati.
+
+{block}
+
+Riassunto:""")
+            reduced.append((f"{group[0][0]} — {group[-1][0]}", text))
+        items, level = reduced, level + 1
+    return items[0][1]
+
+
 def summarize_before_archive(days=90) -> str:
     """Genera summary dei messaggi che stanno per essere archiviati. Salva in weekly_summaries."""
     cutoff = time.strftime("%Y-%m-%dT%H:%M:%S",
@@ -88,11 +131,18 @@ def summarize_before_archive(days=90) -> str:
             "SELECT content FROM chat_messages WHERE ts < ? AND role = 'user' ORDER BY ts DESC LIMIT 10",
             (cutoff,)).fetchall()
 
-    # Prompt compatto
     providers_str = ", ".join(f"{p}: {c}" for p, c in by_provider.items())
     sample = "\n".join(f"  - {r['content'][:80]}" for r in user_msgs[:5])
+    items = load_checkpoints(oldest[:10], cutoff[:10])
 
-    prompt = f"""Sei Vessel, assistente personale di Filippo.
+    try:
+        if items:
+            # Reduce sui checkpoint settimanali/giornalieri (daily_summary, weekly_summary)
+            print(f"[Self-evolve] Archive summary da {len(items)} checkpoint")
+            summary = reduce_summaries(items, f"{count} messaggi chat (periodo {oldest[:10]} — {cutoff[:10]})")
+        else:
+            # Nessun checkpoint (storico precedente a daily_summary): campione di domande
+            summary = _call_ollama(f"""Sei Vessel, assistente personale di Filippo.
 Questi {count} messaggi chat (periodo {oldest[:10]} — {cutoff[:10]}) stanno per essere archiviati.
 Scrivi un breve riassunto (max 100 parole, italiano) di cosa è stato discusso.
 Non inventare dati, basati solo su quello che vedi.
@@ -101,10 +151,7 @@ Messaggi per provider: {providers_str}
 Esempi domande utente:
 {sample}
 
-Riassunto archivio:"""
-
-    try:
-        summary = _call_ollama(prompt)
+Riassunto archivio:""")
     except Exception as e:
         print(f"[Self-evolve] Ollama offline per archive summary: {e}")
         topics = sample.replace("  - ", "").replace("\n", "; ")[:200]
@@ -177,6 +177,17 @@ if not _bridge_cfg:
 CLAUDE_BRIDGE_URL = os.environ.get("CLAUDE_BRIDGE_URL", _bridge_cfg.get("url", "http://localhost:8095"))
 CLAUDE_BRIDGE_TOKEN = os.environ.get("CLAUDE_BRIDGE_TOKEN", _bridge_cfg.get("token", ""))
 
+# ─── Mock LLM (test di carico) ───────────────────────────────────────────────
+# VESSEL_MOCK_URL=http://127.0.0.1:8099 (mock_llm.py): provider LLM e Bot API
+# Telegram puntano al mock, API key non richieste. Mai in produzione.
+MOCK_URL = os.environ.get("VESSEL_MOCK_URL", "")
+
+# ─── Metriche (GET /metrics, Prometheus) ─────────────────────────────────────
+# Con token: Prometheus manda "Authorization: Bearer <token>". Senza token
+# /metrics risponde solo a una sessione dashboard (localhost non basta: il
+# tunnel cloudflared inoltra le richieste esterne da 127.0.0.1).
+METRICS_TOKEN = os.environ.get("VESSEL_METRICS_TOKEN", "")
+
 # ─── OpenRouter (DeepSeek V3) ────────────────────────────────────────────────
 _or_cfg = _get_config("openrouter.json")
 OPENROUTER_API_KEY = os.environ.get("OPENROUTER_API_KEY", _or_cfg.get("apiKey", ""))
@@ -188,6 +199,7 @@ OPENROUTER_LABEL = _or_cfg.get("label", "Auto")
 _tg_cfg = _get_config("telegram.json")
 TELEGRAM_TOKEN   = os.environ.get("TELEGRAM_TOKEN",   _tg_cfg.get("token", ""))
 TELEGRAM_CHAT_ID = os.environ.get("TELEGRAM_CHAT_ID", str(_tg_cfg.get("chat_id", "")))
+TELEGRAM_STREAMING = bool(_tg_cfg.get("streaming", True))  # risposte progressive via editMessageText
 
 # ─── Groq (Whisper STT) ─────────────────────────────────────────────────────
 _groq_cfg = _get_config("groq.json")
@@ -198,6 +210,10 @@ GROQ_WHISPER_LANGUAGE = _groq_cfg.get("language", "it")
 # ─── TTS (Edge TTS) ───────────────────────────────────────────────────────
 TTS_VOICE = "it-IT-DiegoNeural"
 TTS_MAX_CHARS = 2000  # limite caratteri per TTS (evita vocali troppo lunghi)
+# Vocali a frasi mentre il modello genera: "segments" = un vocale per gruppo di frasi
+# appena pronto, "single" = un unico OGG concatenato, "off" = TTS a risposta completa
+TTS_PIPELINE = _tg_cfg.get("voice_pipeline", "segments")
+TTS_WORKERS = 2  # sintesi in parallelo (Edge TTS + ffmpeg per frase)
 
 # ─── HTTPS Locale ────────────────────────────────────────────────────────────
 HTTPS_ENABLED = os.environ.get("HTTPS_ENABLED", "").lower() in ("true", "1", "yes")
@@ -293,7 +309,14 @@ def discover_plugins() -> list[dict]:
             print(f"[Plugin] {d.name}: errore manifest: {e}")
     return plugins
 
-PLUGINS = discover_plugins()
+_plugins_cache: list[dict] | None = None
+
+def get_plugins() -> list[dict]:
+    """Manifest dei plugin, scansionati al primo uso invece che all'import."""
+    global _plugins_cache
+    if _plugins_cache is None:
+        _plugins_cache = discover_plugins()
+    return _plugins_cache
 
 # ─── Auth ─────────────────────────────────────────────────────────────────────
 PIN_FILE = Path.home() / ".nanobot" / "dashboard_pin.hash"
@@ -307,14 +330,57 @@ def _load_sessions() -> dict[str, float]:
             pass
     return {}
 
-def _save_sessions():
+def _sessions_snapshot() -> dict[str, float]:
+    """Copia di SESSIONS presa sul loop: il dict live non va letto da un worker
+    thread. Il flag si azzera qui, così un login/logout durante la scrittura
+    lo rialza e finisce nel flush successivo."""
+    global _sessions_dirty
+    _sessions_dirty = False
+    return dict(SESSIONS)
+
+def _write_sessions(data: dict[str, float]):
+    """Scrittura atomica (tmp + rename): un crash a metà non corrompe sessions.json.
+    Sicura in un worker thread: lavora solo sullo snapshot."""
+    global _sessions_dirty, _sessions_saved_at
     try:
-        SESSION_FILE.write_text(json.dumps(SESSIONS))
-    except Exception:
-        pass
+        tmp = SESSION_FILE.with_suffix(".json.tmp")
+        tmp.write_text(json.dumps(data))
+        tmp.chmod(0o600)
+        os.replace(tmp, SESSION_FILE)
+        _sessions_saved_at = time.time()
+    except Exception as e:
+        _sessions_dirty = True  # riprova al prossimo flush
+        print(f"[Auth] Salvataggio sessioni fallito: {e}")
+
+def _save_sessions():
+    """Salvataggio immediato dal loop (login/logout)."""
+    _write_sessions(_sessions_snapshot())
 
-SESSIONS: dict[str, float] = _load_sessions()
+def _sessions_flush_due(force: bool = False) -> bool:
+    """True se le sessioni sono modificate e l'ultimo salvataggio ha più di
+    SESSION_FLUSH_INTERVAL secondi (o force=True)."""
+    if not _sessions_dirty:
+        return False
+    return force or time.time() - _sessions_saved_at >= SESSION_FLUSH_INTERVAL
+
+def _flush_sessions(force: bool = False):
+    """Persiste le sessioni se modificate. force=True allo shutdown."""
+    if _sessions_flush_due(force):
+        _save_sessions()
+
+def _ensure_sessions():
+    """Carica sessions.json al primo accesso (non all'import)."""
+    global _sessions_loaded
+    if not _sessions_loaded:
+        SESSIONS.update(_load_sessions())
+        _sessions_loaded = True
+
+SESSIONS: dict[str, float] = {}
+_sessions_loaded = False
 SESSION_TIMEOUT = 86400 * 7  # 7 giorni (per PWA iPhone)
+SESSION_FLUSH_INTERVAL = 60  # debounce scrittura last-seen su disco
+_sessions_dirty = False
+_sessions_saved_at = 0.0
 MAX_AUTH_ATTEMPTS = 5
 AUTH_LOCKOUT_SECONDS = 300  # 5 minuti
 
@@ -344,34 +410,96 @@ def _set_pin(pin: str):
     PIN_FILE.chmod(0o600)
 
 def _is_authenticated(token: str) -> bool:
+    """Verifica in memoria. Il last-seen aggiornato va su disco col flush debounced."""
+    global _sessions_dirty
+    _ensure_sessions()
     if token in SESSIONS:
-        if time.time() - SESSIONS[token] < SESSION_TIMEOUT:
-            SESSIONS[token] = time.time()
-            _save_sessions()
+        now = time.time()
+        if now - SESSIONS[token] < SESSION_TIMEOUT:
+            SESSIONS[token] = now
+            _sessions_dirty = True
             return True
         del SESSIONS[token]
-        _save_sessions()
+        _sessions_dirty = True
     return False
 
 def _create_session() -> str:
     token = secrets.token_urlsafe(32)
+    _ensure_sessions()
     SESSIONS[token] = time.time()
     _save_sessions()
     return token
 
+def _revoke_session(token: str):
+    _ensure_sessions()
+    if SESSIONS.pop(token, None) is not None:
+        _save_sessions()
+
 # ─── Rate Limiting ────────────────────────────────────────────────────────────
-RATE_LIMITS: dict[str, list[float]] = {}
+RATE_LIMIT_MAX_KEYS = 1024  # chiavi ip:action tenute in memoria (LRU)
+
+class SlidingWindowLimiter:
+    """Rate limit a sliding-window counter: per chiave solo (inizio finestra,
+    conteggio corrente, conteggio precedente), memoria O(1). Stima =
+    precedente pesato per la parte di finestra ancora sovrapposta + corrente.
+    Chiavi in LRU: oltre max_keys si scarta la meno recente."""
+
+    def __init__(self, max_keys: int = RATE_LIMIT_MAX_KEYS):
+        self.max_keys = max_keys
+        self._entries: "OrderedDict[str, list]" = OrderedDict()  # key → [start, curr, prev, window]
+
+    def hit(self, key: str, max_requests: int, window_seconds: float) -> bool:
+        now = time.time()
+        entry = self._entries.get(key)
+        if entry is None:
+            entry = [now, 0, 0, window_seconds]
+            self._entries[key] = entry
+            if len(self._entries) > self.max_keys:
+                self._entries.popitem(last=False)
+        else:
+            self._entries.move_to_end(key)
+            self._roll(entry, now)
+        start, curr, prev, window = entry
+        weight = max(0.0, 1 - (now - start) / window)
+        if prev * weight + curr >= max_requests:
+            return False
+        entry[1] += 1
+        return True
+
+    @staticmethod
+    def _roll(entry: list, now: float):
+        start, curr, _, window = entry
+        periods = int((now - start) // window)
+        if periods >= 1:
+            entry[2] = curr if periods == 1 else 0
+            entry[1] = 0
+            entry[0] = start + periods * window
+
+    def reset(self, key: str):
+        self._entries.pop(key, None)
+
+    def purge(self):
+        """Rimuove le chiavi inattive da più di due finestre."""
+        now = time.time()
+        for key, entry in list(self._entries.items()):
+            if now - entry[0] >= 2 * entry[3]:
+                del self._entries[key]
+
+    def __len__(self):
+        return len(self._entries)
+
+RATE_LIMITS = SlidingWindowLimiter()
 
 def _rate_limit(ip: str, action: str, max_requests: int, window_seconds: int) -> bool:
-    key = f"{ip}:{action}"
-    now = time.time()
-    timestamps = RATE_LIMITS.get(key, [])
-    timestamps = [t for t in timestamps if now - t < window_seconds]
-    RATE_LIMITS[key] = timestamps
-    if len(timestamps) >= max_requests:
-        return False
-    timestamps.append(now)
-    return True
+    return RATE_LIMITS.hit(f"{ip}:{action}", max_requests, window_seconds)
+
+def _startup_report() -> dict:
+    """Millisecondi per fase dall'inizio dell'avvio (dopo gli import stdlib)."""
+    phases, prev = {}, _BOOT_T0
+    for phase, t in _BOOT_MARKS:
+        phases[phase] = round((t - prev) * 1000, 1)
+        prev = t
+    return {"total_ms": round((prev - _BOOT_T0) * 1000, 1), "phases": phases}
 
 def _validate_config():
     """Stampa warning all'avvio per configurazioni mancanti o incomplete."""
@@ -391,10 +519,14 @@ def _validate_config():
 
 @asynccontextmanager
 async def lifespan(app):
+    _boot_mark("uvicorn")
     _validate_config()
     init_db()
-    db_log_event("system", "start", payload={"port": PORT, "pid": os.getpid(),
-                 "schema_version": SCHEMA_VERSION})
+    _boot_mark("init_db")
+    bus_server = await start_bus_socket()
+    asyncio.create_task(loop_monitor())
+    asyncio.create_task(health_scheduler())
+    asyncio.create_task(job_scheduler())
     asyncio.create_task(stats_broadcaster())
     asyncio.create_task(crypto_push_task())
     if TELEGRAM_TOKEN and TELEGRAM_CHAT_ID:
@@ -402,7 +534,18 @@ async def lifespan(app):
         asyncio.create_task(heartbeat_task())
     loop = asyncio.get_running_loop()
     loop.run_in_executor(None, warmup_ollama)
+    _boot_mark("lifespan")
+    startup = _startup_report()
+    if STARTUP_TRACE:
+        for phase, ms in startup["phases"].items():
+            print(f"[Startup] {phase:<10} {ms:>8.1f} ms")
+    print(f"[Startup] pronto in {startup['total_ms']:.0f} ms")
+    db_log_event("system", "start", payload={"port": PORT, "pid": os.getpid(),
+                 "schema_version": SCHEMA_VERSION, "boot_ms": startup["total_ms"]})
     yield
+    bus_server.close()
+    Path(BUS_SOCKET).unlink(missing_ok=True)
+    _flush_sessions(force=True)
     db_log_event("system", "stop")
 
 app = FastAPI(lifespan=lifespan)
@@ -418,8 +561,8 @@ class SecurityHeadersMiddleware(BaseHTTPMiddleware):
         response.headers["Permissions-Policy"] = "camera=(), microphone=(), geolocation=()"
         response.headers["Content-Security-Policy"] = (
             "default-src 'self'; "
-            "script-src 'unsafe-inline' 'unsafe-eval'; "
-            "style-src 'unsafe-inline' https://fonts.googleapis.com; "
+            "script-src 'self' 'unsafe-inline' 'unsafe-eval'; "
+            "style-src 'self' 'unsafe-inline' https://fonts.googleapis.com; "
             "font-src https://fonts.gstatic.com; "
             "img-src 'self' data:; "
             "connect-src 'self' ws: wss:; "
@@ -428,8 +571,21 @@ class SecurityHeadersMiddleware(BaseHTTPMiddleware):
         )
         return response
 
+class DynamicGZipMiddleware(GZipMiddleware):
+    """GZip solo per le risposte dinamiche: pagine, bundle e sw.js arrivano
+    già compressi (serve_asset) e non vanno ricompressi a ogni richiesta. Il firmware
+    OTA resta binario: Content-Length/Content-Range devono valere sui byte del .bin."""
+    PRECOMPRESSED = ("/", "/sw.js", "/manifest.json", "/api/tamagotchi/firmware")
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] == "http" and (scope["path"] in self.PRECOMPRESSED
+                                        or scope["path"].startswith("/static/")):
+            await self.app(scope, receive, send)
+            return
+        await super().__call__(scope, receive, send)
+
 app.add_middleware(SecurityHeadersMiddleware)
-app.add_middleware(GZipMiddleware, minimum_size=500)
+app.add_middleware(DynamicGZipMiddleware, minimum_size=500)
 
 # ─── Connection manager ───────────────────────────────────────────────────────
 class Manager:
@@ -464,3 +620,4 @@ VESSEL_ICON = "data:image/jpeg;base64,/9j/4AAQSkZJRgABAQAAAQABAAD/2wBDAAYEBQYFBA
 
 VESSEL_ICON_192 = "data:image/jpeg;base64,/9j/4AAQSkZJRgABAQAAAQABAAD/2wBDAAYEBQYFBAYGBQYHBwYIChAKCgkJChQODwwQFxQYGBcUFhYaHSUfGhsjHBYWICwgIyYnKSopGR8tMC0oMCUoKSj/2wBDAQcHBwoIChMKChMoGhYaKCgoKCgoKCgoKCgoKCgoKCgoKCgoKCgoKCgoKCgoKCgoKCgoKCgoKCgoKCgoKCgoKCj/wAARCADAAMADASIAAhEBAxEB/8QAHAABAQADAQEBAQAAAAAAAAAAAAUDBAYCBwEI/8QARRAAAgEDAgMFBQUFBQUJAAAAAQIDAAQRBSEGEjETIkFRYRQycYGRFSNCobEHYnKCwSRSkrKzNmN1ivAlMzRTZKPC0eL/xAAZAQEBAQEBAQAAAAAAAAAAAAAAAQIDBAX/xAAqEQEAAgIBAwEHBQEAAAAAAAAAAQIDESEEEjFBEyJRYXGBoSMykcHw4f/aAAwDAQACEQMRAD8A/l+lKVGSlKUClKUClKUClKUClK/MjxI+tB+0oN+m/wAKUClKUClKUClKUClKUClKUClKUClKUClKUClK2tNsZtRu1t4OQEgszueVI1G7Ox8FA3JoMVrbT3dwkFrDJNM+yxxqWY/IVU+zbCxJ+1r7nmB3trHllYfxSZ5B8uY+le7u9RYpNN0IMloVxPOdnusdWc/hj8k6DbmyajtPBAMQos7/AN9x3R8F8fifpRVaK+th3dM0OBzj37kvcv/w/hrKNc1aJT2dxZ2oA92KKCM48sKua07HRtZ1oqI45OyILKZDyJj0Hj8hWpc6PPbCQvJCyocEo2fpQ0rrqWou2JLPTL0nozWkLnb95QDWJ72wkfk1HRUgJO72cjwuP5XLKfoPjUZtOuVtknMf3TnlVsjc15SWe17kikoRns5FyCP8ArxFDStdaRm1e80ub22zjGZCF5ZYB/vE3wP3gSvr4VKrdtJ2hmW80uWSGeMk8obvJ8D+Ief5giqUkFvrsMk+nwx22pxoXms4xhJlAyzwjwIG5j+JXbKgiBSlKBSlKBSlKBSlKBSlKBSlKBSlKBV3UFbTLJNIiQ+3T8r3uB3geqQ/AbM37xAPuCsPDkUa3E99cRrJb2EfblG6O+QsaH4uQT6A1OkndUluJCXnmLAOeuT7zfHfHzNB4uJWx7JbEsGI5yoyZG9PQeA+ddFpWnGyMYtbSK61JVMkslxjsrcAE+JAJA69em2DXjQtMh03RG4h1GVBluzsrfYtPIOufJR1J+A6muj0yxk1VrIavHcSSXCe0R2Ma/f33kT4RxA7LnbYkAk0aYbWbVNV7VtOmmu5sHtbps28EA6d3ByfixA9DS60bVZFJs49KnuSVY3Elyk8vpyhu6g9MZ6V1XE9hb8NaHay8QQxSxdsxttHt5R2MbFOf71jlmJ6DPXfpgE8Rc8bWshhSHhPh6O3iDKEMBLMD4MwIJ33zQnhnttG1m1S5WWwilumIUmJd2A6jH/dv06EE+R3qYbM3NuxRM25GHsySWiOd+zzuCD4HruN+gtadrPBmpJ7NqeiTaVI/KBcWs7PEjbd8oSCN89PDzNeOJLCKwuLf7P1OO+mkQCCTmLCSM57jHGGycjzGPhRYjfhwUsMlqY54ZMqTlXXYqw8D4gitmCdudLu0ZobqFhITGcFWByHXHTf6H8uhhuBqQmSURBWXL9scEFfwHb3sDGfE8p65rndVtJNF1iSJTzKh5o2YbOh6H4EUTSlq0UWoWQ1a0jCPzBL2FBhY5D0dR4I+Dt0VgR0K1FqrpV5DY3/NIGbTbtDFPH5xMdx6lSAR6qDWpqllLp2o3FnOQZIXKFl6N5MPQjBHoaMtWlKUClKUClKUClKUClKUClKdNzQWbjmteFbSEBea/uGuCB1KR/dp8uZpfpWh7K19rVtp8OSedbdeUZ3zgn6kmqmthY9T0+1K4Szs4VYZ8eTtX/5nNev2dyG312fVG5SdOtpbwFiR3lHdxjxyRRYdNp0UFxqN7ql3bpc6ToSpp9ja52nmzyqBtuS3M5NdFLqknC8d5d392knEN7g3dyYwRbIR3YkzvzDyA8N8YzUKK1k07Q+GtMti32hdSnUpipyzNjCbeffA+INafGao2jWzW8MqGO6V3Unm5F5AuWPq2friuV7+9FPi+j0/T/oX6mY32+I+8eWtx/cMLW2hWVZIpp3mLY7zlVChsnfBBO1cXGjySLHGrO7kKqqMliegA8TXZcaw3WoXOnQ21q8svZTOFjUkkBsnbyAGfrWHS7FdPuNO1XTZJuzZuzkWdVDIWBVsEdCCDn0GpNjtFccTK9bitl6u9ax41/UOSYFWIYEEHBBGCDXe8NwWmpcMQJe3Biithc87xqGeLlHaKcZHiTj8q1eJdDRn1HUbmSWBuzR4FEXN7Q+FDsSTkZYkAgHJB8Mms3CxiPCd5DK5Rla551KnYdiuPzBpktFq7j5J0uK2HPNbfC34if7hsW0YEsOqxKXiYImpsWypLNiK4AIBAOVz8W8zUHiVEvLGNk5R2CEwjly/IGwUZvxFTkZ8h610PDD2qroK6kJGsbqA212CSABzycjH90ZHyOaw2gtbDWrzTLhxNZSJJGHBBBAx3xjrlBG3xU10rbfh5MmOaa36xE/y4K1btLWSI7mM9ov6N/Q/KqmrYuNL0u9Gefs2tJdsd6LHL/7bJ9KnrA1jrT206EFJGhdW+amqdiGm4b1a1Ytz20kV2BjpgmJ/wDOn0rTjKNSlKIUpSgUpSgUpSgUpSgV6RDI6xjq5C/XavNb/D6drr+mR5xz3UK58sutBucTSg8Sa84OAss0a5ONg3IB9Km6QUkQ2nMyyXc8URx05MnOfny/nWW+kMz6rMCEDyklTud5CfyxXnSJ/YHtr3kDmJmkVHUFSRgDY0WH0bXiYdf1u8ijaONEkW3kRyW7OJZF5lyehdWPyGK2bNoLaw0ldTaQz31y1sLrtOZVZY4/eVveUl92yMevSp3EJu04d0c6dG91LPpKGU8nNhWeUNhfnv8AHNc3cz3V/BYQXiSSRQTExckXKQWC8y4I32VdvT1rjbH3W5/3D6WLqpwYtU8zH2/c6riGwv7mDTJtOMUd1YPIVSQjv85BJye6cYII8azXF3penyxQ3t8IxMSO8CwUEYLHAJxjxx4eOK0LPVG1PiOwWI3KwSW0kcg5hy847RwGGNsfXbas3E2h6fqIYJexfaUSqGwCDHncBlO5XBGGGeuPSuHbMarfw+n7Wt5yZunj35nWp5ieJ5j5zHoqWWpiWZvsW4t7y4d1SMo5jWRlHcRiQCuT47Z6Z64kaDYT6fHMdSvIo5ZS91O/vCMFO8G8zjOwz1wK9aFokOlWojN0slxcqHlTmwTGGwGVOuAcjJwTvjbNTb3WJLyymgurT+0TI8aRQKFCR5HKMb97bqSTvvTtm2608cJGWuPtz54iL6tERGtbiPX5z406PTNXWOOKWzQJbaniyPtKgu0cgYc37pyqnb4ZO9RuKmjjsdH1fTwFUWkMhjG4EseFkVhjG4c/IVIlu9VtY7WB9PaJYGURK0JPeQEZLbYPe8vGus4isVteBJ0VBzFI5WDH3BKAe6PAAjfbfI3rvijsjUfN8zrck559pbe4isc/TlwX7Q7SG14j57VmMFxbw3EZIwcNGD/0fGv3Rh2uq30AIC3dnP8ADPZGUdPVRWHihQ2mcPTjmPNZdmWPQlJHGB8BgV+aRdpZavpN7LvCpQSYGO6DyOP8Pj612fPlJznfzpWxqNo9hqFzZye/bytEfXlOP6Vr0ZKUpQKUpSgUpSgUpSgVXt8pwpft07S9t0+OElJH5g1Iqup5eEZAQRz6gpU42OImzv/MPrQa1pKkOvWs0rckMgXmbyDLyt+ear8G6lFpOs3OmamgfTroPa3II35SMAj1Bww9RXOXAEtijg5aJuX+U7j88/WqEskF7ZxyBJEkgjRe3Azhx4N6Hwbw6b0aaWu6XLo+r3NjOys0LYDr7rqd1YehBB+dV+HFutT0XVdLieM4jFxGsjb5QklV9SM/Styzs5OJrKGwkeKPUrSMLaF2AEsZJPZlvjnlJ6EkHbGIFpcXvDusuWieG7h54pIpAQRkFWBHzp5WJ0mk9wDFfmCMHp5Gv3qnjtV/QbrSuxK6pbFmjGUK47xGdm9MVUQnaQZjkZgAclSfGq/CxNvNd34laI2lu7KVOCWYcgGfmT6gGp99Kt3fyPEuEJwuBjbw2r9SWaG2mtlK9lMylsdW5c4Hw3/SpKxOp3D1YWlxqV5Da2kTz3U7hEjXcsa7m9ay03RE4Z+0YoYY5fadRuIxzGWXGBGgHXlHTwzvtWLSIo+H+Hry9jRftFWVJZTJg4cHlhjx5+852IAA2zvOv9Nht9bMVzCyQabbRm7ZSMmUgE59SzYx6VB1+ladpum8K6jxFa27RLbxMsEtwxaaV2HIp2wqDfpgk+dfKtPGDPLkjkiIB9W7oH5n6VX4h4lfUZbyG0RoNOmZSkDMTy4Oc+WTtn4VKQdnp6kghpHLjPioGP1J+lVJVbzMPC+mREYM9xPcdOqgJGPzV6j1X4o+61JbIYC2MKWwH7wGX+rs5qRRkpSlApSlApSlApSlArPY3Utle291bnE0Ei/EpyP0rBSgraxbw2+rXCLiOxugJYSveCxv3kPrjofgRU2CabTLp1whyMHxDKR4HyIP51W0q4XULRdHvZEVS2bOd9uwkJ90n/AMtz18AcN/ezOnhc89pdfc3EDFFInd5SCeZCfDf6HPnRYbfaG0yUZVMYW4ijbfKn3kz47fpXZ8baU2p6Lpl+cyzXEAazuMZMgVd4H23cAEqfEbdTivnEtrcxDnIDCPqUcPyj1wTgb1Yl4v1SXTLexeXMNvIksONijKSRj60VBwUGGHhkfOv1YzISEUknoBuazzmW8f2l0HKzhDy4AzjYem1YJmw/KmQEJC56gZ/WgzWUsUZYSBtwcFTv02/PFb/Dk5g1iK4SNZblG5oIygdWlJATIPhk5+VRlyWx57Vf4QMCavFM5y8BaVRnGSqMwP1AoLn7Q7qHT9Yt9DjkllTTHLXMjPkz3LYMr+ODnC+PSuV1bV7nULy+mdgq3icoldEGFyM4+ma1VWW+uZXlly5DSPI+T6mtiNYbYc0bmWboGK4VPUZ3J+W1Db1BF2McUjQiS7lboV5iufdUDzP8A9VZ9jTSL4z67NFLeQN3bFHEjF16LKR3UUEbrnm2xgdR+JGOHuW4uiza0y88UBH/hSw2kkz+PByq+GQxP4Tz9EZLiaS4uJZ52LyysXdj4k1EeHdpHZ3Ys7EksxyST4k15pSgUpSgUpSgUpSgUpSgUpSg//2Q=="
 
+_boot_mark("config")
@@ -1,162 +1,242 @@
 # ─── Database SQLite ──────────────────────────────────────────────────────────
 DB_PATH = Path.home() / ".nanobot" / "vessel.db"
-SCHEMA_VERSION = 4
+SCHEMA_VERSION = 8
+
+
+class _TimedConnection(sqlite3.Connection):
+    """`with _db_conn() as conn:` misura la transazione; se ha scritto qualcosa
+    la durata (attesa del lock compresa) va in vessel_db_write_seconds."""
+
+    def __enter__(self):
+        self._t0, self._changes = time.perf_counter(), self.total_changes
+        return super().__enter__()
+
+    def __exit__(self, *exc):
+        result = super().__exit__(*exc)
+        if self.total_changes != self._changes:
+            DB_WRITE.observe(time.perf_counter() - self._t0)
+        return result
 
 
 def _db_conn():
     """Crea connessione SQLite con row_factory dict-like."""
-    conn = sqlite3.connect(str(DB_PATH), timeout=5)
+    conn = sqlite3.connect(str(DB_PATH), timeout=5, factory=_TimedConnection)
     conn.execute("PRAGMA journal_mode=WAL")
     conn.row_factory = sqlite3.Row
     return conn
 
 
+_SCHEMA_DDL = """
+CREATE TABLE IF NOT EXISTS schema_version (version INTEGER NOT NULL);
+
+CREATE TABLE IF NOT EXISTS usage (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    ts TEXT NOT NULL,
+    input INTEGER NOT NULL DEFAULT 0,
+    output INTEGER NOT NULL DEFAULT 0,
+    model TEXT NOT NULL DEFAULT '',
+    provider TEXT NOT NULL DEFAULT '',
+    response_time_ms INTEGER NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS idx_usage_ts ON usage(ts);
+
+CREATE TABLE IF NOT EXISTS briefings (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    ts TEXT NOT NULL,
+    weather TEXT DEFAULT '',
+    stories TEXT DEFAULT '[]',
+    calendar_today TEXT DEFAULT '[]',
+    calendar_tomorrow TEXT DEFAULT '[]',
+    text TEXT DEFAULT ''
+);
+CREATE INDEX IF NOT EXISTS idx_briefings_ts ON briefings(ts);
+
+CREATE TABLE IF NOT EXISTS claude_tasks (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    ts TEXT NOT NULL,
+    prompt TEXT DEFAULT '',
+    status TEXT DEFAULT '',
+    exit_code INTEGER DEFAULT 0,
+    duration_ms INTEGER DEFAULT 0,
+    output_preview TEXT DEFAULT ''
+);
+
+CREATE TABLE IF NOT EXISTS chat_messages (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    ts TEXT NOT NULL,
+    provider TEXT NOT NULL,
+    channel TEXT NOT NULL DEFAULT 'dashboard',
+    role TEXT NOT NULL,
+    content TEXT NOT NULL DEFAULT ''
+);
+CREATE INDEX IF NOT EXISTS idx_chat_pct ON chat_messages(provider, channel, ts);
+CREATE INDEX IF NOT EXISTS idx_chat_channel_id ON chat_messages(channel, id);
+
+CREATE TABLE IF NOT EXISTS chat_messages_archive (
+    id INTEGER PRIMARY KEY,
+    ts TEXT NOT NULL,
+    provider TEXT NOT NULL,
+    channel TEXT NOT NULL,
+    role TEXT NOT NULL,
+    content TEXT NOT NULL DEFAULT ''
+);
+
+CREATE TABLE IF NOT EXISTS audit_log (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    ts TEXT NOT NULL,
+    action TEXT NOT NULL,
+    actor TEXT DEFAULT '',
+    resource TEXT DEFAULT '',
+    status TEXT DEFAULT 'ok',
+    details TEXT DEFAULT ''
+);
+CREATE INDEX IF NOT EXISTS idx_audit_ts ON audit_log(ts);
+CREATE INDEX IF NOT EXISTS idx_audit_action ON audit_log(action);
+
+CREATE TABLE IF NOT EXISTS entities (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    type TEXT NOT NULL,
+    name TEXT NOT NULL UNIQUE,
+    description TEXT DEFAULT '',
+    first_seen TEXT NOT NULL,
+    last_seen TEXT NOT NULL,
+    frequency INTEGER DEFAULT 1
+);
+CREATE INDEX IF NOT EXISTS idx_entities_type ON entities(type);
+
+CREATE TABLE IF NOT EXISTS relations (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    entity_a INTEGER NOT NULL,
+    entity_b INTEGER NOT NULL,
+    relation TEXT NOT NULL,
+    frequency INTEGER DEFAULT 1,
+    ts TEXT NOT NULL,
+    FOREIGN KEY(entity_a) REFERENCES entities(id),
+    FOREIGN KEY(entity_b) REFERENCES entities(id)
+);
+
+CREATE TABLE IF NOT EXISTS weekly_summaries (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    ts TEXT NOT NULL,
+    week_start TEXT NOT NULL,
+    week_end TEXT NOT NULL,
+    summary TEXT NOT NULL DEFAULT '',
+    stats TEXT NOT NULL DEFAULT '{}'
+);
+CREATE INDEX IF NOT EXISTS idx_weekly_ts ON weekly_summaries(ts);
+
+CREATE TABLE IF NOT EXISTS saved_prompts (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    ts TEXT NOT NULL,
+    title TEXT NOT NULL,
+    prompt TEXT NOT NULL,
+    provider TEXT NOT NULL DEFAULT '',
+    use_loop INTEGER NOT NULL DEFAULT 0
+);
+
+CREATE TABLE IF NOT EXISTS notes (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    ts TEXT NOT NULL,
+    content TEXT NOT NULL,
+    tags TEXT DEFAULT ''
+);
+CREATE INDEX IF NOT EXISTS idx_notes_ts ON notes(ts);
+
+CREATE TABLE IF NOT EXISTS events (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    ts DATETIME DEFAULT (datetime('now', 'localtime')),
+    category TEXT NOT NULL,
+    action TEXT NOT NULL,
+    provider TEXT,
+    status TEXT DEFAULT 'ok',
+    latency_ms INTEGER DEFAULT 0,
+    payload TEXT DEFAULT '{}',
+    error TEXT DEFAULT ''
+);
+CREATE INDEX IF NOT EXISTS idx_events_ts ON events(ts);
+CREATE INDEX IF NOT EXISTS idx_events_cat ON events(category);
+CREATE INDEX IF NOT EXISTS idx_events_cat_action ON events(category, action);
+
+CREATE TABLE IF NOT EXISTS tracker (
+    id       INTEGER PRIMARY KEY AUTOINCREMENT,
+    ts       TEXT NOT NULL,
+    title    TEXT NOT NULL,
+    body     TEXT DEFAULT '',
+    type     TEXT NOT NULL DEFAULT 'note',
+    priority TEXT NOT NULL DEFAULT 'P2',
+    status   TEXT NOT NULL DEFAULT 'open',
+    tags     TEXT DEFAULT ''
+);
+CREATE INDEX IF NOT EXISTS idx_tracker_status ON tracker(status, type);
+
+CREATE TABLE IF NOT EXISTS job_runs (
+    id          INTEGER PRIMARY KEY AUTOINCREMENT,
+    job         TEXT NOT NULL,
+    trigger     TEXT NOT NULL DEFAULT 'cron',
+    started_at  TEXT NOT NULL,
+    finished_at TEXT DEFAULT '',
+    status      TEXT NOT NULL DEFAULT 'running',
+    duration_ms INTEGER DEFAULT 0,
+    output      TEXT DEFAULT '',
+    error       TEXT DEFAULT ''
+);
+CREATE INDEX IF NOT EXISTS idx_job_runs_job ON job_runs(job, started_at);
+
+CREATE TABLE IF NOT EXISTS summary_checkpoints (
+    kind         TEXT NOT NULL,
+    period_start TEXT NOT NULL,
+    period_end   TEXT NOT NULL,
+    ts           TEXT NOT NULL,
+    summary      TEXT NOT NULL DEFAULT '',
+    stats        TEXT NOT NULL DEFAULT '{}',
+    status       TEXT NOT NULL DEFAULT 'ok',
+    attempts     INTEGER NOT NULL DEFAULT 1,
+    PRIMARY KEY (kind, period_start)
+);
+
+CREATE TABLE IF NOT EXISTS bench_runs (
+    id          INTEGER PRIMARY KEY AUTOINCREMENT,
+    ts          TEXT NOT NULL,
+    provider    TEXT NOT NULL,
+    model       TEXT NOT NULL DEFAULT '',
+    endpoint    TEXT NOT NULL DEFAULT '',
+    label       TEXT NOT NULL DEFAULT '',
+    config      TEXT NOT NULL DEFAULT '{}',
+    levels      TEXT NOT NULL DEFAULT '{}',
+    regressions TEXT NOT NULL DEFAULT '[]',
+    samples     TEXT NOT NULL DEFAULT '[]'
+);
+CREATE INDEX IF NOT EXISTS idx_bench_runs_key ON bench_runs(provider, model, endpoint, label);
+"""
+
+# Impronta di versione + DDL salvata in PRAGMA user_version: se combacia lo
+# schema è già aggiornato e l'avvio salta DDL, migrazioni e check JSONL.
+SCHEMA_STAMP = int(hashlib.sha256(f"{SCHEMA_VERSION}\n{_SCHEMA_DDL}".encode()).hexdigest()[:7], 16)
+
+
+def _schema_is_current() -> bool:
+    """Legge solo l'header del DB (PRAGMA user_version), nessuna DDL."""
+    if not DB_PATH.exists():
+        return False
+    try:
+        conn = sqlite3.connect(str(DB_PATH), timeout=5)
+        try:
+            return conn.execute("PRAGMA user_version").fetchone()[0] == SCHEMA_STAMP
+        finally:
+            conn.close()
+    except sqlite3.Error:
+        return False
+
+
 def init_db():
-    """Crea tabelle + indici. Migra JSONL se presenti e tabelle vuote."""
+    """Crea tabelle + indici. Migra JSONL se presenti e tabelle vuote.
+    Se lo schema risulta già aggiornato (SCHEMA_STAMP) non fa nulla."""
+    if _schema_is_current():
+        print(f"[DB] Schema v{SCHEMA_VERSION} già aggiornato: {DB_PATH}")
+        return
     DB_PATH.parent.mkdir(parents=True, exist_ok=True)
     with _db_conn() as conn:
-        conn.executescript("""
-            CREATE TABLE IF NOT EXISTS schema_version (version INTEGER NOT NULL);
-
-            CREATE TABLE IF NOT EXISTS usage (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                ts TEXT NOT NULL,
-                input INTEGER NOT NULL DEFAULT 0,
-                output INTEGER NOT NULL DEFAULT 0,
-                model TEXT NOT NULL DEFAULT '',
-                provider TEXT NOT NULL DEFAULT '',
-                response_time_ms INTEGER NOT NULL DEFAULT 0
-            );
-            CREATE INDEX IF NOT EXISTS idx_usage_ts ON usage(ts);
-
-            CREATE TABLE IF NOT EXISTS briefings (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                ts TEXT NOT NULL,
-                weather TEXT DEFAULT '',
-                stories TEXT DEFAULT '[]',
-                calendar_today TEXT DEFAULT '[]',
-                calendar_tomorrow TEXT DEFAULT '[]',
-                text TEXT DEFAULT ''
-            );
-            CREATE INDEX IF NOT EXISTS idx_briefings_ts ON briefings(ts);
-
-            CREATE TABLE IF NOT EXISTS claude_tasks (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                ts TEXT NOT NULL,
-                prompt TEXT DEFAULT '',
-                status TEXT DEFAULT '',
-                exit_code INTEGER DEFAULT 0,
-                duration_ms INTEGER DEFAULT 0,
-                output_preview TEXT DEFAULT ''
-            );
-
-            CREATE TABLE IF NOT EXISTS chat_messages (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                ts TEXT NOT NULL,
-                provider TEXT NOT NULL,
-                channel TEXT NOT NULL DEFAULT 'dashboard',
-                role TEXT NOT NULL,
-                content TEXT NOT NULL DEFAULT ''
-            );
-            CREATE INDEX IF NOT EXISTS idx_chat_pct ON chat_messages(provider, channel, ts);
-
-            CREATE TABLE IF NOT EXISTS chat_messages_archive (
-                id INTEGER PRIMARY KEY,
-                ts TEXT NOT NULL,
-                provider TEXT NOT NULL,
-                channel TEXT NOT NULL,
-                role TEXT NOT NULL,
-                content TEXT NOT NULL DEFAULT ''
-            );
-
-            CREATE TABLE IF NOT EXISTS audit_log (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                ts TEXT NOT NULL,
-                action TEXT NOT NULL,
-                actor TEXT DEFAULT '',
-                resource TEXT DEFAULT '',
-                status TEXT DEFAULT 'ok',
-                details TEXT DEFAULT ''
-            );
-            CREATE INDEX IF NOT EXISTS idx_audit_ts ON audit_log(ts);
-            CREATE INDEX IF NOT EXISTS idx_audit_action ON audit_log(action);
-
-            CREATE TABLE IF NOT EXISTS entities (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                type TEXT NOT NULL,
-                name TEXT NOT NULL UNIQUE,
-                description TEXT DEFAULT '',
-                first_seen TEXT NOT NULL,
-                last_seen TEXT NOT NULL,
-                frequency INTEGER DEFAULT 1
-            );
-            CREATE INDEX IF NOT EXISTS idx_entities_type ON entities(type);
-
-            CREATE TABLE IF NOT EXISTS relations (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                entity_a INTEGER NOT NULL,
-                entity_b INTEGER NOT NULL,
-                relation TEXT NOT NULL,
-                frequency INTEGER DEFAULT 1,
-                ts TEXT NOT NULL,
-                FOREIGN KEY(entity_a) REFERENCES entities(id),
-                FOREIGN KEY(entity_b) REFERENCES entities(id)
-            );
-
-            CREATE TABLE IF NOT EXISTS weekly_summaries (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                ts TEXT NOT NULL,
-                week_start TEXT NOT NULL,
-                week_end TEXT NOT NULL,
-                summary TEXT NOT NULL DEFAULT '',
-                stats TEXT NOT NULL DEFAULT '{}'
-            );
-            CREATE INDEX IF NOT EXISTS idx_weekly_ts ON weekly_summaries(ts);
-
-            CREATE TABLE IF NOT EXISTS saved_prompts (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                ts TEXT NOT NULL,
-                title TEXT NOT NULL,
-                prompt TEXT NOT NULL,
-                provider TEXT NOT NULL DEFAULT '',
-                use_loop INTEGER NOT NULL DEFAULT 0
-            );
-
-            CREATE TABLE IF NOT EXISTS notes (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                ts TEXT NOT NULL,
-                content TEXT NOT NULL,
-                tags TEXT DEFAULT ''
-            );
-            CREATE INDEX IF NOT EXISTS idx_notes_ts ON notes(ts);
-
-            CREATE TABLE IF NOT EXISTS events (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                ts DATETIME DEFAULT (datetime('now', 'localtime')),
-                category TEXT NOT NULL,
-                action TEXT NOT NULL,
-                provider TEXT,
-                status TEXT DEFAULT 'ok',
-                latency_ms INTEGER DEFAULT 0,
-                payload TEXT DEFAULT '{}',
-                error TEXT DEFAULT ''
-            );
-            CREATE INDEX IF NOT EXISTS idx_events_ts ON events(ts);
-            CREATE INDEX IF NOT EXISTS idx_events_cat ON events(category);
-            CREATE INDEX IF NOT EXISTS idx_events_cat_action ON events(category, action);
-
-            CREATE TABLE IF NOT EXISTS tracker (
-                id       INTEGER PRIMARY KEY AUTOINCREMENT,
-                ts       TEXT NOT NULL,
-                title    TEXT NOT NULL,
-                body     TEXT DEFAULT '',
-                type     TEXT NOT NULL DEFAULT 'note',
-                priority TEXT NOT NULL DEFAULT 'P2',
-                status   TEXT NOT NULL DEFAULT 'open',
-                tags     TEXT DEFAULT ''
-            );
-            CREATE INDEX IF NOT EXISTS idx_tracker_status ON tracker(status, type);
-        """)
+        conn.executescript(_SCHEMA_DDL)
         # Schema version + migrations
         row = conn.execute("SELECT version FROM schema_version LIMIT 1").fetchone()
         current_ver = row[0] if row else 0
@@ -179,10 +259,24 @@ def init_db():
         if current_ver < 4:
             # tracker table già creata dal CREATE IF NOT EXISTS sopra
             print("[DB] Migrazione v4: tabella 'tracker' per bug/note tracking")
+        if current_ver < 5:
+            # job_runs table già creata dal CREATE IF NOT EXISTS sopra
+            print("[DB] Migrazione v5: tabella 'job_runs' per lo scheduler in-process")
+        if current_ver < 6:
+            # summary_checkpoints table già creata dal CREATE IF NOT EXISTS sopra
+            print("[DB] Migrazione v6: tabella 'summary_checkpoints' per i riassunti incrementali")
+        if current_ver < 7:
+            # bench_runs table già creata dal CREATE IF NOT EXISTS sopra
+            print("[DB] Migrazione v7: tabella 'bench_runs' per lo storico benchmark")
+        if current_ver < 8:
+            # idx_chat_channel_id già creato dal CREATE IF NOT EXISTS sopra
+            print("[DB] Migrazione v8: indice (channel, id) per la chat a pagine")
         if current_ver < SCHEMA_VERSION:
             conn.execute("UPDATE schema_version SET version = ?", (SCHEMA_VERSION,))
 
     _migrate_jsonl()
+    with _db_conn() as conn:
+        conn.execute(f"PRAGMA user_version = {SCHEMA_STAMP}")
     print(f"[DB] SQLite inizializzato: {DB_PATH}")
 
 
@@ -408,6 +502,18 @@ def db_load_chat_history(provider: str, channel: str = "dashboard", limit: int =
         return [{"role": r["role"], "content": r["content"]} for r in reversed(rows)]
 
 
+def db_get_chat_page(channel: str = "dashboard", before_id: int = 0, limit: int = 30) -> dict:
+    """Pagina di messaggi del channel (tutti i provider) con id < before_id, dal più
+    vecchio al più recente. before_id=0 → ultima pagina. has_more: ce ne sono di più vecchi."""
+    with _db_conn() as conn:
+        rows = conn.execute(
+            "SELECT id, ts, provider, role, content, agent FROM chat_messages "
+            "WHERE channel = ? AND id < ? ORDER BY id DESC LIMIT ?",
+            (channel, before_id or 2**63 - 1, limit + 1)
+        ).fetchall()
+    return {"messages": [dict(r) for r in reversed(rows[:limit])], "has_more": len(rows) > limit}
+
+
 def db_clear_chat_history(channel: str = "dashboard"):
     """Cancella tutta la chat history per un channel."""
     with _db_conn() as conn:
@@ -762,6 +868,111 @@ def db_cleanup_old_events(days: int = 90) -> int:
         return cur.rowcount
 
 
+# ─── Job runs (scheduler in-process) ─────────────────────────────────────────
+
+def db_job_run_start(job: str, trigger: str = "cron") -> int:
+    with _db_conn() as conn:
+        cur = conn.execute(
+            "INSERT INTO job_runs (job, trigger, started_at) VALUES (?, ?, ?)",
+            (job, trigger, time.strftime("%Y-%m-%dT%H:%M:%S")))
+        return cur.lastrowid
+
+
+def db_job_run_finish(run_id: int, status: str, duration_ms: int,
+                      output: str = "", error: str = ""):
+    with _db_conn() as conn:
+        conn.execute(
+            "UPDATE job_runs SET finished_at = ?, status = ?, duration_ms = ?, output = ?, error = ? "
+            "WHERE id = ?",
+            (time.strftime("%Y-%m-%dT%H:%M:%S"), status, duration_ms,
+             output[-4000:], error[:500], run_id))
+
+
+def db_job_runs_interrupt() -> int:
+    """Righe rimaste 'running' da un processo precedente (riavvio a job in corso) → 'interrupted'."""
+    with _db_conn() as conn:
+        cur = conn.execute(
+            "UPDATE job_runs SET status = 'interrupted', finished_at = ?, error = 'server riavviato' "
+            "WHERE status = 'running'", (time.strftime("%Y-%m-%dT%H:%M:%S"),))
+        return cur.rowcount
+
+
+def db_get_job_runs(job: str = "", limit: int = 20) -> list:
+    query = "SELECT id, job, trigger, started_at, finished_at, status, duration_ms, output, error FROM job_runs"
+    params: list = []
+    if job:
+        query += " WHERE job = ?"
+        params.append(job)
+    query += " ORDER BY id DESC LIMIT ?"
+    params.append(limit)
+    with _db_conn() as conn:
+        return [dict(r) for r in conn.execute(query, params).fetchall()]
+
+
+def db_get_last_job_runs() -> dict:
+    """Ultima esecuzione per ogni job: {job: {status, started_at, duration_ms, ...}}."""
+    with _db_conn() as conn:
+        rows = conn.execute(
+            "SELECT job, trigger, started_at, status, duration_ms, error FROM job_runs "
+            "WHERE id IN (SELECT MAX(id) FROM job_runs GROUP BY job)").fetchall()
+    return {r["job"]: dict(r) for r in rows}
+
+
+# ─── Benchmark provider ──────────────────────────────────────────────────────
+
+def db_save_bench_run(provider: str, model: str, endpoint: str, label: str, config: dict,
+                      levels: dict, regressions: list, samples: list) -> int:
+    with _db_conn() as conn:
+        cur = conn.execute(
+            "INSERT INTO bench_runs (ts, provider, model, endpoint, label, config, levels, regressions, samples) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            (time.strftime("%Y-%m-%dT%H:%M:%S"), provider, model, endpoint, label,
+             json.dumps(config), json.dumps(levels), json.dumps(regressions, ensure_ascii=False),
+             json.dumps(samples, ensure_ascii=False)))
+        return cur.lastrowid
+
+
+def _bench_row(r) -> dict:
+    out = dict(r)
+    for k in ("config", "levels", "regressions"):
+        out[k] = json.loads(out[k] or "null")
+    return out
+
+
+def db_get_bench_runs(provider: str = "", limit: int = 20) -> list:
+    """Storico run (senza i campioni singoli), dal più recente."""
+    query = "SELECT id, ts, provider, model, endpoint, label, config, levels, regressions FROM bench_runs"
+    params: list = []
+    if provider:
+        query += " WHERE provider = ?"
+        params.append(provider)
+    query += " ORDER BY id DESC LIMIT ?"
+    params.append(limit)
+    with _db_conn() as conn:
+        return [_bench_row(r) for r in conn.execute(query, params).fetchall()]
+
+
+def db_get_last_bench_run(provider: str, model: str, endpoint: str = "", label: str = "") -> dict | None:
+    """Run precedente confrontabile: stesso provider, modello, endpoint ed etichetta.
+    Salta i run in cui ogni richiesta è fallita: metriche tutte null, non fanno da baseline."""
+    with _db_conn() as conn:
+        rows = conn.execute(
+            "SELECT id, ts, provider, model, endpoint, label, config, levels, regressions FROM bench_runs "
+            "WHERE provider = ? AND model = ? AND endpoint = ? AND label = ? ORDER BY id DESC LIMIT 50",
+            (provider, model, endpoint, label)).fetchall()
+    for r in rows:
+        run = _bench_row(r)
+        if not bench_all_failed(run["levels"]):
+            return run
+    return None
+
+
+def bench_all_failed(levels: dict | None) -> bool:
+    """True se nessuna richiesta del run è andata a buon fine."""
+    levels = (levels or {}).values()
+    return sum(lv.get("errors", 0) for lv in levels) >= sum(lv.get("requests", 0) for lv in levels)
+
+
 # ─── Analytics (Fase 62) ─────────────────────────────────────────────────────
 
 def db_get_failover_log(limit: int = 20) -> list:
@@ -7,28 +7,63 @@ Accesso: http://your-pi.local:{PORT}
 """
 
 import asyncio
+import base64
+import bisect
+import concurrent.futures
 import functools
+import gzip
 import hashlib
+import importlib.util
 import http.client
 import io
 import json
+import logging
 import os
 import zipfile
+import random
 import re
 import secrets
 import subprocess
 import time
+import urllib.error
+import urllib.parse
 import urllib.request
-import shlex
+import socket
 import ssl
+import statistics
+import struct
+import sys
 import sqlite3
-from datetime import datetime as _dt
+import threading
+import traceback
+import tracemalloc
+from datetime import datetime as _dt, timedelta
+from collections import Counter, OrderedDict, deque
 from contextlib import asynccontextmanager
+from dataclasses import dataclass, fields as dataclass_fields
 from pathlib import Path
+from typing import ClassVar
+
+# ─── Startup timeline (opt-in: VESSEL_STARTUP_TRACE=1) ───────────────────────
+# Le fasi registrano sempre il proprio istante (costo trascurabile); il dettaglio
+# viene stampato solo con la variabile d'ambiente attiva.
+STARTUP_TRACE = os.environ.get("VESSEL_STARTUP_TRACE") == "1"
+_BOOT_T0 = time.perf_counter()
+_BOOT_MARKS: list[tuple[str, float]] = []
+
+def _boot_mark(phase: str):
+    """Segna la fine di una fase di avvio."""
+    _BOOT_MARKS.append((phase, time.perf_counter()))
 
 from fastapi import FastAPI, WebSocket, WebSocketDisconnect, Request, HTTPException
-from fastapi.responses import HTMLResponse, Response, JSONResponse
+from fastapi.responses import HTMLResponse, Response, JSONResponse, StreamingResponse
 from starlette.middleware.base import BaseHTTPMiddleware
 from starlette.middleware.gzip import GZipMiddleware
 import uvicorn
 
+try:
+    import brotli  # opzionale: Content-Encoding br per pagine e bundle
+except ImportError:
+    brotli = None
+
+_boot_mark("imports")
@@ -15,14 +15,24 @@ class BaseChatProvider:
         self.parser_type = "json_lines"
         self.is_valid = True
         self.error_msg = ""
-    
+        self.endpoint = ""   # mock/benchmark: sostituisce host e porta, credenziali fittizie
+
     def setup(self):
         pass
 
+    def credential(self, real: str) -> str:
+        """Con un endpoint alternativo la chiave vera non parte mai: al suo posto "mock"."""
+        return "mock" if self.endpoint else real
+
+    def redirect(self):
+        u = urllib.parse.urlsplit(self.endpoint)
+        self.host, self.use_https = u.hostname or "127.0.0.1", u.scheme == "https"
+        self.port = u.port or (443 if self.use_https else 80)
+
 class AnthropicProvider(BaseChatProvider):
     def setup(self):
         cfg = _get_config("config.json")
-        api_key = cfg.get("providers", {}).get("anthropic", {}).get("apiKey", "")
+        api_key = self.credential(cfg.get("providers", {}).get("anthropic", {}).get("apiKey", ""))
         if not api_key:
             self.is_valid = False
             self.error_msg = "(nessuna API key Anthropic)"
@@ -36,7 +46,7 @@ class AnthropicProvider(BaseChatProvider):
 class OpenRouterProvider(BaseChatProvider):
     def setup(self):
         or_cfg = _get_config("openrouter.json")
-        api_key = os.environ.get("OPENROUTER_API_KEY", or_cfg.get("apiKey", ""))
+        api_key = self.credential(os.environ.get("OPENROUTER_API_KEY", or_cfg.get("apiKey", "")))
         if not api_key:
             self.is_valid = False
             self.error_msg = "(nessuna API key OpenRouter)"
@@ -82,7 +92,7 @@ class OllamaProvider(BaseChatProvider):
 class BrainProvider(BaseChatProvider):
     """Claude Code CLI via bridge — ragionamento con memoria cross-sessione."""
     def setup(self):
-        if not CLAUDE_BRIDGE_TOKEN:
+        if not CLAUDE_BRIDGE_TOKEN and not self.endpoint:
             self.is_valid = False
             self.error_msg = "(Bridge token mancante)"
             return
@@ -100,14 +110,16 @@ class BrainProvider(BaseChatProvider):
                 last_user_msg = msg["content"]
                 break
         self.payload = json.dumps({
-            "token": CLAUDE_BRIDGE_TOKEN,
+            "token": self.credential(CLAUDE_BRIDGE_TOKEN),
             "prompt": last_user_msg,
             "system_prompt": self.system_prompt,
         })
         self.timeout = 120
         self.parser_type = "ndjson_brain"
 
-def get_provider(provider_id: str, model: str, system_prompt: str, history: list) -> BaseChatProvider:
+def get_provider(provider_id: str, model: str, system_prompt: str, history: list,
+                 endpoint: str = "") -> BaseChatProvider:
+    """endpoint (o MOCK_URL): stesso payload e parser, host/porta del mock."""
     if provider_id == "brain":
         p = BrainProvider(model, system_prompt, history)
     elif provider_id == "anthropic":
@@ -118,5 +130,8 @@ def get_provider(provider_id: str, model: str, system_prompt: str, history: list
         p = OllamaPCProvider(model, system_prompt, history)
     else:
         p = OllamaProvider(model, system_prompt, history)
+    p.endpoint = endpoint or MOCK_URL
     p.setup()
+    if p.endpoint and p.is_valid:
+        p.redirect()
     return p
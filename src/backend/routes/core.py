@@ -1,49 +1,54 @@
 # ─── Background broadcaster ───────────────────────────────────────────────────
 _PEEKING_THRESHOLD = 300   # secondi di idle prima di inviare PEEKING (5 min)
 _BORED_THRESHOLD   = 1800  # secondi di idle prima di inviare BORED (30 min)
-_bridge_status_cache = "offline"  # cache bridge check
+_stats_snapshot: dict = {"pi": None, "tmux": [], "ts": 0}
+STATS_SNAPSHOT_MAX_AGE = 10  # secondi: l'init WS riusa l'ultimo giro del broadcaster
+
+async def _get_stats_snapshot() -> dict:
+    """Ultime stats Pi+tmux. Ricalcola solo se lo snapshot è più vecchio di STATS_SNAPSHOT_MAX_AGE."""
+    if _stats_snapshot["pi"] and time.time() - _stats_snapshot["ts"] < STATS_SNAPSHOT_MAX_AGE:
+        return _stats_snapshot
+    pi, tmux = await asyncio.gather(get_pi_stats(), bg(get_tmux_sessions))
+    _stats_snapshot.update({"pi": pi, "tmux": tmux, "ts": time.time()})
+    return _stats_snapshot
 
 async def stats_broadcaster():
-    global _bridge_status_cache
     cycle = 0
     while True:
         await asyncio.sleep(5)
         cycle += 1
         if cycle % 60 == 0:
             _cleanup_expired()
-        # Bridge check ogni 30 cicli (150s) — non blocca ogni 5s
-        if cycle % 30 == 0:
-            try:
-                result = await bg(check_bridge_health)
-                _bridge_status_cache = result.get("status", "offline")
-            except Exception:
-                _bridge_status_cache = "offline"
+        if cycle % 12 == 0 and _sessions_flush_due():
+            # snapshot sul loop, solo la scrittura su file va nel thread
+            await bg(_write_sessions, _sessions_snapshot())
         # BORED/PEEKING trigger: ogni 60s controlla idle ESP32
         if cycle % 12 == 0 and _tamagotchi_connections:
             idle_secs = time.time() - get_last_chat_ts()
             if (idle_secs > _BORED_THRESHOLD
                     and _tamagotchi_state not in ("BORED", "ALERT", "WORKING", "THINKING", "SLEEPING")):
-                await broadcast_tamagotchi("BORED")
+                await bus.publish(SigilState("BORED"))
             elif (idle_secs > _PEEKING_THRESHOLD
                     and _tamagotchi_state not in ("PEEKING", "SLEEPING", "THINKING", "WORKING", "BORED")):
-                await broadcast_tamagotchi("PEEKING")
+                await bus.publish(SigilState("PEEKING"))
         if manager.connections:
             pi = await get_pi_stats()
             tmux = await bg(get_tmux_sessions)
+            _stats_snapshot.update({"pi": pi, "tmux": tmux, "ts": time.time()})
             await manager.broadcast({
                 "type": "stats",
                 "data": {
                     "pi": pi,
                     "tmux": tmux,
                     "time": time.strftime("%H:%M:%S"),
-                    "bridge": _bridge_status_cache,
+                    "bridge": bridge_status(),
                 }
             })
 
 # ─── Plugin Handler Registration ────────────────────────────────────────────
 def _load_plugin_handlers():
     """Carica handler.py dei plugin e li registra nel WS_DISPATCHER."""
-    for plugin in PLUGINS:
+    for plugin in get_plugins():
         plugin_id = plugin["id"]
         handler_path = Path(plugin["_path"]) / "handler.py"
         if not handler_path.exists():
@@ -72,7 +77,14 @@ def _load_plugin_handlers():
         except Exception as e:
             print(f"[Plugin] {plugin_id}: errore caricamento: {e}")
 
-_load_plugin_handlers()
+_plugin_handlers_loaded = False
+
+def _ensure_plugin_handlers():
+    """exec degli handler plugin rimandato alla prima connessione WS (non all'import)."""
+    global _plugin_handlers_loaded
+    if not _plugin_handlers_loaded:
+        _plugin_handlers_loaded = True
+        _load_plugin_handlers()
 
 @app.websocket("/ws")
 async def websocket_endpoint(websocket: WebSocket):
@@ -80,23 +92,22 @@ async def websocket_endpoint(websocket: WebSocket):
     if not _is_authenticated(token):
         await websocket.close(code=4001, reason="Non autenticato")
         return
+    _ensure_plugin_handlers()
     await manager.connect(websocket)
-    provider_map = {
-        "ollama": "ollama", "cloud": "anthropic", "deepseek": "openrouter",
-        "pc": "ollama_pc", "brain": "brain"
-    }
-    ctx = {k: db_load_chat_history(pid) for k, pid in provider_map.items()}
+    # Stato per-socket: solo flag. Le history chat sono nel ConversationStore condiviso.
+    ctx = {"_memory_enabled": False}
+    snapshot = await _get_stats_snapshot()
     await websocket.send_json({
         "type": "init",
         "data": {
-            "pi": await get_pi_stats(),
-            "tmux": await bg(get_tmux_sessions),
-            "version": get_nanobot_version(),
-            "memory": get_memory_preview(),
+            "pi": snapshot["pi"],
+            "tmux": snapshot["tmux"],
+            "version": await bg(get_nanobot_version),
+            "memory": await bg(get_memory_preview),
             "time": time.strftime("%H:%M:%S"),
         }
     })
-    await broadcast_tamagotchi("CURIOUS")
+    await bus.publish(SigilState("CURIOUS"))
     try:
         while True:
             msg = await websocket.receive_json()
@@ -118,17 +129,17 @@ async def auth_login(request: Request):
     if not PIN_FILE.exists():
         if len(pin) != 4 or not pin.isdigit():
             return JSONResponse({"error": "Il PIN deve essere 4 cifre"}, status_code=400)
-        _set_pin(pin)
+        await bg(_set_pin, pin)  # PBKDF2: ~200ms di CPU, fuori dal loop
         token = _create_session()
         resp = JSONResponse({"ok": True, "setup": True})
         is_secure = request.url.scheme == "https"
         resp.set_cookie("vessel_session", token, max_age=SESSION_TIMEOUT,
                         httponly=True, samesite="lax", secure=is_secure)
         return resp
-    if not _verify_pin(pin):
+    if not await bg(_verify_pin, pin):
         db_log_audit("login_fail", actor=ip)
         return JSONResponse({"error": "PIN errato"}, status_code=401)
-    RATE_LIMITS.pop(f"{ip}:auth", None)
+    RATE_LIMITS.reset(f"{ip}:auth")
     token = _create_session()
     db_log_audit("login", actor=ip)
     resp = JSONResponse({"ok": True})
@@ -140,9 +151,7 @@ async def auth_login(request: Request):
 @app.post("/auth/logout")
 async def auth_logout(request: Request):
     token = request.cookies.get("vessel_session", "")
-    if token in SESSIONS:
-        del SESSIONS[token]
-        _save_sessions()
+    _revoke_session(token)
     db_log_audit("logout", actor=request.client.host)
     resp = JSONResponse({"ok": True})
     is_secure = request.url.scheme == "https"
@@ -160,31 +169,46 @@ async def auth_check(request: Request):
 async def root(request: Request):
     token = request.cookies.get("vessel_session", "")
     if _is_authenticated(token):
-        return HTML
-    return LOGIN_HTML
+        entry = page_asset("html", HTML, "text/html")
+    else:
+        entry = page_asset("login", LOGIN_HTML, "text/html")
+    return serve_asset(request, entry, PAGE_CACHE_CONTROL, vary="Accept-Encoding, Cookie")
+
+@app.get("/static/{name}")
+async def static_bundle(request: Request, name: str):
+    """Bundle CSS/JS content-hashed: cache immutabile, 304 su If-None-Match."""
+    if not _is_authenticated(request.cookies.get("vessel_session", "")):
+        return JSONResponse({"error": "Non autenticato"}, status_code=401)
+    entry = STATIC_ASSETS.get(name)
+    if entry is None:
+        return JSONResponse({"error": "Not found"}, status_code=404)
+    return serve_asset(request, entry, STATIC_CACHE_CONTROL)
+
+MANIFEST = {
+    "name": "Vessel Dashboard",
+    "short_name": "Vessel",
+    "description": "Vessel — AI Dashboard for Raspberry Pi",
+    "start_url": "/",
+    "display": "standalone",
+    "orientation": "any",
+    "background_color": "#060a06",
+    "theme_color": "#060a06",
+    "categories": ["utilities", "productivity"],
+    "icons": [
+        {"src": VESSEL_ICON, "sizes": "64x64", "type": "image/jpeg"},
+        {"src": VESSEL_ICON_192, "sizes": "192x192", "type": "image/jpeg"}
+    ]
+}
 
 @app.get("/manifest.json")
-async def manifest():
-    return {
-        "name": "Vessel Dashboard",
-        "short_name": "Vessel",
-        "description": "Vessel — AI Dashboard for Raspberry Pi",
-        "start_url": "/",
-        "display": "standalone",
-        "orientation": "any",
-        "background_color": "#060a06",
-        "theme_color": "#060a06",
-        "categories": ["utilities", "productivity"],
-        "icons": [
-            {"src": VESSEL_ICON, "sizes": "64x64", "type": "image/jpeg"},
-            {"src": VESSEL_ICON_192, "sizes": "192x192", "type": "image/jpeg"}
-        ]
-    }
+async def manifest(request: Request):
+    entry = page_asset("manifest", json.dumps(MANIFEST, ensure_ascii=False), "application/manifest+json")
+    return serve_asset(request, entry, PAGE_CACHE_CONTROL)
 
-@app.get("/sw.js")
-async def service_worker():
-    sw_code = """
-const CACHE = 'vessel-v4';
+# Navigazioni: network-first con fallback offline. Bundle /static/: cache-first
+# (sono immutabili); quando arriva un hash nuovo si eliminano le versioni vecchie.
+SW_CODE = """
+const CACHE = 'vessel-v5';
 const OFFLINE_URL = '/';
 
 self.addEventListener('install', e => {
@@ -200,6 +224,7 @@ self.addEventListener('activate', e => {
 });
 
 self.addEventListener('fetch', e => {
+  const url = new URL(e.request.url);
   if (e.request.mode === 'navigate') {
     e.respondWith(
       fetch(e.request).then(r => {
@@ -208,31 +233,49 @@ self.addEventListener('fetch', e => {
         return r;
       }).catch(() => caches.match(OFFLINE_URL))
     );
+  } else if (url.origin === location.origin && url.pathname.startsWith('/static/')) {
+    e.respondWith(caches.open(CACHE).then(c => c.match(e.request).then(hit => hit ||
+      fetch(e.request).then(r => {
+        if (r.ok) {
+          const prefix = url.pathname.split('.')[0] + '.';
+          c.keys().then(keys => keys.forEach(k => {
+            const p = new URL(k.url).pathname;
+            if (p.startsWith(prefix) && p !== url.pathname) c.delete(k);
+          }));
+          c.put(e.request, r.clone());
+        }
+        return r;
+      })
+    )));
   }
 });
 """
-    return Response(content=sw_code, media_type="application/javascript",
-                    headers={"Service-Worker-Allowed": "/"})
+
+@app.get("/sw.js")
+async def service_worker(request: Request):
+    resp = serve_asset(request, page_asset("sw", SW_CODE, "application/javascript"), PAGE_CACHE_CONTROL)
+    resp.headers["Service-Worker-Allowed"] = "/"
+    return resp
 
 # ─── API endpoints ───────────────────────────────────────────────────────────
 @app.get("/api/health")
 async def api_health():
     pi = await get_pi_stats()
-    ollama = await bg(check_ollama_health)
-    bridge = await bg(check_bridge_health)
+    ollama, _ = await asyncio.gather(health_get("ollama"), health_get("bridge"))
     return {
         "status": "ok",
         "timestamp": time.time(),
         "services": {
             "pi": pi["health"],
-            "ollama": "online" if ollama else "offline",
-            "bridge": bridge.get("status", "offline")
+            "ollama": "online" if ollama["ok"] else "offline",
+            "bridge": bridge_status()
         },
         "details": {
             "pi_temp": pi.get("temp_val"),
             "pi_cpu": pi.get("cpu_val"),
             "pi_mem": pi.get("mem_pct")
-        }
+        },
+        "checks": health_report()
     }
 
 @app.get("/api/plugins")
@@ -242,7 +285,7 @@ async def api_plugins(request: Request):
     if not _is_authenticated(token):
         return JSONResponse({"error": "Non autenticato"}, status_code=401)
     result = []
-    for plugin in PLUGINS:
+    for plugin in get_plugins():
         p_path = Path(plugin["_path"])
         entry = {"id": plugin["id"], "title": plugin["title"], "icon": plugin["icon"],
                  "tab_label": plugin["tab_label"], "actions": plugin.get("actions", "load"),
@@ -298,6 +341,167 @@ async def api_events_stats(request: Request, since: str = ""):
         return JSONResponse({"error": "Non autenticato"}, status_code=401)
     return db_get_event_stats(since=since)
 
+@app.get("/api/cache/stats")
+async def api_cache_stats(request: Request):
+    """Contatori hit/miss/stale delle cache di servizio (@cached)."""
+    token = request.cookies.get("vessel_session", "")
+    if not _is_authenticated(token):
+        return JSONResponse({"error": "Non autenticato"}, status_code=401)
+    return cache_stats()
+
+@app.get("/api/http/stats")
+async def api_http_stats(request: Request):
+    """Fetch esterni per fonte: latenza, 304, stale, errori (services/fetch.py)."""
+    token = request.cookies.get("vessel_session", "")
+    if not _is_authenticated(token):
+        return JSONResponse({"error": "Non autenticato"}, status_code=401)
+    return http_fetch_stats()
+
+@app.get("/api/debug/loop")
+async def api_debug_loop(request: Request, top: int = 10):
+    """Lag dell'event loop e chiamate che l'hanno bloccato di più (services/debug.py)."""
+    token = request.cookies.get("vessel_session", "")
+    if not _is_authenticated(token):
+        return JSONResponse({"error": "Non autenticato"}, status_code=401)
+    return loop_stats(min(max(top, 1), 50))
+
+@app.get("/metrics")
+async def metrics(request: Request):
+    """Metriche in-process in formato OpenMetrics (services/metrics.py) per lo scrape Prometheus."""
+    # Niente fiducia in localhost: dietro cloudflared ogni richiesta arriva da 127.0.0.1
+    auth = request.headers.get("authorization", "")
+    allowed = bool(METRICS_TOKEN) and secrets.compare_digest(auth, f"Bearer {METRICS_TOKEN}")
+    if not allowed and not _is_authenticated(request.cookies.get("vessel_session", "")):
+        return JSONResponse({"error": "Non autenticato"}, status_code=401)
+    return Response(metrics_render(), media_type="application/openmetrics-text; version=1.0.0; charset=utf-8")
+
+@app.post("/api/debug/profile")
+async def api_debug_profile_run(request: Request):
+    """Profilo CPU a campionamento di N secondi su tutti i thread (services/debug.py)."""
+    token = request.cookies.get("vessel_session", "")
+    if not _is_authenticated(token):
+        return JSONResponse({"error": "Non autenticato"}, status_code=401)
+    ip = request.client.host if request.client else "unknown"
+    if not _rate_limit(ip, "debug_profile", 6, 600):
+        return JSONResponse({"error": "Troppi profili, riprova più tardi"}, status_code=429)
+    if _profile_state["running"]:
+        return JSONResponse({"error": "Profilo già in corso"}, status_code=409)
+    try:
+        body = await request.json()
+        seconds = float(body.get("seconds", 10))
+        interval_ms = float(body.get("interval_ms", PROFILE_INTERVAL * 1000))
+    except (ValueError, TypeError, AttributeError):
+        return JSONResponse({"error": "Parametri non validi"}, status_code=400)
+    if not 1 <= seconds <= PROFILE_MAX_S or not 2 <= interval_ms <= 100:
+        return JSONResponse({"error": f"seconds 1..{PROFILE_MAX_S}, interval_ms 2..100"}, status_code=400)
+    db_log_audit("debug_profile", actor=ip, resource=f"{seconds:g}s")
+    try:
+        result = await cpu_profile(seconds, interval_ms / 1000)
+    except RuntimeError as e:
+        return JSONResponse({"error": str(e)}, status_code=409)
+    return {k: v for k, v in result.items() if k != "collapsed"}
+
+@app.get("/api/debug/profile")
+async def api_debug_profile(request: Request, format: str = "json"):
+    """Ultimo profilo CPU; format=collapsed → stack "collapsed" per flamegraph.pl/speedscope."""
+    token = request.cookies.get("vessel_session", "")
+    if not _is_authenticated(token):
+        return JSONResponse({"error": "Non autenticato"}, status_code=401)
+    last = _profile_state["last"]
+    if not last:
+        return JSONResponse({"error": "Nessun profilo catturato"}, status_code=404)
+    if format == "collapsed":
+        name = "vessel-cpu-" + last["ts"].replace(":", "").replace("-", "") + ".folded"
+        return Response(last["collapsed"], media_type="text/plain; charset=utf-8",
+                        headers={"Content-Disposition": f'attachment; filename="{name}"'})
+    return {**{k: v for k, v in last.items() if k != "collapsed"}, "running": _profile_state["running"]}
+
+@app.get("/api/debug/memory")
+async def api_debug_memory(request: Request):
+    """RSS, stato tracemalloc e dimensione delle strutture longeve."""
+    token = request.cookies.get("vessel_session", "")
+    if not _is_authenticated(token):
+        return JSONResponse({"error": "Non autenticato"}, status_code=401)
+    return {**mem_trace_status(), **await bg(mem_suspects)}
+
+@app.post("/api/debug/memory")
+async def api_debug_memory_action(request: Request):
+    """tracemalloc: action=start (baseline) | diff (top punti cresciuti) | stop."""
+    token = request.cookies.get("vessel_session", "")
+    if not _is_authenticated(token):
+        return JSONResponse({"error": "Non autenticato"}, status_code=401)
+    ip = request.client.host if request.client else "unknown"
+    if not _rate_limit(ip, "debug_memory", 20, 600):
+        return JSONResponse({"error": "Troppe richieste, riprova più tardi"}, status_code=429)
+    try:
+        body = await request.json()
+        action = str(body.get("action", ""))
+        top = min(max(int(body.get("top", 20)), 1), 100)
+        frames = int(body.get("frames", MEM_TRACE_FRAMES))
+    except (ValueError, TypeError, AttributeError):
+        return JSONResponse({"error": "Parametri non validi"}, status_code=400)
+    group = "traceback" if body.get("group") == "traceback" else "lineno"
+    if action == "start":
+        db_log_audit("debug_memory_start", actor=ip)
+        return await mem_trace_begin(frames)
+    if action == "stop":
+        return mem_trace_stop()
+    if action == "diff":
+        try:
+            return await bg(mem_trace_diff, top, group, bool(body.get("rebase", False)))
+        except RuntimeError as e:
+            return JSONResponse({"error": str(e)}, status_code=409)
+    return JSONResponse({"error": "action: start | diff | stop"}, status_code=400)
+
+@app.get("/api/bench/runs")
+async def api_bench_runs(request: Request, provider: str = "", limit: int = 20):
+    """Storico benchmark provider (services/bench.py), dal più recente."""
+    token = request.cookies.get("vessel_session", "")
+    if not _is_authenticated(token):
+        return JSONResponse({"error": "Non autenticato"}, status_code=401)
+    return {"runs": await bg(db_get_bench_runs, provider, min(max(limit, 1), 100)),
+            "running": _bench_running}
+
+@app.post("/api/bench/run")
+async def api_bench_run(request: Request):
+    """Avvia un benchmark in background; il risultato arriva via WS (bench_result) e in /api/bench/runs."""
+    token = request.cookies.get("vessel_session", "")
+    if not _is_authenticated(token):
+        return JSONResponse({"error": "Non autenticato"}, status_code=401)
+    ip = request.client.host if request.client else "unknown"
+    if not _rate_limit(ip, "bench", 3, 600):
+        return JSONResponse({"error": "Troppi benchmark, riprova più tardi"}, status_code=429)
+    if _bench_running:
+        return JSONResponse({"error": "Benchmark già in corso"}, status_code=409)
+    try:
+        body = await request.json()
+        provider_id = str(body.get("provider", "ollama"))
+        concurrency = tuple(int(c) for c in body.get("concurrency", [1, 2, 4]))
+        rounds = int(body.get("rounds", 1))
+    except (ValueError, TypeError, AttributeError):
+        return JSONResponse({"error": "Parametri non validi"}, status_code=400)
+    endpoint = str(body.get("endpoint", ""))
+    if provider_id not in BENCH_PROVIDERS:
+        return JSONResponse({"error": "Provider sconosciuto"}, status_code=400)
+    if not concurrency or not all(1 <= c <= 16 for c in concurrency) or not 1 <= rounds <= 5:
+        return JSONResponse({"error": "concurrency 1..16, rounds 1..5"}, status_code=400)
+    if endpoint and not re.match(r"^https?://[\w.\-]+(:\d+)?/?$", endpoint):
+        return JSONResponse({"error": "endpoint non valido"}, status_code=400)
+    db_log_audit("bench_run", actor=ip, resource=provider_id)
+
+    async def _run():
+        async def _progress(c, level):
+            await manager.broadcast({"type": "bench_progress", "concurrency": c, "level": level})
+        try:
+            run = await bench_run(provider_id, str(body.get("model", ""))[:80], concurrency, rounds,
+                                  endpoint=endpoint, memory=bool(body.get("memory", True)),
+                                  label=str(body.get("label", ""))[:40], on_progress=_progress)
+            await manager.broadcast({"type": "bench_result", "run": run})
+        except Exception as e:
+            await manager.broadcast({"type": "bench_result", "error": str(e)[:200]})
+    asyncio.create_task(_run())
+    return {"started": True}
+
 @app.get("/api/chat/history")
 async def api_chat_history(request: Request, channel: str = "dashboard",
                            provider: str = "", date: str = "today", limit: int = 50):
@@ -385,3 +589,5 @@ async def export_data(request: Request):
         "Content-Disposition": 'attachment; filename="vessel_export.zip"'
     }
     return Response(zip_buffer.getvalue(), headers=headers, media_type="application/x-zip-compressed")
+
+_boot_mark("routes")
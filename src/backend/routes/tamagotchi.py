@@ -3,36 +3,106 @@ _tamagotchi_connections: set = set()
 _tamagotchi_state: str = "IDLE"
 _mood_counter: dict = {"happy": 0, "alert": 0, "error": 0}
 
-async def broadcast_tamagotchi(state: str, detail: str = "", text: str = "", mood: dict | None = None):
-    global _tamagotchi_state, _mood_counter
-    _tamagotchi_state = state
-    # Aggiorna mood counter
-    if state in ("HAPPY", "PROUD"): _mood_counter["happy"] += 1
-    elif state == "ALERT":         _mood_counter["alert"] += 1
-    elif state == "ERROR":         _mood_counter["error"] += 1
-    elif state == "SLEEPING":
-        # Reset counter dopo invio (fine giornata)
-        pass
-    payload: dict = {"state": state}
-    if detail:
-        payload["detail"] = detail
-    if text:
-        payload["text"] = text
-    if mood is not None:
-        payload["mood"] = mood
+# ─── Consegna stato: coalescing, seq/ack, resync ─────────────────────────────
+# Una chat produce THINKING → emozione in pochi ms, più heartbeat e timer: ogni
+# transizione era un frame radio e un'animazione sul T-Display. Le richieste
+# dentro la finestra TAMAGOTCHI_DEBOUNCE si fondono in un solo frame (vince
+# l'ultimo stato, detail/text/mood si uniscono) con numero di sequenza.
+# Protocollo v2 (il device lo annuncia con {"hello": {"proto": 2, "last_seq": N,
+# "binary": true}}): ack per frame, al reconnect e a ack mancanti si rimanda solo
+# lo snapshot corrente. I device v1 ricevono lo stesso frame JSON ("seq" ignorato).
+TAMAGOTCHI_DEBOUNCE = 0.25
+TAMAGOTCHI_HELLO_WAIT = 2.0  # attesa del primo messaggio (hello) dopo accept
+# Indice = codice di stato nei frame binari: allineato a STATE_CODES nel firmware
+SIGIL_STATE_CODES = ("IDLE", "THINKING", "WORKING", "PROUD", "SLEEPING", "ERROR", "BOOTING",
+                     "HAPPY", "ALERT", "CURIOUS", "BORED", "PEEKING")
+SIGIL_FRAME_MAGIC = 0x53  # 'S'
+SIGIL_FRAME_HEAD = struct.Struct("<BBIBBBB")  # magic, flags, seq, stato, happy, alert, error
+
+_sigil_seq = 0
+_sigil_state_sent = "IDLE"   # stato dell'ultimo frame consegnato (snapshot per resync)
+_sigil_pending: dict | None = None
+_sigil_flush_task: asyncio.Task | None = None
+_sigil_peers: dict = {}      # ws → {"proto": 1|2, "binary": bool, "acked": int}
+SIGIL_STATS = {"requested": 0, "frames": 0, "coalesced": 0, "resyncs": 0, "acks": 0}
+
+def _sigil_pack(frame: dict) -> bytes:
+    """Frame binario: header 10 byte + detail/text con prefisso di lunghezza (max 255 byte)."""
+    mood = frame.get("mood") or {}
+    head = SIGIL_FRAME_HEAD.pack(
+        SIGIL_FRAME_MAGIC, 1 if "mood" in frame else 0, frame["seq"] & 0xFFFFFFFF,
+        SIGIL_STATE_CODES.index(frame["state"]),
+        *(min(int(mood.get(k, 0) or 0), 255) for k in ("happy", "alert", "error")))
+    out = [head]
+    for key in ("detail", "text"):
+        raw = frame.get(key, "").encode("utf-8")[:255].decode("utf-8", "ignore").encode("utf-8")
+        out.append(bytes((len(raw),)) + raw)
+    return b"".join(out)
+
+async def _sigil_send(ws, frame: dict):
+    if _sigil_peers.get(ws, {}).get("binary"):
+        await ws.send_bytes(_sigil_pack(frame))
+    else:
+        await ws.send_json(frame)
+
+async def _sigil_send_snapshot(ws):
+    """Resync: solo lo stato corrente, non la coda delle transizioni perse."""
+    SIGIL_STATS["resyncs"] += 1
+    await _sigil_send(ws, {"state": _sigil_state_sent, "seq": _sigil_seq})
+
+async def _sigil_flush_later():
+    global _sigil_seq, _sigil_pending, _sigil_state_sent
+    await asyncio.sleep(TAMAGOTCHI_DEBOUNCE)
+    frame, _sigil_pending = _sigil_pending, None
+    if not frame:
+        return
+    _sigil_seq += 1
+    frame["seq"] = _sigil_seq
+    _sigil_state_sent = frame["state"]
+    SIGIL_STATS["frames"] += 1
     dead = set()
     for ws in _tamagotchi_connections.copy():
         try:
-            await ws.send_json(payload)
+            await _sigil_send(ws, frame)
         except Exception:
             dead.add(ws)
     _tamagotchi_connections.difference_update(dead)
     # Notifica dashboard WS clients (Fase 38 — Emotion Bridge)
     try:
-        await manager.broadcast({"type": "sigil_state", "state": state})
+        await manager.broadcast({"type": "sigil_state", "state": frame["state"]})
     except Exception:
         pass
 
+def _sigil_enqueue(state: str, detail: str = "", text: str = "", mood: dict | None = None):
+    """Fonde la transizione nel frame in attesa e pianifica il flush."""
+    global _sigil_pending, _sigil_flush_task
+    SIGIL_STATS["requested"] += 1
+    if _sigil_pending is None:
+        _sigil_pending = {}
+    else:
+        SIGIL_STATS["coalesced"] += 1
+    _sigil_pending["state"] = state
+    if detail:
+        _sigil_pending["detail"] = detail
+    if text:
+        _sigil_pending["text"] = text
+    if mood is not None:
+        _sigil_pending["mood"] = mood
+    if _sigil_flush_task is None or _sigil_flush_task.done():
+        _sigil_flush_task = asyncio.create_task(_sigil_flush_later())
+
+async def broadcast_tamagotchi(state: str, detail: str = "", text: str = "", mood: dict | None = None):
+    global _tamagotchi_state, _mood_counter
+    _tamagotchi_state = state
+    # Aggiorna mood counter
+    if state in ("HAPPY", "PROUD"): _mood_counter["happy"] += 1
+    elif state == "ALERT":         _mood_counter["alert"] += 1
+    elif state == "ERROR":         _mood_counter["error"] += 1
+    elif state == "SLEEPING":
+        # Reset counter dopo invio (fine giornata)
+        pass
+    _sigil_enqueue(state, detail, text, mood)
+
 async def broadcast_tamagotchi_raw(payload: dict):
     """Invia payload arbitrario (es. crypto_update) all'ESP32 senza modificare _tamagotchi_state."""
     dead = set()
@@ -43,6 +113,33 @@ async def broadcast_tamagotchi_raw(payload: dict):
             dead.add(ws)
     _tamagotchi_connections.difference_update(dead)
 
+# ─── Subscriber del bus: unico punto che parla con ESP32 e dashboard ─────────
+@bus.on(SigilState)
+async def _on_sigil_state(e: SigilState):
+    global _mood_counter
+    await broadcast_tamagotchi(e.state, e.detail, e.text, e.mood)
+    if e.state == "SLEEPING":
+        _mood_counter = {"happy": 0, "alert": 0, "error": 0}
+
+@bus.on(SigilText)
+async def _on_sigil_text(e: SigilText):
+    # Il firmware si aspetta "state" per processare il payload — manteniamo lo stato corrente
+    _sigil_enqueue(_tamagotchi_state, text=e.text)
+
+@bus.on(CryptoUpdate)
+async def _on_crypto_update(e: CryptoUpdate):
+    await broadcast_tamagotchi_raw({"action": "crypto_update", "btc": e.btc, "eth": e.eth,
+                                    "btc_change": e.btc_change, "eth_change": e.eth_change})
+
+@bus.on(Alert)
+async def _on_alert(e: Alert):
+    await broadcast_tamagotchi("ALERT")
+
+bus.provide("sigil.mood", lambda: dict(_mood_counter))
+bus.provide("sigil.state", lambda: {"state": _tamagotchi_state, "seq": _sigil_seq,
+                                    "clients": len(_tamagotchi_connections)})
+bus.provide("sigil.clients", lambda: len(_tamagotchi_connections))
+
 async def _handle_tamagotchi_cmd(ws: WebSocket, cmd: str, req_id: int):
     """Gestisce un comando inviato dall'ESP32 e risponde."""
     try:
@@ -82,19 +179,19 @@ async def _handle_tamagotchi_cmd(ws: WebSocket, cmd: str, req_id: int):
             subprocess.run(["sudo", "shutdown", "-h", "now"])
 
         elif cmd == "run_briefing":
-            await bg(run_briefing)
+            await run_briefing()
             await ws.send_json({"resp": "run_briefing", "req_id": req_id, "ok": True,
                                 "data": {"msg": "Briefing generato"}})
 
         elif cmd == "check_ollama":
-            alive = await bg(check_ollama_health)
+            ollama = await health_get("ollama", max_age=HEALTH_ON_DEMAND_AGE)
             await ws.send_json({"resp": "check_ollama", "req_id": req_id, "ok": True,
-                                "data": {"alive": alive}})
+                                "data": {"alive": bool(ollama["ok"])}})
 
         elif cmd == "check_bridge":
-            health = await bg(check_bridge_health)
+            await health_get("bridge", max_age=HEALTH_ON_DEMAND_AGE)
             await ws.send_json({"resp": "check_bridge", "req_id": req_id, "ok": True,
-                                "data": health})
+                                "data": {"status": bridge_status()}})
 
         elif cmd == "warmup_ollama":
             await bg(warmup_ollama)
@@ -113,55 +210,93 @@ async def _handle_tamagotchi_cmd(ws: WebSocket, cmd: str, req_id: int):
         except Exception:
             pass
 
+def _sigil_int(value, default=None):
+    """Intero dal device; stringhe, float, bool o null valgono default (mai eccezioni)."""
+    return value if isinstance(value, int) and not isinstance(value, bool) else default
+
+async def _handle_tamagotchi_msg(ws: WebSocket, data: str):
+    """hello (protocollo v2), ack di un frame di stato, comandi menu."""
+    try:
+        msg = json.loads(data)
+    except (json.JSONDecodeError, ValueError):
+        return
+    if not isinstance(msg, dict):
+        return
+    peer = _sigil_peers.setdefault(ws, {"proto": 1, "binary": False, "acked": 0})
+    if "hello" in msg:
+        hello = msg["hello"] if isinstance(msg["hello"], dict) else {}
+        peer["proto"] = _sigil_int(hello.get("proto"), 1) or 1
+        peer["binary"] = bool(hello.get("binary")) and peer["proto"] >= 2
+        peer["acked"] = _sigil_int(hello.get("last_seq"), 0)
+        peer["id"] = str(hello.get("id", ""))[:32] or ws.client.host
+        peer["fw"] = str(hello.get("fw", ""))[:32]
+        db_log_event("esp32", "hello", payload={"proto": peer["proto"], "binary": peer["binary"],
+                                                 "last_seq": peer["acked"], "seq": _sigil_seq,
+                                                 "id": peer["id"], "fw": peer["fw"]})
+        await _sigil_send_snapshot(ws)
+    elif "ack" in msg:
+        ack = _sigil_int(msg["ack"])
+        if ack is not None:        # ack malformato: ignorato, il socket resta su
+            SIGIL_STATS["acks"] += 1
+            peer["acked"] = max(peer["acked"], ack)
+    elif isinstance(msg.get("ota"), dict):
+        # Esito OTA dal device: ok (riavvio), skip (versione già installata), error
+        ota = msg["ota"]
+        status = str(ota.get("status", ""))[:16]
+        await _ota_update(peer.get("id") or ws.client.host, status=status,
+                          version=str(ota.get("version", ""))[:32], error=str(ota.get("error", ""))[:80])
+        db_log_event("esp32", "ota_result", status="ok" if status in ("ok", "skip") else "error", payload=ota)
+    elif msg.get("cmd"):
+        await _handle_tamagotchi_cmd(ws, msg["cmd"], msg.get("req_id", 0))
+
 @app.websocket("/ws/tamagotchi")
 async def tamagotchi_ws(websocket: WebSocket):
     await websocket.accept()
     _tamagotchi_connections.add(websocket)
+    peer = _sigil_peers.setdefault(websocket, {"proto": 1, "binary": False, "acked": 0})
     db_log_event("esp32", "connect", payload={"ip": websocket.client.host})
     print(f"[Tamagotchi] ESP32 connesso da {websocket.client.host}")
     try:
-        await websocket.send_json({"state": _tamagotchi_state})
+        # Il firmware v2 si presenta con hello; i v1 mandano "Connected" o nulla
+        try:
+            first = await asyncio.wait_for(websocket.receive_text(), timeout=TAMAGOTCHI_HELLO_WAIT)
+            await _handle_tamagotchi_msg(websocket, first)
+        except asyncio.TimeoutError:
+            pass
+        if peer["proto"] < 2:
+            await websocket.send_json({"state": _sigil_state_sent, "seq": _sigil_seq})
         while True:
             try:
                 data = await asyncio.wait_for(websocket.receive_text(), timeout=30.0)
-                try:
-                    msg = json.loads(data)
-                    cmd = msg.get("cmd")
-                    if cmd:
-                        req_id = msg.get("req_id", 0)
-                        await _handle_tamagotchi_cmd(websocket, cmd, req_id)
-                        continue
-                except (json.JSONDecodeError, ValueError):
-                    pass
+                await _handle_tamagotchi_msg(websocket, data)
             except asyncio.TimeoutError:
                 await websocket.send_json({"ping": True})
+                # Frame non confermato (perso in radio): rimanda lo snapshot
+                if peer["proto"] >= 2 and peer["acked"] < _sigil_seq:
+                    await _sigil_send_snapshot(websocket)
     except WebSocketDisconnect:
-        _tamagotchi_connections.discard(websocket)
         db_log_event("esp32", "disconnect")
         print("[Tamagotchi] ESP32 disconnesso")
     except Exception:
-        _tamagotchi_connections.discard(websocket)
         db_log_event("esp32", "disconnect", status="error")
+    finally:
+        _tamagotchi_connections.discard(websocket)
+        _sigil_peers.pop(websocket, None)
 
 @app.post("/api/tamagotchi/state")
 async def set_tamagotchi_state(request: Request):
-    """Aggiorna lo stato del tamagotchi ESP32. Chiamabile da cron/script locali."""
+    """Aggiorna lo stato del tamagotchi ESP32 (pubblica sul bus). Gli script locali
+    usano il socket del bus; l'endpoint resta per client esterni."""
     try:
         data = await request.json()
     except Exception:
         return JSONResponse({"ok": False, "error": "JSON non valido"}, status_code=400)
-    global _mood_counter
-    state  = data.get("state", "")
-    detail = data.get("detail", "")
-    text   = data.get("text", "")
-    mood   = data.get("mood", None)
-    valid_states = {"IDLE", "THINKING", "WORKING", "PROUD", "SLEEPING", "ERROR", "BOOTING", "HAPPY", "ALERT", "CURIOUS", "BORED", "PEEKING"}
-    if state not in valid_states:
-        return JSONResponse({"ok": False, "error": f"Stato non valido. Validi: {valid_states}"}, status_code=400)
-    await broadcast_tamagotchi(state, detail, text, mood)
-    if state == "SLEEPING":
-        _mood_counter = {"happy": 0, "alert": 0, "error": 0}
-    return {"ok": True, "state": state, "clients": len(_tamagotchi_connections)}
+    try:
+        event = bus_event("sigil.state", data)
+    except ValueError:
+        return JSONResponse({"ok": False, "error": f"Stato non valido. Validi: {set(SIGIL_STATES)}"}, status_code=400)
+    await bus.publish(event)
+    return {"ok": True, "state": event.state, "clients": len(_tamagotchi_connections)}
 
 @app.post("/api/tamagotchi/text")
 async def send_tamagotchi_text(request: Request):
@@ -170,39 +305,159 @@ async def send_tamagotchi_text(request: Request):
         data = await request.json()
     except Exception:
         return JSONResponse({"ok": False, "error": "JSON non valido"}, status_code=400)
-    text = data.get("text", "").strip()
-    if not text or len(text) > 64:
-        return JSONResponse({"ok": False, "error": "Testo vuoto o troppo lungo (max 64)"}, status_code=400)
-    # Il firmware si aspetta "state" per processare il payload — manteniamo lo stato corrente
-    await broadcast_tamagotchi_raw({"state": _tamagotchi_state, "text": text})
-    return {"ok": True, "text": text, "clients": len(_tamagotchi_connections)}
+    try:
+        event = SigilText(str(data.get("text", "")).strip())
+    except ValueError as e:
+        return JSONResponse({"ok": False, "error": str(e)}, status_code=400)
+    await bus.publish(event)
+    return {"ok": True, "text": event.text, "clients": len(_tamagotchi_connections)}
+
+# ─── OTA firmware: manifest, download a range, progresso per device ──────────
+# Sul 2.4 GHz il download cadeva a metà e ripartiva da zero. Il device legge il
+# manifest (versione, dimensione, sha256), salta l'update se ha già quella
+# versione e riprende da dove si è interrotto con Range + If-Range (ETag = sha256:
+# se il .bin cambia nel frattempo riparte da capo invece di mischiare due build).
+TAMAGOTCHI_FW_DIR = Path.home() / ".nanobot" / "firmware"
+TAMAGOTCHI_FW_CHUNK = 16 * 1024
+TAMAGOTCHI_OTA_NOTIFY = 1.0  # intervallo minimo tra due ota_progress alla dashboard (s)
+_RANGE_RE = re.compile(r"bytes=(\d*)-(\d*)$")
+_fw_manifest_cache: dict = {}
+_ota_progress: dict = {}     # device → {version, offset, size, pct, status, attempts, updated}
+
+def _firmware_manifest() -> dict | None:
+    """Manifest del firmware corrente; sha256 ricalcolato solo se il file cambia.
+    La versione arriva da tamagotchi.json (scritto da build.py), altrimenti dallo sha."""
+    fw = TAMAGOTCHI_FW_DIR / "tamagotchi.bin"
+    try:
+        st = fw.stat()
+    except FileNotFoundError:
+        return None
+    key = (st.st_mtime_ns, st.st_size)
+    if _fw_manifest_cache.get("key") == key:
+        return _fw_manifest_cache["manifest"]
+    h = hashlib.sha256()
+    with open(fw, "rb") as f:
+        while chunk := f.read(1 << 16):
+            h.update(chunk)
+    sha = h.hexdigest()
+    version = sha[:12]
+    try:
+        version = json.loads((TAMAGOTCHI_FW_DIR / "tamagotchi.json").read_text()).get("version") or version
+    except (OSError, ValueError):
+        pass
+    manifest = {"version": version, "size": st.st_size, "sha256": sha,
+                "chunk": TAMAGOTCHI_FW_CHUNK, "url": "/api/tamagotchi/firmware"}
+    _fw_manifest_cache.update(key=key, manifest=manifest)
+    return manifest
+
+def _parse_range(header: str, size: int) -> tuple[int, int] | None:
+    """"bytes=a-b" / "bytes=a-" / "bytes=-n" → (start, end) inclusivo. None se non soddisfacibile."""
+    m = _RANGE_RE.match(header.strip())
+    if not m or not (m.group(1) or m.group(2)):
+        return None
+    if not m.group(1):
+        start, end = max(size - int(m.group(2)), 0), size - 1
+    else:
+        start = int(m.group(1))
+        end = min(int(m.group(2)), size - 1) if m.group(2) else size - 1
+    return (start, end) if start <= end < size else None
+
+async def _ota_update(device: str, **fields):
+    """Aggiorna il progresso di un device e lo notifica alla dashboard."""
+    p = _ota_progress.setdefault(device, {"device": device, "attempts": 0, "status": "idle"})
+    p.update(fields, updated=time.time())
+    try:
+        await manager.broadcast({"type": "ota_progress", "data": dict(p)})
+    except Exception:
+        pass
+
+@app.get("/api/tamagotchi/firmware/manifest")
+async def get_tamagotchi_firmware_manifest():
+    manifest = await bg(_firmware_manifest)
+    if not manifest:
+        return JSONResponse({"error": "Firmware non trovato. Esegui il deploy prima."}, status_code=404)
+    return manifest
 
 @app.get("/api/tamagotchi/firmware")
-async def get_tamagotchi_firmware():
-    """Serve il firmware .bin per OTA update ESP32."""
-    from pathlib import Path as _Path
-    from fastapi.responses import FileResponse
-    fw = _Path.home() / ".nanobot" / "firmware" / "tamagotchi.bin"
-    if not fw.exists():
+async def get_tamagotchi_firmware(request: Request):
+    """Serve il firmware .bin per OTA update ESP32, a pezzi e con supporto Range."""
+    manifest = await bg(_firmware_manifest)
+    if not manifest:
         return JSONResponse({"error": "Firmware non trovato. Esegui il deploy prima."}, status_code=404)
-    return FileResponse(str(fw), media_type="application/octet-stream", filename="tamagotchi.bin")
+    size, etag = manifest["size"], f'"{manifest["sha256"]}"'
+    headers = {"Accept-Ranges": "bytes", "ETag": etag, "X-Firmware-Version": manifest["version"]}
+    start, end, status = 0, size - 1, 200
+    range_h = request.headers.get("range")
+    if range_h and request.headers.get("if-range", etag) == etag:
+        rng = _parse_range(range_h, size)
+        if rng is None:
+            return Response(status_code=416, headers={"Content-Range": f"bytes */{size}", **headers})
+        start, end, status = rng[0], rng[1], 206
+        headers["Content-Range"] = f"bytes {start}-{end}/{size}"
+    headers["Content-Length"] = str(end - start + 1)
+    device = request.headers.get("x-sigil-id") or request.client.host
+    prev = _ota_progress.get(device, {})
+    await _ota_update(device, version=manifest["version"], size=size, offset=start,
+                      pct=start * 100 // size, status="downloading",
+                      attempts=prev.get("attempts", 0) + 1 if start else 1)
+    fw_path = TAMAGOTCHI_FW_DIR / "tamagotchi.bin"
+
+    async def _stream():
+        pos, last_notify = start, 0.0
+        with open(fw_path, "rb") as f:
+            f.seek(start)
+            try:
+                while pos <= end:
+                    chunk = await bg(f.read, min(TAMAGOTCHI_FW_CHUNK, end - pos + 1))
+                    if not chunk:
+                        break
+                    pos += len(chunk)
+                    yield chunk
+                    if time.time() - last_notify >= TAMAGOTCHI_OTA_NOTIFY or pos > end:
+                        last_notify = time.time()
+                        await _ota_update(device, offset=pos, pct=pos * 100 // size,
+                                          status="downloaded" if pos >= size else "downloading")
+            finally:
+                if pos <= end or _ota_progress.get(device, {}).get("status") == "downloading":
+                    # Connessione caduta: il device riprenderà da qui con Range
+                    _ota_progress.get(device, {}).update(offset=pos, pct=pos * 100 // size,
+                                                         status="interrupted", updated=time.time())
+                    db_log_event("esp32", "ota_interrupted", status="error",
+                                 payload={"device": device, "offset": pos, "size": size})
+
+    return StreamingResponse(_stream(), status_code=status, headers=headers,
+                             media_type="application/octet-stream")
 
 @app.post("/api/tamagotchi/ota")
 async def trigger_tamagotchi_ota(request: Request):
-    """Invia comando OTA all'ESP32 via WebSocket."""
+    """Invia comando OTA all'ESP32 via WebSocket (con la versione del manifest)."""
+    manifest = await bg(_firmware_manifest)
+    if not manifest:
+        return JSONResponse({"ok": False, "error": "Firmware non trovato. Esegui il deploy prima."},
+                            status_code=404)
     dead = set()
     for ws in _tamagotchi_connections.copy():
         try:
-            await ws.send_json({"action": "ota_update"})
+            await ws.send_json({"action": "ota_update", "version": manifest["version"]})
         except Exception:
             dead.add(ws)
     _tamagotchi_connections.difference_update(dead)
-    clients = len(_tamagotchi_connections) - len(dead)
-    return {"ok": True, "notified": clients}
+    clients = len(_tamagotchi_connections)
+    db_log_event("esp32", "ota_trigger", payload={"version": manifest["version"], "clients": clients})
+    return {"ok": True, "notified": clients, "version": manifest["version"],
+            "status": f"OTA {manifest['version']} → {clients} device"}
+
+@app.get("/api/tamagotchi/ota")
+async def get_tamagotchi_ota():
+    """Progresso OTA per device + manifest corrente."""
+    return {"manifest": await bg(_firmware_manifest), "devices": list(_ota_progress.values())}
 
 @app.get("/api/tamagotchi/state")
 async def get_tamagotchi_state():
-    return {"state": _tamagotchi_state, "clients": len(_tamagotchi_connections)}
+    return {"state": _tamagotchi_state, "clients": len(_tamagotchi_connections), "seq": _sigil_seq,
+            "peers": [{"id": p.get("id", ""), "fw": p.get("fw", ""), "proto": p["proto"],
+                       "binary": p["binary"], "acked": p["acked"]} for p in _sigil_peers.values()],
+            "delivery": dict(SIGIL_STATS)}
 
 @app.get("/api/tamagotchi/mood")
 async def get_tamagotchi_mood():
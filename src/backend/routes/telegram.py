@@ -1,6 +1,4 @@
 # ─── Telegram polling ────────────────────────────────────────────────────────
-_tg_histories: dict[str, list] = {}
-
 _BRAINSTORM_SYSTEM = (
     "Sei in modalità BRAINSTORMING. Il tuo compito è:\n"
     "- Generare 10-15 idee diverse, creative e inaspettate sull'argomento dato\n"
@@ -19,50 +17,51 @@ _TELEGRAM_BREVITY = (
 )
 
 # ─── Prefetch: esecuzione comandi reali per arricchire il contesto Telegram ──
-_GHELPER_PY = str(Path.home() / ".local/share/google-workspace-mcp/bin/python")
-_GHELPER_SCRIPT = str(Path.home() / "scripts/google_helper.py")
-_GHELPER = f"{_GHELPER_PY} {_GHELPER_SCRIPT}"
+def _run_local(argv: list) -> str:
+    r = subprocess.run(argv, capture_output=True, text=True, timeout=30)
+    return (r.stdout + r.stderr).strip()
 
 async def _prefetch_context(text: str) -> str:
     """Rileva intent e esegue comandi reali sul Pi. Ritorna output da iniettare nel contesto."""
     low = text.lower()
-    cmds = []
+    cmds = []  # argomenti google_helper
+    local = []  # comandi di sistema (lista argomenti, niente shell)
     # Google Tasks
     if any(k in low for k in ["google task", "i miei task", "le mie task", "task di oggi",
                                "leggi i task", "mostra i task", "lista task",
                                "quali task", "ho da fare", "cosa devo fare", "task da fare",
                                "i task", "to do", "todo", "cose da fare"]):
-        cmds.append(f"{_GHELPER} tasks list")
+        cmds.append(["tasks", "list"])
     # Calendario domani (prima di oggi per priorità match)
     if "domani" in low and any(k in low for k in ["calendario", "agenda", "eventi", "appuntamenti", "impegni"]):
-        cmds.append(f"{_GHELPER} calendar tomorrow")
+        cmds.append(["calendar", "tomorrow"])
     # Calendario oggi (o generico senza "domani/settimana")
     elif any(k in low for k in ["calendario", "agenda oggi", "eventi di oggi",
                                  "appuntamenti oggi", "impegni oggi",
                                  "in calendario", "in agenda", "ho appuntamenti"]):
-        cmds.append(f"{_GHELPER} calendar today")
+        cmds.append(["calendar", "today"])
     # Briefing (calendario + tasks combo)
     if "briefing" in low:
-        if not any("calendar" in c for c in cmds):
-            cmds.append(f"{_GHELPER} calendar today")
-        if not any("tasks" in c for c in cmds):
-            cmds.append(f"{_GHELPER} tasks list")
+        if not any(c[0] == "calendar" for c in cmds):
+            cmds.append(["calendar", "today"])
+        if not any(c[0] == "tasks" for c in cmds):
+            cmds.append(["tasks", "list"])
     # Crontab
     if any(k in low for k in ["cron", "crontab"]):
-        cmds.append("crontab -l")
+        local.append(["crontab", "-l"])
     # Spazio disco
     if any(k in low for k in ["spazio disco", "quanto spazio", "spazio su disco"]):
-        cmds.append("df -h /")
+        local.append(["df", "-h", "/"])
     # Gmail
     if any(k in low for k in ["gmail", "mail non lette", "email non lette", "la posta", "le mail",
                                "email nuov", "mail nuov", "ho email", "ho mail", "le email",
                                "controlla email", "controlla mail", "check mail", "la mail",
                                "posta elettronica", "inbox"]):
-        cmds.append(f"{_GHELPER} gmail unread")
+        cmds.append(["gmail", "unread"])
     # Google Docs
     if any(k in low for k in ["google doc", "i miei doc", "i miei documenti", "lista doc",
                                "documenti recenti", "ultimi doc", "apri doc"]):
-        cmds.append(f"{_GHELPER} docs list 8")
+        cmds.append(["docs", "list", "8"])
     # Note rapide (query sincrona DB, non serve executor)
     notes_part = ""
     if any(k in low for k in ["le mie note", "mie note", "ho scritto", "appunti", "ricordami cosa", "cosa ho annotato"]):
@@ -71,20 +70,16 @@ async def _prefetch_context(text: str) -> str:
             notes_text = "\n".join(f"[{n['ts'][:10]}] #{n['id']}: {n['content'][:120]}" for n in notes)
             notes_part = f"Note recenti:\n{notes_text}"
 
-    if not cmds and not notes_part:
+    if not cmds and not local and not notes_part:
         return ""
-    loop = asyncio.get_running_loop()
+    # Tutte le letture partono insieme: il tempo è quello della più lenta
+    jobs = [bg(google_call, c) for c in cmds] + [bg(_run_local, c) for c in local]
     parts = []
-    for cmd in cmds:
-        try:
-            def _run(c=cmd):
-                r = subprocess.run(c, shell=True, capture_output=True, text=True, timeout=30)
-                return (r.stdout + r.stderr).strip()
-            out = await loop.run_in_executor(None, _run)
-            if out:
-                parts.append(out)
-        except Exception as e:
-            print(f"[Telegram] Prefetch error: {e}")
+    for out in await asyncio.gather(*jobs, return_exceptions=True):
+        if isinstance(out, Exception):
+            print(f"[Telegram] Prefetch error: {out}")
+        elif out:
+            parts.append(out)
     if notes_part:
         parts.append(notes_part)
     if not parts:
@@ -92,11 +87,6 @@ async def _prefetch_context(text: str) -> str:
     print(f"[Telegram] Prefetch: {len(parts)} risultati per '{text[:50]}'")
     return "\n\n".join(parts)
 
-def _tg_history(provider_id: str) -> list:
-    if provider_id not in _tg_histories:
-        _tg_histories[provider_id] = db_load_chat_history(provider_id, channel="telegram")
-    return _tg_histories[provider_id]
-
 def _resolve_telegram_provider(text: str) -> tuple[str, str, str, str]:
     """Risolve prefisso provider dal testo Telegram. Ritorna (provider_id, system, model, clean_text)."""
     low = text.lower()
@@ -127,7 +117,7 @@ async def _handle_telegram_message(text: str):
             f"Uptime: {pi['uptime']}\n"
             f"Tmux: {sessions}"
         )
-        telegram_send(reply)
+        await tg_send(reply)
         return
 
     if text.strip() == "/help":
@@ -154,7 +144,7 @@ async def _handle_telegram_message(text: str):
             "  /voice <msg> - risposta vocale\n"
             "  /help - questo messaggio"
         )
-        telegram_send(reply)
+        await tg_send(reply)
         return
 
     low = text.strip().lower()
@@ -168,9 +158,9 @@ async def _handle_telegram_message(text: str):
             tags = " ".join(_re.findall(r'#\w+', content))
             note_id = db_add_note(content, tags=tags)
             tag_str = f" [{tags}]" if tags else ""
-            telegram_send(f"📌 Nota #{note_id} salvata{tag_str}.")
+            await tg_send(f"📌 Nota #{note_id} salvata{tag_str}.")
         else:
-            telegram_send("Uso: /nota <testo>")
+            await tg_send("Uso: /nota <testo>")
         return
 
     if low == "/note" or low.startswith("/note "):
@@ -181,38 +171,37 @@ async def _handle_telegram_message(text: str):
             n = 5
         notes = db_get_notes(n)
         if not notes:
-            telegram_send("Nessuna nota salvata.")
+            await tg_send("Nessuna nota salvata.")
             return
         lines = [f"#{n_['id']} [{n_['ts'][:10]}] {n_['content'][:90]}" for n_ in notes]
-        telegram_send(f"📌 Ultime {len(notes)} note:\n" + "\n".join(lines))
+        await tg_send(f"📌 Ultime {len(notes)} note:\n" + "\n".join(lines))
         return
 
     if low.startswith("/cerca "):
         kw = text[7:].strip()
         results = db_search_notes(kw)
         if not results:
-            telegram_send(f"Nessuna nota per '{kw}'.")
+            await tg_send(f"Nessuna nota per '{kw}'.")
             return
         lines = [f"#{n['id']} [{n['ts'][:10]}] {n['content'][:80]}" for n in results]
-        telegram_send(f"🔍 '{kw}':\n" + "\n".join(lines))
+        await tg_send(f"🔍 '{kw}':\n" + "\n".join(lines))
         return
 
     if low.startswith("/delnota "):
         try:
             note_id = int(text[9:].strip())
             if db_delete_note(note_id):
-                telegram_send(f"🗑 Nota #{note_id} eliminata.")
+                await tg_send(f"🗑 Nota #{note_id} eliminata.")
             else:
-                telegram_send(f"Nota #{note_id} non trovata.")
+                await tg_send(f"Nota #{note_id} non trovata.")
         except ValueError:
-            telegram_send("Uso: /delnota <id>")
+            await tg_send("Uso: /delnota <id>")
         return
 
     # ─── Fase 42: Google Docs ─────────────────────────────────────────────────
     if low.startswith("/docs"):
         args_raw = text.strip()[5:].strip()   # tutto dopo "/docs"
         args_low = args_raw.lower()
-        loop = asyncio.get_running_loop()
 
         if not args_raw or args_low == "list" or args_low.startswith("list"):
             n = 8
@@ -220,52 +209,34 @@ async def _handle_telegram_message(text: str):
                 n = min(int(args_low.split()[1]), 15)
             except (ValueError, IndexError):
                 pass
-            def _docs_list(n=n):
-                r = subprocess.run(
-                    f"{_GHELPER} docs list {n}",
-                    shell=True, capture_output=True, text=True, timeout=30
-                )
-                return (r.stdout + r.stderr).strip()
-            out = await loop.run_in_executor(None, _docs_list)
-            telegram_send(out or "Nessun documento trovato.")
+            out = await bg(google_call, ["docs", "list", str(n)])
+            await tg_send(out or "Nessun documento trovato.")
 
         elif args_low.startswith("read "):
             title = args_raw[5:].strip()
             if not title:
-                telegram_send("Uso: /docs read <titolo>")
+                await tg_send("Uso: /docs read <titolo>")
             else:
-                def _docs_read(t=title):
-                    r = subprocess.run(
-                        [_GHELPER_PY, _GHELPER_SCRIPT, "docs", "read", t],
-                        capture_output=True, text=True, timeout=30
-                    )
-                    return (r.stdout + r.stderr).strip()
-                out = await loop.run_in_executor(None, _docs_read)
+                out = await bg(google_call, ["docs", "read", title])
                 if len(out) > 3800:
                     out = out[:3800] + "\n[...troncato]"
-                telegram_send(out or "Documento non trovato.")
+                await tg_send(out or "Documento non trovato.")
 
         elif args_low.startswith("append "):
             rest = args_raw[7:].strip()
             if "|" not in rest:
-                telegram_send("Uso: /docs append <titolo> | <testo da aggiungere>")
+                await tg_send("Uso: /docs append <titolo> | <testo da aggiungere>")
             else:
                 title, testo = rest.split("|", 1)
                 title, testo = title.strip(), testo.strip()
                 if not title or not testo:
-                    telegram_send("Uso: /docs append <titolo> | <testo da aggiungere>")
+                    await tg_send("Uso: /docs append <titolo> | <testo da aggiungere>")
                 else:
-                    def _docs_append(t=title, tx=testo):
-                        r = subprocess.run(
-                            [_GHELPER_PY, _GHELPER_SCRIPT, "docs", "append", t, tx],
-                            capture_output=True, text=True, timeout=30
-                        )
-                        return (r.stdout + r.stderr).strip()
-                    out = await loop.run_in_executor(None, _docs_append)
-                    telegram_send(out or "✅ Testo aggiunto.")
+                    out = await bg(google_call, ["docs", "append", title, testo])
+                    await tg_send(out or "✅ Testo aggiunto.")
 
         else:
-            telegram_send(
+            await tg_send(
                 "📄 Google Docs:\n"
                 "  /docs list [N] — lista documenti\n"
                 "  /docs read <titolo> — leggi documento\n"
@@ -280,9 +251,9 @@ async def _handle_telegram_message(text: str):
         kg_desc = parts[1].strip()
         if kg_name and kg_desc:
             eid = db_upsert_entity("memo", kg_name, kg_desc)
-            telegram_send(f"🧠 Ricordato: {kg_name} (#{eid})")
+            await tg_send(f"🧠 Ricordato: {kg_name} (#{eid})")
         else:
-            telegram_send("Uso: /ricorda <nome> = <descrizione>")
+            await tg_send("Uso: /ricorda <nome> = <descrizione>")
         return
 
     if low.startswith("/chi "):
@@ -295,7 +266,7 @@ async def _handle_telegram_message(text: str):
         else:
             kg_query = rest.strip()
         if not kg_query:
-            telegram_send("Uso: /chi è <nome>")
+            await tg_send("Uso: /chi è <nome>")
             return
         entity = db_search_entity(kg_query)
         if entity:
@@ -309,7 +280,7 @@ async def _handle_telegram_message(text: str):
                     for r in entity["relations"][:3]
                 )
                 lines.append(f"Relazioni: {rels_str}")
-            telegram_send("\n".join(lines))
+            await tg_send("\n".join(lines))
             return
         # Non trovato nel KG → fallthrough all'LLM (usa FRIENDS.md + context)
         text = f"Chi è {kg_query}?"
@@ -321,7 +292,7 @@ async def _handle_telegram_message(text: str):
     if low.startswith("/brainstorm "):
         text = text[12:].strip()
         if not text:
-            telegram_send("Uso: /brainstorm <argomento>")
+            await tg_send("Uso: /brainstorm <argomento>")
             return
         brainstorm_mode = True
         system = _BRAINSTORM_SYSTEM
@@ -329,7 +300,7 @@ async def _handle_telegram_message(text: str):
         text = text[7:].strip()
         send_voice = True
     elif low == "/voice":
-        telegram_send("Uso: /voice <messaggio>")
+        await tg_send("Uso: /voice <messaggio>")
         return
 
     # Prefetch: esecui comandi reali se il messaggio matcha pattern noti
@@ -338,31 +309,61 @@ async def _handle_telegram_message(text: str):
     if context:
         enriched_text = f"[DATI REALI DAL SISTEMA — usa questi per rispondere:]\n{context}\n\n[RICHIESTA:] {text}"
 
-    history = _tg_history(provider_id)
-    await broadcast_tamagotchi("THINKING")
+    history = await conversations.get(provider_id, channel="telegram")
+    await bus.publish(SigilState("THINKING"))
     if send_voice:
         voice_prefix = (
             "[L'utente ha richiesto risposta vocale — rispondi in modo conciso e naturale, "
             "come in una conversazione parlata. Niente emoji, asterischi, elenchi, "
             "formattazione markdown o roleplay. Max 2-3 frasi.] "
         )
-        reply = await _chat_response(voice_prefix + enriched_text, history, provider_id, system, model, channel="telegram")
-        telegram_send(reply)
-        await broadcast_tamagotchi(detect_emotion(reply or ""), detail="Telegram", text=text[:40])
-        loop = asyncio.get_running_loop()
-        def _tts_send():
-            ogg = text_to_voice(reply)
-            if ogg:
-                telegram_send_voice(ogg)
-        loop.run_in_executor(None, _tts_send)
+        reply = await _telegram_reply(voice_prefix + enriched_text, history, provider_id, system, model,
+                                      voice=True)
+        await bus.publish(SigilState(detect_emotion(reply or ""), detail="Telegram", text=text[:40]))
     else:
-        reply = await _chat_response(enriched_text, history, provider_id, system, model, channel="telegram")
-        telegram_send(reply)
-        await broadcast_tamagotchi(detect_emotion(reply or ""), detail="Telegram", text=text[:40])
+        reply = await _telegram_reply(enriched_text, history, provider_id, system, model)
+        await bus.publish(SigilState(detect_emotion(reply or ""), detail="Telegram", text=text[:40]))
         # Brainstorm: salva sessione come nota #brainstorm silenziosamente
         if brainstorm_mode and reply:
             db_add_note(f"[Brainstorm: {text[:60]}]\n{reply}", tags="#brainstorm")
 
+async def _telegram_reply(message: str, history: list, provider_id: str,
+                          system: str, model: str, voice: bool = False) -> str:
+    """Genera e invia la risposta. In streaming il telefono vede il testo crescere
+    (placeholder + edit throttled) come la dashboard; altrimenti un invio unico.
+    Con voice=True il vocale segue: a frasi durante la generazione (TTS_PIPELINE)
+    oppure sintetizzato a risposta completa."""
+    streamer = TelegramStreamer() if TELEGRAM_STREAMING else None
+    speaker = VoicePipeline() if voice and TTS_PIPELINE != "off" else None
+    sinks = [x.on_chunk for x in (streamer, speaker) if x is not None]
+
+    async def on_chunk(chunk: str):
+        for sink in sinks:
+            await sink(chunk)
+
+    if streamer:
+        await streamer.start()
+    reply = await _chat_response(message, history, provider_id, system, model,
+                                 channel="telegram", on_chunk=on_chunk if sinks else None)
+    if streamer:
+        await streamer.finish(reply)
+    else:
+        await tg_send(reply, wait=False)
+    if speaker:
+        asyncio.create_task(speaker.finish(reply))
+    elif voice:
+        asyncio.create_task(_send_voice_reply(reply))
+    return reply
+
+async def _send_voice_reply(reply: str):
+    """TTS (pipe Edge TTS → ffmpeg, solo I/O: resta sul loop), poi sendVoice
+    accodato dopo il testo (stessa coda chat)."""
+    ogg = await tts_ogg(reply)
+    if ogg:
+        await tg_send_voice(ogg)
+    else:
+        print("[TTS] Generazione vocale fallita, risposta solo testo")
+
 VOICE_MAX_DURATION = 180
 
 async def _handle_telegram_voice(voice: dict):
@@ -372,21 +373,21 @@ async def _handle_telegram_voice(voice: dict):
     if not file_id:
         return
     if duration > VOICE_MAX_DURATION:
-        telegram_send(f"Il vocale è troppo lungo ({duration}s, max {VOICE_MAX_DURATION}s). Prova con uno più breve.")
+        await tg_send(f"Il vocale è troppo lungo ({duration}s, max {VOICE_MAX_DURATION}s). Prova con uno più breve.")
         return
 
     file_path = await bg(telegram_get_file, file_id)
     if not file_path:
-        telegram_send("Non riesco a recuperare il vocale. Riprova.")
+        await tg_send("Non riesco a recuperare il vocale. Riprova.")
         return
     audio_bytes = await bg(telegram_download_file, file_path)
     if not audio_bytes:
-        telegram_send("Non riesco a scaricare il vocale. Riprova.")
+        await tg_send("Non riesco a scaricare il vocale. Riprova.")
         return
 
     text = await bg(transcribe_voice, audio_bytes)
     if not text:
-        telegram_send("Non sono riuscito a trascrivere il vocale. Prova a scrivere.")
+        await tg_send("Non sono riuscito a trascrivere il vocale. Prova a scrivere.")
         return
 
     print(f"[Telegram] Vocale trascritto ({duration}s): {text[:80]}...")
@@ -401,56 +402,51 @@ async def _handle_telegram_voice(voice: dict):
     )
     voice_text = voice_prefix + text
 
-    history = _tg_history(provider_id)
-    await broadcast_tamagotchi("THINKING")
-    reply = await _chat_response(voice_text, history, provider_id, system, model, channel="telegram")
+    history = await conversations.get(provider_id, channel="telegram")
+    await bus.publish(SigilState("THINKING"))
+    reply = await _telegram_reply(voice_text, history, provider_id, system, model, voice=True)
+    await bus.publish(SigilState(detect_emotion(reply or ""), detail="Telegram", text=text[:40]))
 
-    telegram_send(reply)
-    await broadcast_tamagotchi(detect_emotion(reply or ""), detail="Telegram", text=text[:40])
 
-    loop = asyncio.get_running_loop()
-    def _tts_and_send():
-        ogg = text_to_voice(reply)
-        if ogg:
-            telegram_send_voice(ogg)
-        else:
-            print("[TTS] Generazione vocale fallita, risposta solo testo")
-    loop.run_in_executor(None, _tts_and_send)
+async def _dispatch_update(upd: dict, slots: asyncio.Semaphore):
+    """Gestisce un update col limite di concorrenza (il polling non si ferma)."""
+    async with slots:
+        try:
+            msg = upd.get("message") or upd.get("edited_message")
+            if not msg:
+                return
+            chat_id = str(msg.get("chat", {}).get("id", ""))
+            if chat_id != TELEGRAM_CHAT_ID:
+                print(f"[Telegram] Messaggio da chat non autorizzata: {chat_id}")
+                return
+            voice = msg.get("voice")
+            if voice:
+                db_log_event("telegram", "receive", payload={"type": "voice", "duration": voice.get("duration", 0)})
+                await _handle_telegram_voice(voice)
+                return
+            text = msg.get("text", "").strip()
+            if not text:
+                return
+            db_log_event("telegram", "receive", payload={"type": "text", "chars": len(text)})
+            await _handle_telegram_message(text)
+        except Exception as e:
+            print(f"[Telegram] Errore gestione update: {e}")
 
 
 async def telegram_polling_task():
-    """Long polling Telegram. Avviato nel lifespan se token configurato."""
+    """Long polling Telegram su connessione keep-alive. Avviato nel lifespan se token configurato.
+    Gli update sono gestiti in task separati, al massimo TELEGRAM_MAX_INFLIGHT alla volta."""
     offset = 0
+    slots = asyncio.Semaphore(TELEGRAM_MAX_INFLIGHT)
     print("[Telegram] Polling avviato")
     while True:
         try:
-            url = f"https://api.telegram.org/bot{TELEGRAM_TOKEN}/getUpdates?offset={offset}&timeout=30"
-
-            def _poll():
-                req = urllib.request.Request(url)
-                with urllib.request.urlopen(req, timeout=35) as resp:
-                    return json.loads(resp.read())
-
-            updates = await asyncio.get_running_loop().run_in_executor(None, _poll)
-            for upd in updates.get("result", []):
+            updates = await tg_client.get_updates(offset)
+            for upd in updates:
                 offset = upd["update_id"] + 1
-                msg = upd.get("message") or upd.get("edited_message")
-                if not msg:
-                    continue
-                chat_id = str(msg.get("chat", {}).get("id", ""))
-                if chat_id != TELEGRAM_CHAT_ID:
-                    print(f"[Telegram] Messaggio da chat non autorizzata: {chat_id}")
-                    continue
-                voice = msg.get("voice")
-                if voice:
-                    db_log_event("telegram", "receive", payload={"type": "voice", "duration": voice.get("duration", 0)})
-                    asyncio.create_task(_handle_telegram_voice(voice))
-                    continue
-                text = msg.get("text", "").strip()
-                if not text:
-                    continue
-                db_log_event("telegram", "receive", payload={"type": "text", "chars": len(text)})
-                asyncio.create_task(_handle_telegram_message(text))
+                asyncio.create_task(_dispatch_update(upd, slots))
+        except TelegramRetryAfter as e:
+            await asyncio.sleep(e.retry_after)
         except Exception as e:
             print(f"[Telegram] Polling error: {e}")
             await asyncio.sleep(10)
@@ -1,14 +1,11 @@
-# ─── Auto-routing helper (Fase 39C) ──────────────────────────────────────────
-def _resolve_auto_params(provider_id: str) -> tuple:
-    """Risolve (ctx_key, model) per il routing automatico agente."""
-    _map = {
-        "anthropic": ("cloud", ANTHROPIC_MODEL),
-        "ollama": ("ollama", OLLAMA_MODEL),
-        "ollama_pc": ("pc", OLLAMA_PC_MODEL),
-        "openrouter": ("deepseek", OPENROUTER_MODEL),
-        "brain": ("brain", BRAIN_MODEL),
-    }
-    return _map.get(provider_id, ("cloud", ANTHROPIC_MODEL))
+# ─── Chat routing (provider UI → provider_id, system, model) ─────────────────
+_DASHBOARD_PROVIDERS = {
+    "local":    ("ollama", OLLAMA_SYSTEM, OLLAMA_MODEL),
+    "pc":       ("ollama_pc", OLLAMA_PC_SYSTEM, OLLAMA_PC_MODEL),
+    "deepseek": ("openrouter", OPENROUTER_SYSTEM, OPENROUTER_MODEL),
+    "brain":    ("brain", BRAIN_SYSTEM, BRAIN_MODEL),
+    "cloud":    ("anthropic", ANTHROPIC_SYSTEM, ANTHROPIC_MODEL),
+}
 
 # ─── WebSocket Handlers ──────────────────────────────────────────────────────
 async def handle_chat(websocket, msg, ctx):
@@ -20,42 +17,42 @@ async def handle_chat(websocket, msg, ctx):
         await websocket.send_json({"type": "chat_reply", "text": "[!] Troppi messaggi. Attendi un momento."})
         return
     await websocket.send_json({"type": "chat_thinking"})
-    await broadcast_tamagotchi("THINKING")
+    await bus.publish(SigilState("THINKING"))
     mem = ctx.get("_memory_enabled", False)
-    reply = ""
+    agent_id = ""
     if provider == "auto":
         agent_id = detect_agent(text)
         agent_cfg = get_agent_config(agent_id)
         pid = agent_cfg.get("default_provider", "anthropic")
         system = build_agent_prompt(agent_id, pid)
-        ctx_key, default_model = _resolve_auto_params(pid)
-        model = agent_cfg.get("model", default_model)
-        reply = await _stream_chat(websocket, text, ctx[ctx_key], pid, system, model, memory_enabled=mem, agent_id=agent_id)
-    elif provider == "local":
-        reply = await _stream_chat(websocket, text, ctx["ollama"], "ollama", OLLAMA_SYSTEM, OLLAMA_MODEL, memory_enabled=mem)
-    elif provider == "pc":
-        reply = await _stream_chat(websocket, text, ctx["pc"], "ollama_pc", OLLAMA_PC_SYSTEM, OLLAMA_PC_MODEL, memory_enabled=mem)
-    elif provider == "deepseek":
-        reply = await _stream_chat(websocket, text, ctx["deepseek"], "openrouter", OPENROUTER_SYSTEM, OPENROUTER_MODEL, memory_enabled=mem)
-    elif provider == "brain":
-        reply = await _stream_chat(websocket, text, ctx["brain"], "brain", BRAIN_SYSTEM, BRAIN_MODEL, memory_enabled=mem)
+        model = agent_cfg.get("model", _provider_defaults(pid)[0])
     else:
-        reply = await _stream_chat(websocket, text, ctx["cloud"], "anthropic", ANTHROPIC_SYSTEM, ANTHROPIC_MODEL, memory_enabled=mem)
+        pid, system, model = _DASHBOARD_PROVIDERS.get(provider, _DASHBOARD_PROVIDERS["cloud"])
+    # History condivisa tra tutte le connessioni dashboard (lazy load da SQLite)
+    history = await conversations.get(pid)
+    reply = await _stream_chat(websocket, text, history, pid, system, model,
+                               memory_enabled=mem, agent_id=agent_id)
     emotion = detect_emotion(reply or "")
-    await broadcast_tamagotchi(emotion)
+    await bus.publish(SigilState(emotion))
 
 async def handle_clear_chat(websocket, msg, ctx):
-    for val in list(ctx.values()):
-        if isinstance(val, list):
-            val.clear()
-    db_clear_chat_history("dashboard")
+    conversations.clear("dashboard")
+    await bg(db_clear_chat_history, "dashboard")
+
+async def handle_chat_page(websocket, msg, ctx):
+    """Storico chat dashboard a pagine (la lista virtualizzata chiede le più vecchie scorrendo)."""
+    before = msg.get("before", 0)
+    if not isinstance(before, int) or before < 0:
+        before = 0
+    page = await bg(db_get_chat_page, "dashboard", before, 30)
+    await websocket.send_json({"type": "chat_page", "before": before, **page})
 
 async def handle_check_ollama(websocket, msg, ctx):
-    alive = await bg(check_ollama_health)
-    await websocket.send_json({"type": "ollama_status", "alive": alive})
+    ollama = await health_get("ollama", max_age=HEALTH_ON_DEMAND_AGE)
+    await websocket.send_json({"type": "ollama_status", "alive": bool(ollama["ok"])})
 
 async def handle_get_memory(websocket, msg, ctx):
-    await websocket.send_json({"type": "memory", "text": get_memory_preview()})
+    await websocket.send_json({"type": "memory", "text": await bg(get_memory_preview)})
 
 async def handle_get_history(websocket, msg, ctx):
     await websocket.send_json({"type": "history", "text": get_history_preview()})
@@ -64,11 +61,11 @@ async def handle_get_quickref(websocket, msg, ctx):
     await websocket.send_json({"type": "quickref", "text": get_quickref_preview()})
 
 async def handle_get_stats(websocket, msg, ctx):
-    bridge = await bg(check_bridge_health)
+    await health_get("bridge")
     await websocket.send_json({
         "type": "stats",
         "data": {"pi": await get_pi_stats(), "tmux": await bg(get_tmux_sessions), "time": time.strftime("%H:%M:%S"),
-                 "bridge": bridge.get("status", "offline")}
+                 "bridge": bridge_status()}
     })
 
 async def handle_get_logs(websocket, msg, ctx):
@@ -81,6 +78,34 @@ async def handle_get_cron(websocket, msg, ctx):
     jobs = await bg(get_cron_jobs)
     await websocket.send_json({"type": "cron", "jobs": jobs})
 
+async def handle_get_jobs(websocket, msg, ctx):
+    await websocket.send_json({"type": "jobs", "jobs": await bg(job_list)})
+
+async def handle_run_job(websocket, msg, ctx):
+    """Trigger manuale di un job dello scheduler (progresso via job_progress)."""
+    ip = websocket.client.host
+    name = msg.get("name", "")
+    if name not in JOB_DEFAULTS:
+        await websocket.send_json({"type": "toast", "text": "[!] Job sconosciuto"})
+        return
+    if not _rate_limit(ip, "run_job", 5, 60):
+        await websocket.send_json({"type": "toast", "text": "[!] Troppi tentativi"})
+        return
+    db_log_audit("job_run", actor=ip, resource=name)
+    await websocket.send_json({"type": "toast", "text": f"[..] {name} avviato"})
+    # Un job dura fino al suo timeout (30 min per deep_learn/self_evolve): gira in un task
+    # così il loop di ricezione del socket resta libero; l'esito arriva con job_progress
+    asyncio.create_task(_run_job_manual(name))
+
+async def _run_job_manual(name: str):
+    await run_job(name, "manual")
+    await manager.broadcast({"type": "jobs", "jobs": await bg(job_list)})
+
+async def handle_get_job_runs(websocket, msg, ctx):
+    name = msg.get("name", "")
+    runs = await bg(db_get_job_runs, name, 10)
+    await websocket.send_json({"type": "job_runs", "job": name, "runs": runs})
+
 async def handle_add_cron(websocket, msg, ctx):
     ip = websocket.client.host
     if not _rate_limit(ip, "cron", 10, 60):
@@ -129,10 +154,13 @@ async def handle_get_briefing(websocket, msg, ctx):
 
 async def handle_run_briefing(websocket, msg, ctx):
     await websocket.send_json({"type": "toast", "text": "[..] Generazione briefing…"})
-    bd = await bg(run_briefing)
-    await websocket.send_json({"type": "briefing", "data": bd})
-    await websocket.send_json({"type": "toast", "text": "[ok] Briefing generato con successo", "notify": True})
-    await broadcast_tamagotchi("PROUD", detail="Briefing", text="Briefing completato")
+    asyncio.create_task(_run_briefing_manual())
+
+async def _run_briefing_manual():
+    bd = await run_briefing()
+    await manager.broadcast({"type": "briefing", "data": bd})
+    await manager.broadcast({"type": "toast", "text": "[ok] Briefing generato con successo", "notify": True})
+    await bus.publish(SigilState("PROUD", detail="Briefing", text="Briefing completato"))
 
 async def handle_tmux_kill(websocket, msg, ctx):
     session = msg.get("session", "")
@@ -238,31 +266,24 @@ async def handle_deep_learn(websocket, msg, ctx):
         await websocket.send_json({"type": "toast", "text": "Deep Learn gia' eseguito di recente (max 1/h)"})
         return
     await websocket.send_json({"type": "toast", "text": "Deep Learn in corso... (1-2 minuti)"})
-    await broadcast_tamagotchi("THINKING")
-    try:
-        def _run():
-            r = subprocess.run(
-                ["python3.13", str(Path.home() / "deep_learn.py")],
-                capture_output=True, text=True, timeout=300
-            )
-            return (r.stdout + r.stderr).strip()
-        output = await bg(_run)
-        notes = db_get_notes(1)
+    await bus.publish(SigilState("THINKING"))
+    asyncio.create_task(_run_deep_learn_manual())
+
+async def _run_deep_learn_manual():
+    res = await run_job("deep_learn", "manual")
+    if res["ok"]:
+        notes = await bg(db_get_notes, 1)
         if notes and "#deep_learn" in (notes[0].get("tags") or ""):
             result_text = notes[0]["content"][:500]
         else:
-            result_text = output[-500:] if output else "Nessun output"
-        await websocket.send_json({"type": "deep_learn_result", "text": result_text})
-        await websocket.send_json({"type": "toast", "text": "Deep Learn completato"})
-        await broadcast_tamagotchi("PROUD", detail="Deep Learn", text="Apprendimento completato")
-    except subprocess.TimeoutExpired:
-        await websocket.send_json({"type": "deep_learn_result", "text": "Timeout (5 min)"})
-        await websocket.send_json({"type": "toast", "text": "Deep Learn: timeout"})
-        await broadcast_tamagotchi("ERROR")
-    except Exception as e:
-        await websocket.send_json({"type": "deep_learn_result", "text": f"Errore: {e}"})
-        await websocket.send_json({"type": "toast", "text": f"Deep Learn errore: {e}"})
-        await broadcast_tamagotchi("ERROR")
+            result_text = "Nessun output"
+        await manager.broadcast({"type": "deep_learn_result", "text": result_text})
+        await manager.broadcast({"type": "toast", "text": "Deep Learn completato"})
+        await bus.publish(SigilState("PROUD", detail="Deep Learn", text="Apprendimento completato"))
+    else:
+        await manager.broadcast({"type": "deep_learn_result", "text": f"Errore: {res['error']}"})
+        await manager.broadcast({"type": "toast", "text": f"Deep Learn: {res['error']}"})
+        await bus.publish(SigilState("ERROR"))
 
 async def handle_get_sigil_state(websocket, msg, ctx):
     await websocket.send_json({"type": "sigil_state", "state": _tamagotchi_state})
@@ -332,6 +353,7 @@ async def handle_get_analytics(websocket, msg, ctx):
             "latency": analytics.get("latency", []),
             "errors": analytics.get("errors", []),
             "failovers": failovers,
+            "loop": loop_stats(5),
         }
     })
 
@@ -342,9 +364,94 @@ async def handle_get_heatmap(websocket, msg, ctx):
     data = await bg(db_get_activity_heatmap, days)
     await websocket.send_json({"type": "heatmap", "data": data})
 
+# ─── Bootstrap (snapshot iniziale dashboard in un solo round trip) ───────────
+
+async def _bs_stats():
+    snap = await _get_stats_snapshot()
+    return {"type": "stats", "data": {"pi": snap["pi"], "tmux": snap["tmux"],
+                                      "time": time.strftime("%H:%M:%S"),
+                                      "bridge": bridge_status()}}
+
+async def _bs_sigil_state():
+    return {"type": "sigil_state", "state": _tamagotchi_state}
+
+async def _bs_briefing():
+    return {"type": "briefing", "data": await bg(get_briefing_data)}
+
+async def _bs_tokens():
+    return {"type": "tokens", "data": await bg(get_token_stats)}
+
+async def _bs_usage_report():
+    return {"type": "usage_report", "data": await bg(db_get_usage_report, "day")}
+
+async def _bs_cron():
+    return {"type": "cron", "jobs": await bg(get_cron_jobs)}
+
+async def _bs_jobs():
+    return {"type": "jobs", "jobs": await bg(job_list)}
+
+async def _bs_logs():
+    return {"type": "logs", "data": await bg(get_nanobot_logs, 80, "", "")}
+
+async def _bs_entities():
+    entities, relations = await asyncio.gather(bg(db_get_entities, ""), bg(db_get_relations))
+    return {"type": "knowledge_graph", "entities": entities, "relations": relations}
+
+async def _bs_chat_page():
+    return {"type": "chat_page", "before": 0, **await bg(db_get_chat_page, "dashboard", 0, 30)}
+
+async def _bs_saved_prompts():
+    return {"type": "saved_prompts", "prompts": await bg(db_get_saved_prompts)}
+
+_BOOTSTRAP_SECTIONS = {
+    "stats": _bs_stats,
+    "sigil_state": _bs_sigil_state,
+    "briefing": _bs_briefing,
+    "tokens": _bs_tokens,
+    "usage_report": _bs_usage_report,
+    "cron": _bs_cron,
+    "jobs": _bs_jobs,
+    "logs": _bs_logs,
+    "entities": _bs_entities,
+    "saved_prompts": _bs_saved_prompts,
+    "chat_page": _bs_chat_page,
+}
+# Above the fold (header + card Home): fonti locali/cache, spedite in un unico frame
+_BOOTSTRAP_CRITICAL = ("stats", "sigil_state", "briefing")
+
+async def handle_bootstrap(websocket, msg, ctx):
+    """Snapshot iniziale: tutte le sezioni partono in parallelo, le critical escono
+    insieme in un frame 'bootstrap', le altre in streaming appena pronte."""
+    t0 = time.time()
+    tasks = {name: asyncio.create_task(fn()) for name, fn in _BOOTSTRAP_SECTIONS.items()}
+    weather = WS_DISPATCHER.get("plugin_weather")
+    if weather:
+        # Il plugin invia da sé la propria risposta: gira in parallelo e basta
+        tasks["plugin_weather"] = asyncio.create_task(
+            weather(websocket, {"action": "plugin_weather"}, ctx))
+    critical = []
+    for name in _BOOTSTRAP_CRITICAL:
+        try:
+            critical.append(await tasks.pop(name))
+        except Exception as e:
+            print(f"[Bootstrap] {name}: {e}")
+    await websocket.send_json({"type": "bootstrap", "messages": critical})
+    for fut in asyncio.as_completed(list(tasks.values())):
+        try:
+            out = await fut
+        except Exception as e:
+            print(f"[Bootstrap] sezione fallita: {e}")
+            continue
+        if out:
+            await websocket.send_json(out)
+    await websocket.send_json({"type": "bootstrap_done",
+                               "ms": int((time.time() - t0) * 1000)})
+
 WS_DISPATCHER = {
+    "bootstrap": handle_bootstrap,
     "chat": handle_chat,
     "clear_chat": handle_clear_chat,
+    "chat_page": handle_chat_page,
     "check_ollama": handle_check_ollama,
     "get_memory": handle_get_memory,
     "get_history": handle_get_history,
@@ -354,6 +461,9 @@ WS_DISPATCHER = {
     "get_cron": handle_get_cron,
     "add_cron": handle_add_cron,
     "delete_cron": handle_delete_cron,
+    "get_jobs": handle_get_jobs,
+    "run_job": handle_run_job,
+    "get_job_runs": handle_get_job_runs,
     "get_tokens": handle_get_tokens,
     "get_usage_report": handle_get_usage_report,
     "get_crypto": handle_get_crypto,
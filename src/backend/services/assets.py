@@ -0,0 +1,68 @@
+# ─── Static assets (bundle precompressi + ETag + 304) ────────────────────────
+# build.py genera STATIC_BUNDLES: nome content-hashed → testo + gzip/br in base64.
+# Qui si decodificano una volta sola; le pagine (HTML, login, sw.js, manifest)
+# vengono compresse al primo accesso e poi servite sempre dalla stessa entry.
+
+STATIC_CACHE_CONTROL = "private, max-age=31536000, immutable"  # nome cambia a ogni build
+PAGE_CACHE_CONTROL = "no-cache"  # sempre rivalidata via ETag
+
+def _asset_entry(body, content_type: str, gz: bytes | None = None, br: bytes | None = None,
+                 etag: str = "") -> dict:
+    if isinstance(body, str):
+        body = body.encode("utf-8")
+    if gz is None:
+        gz = gzip.compress(body, 9, mtime=0)
+    if br is None and brotli is not None:
+        br = brotli.compress(body)
+    return {
+        "type": content_type,
+        "etag": etag or f'"{hashlib.sha256(body).hexdigest()[:16]}"',
+        "identity": body,
+        "gzip": gz,
+        "br": br,
+    }
+
+STATIC_ASSETS: dict[str, dict] = {
+    name: _asset_entry(a["raw"], a["type"],
+                       gz=base64.b64decode(a["gz"]),
+                       br=base64.b64decode(a["br"]) if "br" in a else None,
+                       etag=a["etag"])
+    for name, a in STATIC_BUNDLES.items()
+}
+
+_PAGE_ASSETS: dict[str, dict] = {}
+
+def page_asset(key: str, body, content_type: str) -> dict:
+    """Entry precompressa per una pagina generata in-process (calcolata una volta)."""
+    entry = _PAGE_ASSETS.get(key)
+    if entry is None:
+        entry = _asset_entry(body, content_type)
+        _PAGE_ASSETS[key] = entry
+    return entry
+
+def _accepted_encodings(request: Request) -> set[str]:
+    accepted = set()
+    for part in request.headers.get("accept-encoding", "").split(","):
+        token, _, params = part.strip().partition(";")
+        if token and params.replace(" ", "") not in ("q=0", "q=0.0"):
+            accepted.add(token.lower())
+    return accepted
+
+def serve_asset(request: Request, entry: dict, cache_control: str,
+                vary: str = "Accept-Encoding") -> Response:
+    """Risposta con ETag/Cache-Control; 304 se If-None-Match combacia,
+    altrimenti la variante già compressa migliore accettata dal client."""
+    headers = {"ETag": entry["etag"], "Cache-Control": cache_control, "Vary": vary}
+    if_none_match = request.headers.get("if-none-match", "")
+    if if_none_match:
+        tags = {t.strip().removeprefix("W/") for t in if_none_match.split(",")}
+        if "*" in tags or entry["etag"] in tags:
+            return Response(status_code=304, headers=headers)
+    accepted = _accepted_encodings(request)
+    if entry["br"] is not None and "br" in accepted:
+        body, headers["Content-Encoding"] = entry["br"], "br"
+    elif "gzip" in accepted:
+        body, headers["Content-Encoding"] = entry["gzip"], "gzip"
+    else:
+        body = entry["identity"]
+    return Response(content=body, media_type=entry["type"], headers=headers)
@@ -0,0 +1,143 @@
+# ─── Benchmark provider ─────────────────────────────────────────────────────
+# Misura i provider sullo stesso percorso della chat vera: _enrich_system_prompt
+# (memoria, weekly, topic recall) → build_context → get_provider → _provider_worker.
+# Per ogni livello di concorrenza (1..N richieste in parallelo): TTFT, latenza
+# end-to-end, token/s di prompt eval e di generazione, throughput aggregato.
+# Ogni run finisce in SQLite (bench_runs) e viene confrontato col precedente
+# dello stesso provider/modello/endpoint: oltre BENCH_REGRESSION è regressione.
+BENCH_REGRESSION = 0.15   # peggioramento relativo che conta come regressione
+BENCH_PROVIDERS = ("ollama", "ollama_pc", "anthropic", "openrouter", "brain")
+BENCH_PROMPTS = [
+    {"id": "chat", "message": "Ciao! Come va oggi? Rispondi in due frasi."},
+    {"id": "code", "message": "Questo codice Python ha un errore, correggilo e rispondi solo con il codice:\n"
+                              "def total(xs):\n    s = 0\n    for x on xs:\n        s += x\n    return s"},
+    {"id": "long", "message": "Spiegami cos'è un buco nero in tre paragrafi dettagliati."},
+]
+_bench_running = False
+
+
+class _BenchSink:
+    """Prende il posto della queue di _provider_worker e annota i tempi dei chunk."""
+    def __init__(self):
+        self.t0 = time.perf_counter()
+        self.first = self.end = None
+        self.text = ""
+        self.meta: dict = {}
+        self.error = ""
+
+    def put_nowait(self, item):
+        kind, val = item
+        if kind == "chunk" and val:
+            if self.first is None:
+                self.first = time.perf_counter()
+            self.text += val
+        elif kind == "meta":
+            self.meta = val
+        elif kind == "error":
+            self.error = val
+        elif kind == "end":
+            self.end = time.perf_counter()
+
+
+def _bench_provider(provider_id: str, model: str, message: str, memory: bool, endpoint: str):
+    """Provider pronto come lo costruirebbe _execute_chat; endpoint = host/porta di un mock."""
+    default_model, system_prompt = _provider_defaults(provider_id)
+    system = _enrich_system_prompt(system_prompt, memory, message, provider_id)
+    trimmed = build_context([{"role": "user", "content": message}], provider_id, system)
+    return get_provider(provider_id, model or default_model, system, trimmed, endpoint)
+
+def _bench_once(provider_id: str, model: str, prompt: dict, memory: bool, endpoint: str) -> dict:
+    """Una richiesta completa (sincrona, nel thread pool)."""
+    provider = _bench_provider(provider_id, model, prompt["message"], memory, endpoint)
+    if not provider.is_valid:
+        return {"prompt": prompt["id"], "error": provider.error_msg}
+    sink = _BenchSink()
+    _provider_worker(provider, sink)
+    end = sink.end or time.perf_counter()
+    m = sink.meta
+    out_tok = m.get("output_tokens") or (estimate_tokens(sink.text) if sink.text else 0)
+    in_tok = m.get("input_tokens") or estimate_tokens(provider.payload)
+    ttft = (sink.first - sink.t0) * 1000 if sink.first else None
+    # Ollama riporta le durate server-side; per gli altri si usa il tempo dal primo token
+    gen_ms = m.get("eval_ms") or ((end - sink.first) * 1000 if sink.first else 0)
+    return {"prompt": prompt["id"], "ttft_ms": round(ttft, 1) if ttft is not None else None,
+            "total_ms": round((end - sink.t0) * 1000, 1), "in_tokens": in_tok, "out_tokens": out_tok,
+            "prompt_tps": round(in_tok / (m["prompt_eval_ms"] / 1000), 1) if m.get("prompt_eval_ms") else None,
+            "gen_tps": round(out_tok / (gen_ms / 1000), 1) if gen_ms > 0 and out_tok else None,
+            "error": sink.error if not sink.text else ""}
+
+def _pct(values: list, q: float):
+    values = sorted(v for v in values if v is not None)
+    if not values:
+        return None
+    return round(values[min(len(values) - 1, int(q * len(values)))], 1)
+
+def _bench_level(samples: list, wall_ms: float) -> dict:
+    ok = [s for s in samples if not s["error"]]
+    gen = [s["gen_tps"] for s in ok if s.get("gen_tps")]
+    pe = [s["prompt_tps"] for s in ok if s.get("prompt_tps")]
+    return {"requests": len(samples), "errors": len(samples) - len(ok),
+            "ttft_p50": _pct([s["ttft_ms"] for s in ok], 0.5), "ttft_p95": _pct([s["ttft_ms"] for s in ok], 0.95),
+            "total_p50": _pct([s["total_ms"] for s in ok], 0.5), "total_p95": _pct([s["total_ms"] for s in ok], 0.95),
+            "gen_tps": round(statistics.mean(gen), 1) if gen else None,
+            "prompt_tps": round(statistics.mean(pe), 1) if pe else None,
+            "throughput_tps": round(sum(s["out_tokens"] for s in ok) / (wall_ms / 1000), 1) if wall_ms else None}
+
+def bench_regressions(levels: dict, previous: dict | None) -> list[str]:
+    """Confronta per livello di concorrenza: latenze su = peggio, token/s giù = peggio."""
+    if not previous:
+        return []
+    out = []
+    for c, cur in levels.items():
+        old = previous.get(c) or previous.get(str(c))
+        if not old:
+            continue
+        for key, higher_is_worse in (("ttft_p50", True), ("total_p50", True), ("gen_tps", False),
+                                     ("throughput_tps", False)):
+            a, b = old.get(key), cur.get(key)
+            if not a or b is None:
+                continue
+            delta = (b - a) / a
+            if (delta > BENCH_REGRESSION) if higher_is_worse else (delta < -BENCH_REGRESSION):
+                out.append(f"c={c} {key}: {a} → {b} ({delta:+.0%})")
+    return out
+
+async def bench_run(provider_id: str, model: str = "", concurrency=(1, 2, 4), rounds: int = 1,
+                    prompts: list | None = None, endpoint: str = "", memory: bool = True,
+                    label: str = "", on_progress=None) -> dict:
+    """Sweep di concorrenza: per ogni livello c, `rounds` ondate di c richieste insieme
+    (prompt a rotazione). Salva il run e ritorna riepilogo + regressioni."""
+    global _bench_running
+    if _bench_running:
+        raise RuntimeError("benchmark già in corso")
+    _bench_running = True
+    try:
+        prompts = prompts or BENCH_PROMPTS
+        model = model or _provider_defaults(provider_id)[0]
+        levels, samples = {}, []
+        for c in concurrency:
+            level_samples, wall = [], 0.0
+            for r in range(rounds):
+                batch = [prompts[(r * c + i) % len(prompts)] for i in range(c)]
+                t0 = time.perf_counter()
+                level_samples += await asyncio.gather(
+                    *(bg(_bench_once, provider_id, model, p, memory, endpoint) for p in batch))
+                wall += (time.perf_counter() - t0) * 1000
+            levels[c] = _bench_level(level_samples, wall)
+            samples += [{**s, "concurrency": c} for s in level_samples]
+            if on_progress:
+                await on_progress(c, levels[c])
+        previous = await bg(db_get_last_bench_run, provider_id, model, endpoint, label)
+        regressions = bench_regressions(levels, previous["levels"] if previous else None)
+        config = {"concurrency": list(concurrency), "rounds": rounds, "memory": memory,
+                  "prompts": [p["id"] for p in prompts]}
+        run_id = await bg(db_save_bench_run, provider_id, model, endpoint, label, config, levels,
+                          regressions, samples)
+        db_log_event("bench", "run", provider=provider_id,
+                     status="error" if regressions or bench_all_failed(levels) else "ok",
+                     payload={"run_id": run_id, "model": model, "regressions": len(regressions)})
+        return {"id": run_id, "provider": provider_id, "model": model, "endpoint": endpoint,
+                "label": label, "config": config, "levels": levels, "regressions": regressions,
+                "failed": bench_all_failed(levels), "previous_id": previous["id"] if previous else None}
+    finally:
+        _bench_running = False
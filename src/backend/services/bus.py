@@ -0,0 +1,148 @@
+# ─── Event bus in-process (Sigil: stato, mood, crypto, alert) ───────────────
+# I servizi pubblicano eventi tipizzati; routes/tamagotchi.py si iscrive e fa il
+# broadcast verso ESP32 e dashboard. Niente HTTP loopback né lookup in globals().
+# Gli script cron (goodnight, check_in, task_reminder, briefing) pubblicano dallo
+# stesso bus via Unix socket: una riga JSON per messaggio.
+BUS_SOCKET = os.environ.get("VESSEL_BUS_SOCKET", str(Path.home() / ".nanobot" / "vessel_bus.sock"))
+SIGIL_STATES = frozenset({"IDLE", "THINKING", "WORKING", "PROUD", "SLEEPING", "ERROR", "BOOTING",
+                          "HAPPY", "ALERT", "CURIOUS", "BORED", "PEEKING"})
+
+@dataclass(frozen=True)
+class SigilState:
+    topic: ClassVar[str] = "sigil.state"
+    state: str
+    detail: str = ""
+    text: str = ""
+    mood: dict | None = None
+
+    def __post_init__(self):
+        if self.state not in SIGIL_STATES:
+            raise ValueError(f"Stato non valido: {self.state}")
+
+@dataclass(frozen=True)
+class SigilText:
+    topic: ClassVar[str] = "sigil.text"
+    text: str
+
+    def __post_init__(self):
+        if not self.text or len(self.text) > 64:
+            raise ValueError("Testo vuoto o troppo lungo (max 64)")
+
+@dataclass(frozen=True)
+class CryptoUpdate:
+    topic: ClassVar[str] = "crypto.update"
+    btc: float
+    eth: float = 0
+    btc_change: float = 0
+    eth_change: float = 0
+
+@dataclass(frozen=True)
+class Alert:
+    topic: ClassVar[str] = "alert"
+    source: str
+    message: str
+    key: str = ""
+
+BUS_EVENTS = {cls.topic: cls for cls in (SigilState, SigilText, CryptoUpdate, Alert)}
+
+
+class EventBus:
+    """Pub/sub per tipo di evento. Gli handler sono coroutine; un handler che
+    fallisce viene loggato e non blocca gli altri."""
+
+    def __init__(self):
+        self._subs: dict[type, list] = {}
+        self._queries: dict = {}
+        self.published = 0
+        self.errors = 0
+
+    def subscribe(self, event_type: type, handler):
+        self._subs.setdefault(event_type, []).append(handler)
+        return handler
+
+    def on(self, event_type: type):
+        """Decorator: @bus.on(SigilState)."""
+        return lambda handler: self.subscribe(event_type, handler)
+
+    def provide(self, name: str, fn):
+        """Registra una lettura sincrona esposta al socket (es. "sigil.mood")."""
+        self._queries[name] = fn
+
+    async def publish(self, event):
+        self.published += 1
+        for handler in self._subs.get(type(event), ()):
+            try:
+                await handler(event)
+            except Exception as e:
+                self.errors += 1
+                print(f"[Bus] {event.topic}: handler {getattr(handler, '__name__', handler)} fallito: {e}")
+
+    def query(self, name: str):
+        fn = self._queries.get(name)
+        if fn is None:
+            raise ValueError(f"Query sconosciuta: {name}")
+        return fn()
+
+    def stats(self) -> dict:
+        return {"published": self.published, "errors": self.errors,
+                "subscribers": {t.topic: len(h) for t, h in self._subs.items()}}
+
+
+bus = EventBus()
+
+
+def bus_event(topic: str, data: dict):
+    """Evento tipizzato da topic + dict (socket, REST). ValueError se non valido."""
+    cls = BUS_EVENTS.get(topic)
+    if cls is None:
+        raise ValueError(f"Topic sconosciuto: {topic}")
+    if data is not None and not isinstance(data, dict):
+        raise ValueError(f"{topic}: data deve essere un oggetto")
+    names = {f.name for f in dataclass_fields(cls)}
+    try:
+        return cls(**{k: v for k, v in (data or {}).items() if k in names})
+    except TypeError as e:
+        raise ValueError(f"{topic}: {e}")
+
+
+async def bus_dispatch(msg: dict) -> dict:
+    """Un messaggio nel formato del socket (usato anche dai job in-process):
+    {"topic": "sigil.state", "data": {...}} → {"ok": true}
+    {"query": "sigil.mood"}                 → {"ok": true, "data": {...}}"""
+    if not isinstance(msg, dict):
+        return {"ok": False, "error": "messaggio non valido: atteso un oggetto JSON"}
+    try:
+        if "query" in msg:
+            return {"ok": True, "data": bus.query(msg["query"])}
+        await bus.publish(bus_event(msg.get("topic", ""), msg.get("data")))
+        return {"ok": True}
+    except ValueError as e:
+        return {"ok": False, "error": str(e)}
+
+
+async def _bus_client(reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+    """Una riga JSON per messaggio (vedi bus_dispatch)."""
+    try:
+        while line := await reader.readline():
+            try:
+                reply = await bus_dispatch(json.loads(line))
+            except ValueError as e:
+                reply = {"ok": False, "error": str(e)}
+            writer.write((json.dumps(reply) + "\n").encode("utf-8"))
+            await writer.drain()
+    except ConnectionError:
+        pass
+    finally:
+        writer.close()
+
+
+async def start_bus_socket():
+    """Socket per gli script locali (solo utente: 0600)."""
+    path = Path(BUS_SOCKET)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    if path.exists():
+        path.unlink()
+    server = await asyncio.start_unix_server(_bus_client, path=str(path))
+    os.chmod(path, 0o600)
+    print(f"[Bus] Socket pronto su {path}")
+    return server
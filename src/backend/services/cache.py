@@ -0,0 +1,130 @@
+# ─── Service Cache (TTL + single-flight + stale-while-revalidate) ────────────
+# Le funzioni di servizio sono sincrone e girano nei thread dell'executor (bg):
+# la cache è quindi thread-safe e coalizza i chiamanti concorrenti sulla stessa chiave.
+
+_CACHE_REGISTRY: dict = {}
+
+class ServiceCache:
+    """Wrapper per una funzione sincrona: risultato in cache per `ttl` secondi.
+    - single-flight: chiamanti concorrenti con gli stessi argomenti attendono un'unica esecuzione
+    - stale-while-revalidate: scaduto da meno di `stale` secondi → valore vecchio subito,
+      refresh in background
+    - invalidate(*args) / invalidate() per svuotare una chiave o tutto
+    Le eccezioni non vengono messe in cache."""
+
+    def __init__(self, fn, ttl: float, stale: float = 0, name: str = "", maxsize: int = 64):
+        self.fn = fn
+        self.ttl = ttl
+        self.stale = stale
+        self.name = name or fn.__name__
+        self.maxsize = maxsize
+        self._lock = threading.Lock()
+        self._entries: dict = {}   # key → (value, ts monotonic)
+        self._inflight: dict = {}  # key → concurrent.futures.Future
+        self.hits = 0
+        self.misses = 0
+        self.stale_hits = 0
+        self.coalesced = 0
+        self.errors = 0
+        _CACHE_REGISTRY[self.name] = self
+
+    @staticmethod
+    def _key(args, kwargs):
+        return (args, tuple(sorted(kwargs.items()))) if kwargs else args
+
+    def __call__(self, *args, **kwargs):
+        key = self._key(args, kwargs)
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                age = now - entry[1]
+                if age < self.ttl:
+                    self.hits += 1
+                    return entry[0]
+                if age < self.ttl + self.stale:
+                    self.stale_hits += 1
+                    if key not in self._inflight:
+                        fut = concurrent.futures.Future()
+                        self._inflight[key] = fut
+                        threading.Thread(target=self._refresh, args=(key, fut, args, kwargs),
+                                         daemon=True, name=f"cache-{self.name}").start()
+                    return entry[0]
+            fut = self._inflight.get(key)
+            if fut is None:
+                fut = concurrent.futures.Future()
+                self._inflight[key] = fut
+                self.misses += 1
+                owner = True
+            else:
+                self.coalesced += 1
+                owner = False
+        if owner:
+            return self._compute(key, fut, args, kwargs)
+        return fut.result()
+
+    def _compute(self, key, fut, args, kwargs):
+        try:
+            value = self.fn(*args, **kwargs)
+        except BaseException as e:
+            with self._lock:
+                self._inflight.pop(key, None)
+                self.errors += 1
+            fut.set_exception(e)
+            raise
+        with self._lock:
+            self._entries[key] = (value, time.monotonic())
+            if len(self._entries) > self.maxsize:
+                self._entries.pop(next(iter(self._entries)))
+            self._inflight.pop(key, None)
+        fut.set_result(value)
+        return value
+
+    def _refresh(self, key, fut, args, kwargs):
+        try:
+            self._compute(key, fut, args, kwargs)
+        except Exception as e:
+            print(f"[Cache] {self.name}: refresh fallito: {e}")
+
+    def invalidate(self, *args, **kwargs):
+        """Invalida la chiave per questi argomenti; senza argomenti svuota tutto."""
+        with self._lock:
+            if args or kwargs:
+                self._entries.pop(self._key(args, kwargs), None)
+            else:
+                self._entries.clear()
+
+    def peek(self, *args, **kwargs):
+        """Valore in cache (anche scaduto) senza eseguire la funzione. None se assente."""
+        entry = self._entries.get(self._key(args, kwargs))
+        return entry[0] if entry else None
+
+    def stats(self) -> dict:
+        total = self.hits + self.stale_hits + self.coalesced + self.misses
+        return {"hits": self.hits, "misses": self.misses, "stale_hits": self.stale_hits,
+                "coalesced": self.coalesced, "errors": self.errors,
+                "entries": len(self._entries), "ttl": self.ttl, "stale": self.stale,
+                "hit_rate": round((total - self.misses) / total, 3) if total else 0}
+
+
+def cached(ttl: float, stale: float = 0, name: str = "", maxsize: int = 64):
+    """Decorator dichiarativo: @cached(ttl=60, stale=300)."""
+    def deco(fn):
+        cache = ServiceCache(fn, ttl, stale, name, maxsize)
+        functools.update_wrapper(cache, fn)
+        return cache
+    return deco
+
+
+def cache_invalidate(name: str) -> bool:
+    """Invalida per nome (es. da handler dopo una scrittura). True se la cache esiste."""
+    cache = _CACHE_REGISTRY.get(name)
+    if cache is None:
+        return False
+    cache.invalidate()
+    return True
+
+
+def cache_stats() -> dict:
+    """Contatori hit/miss per tutte le cache registrate."""
+    return {name: c.stats() for name, c in _CACHE_REGISTRY.items()}
@@ -81,6 +81,7 @@ def _provider_worker(provider, queue):
     """Worker thread: HTTP request a un provider, streamma chunk via queue.
     Protocollo queue: ("chunk", text), ("meta", dict), ("error", str), ("end", None)."""
     input_tokens = output_tokens = 0
+    timing = {}  # Ollama: durate server-side di prompt eval e generazione (per il benchmark)
     try:
         conn_class = http.client.HTTPSConnection if provider.use_https else http.client.HTTPConnection
         conn = conn_class(provider.host, provider.port, timeout=provider.timeout)
@@ -92,7 +93,7 @@ def _provider_worker(provider, queue):
             return
         buf = ""
         while True:
-            raw = resp.read(512)
+            raw = resp.read1(512)  # read1: ritorna appena arriva qualcosa, non attende 512 byte (TTFT)
             if not raw:
                 break
             buf += raw.decode("utf-8", errors="replace")
@@ -110,6 +111,8 @@ def _provider_worker(provider, queue):
                         if data.get("done"):
                             input_tokens = data.get("prompt_eval_count", 0)
                             output_tokens = data.get("eval_count", 0)
+                            timing = {"prompt_eval_ms": data.get("prompt_eval_duration", 0) / 1e6,
+                                      "eval_ms": data.get("eval_duration", 0) / 1e6}
                             conn.close()
                             return
                     except Exception:
@@ -171,7 +174,7 @@ def _provider_worker(provider, queue):
     except Exception as e:
         queue.put_nowait(("error", str(e)))
     finally:
-        queue.put_nowait(("meta", {"input_tokens": input_tokens, "output_tokens": output_tokens}))
+        queue.put_nowait(("meta", {"input_tokens": input_tokens, "output_tokens": output_tokens, **timing}))
         queue.put_nowait(("end", None))
 
 
@@ -236,13 +239,14 @@ async def _execute_chat(message, chat_history, provider_id, system_prompt, model
     actual_model = model
     last_error = ""
     trimmed = []
-    loop = asyncio.get_running_loop()
+    first_token_at = 0.0
 
     for attempt, (try_pid, try_model) in enumerate(providers_chain):
         trimmed = build_context(chat_history, try_pid, system)
         provider = get_provider(try_pid, try_model, system, trimmed)
         if not provider.is_valid:
             last_error = provider.error_msg
+            PROVIDER_ERRORS.inc(try_pid)
             if attempt < len(providers_chain) - 1:
                 continue
             # Nessun provider disponibile
@@ -255,12 +259,14 @@ async def _execute_chat(message, chat_history, provider_id, system_prompt, model
             await on_chunk(f"\n⚡ Failover → {try_pid}\n")
 
         queue: asyncio.Queue = asyncio.Queue()
-        loop.run_in_executor(None, _provider_worker, provider, queue)
+        _bg_submit(_provider_worker, provider, queue)
 
         while True:
             kind, val = await queue.get()
             if kind == "chunk":
                 if val:
+                    if not first_token_at:
+                        first_token_at = time.time()
                     full_reply += val
                     if on_chunk:
                         await on_chunk(val)
@@ -275,11 +281,12 @@ async def _execute_chat(message, chat_history, provider_id, system_prompt, model
             actual_pid = try_pid
             actual_model = try_model
             if attempt > 0:
-                loop.run_in_executor(None, telegram_send,
-                    f"⚠️ Provider failover: {provider_id} → {try_pid}")
+                CHAT_FAILOVERS.inc(provider_id, try_pid)
+                asyncio.create_task(tg_send(f"⚠️ Provider failover: {provider_id} → {try_pid}", wait=False))
                 db_log_audit("failover", resource=f"{provider_id} → {try_pid}",
                              details=last_error[:200])
             break
+        PROVIDER_ERRORS.inc(try_pid)
 
         if attempt == len(providers_chain) - 1:
             err = f"(errore {try_pid}: {last_error})"
@@ -298,6 +305,12 @@ async def _execute_chat(message, chat_history, provider_id, system_prompt, model
                     provider=actual_pid, response_time_ms=elapsed)
     # Observability: log evento chat
     evt_status = "ok" if full_reply and not full_reply.startswith("(errore") else "error"
+    CHAT_REQUESTS.inc(actual_pid, channel, evt_status)
+    CHAT_LATENCY.observe(elapsed / 1000, actual_pid)
+    if first_token_at:
+        CHAT_TTFT.observe(first_token_at - start_time, actual_pid)
+    CHAT_TOKENS.inc(actual_pid, "in", n=in_tok)
+    CHAT_TOKENS.inc(actual_pid, "out", n=out_tok)
     db_log_event("chat", "response", provider=actual_pid, status=evt_status,
                  latency_ms=elapsed,
                  payload={"model": actual_model, "tokens_in": in_tok,
@@ -311,7 +324,7 @@ async def _execute_chat(message, chat_history, provider_id, system_prompt, model
     global _last_chat_ts
     _last_chat_ts = time.time()
     if full_reply:
-        loop.run_in_executor(None, _bg_extract_and_store, message, full_reply)
+        _bg_submit(_bg_extract_and_store, message, full_reply)
     return full_reply, actual_pid, elapsed
 
 
@@ -339,11 +352,13 @@ async def _chat_response(
     provider_id: str, system_prompt: str, model: str,
     channel: str = "telegram",
     memory_enabled: bool = True,
+    on_chunk=None,
 ) -> str:
-    """Chat non-streaming (wrapper sottile). Usata da Telegram."""
+    """Chat con risposta completa (wrapper sottile). Usata da Telegram;
+    con on_chunk riceve anche i chunk man mano (streaming via edit)."""
     full_reply, *_ = await _execute_chat(
         message, chat_history, provider_id, system_prompt, model,
-        memory_enabled=memory_enabled, channel=channel)
+        memory_enabled=memory_enabled, channel=channel, on_chunk=on_chunk)
     return full_reply
 
 
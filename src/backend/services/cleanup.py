@@ -1,13 +1,13 @@
 # ─── Cleanup ─────────────────────────────────────────────────────────────────
 def _cleanup_expired():
+    global _sessions_dirty
     now = time.time()
-    for key in list(RATE_LIMITS.keys()):
-        RATE_LIMITS[key] = [t for t in RATE_LIMITS[key] if now - t < 600]
-        if not RATE_LIMITS[key]:
-            del RATE_LIMITS[key]
+    RATE_LIMITS.purge()
+    _ensure_sessions()
     for token in list(SESSIONS.keys()):
         if now - SESSIONS[token] > SESSION_TIMEOUT:
             del SESSIONS[token]
+            _sessions_dirty = True
 
 
 def cleanup_old_data():
@@ -16,3 +16,5 @@ def cleanup_old_data():
     purged_usage = db_archive_old_usage(180)
     purged_events = db_cleanup_old_events(90)
     print(f"[Cleanup] Archiviati {archived} chat, purged {purged_usage} usage, {purged_events} events")
+
+_boot_mark("services")
@@ -0,0 +1,33 @@
+# ─── Conversation Store (stato chat condiviso tra connessioni) ───────────────
+class ConversationStore:
+    """Storia chat per processo, chiave (channel, provider_id).
+    Caricata da SQLite solo al primo uso del provider; tutte le connessioni
+    (tab dashboard, Telegram) condividono la stessa lista in memoria."""
+
+    def __init__(self):
+        self._histories: dict[tuple[str, str], list] = {}
+        self._locks: dict[tuple[str, str], asyncio.Lock] = {}
+
+    async def get(self, provider_id: str, channel: str = "dashboard") -> list:
+        """Ritorna la lista condivisa (mutabile). Lazy load al primo accesso."""
+        key = (channel, provider_id)
+        history = self._histories.get(key)
+        if history is not None:
+            return history
+        lock = self._locks.setdefault(key, asyncio.Lock())
+        async with lock:
+            if key not in self._histories:
+                self._histories[key] = await bg(db_load_chat_history, provider_id, channel)
+        return self._histories[key]
+
+    def clear(self, channel: str = "dashboard"):
+        """Svuota in-place le history del channel (le connessioni aperte vedono il reset)."""
+        for (ch, _), history in self._histories.items():
+            if ch == channel:
+                history.clear()
+
+    def stats(self) -> dict:
+        """Numero messaggi in memoria per channel:provider (diagnostica)."""
+        return {f"{ch}:{pid}": len(h) for (ch, pid), h in self._histories.items()}
+
+conversations = ConversationStore()
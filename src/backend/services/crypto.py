@@ -1,28 +1,27 @@
 # ─── Crypto ──────────────────────────────────────────────────────────────────
-_crypto_cache: dict = {}
-
+@cached(ttl=60, stale=240)
 def get_crypto_prices() -> dict:
-    """Fetch BTC/ETH prezzi da CoinGecko API pubblica, con cache fallback."""
-    global _crypto_cache
+    """Fetch BTC/ETH prezzi da CoinGecko API pubblica (http_get: stale da disco se giù)."""
     data = {"btc": None, "eth": None, "error": None}
+    url = "https://api.coingecko.com/api/v3/simple/price?ids=bitcoin,ethereum&vs_currencies=usd,eur&include_24hr_change=true"
+    res = http_get(url, timeout=10, source="coingecko")
+    if res["body"] is None:
+        data["error"] = res["error"][:100]
+        return data
     try:
-        url = "https://api.coingecko.com/api/v3/simple/price?ids=bitcoin,ethereum&vs_currencies=usd,eur&include_24hr_change=true"
-        req = urllib.request.Request(url, headers={"User-Agent": "Vessel-Dashboard/1.0"})
-        with urllib.request.urlopen(req, timeout=10) as resp:
-            raw = json.loads(resp.read())
-        if "bitcoin" in raw:
-            b = raw["bitcoin"]
-            data["btc"] = {"usd": b.get("usd", 0), "eur": b.get("eur", 0),
-                           "change_24h": round(b.get("usd_24h_change", 0), 2)}
-        if "ethereum" in raw:
-            e = raw["ethereum"]
-            data["eth"] = {"usd": e.get("usd", 0), "eur": e.get("eur", 0),
-                           "change_24h": round(e.get("usd_24h_change", 0), 2)}
-        _crypto_cache = {"btc": data["btc"], "eth": data["eth"], "ts": time.time()}
-    except Exception as ex:
+        raw = json.loads(res["body"])
+    except ValueError as ex:
         data["error"] = str(ex)[:100]
-        if _crypto_cache:
-            data["btc"] = _crypto_cache.get("btc")
-            data["eth"] = _crypto_cache.get("eth")
-            data["error"] = f"cached ({data['error']})"
+        return data
+    if "bitcoin" in raw:
+        b = raw["bitcoin"]
+        data["btc"] = {"usd": b.get("usd", 0), "eur": b.get("eur", 0),
+                       "change_24h": round(b.get("usd_24h_change", 0), 2)}
+    if "ethereum" in raw:
+        e = raw["ethereum"]
+        data["eth"] = {"usd": e.get("usd", 0), "eur": e.get("eur", 0),
+                       "change_24h": round(e.get("usd_24h_change", 0), 2)}
+    if res["status"] == "stale":
+        # CoinGecko giù: ultimi prezzi salvati su disco (sopravvivono ai restart)
+        data["error"] = f"cached ({res['error'][:100]})"
     return data
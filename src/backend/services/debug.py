@@ -0,0 +1,330 @@
+# ─── Event loop: lag e chiamate bloccanti ───────────────────────────────────
+# loop_monitor() si sveglia ogni LOOP_TICK e misura di quanto arriva in ritardo
+# (lag). Un thread watchdog guarda il battito: se il loop è fermo oltre
+# LOOP_BLOCK_MS campiona lo stack del thread del loop, cioè la chiamata che sta
+# bloccando in quel momento, e a fine stallo lo somma ai "peggiori" per punto
+# del codice. Costo a regime: un timer ogni 250ms e un thread che dorme 50ms.
+# VESSEL_LOOP_DEBUG=1 accende anche il debug mode di asyncio: ogni callback oltre
+# soglia (slow_callback_duration) viene registrato con l'ultimo stack campionato.
+LOOP_TICK = 0.25
+LOOP_BLOCK_MS = 100
+LOOP_WATCHDOG_POLL = 0.05
+LOOP_STALL_LOG_MS = 1000        # stalli così lunghi finiscono anche negli eventi
+LOOP_DEBUG = os.environ.get("VESSEL_LOOP_DEBUG", "").lower() in ("1", "true", "yes")
+
+_loop_lags: deque = deque(maxlen=240)          # ultimo minuto di campioni (ms)
+_loop_offenders: dict[str, dict] = {}
+_loop_slow_callbacks: deque = deque(maxlen=30)
+_loop_state = {"beat": 0.0, "thread": 0, "stall": None, "stalls": 0, "max_ms": 0.0, "since": 0.0}
+
+
+def _loop_stack(thread_id: int) -> list[str]:
+    """Stack del thread del loop, dal frame più esterno; solo le ultime righe utili."""
+    frame = sys._current_frames().get(thread_id)
+    if frame is None:
+        return []
+    return [f"{f.name} ({Path(f.filename).name}:{f.lineno})" for f in traceback.extract_stack(frame)][-12:]
+
+def _loop_culprit(stack: list[str]) -> str:
+    """Il punto più interno del nostro codice (non stdlib) nello stack campionato."""
+    here = Path(__file__).name
+    for line in reversed(stack):
+        if f"({here}:" in line:
+            return line
+    return stack[-1] if stack else "?"
+
+def _loop_watchdog():
+    while True:
+        time.sleep(LOOP_WATCHDOG_POLL)
+        late = (time.monotonic() - _loop_state["beat"] - LOOP_TICK) * 1000
+        if late > LOOP_BLOCK_MS and _loop_state["stall"] is None:
+            stack = _loop_stack(_loop_state["thread"])
+            _loop_state["stall"] = {"stack": stack, "where": _loop_culprit(stack)}
+
+def _loop_stall_end(stall: dict, lag_ms: float):
+    _loop_state["stalls"] += 1
+    o = _loop_offenders.setdefault(stall["where"], {"where": stall["where"], "count": 0,
+                                                     "total_ms": 0.0, "max_ms": 0.0})
+    o["count"] += 1
+    o["total_ms"] += lag_ms
+    o["max_ms"] = max(o["max_ms"], lag_ms)
+    o["stack"], o["last"] = stall["stack"], time.strftime("%Y-%m-%dT%H:%M:%S")
+    if lag_ms >= LOOP_STALL_LOG_MS:
+        # nel thread pool: una scrittura SQLite qui sarebbe a sua volta uno stallo
+        asyncio.get_running_loop().run_in_executor(None, functools.partial(
+            db_log_event, "loop", "stall", status="error", latency_ms=int(lag_ms),
+            payload={"where": stall["where"]}))
+
+
+class _SlowCallbackHandler(logging.Handler):
+    """Intercetta "Executing <Handle ...> took 0.3 seconds" del debug mode di asyncio."""
+    def emit(self, record):
+        msg = record.getMessage()
+        if msg.startswith("Executing"):
+            stall = _loop_state["stall"]
+            took = re.search(r" took ([\d.]+) seconds$", msg)
+            _loop_slow_callbacks.append({"ts": time.strftime("%H:%M:%S"), "callback": msg[10:170],
+                                         "ms": round(float(took.group(1)) * 1000) if took else 0,
+                                         "where": stall["where"] if stall else ""})
+
+
+async def loop_monitor():
+    """Task del lifespan: battito + misura del lag, avvia il watchdog."""
+    loop = asyncio.get_running_loop()
+    _loop_state.update(beat=time.monotonic(), thread=threading.get_ident(), since=time.time())
+    threading.Thread(target=_loop_watchdog, name="loop-watchdog", daemon=True).start()
+    if LOOP_DEBUG:
+        loop.set_debug(True)
+        loop.slow_callback_duration = LOOP_BLOCK_MS / 1000
+        logging.getLogger("asyncio").addHandler(_SlowCallbackHandler())
+        print(f"[Loop] debug asyncio attivo, soglia {LOOP_BLOCK_MS}ms")
+    while True:
+        t0 = time.monotonic()
+        await asyncio.sleep(LOOP_TICK)
+        now = time.monotonic()
+        lag = max(0.0, (now - t0 - LOOP_TICK) * 1000)
+        _loop_state["beat"] = now
+        _loop_lags.append(lag)
+        _loop_state["max_ms"] = max(_loop_state["max_ms"], lag)
+        stall, _loop_state["stall"] = _loop_state["stall"], None
+        if stall:
+            _loop_stall_end(stall, lag)
+
+def loop_stats(top: int = 10) -> dict:
+    """Lag dell'ultimo minuto, stalli dall'avvio, i punti che hanno bloccato di più."""
+    lags = sorted(_loop_lags)
+    pick = lambda q: round(lags[min(len(lags) - 1, int(q * len(lags)))], 1) if lags else 0.0
+    worst = sorted(_loop_offenders.values(), key=lambda o: o["total_ms"], reverse=True)[:top]
+    return {"tick_ms": LOOP_TICK * 1000, "threshold_ms": LOOP_BLOCK_MS, "debug": LOOP_DEBUG,
+            "lag": {"current": round(_loop_lags[-1], 1) if _loop_lags else 0.0,
+                    "p50": pick(0.5), "p99": pick(0.99), "max_1m": round(lags[-1], 1) if lags else 0.0,
+                    "max": round(_loop_state["max_ms"], 1)},
+            "stalls": _loop_state["stalls"], "since": _loop_state["since"],
+            "offenders": [{**o, "total_ms": round(o["total_ms"]), "max_ms": round(o["max_ms"])} for o in worst],
+            "slow_callbacks": list(_loop_slow_callbacks)[-10:]}
+
+
+# ─── Profilo CPU on-demand (campionamento) ──────────────────────────────────
+# Per N secondi un thread dedicato legge gli stack di tutti i thread
+# (sys._current_frames) ogni PROFILE_INTERVAL e conta gli stack uguali: ne esce
+# un profilo "collapsed" (frame;frame;frame conteggio) che flamegraph.pl o
+# speedscope trasformano in flamegraph. Costo limitato: se un campione costa
+# più di un decimo dell'intervallo il thread dorme di più (≤ ~10% di un core).
+# Il tempo CPU reale per thread viene da /proc (Linux), per distinguere chi
+# lavora da chi aspetta su select/queue/socket.
+PROFILE_MAX_S = 60
+PROFILE_INTERVAL = 0.01          # 100 Hz
+PROFILE_MAX_DEPTH = 64
+PROFILE_IDLE = {("selectors.py", "select"), ("threading.py", "wait"), ("thread.py", "_worker"),
+                ("queue.py", "get"), ("socket.py", "readinto"), ("socket.py", "accept"),
+                ("ssl.py", "read"), ("ssl.py", "recv_into")}
+_profile_state: dict = {"running": False, "last": None}
+
+
+def _profile_frame(code) -> str:
+    return f"{code.co_name} ({Path(code.co_filename).name}:{code.co_firstlineno})"
+
+def _profile_idle(code) -> bool:
+    """Foglia dello stack in attesa (select, lock, socket, il nostro watchdog): non è CPU."""
+    return code.co_name == "_loop_watchdog" or (Path(code.co_filename).name, code.co_name) in PROFILE_IDLE
+
+def _thread_cpu_ticks() -> dict[int, int]:
+    """utime+stime per thread nativo da /proc/self/task; vuoto fuori da Linux."""
+    ticks = {}
+    try:
+        for task in os.scandir("/proc/self/task"):
+            stat = Path(task.path, "stat").read_text()
+            fields = stat[stat.rindex(")") + 2:].split()
+            ticks[int(task.name)] = int(fields[11]) + int(fields[12])
+    except (OSError, ValueError, IndexError):
+        pass
+    return ticks
+
+def _profile_sample(seconds: float, interval: float) -> dict:
+    """Gira nel suo thread: campiona, poi aggrega. Gli stack sono tuple di code object
+    (economiche da confrontare); i nomi si formattano una volta sola alla fine."""
+    me = threading.get_ident()
+    stacks: Counter = Counter()
+    samples, cost = 0, 0.0
+    cpu0, proc0, t0 = _thread_cpu_ticks(), os.times(), time.monotonic()
+    deadline = t0 + seconds
+    while time.monotonic() < deadline:
+        s = time.perf_counter()
+        for tid, frame in sys._current_frames().items():
+            if tid == me:
+                continue
+            codes = []
+            while frame is not None and len(codes) < PROFILE_MAX_DEPTH:
+                codes.append(frame.f_code)
+                frame = frame.f_back
+            stacks[(tid, tuple(reversed(codes)))] += 1
+        samples += 1
+        spent = time.perf_counter() - s
+        cost += spent
+        time.sleep(max(interval - spent, spent * 9))
+    wall = time.monotonic() - t0
+    cpu1, proc1 = _thread_cpu_ticks(), os.times()
+
+    threads = {t.ident: t for t in threading.enumerate()}
+    tick = os.sysconf("SC_CLK_TCK") if hasattr(os, "sysconf") else 100
+    cpu = sorted(({"thread": threads[i].name if i in threads else f"tid-{i}",
+                   "cpu_pct": round((cpu1[n] - cpu0.get(n, 0)) / tick / wall * 100, 1)}
+                  for i, n in ((t.ident, t.native_id) for t in threads.values()) if n in cpu1),
+                 key=lambda x: x["cpu_pct"], reverse=True)
+
+    lines, self_c, total_c = [], Counter(), Counter()
+    busy = 0
+    for (tid, codes), n in stacks.most_common():
+        name = threads[tid].name if tid in threads else f"tid-{tid}"
+        frames = [_profile_frame(c) for c in codes]
+        lines.append(f"{name};{';'.join(frames)} {n}" if frames else f"{name} {n}")
+        if not codes or _profile_idle(codes[-1]):
+            continue
+        busy += n
+        self_c[frames[-1]] += n
+        for f in set(frames):
+            total_c[f] += n
+    pct = lambda n: round(n / busy * 100, 1) if busy else 0.0
+    proc_cpu = (proc1.user + proc1.system) - (proc0.user + proc0.system)
+    return {"ts": time.strftime("%Y-%m-%dT%H:%M:%S"), "seconds": round(wall, 1),
+            "interval_ms": interval * 1000, "samples": samples, "stacks": len(stacks),
+            "busy_samples": busy, "overhead_pct": round(cost / wall * 100, 2),
+            "process_cpu_pct": round(proc_cpu / wall * 100, 1), "threads": cpu,
+            "top_self": [{"where": f, "pct": pct(n)} for f, n in self_c.most_common(15)],
+            "top_total": [{"where": f, "pct": pct(n)} for f, n in total_c.most_common(15)],
+            "collapsed": "\n".join(lines) + "\n"}
+
+async def cpu_profile(seconds: float, interval: float = PROFILE_INTERVAL) -> dict:
+    """Cattura un profilo di `seconds` (max PROFILE_MAX_S) in un thread dedicato, non nel
+    pool: un worker occupato per un minuto toglierebbe posto alle chiamate bg()."""
+    if _profile_state["running"]:
+        raise RuntimeError("profilo già in corso")
+    _profile_state["running"] = True
+    loop = asyncio.get_running_loop()
+    done = loop.create_future()
+
+    def run():
+        try:
+            result = _profile_sample(min(max(seconds, 1.0), PROFILE_MAX_S), max(interval, 0.002))
+            loop.call_soon_threadsafe(done.set_result, result)
+        except Exception as e:
+            loop.call_soon_threadsafe(done.set_exception, e)
+
+    try:
+        threading.Thread(target=run, name="cpu-profiler", daemon=True).start()
+        result = await done
+    finally:
+        _profile_state["running"] = False
+    _profile_state["last"] = result
+    db_log_event("debug", "cpu_profile", latency_ms=int(result["seconds"] * 1000),
+                 payload={"samples": result["samples"], "process_cpu_pct": result["process_cpu_pct"],
+                          "top": result["top_self"][:3]})
+    return result
+
+
+# ─── Memoria: tracemalloc + strutture longeve ───────────────────────────────
+# tracemalloc costa (RAM per ogni blocco tracciato, allocazioni più lente):
+# si accende solo su richiesta, con una baseline, e si spegne da solo dopo
+# MEM_TRACE_MAX_S. Ogni diff confronta lo stato attuale con la baseline (o con
+# il diff precedente se rebase) → i punti del codice che continuano ad allocare.
+MEM_TRACE_FRAMES = 8
+MEM_TRACE_MAX_S = 1800
+MEM_SIZE_MAX_OBJS = 50_000       # tetto alla visita di _deep_size
+_mem_state: dict = {"baseline": None, "started": 0.0, "stop_handle": None, "diffs": 0}
+_MEM_FILTERS = [tracemalloc.Filter(False, tracemalloc.__file__),
+                tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+                tracemalloc.Filter(False, "<frozen importlib._bootstrap_external>"),
+                tracemalloc.Filter(False, "<unknown>")]
+
+
+def _mem_snapshot():
+    return tracemalloc.take_snapshot().filter_traces(_MEM_FILTERS)
+
+def _mem_rss_kb() -> int:
+    try:
+        for line in Path("/proc/self/status").read_text().splitlines():
+            if line.startswith("VmRSS:"):
+                return int(line.split()[1])
+    except (OSError, ValueError):
+        pass
+    return 0
+
+def _deep_size(obj) -> int:
+    """Byte approssimati di un oggetto e di ciò che contiene (dict/list/tuple/set), visita limitata."""
+    seen, stack, total = set(), [obj], 0
+    while stack and len(seen) < MEM_SIZE_MAX_OBJS:
+        o = stack.pop()
+        if id(o) in seen:
+            continue
+        seen.add(id(o))
+        total += sys.getsizeof(o)
+        # list(...) copia in un colpo solo: il loop può modificarle mentre si visita
+        if isinstance(o, dict):
+            for k, v in list(o.items()):
+                stack += (k, v)
+        elif isinstance(o, (list, tuple, set, frozenset, deque)):
+            stack.extend(list(o))
+    return total
+
+def mem_suspects() -> dict:
+    """Dimensione delle strutture che vivono quanto il processo (sospette di crescita lenta)."""
+    items = {"SESSIONS": SESSIONS, "RATE_LIMITS": RATE_LIMITS._entries,
+             "manager.connections": manager.connections, "_sigil_peers": _sigil_peers,
+             "_ota_progress": _ota_progress, "_http_stats": _http_stats,
+             "_loop_offenders": _loop_offenders}
+    out = [{"name": k, "len": len(v), "kb": round(_deep_size(v) / 1024, 1)} for k, v in items.items()]
+    # history chat (dashboard e Telegram): una lista per channel:provider
+    for (ch, pid), h in list(conversations._histories.items()):
+        out.append({"name": f"conversations[{ch}:{pid}]", "len": len(h), "kb": round(_deep_size(h) / 1024, 1)})
+    return {"rss_kb": _mem_rss_kb(), "structures": sorted(out, key=lambda x: x["kb"], reverse=True)}
+
+def mem_trace_start(frames: int = MEM_TRACE_FRAMES) -> dict:
+    """Accende tracemalloc e prende la baseline (nel thread pool: lo snapshot costa)."""
+    if not tracemalloc.is_tracing():
+        tracemalloc.start(min(max(frames, 1), 25))
+    _mem_state.update(baseline=_mem_snapshot(), started=time.time(), diffs=0)
+    return mem_trace_status()
+
+async def mem_trace_begin(frames: int = MEM_TRACE_FRAMES) -> dict:
+    status = await bg(mem_trace_start, frames)
+    if _mem_state["stop_handle"]:
+        _mem_state["stop_handle"].cancel()
+    _mem_state["stop_handle"] = asyncio.get_running_loop().call_later(MEM_TRACE_MAX_S, mem_trace_stop)
+    return status
+
+def mem_trace_stop() -> dict:
+    if tracemalloc.is_tracing():
+        tracemalloc.stop()
+    _mem_state.update(baseline=None, started=0.0)
+    handle, _mem_state["stop_handle"] = _mem_state["stop_handle"], None
+    if handle:
+        handle.cancel()
+    return mem_trace_status()
+
+def mem_trace_status() -> dict:
+    tracing = tracemalloc.is_tracing()
+    current, peak = tracemalloc.get_traced_memory() if tracing else (0, 0)
+    return {"tracing": tracing, "since": _mem_state["started"], "diffs": _mem_state["diffs"],
+            "auto_stop_s": MEM_TRACE_MAX_S, "traced_kb": current // 1024, "peak_kb": peak // 1024,
+            "overhead_kb": tracemalloc.get_tracemalloc_memory() // 1024 if tracing else 0,
+            "rss_kb": _mem_rss_kb()}
+
+def mem_trace_diff(top: int = 20, group: str = "lineno", rebase: bool = False) -> dict:
+    """Top punti di allocazione cresciuti dalla baseline. group="traceback" tiene lo stack
+    completo (MEM_TRACE_FRAMES) per capire da dove arriva una riga stdlib."""
+    if _mem_state["baseline"] is None:
+        raise RuntimeError("tracemalloc non attivo: avvialo prima")
+    snap = _mem_snapshot()
+    stats = snap.compare_to(_mem_state["baseline"], group)
+    stats.sort(key=lambda s: s.size_diff, reverse=True)
+    sites = [{"where": f"{Path(s.traceback[-1].filename).name}:{s.traceback[-1].lineno}" if group == "traceback"
+              else f"{Path(s.traceback[0].filename).name}:{s.traceback[0].lineno}",
+              "size_kb": round(s.size / 1024, 1), "size_diff_kb": round(s.size_diff / 1024, 1),
+              "count": s.count, "count_diff": s.count_diff,
+              "stack": [f"{Path(f.filename).name}:{f.lineno}" for f in s.traceback] if group == "traceback" else []}
+             for s in stats[:top] if s.size_diff > 0]
+    _mem_state["diffs"] += 1
+    if rebase:
+        _mem_state["baseline"] = snap
+    return {**mem_trace_status(), "group": group, "sites": sites,
+            "grown_kb": round(sum(s.size_diff for s in stats if s.size_diff > 0) / 1024, 1)}
@@ -0,0 +1,104 @@
+# ─── Fetch HTTP condiviso (GET condizionali + cache su disco) ───────────────
+# Feed e API esterne (CoinGecko, HN, open-meteo, GitHub, PyPI, Reddit) passano
+# da qui: ETag/Last-Modified salvati su disco → richieste condizionali (304 =
+# niente corpo da scaricare), al massimo HTTP_HOST_LIMIT richieste per host,
+# contenuto vecchio servito se la fonte non risponde, latenza per fonte.
+# I job dello scheduler lo ricevono al posto del loro _fetch_url.
+HTTP_CACHE_DIR = Path.home() / ".nanobot" / "http_cache"
+HTTP_HOST_LIMIT = 2
+HTTP_USER_AGENT = "Vessel/1.0"
+
+_http_host_sems: dict[str, threading.BoundedSemaphore] = {}
+_http_lock = threading.Lock()
+_http_stats: dict[str, dict] = {}
+
+def _http_sem(host: str) -> threading.BoundedSemaphore:
+    with _http_lock:
+        sem = _http_host_sems.get(host)
+        if sem is None:
+            sem = _http_host_sems[host] = threading.BoundedSemaphore(HTTP_HOST_LIMIT)
+        return sem
+
+def _http_cache_key(url: str) -> Path:
+    return HTTP_CACHE_DIR / hashlib.sha256(url.encode("utf-8")).hexdigest()[:32]
+
+def _http_cache_read(url: str) -> tuple[dict, bytes | None]:
+    key = _http_cache_key(url)
+    try:
+        meta = json.loads(key.with_suffix(".json").read_text(encoding="utf-8"))
+        return meta, key.with_suffix(".body").read_bytes()
+    except (OSError, ValueError):
+        return {}, None
+
+def _http_cache_write(url: str, meta: dict, body: bytes | None = None):
+    """Il corpo si scrive prima dei metadati: un meta senza corpo non esiste mai."""
+    key = _http_cache_key(url)
+    try:
+        HTTP_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        if body is not None:
+            tmp = key.with_suffix(".tmp")
+            tmp.write_bytes(body)
+            tmp.replace(key.with_suffix(".body"))
+        key.with_suffix(".json").write_text(json.dumps(meta), encoding="utf-8")
+    except OSError as e:
+        print(f"[HTTP] cache {url[:60]}: {e}")
+
+def _http_record(source: str, status: str, latency_ms: int, error: str = ""):
+    with _http_lock:
+        s = _http_stats.setdefault(source, {"requests": 0, "not_modified": 0, "stale": 0, "errors": 0,
+                                            "total_ms": 0})
+        s["requests"] += 1
+        s["total_ms"] += latency_ms
+        s["not_modified"] += status == "not_modified"
+        s["stale"] += status == "stale"
+        s["errors"] += status == "error"
+        s.update(last_status=status, last_ms=latency_ms, last_error=error, at=time.time())
+
+def http_get(url: str, timeout: float = 10, source: str = "", headers: dict | None = None,
+             max_age: float = 0) -> dict:
+    """GET con validatori su disco. Ritorna {"body", "status", "latency_ms", "error"}:
+    status "ok" (200), "not_modified" (304, corpo dalla cache), "fresh" (cache più giovane
+    di max_age, nessuna richiesta), "stale" (fonte in errore, corpo vecchio), "error" (body None)."""
+    parts = urllib.parse.urlsplit(url)
+    source = source or (parts.netloc + parts.path)[:60]
+    meta, cached_body = _http_cache_read(url)
+    if max_age and cached_body is not None and time.time() - meta.get("fetched_at", 0) < max_age:
+        return {"body": cached_body, "status": "fresh", "latency_ms": 0, "error": ""}
+    req_headers = {"User-Agent": HTTP_USER_AGENT, **(headers or {})}
+    if cached_body is not None:
+        if meta.get("etag"):
+            req_headers["If-None-Match"] = meta["etag"]
+        if meta.get("last_modified"):
+            req_headers["If-Modified-Since"] = meta["last_modified"]
+    t0 = time.time()
+    body, status, error = None, "ok", ""
+    try:
+        with _http_sem(parts.netloc):
+            with urllib.request.urlopen(urllib.request.Request(url, headers=req_headers), timeout=timeout) as r:
+                body = r.read()
+                validators = {"etag": r.headers.get("ETag", ""), "last_modified": r.headers.get("Last-Modified", "")}
+        _http_cache_write(url, {**validators, "fetched_at": time.time()}, body)
+    except urllib.error.HTTPError as e:
+        if e.code == 304 and cached_body is not None:
+            body, status = cached_body, "not_modified"
+            _http_cache_write(url, {**meta, "fetched_at": time.time()})
+        else:
+            error = f"HTTP {e.code}"
+    except Exception as e:
+        error = str(e)[:120] or type(e).__name__
+    if error:
+        body, status = cached_body, "stale" if cached_body is not None else "error"
+    latency = int((time.time() - t0) * 1000)
+    _http_record(source, status, latency, error)
+    return {"body": body, "status": status, "latency_ms": latency, "error": error}
+
+def http_fetch(url: str, timeout: float = 10, source: str = "", **kwargs) -> bytes | None:
+    """Solo il corpo (anche stale), None se la fonte è giù e non c'è cache."""
+    return http_get(url, timeout, source, **kwargs)["body"]
+
+def http_fetch_stats() -> dict:
+    """Per fonte: richieste, 304, stale, errori, latenza ultima/media."""
+    with _http_lock:
+        return {src: {**{k: v for k, v in s.items() if k != "total_ms"},
+                      "avg_ms": round(s["total_ms"] / s["requests"]) if s["requests"] else 0}
+                for src, s in _http_stats.items()}
@@ -0,0 +1,65 @@
+# ─── Google Workspace (worker google_helper persistente) ────────────────────
+# google_helper.py gira nel venv google-workspace-mcp. Invece di un interprete
+# nuovo per comando (import librerie + credenziali: 2-4s) si parla via Unix
+# socket con un worker `google_helper.py serve` sempre caldo, avviato al primo
+# uso. Se il worker non risponde si ripiega sul subprocess one-shot.
+GOOGLE_HELPER_PY = str(Path.home() / ".local/share/google-workspace-mcp/bin/python")
+GOOGLE_HELPER_SCRIPT = str(Path.home() / "scripts/google_helper.py")
+GOOGLE_HELPER_SOCKET = os.environ.get("GOOGLE_HELPER_SOCKET",
+                                      str(Path.home() / ".nanobot" / "google_helper.sock"))
+GOOGLE_SPAWN_COOLDOWN = 60  # secondi tra due tentativi di avvio del worker
+
+_google_spawn_lock = threading.Lock()
+_google_spawned_at = 0.0
+
+def _google_rpc(argv: list, timeout: float) -> str:
+    """Una richiesta JSON-RPC al worker. OSError se non raggiungibile."""
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as s:
+        s.settimeout(timeout)
+        s.connect(GOOGLE_HELPER_SOCKET)
+        s.sendall((json.dumps({"jsonrpc": "2.0", "id": 1, "method": "call",
+                               "params": {"argv": argv}}) + "\n").encode("utf-8"))
+        buf = b""
+        while not buf.endswith(b"\n"):
+            chunk = s.recv(65536)
+            if not chunk:
+                break
+            buf += chunk
+    resp = json.loads(buf)
+    if "error" in resp:
+        return resp["error"].get("message", "errore google_helper")
+    return resp.get("result", {}).get("output", "")
+
+def _google_spawn():
+    """Avvia il worker in background (sessione separata: sopravvive ai restart)."""
+    global _google_spawned_at
+    with _google_spawn_lock:
+        if time.time() - _google_spawned_at < GOOGLE_SPAWN_COOLDOWN:
+            return
+        _google_spawned_at = time.time()
+    try:
+        subprocess.Popen([GOOGLE_HELPER_PY, GOOGLE_HELPER_SCRIPT, "serve", "--socket", GOOGLE_HELPER_SOCKET],
+                         stdin=subprocess.DEVNULL, stdout=subprocess.DEVNULL,
+                         stderr=subprocess.DEVNULL, start_new_session=True)
+        print(f"[Google] Worker avviato su {GOOGLE_HELPER_SOCKET}")
+    except Exception as e:
+        print(f"[Google] Avvio worker fallito: {e}")
+
+def google_call(argv: list, timeout: float = 30) -> str:
+    """Esegue un comando google_helper (es. ["tasks", "list"]) e ritorna l'output.
+    Sincrona: chiamare via bg() dagli handler async."""
+    if not Path(GOOGLE_HELPER_SCRIPT).exists():
+        return ""
+    try:
+        return _google_rpc(argv, timeout).strip()
+    except (OSError, ValueError):
+        pass
+    if Path(GOOGLE_HELPER_PY).exists():
+        _google_spawn()
+    try:
+        r = subprocess.run([GOOGLE_HELPER_PY, GOOGLE_HELPER_SCRIPT] + argv,
+                           capture_output=True, text=True, timeout=timeout)
+        return (r.stdout + r.stderr).strip()
+    except Exception as e:
+        print(f"[Google] {' '.join(argv)}: {e}")
+        return ""
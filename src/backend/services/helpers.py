@@ -12,7 +12,22 @@ def _inject_date(system_prompt: str) -> str:
 # ─── Helpers ──────────────────────────────────────────────────────────────────
 async def bg(fn, *args):
     """Esegue una funzione sincrona in un thread executor (non blocca l'event loop)."""
-    return await asyncio.get_running_loop().run_in_executor(None, fn, *args)
+    return await _bg_submit(fn, *args)
+
+def _bg_submit(fn, *args) -> asyncio.Future:
+    """run_in_executor senza await (fire-and-forget o worker di lunga durata), con le
+    metriche del pool: attesa in coda e worker occupati (services/metrics.py)."""
+    EXECUTOR_QUEUED.inc()
+    return asyncio.get_running_loop().run_in_executor(None, _bg_call, time.perf_counter(), fn, args)
+
+def _bg_call(queued_at: float, fn, args):
+    EXECUTOR_QUEUED.dec()
+    EXECUTOR_WAIT.observe(time.perf_counter() - queued_at)
+    EXECUTOR_BUSY.inc()
+    try:
+        return fn(*args)
+    finally:
+        EXECUTOR_BUSY.dec()
 
 def run(cmd: str) -> str:
     """Esegue un comando shell. SAFETY: usare SOLO con comandi hardcoded interni,
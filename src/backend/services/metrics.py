@@ -0,0 +1,172 @@
+# ─── Metriche in-process (OpenMetrics) ──────────────────────────────────────
+# Contatori, gauge e istogrammi in memoria, esposti da GET /metrics in formato
+# testo OpenMetrics per un Prometheus in LAN. Registrare costa un lock non
+# conteso e una somma su un dict (gli istogrammi anche un bisect): va bene nei
+# percorsi caldi. Le grandezze che esistono già altrove (connessioni WS, code,
+# SIGIL_STATS, bus) non si duplicano: una funzione `fn` le legge allo scrape.
+METRICS_PREFIX = "vessel_"
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120)
+_METRICS: dict[str, "Metric"] = {}
+_METRICS_STARTED = time.time()
+
+
+def _metric_escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace("\"", "\\\"").replace("\n", "\\n")
+
+def _metric_labels(names: tuple, values: tuple, extra: str = "") -> str:
+    parts = [f'{n}="{_metric_escape(v)}"' for n, v in zip(names, values)]
+    if extra:
+        parts.append(extra)
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+def _metric_num(v) -> str:
+    if isinstance(v, float):
+        return "+Inf" if v == float("inf") else repr(round(v, 6))
+    return str(v)
+
+
+class Metric:
+    """Base: nome, help, nomi delle label; i valori per tupla di label."""
+    kind = "unknown"
+
+    def __init__(self, name: str, help: str, labels: tuple = (), fn=None):
+        self.name = METRICS_PREFIX + name
+        self.help = help
+        self.labels = tuple(labels)
+        self.fn = fn                       # () → numero oppure {tupla label: numero}
+        self._values: dict = {}
+        self._lock = threading.Lock()
+        _METRICS[self.name] = self
+
+    def series(self) -> dict:
+        if self.fn is None:
+            with self._lock:
+                return dict(self._values)
+        v = self.fn()
+        return v if isinstance(v, dict) else {(): v}
+
+    def expose(self) -> list[str]:
+        return [f"{self.name}{_metric_labels(self.labels, k)} {_metric_num(v)}"
+                for k, v in self.series().items()]
+
+
+class CounterMetric(Metric):
+    kind = "counter"
+
+    def inc(self, *labels, n=1):
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0) + n
+
+    def expose(self) -> list[str]:
+        return [f"{self.name}_total{_metric_labels(self.labels, k)} {_metric_num(v)}"
+                for k, v in self.series().items()]
+
+
+class GaugeMetric(Metric):
+    kind = "gauge"
+
+    def set(self, value, *labels):
+        self._values[labels] = value
+
+    def inc(self, *labels, n=1):
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0) + n
+
+    def dec(self, *labels, n=1):
+        self.inc(*labels, n=-n)
+
+
+class HistogramMetric(Metric):
+    """Bucket fissi; per tupla di label [conteggi per bucket..., somma, totale]."""
+    kind = "histogram"
+
+    def __init__(self, name: str, help: str, labels: tuple = (), buckets: tuple = LATENCY_BUCKETS):
+        super().__init__(name, help, labels)
+        self.buckets = tuple(buckets)
+
+    def observe(self, value: float, *labels):
+        i = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            row = self._values.get(labels)
+            if row is None:
+                row = self._values[labels] = [0] * (len(self.buckets) + 3)
+            row[i] += 1
+            row[-2] += value
+            row[-1] += 1
+
+    def expose(self) -> list[str]:
+        out = []
+        with self._lock:
+            rows = {k: list(v) for k, v in self._values.items()}
+        for k, row in rows.items():
+            acc = 0
+            for le, n in zip(self.buckets + (float("inf"),), row):
+                acc += n
+                le_label = 'le="' + _metric_num(float(le)) + '"'
+                out.append(f"{self.name}_bucket{_metric_labels(self.labels, k, le_label)} {acc}")
+            lbl = _metric_labels(self.labels, k)
+            out.append(f"{self.name}_count{lbl} {row[-1]}")
+            out.append(f"{self.name}_sum{lbl} {_metric_num(float(row[-2]))}")
+        return out
+
+
+def metrics_render() -> str:
+    """Tutte le metriche in formato testo OpenMetrics (termina con # EOF).
+    Una fn che fallisce (es. servizio non ancora inizializzato) salta solo la sua metrica."""
+    lines = []
+    for m in _METRICS.values():
+        try:
+            samples = m.expose()
+        except Exception:
+            continue
+        lines.append(f"# HELP {m.name} {_metric_escape(m.help)}")
+        lines.append(f"# TYPE {m.name} {m.kind}")
+        lines.extend(samples)
+    lines.append("# EOF")
+    return "\n".join(lines) + "\n"
+
+
+# ─── Catalogo ────────────────────────────────────────────────────────────────
+# Chat (services/chat.py: _execute_chat)
+CHAT_REQUESTS = CounterMetric("chat_requests", "Risposte chat per provider effettivo, canale ed esito",
+                              ("provider", "channel", "status"))
+CHAT_LATENCY = HistogramMetric("chat_latency_seconds", "Durata completa di una risposta chat", ("provider",))
+CHAT_TTFT = HistogramMetric("chat_ttft_seconds", "Dalla richiesta al primo token ricevuto", ("provider",))
+CHAT_TOKENS = CounterMetric("chat_tokens", "Token per provider e direzione", ("provider", "direction"))
+CHAT_FAILOVERS = CounterMetric("chat_failovers", "Failover riusciti verso il provider di riserva", ("from", "to"))
+PROVIDER_ERRORS = CounterMetric("provider_errors", "Tentativi falliti (nessun testo) per provider", ("provider",))
+
+# Executor (services/helpers.py: bg) e SQLite (database.py: _TimedConnection)
+EXECUTOR_QUEUED = GaugeMetric("executor_queued", "Chiamate bg() in coda in attesa di un worker del pool")
+EXECUTOR_BUSY = GaugeMetric("executor_busy", "Worker del pool occupati da chiamate bg()")
+EXECUTOR_WAIT = HistogramMetric("executor_wait_seconds", "Attesa in coda prima che un worker del pool parta",
+                                buckets=(0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1, 5))
+DB_WRITE = HistogramMetric("db_write_seconds", "Transazioni SQLite con scritture (with _db_conn())",
+                           buckets=(0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 1, 5))
+
+
+def _executor_workers():
+    pool = getattr(asyncio.get_running_loop(), "_default_executor", None)   # creato al primo bg()
+    return getattr(pool, "_max_workers", 0)
+
+def _queue_depths() -> dict:
+    out = {("telegram_send",): sum(q.qsize() for q in tg_client._queues.values())}
+    out[("sigil_unacked",)] = sum(max(0, _sigil_seq - p["acked"]) for p in list(_sigil_peers.values())
+                                  if p["proto"] >= 2)
+    return out
+
+# Letture allo scrape
+GaugeMetric("executor_workers", "Worker massimi del thread pool di default", fn=_executor_workers)
+GaugeMetric("ws_connections", "WebSocket aperti per tipo", ("kind",),
+            fn=lambda: {("dashboard",): len(manager.connections), ("sigil",): len(_sigil_peers)})
+GaugeMetric("queue_depth", "Messaggi in attesa per coda", ("queue",), fn=_queue_depths)
+GaugeMetric("event_loop_lag_seconds", "Ultimo ritardo misurato del battito dell'event loop",
+            fn=lambda: round(_loop_lags[-1] / 1000, 4) if _loop_lags else 0.0)
+CounterMetric("event_loop_stalls", "Stalli dell'event loop oltre soglia", fn=lambda: _loop_state["stalls"])
+CounterMetric("sigil_frames", "Frame Sigil per esito", ("kind",),
+              fn=lambda: {(k,): v for k, v in SIGIL_STATS.items()})
+CounterMetric("telegram_retries_429", "Risposte 429 della Bot API", fn=lambda: tg_client.retries_429)
+CounterMetric("bus_events", "Eventi pubblicati sul bus in-process", ("status",),
+              fn=lambda: {("published",): bus.published, ("error",): bus.errors})
+GaugeMetric("process_resident_memory_bytes", "RSS del processo", fn=lambda: _mem_rss_kb() * 1024)
+GaugeMetric("process_start_time_seconds", "Avvio del processo (epoch)", fn=lambda: round(_METRICS_STARTED, 3))
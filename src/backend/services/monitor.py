@@ -1,3 +1,90 @@
+# ─── Health registry ──────────────────────────────────────────────────────────
+# Un solo posto che sonda i servizi: heartbeat, broadcaster, handler WS, ESP32 e
+# /api/health leggono l'ultimo risultato (con età) invece di rifare la richiesta.
+# Ogni check ha intervallo con jitter e timeout; negli eventi finisce solo il
+# cambio di stato (online ↔ offline), non ogni ping.
+HEALTH_JITTER = 0.1          # ±10% sull'intervallo, evita che i check si allineino
+HEALTH_ON_DEMAND_AGE = 10    # s: un check esplicito dell'utente riusa risultati più freschi di così
+_health: dict[str, dict] = {}
+
+def register_health_check(name: str, probe, interval: float, timeout: float = 5.0):
+    """Registra un probe sincrono (gira via bg). Il risultato è ok se truthy;
+    per i dict, se status non è "offline"."""
+    _health[name] = {"probe": probe, "interval": interval, "timeout": timeout,
+                     "ok": None, "value": None, "error": "", "checked_at": 0.0, "changed_at": 0.0,
+                     "latency_ms": 0, "runs": 0, "next_at": 0.0, "lock": asyncio.Lock()}
+
+def _health_ok(value) -> bool:
+    if isinstance(value, dict):
+        return value.get("status") != "offline"
+    return bool(value)
+
+async def _health_run(name: str) -> dict:
+    c = _health[name]
+    if c["lock"].locked():
+        # Probe già in corso: si aspetta quello (single-flight)
+        async with c["lock"]:
+            return c
+    async with c["lock"]:
+        t0 = time.time()
+        try:
+            value = await asyncio.wait_for(bg(c["probe"]), timeout=c["timeout"])
+            error = ""
+        except asyncio.TimeoutError:
+            value, error = None, "timeout"
+        except Exception as e:
+            value, error = None, str(e)[:120]
+        ok = _health_ok(value) and not error
+        latency = int((time.time() - t0) * 1000)
+        prev = c["ok"]
+        c.update(ok=ok, value=value, error=error, checked_at=time.time(), latency_ms=latency, runs=c["runs"] + 1,
+                 next_at=time.time() + c["interval"] * random.uniform(1 - HEALTH_JITTER, 1 + HEALTH_JITTER))
+        if ok != prev:
+            c["changed_at"] = c["checked_at"]
+            db_log_event("health", name, status="ok" if ok else "error", latency_ms=latency,
+                         payload={"from": prev, "to": ok}, error=error or None)
+    return c
+
+def health_state(name: str) -> dict:
+    """Ultimo risultato noto, senza sondare. ok=None se il check non ha ancora girato."""
+    c = _health.get(name)
+    if c is None:
+        return {"ok": None, "value": None, "age": None, "error": "check non registrato"}
+    return {"ok": c["ok"], "value": c["value"], "error": c["error"], "latency_ms": c["latency_ms"],
+            "age": round(time.time() - c["checked_at"], 1) if c["checked_at"] else None,
+            "since": c["changed_at"], "interval": c["interval"], "runs": c["runs"]}
+
+async def health_get(name: str, max_age: float | None = None) -> dict:
+    """Come health_state, ma sonda se il check non ha mai girato o è più vecchio di max_age
+    (per le richieste esplicite dell'utente: "Check Ollama" dal menu ESP32, dashboard)."""
+    c = _health.get(name)
+    if c is not None and (not c["checked_at"] or (max_age is not None and time.time() - c["checked_at"] > max_age)):
+        await _health_run(name)
+    return health_state(name)
+
+def health_report() -> dict:
+    return {name: health_state(name) for name in _health}
+
+def bridge_status() -> str:
+    """Stato bridge per stats/dashboard ("offline" finché il primo check non gira)."""
+    st = health_state("bridge")
+    return st["value"].get("status", "online") if st["ok"] else "offline"
+
+async def health_scheduler():
+    """Loop background: lancia i check scaduti, poi dorme fino al prossimo."""
+    print(f"[Health] Scheduler avviato ({', '.join(_health)})")
+    while True:
+        now = time.time()
+        for name, c in _health.items():
+            if c["next_at"] <= now and not c["lock"].locked():
+                asyncio.create_task(_health_run(name))
+        next_at = min((c["next_at"] for c in _health.values()), default=now + 60)
+        await asyncio.sleep(max(1.0, next_at - time.time()))
+
+register_health_check("ollama", check_ollama_health, interval=60, timeout=5)
+register_health_check("bridge", check_bridge_health, interval=60, timeout=5)
+
+
 # ─── Heartbeat Monitor (Fase 17B) ────────────────────────────────────────────
 _heartbeat_last_alert: dict[str, float] = {}
 _heartbeat_known_down: set[str] = set()  # servizi noti come down (no re-alert)
@@ -25,20 +112,13 @@ async def heartbeat_task():
             if mem_pct > 90:
                 alerts.append(("mem_high", f"💾 RAM Pi: {mem_pct}% (critica)"))
 
-            # 3) Ollama + Bridge — check paralleli
-            checks = [bg(check_ollama_health)]
-            if CLAUDE_BRIDGE_TOKEN:
-                checks.append(bg(check_bridge_health))
-            results = await asyncio.gather(*checks, return_exceptions=True)
-
-            ollama_ok = results[0] if not isinstance(results[0], Exception) else False
-            if not ollama_ok:
+            # 3) Ollama + Bridge — dal registry (sondati da health_scheduler)
+            ollama, bridge = await asyncio.gather(health_get("ollama"), health_get("bridge"))
+            if not ollama["ok"]:
                 alerts.append(("ollama_down", "🔴 Ollama locale non raggiungibile"))
 
-            if CLAUDE_BRIDGE_TOKEN and len(results) > 1:
-                bridge = results[1] if not isinstance(results[1], Exception) else {"status": "offline"}
-                if bridge.get("status") == "offline":
-                    alerts.append(("bridge_down", "🔴 Claude Bridge offline"))
+            if CLAUDE_BRIDGE_TOKEN and not bridge["ok"]:
+                alerts.append(("bridge_down", "🔴 Claude Bridge offline"))
 
             # Invia alert con logica differenziata
             active_keys = {k for k, _ in alerts}
@@ -47,7 +127,7 @@ async def heartbeat_task():
                     # Servizi: notifica solo al cambio stato (up → down)
                     if alert_key not in _heartbeat_known_down:
                         _heartbeat_known_down.add(alert_key)
-                        telegram_send(f"[Heartbeat] {alert_msg}")
+                        await tg_send(f"[Heartbeat] {alert_msg}")
                         db_log_audit("heartbeat_alert", resource=alert_key, details=alert_msg)
                         db_log_event("system", "alert", status="error",
                                      payload={"key": alert_key, "msg": alert_msg})
@@ -57,7 +137,7 @@ async def heartbeat_task():
                     last = _heartbeat_last_alert.get(alert_key, 0)
                     if now - last >= HEARTBEAT_ALERT_COOLDOWN:
                         _heartbeat_last_alert[alert_key] = now
-                        telegram_send(f"[Heartbeat] {alert_msg}")
+                        await tg_send(f"[Heartbeat] {alert_msg}")
                         db_log_audit("heartbeat_alert", resource=alert_key, details=alert_msg)
                         db_log_event("system", "alert", status="error",
                                      payload={"key": alert_key, "msg": alert_msg})
@@ -68,18 +148,18 @@ async def heartbeat_task():
                 if key not in active_keys:
                     _heartbeat_known_down.discard(key)
                     label = key.replace("_down", "").replace("_", " ").title()
-                    telegram_send(f"[Heartbeat] ✅ {label} tornato online")
+                    await tg_send(f"[Heartbeat] ✅ {label} tornato online")
                     db_log_audit("heartbeat_recovery", resource=key)
                     db_log_event("system", "recovery", payload={"key": key, "service": label})
                     print(f"[Heartbeat] RECOVERY: {label} online")
 
             # Tamagotchi: ALERT se ci sono problemi, IDLE se risolti
             if alerts:
-                _set_tamagotchi_local("ALERT")
+                await bus.publish(Alert("heartbeat", alerts[0][1], key=alerts[0][0]))
             elif _heartbeat_last_alert or _heartbeat_known_down:
                 pass  # ancora problemi noti, mantieni stato corrente
             else:
-                _set_tamagotchi_local("IDLE")
+                await bus.publish(SigilState("IDLE"))
 
             # Pulisci cooldown soglie risolte
             for key in list(_heartbeat_last_alert.keys()):
@@ -92,29 +172,23 @@ async def heartbeat_task():
 
 
 async def crypto_push_task():
-    """Loop background: push prezzi BTC/ETH all'ESP32 ogni 15 minuti via broadcast_raw.
-    Usa globals() per accedere a broadcast_tamagotchi_raw definita in routes.py
-    (nel file compilato unico tutto è nello stesso namespace globale).
-    """
+    """Loop background: pubblica prezzi BTC/ETH sul bus ogni 15 minuti
+    (il Sigil li riceve via subscriber). Niente fetch se nessun ESP32 è connesso."""
     print("[Crypto] Push task avviato")
     await asyncio.sleep(60)  # attendi boot completo
     while True:
         try:
-            _conns    = globals().get("_tamagotchi_connections", set())
-            _bcast    = globals().get("broadcast_tamagotchi_raw")
-            if _conns and _bcast:
+            if bus.query("sigil.clients"):
                 data = await bg(get_crypto_prices)
                 btc  = data.get("btc")
                 eth  = data.get("eth")
                 if not data.get("error") and btc and btc.get("usd", 0) > 0:
-                    payload = {
-                        "action":     "crypto_update",
-                        "btc":        btc["usd"],
-                        "eth":        eth["usd"]        if eth else 0,
-                        "btc_change": btc["change_24h"] if btc else 0,
-                        "eth_change": eth["change_24h"] if eth else 0,
-                    }
-                    await _bcast(payload)
+                    await bus.publish(CryptoUpdate(
+                        btc=btc["usd"],
+                        eth=eth["usd"]        if eth else 0,
+                        btc_change=btc["change_24h"],
+                        eth_change=eth["change_24h"] if eth else 0,
+                    ))
                     print(f"[Crypto] Push → BTC ${btc['usd']:.0f} ({btc['change_24h']:+.1f}%)")
         except Exception as e:
             print(f"[Crypto] Push error: {e}")
@@ -0,0 +1,288 @@
+# ─── Job scheduler in-process (sostituisce i cron degli script) ─────────────
+# Ogni voce di crontab avviava un interprete nuovo: import, config e connessioni
+# rifatti da zero per pochi secondi di lavoro vero. Qui gli script sono moduli
+# caricati una volta (ricaricati se il file cambia) e il loro main() gira in un
+# pool dedicato con gli helper del server iniettati al posto dei duplicati locali:
+# Telegram sul client keep-alive, Sigil sul bus, Google sul worker, stesso DB.
+# Le print del job diventano progresso live sulla dashboard e storico in job_runs.
+JOB_JITTER = 30          # s casuali aggiunti a ogni esecuzione (i job delle :00 non partono insieme)
+JOB_OUTPUT_LINES = 200   # righe di output tenute per esecuzione
+JOB_WORKERS = 2          # thread dei job, separati dal pool di bg()
+
+# Un job dura fino a 30 min e un thread in timeout non si può interrompere: nel
+# pool di default toglierebbe worker a chat, DB e health probe per minuti
+_job_pool = concurrent.futures.ThreadPoolExecutor(max_workers=JOB_WORKERS, thread_name_prefix="job")
+
+# nome: (cron, script, timeout s, telegram in HTML)
+JOB_DEFAULTS = {
+    "ai_monitor":     ("30 6 * * *",      "ai_monitor.py",            300,  False),
+    "briefing":       ("30 7 * * *",      str(BRIEFING_SCRIPT),       300,  False),
+    "task_reminder":  ("*/15 7-22 * * *", "scripts/task_reminder.py", 120,  True),
+    "check_in":       ("0 20 * * *",      "check_in.py",              120,  True),
+    "goodnight":      ("0 22 * * *",      "scripts/goodnight.py",     120,  True),
+    "deep_learn":     ("0 2 1 * *",       "deep_learn.py",            1800, False),
+    "self_evolve":    ("0 3 * * 0",       "self_evolve.py",           1800, False),
+    "backup_db":      ("0 4 * * 0",       "backup_db.py",             900,  False),
+    "daily_summary":  ("20 0-6 * * *",    "daily_summary.py",         900,  False),
+    "weekly_summary": ("0 5-8 * * 0",     "weekly_summary.py",        900,  False),
+}
+
+# ─── Espressioni cron ────────────────────────────────────────────────────────
+_CRON_ALIASES = {"@hourly": "0 * * * *", "@daily": "0 0 * * *", "@midnight": "0 0 * * *",
+                 "@weekly": "0 0 * * 0", "@monthly": "0 0 1 * *"}
+_CRON_BOUNDS = ((0, 59), (0, 23), (1, 31), (1, 12), (0, 7))
+
+def _cron_field(expr: str, lo: int, hi: int) -> frozenset:
+    values = set()
+    for part in expr.split(","):
+        rng, _, step = part.partition("/")
+        step = int(step) if step else 1
+        if rng == "*":
+            a, b = lo, hi
+        elif "-" in rng:
+            a, b = (int(x) for x in rng.split("-", 1))
+        else:
+            a = int(rng)
+            b = hi if step > 1 else a   # "5/15" = dal 5 ogni 15
+        if step < 1 or not lo <= a <= b <= hi:
+            raise ValueError(f"campo fuori intervallo: {part}")
+        values.update(range(a, b + 1, step))
+    return frozenset(values)
+
+def parse_cron(expr: str) -> tuple:
+    """"m h dom mon dow" (o @daily/@hourly/...) → insiemi di valori ammessi.
+    ValueError se l'espressione non è valida."""
+    expr = _CRON_ALIASES.get(expr.strip(), expr.strip())
+    parts = expr.split()
+    if len(parts) != 5:
+        raise ValueError(f"Cron non valido: {expr!r}")
+    try:
+        fields = [_cron_field(p, lo, hi) for p, (lo, hi) in zip(parts, _CRON_BOUNDS)]
+    except ValueError as e:
+        raise ValueError(f"Cron non valido: {expr!r} ({e})")
+    fields[4] = frozenset(d % 7 for d in fields[4])   # 7 = domenica
+    # Regola cron: se giorno del mese e della settimana sono entrambi ristretti, basta uno dei due
+    return (*fields, parts[2].startswith("*"), parts[4].startswith("*"))
+
+def cron_next(spec: tuple, after: _dt) -> _dt:
+    """Prima esecuzione strettamente successiva ad `after` (salta per mese/giorno/ora)."""
+    minutes, hours, doms, months, dows, dom_any, dow_any = spec
+    t = after.replace(second=0, microsecond=0) + timedelta(minutes=1)
+    limit = t + timedelta(days=366 * 4)
+    while t < limit:
+        if t.month not in months:
+            t = (t.replace(day=1, hour=0, minute=0) + timedelta(days=32)).replace(day=1)
+            continue
+        dom_ok, dow_ok = t.day in doms, (t.weekday() + 1) % 7 in dows
+        if not (dom_ok and dow_ok if dom_any or dow_any else dom_ok or dow_ok):
+            t = t.replace(hour=0, minute=0) + timedelta(days=1)
+            continue
+        if t.hour not in hours:
+            t = t.replace(minute=0) + timedelta(hours=1)
+            continue
+        if t.minute not in minutes:
+            t += timedelta(minutes=1)
+            continue
+        return t
+    raise ValueError("nessuna esecuzione nei prossimi 4 anni")
+
+# ─── Registro job ────────────────────────────────────────────────────────────
+_jobs: dict[str, dict] = {}
+_jobs_loop: asyncio.AbstractEventLoop | None = None
+_print_builtin = print
+
+def _job_script(path: str) -> Path:
+    """Lo script può stare in ~/<path>, ~/scripts/<nome> o ~/<nome>: il primo che esiste."""
+    p = Path(path).expanduser()
+    if p.is_absolute():
+        return p
+    home = Path.home()
+    for cand in (home / p, home / "scripts" / p.name, home / p.name):
+        if cand.exists():
+            return cand
+    return home / p
+
+def load_jobs():
+    """Registro da JOB_DEFAULTS + override in ~/.nanobot/jobs.json
+    ({"briefing": {"cron": "0 8 * * *", "enabled": false, "script": "...", "timeout": 600}})."""
+    overrides = _get_config("jobs.json")
+    for name, (cron, script, timeout, html) in JOB_DEFAULTS.items():
+        o = overrides.get(name, {}) if isinstance(overrides.get(name), dict) else {}
+        cron = o.get("cron", cron)
+        try:
+            spec = parse_cron(cron)
+        except ValueError as e:
+            print(f"[Jobs] {name}: {e} — disabilitato")
+            spec = None
+        prev = _jobs.get(name, {})
+        _jobs[name] = {"name": name, "cron": cron, "spec": spec,
+                       "script": _job_script(o.get("script", script)),
+                       "timeout": int(o.get("timeout", timeout)), "html": html,
+                       "enabled": bool(o.get("enabled", True)) and spec is not None,
+                       "next_at": 0.0, "running": prev.get("running", False),
+                       "module": prev.get("module"), "mtime": prev.get("mtime", 0)}
+
+def _crontab_text() -> str:
+    try:
+        r = subprocess.run(["crontab", "-l"], capture_output=True, text=True, timeout=10)
+        return r.stdout if r.returncode == 0 else ""
+    except Exception:
+        return ""
+
+def _job_external(job: dict, crontab: str) -> bool:
+    """True se lo script è ancora nel crontab: lo lancia cron, lo scheduler non lo duplica."""
+    return any(job["script"].name in line for line in crontab.splitlines()
+               if line.strip() and not line.lstrip().startswith("#"))
+
+def _schedule_next(job: dict):
+    if not job["enabled"]:
+        job["next_at"] = 0.0
+        return
+    job["next_at"] = cron_next(job["spec"], _dt.now()).timestamp() + random.uniform(0, JOB_JITTER)
+
+# ─── Helper condivisi iniettati negli script ────────────────────────────────
+def _job_await(coro, timeout: float = 60):
+    """Dal thread del job: esegue una coroutine sul loop del server e ne attende il risultato."""
+    return asyncio.run_coroutine_threadsafe(coro, _jobs_loop).result(timeout)
+
+def _job_telegram(html: bool):
+    def telegram_send(text: str) -> bool:
+        if not TELEGRAM_TOKEN or not TELEGRAM_CHAT_ID:
+            print("Telegram non configurato")
+            return False
+        extra = {"parse_mode": "HTML"} if html else {}
+        sent = _job_await(tg_client.send_message(text, **extra))
+        return all(m is not None for m in sent)
+    return telegram_send
+
+def _job_bus_send(msg: dict) -> dict:
+    return _job_await(bus_dispatch(msg), timeout=5)
+
+def _job_call_google(args: list) -> str | None:
+    return google_call(args, timeout=15) or None
+
+def _job_fetch_url(url: str, timeout: float = 10) -> bytes | None:
+    return http_fetch(url, timeout)
+
+def _job_printer(name: str, out: list):
+    """print() del job: output catturato + riga di progresso sulla dashboard."""
+    def _print(*args, sep=" ", end="\n", file=None, flush=False):
+        line = sep.join(str(a) for a in args)
+        out.append(line)
+        del out[:-JOB_OUTPUT_LINES]
+        _print_builtin(f"[Job:{name}] {line}")
+        _jobs_loop.call_soon_threadsafe(
+            asyncio.ensure_future,
+            manager.broadcast({"type": "job_progress", "job": name, "status": "running", "line": line[:300]}))
+    return _print
+
+def _job_module(job: dict):
+    """Importa lo script come modulo (una volta, o di nuovo se il file è cambiato)."""
+    path = job["script"]
+    mtime = path.stat().st_mtime_ns
+    if job["module"] is None or job["mtime"] != mtime:
+        spec = importlib.util.spec_from_file_location(f"vessel_job_{job['name']}", path)
+        module = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(module)
+        job["module"], job["mtime"] = module, mtime
+    return job["module"]
+
+def _job_exec(job: dict, out: list):
+    """Gira in _job_pool. SystemExit con codice != 0 diventa un errore."""
+    module = _job_module(job)
+    shared = {"telegram_send": _job_telegram(job["html"]), "send_to_telegram": _job_telegram(False),
+              "_bus_send": _job_bus_send, "_call_google": _job_call_google, "_db_conn": _db_conn,
+              "_fetch_url": _job_fetch_url}
+    for attr, fn in shared.items():
+        if hasattr(module, attr):   # si sostituiscono solo gli helper che lo script definisce
+            setattr(module, attr, fn)
+    module.print = _job_printer(job["name"], out)
+    try:
+        module.main()
+    except SystemExit as e:
+        if e.code not in (None, 0):
+            raise RuntimeError(f"exit {e.code}")
+
+# ─── Esecuzione ──────────────────────────────────────────────────────────────
+def _job_done(job: dict, fut: asyncio.Future):
+    job["running"] = False
+    # exception() va letta comunque (altrimenti "exception never retrieved")
+    if not fut.cancelled() and fut.exception() is not None and job.pop("timed_out", False):
+        print(f"[Jobs] {job['name']} terminato dopo il timeout: {fut.exception()}")
+
+async def run_job(name: str, trigger: str = "cron") -> dict:
+    """Esegue un job (cron o manuale). Un job già in corso non parte una seconda volta."""
+    job = _jobs.get(name)
+    if job is None:
+        return {"ok": False, "error": f"Job sconosciuto: {name}"}
+    if job["running"]:
+        db_log_event("scheduler", "skip", status="error", payload={"job": name, "trigger": trigger},
+                     error="già in esecuzione")
+        return {"ok": False, "error": "già in esecuzione"}
+    if not job["script"].exists():
+        return {"ok": False, "error": f"script non trovato: {job['script']}"}
+    job["running"] = True
+    out: list[str] = []
+    run_id = await bg(db_job_run_start, name, trigger)
+    await manager.broadcast({"type": "job_progress", "job": name, "status": "running", "line": ""})
+    t0 = time.time()
+    fut = asyncio.get_running_loop().run_in_executor(_job_pool, _job_exec, job, out)
+    # Il thread non si può interrompere: il flag si libera solo quando finisce davvero
+    fut.add_done_callback(lambda f: _job_done(job, f))
+    try:
+        await asyncio.wait_for(asyncio.shield(fut), timeout=job["timeout"])
+        status, error = "ok", ""
+    except asyncio.TimeoutError:
+        status, error = "timeout", f"oltre {job['timeout']}s"
+        job["timed_out"] = True
+    except Exception as e:
+        status, error = "error", str(e)[:300]
+    duration = int((time.time() - t0) * 1000)
+    await bg(db_job_run_finish, run_id, status, duration, "\n".join(out), error)
+    db_log_event("scheduler", name, status="ok" if status == "ok" else "error", latency_ms=duration,
+                 payload={"trigger": trigger}, error=error)
+    await manager.broadcast({"type": "job_progress", "job": name, "status": status,
+                             "line": error, "duration_ms": duration})
+    return {"ok": status == "ok", "status": status, "error": error, "duration_ms": duration}
+
+async def run_briefing() -> dict:
+    """Briefing manuale (dashboard, ESP32): stesso job dello scheduler, poi i dati aggiornati."""
+    await run_job("briefing", "manual")
+    get_briefing_data.invalidate()
+    return await bg(get_briefing_data)
+
+async def job_scheduler():
+    """Loop dello scheduler: dorme fino al prossimo job in scadenza (max 60s)."""
+    global _jobs_loop
+    _jobs_loop = asyncio.get_running_loop()
+    load_jobs()
+    # Al boot nessun job è in corso: le righe 'running' sono di un processo interrotto
+    stale = await bg(db_job_runs_interrupt)
+    if stale:
+        print(f"[Jobs] {stale} esecuzioni interrotte dal riavvio")
+    for job in _jobs.values():
+        _schedule_next(job)
+    print(f"[Jobs] Scheduler attivo: {sum(j['enabled'] for j in _jobs.values())} job")
+    while True:
+        now = time.time()
+        due = [j for j in _jobs.values() if j["next_at"] and j["next_at"] <= now]
+        if due:
+            crontab = await bg(_crontab_text)
+            for job in due:
+                _schedule_next(job)
+                if _job_external(job, crontab):
+                    continue
+                asyncio.create_task(run_job(job["name"], "cron"))
+        pending = [j["next_at"] for j in _jobs.values() if j["next_at"]]
+        await asyncio.sleep(min(60.0, max(1.0, min(pending, default=now + 60) - time.time())))
+
+def job_list() -> list[dict]:
+    """Stato dei job per il widget Cron (sincrona: via bg)."""
+    last = db_get_last_job_runs()
+    crontab = _crontab_text()
+    return [{"name": j["name"], "cron": j["cron"], "script": str(j["script"]),
+             "exists": j["script"].exists(), "enabled": j["enabled"],
+             "external": _job_external(j, crontab), "running": j["running"],
+             "next": _dt.fromtimestamp(j["next_at"]).strftime("%d/%m %H:%M") if j["next_at"] else "",
+             "last": last.get(j["name"])}
+            for j in _jobs.values()]
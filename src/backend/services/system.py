@@ -53,14 +53,34 @@ def get_tmux_sessions() -> list[dict]:
             sessions.append({"name": name, "info": line.strip()})
     return sessions
 
+_version_cache: dict = {"text": "", "ts": 0}
+VERSION_CACHE_TTL = 3600  # la CLI nanobot cambia solo con un upgrade
+
 def get_nanobot_version() -> str:
-    return run("nanobot --version 2>/dev/null | head -1") or "N/A"
+    """Versione nanobot CLI. Cache 1h (evita un subprocess ad ogni connessione WS)."""
+    now = time.time()
+    if _version_cache["text"] and now - _version_cache["ts"] < VERSION_CACHE_TTL:
+        return _version_cache["text"]
+    version = run("nanobot --version 2>/dev/null | head -1") or "N/A"
+    _version_cache["text"] = version
+    _version_cache["ts"] = now
+    return version
+
+_memory_preview_cache: dict = {"text": "", "mtime": 0.0}
 
 def get_memory_preview() -> str:
-    if MEMORY_FILE.exists():
-        lines = [l for l in MEMORY_FILE.read_text(encoding="utf-8").splitlines() if l.strip()]
-        return "\n".join(lines[:30]) if lines else "(vuota)"
-    return "(file non trovato)"
+    """Anteprima MEMORY.md. Riletta solo se il file cambia (mtime)."""
+    try:
+        mtime = MEMORY_FILE.stat().st_mtime
+    except OSError:
+        return "(file non trovato)"
+    if _memory_preview_cache["text"] and _memory_preview_cache["mtime"] == mtime:
+        return _memory_preview_cache["text"]
+    lines = [l for l in MEMORY_FILE.read_text(encoding="utf-8").splitlines() if l.strip()]
+    text = "\n".join(lines[:30]) if lines else "(vuota)"
+    _memory_preview_cache["text"] = text
+    _memory_preview_cache["mtime"] = mtime
+    return text
 
 def get_quickref_preview() -> str:
     if QUICKREF_FILE.exists():
@@ -110,6 +130,7 @@ def get_nanobot_logs(n: int = 80, search: str = "", date_filter: str = "") -> di
     return {"lines": result_lines, "total": total, "filtered": filtered}
 
 # ─── Cron ────────────────────────────────────────────────────────────────────
+@cached(ttl=300)
 def get_cron_jobs() -> list[dict]:
     HUMAN = {
         "0 * * * *": "ogni ora",  "*/5 * * * *": "ogni 5 min",
@@ -169,6 +190,7 @@ def add_cron_job(schedule: str, command: str) -> str:
     result = subprocess.run(
         ["crontab", "-"], input=new_crontab, capture_output=True, text=True
     )
+    get_cron_jobs.invalidate()
     if result.returncode == 0:
         return "ok"
     return f"Errore: {result.stderr[:100]}"
@@ -187,6 +209,7 @@ def delete_cron_job(line_index: int) -> str:
     result = subprocess.run(
         ["crontab", "-"], input=new_crontab, capture_output=True, text=True
     )
+    get_cron_jobs.invalidate()
     if result.returncode == 0:
         return "ok"
     return f"Errore: {result.stderr[:100]}"
@@ -196,20 +219,14 @@ BRIEFING_LOG = Path.home() / ".nanobot" / "briefing_log.jsonl"
 BRIEFING_SCRIPT = Path.home() / ".nanobot" / "workspace" / "skills" / "morning-briefing" / "briefing.py"
 BRIEFING_CRON = "30 7 * * *"  # 07:30 ogni giorno
 
+@cached(ttl=60)
 def get_briefing_data() -> dict:
     """Legge ultimo briefing da SQLite."""
     return db_get_briefing()
 
-def run_briefing() -> dict:
-    """Esegue briefing.py e restituisce il risultato."""
-    safe_parent = shlex.quote(str(BRIEFING_SCRIPT.parent))
-    safe_name = shlex.quote(str(BRIEFING_SCRIPT.name))
-    result = run(f"cd {safe_parent} && python3.13 {safe_name} 2>&1")
-    return get_briefing_data()
-
 # ─── Ollama Health ───────────────────────────────────────────────────────────
 def check_ollama_health() -> bool:
-    """Verifica se Ollama è raggiungibile."""
+    """Verifica se Ollama è raggiungibile (probe del health registry)."""
     try:
         req = urllib.request.Request(f"{OLLAMA_BASE}/api/tags")
         with urllib.request.urlopen(req, timeout=3) as resp:
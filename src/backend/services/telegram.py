@@ -1,8 +1,425 @@
 # ─── Telegram ────────────────────────────────────────────────────────────────
+TELEGRAM_API_HOST = "api.telegram.org"
+TELEGRAM_MAX_MESSAGE = 4096
+TELEGRAM_CHAT_INTERVAL = 1.0     # max ~1 msg/s per chat (limite Telegram)
+TELEGRAM_GLOBAL_INTERVAL = 1 / 30  # max ~30 msg/s complessivi
+TELEGRAM_MAX_INFLIGHT = 4        # update in ingresso gestiti in parallelo
+TELEGRAM_SEND_RETRIES = 5
+TELEGRAM_EDIT_INTERVAL = 1.5     # streaming: edit dello stesso messaggio al più ogni 1.5s
+TELEGRAM_STREAM_PLACEHOLDER = "…"
+
+
+class _KeepAliveHTTPS:
+    """Connessione HTTP/1.1 keep-alive su asyncio streams: una richiesta alla volta,
+    riconnessione trasparente se il server ha chiuso la connessione inattiva."""
+
+    def __init__(self, host: str, port: int = 443, tls: bool = True):
+        self.host = host
+        self.port = port
+        self.tls = tls
+        self._reader = None
+        self._writer = None
+        self._lock = asyncio.Lock()
+        self.requests = 0
+        self.connects = 0
+
+    async def _connect(self):
+        self._reader, self._writer = await asyncio.open_connection(
+            self.host, self.port, ssl=ssl.create_default_context() if self.tls else None)
+        self.connects += 1
+
+    def close(self):
+        if self._writer is not None:
+            self._writer.close()
+        self._reader = self._writer = None
+
+    async def request(self, method: str, path: str, body: bytes | list = b"",
+                      content_type: str = "application/json", timeout: float = 15) -> tuple[int, bytes]:
+        async with self._lock:
+            for attempt in range(2):
+                reused = self._writer is not None
+                try:
+                    if not reused:
+                        try:
+                            # Stesso timeout della richiesta: un handshake lento non
+                            # deve tenere il lock (e tutti gli invii in coda) all'infinito
+                            await asyncio.wait_for(self._connect(), timeout)
+                        except (OSError, asyncio.TimeoutError) as e:
+                            e._not_sent = True   # niente è partito: ritentare è sicuro
+                            raise
+                    return await asyncio.wait_for(self._roundtrip(method, path, body, content_type), timeout)
+                except (ConnectionError, asyncio.IncompleteReadError, ssl.SSLError) as e:
+                    self.close()
+                    # Connessione riusata chiusa dal server mentre era inattiva:
+                    # la richiesta non è stata elaborata, si riprova su una nuova
+                    if attempt or not reused or not getattr(e, "_no_response", False):
+                        raise
+                except BaseException:
+                    self.close()
+                    raise
+
+    async def _roundtrip(self, method: str, path: str, body: bytes | list, content_type: str) -> tuple[int, bytes]:
+        # body può essere una lista di buffer (multipart): scritti uno per uno, senza join
+        chunks = body if isinstance(body, list) else [body]
+        length = sum(len(c) for c in chunks)
+        head = (f"{method} {path} HTTP/1.1\r\nHost: {self.host}\r\n"
+                f"User-Agent: Vessel-Dashboard/1.0\r\nConnection: keep-alive\r\n")
+        if length or method == "POST":
+            head += f"Content-Type: {content_type}\r\nContent-Length: {length}\r\n"
+        try:
+            self._writer.write(head.encode() + b"\r\n")
+            for chunk in chunks:
+                if chunk:
+                    self._writer.write(chunk)
+            await self._writer.drain()
+            status_line = await self._reader.readline()
+        except ConnectionError as e:
+            e._no_response = True
+            raise
+        if not status_line:
+            err = ConnectionResetError("connessione chiusa dal server")
+            err._no_response = True
+            raise err
+        self.requests += 1
+        status = int(status_line.split()[1])
+        headers = {}
+        while True:
+            line = await self._reader.readline()
+            if line in (b"\r\n", b"\n", b""):
+                break
+            k, _, v = line.decode("latin-1").partition(":")
+            headers[k.strip().lower()] = v.strip()
+        if headers.get("transfer-encoding", "").lower() == "chunked":
+            data = bytearray()
+            while True:
+                size = int((await self._reader.readline()).split(b";")[0], 16)
+                if size == 0:
+                    await self._reader.readline()
+                    break
+                data += await self._reader.readexactly(size)
+                await self._reader.readline()
+            data = bytes(data)
+        elif "content-length" in headers:
+            data = await self._reader.readexactly(int(headers["content-length"]))
+        else:
+            data = await self._reader.read()
+            self.close()
+        if headers.get("connection", "").lower() == "close":
+            self.close()
+        return status, data
+
+
+def _split_message(text: str, limit: int = TELEGRAM_MAX_MESSAGE) -> list[str]:
+    """Divide un testo lungo in parti <= limit, preferendo paragrafi, righe, spazi.
+    Markdown-safe: un blocco ``` spezzato viene chiuso a fine parte e riaperto
+    all'inizio della successiva, così ogni messaggio resta ben formato."""
+    parts = []
+    fence = "```"
+    while len(text) > limit:
+        room = limit - len(fence) - 1  # spazio per un'eventuale chiusura del blocco
+        cut = -1
+        for sep in ("\n\n", "\n", " "):
+            cut = text.rfind(sep, room // 2, room)
+            if cut != -1:
+                break
+        if cut == -1:
+            cut = room
+        part, text = text[:cut].rstrip(), text[cut:].lstrip()
+        if part.count(fence) % 2:
+            part += "\n" + fence
+            text = fence + "\n" + text
+        parts.append(part)
+    if text:
+        parts.append(text)
+    return parts
+
+
+def _multipart(fields: dict, files: dict, boundary: str = "----VesselTelegramBoundary") -> tuple[list, int, str]:
+    """Body multipart/form-data come lista di buffer, senza concatenarli: i file
+    entrano come memoryview (zero copie). Ritorna (parti, lunghezza, content-type).
+    files: nome → (filename, content_type, bytes)."""
+    parts = []
+    for name, value in fields.items():
+        parts.append(f'--{boundary}\r\nContent-Disposition: form-data; name="{name}"\r\n\r\n{value}\r\n'.encode())
+    for name, (filename, ctype, data) in files.items():
+        parts.append(f'--{boundary}\r\nContent-Disposition: form-data; name="{name}"; filename="{filename}"\r\n'
+                     f"Content-Type: {ctype}\r\n\r\n".encode())
+        parts.append(memoryview(data))
+        parts.append(b"\r\n")
+    parts.append(f"--{boundary}--\r\n".encode())
+    return parts, sum(len(p) for p in parts), f"multipart/form-data; boundary={boundary}"
+
+
+class TelegramRetryAfter(Exception):
+    def __init__(self, retry_after: float, description: str = ""):
+        super().__init__(description or f"retry after {retry_after}s")
+        self.retry_after = retry_after
+
+
+class TelegramClient:
+    """Client Bot API asincrono.
+    - due connessioni keep-alive: una per il long polling, una per gli invii
+    - coda di uscita per chat: ordine garantito, ~1 msg/s per chat, ~30 msg/s globali
+    - 429 → attende `retry_after` e ritenta lo stesso messaggio (l'ordine resta)
+    - errori di rete: ritenta solo se la richiesta non è partita (niente doppioni)
+    - testi > 4096 caratteri divisi in più messaggi consecutivi"""
+
+    def __init__(self, token: str):
+        self.token = token
+        api = (TELEGRAM_API_HOST, 443, True)
+        if MOCK_URL:  # test di carico: Bot API servita da mock_llm.py
+            u = urllib.parse.urlsplit(MOCK_URL)
+            api = (u.hostname or "127.0.0.1", u.port or 80, u.scheme == "https")
+        self._send_conn = _KeepAliveHTTPS(*api)
+        self._poll_conn = _KeepAliveHTTPS(*api)
+        self._queues: dict[str, asyncio.Queue] = {}
+        self._workers: dict[str, asyncio.Task] = {}
+        self._chat_next: dict[str, float] = {}
+        self._global_next = 0.0
+        self._global_lock = asyncio.Lock()
+        self.loop: asyncio.AbstractEventLoop | None = None
+        self.sent = 0
+        self.retries_429 = 0
+        self.errors = 0
+
+    async def api(self, method: str, payload: dict | None = None, files: dict | None = None,
+                  poll: bool = False, timeout: float = 15):
+        """Chiama un metodo Bot API e ritorna `result`. Solleva TelegramRetryAfter su 429."""
+        if files:
+            body, _length, ctype = _multipart(payload or {}, files)
+        else:
+            body, ctype = json.dumps(payload or {}).encode("utf-8"), "application/json"
+        conn = self._poll_conn if poll else self._send_conn
+        status, raw = await conn.request("POST", f"/bot{self.token}/{method}", body, ctype, timeout=timeout)
+        try:
+            data = json.loads(raw)
+        except ValueError:
+            raise RuntimeError(f"{method}: HTTP {status}, risposta non JSON")
+        if status == 429 or data.get("error_code") == 429:
+            raise TelegramRetryAfter(data.get("parameters", {}).get("retry_after", 1), data.get("description", ""))
+        if not data.get("ok"):
+            raise RuntimeError(f"{method}: {data.get('description', f'HTTP {status}')}")
+        return data.get("result")
+
+    def _enqueue(self, chat_id: str, method: str, payload: dict, files: dict | None) -> asyncio.Future:
+        self.loop = asyncio.get_running_loop()
+        fut = self.loop.create_future()
+        queue = self._queues.get(chat_id)
+        if queue is None:
+            queue = self._queues[chat_id] = asyncio.Queue()
+        queue.put_nowait((method, payload, files, fut))
+        worker = self._workers.get(chat_id)
+        if worker is None or worker.done():
+            self._workers[chat_id] = asyncio.create_task(self._chat_worker(chat_id, queue))
+        return fut
+
+    async def _throttle(self, chat_id: str):
+        wait = self._chat_next.get(chat_id, 0) - time.monotonic()
+        if wait > 0:
+            await asyncio.sleep(wait)
+        async with self._global_lock:
+            wait = self._global_next - time.monotonic()
+            if wait > 0:
+                await asyncio.sleep(wait)
+            self._global_next = time.monotonic() + TELEGRAM_GLOBAL_INTERVAL
+
+    async def _chat_worker(self, chat_id: str, queue: asyncio.Queue):
+        """Un worker per chat: invia in ordine FIFO, un messaggio alla volta."""
+        while True:
+            try:
+                method, payload, files, fut = await asyncio.wait_for(queue.get(), timeout=300)
+            except asyncio.TimeoutError:
+                if queue.empty():
+                    self._workers.pop(chat_id, None)
+                    return
+                continue
+            t0 = time.time()
+            result, error = None, None
+            for _attempt in range(TELEGRAM_SEND_RETRIES):
+                await self._throttle(chat_id)
+                try:
+                    result = await self.api(method, payload, files, timeout=30 if files else 15)
+                    error = None
+                    break
+                except TelegramRetryAfter as e:
+                    self.retries_429 += 1
+                    print(f"[Telegram] 429 su {method}: attendo {e.retry_after}s")
+                    self._chat_next[chat_id] = time.monotonic() + e.retry_after
+                    error = e
+                except RuntimeError as e:
+                    error = e  # rifiutato da Telegram (400/403): inutile ritentare
+                    break
+                except Exception as e:
+                    error = e
+                    # Si ritenta solo se la richiesta non è arrivata a Telegram (connect
+                    # fallita, connessione chiusa prima di qualunque risposta). Un timeout
+                    # o un reset dopo l'invio può nascondere un messaggio già consegnato:
+                    # sendMessage/sendVoice non sono idempotenti, meglio perderlo che doppio
+                    if not (getattr(e, "_not_sent", False) or getattr(e, "_no_response", False)):
+                        break
+                    await asyncio.sleep(1)
+                finally:
+                    self._chat_next[chat_id] = max(self._chat_next.get(chat_id, 0),
+                                                   time.monotonic() + TELEGRAM_CHAT_INTERVAL)
+            latency = int((time.time() - t0) * 1000)
+            if error is None:
+                self.sent += 1
+                db_log_event("telegram", "send", status="ok", latency_ms=latency,
+                             payload={"method": method,
+                                      "chars": len(payload.get("text", payload.get("caption", "")))})
+            else:
+                self.errors += 1
+                print(f"[Telegram] {method} error: {error}")
+                db_log_event("telegram", "send", status="error", latency_ms=latency,
+                             payload={"method": method}, error=str(error)[:200])
+            if not fut.done():
+                fut.set_result(result if error is None else None)
+
+    async def send_message(self, text: str, chat_id: str = "", wait: bool = True, **extra) -> list:
+        """Accoda un testo (diviso se > 4096). Con wait=True attende l'invio e
+        ritorna i Message inviati (None per le parti fallite)."""
+        chat_id = chat_id or TELEGRAM_CHAT_ID
+        futs = [self._enqueue(chat_id, "sendMessage", {"chat_id": chat_id, "text": part, **extra}, None)
+                for part in _split_message(text or "(vuoto)")]
+        if not wait:
+            return []
+        return list(await asyncio.gather(*futs))
+
+    async def edit_message(self, message_id: int, text: str, chat_id: str = "", **extra):
+        """Sostituisce il testo di un messaggio già inviato (stessa coda della chat)."""
+        chat_id = chat_id or TELEGRAM_CHAT_ID
+        return await self._enqueue(chat_id, "editMessageText",
+                                   {"chat_id": chat_id, "message_id": message_id, "text": text, **extra}, None)
+
+    async def send_voice(self, ogg_bytes: bytes, caption: str = "", chat_id: str = ""):
+        chat_id = chat_id or TELEGRAM_CHAT_ID
+        fields = {"chat_id": chat_id}
+        if caption:
+            fields["caption"] = caption[:1024]
+        return await self._enqueue(chat_id, "sendVoice", fields,
+                                   {"voice": ("voice.ogg", "audio/ogg", ogg_bytes)})
+
+    async def get_updates(self, offset: int, timeout: int = 30) -> list:
+        """Long polling sulla connessione dedicata (non blocca gli invii)."""
+        self.loop = asyncio.get_running_loop()
+        return await self.api("getUpdates", {"offset": offset, "timeout": timeout,
+                                             "allowed_updates": ["message", "edited_message"]},
+                              poll=True, timeout=timeout + 10) or []
+
+    def stats(self) -> dict:
+        return {"sent": self.sent, "errors": self.errors, "retries_429": self.retries_429,
+                "queued": sum(q.qsize() for q in self._queues.values()),
+                "send_conn": {"requests": self._send_conn.requests, "connects": self._send_conn.connects},
+                "poll_conn": {"requests": self._poll_conn.requests, "connects": self._poll_conn.connects}}
+
+
+tg_client = TelegramClient(TELEGRAM_TOKEN)
+
+
+async def tg_send(text: str, wait: bool = True) -> bool:
+    """Invio asincrono alla chat configurata (via coda). True se tutte le parti sono partite."""
+    if not TELEGRAM_TOKEN or not TELEGRAM_CHAT_ID:
+        return False
+    sent = await tg_client.send_message(text, wait=wait)
+    return not wait or all(m is not None for m in sent)
+
+
+async def tg_send_voice(ogg_bytes: bytes, caption: str = "") -> bool:
+    if not TELEGRAM_TOKEN or not TELEGRAM_CHAT_ID or not ogg_bytes:
+        return False
+    return await tg_client.send_voice(ogg_bytes, caption) is not None
+
+
+class TelegramStreamer:
+    """Risposta progressiva: placeholder subito, poi editMessageText man mano
+    che arrivano i chunk (`on_chunk` di _execute_chat).
+    - al massimo un edit ogni TELEGRAM_EDIT_INTERVAL, uno solo in volo
+    - oltre 4096 caratteri la parte piena resta com'è e si continua in un nuovo messaggio
+    - finish() fa l'edit finale col testo definitivo
+    Se il placeholder non parte, ripiega su un invio normale a fine generazione."""
+
+    def __init__(self, chat_id: str = ""):
+        self.chat_id = chat_id or TELEGRAM_CHAT_ID
+        self.text = ""
+        self._ids: list = []     # message_id per parte
+        self._shown: list = []   # testo richiesto per parte (evita edit identici → 400)
+        self._dirty = asyncio.Event()
+        self._task: asyncio.Task | None = None
+        self.edits = 0
+
+    async def start(self, placeholder: str = TELEGRAM_STREAM_PLACEHOLDER):
+        sent = await tg_client.send_message(placeholder, chat_id=self.chat_id)
+        if sent and sent[0]:
+            self._ids.append(sent[0].get("message_id"))
+            self._shown.append(placeholder)
+            self._task = asyncio.create_task(self._flusher())
+
+    async def on_chunk(self, chunk: str):
+        self.text += chunk
+        self._dirty.set()
+
+    async def _flusher(self):
+        while True:
+            await self._dirty.wait()
+            self._dirty.clear()
+            await self._sync()
+            await asyncio.sleep(TELEGRAM_EDIT_INTERVAL)
+
+    async def _sync(self):
+        # Le parti già piene hanno un taglio stabile: si modifica solo quella che cresce
+        for i, part in enumerate(_split_message(self.text)):
+            if i < len(self._ids):
+                if self._shown[i] != part:
+                    self._shown[i] = part
+                    self.edits += 1
+                    await tg_client.edit_message(self._ids[i], part, chat_id=self.chat_id)
+            else:
+                sent = await tg_client.send_message(part, chat_id=self.chat_id)
+                self._ids.append(sent[0].get("message_id") if sent and sent[0] else None)
+                self._shown.append(part)
+
+    async def finish(self, final: str = "") -> str:
+        """Edit finale (testo definitivo, o quello accumulato se vuoto)."""
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+        self.text = final or self.text or "(vuoto)"
+        if not self._ids:
+            await tg_client.send_message(self.text, chat_id=self.chat_id)
+        else:
+            await self._sync()
+        return self.text
+
+
 def telegram_send(text: str) -> bool:
-    """Invia un messaggio al bot Telegram. Restituisce True se successo."""
+    """Versione sincrona per codice che gira nei thread dell'executor.
+    Se il client è attivo passa dalla sua coda; dal thread dell'event loop accoda
+    senza attendere (attendere qui bloccherebbe il loop)."""
     if not TELEGRAM_TOKEN or not TELEGRAM_CHAT_ID:
         return False
+    loop = tg_client.loop
+    if loop is not None and loop.is_running():
+        try:
+            running = asyncio.get_running_loop()
+        except RuntimeError:
+            running = None
+        if running is loop:
+            asyncio.ensure_future(tg_send(text, wait=False))
+            return True
+        fut = asyncio.run_coroutine_threadsafe(tg_send(text), loop)
+        try:
+            return fut.result(timeout=60)
+        except Exception as e:
+            print(f"[Telegram] send error: {e}")
+            return False
+    return _telegram_send_blocking(text)
+
+
+def _telegram_send_blocking(text: str) -> bool:
+    """Fallback urllib quando il client asincrono non è attivo (es. prima del lifespan)."""
     t0 = time.time()
     try:
         url = f"https://api.telegram.org/bot{TELEGRAM_TOKEN}/sendMessage"
@@ -58,39 +475,19 @@ def transcribe_voice(audio_bytes: bytes, filename: str = "voice.ogg") -> str:
     if not audio_bytes:
         return ""
     try:
-        boundary = "----VesselSTTBoundary"
-        body = b""
-        # Campo: file
-        body += f"--{boundary}\r\n".encode()
-        body += f'Content-Disposition: form-data; name="file"; filename="{filename}"\r\n'.encode()
-        body += b"Content-Type: audio/ogg\r\n\r\n"
-        body += audio_bytes
-        body += b"\r\n"
-        # Campo: model
-        body += f"--{boundary}\r\n".encode()
-        body += b'Content-Disposition: form-data; name="model"\r\n\r\n'
-        body += f"{GROQ_WHISPER_MODEL}\r\n".encode()
-        # Campo: language
-        body += f"--{boundary}\r\n".encode()
-        body += b'Content-Disposition: form-data; name="language"\r\n\r\n'
-        body += f"{GROQ_WHISPER_LANGUAGE}\r\n".encode()
-        # Campo: response_format
-        body += f"--{boundary}\r\n".encode()
-        body += b'Content-Disposition: form-data; name="response_format"\r\n\r\n'
-        body += b"json\r\n"
-        # Campo: temperature
-        body += f"--{boundary}\r\n".encode()
-        body += b'Content-Disposition: form-data; name="temperature"\r\n\r\n'
-        body += b"0\r\n"
-        # Chiudi boundary
-        body += f"--{boundary}--\r\n".encode()
-
+        parts, length, ctype = _multipart(
+            {"model": GROQ_WHISPER_MODEL, "language": GROQ_WHISPER_LANGUAGE,
+             "response_format": "json", "temperature": "0"},
+            {"file": (filename, "audio/ogg", audio_bytes)},
+            boundary="----VesselSTTBoundary")
+        # data iterabile: http.client invia le parti in sequenza (l'audio non viene copiato)
         req = urllib.request.Request(
             "https://api.groq.com/openai/v1/audio/transcriptions",
-            data=body, method="POST"
+            data=parts, method="POST"
         )
         req.add_header("Authorization", f"Bearer {GROQ_API_KEY}")
-        req.add_header("Content-Type", f"multipart/form-data; boundary={boundary}")
+        req.add_header("Content-Type", ctype)
+        req.add_header("Content-Length", str(length))
         req.add_header("User-Agent", "Vessel-Dashboard/1.0")
 
         with urllib.request.urlopen(req, timeout=30) as resp:
@@ -104,105 +501,227 @@ def transcribe_voice(audio_bytes: bytes, filename: str = "voice.ogg") -> str:
         return ""
 
 
-def text_to_voice(text: str) -> bytes:
-    """Converte testo in audio OGG Opus via Edge TTS + ffmpeg.
-    Restituisce bytes OGG pronti per Telegram sendVoice, bytes vuoti su errore."""
-    if not text or not text.strip():
+# ─── TTS: Edge TTS → ffmpeg via pipe, cache content-addressed in RAM ─────────
+# L'MP3 di Edge TTS entra nello stdin di ffmpeg man mano che arriva e l'OGG Opus
+# si legge dallo stdout: nessun file temporaneo sulla SD. Le frasi ripetute
+# (saluti, conferme, briefing) escono dalla cache senza rete né ffmpeg.
+TTS_CACHE_MAX_BYTES = 8 * 1024 * 1024
+_FFMPEG_OPUS = ["ffmpeg", "-hide_banner", "-loglevel", "error", "-f", "mp3", "-i", "pipe:0",
+                "-c:a", "libopus", "-b:a", "48k", "-application", "voip", "-f", "ogg", "pipe:1"]
+_tts_cache: OrderedDict = OrderedDict()  # sha256(voce + testo) → bytes OGG
+_tts_cache_lock = threading.Lock()
+_tts_cache_size = 0
+TTS_STATS = {"hits": 0, "misses": 0, "errors": 0}
+
+def _tts_key(text: str) -> str:
+    return hashlib.sha256(f"{TTS_VOICE}\0{text}".encode("utf-8")).hexdigest()
+
+def _tts_cache_get(key: str) -> bytes | None:
+    with _tts_cache_lock:
+        ogg = _tts_cache.get(key)
+        if ogg is not None:
+            _tts_cache.move_to_end(key)
+        return ogg
+
+def _tts_cache_put(key: str, ogg: bytes):
+    global _tts_cache_size
+    if len(ogg) > TTS_CACHE_MAX_BYTES // 4:
+        return  # vocali lunghi: raramente ripetuti, non vale la pena
+    with _tts_cache_lock:
+        if key in _tts_cache:
+            return
+        _tts_cache[key] = ogg
+        _tts_cache_size += len(ogg)
+        while _tts_cache_size > TTS_CACHE_MAX_BYTES:
+            _, old = _tts_cache.popitem(last=False)
+            _tts_cache_size -= len(old)
+
+async def _edge_mp3_stream(text: str):
+    """Chunk MP3 di Edge TTS man mano che arrivano."""
+    import edge_tts
+    async for chunk in edge_tts.Communicate(text, TTS_VOICE).stream():
+        if chunk["type"] == "audio":
+            yield chunk["data"]
+
+async def _edge_mp3(text: str) -> bytes:
+    return b"".join([c async for c in _edge_mp3_stream(text)])
+
+async def _ffmpeg_opus(source) -> bytes:
+    """MP3 (iteratore asincrono di chunk) → ffmpeg stdin; OGG Opus letto da stdout.
+    Più segmenti MP3 in sequenza diventano un unico OGG. bytes vuoti su errore."""
+    try:
+        proc = await asyncio.create_subprocess_exec(
+            *_FFMPEG_OPUS, stdin=subprocess.PIPE, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+    except Exception as e:
+        print(f"[TTS] Error: {e}")
         return b""
-    # Tronca testo troppo lungo
-    if len(text) > TTS_MAX_CHARS:
-        text = text[:TTS_MAX_CHARS]
+    # stdout/stderr letti in parallelo alla scrittura: nessun deadlock sui buffer delle pipe
+    out = asyncio.create_task(proc.stdout.read())
+    err = asyncio.create_task(proc.stderr.read())
     try:
-        import edge_tts
-        import tempfile
-        # Edge TTS genera MP3 — scriviamo su temp file
-        with tempfile.NamedTemporaryFile(suffix=".mp3", delete=False) as mp3_f:
-            mp3_path = mp3_f.name
-        ogg_path = mp3_path.replace(".mp3", ".ogg")
-        # Esegui edge-tts in modo sincrono (asyncio.run in thread separato)
-        async def _generate():
-            comm = edge_tts.Communicate(text, TTS_VOICE)
-            await comm.save(mp3_path)
-        # Usa un nuovo event loop (siamo in un thread executor)
-        import asyncio
-        try:
-            loop = asyncio.get_running_loop()
-        except RuntimeError:
-            loop = None
-        if loop and loop.is_running():
-            # Siamo già in un event loop — usa asyncio.run_coroutine_threadsafe
-            # Non dovrebbe succedere, ma gestiamo il caso
-            new_loop = asyncio.new_event_loop()
-            new_loop.run_until_complete(_generate())
-            new_loop.close()
-        else:
-            asyncio.run(_generate())
-        # Converti MP3 → OGG Opus via ffmpeg
-        result = subprocess.run(
-            ["ffmpeg", "-y", "-i", mp3_path, "-c:a", "libopus", "-b:a", "48k",
-             "-application", "voip", ogg_path],
-            capture_output=True, timeout=30
-        )
-        if result.returncode != 0:
-            print(f"[TTS] ffmpeg error: {result.stderr.decode()[:200]}")
-            return b""
-        with open(ogg_path, "rb") as f:
-            ogg_bytes = f.read()
-        try:
-            os.unlink(mp3_path)
-        except Exception:
-            pass
-        try:
-            os.unlink(ogg_path)
-        except Exception:
-            pass
-        if ogg_bytes:
-            print(f"[TTS] Generato vocale: {len(ogg_bytes)} bytes, {len(text)} chars")
-        return ogg_bytes
+        async for chunk in source:
+            proc.stdin.write(chunk)
+            await proc.stdin.drain()
+        proc.stdin.close()
+        ogg = await asyncio.wait_for(out, 30)
+        await asyncio.wait_for(proc.wait(), 5)
+    except BaseException as e:
+        if proc.returncode is None:
+            proc.kill()
+        out.cancel()
+        err.cancel()
+        if not isinstance(e, Exception):
+            raise
+        print(f"[TTS] Error: {e}")
+        return b""
+    stderr = await err
+    if proc.returncode != 0 or not ogg:
+        print(f"[TTS] ffmpeg error: {stderr.decode(errors='replace')[:200]}")
+        return b""
+    return ogg
+
+async def tts_ogg(text: str) -> bytes:
+    """Testo → OGG Opus pronto per sendVoice, tutto in memoria. bytes vuoti su errore.
+    Asincrona: si può attendere direttamente dall'event loop (solo I/O)."""
+    text = (text or "").strip()[:TTS_MAX_CHARS]
+    if not text:
+        return b""
+    key = _tts_key(text)
+    ogg = _tts_cache_get(key)
+    if ogg is not None:
+        TTS_STATS["hits"] += 1
+        return ogg
+    TTS_STATS["misses"] += 1
+    ogg = await _ffmpeg_opus(_edge_mp3_stream(text))
+    if not ogg:
+        TTS_STATS["errors"] += 1
+        return b""
+    _tts_cache_put(key, ogg)
+    print(f"[TTS] Generato vocale: {len(ogg)} bytes, {len(text)} chars")
+    return ogg
+
+
+def text_to_voice(text: str) -> bytes:
+    """Versione sincrona di tts_ogg() per codice nei thread dell'executor."""
+    try:
+        return asyncio.run(tts_ogg(text))
     except Exception as e:
         print(f"[TTS] Error: {e}")
         return b""
 
 
+# ─── Vocale a frasi (pipeline durante la generazione) ────────────────────────
+_SENTENCE_END = re.compile(r"[.!?…]+[\"')\]»]*\s+|\n+")
+TTS_MIN_SEGMENT = 60  # frasi più corte si accorpano alla successiva
+_tts_slots = asyncio.Semaphore(TTS_WORKERS)
+
+class VoicePipeline:
+    """Sintesi vocale a frasi mentre la risposta è ancora in generazione.
+    on_chunk() riceve lo stream del modello; ogni frase completa (accorpata fino a
+    TTS_MIN_SEGMENT caratteri) parte subito nel pool di TTS_WORKERS sintesi.
+    - "segments": ogni segmento è inviato appena pronto, nell'ordine del testo
+    - "single": gli MP3 delle frasi confluiscono in un unico ffmpeg → un solo OGG
+    finish() chiude l'ultima frase e attende gli invii."""
+
+    def __init__(self, mode: str = "", chat_id: str = ""):
+        self.mode = mode or TTS_PIPELINE
+        self.chat_id = chat_id or TELEGRAM_CHAT_ID
+        self._buf = ""
+        self._chars = 0
+        self._jobs: list[asyncio.Task] = []
+        self._ready: asyncio.Queue = asyncio.Queue()
+        self._sender: asyncio.Task | None = None
+        self._t0 = time.monotonic()
+        self.first_audio_ms = None
+        self.sent = 0
+
+    async def on_chunk(self, chunk: str):
+        self._buf += chunk
+        for sentence in self._take_sentences():
+            self._schedule(sentence)
+
+    def _take_sentences(self, final: bool = False) -> list[str]:
+        out = []
+        while True:
+            m = _SENTENCE_END.search(self._buf, TTS_MIN_SEGMENT)
+            if not m:
+                break
+            out.append(self._buf[:m.end()].strip())
+            self._buf = self._buf[m.end():]
+        if final:
+            out.append(self._buf.strip())
+            self._buf = ""
+        return [s for s in out if s]
+
+    def _schedule(self, sentence: str):
+        if self._chars >= TTS_MAX_CHARS:
+            return
+        sentence = sentence[:TTS_MAX_CHARS - self._chars]
+        self._chars += len(sentence)
+        job = asyncio.create_task(self._synth(sentence))
+        self._jobs.append(job)
+        self._ready.put_nowait(job)
+        if self.mode == "segments" and self._sender is None:
+            self._sender = asyncio.create_task(self._send_in_order())
+
+    async def _synth(self, sentence: str) -> bytes:
+        async with _tts_slots:
+            if self.mode == "single":
+                return await _edge_mp3(sentence)
+            return await tts_ogg(sentence)
+
+    async def _send(self, ogg: bytes):
+        if not ogg:
+            return
+        if self.first_audio_ms is None:
+            self.first_audio_ms = int((time.monotonic() - self._t0) * 1000)
+        if await tg_client.send_voice(ogg, chat_id=self.chat_id) is not None:
+            self.sent += 1
+
+    async def _send_in_order(self):
+        while True:
+            job = await self._ready.get()
+            if job is None:
+                return
+            try:
+                await self._send(await job)
+            except Exception as e:
+                print(f"[TTS] Segmento fallito: {e}")
+
+    async def _mp3_in_order(self):
+        for job in self._jobs:
+            try:
+                yield await job
+            except Exception as e:
+                print(f"[TTS] Segmento fallito: {e}")
+
+    async def finish(self, final: str = ""):
+        """Ultima frase + attesa invii. Se non è arrivato alcun chunk usa `final`."""
+        if not self._jobs and not self._buf.strip():
+            self._buf = final or ""
+        for sentence in self._take_sentences(final=True):
+            self._schedule(sentence)
+        if self.mode == "single":
+            if self._jobs:
+                await self._send(await _ffmpeg_opus(self._mp3_in_order()))
+        elif self._sender is not None:
+            self._ready.put_nowait(None)
+            await self._sender
+        if not self.sent:
+            print("[TTS] Generazione vocale fallita, risposta solo testo")
+        db_log_event("telegram", "voice_pipeline", status="ok" if self.sent else "error",
+                     latency_ms=self.first_audio_ms or 0,
+                     payload={"mode": self.mode, "segments": len(self._jobs), "sent": self.sent})
+
+
 def telegram_send_voice(ogg_bytes: bytes, caption: str = "") -> bool:
-    """Invia un messaggio vocale OGG Opus a Telegram via sendVoice API (multipart).
-    Restituisce True se successo."""
-    if not TELEGRAM_TOKEN or not TELEGRAM_CHAT_ID:
-        return False
-    if not ogg_bytes:
+    """Versione sincrona (thread executor) di tg_send_voice."""
+    loop = tg_client.loop
+    if not ogg_bytes or loop is None or not loop.is_running():
         return False
+    fut = asyncio.run_coroutine_threadsafe(tg_send_voice(ogg_bytes, caption), loop)
     try:
-        boundary = "----VesselTTSBoundary"
-        body = b""
-        # Campo: chat_id
-        body += f"--{boundary}\r\n".encode()
-        body += b'Content-Disposition: form-data; name="chat_id"\r\n\r\n'
-        body += f"{TELEGRAM_CHAT_ID}\r\n".encode()
-        # Campo: voice (file OGG)
-        body += f"--{boundary}\r\n".encode()
-        body += b'Content-Disposition: form-data; name="voice"; filename="voice.ogg"\r\n'
-        body += b"Content-Type: audio/ogg\r\n\r\n"
-        body += ogg_bytes
-        body += b"\r\n"
-        # Campo: caption (opzionale)
-        if caption:
-            body += f"--{boundary}\r\n".encode()
-            body += b'Content-Disposition: form-data; name="caption"\r\n\r\n'
-            body += f"{caption[:1024]}\r\n".encode()
-        # Chiudi boundary
-        body += f"--{boundary}--\r\n".encode()
-
-        url = f"https://api.telegram.org/bot{TELEGRAM_TOKEN}/sendVoice"
-        req = urllib.request.Request(url, data=body, method="POST")
-        req.add_header("Content-Type", f"multipart/form-data; boundary={boundary}")
-        req.add_header("User-Agent", "Vessel-Dashboard/1.0")
-        with urllib.request.urlopen(req, timeout=30) as resp:
-            result = json.loads(resp.read().decode())
-        if result.get("ok"):
-            print("[TTS] Vocale inviato su Telegram")
-            return True
-        print(f"[TTS] sendVoice failed: {result}")
-        return False
+        return fut.result(timeout=120)
     except Exception as e:
         print(f"[TTS] sendVoice error: {e}")
         return False
@@ -76,21 +76,3 @@ def _provider_defaults(provider_id: str) -> tuple:
     if provider_id == "brain":
         return BRAIN_MODEL, BRAIN_SYSTEM
     return OLLAMA_MODEL, OLLAMA_SYSTEM
-
-# ─── Tamagotchi helper (REST locale, evita import circolari) ──────────────────
-def _set_tamagotchi_local(state: str, detail: str = "", text: str = ""):
-    """Imposta stato tamagotchi via REST locale (non importa routes)."""
-    try:
-        payload: dict = {"state": state}
-        if detail:
-            payload["detail"] = detail
-        if text:
-            payload["text"] = text
-        data = json.dumps(payload).encode("utf-8")
-        req = urllib.request.Request(
-            "http://127.0.0.1:8090/api/tamagotchi/state",
-            data=data, headers={"Content-Type": "application/json"}, method="POST"
-        )
-        urllib.request.urlopen(req, timeout=3)
-    except Exception:
-        pass
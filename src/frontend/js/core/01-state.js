@@ -7,7 +7,6 @@
   let memoryEnabled = false;
   let currentTab = 'dashboard';
   let chatProvider = 'cloud';
-  let streamDiv = null;
   let activeDrawer = null;
 
   function esc(s) {
@@ -9,23 +9,14 @@
         hhd.className = 'health-dot';
       }
       if (reconnectTimer) { clearTimeout(reconnectTimer); reconnectTimer = null; }
-      setTimeout(() => {
-        send({ action: 'plugin_weather' });
-        send({ action: 'get_tokens' });
-        send({ action: 'get_briefing' });
-        send({ action: 'get_cron' });
-        send({ action: 'get_logs' });
-        send({ action: 'get_entities' });
-        send({ action: 'get_usage_report', period: 'day' });
-        send({ action: 'get_saved_prompts' });
-        send({ action: 'get_sigil_state' });
-        // Restore memory toggle from localStorage
-        try {
-          if (localStorage.getItem('vessel_memory_enabled') === '1') {
-            send({ action: 'toggle_memory' });
-          }
-        } catch(e) {}
-      }, 500);
+      // Snapshot iniziale in un solo round trip (critical subito, resto in streaming)
+      send({ action: 'bootstrap' });
+      // Restore memory toggle from localStorage
+      try {
+        if (localStorage.getItem('vessel_memory_enabled') === '1') {
+          send({ action: 'toggle_memory' });
+        }
+      } catch(e) {}
     };
     ws.onclose = (e) => {
       const hhd = document.getElementById('home-health-dot');
@@ -51,6 +42,12 @@
       const mc = document.getElementById('memory-content');
       if (mc) mc.textContent = msg.data.memory;
     }
+    else if (msg.type === 'bootstrap') {
+      (msg.messages || []).forEach(m => {
+        try { handleMessage(m); } catch(e) { console.error('[Bootstrap]', m.type, e); }
+      });
+    }
+    else if (msg.type === 'bootstrap_done') { console.debug('[Bootstrap] ' + msg.ms + 'ms'); }
     else if (msg.type === 'stats') {
       updateStats(msg.data.pi);
       updateSessions(msg.data.tmux);
@@ -72,6 +69,7 @@
       document.getElementById('chat-send').disabled = false;
       if (msg.agent) showAgentBadge(msg.agent);
     }
+    else if (msg.type === 'chat_page') { renderChatPage(msg); }
     else if (msg.type === 'chat_reply') { removeThinking(); appendMessage(msg.text, 'bot'); document.getElementById('chat-send').disabled = false; }
     else if (msg.type === 'memory')   { const el = document.getElementById('memory-content'); if (el) el.textContent = msg.text; }
     else if (msg.type === 'history')  { const el = document.getElementById('history-content'); if (el) el.textContent = msg.text; }
@@ -89,6 +87,9 @@
     }
     else if (msg.type === 'logs')    { renderLogs(msg.data); }
     else if (msg.type === 'cron')    { renderCron(msg.jobs); }
+    else if (msg.type === 'jobs')    { renderJobs(msg.jobs); }
+    else if (msg.type === 'job_progress') { renderJobProgress(msg); }
+    else if (msg.type === 'job_runs') { renderJobRuns(msg); }
     else if (msg.type === 'tokens')  { renderTokens(msg.data); }
     else if (msg.type === 'usage_report') { renderUsageReport(msg.data); }
     else if (msg.type === 'briefing') { renderBriefing(msg.data); }
@@ -98,6 +99,7 @@
     else if (msg.type === 'shutdown_ack') { document.getElementById('reboot-overlay').classList.add('show'); document.getElementById('reboot-status').textContent = 'Il Pi si sta spegnendo…'; document.querySelector('.reboot-text').textContent = 'Spegnimento in corso…'; }
     else if (msg.type === 'saved_prompts') { renderSavedPrompts(msg.prompts); }
     else if (msg.type === 'sigil_state') { updateSigilIndicator(msg.state); }
+    else if (msg.type === 'ota_progress') { if (typeof renderOtaProgress === 'function') renderOtaProgress(msg.data); }
     else if (msg.type === 'tracker')   { renderTracker(msg.items); }
     else if (msg.type === 'analytics') { renderAnalytics(msg.data); }
     else if (msg.type === 'heatmap')   { renderHeatmap(msg.data); }
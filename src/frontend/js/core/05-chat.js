@@ -17,72 +17,287 @@
     el.style.height = Math.min(el.scrollHeight, 120) + 'px';
   }
 
-  function appendMessage(text, role) {
+  // ── Lista chat: modello + finestra virtuale ──
+  // I messaggi vivono in _chat.msgs; nel DOM c'è solo la finestra visibile (più
+  // CHAT_OVERSCAN sopra e sotto), il resto sono due spacer alti quanto i messaggi
+  // che sostituiscono (altezze misurate, o stimate se mai renderizzati). Salendo
+  // oltre il primo messaggio si chiede la pagina precedente al server (chat_page).
+  // I chunk in streaming si accumulano e si applicano una volta per animation
+  // frame; il markdown si ricalcola solo per l'ultimo blocco ancora aperto.
+  const CHAT_OVERSCAN = 600;     // px
+  const CHAT_EST_HEIGHT = 64;    // px, messaggi mai misurati
+  const CHAT_GAP = 8;            // = gap di #chat-messages
+  const CHAT_STICK_PX = 40;      // entro questa distanza dal fondo si segue lo stream
+  const _chat = {
+    msgs: [],                    // {id, role, text, agent, h, el, body, mdPos, mdTail}
+    start: 0, end: 0,            // finestra renderizzata [start, end)
+    top: null, bottom: null,     // spacer
+    stream: null, pending: '',
+    stick: true, hasMore: false, loadingPage: false, pageBefore: null, loaded: false, raf: 0,
+    hidden: false,               // tab Code nascosta: niente misure (tutto a 0)
+  };
+
+  function _chatBox() {
     const box = document.getElementById('chat-messages');
-    if (role === 'bot') {
-      const wrap = document.createElement('div');
-      wrap.className = 'copy-wrap';
-      wrap.style.cssText = 'align-self:flex-start;max-width:85%;';
-      const div = document.createElement('div');
-      div.className = 'msg msg-bot';
-      div.style.maxWidth = '100%';
-      div.textContent = text;
-      const btn = document.createElement('button');
-      btn.className = 'copy-btn'; btn.textContent = '[cp]'; btn.title = 'Copia';
-      btn.onclick = () => copyToClipboard(div.textContent);
-      wrap.appendChild(div); wrap.appendChild(btn);
-      box.appendChild(wrap);
-    } else {
-      const div = document.createElement('div');
-      div.className = `msg msg-${role}`;
-      div.textContent = text;
-      box.appendChild(div);
+    if (box && !_chat.top) {
+      _chat.top = document.createElement('div');
+      _chat.bottom = document.createElement('div');
+      _chat.top.className = _chat.bottom.className = 'chat-spacer';
+      _chat.top.style.display = _chat.bottom.style.display = 'none';
+      box.appendChild(_chat.top);
+      box.appendChild(_chat.bottom);
+      box.addEventListener('scroll', _chatOnScroll, { passive: true });
+      // Il bootstrap arriva di solito con #tab-code in display:none: quando il box
+      // prende le sue dimensioni (tab aperta, rotazione, tastiera) si rifà il layout
+      if (window.ResizeObserver) new ResizeObserver(_chatSchedule).observe(box);
     }
-    box.scrollTop = box.scrollHeight;
+    return box;
   }
 
-  function appendChunk(text) {
+  function _chatSchedule() {
+    if (!_chat.raf) _chat.raf = requestAnimationFrame(_chatFrame);
+  }
+
+  function _chatFrame() {
+    _chat.raf = 0;
+    _chatFlushStream();
+    _chatUpdate();
+  }
+
+  function _chatPush(m) {
+    const box = _chatBox();
+    const welcome = box && box.querySelector('.chat-welcome');
+    if (welcome) welcome.remove();
+    _chat.msgs.push(m);
+    _chatSchedule();
+    return m;
+  }
+
+  function _chatOnScroll() {
     const box = document.getElementById('chat-messages');
-    if (!streamDiv) {
-      streamDiv = document.createElement('div');
-      streamDiv.className = 'msg msg-bot';
-      streamDiv.textContent = '';
-      box.appendChild(streamDiv);
+    _chat.stick = box.scrollTop + box.clientHeight >= box.scrollHeight - CHAT_STICK_PX;
+    _chatSchedule();
+  }
+
+  function _chatMaybePage(box) {
+    if (_chat.start > 0 || !_chat.hasMore || _chat.loadingPage || box.scrollTop > CHAT_OVERSCAN) return;
+    const oldest = _chat.msgs.find(m => m.id);
+    if (oldest) {
+      _chat.loadingPage = true; _chat.pageBefore = oldest.id;
+      send({ action: 'chat_page', before: oldest.id });
     }
-    streamDiv.textContent += text;
-    box.scrollTop = box.scrollHeight;
   }
 
-  function showAgentBadge(agentId) {
-    const box = document.getElementById('chat-messages');
-    const wraps = box.querySelectorAll('.copy-wrap');
-    const last = wraps[wraps.length - 1];
-    if (!last) return;
-    const existing = last.querySelector('.agent-badge');
-    if (existing) return;
+  function _chatHeight(i) { return (_chat.msgs[i].h || CHAT_EST_HEIGHT) + CHAT_GAP; }
+
+  function _chatUpdate() {
+    const box = _chatBox();
+    if (!box) return;
+    if (!box.clientHeight) { _chat.hidden = true; return; }
+    // Riapertura della tab: lo scroll di un box nascosto non è affidabile, si riparte dal fondo
+    if (_chat.hidden) { _chat.hidden = false; _chat.stick = true; }
+    const msgs = _chat.msgs, n = msgs.length;
+    const pad = parseFloat(getComputedStyle(box).paddingTop) || 0;
+    // Ancora: il primo messaggio visibile resta dov'è anche se cambiano le altezze
+    // sopra (misure nuove, pagina più vecchia aggiunta in testa)
+    let anchor = -1, anchorOff = 0;
+    if (!_chat.stick) {
+      for (let i = _chat.start; i < Math.min(_chat.end, n); i++) {
+        const el = msgs[i].el;
+        if (el && el.offsetTop + el.offsetHeight > box.scrollTop) { anchor = i; anchorOff = el.offsetTop - box.scrollTop; break; }
+      }
+    }
+    let start, end;
+    if (_chat.stick) {
+      end = start = n;
+      for (let acc = 0; start > 0 && acc < box.clientHeight + CHAT_OVERSCAN;) acc += _chatHeight(--start);
+    } else {
+      let view = box.scrollTop - pad;
+      if (anchor >= 0) {
+        view = -anchorOff;
+        for (let i = 0; i < anchor; i++) view += _chatHeight(i);
+      }
+      const lo = view - CHAT_OVERSCAN, hi = view + box.clientHeight + CHAT_OVERSCAN;
+      let y = 0;
+      start = 0;
+      while (start < n - 1 && y + _chatHeight(start) < lo) y += _chatHeight(start++);
+      end = start;
+      while (end < n && y < hi) y += _chatHeight(end++);
+    }
+    // Fuori dalla finestra: via dal DOM (l'altezza misurata resta nel modello)
+    for (let i = _chat.start; i < Math.min(_chat.end, n); i++) {
+      const m = msgs[i];
+      if ((i < start || i >= end) && m.el) { m.el.remove(); m.el = m.body = m.mdTail = null; }
+    }
+    let ref = _chat.bottom;
+    for (let i = end - 1; i >= start; i--) {
+      const m = msgs[i];
+      if (!m.el) box.insertBefore(_chatBuild(m), ref);
+      ref = m.el;
+    }
+    _chat.start = start; _chat.end = end;
+    for (let i = start; i < end; i++) msgs[i].h = msgs[i].el.offsetHeight;
+    let above = 0, below = 0;
+    for (let i = 0; i < start; i++) above += _chatHeight(i);
+    for (let i = end; i < n; i++) below += _chatHeight(i);
+    _chat.top.style.display = start ? '' : 'none';
+    _chat.top.style.height = Math.max(0, above - CHAT_GAP) + 'px';
+    _chat.bottom.style.display = end < n ? '' : 'none';
+    _chat.bottom.style.height = Math.max(0, below - CHAT_GAP) + 'px';
+    const a = anchor >= 0 ? msgs[anchor].el : null;
+    const want = _chat.stick ? box.scrollHeight - box.clientHeight : a ? a.offsetTop - anchorOff : null;
+    if (want !== null && Math.abs(box.scrollTop - want) > 1) box.scrollTop = want;
+    _chatMaybePage(box);
+  }
+
+  function _chatBuild(m) {
+    if (m.role === 'user') {
+      m.el = document.createElement('div');
+      m.el.className = 'msg msg-user';
+      m.el.textContent = m.text;
+      return m.el;
+    }
+    const wrap = document.createElement('div');
+    wrap.className = 'copy-wrap';
+    wrap.style.cssText = 'align-self:flex-start;max-width:85%;';
+    const div = document.createElement('div');
+    div.className = 'msg msg-bot';
+    div.style.maxWidth = '100%';
+    m.body = document.createElement('div');
+    m.body.className = 'md-body';
+    div.appendChild(m.body);
+    if (m.agent) div.appendChild(_chatBadge(m.agent));
+    const btn = document.createElement('button');
+    btn.className = 'copy-btn'; btn.textContent = '[cp]'; btn.title = 'Copia';
+    btn.onclick = () => copyToClipboard(m.text);
+    wrap.appendChild(div); wrap.appendChild(btn);
+    m.el = wrap;
+    m.mdPos = 0; m.mdTail = null;
+    _mdUpdate(m);
+    return wrap;
+  }
+
+  function _chatBadge(agentId) {
     const badge = document.createElement('span');
     badge.className = 'agent-badge';
     badge.dataset.agent = agentId;
     badge.textContent = agentId;
-    const msgDiv = last.querySelector('.msg-bot');
-    if (msgDiv) msgDiv.appendChild(badge);
+    return badge;
+  }
+
+  // ── Markdown incrementale ──
+  // Blocchi: codice tra fence (MD_FENCE) oppure paragrafi separati da riga vuota. I blocchi
+  // chiusi si renderizzano una volta sola (m.mdPos = dove finiscono); l'ultimo,
+  // ancora aperto, si rifà a ogni frame. Niente HTML dal modello: esc() prima.
+  // Backtick scritti come \x60: il minificatore di build.py li conta per i template literal.
+  const MD_FENCE = '\x60\x60\x60';
+  function _mdNextBlock(text, pos) {
+    if (text.startsWith(MD_FENCE, pos)) {
+      const close = text.indexOf('\n' + MD_FENCE, pos + 3);
+      if (close < 0) return -1;
+      const eol = text.indexOf('\n', close + 4);
+      return eol < 0 ? -1 : eol + 1;
+    }
+    const para = text.indexOf('\n\n', pos);
+    const fence = text.indexOf('\n' + MD_FENCE, pos);
+    if (fence >= 0 && (para < 0 || fence < para)) return fence + 1;
+    return para < 0 ? -1 : para + 2;
+  }
+
+  function _mdInline(src) {
+    return esc(src).split(/(\x60[^\x60\n]+\x60)/).map((part, i) => i % 2
+      ? '<code class="md-ic">' + part.slice(1, -1) + '</code>'
+      : part.replace(/\*\*([^*\n]+)\*\*/g, '<strong>$1</strong>')
+            .replace(/^#{1,4} (.+)$/gm, '<strong class="md-h">$1</strong>')
+    ).join('');
+  }
+
+  function _mdBlock(src) {
+    if (src.startsWith(MD_FENCE)) {
+      const nl = src.indexOf('\n');
+      const pre = document.createElement('pre');
+      pre.className = 'md-code';
+      const lang = (nl < 0 ? src.slice(3) : src.slice(3, nl)).trim();
+      if (lang) pre.dataset.lang = lang;
+      pre.textContent = nl < 0 ? '' : src.slice(nl + 1).replace(/\n?\x60\x60\x60\s*$/, '');
+      return pre;
+    }
+    const t = src.replace(/^\n+|\n+$/g, '');
+    if (!t) return null;
+    const div = document.createElement('div');
+    div.className = 'md-p';
+    div.innerHTML = _mdInline(t);
+    return div;
+  }
+
+  function _mdUpdate(m) {
+    const text = m.text;
+    for (let cut; (cut = _mdNextBlock(text, m.mdPos)) >= 0; m.mdPos = cut) {
+      const el = _mdBlock(text.slice(m.mdPos, cut));
+      if (el) m.body.insertBefore(el, m.mdTail);
+    }
+    const tail = _mdBlock(text.slice(m.mdPos));
+    if (m.mdTail) m.mdTail.remove();
+    m.mdTail = tail;
+    if (tail) m.body.appendChild(tail);
+  }
+
+  // ── API usata da 02-websocket.js ──
+  function appendMessage(text, role) {
+    if (role === 'user') _chat.stick = true;
+    _chatPush({ role: role === 'user' ? 'user' : 'bot', text, agent: '' });
+  }
+
+  function appendChunk(text) {
+    if (!_chat.stream) _chat.stream = _chatPush({ role: 'bot', text: '', agent: '' });
+    _chat.pending += text;
+    _chatSchedule();
+  }
+
+  function _chatFlushStream() {
+    const m = _chat.stream;
+    if (!m || !_chat.pending) return;
+    m.text += _chat.pending;
+    _chat.pending = '';
+    if (m.body) _mdUpdate(m);
+  }
+
+  function showAgentBadge(agentId) {
+    const m = [..._chat.msgs].reverse().find(x => x.role === 'bot');
+    if (!m || m.agent) return;
+    m.agent = agentId;
+    const div = m.el && m.el.querySelector('.msg-bot');
+    if (div) div.appendChild(_chatBadge(agentId));
   }
 
   function finalizeStream() {
-    if (streamDiv) {
-      const box = streamDiv.parentNode;
-      const wrap = document.createElement('div');
-      wrap.className = 'copy-wrap';
-      wrap.style.cssText = 'align-self:flex-start;max-width:85%;';
-      streamDiv.style.maxWidth = '100%';
-      box.insertBefore(wrap, streamDiv);
-      wrap.appendChild(streamDiv);
-      const btn = document.createElement('button');
-      btn.className = 'copy-btn'; btn.textContent = '[cp]'; btn.title = 'Copia';
-      btn.onclick = () => copyToClipboard(streamDiv.textContent);
-      wrap.appendChild(btn);
+    _chatFlushStream();      // anche a tab in background (rAF fermo)
+    _chat.stream = null;
+    _chatSchedule();
+  }
+
+  function renderChatPage(msg) {
+    const page = (msg.messages || []).map(r => ({
+      id: r.id, role: r.role === 'user' ? 'user' : 'bot', text: r.content || '', agent: r.agent || ''
+    }));
+    if (!msg.before) {
+      // Prima pagina (bootstrap): solo se la chat è ancora vuota, non ai reconnect
+      if (_chat.loaded || _chat.msgs.length) return;
+      _chat.loaded = true;
+      _chat.hasMore = !!msg.has_more;
+      _chat.stick = true;
+      page.forEach(_chatPush);
+      return;
     }
-    streamDiv = null;
+    // Risposta tardiva (chat pulita nel frattempo) o non richiesta: si scarta
+    if (!_chat.loadingPage || msg.before !== _chat.pageBefore) return;
+    _chat.loadingPage = false;
+    _chat.hasMore = !!msg.has_more;
+    if (!page.length) return;
+    _chat.msgs.unshift(...page);
+    _chat.start += page.length;
+    _chat.end += page.length;
+    _chatSchedule();
   }
 
   function appendThinking() {
@@ -95,8 +310,11 @@
   function removeThinking() { const el = document.getElementById('thinking'); if (el) el.remove(); }
 
   function clearChat() {
-    document.getElementById('chat-messages').innerHTML =
-      '<div class="msg msg-bot">Chat pulita</div>';
+    _chat.msgs.forEach(m => { if (m.el) m.el.remove(); });
+    _chat.msgs = []; _chat.start = _chat.end = 0;
+    _chat.stream = null; _chat.pending = ''; _chat.hasMore = false; _chat.stick = true;
+    _chat.loadingPage = false; _chat.pageBefore = null;
+    appendMessage('Chat pulita', 'bot');
     send({ action: 'clear_chat' });
   }
 
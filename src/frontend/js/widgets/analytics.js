@@ -9,6 +9,7 @@
   };
 
   let _anlPeriod = 'day';
+  let _anlDebugHtml = '';   // ultimo risultato profilo/memoria, sopravvive al refresh
 
   function loadAnalytics(period) {
     if (period) _anlPeriod = period;
@@ -113,6 +114,40 @@
       html += '</div>';
     }
 
+    // ── Event loop (services/debug.py) ──
+    const loop = data.loop;
+    if (loop) {
+      const lag = loop.lag || {};
+      html += '<div class="anl-section-label" style="margin-top:14px;">EVENT LOOP</div>';
+      html += `<div class="anl-total" style="text-align:left;">Lag 1 min: <span>p50 ${lag.p50}ms \u00b7 p99 ${lag.p99}ms \u00b7 max ${lag.max_1m}ms</span>
+        \u00b7 stalli &gt;${loop.threshold_ms}ms dall'avvio: <span>${loop.stalls}</span>${loop.debug ? ' \u00b7 <span>debug asyncio</span>' : ''}</div>`;
+      const worst = loop.offenders || [];
+      if (!worst.length) {
+        html += '<div class="no-items">// nessuna chiamata bloccante registrata</div>';
+      } else {
+        html += '<div class="anl-failover-list">';
+        worst.forEach(o => {
+          html += `<div class="anl-failover-item" title="${esc((o.stack || []).join('\n'))}">
+            <span class="anl-fail-ts">${o.count}\u00d7 \u00b7 max ${o.max_ms}ms</span>
+            <span class="anl-fail-route">${esc(o.where)}</span>
+            <span class="anl-fail-reason">totale ${o.total_ms}ms \u00b7 ultimo ${esc((o.last || '').slice(11, 19))}</span>
+          </div>`;
+        });
+        html += '</div>';
+      }
+    }
+
+    // ── Profilo CPU / memoria on-demand (services/debug.py) ──
+    html += '<div class="anl-section-label" style="margin-top:14px;">PROFILO</div>';
+    html += `<div class="anl-debug-actions">
+      <button class="btn-ghost btn-sm" onclick="anlCpuProfile(this, 10)">CPU 10s</button>
+      <a class="btn-ghost btn-sm" href="/api/debug/profile?format=collapsed" title="stack collapsed per flamegraph.pl / speedscope">↓ flamegraph</a>
+      <button class="btn-ghost btn-sm" onclick="anlMemory(this, 'start')">Mem baseline</button>
+      <button class="btn-ghost btn-sm" onclick="anlMemory(this, 'diff')">Mem diff</button>
+      <button class="btn-ghost btn-sm" onclick="anlMemory(this, 'stop')">Mem stop</button>
+    </div>`;
+    html += `<div id="anl-debug-out">${_anlDebugHtml || '<div class="no-items">// nessuna cattura</div>'}</div>`;
+
     // ── Heatmap placeholder (riempito da renderHeatmap) ──
     html += '<div class="anl-section-label" style="margin-top:14px;">ATTIVITA\' ULTIMI 7 GIORNI</div>';
     html += '<div id="anl-heatmap-wrap"><div class="no-items">// caricamento\u2026</div></div>';
@@ -120,6 +155,73 @@
     el.innerHTML = html;
   }
 
+  function _anlDebugShow(html) {
+    _anlDebugHtml = html;
+    const out = document.getElementById('anl-debug-out');
+    if (out) out.innerHTML = html;
+  }
+
+  function _anlDebugList(rows) {
+    if (!rows.length) return '<div class="no-items">// niente da segnalare</div>';
+    return '<div class="anl-failover-list">' + rows.map(([left, mid, right, title]) =>
+      `<div class="anl-failover-item"${title ? ` title="${esc(title)}"` : ''}>
+        <span class="anl-fail-ts">${left}</span>
+        <span class="anl-fail-route">${esc(mid)}</span>
+        <span class="anl-fail-reason">${right}</span>
+      </div>`).join('') + '</div>';
+  }
+
+  async function anlCpuProfile(btn, seconds) {
+    btn.disabled = true;
+    _anlDebugShow(`<div class="no-items">// campionamento ${seconds}s in corso…</div>`);
+    try {
+      const r = await fetch('/api/debug/profile', {
+        method: 'POST', headers: { 'Content-Type': 'application/json' },
+        body: JSON.stringify({ seconds })
+      });
+      const d = await r.json();
+      if (!r.ok) { _anlDebugShow(`<div class="no-items">// ${esc(d.error || 'errore')}</div>`); return; }
+      const threads = (d.threads || []).filter(t => t.cpu_pct > 0).map(t => `${esc(t.thread)} ${t.cpu_pct}%`).join(' · ');
+      _anlDebugShow(`<div class="anl-total" style="text-align:left;">CPU processo: <span>${d.process_cpu_pct}%</span>
+          · ${d.samples} campioni in ${d.seconds}s · overhead ${d.overhead_pct}%</div>`
+        + (threads ? `<div class="anl-total" style="text-align:left;">Thread: <span>${threads}</span></div>` : '')
+        + _anlDebugList((d.top_self || []).map(f => [`${f.pct}%`, f.where, 'self', ''])));
+    } catch (e) {
+      _anlDebugShow(`<div class="no-items">// ${esc(e.message)}</div>`);
+    } finally {
+      btn.disabled = false;
+    }
+  }
+
+  async function anlMemory(btn, action) {
+    btn.disabled = true;
+    try {
+      const r = await fetch('/api/debug/memory', {
+        method: 'POST', headers: { 'Content-Type': 'application/json' },
+        body: JSON.stringify({ action, top: 15, rebase: true })
+      });
+      const d = await r.json();
+      if (!r.ok) { _anlDebugShow(`<div class="no-items">// ${esc(d.error || 'errore')}</div>`); return; }
+      const kb = n => n >= 1024 ? (n / 1024).toFixed(1) + 'MB' : n + 'KB';
+      let html = `<div class="anl-total" style="text-align:left;">RSS: <span>${kb(d.rss_kb)}</span>
+        · tracemalloc: <span>${d.tracing ? `attivo, ${kb(d.traced_kb)} tracciati (+${kb(d.overhead_kb)} overhead)` : 'spento'}</span></div>`;
+      if (action === 'diff') {
+        html += `<div class="anl-total" style="text-align:left;">Cresciuti dall'ultimo diff: <span>${kb(d.grown_kb)}</span></div>`;
+        html += _anlDebugList((d.sites || []).map(s =>
+          [`+${kb(s.size_diff_kb)}`, s.where, `${s.count} blocchi (+${s.count_diff})`, (s.stack || []).join('\n')]));
+      }
+      if (action === 'start') {
+        const m = await (await fetch('/api/debug/memory')).json();
+        html += _anlDebugList((m.structures || []).map(x => [kb(x.kb), x.name, `${x.len} elementi`, '']));
+      }
+      _anlDebugShow(html);
+    } catch (e) {
+      _anlDebugShow(`<div class="no-items">// ${esc(e.message)}</div>`);
+    } finally {
+      btn.disabled = false;
+    }
+  }
+
   function renderHeatmap(data) {
     const wrap = document.getElementById('anl-heatmap-wrap');
     if (!wrap) return;
@@ -1,5 +1,8 @@
   // ── Widget: Cron Jobs ──
-  function loadCron(btn) { if (btn) btn.textContent = '…'; send({ action: 'get_cron' }); }
+  let _jobsData = null;
+  const JOB_ICON = { ok: '✓', error: '✕', timeout: '⏱', running: '…', interrupted: '↯' };
+
+  function loadCron(btn) { if (btn) btn.textContent = '…'; send({ action: 'get_cron' }); send({ action: 'get_jobs' }); }
 
   function renderCron(jobs) {
     const cp = document.getElementById('wt-cron-preview');
@@ -12,7 +15,7 @@
         <button class="btn-red btn-sm" style="padding:3px 8px;" onclick="deleteCron(${i})">✕</button>
       </div>`).join('') + '</div>'
       : '<div class="no-items">// nessun cron job</div>';
-    el.innerHTML = jobList + `
+    el.innerHTML = jobList + '<div id="jobs-body"></div>' + `
       <div style="margin-top:10px;border-top:1px solid var(--border);padding-top:10px;">
         <div style="font-size:10px;color:var(--muted);margin-bottom:6px;">AGGIUNGI</div>
         <div style="display:flex;gap:6px;margin-bottom:6px;">
@@ -24,6 +27,7 @@
           <button class="btn-ghost btn-sm" onclick="loadCron()">↻</button>
         </div>
       </div>`;
+    renderJobs(_jobsData);
   }
   function addCron() {
     const sched = document.getElementById('cron-schedule').value.trim();
@@ -32,3 +36,47 @@
     send({ action: 'add_cron', schedule: sched, command: cmd });
   }
   function deleteCron(index) { send({ action: 'delete_cron', index: index }); }
+
+  // ── Job in-process (scheduler del server) ──
+
+  function renderJobs(jobs) {
+    _jobsData = jobs;
+    const el = document.getElementById('jobs-body');
+    if (!el || !jobs) return;
+    el.innerHTML = '<div style="font-size:10px;color:var(--muted);margin:10px 0 6px;">JOB</div><div class="cron-list">' +
+      jobs.map(j => {
+        const last = j.last ? `${JOB_ICON[j.last.status] || '?'} ${j.last.started_at.slice(5, 16).replace('T', ' ')} · ${Math.round(j.last.duration_ms / 1000)}s` : 'mai eseguito';
+        const when = !j.exists ? 'script assente' : j.external ? 'via crontab' : !j.enabled ? 'disabilitato' : 'prossimo ' + j.next;
+        return `
+      <div class="cron-item" style="align-items:center;">
+        <div class="cron-schedule">${esc(j.cron)}</div>
+        <div style="flex:1;cursor:pointer;" onclick="loadJobRuns('${j.name}')">
+          <div class="cron-cmd">${esc(j.name)}</div>
+          <div class="cron-desc">// ${esc(when)} · ${esc(last)}</div>
+          <div class="job-line" id="job-line-${j.name}">${j.running ? '… in corso' : ''}</div>
+          <div class="job-runs" id="job-runs-${j.name}"></div>
+        </div>
+        <button class="btn-green btn-sm" style="padding:3px 8px;" onclick="runJob('${j.name}', this)" ${j.running || !j.exists ? 'disabled' : ''}>▶</button>
+      </div>`; }).join('') + '</div>';
+  }
+  function runJob(name, btn) { if (btn) btn.disabled = true; send({ action: 'run_job', name: name }); }
+  function loadJobRuns(name) {
+    const el = document.getElementById('job-runs-' + name);
+    if (el && el.innerHTML) { el.innerHTML = ''; return; }
+    send({ action: 'get_job_runs', name: name });
+  }
+  function renderJobProgress(msg) {
+    const el = document.getElementById('job-line-' + msg.job);
+    if (!el) return;
+    if (msg.status === 'running') { if (msg.line) el.textContent = '… ' + msg.line; else el.textContent = '… in corso'; return; }
+    el.textContent = (JOB_ICON[msg.status] || '?') + ' ' + msg.status + (msg.line ? ': ' + msg.line : '') +
+      (msg.duration_ms != null ? ' (' + Math.round(msg.duration_ms / 1000) + 's)' : '');
+  }
+  function renderJobRuns(msg) {
+    const el = document.getElementById('job-runs-' + msg.job);
+    if (!el) return;
+    el.innerHTML = (msg.runs || []).map(r => `
+      <div class="job-run"><span>${JOB_ICON[r.status] || '?'} ${esc(r.started_at.slice(5, 16).replace('T', ' '))}</span>
+        <span>${esc(r.trigger)}</span><span>${Math.round(r.duration_ms / 1000)}s</span>
+        ${r.error ? `<span class="job-run-err">${esc(r.error)}</span>` : ''}</div>`).join('') || '<div class="job-run">// nessuna esecuzione</div>';
+  }
@@ -141,6 +141,34 @@
       fillEllipse(ctx, G.cx, G.cy+10, 34, 42, [1,0,2]);
     }
 
+    // ── Layer statici pre-renderizzati ──
+    // Sfondo + cappuccio (~330 fillRect colonna per colonna) + ombra del volto e le
+    // scanline non cambiano da un frame all'altro: si disegnano una volta in un
+    // canvas 320×170 per colore e poi ogni frame è un solo drawImage.
+    const _layers = new Map();
+    function _layer(key, draw) {
+      let c = _layers.get(key);
+      if (!c) {
+        c = document.createElement('canvas');
+        c.width = 320; c.height = 170;
+        draw(c.getContext('2d'));
+        _layers.set(key, c);
+      }
+      return c;
+    }
+
+    function drawBase(ctx, hoodCol, shadow) {
+      ctx.drawImage(_layer('base:' + hoodCol + (shadow ? ':s' : ''), l => {
+        l.fillStyle = rgb(C.bg); l.fillRect(0, 0, 320, 170);
+        drawHoodFilled(l, hoodCol);
+        if (shadow) drawFaceShadow(l);
+      }), 0, 0);
+    }
+
+    function drawScanlinesCached(ctx) {
+      ctx.drawImage(_layer('scan', drawScanlines), 0, 0);
+    }
+
     // ── Eye glow (2 concentric circles, ESP32 drawEyeGlow) ──
     function drawEyeGlow(ctx, ex, ey, col, intensity) {
       if (intensity < 0.05) return;
@@ -235,8 +263,7 @@
       const {cx,cy,eyeY,sigilY,mouthY,lx,rx,hw,hh} = G;
 
       if (state === 'IDLE') {
-        drawHoodFilled(ctx, C.hood);
-        drawFaceShadow(ctx);
+        drawBase(ctx, C.hood, true);
         const breath = 0.7 + 0.3*Math.sin(now/4000*Math.PI*2);
         const eyeCol = [0, (255*breath)|0, (65*breath)|0];
         drawEyeGlow(ctx, lx, eyeY, C.green, 0.8);
@@ -251,8 +278,7 @@
         drawLine(ctx, cx-15, mouthY, cx+15, mouthY, 1, eyeCol);
 
       } else if (state === 'THINKING') {
-        drawHoodFilled(ctx, C.hood);
-        drawFaceShadow(ctx);
+        drawBase(ctx, C.hood, true);
         drawEyeGlow(ctx, lx, eyeY, C.green, 1);
         drawEyeGlow(ctx, rx, eyeY, C.green, 1);
         drawMandorlaEyeRelaxed(ctx, lx, eyeY, hw, hh, C.green, 0);
@@ -268,8 +294,7 @@
         if (dots) drawText(ctx, dots, cx, cy+50, C.dim, 14);
 
       } else if (state === 'WORKING') {
-        drawHoodFilled(ctx, C.hood);
-        drawFaceShadow(ctx);
+        drawBase(ctx, C.hood, true);
         drawEyeGlow(ctx, lx, eyeY, C.green, 0.5);
         drawEyeGlow(ctx, rx, eyeY, C.green, 0.5);
         drawMandorlaEye(ctx, lx, eyeY, hw, 4, C.dim);
@@ -283,8 +308,7 @@
         if (dots) drawText(ctx, dots, cx, cy+50, C.dim, 14);
 
       } else if (state === 'PROUD') {
-        drawHoodFilled(ctx, C.hoodLt);
-        drawFaceShadow(ctx);
+        drawBase(ctx, C.hoodLt, true);
         drawEyeGlow(ctx, lx, eyeY, C.green, 1);
         drawEyeGlow(ctx, rx, eyeY, C.green, 1);
         drawHappyEye(ctx, lx, eyeY, (hw*0.7)|0, C.green);
@@ -298,7 +322,7 @@
         drawMouth(ctx, cx, mouthY, 18, C.green, 7);
 
       } else if (state === 'SLEEPING') {
-        drawHoodFilled(ctx, lerp(C.hood, C.bg, 0.4));
+        drawBase(ctx, lerp(C.hood, C.bg, 0.4), false);
         drawLine(ctx, lx-hw, eyeY, lx+hw, eyeY, 2, C.dim);
         drawLine(ctx, rx-hw, eyeY, rx+hw, eyeY, 2, C.dim);
         drawSigil(ctx, cx, sigilY, [40,0,10], 0.5);
@@ -308,8 +332,7 @@
         drawText(ctx, 'z', cx+85, cy-75+yOff, C.dim, 14);
 
       } else if (state === 'HAPPY') {
-        drawHoodFilled(ctx, C.hoodLt);
-        drawFaceShadow(ctx);
+        drawBase(ctx, C.hoodLt, true);
         drawEyeGlow(ctx, lx, eyeY, C.green, 1);
         drawEyeGlow(ctx, rx, eyeY, C.green, 1);
         drawHappyEye(ctx, lx, eyeY, (hw*0.8)|0, C.green);
@@ -327,8 +350,7 @@
         drawText(ctx, '*', cx+48, cy-48, starCol, 8);
 
       } else if (state === 'CURIOUS') {
-        drawHoodFilled(ctx, C.hoodLt);
-        drawFaceShadow(ctx);
+        drawBase(ctx, C.hoodLt, true);
         drawEyeGlow(ctx, lx, eyeY, C.green, 1);
         drawEyeGlow(ctx, rx, eyeY, C.green, 1);
         drawMandorlaEyeRelaxed(ctx, lx, eyeY, hw+2, hh+2, C.green, 0);
@@ -348,8 +370,7 @@
         drawText(ctx, '?', cx+80, cy-30+qY, C.dim, 24);
 
       } else if (state === 'ALERT') {
-        drawHoodFilled(ctx, C.yellow);
-        drawFaceShadow(ctx);
+        drawBase(ctx, C.yellow, true);
         drawEyeGlow(ctx, lx, eyeY, C.yellow, 1);
         drawEyeGlow(ctx, rx, eyeY, C.yellow, 1);
         drawMandorlaEye(ctx, lx, eyeY, hw, hh, C.yellow);
@@ -369,8 +390,7 @@
         if ((now/500|0)%2===0) drawText(ctx, '!', cx+90, cy-15, C.red, 24);
 
       } else if (state === 'ERROR') {
-        drawHoodFilled(ctx, C.red);
-        drawFaceShadow(ctx);
+        drawBase(ctx, C.red, true);
         drawEyeGlow(ctx, lx, eyeY, C.red, 0.6);
         drawEyeGlow(ctx, rx, eyeY, C.red, 0.6);
         // X marks
@@ -391,8 +411,7 @@
         const phase = (elapsed/5000|0)%6;
         const t = (elapsed%5000)/5000;
 
-        drawHoodFilled(ctx, C.hood);
-        drawFaceShadow(ctx);
+        drawBase(ctx, C.hood, true);
         drawEyeGlow(ctx, lx, eyeY, C.green, 0.7);
         drawEyeGlow(ctx, rx, eyeY, C.green, 0.7);
 
@@ -493,7 +512,7 @@
       const now = Date.now() - startTime;
       const pulse = 0.3 + 0.2*Math.sin(now/3000*Math.PI*2);
       drawSigil(ctx, 160, 85, lerp(C.bg, C.red, pulse), 1.5);
-      drawScanlines(ctx);
+      drawScanlinesCached(ctx);
       _blit(canvas);
     }
 
@@ -516,7 +535,7 @@
       ctx.fillRect(0, 0, 320, 170);
       const now = Date.now() - startTime;
       renderStates(ctx, now, state);
-      drawScanlines(ctx);
+      drawScanlinesCached(ctx);
       _blit(canvas);
     }
 
@@ -634,6 +653,7 @@
       _sigilState = state;
       _sigilStartTime = Date.now();
       _sigilStateTime = Date.now();
+      _sigilKick(true);
     }
     _sigilOnline = true;
     const moodEl = document.getElementById('sigil-mood-info');
@@ -658,6 +678,7 @@
   function wakeSigil() {
     if (!_sigilDormant) return;
     _sigilDormant = false;
+    _sigilKick(true);
     const label = document.getElementById('sigil-wake-label');
     if (label) label.style.display = 'none';
     const cmds = document.getElementById('sigil-commands');
@@ -675,32 +696,101 @@
   }
 
   // ── Animation loop ──
-  function _sigilAnimLoop() {
-    const wc = document.getElementById('sigil-widget-canvas');
-    if (wc && wc.offsetParent !== null) {
-      if (_sigilDormant) {
-        SigilEngine.renderDormantFrame(wc, _sigilStartTime);
-      } else {
-        SigilEngine.renderFrame(wc, _sigilState, _sigilStartTime);
-      }
-    }
-    const mc = document.getElementById('sigil-header-canvas');
-    if (mc && mc.offsetParent !== null) {
-      SigilEngine.renderMini(mc, _sigilState, _sigilStartTime);
+  // Niente rAF continuo: ogni canvas ha un tetto di fps per stato e si ridisegna
+  // solo quando l'animazione passa al frame successivo (o cambia stato/dimensione).
+  // Tra un frame e l'altro si dorme con setTimeout, poi un rAF allinea al vsync.
+  // Tab in background (visibilitychange) o canvas fuori schermo / vista nascosta
+  // (IntersectionObserver) → nessun timer: il loop riparte quando tornano visibili.
+  // Riferimento: l'ESP32 anima a ~20 fps; qui basta il passo più rapido di ogni
+  // stato (ALERT trema ogni 80ms, HAPPY lampeggia ogni 300ms, IDLE respira in 4s).
+  const SIGIL_FPS = {
+    IDLE: 10, THINKING: 15, WORKING: 12, PROUD: 20, SLEEPING: 8, HAPPY: 20,
+    CURIOUS: 15, ALERT: 24, ERROR: 10, BORED: 15, DORMANT: 8
+  };
+  // Header: solo IDLE (respiro) e THINKING/WORKING (pulsazione) si muovono; 0 = statico
+  const SIGIL_MINI_FPS = {
+    THINKING: 12, WORKING: 12, SLEEPING: 0, HAPPY: 0, PROUD: 0, ERROR: 0, ALERT: 0
+  };
+  const SIGIL_MINI_FPS_DEFAULT = 8;
+
+  // Per canvas: visibile secondo l'IntersectionObserver + ultimo frame disegnato (-1 = da ridisegnare)
+  const _sigilView = {
+    'sigil-widget-canvas': { seen: true, frame: -1 },
+    'sigil-header-canvas': { seen: true, frame: -1 },
+  };
+  let _sigilTimer = null;
+
+  // Disegna se è scattato un nuovo frame; ritorna quando serve il prossimo (ms epoch)
+  function _sigilDraw(id, fps, render) {
+    const v = _sigilView[id];
+    const el = document.getElementById(id);
+    if (!el || !v.seen || document.hidden) return Infinity;
+    const frame = fps > 0 ? Math.floor((Date.now() - _sigilStartTime) * fps / 1000) : 0;
+    if (frame !== v.frame) {
+      v.frame = frame;
+      render(el);
     }
-    if (!_sigilDormant) {
-      const timerEl = document.getElementById('sigil-mood-timer');
-      if (timerEl) {
-        const elapsed = Math.floor((Date.now() - _sigilStateTime) / 1000);
-        if (elapsed < 60) timerEl.textContent = elapsed + 's';
-        else if (elapsed < 3600) timerEl.textContent = Math.floor(elapsed/60) + 'm ' + (elapsed%60) + 's';
-        else timerEl.textContent = Math.floor(elapsed/3600) + 'h ' + Math.floor((elapsed%3600)/60) + 'm';
-      }
+    return fps > 0 ? _sigilStartTime + Math.ceil((frame + 1) * 1000 / fps) : Infinity;
+  }
+
+  // Timer "da quanto dura lo stato": basta aggiornarlo allo scoccare del secondo
+  function _sigilMoodTimer() {
+    const timerEl = document.getElementById('sigil-mood-timer');
+    if (!timerEl) return Infinity;
+    const elapsed = Math.floor((Date.now() - _sigilStateTime) / 1000);
+    let text;
+    if (elapsed < 60) text = elapsed + 's';
+    else if (elapsed < 3600) text = Math.floor(elapsed/60) + 'm ' + (elapsed%60) + 's';
+    else text = Math.floor(elapsed/3600) + 'h ' + Math.floor((elapsed%3600)/60) + 'm';
+    if (timerEl.textContent !== text) timerEl.textContent = text;
+    return _sigilStateTime + (elapsed + 1) * 1000;
+  }
+
+  function _sigilTick() {
+    _sigilAnimFrame = null;
+    const state = _sigilState, dormant = _sigilDormant;
+    const fps = dormant ? SIGIL_FPS.DORMANT : (SIGIL_FPS[state] ?? SIGIL_FPS.IDLE);
+    let next = _sigilDraw('sigil-widget-canvas', fps, wc => {
+      if (dormant) SigilEngine.renderDormantFrame(wc, _sigilStartTime);
+      else SigilEngine.renderFrame(wc, state, _sigilStartTime);
+    });
+    next = Math.min(next, _sigilDraw('sigil-header-canvas', SIGIL_MINI_FPS[state] ?? SIGIL_MINI_FPS_DEFAULT,
+      mc => SigilEngine.renderMini(mc, state, _sigilStartTime)));
+    if (!dormant && _sigilView['sigil-widget-canvas'].seen && !document.hidden) {
+      next = Math.min(next, _sigilMoodTimer());
     }
-    _sigilAnimFrame = requestAnimationFrame(_sigilAnimLoop);
+    if (next !== Infinity) _sigilTimer = setTimeout(_sigilSchedule, Math.max(0, next - Date.now()));
   }
 
-  _sigilAnimLoop();
+  function _sigilSchedule() {
+    _sigilTimer = null;
+    if (_sigilAnimFrame === null) _sigilAnimFrame = requestAnimationFrame(_sigilTick);
+  }
+
+  // Sveglia il loop; dirty = ridisegna anche i canvas statici (stato o dimensioni cambiati)
+  function _sigilKick(dirty) {
+    if (dirty) Object.values(_sigilView).forEach(v => { v.frame = -1; });
+    if (_sigilTimer !== null) { clearTimeout(_sigilTimer); _sigilTimer = null; }
+    _sigilSchedule();
+  }
+
+  if ('IntersectionObserver' in window) {
+    const io = new IntersectionObserver(entries => {
+      entries.forEach(e => {
+        const v = _sigilView[e.target.id];
+        if (v) v.seen = e.isIntersecting;
+      });
+      _sigilKick(false);
+    });
+    Object.keys(_sigilView).forEach(id => {
+      const el = document.getElementById(id);
+      if (el) io.observe(el);
+    });
+  }
+  document.addEventListener('visibilitychange', () => _sigilKick(false));
+  window.addEventListener('resize', () => _sigilKick(true));
+
+  _sigilKick(true);
 
   // ── Sigil commands ──
   function sigilCommand(state) {
@@ -734,6 +824,19 @@
       .catch(() => showToast('Errore OTA'));
   }
 
+  // ── Progresso OTA per device (ota_progress dal backend) ──
+  const _otaLabels = { downloading: 'download', downloaded: 'flash', interrupted: 'ripresa…',
+                       ok: 'OK, riavvio', skip: 'già aggiornato', error: 'errore' };
+  function renderOtaProgress(d) {
+    const el = document.getElementById('sigil-ota-status');
+    if (!el || !d) return;
+    const label = _otaLabels[d.status] || d.status;
+    const pct = (d.status === 'downloading' || d.status === 'interrupted') ? ' ' + (d.pct || 0) + '%' : '';
+    const retry = d.attempts > 1 ? ' (tent. ' + d.attempts + ')' : '';
+    el.textContent = 'OTA v' + (d.version || '?') + ': ' + label + pct + retry + (d.error ? ' — ' + d.error : '');
+    if (d.status === 'ok' || d.status === 'skip' || d.status === 'error') showToast('Sigil ' + el.textContent);
+  }
+
   function scrollToSigilWidget() {
     switchView('dashboard');
     setTimeout(() => {
@@ -9,6 +9,7 @@ per evitare dipendenza diretta dalle librerie Google.
 """
 import json
 import os
+import socket
 import subprocess
 import urllib.request
 from datetime import datetime, timedelta
@@ -19,8 +20,10 @@ NANOBOT_DIR = Path.home() / ".nanobot"
 SENT_FILE = NANOBOT_DIR / "reminders_sent.json"
 GOOGLE_PYTHON = Path.home() / ".local" / "share" / "google-workspace-mcp" / "bin" / "python"
 GOOGLE_HELPER = Path.home() / "scripts" / "google_helper.py"
+GOOGLE_SOCKET = Path(os.environ.get("GOOGLE_HELPER_SOCKET", str(Path.home() / ".nanobot" / "google_helper.sock")))
 REMINDER_MINUTES = 20  # notifica se evento entro N minuti
 MORNING_HOUR = 7       # digest tasks alla prima esecuzione dopo quest'ora
+BUS_SOCKET = os.environ.get("VESSEL_BUS_SOCKET", str(Path.home() / ".nanobot" / "vessel_bus.sock"))
 
 
 # ─── Telegram ────────────────────────────────────────────────────────────────
@@ -54,22 +57,28 @@ def telegram_send(text: str) -> bool:
 
 
 # ─── Sigil notification ──────────────────────────────────────────────────────
-def _notify_sigil(state: str, detail: str = "", text: str = ""):
-    """Aggiorna stato Sigil via REST locale."""
+def _bus_send(msg: dict) -> dict:
+    """Una riga JSON sul bus eventi di Vessel (Unix socket), ritorna la risposta."""
     try:
-        payload: dict = {"state": state}
-        if detail:
-            payload["detail"] = detail
-        if text:
-            payload["text"] = text
-        data = json.dumps(payload).encode("utf-8")
-        req = urllib.request.Request(
-            "http://127.0.0.1:8090/api/tamagotchi/state",
-            data=data, headers={"Content-Type": "application/json"}, method="POST"
-        )
-        urllib.request.urlopen(req, timeout=3)
-    except Exception:
-        pass
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as s:
+            s.settimeout(3)
+            s.connect(BUS_SOCKET)
+            s.sendall((json.dumps(msg) + "\n").encode("utf-8"))
+            buf = b""
+            while not buf.endswith(b"\n"):
+                chunk = s.recv(4096)
+                if not chunk:
+                    break
+                buf += chunk
+        return json.loads(buf)
+    except (OSError, ValueError) as e:
+        print(f"[Reminder] Bus error: {e}")
+        return {}
+
+
+def _notify_sigil(state: str, detail: str = "", text: str = ""):
+    """Aggiorna stato Sigil via bus eventi locale."""
+    _bus_send({"topic": "sigil.state", "data": {"state": state, "detail": detail, "text": text}})
 
 
 # ─── Dedup ───────────────────────────────────────────────────────────────────
@@ -89,8 +98,35 @@ def _save_sent(sent: dict):
 
 
 # ─── Google Helper subprocess ────────────────────────────────────────────────
+def _google_rpc(args: list) -> str | None:
+    """Prova il worker google_helper (Unix socket, credenziali già calde).
+    None se il worker non è attivo: il chiamante ripiega sul subprocess."""
+    try:
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as s:
+            s.settimeout(15)
+            s.connect(str(GOOGLE_SOCKET))
+            s.sendall((json.dumps({"jsonrpc": "2.0", "id": 1, "method": "call",
+                                   "params": {"argv": args}}) + "\n").encode("utf-8"))
+            buf = b""
+            while not buf.endswith(b"\n"):
+                chunk = s.recv(65536)
+                if not chunk:
+                    break
+                buf += chunk
+        resp = json.loads(buf)
+    except (OSError, ValueError):
+        return None
+    if "error" in resp:
+        return None
+    return resp.get("result", {}).get("output", "").strip() or None
+
+
 def _call_google(args: list) -> str | None:
-    """Chiama google_helper.py via subprocess col Python del venv Google."""
+    """Chiama google_helper: worker via socket se attivo, altrimenti subprocess
+    col Python del venv Google."""
+    out = _google_rpc(args)
+    if out is not None:
+        return out
     if not GOOGLE_PYTHON.exists() or not GOOGLE_HELPER.exists():
         print(f"[Reminder] Google helper non trovato")
         return None
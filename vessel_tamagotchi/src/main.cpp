@@ -6,6 +6,7 @@
 #include <ArduinoJson.h>
 #include <HTTPClient.h>
 #include <Update.h>
+#include <mbedtls/sha256.h>
 
 // ─── Display & WebSocket ─────────────────────────────────────────────────────
 TFT_eSPI tft = TFT_eSPI();
@@ -13,6 +14,9 @@ TFT_eSprite fb = TFT_eSprite(&tft);
 WebSocketsClient webSocket;
 
 // ─── Config ──────────────────────────────────────────────────────────────────
+// Versione firmware: build.py la copia nel manifest OTA (firmware/tamagotchi.json)
+const char* FW_VERSION = "2.1.0";
+
 // WiFi — rete casa + hotspot iPhone
 const char* HOME_SSID     = "FrzTsu";
 const char* HOME_PASS     = "qegduw-juSqe4-jikkom";
@@ -49,6 +53,16 @@ uint16_t COL_HOOD_LT;  // bordo cappuccio #6a2d9e
 String currentState = "BOOTING";
 bool   wsConnected  = false;
 
+// ─── Protocollo stato v2 (seq/ack, frame binari) ─────────────────────────────
+// Indice = codice stato nei frame binari: allineato a SIGIL_STATE_CODES nel backend
+const char* STATE_CODES[] = {"IDLE", "THINKING", "WORKING", "PROUD", "SLEEPING", "ERROR", "BOOTING",
+                             "HAPPY", "ALERT", "CURIOUS", "BORED", "PEEKING"};
+const int      STATE_CODE_COUNT   = 12;
+const uint8_t  SIGIL_FRAME_MAGIC  = 0x53;  // 'S'
+const size_t   SIGIL_FRAME_HEAD   = 10;    // magic, flags, seq(4), stato, happy, alert, error
+uint32_t lastSeq   = 0;
+bool     seqSynced = false;  // primo frame dopo il connect: accettato sempre (il server può essere ripartito)
+
 // ─── Standalone mode (Pi offline >60s) ───────────────────────────────────────
 unsigned long offlineSince    = 0;
 bool          standaloneMode  = false;
@@ -1804,104 +1818,273 @@ void bootAnimation() {
 }
 
 // ─── OTA Update ───────────────────────────────────────────────────────────────
+// Manifest (versione, size, sha256) → skip se già installata → download a pezzi
+// con Range/If-Range: se la connessione cade si riprende dall'ultimo byte scritto
+// invece di ricominciare. Lo sha256 è verificato prima di attivare la partizione.
 
-void performOTA() {
-    Serial.println("[OTA] Avvio aggiornamento firmware...");
+const int           OTA_MAX_ATTEMPTS = 6;
+const unsigned long OTA_STALL_MS     = 10000;  // nessun byte per 10s → nuova richiesta
+
+String otaUrl(const char* path) {
+    if (connMode == CONN_LOCAL)
+        return String("http://") + LOCAL_HOST + ":" + String(LOCAL_PORT) + path;
+    return String("https://") + TUNNEL_HOST + path;
+}
+
+void drawOTAScreen(const char* line, int pct) {
     fb.fillSprite(COL_BG);
     fb.setTextColor(COL_GREEN);
     fb.setTextDatum(MC_DATUM);
-    fb.drawString("OTA UPDATE", 160, 65, 4);
+    fb.drawString("OTA UPDATE", 160, pct < 0 ? 65 : 55, 4);
     fb.setTextColor(COL_DIM);
-    fb.drawString("connecting...", 160, 105, 2);
+    if (pct < 0) {
+        fb.drawString(line, 160, 105, 2);
+    } else {
+        fb.drawString(line, 160, 92, 2);
+        fb.drawRect(20, 110, 280, 12, COL_DIM);
+        fb.fillRect(20, 110, (280 * pct) / 100, 12, COL_GREEN);
+        fb.drawString(String(pct) + "%", 160, 132, 2);
+    }
     drawScanlines();
     fb.pushSprite(0, 0);
+}
 
+void reportOTA(const char* status, const char* version, const char* error) {
+    StaticJsonDocument<192> doc;
+    JsonObject ota = doc.createNestedObject("ota");
+    ota["status"]  = status;
+    ota["version"] = version;
+    if (error) ota["error"] = error;
+    char buf[192];
+    serializeJson(doc, buf);
+    webSocket.sendTXT(buf);
+}
+
+void otaFail(const char* version, const char* error) {
+    Serial.printf("[OTA] Fallito: %s\n", error);
+    reportOTA("error", version, error);
+    currentState = "ERROR";
+    renderState();
+}
+
+void performOTA() {
+    Serial.println("[OTA] Avvio aggiornamento firmware...");
+    drawOTAScreen("connecting...", -1);
+
+    // ── Manifest ──
     HTTPClient http;
-    String url;
-    if (connMode == CONN_LOCAL) {
-        url = String("http://") + LOCAL_HOST + ":" + String(LOCAL_PORT) + "/api/tamagotchi/firmware";
-    } else {
-        url = String("https://") + TUNNEL_HOST + "/api/tamagotchi/firmware";
-    }
-    Serial.printf("[OTA] URL: %s\n", url.c_str());
-    http.begin(url);
-    http.setTimeout(30000);
+    http.begin(otaUrl("/api/tamagotchi/firmware/manifest"));
+    http.setTimeout(10000);
     int code = http.GET();
-
     if (code != 200) {
-        Serial.printf("[OTA] HTTP error: %d\n", code);
+        Serial.printf("[OTA] Manifest HTTP error: %d\n", code);
         http.end();
-        currentState = "ERROR";
+        otaFail("", "manifest");
+        return;
+    }
+    StaticJsonDocument<384> man;
+    DeserializationError err = deserializeJson(man, http.getString());
+    http.end();
+    if (err) { otaFail("", "manifest json"); return; }
+    String version = man["version"] | "";
+    String sha     = man["sha256"] | "";
+    size_t len     = man["size"] | 0;
+    Serial.printf("[OTA] Manifest: v%s %u bytes (installata: v%s)\n", version.c_str(), len, FW_VERSION);
+
+    if (version == FW_VERSION) {
+        Serial.println("[OTA] Versione già installata, skip");
+        reportOTA("skip", version.c_str(), nullptr);
+        drawOTAScreen("up to date", -1);
+        delay(1000);
+        currentState = "IDLE";
         renderState();
         return;
     }
+    if (len == 0 || sha.length() != 64 || !Update.begin(len)) {
+        otaFail(version.c_str(), "update begin");
+        return;
+    }
+
+    mbedtls_sha256_context ctx;
+    mbedtls_sha256_init(&ctx);
+    mbedtls_sha256_starts(&ctx, 0);
 
-    int len = http.getSize();
-    Serial.printf("[OTA] Firmware: %d bytes\n", len);
+    uint8_t buf[1024];
+    size_t written = 0;
+    unsigned long lastDraw = 0;
+    String etag = "\"" + sha + "\"";
+    String fwUrl = otaUrl("/api/tamagotchi/firmware");
+
+    for (int attempt = 0; attempt < OTA_MAX_ATTEMPTS && written < len; attempt++) {
+        if (attempt > 0) {
+            Serial.printf("[OTA] Ripresa da %u/%u (tentativo %d)\n", written, len, attempt + 1);
+            drawOTAScreen("resuming...", written * 100 / len);
+            delay(1000 * attempt);
+        }
+        http.begin(fwUrl);
+        http.setTimeout(15000);
+        http.addHeader("X-Sigil-Id", WiFi.macAddress());
+        if (written > 0) {
+            http.addHeader("Range", "bytes=" + String(written) + "-");
+            http.addHeader("If-Range", etag);
+        }
+        code = http.GET();
+        if (code == 200 && written > 0) {
+            // Il .bin è cambiato sul Pi: non si possono mischiare due build
+            http.end();
+            Update.abort();
+            mbedtls_sha256_free(&ctx);
+            otaFail(version.c_str(), "firmware cambiato");
+            return;
+        }
+        if (code != 200 && code != 206) {
+            Serial.printf("[OTA] HTTP error: %d\n", code);
+            http.end();
+            continue;
+        }
+
+        WiFiClient* stream = http.getStreamPtr();
+        unsigned long lastByte = millis();
+        while (written < len) {
+            size_t avail = stream->available();
+            if (avail == 0) {
+                if (!stream->connected() || millis() - lastByte > OTA_STALL_MS) break;
+                delay(2);
+                continue;
+            }
+            int rd = stream->readBytes(buf, min(sizeof(buf), min(avail, len - written)));
+            if (rd <= 0) break;
+            if (Update.write(buf, rd) != (size_t)rd) {
+                http.end();
+                mbedtls_sha256_free(&ctx);
+                Update.abort();
+                otaFail(version.c_str(), "flash write");
+                return;
+            }
+            mbedtls_sha256_update(&ctx, buf, rd);
+            written += rd;
+            lastByte = millis();
+            if (millis() - lastDraw >= 200) {
+                lastDraw = millis();
+                drawOTAScreen("flashing...", written * 100 / len);
+            }
+        }
+        http.end();
+    }
+
+    uint8_t digest[32];
+    mbedtls_sha256_finish(&ctx, digest);
+    mbedtls_sha256_free(&ctx);
+    char hex[65];
+    for (int i = 0; i < 32; i++) sprintf(hex + i * 2, "%02x", digest[i]);
+
+    if (written != len) {
+        Update.abort();
+        otaFail(version.c_str(), "download incompleto");
+        return;
+    }
+    if (sha != hex) {
+        Update.abort();
+        otaFail(version.c_str(), "sha256 mismatch");
+        return;
+    }
+    if (!Update.end(true)) {
+        otaFail(version.c_str(), "update end");
+        return;
+    }
+    reportOTA("ok", version.c_str(), nullptr);
     fb.fillSprite(COL_BG);
     fb.setTextColor(COL_GREEN);
     fb.setTextDatum(MC_DATUM);
-    fb.drawString("OTA UPDATE", 160, 55, 4);
+    fb.drawString("UPDATE OK", 160, 65, 4);
     fb.setTextColor(COL_DIM);
-    fb.drawString("flashing...", 160, 92, 2);
-    fb.drawRect(20, 110, 280, 12, COL_DIM);
+    fb.drawString("rebooting...", 160, 105, 2);
     drawScanlines();
     fb.pushSprite(0, 0);
+    delay(1500);
+    ESP.restart();
+}
 
-    WiFiClient* stream = http.getStreamPtr();
-    if (!Update.begin(len)) {
-        http.end();
-        currentState = "ERROR";
-        renderState();
-        return;
-    }
+// ─── Applicazione frame di stato (JSON o binario) ───────────────────────────
 
-    uint8_t buf[1024];
-    size_t written = 0;
-    unsigned long lastDraw = 0;
+// false se il frame è già stato applicato (duplicato da resync)
+bool acceptSeq(uint32_t seq) {
+    if (seqSynced && seq != 0 && seq <= lastSeq) return false;
+    lastSeq   = seq;
+    seqSynced = true;
+    return true;
+}
 
-    while (stream->available() > 0 && written < (size_t)len) {
-        int toRead = min((int)sizeof(buf), (int)(len - (int)written));
-        int rd = stream->readBytes(buf, toRead);
-        if (rd <= 0) break;
-        if (!Update.write(buf, rd)) break;
-        written += rd;
-        unsigned long now = millis();
-        if (now - lastDraw >= 200) {
-            lastDraw = now;
-            int pct = (len > 0) ? (written * 100 / len) : 0;
-            fb.fillSprite(COL_BG);
-            fb.setTextColor(COL_GREEN);
-            fb.setTextDatum(MC_DATUM);
-            fb.drawString("OTA UPDATE", 160, 55, 4);
-            fb.setTextColor(COL_DIM);
-            fb.drawString("flashing...", 160, 92, 2);
-            fb.drawRect(20, 110, 280, 12, COL_DIM);
-            fb.fillRect(20, 110, (280 * pct) / 100, 12, COL_GREEN);
-            fb.drawString(String(pct) + "%", 160, 132, 2);
-            drawScanlines();
-            fb.pushSprite(0, 0);
+void sendAck(uint32_t seq) {
+    char buf[32];
+    snprintf(buf, sizeof(buf), "{\"ack\":%lu}", (unsigned long)seq);
+    webSocket.sendTXT(buf);
+}
+
+void sendHello() {
+    char buf[160];
+    snprintf(buf, sizeof(buf),
+             "{\"hello\":{\"proto\":2,\"last_seq\":%lu,\"binary\":true,\"id\":\"%s\",\"fw\":\"%s\"}}",
+             (unsigned long)lastSeq, WiFi.macAddress().c_str(), FW_VERSION);
+    webSocket.sendTXT(buf);
+}
+
+void applyState(const String& ns, const char* detailRaw, const char* textRaw,
+                bool hasMood, int happy, int alert, int error) {
+    // ── Mood summary pre-SLEEPING ──────────────────────────────────────
+    if (ns == "SLEEPING") {
+        if (hasMood) {
+            moodHappy  = happy;
+            moodAlert  = alert;
+            moodError  = error;
+            moodActive    = true;
+            moodStartedAt = millis();
+            // Non settiamo ancora currentState — lo farà il loop dopo MOOD_DURATION
+            Serial.printf("[Mood] H:%d A:%d E:%d\n", moodHappy, moodAlert, moodError);
+            renderMoodSummary();
+            return;
         }
     }
 
-    bool ok = Update.end();
-    http.end();
+    // ── Transizione sbadiglio SLEEPING→IDLE ───────────────────────────
+    if (ns == "IDLE" && currentState == "SLEEPING") {
+        transition.anim  = TRANS_YAWN;
+        transition.start = millis();
+        Serial.println("[Trans] Sbadiglio SLEEPING→IDLE");
+        return;
+    }
 
-    if (ok && written == (size_t)len) {
-        fb.fillSprite(COL_BG);
-        fb.setTextColor(COL_GREEN);
-        fb.setTextDatum(MC_DATUM);
-        fb.drawString("UPDATE OK", 160, 65, 4);
-        fb.setTextColor(COL_DIM);
-        fb.drawString("rebooting...", 160, 105, 2);
-        drawScanlines();
-        fb.pushSprite(0, 0);
-        delay(1500);
-        ESP.restart();
-    } else {
-        currentState = "ERROR";
-        renderState();
+    currentState = ns;
+    stateStartedAt = millis();
+
+    // Reset idle depth su qualsiasi cambio stato attivo (non SLEEPING)
+    if (ns != "SLEEPING") resetInteraction();
+
+    if (currentState == "IDLE") {
+        blink.phase       = BLINK_NONE;
+        blink.openness    = 1.0;
+        blink.nextBlinkAt = millis() + random(1000, 3000);
+    }
+    if (currentState == "HAPPY")   happyStartedAt   = millis();
+    if (currentState == "PROUD")   proudStartedAt   = millis();
+    if (currentState == "CURIOUS") curiousStartedAt = millis();
+
+    if (detailRaw || textRaw) {
+        String d = detailRaw ? String(detailRaw) : "";
+        String t = textRaw   ? String(textRaw)   : "";
+        pushNotification(d, t);
+        // Mostra subito se utente è attivo (AWAKE/DROWSY)
+        if (currentIdleDepth <= IDLE_DROWSY) {
+            int idx = getOldestUnread();
+            if (idx >= 0) {
+                showNotification(notifQueue[idx].detail, notifQueue[idx].text, false);
+                markNotifRead(idx);
+            }
+        }
+        // Se in deep idle: resta in coda, indicatore lo segnala
     }
+
+    renderState();
 }
 
 // ─── WebSocket ───────────────────────────────────────────────────────────────
@@ -1932,7 +2115,8 @@ void webSocketEvent(WStype_t type, uint8_t* payload, size_t length) {
             transition.anim   = TRANS_NONE;
             resetInteraction();
             renderState();
-            webSocket.sendTXT("Connected");
+            seqSynced = false;
+            sendHello();
             break;
 
         case WStype_TEXT: {
@@ -2006,67 +2190,43 @@ void webSocketEvent(WStype_t type, uint8_t* payload, size_t length) {
 
             // ── Cambio stato ──────────────────────────────────────────────────
             const char* newState  = doc["state"];
-            const char* detailRaw = doc["detail"];
-            const char* textRaw   = doc["text"];
-
             if (!newState) break;
-            String ns = String(newState);
-
-            // ── Mood summary pre-SLEEPING ──────────────────────────────────────
-            if (ns == "SLEEPING") {
-                JsonObject mood = doc["mood"];
-                if (!mood.isNull()) {
-                    moodHappy  = mood["happy"] | 0;
-                    moodAlert  = mood["alert"] | 0;
-                    moodError  = mood["error"] | 0;
-                    moodActive    = true;
-                    moodStartedAt = millis();
-                    // Non settiamo ancora currentState — lo farà il loop dopo MOOD_DURATION
-                    Serial.printf("[Mood] H:%d A:%d E:%d\n", moodHappy, moodAlert, moodError);
-                    renderMoodSummary();
-                    break;
-                }
+            if (doc.containsKey("seq")) {
+                uint32_t seq = doc["seq"];
+                sendAck(seq);  // anche i duplicati: fermano il resync lato server
+                if (!acceptSeq(seq)) break;
             }
+            JsonObject mood = doc["mood"];
+            applyState(String(newState), doc["detail"], doc["text"], !mood.isNull(),
+                       mood["happy"] | 0, mood["alert"] | 0, mood["error"] | 0);
+            break;
+        }
 
-            // ── Transizione sbadiglio SLEEPING→IDLE ───────────────────────────
-            if (ns == "IDLE" && currentState == "SLEEPING") {
-                transition.anim  = TRANS_YAWN;
-                transition.start = millis();
-                Serial.println("[Trans] Sbadiglio SLEEPING→IDLE");
-                break;
-            }
-
-            currentState = ns;
-            stateStartedAt = millis();
-
-            // Reset idle depth su qualsiasi cambio stato attivo (non SLEEPING)
-            if (ns != "SLEEPING") resetInteraction();
-
-            if (currentState == "IDLE") {
-                blink.phase       = BLINK_NONE;
-                blink.openness    = 1.0;
-                blink.nextBlinkAt = millis() + random(1000, 3000);
+        case WStype_BIN: {
+            // Frame binario v2: header 10 byte + [len][detail] + [len][text]
+            if (length < SIGIL_FRAME_HEAD + 2 || payload[0] != SIGIL_FRAME_MAGIC) break;
+            uint32_t seq = (uint32_t)payload[2] | ((uint32_t)payload[3] << 8) |
+                           ((uint32_t)payload[4] << 16) | ((uint32_t)payload[5] << 24);
+            uint8_t code = payload[6];
+            if (code >= STATE_CODE_COUNT) break;
+            size_t pos = SIGIL_FRAME_HEAD;
+            String fields[2];
+            bool ok = true;
+            for (int f = 0; f < 2; f++) {
+                if (pos >= length) { ok = false; break; }
+                uint8_t n = payload[pos++];
+                if (pos + n > length) { ok = false; break; }
+                fields[f].reserve(n);
+                for (uint8_t i = 0; i < n; i++) fields[f] += (char)payload[pos + i];
+                pos += n;
             }
-            if (currentState == "HAPPY")   happyStartedAt   = millis();
-            if (currentState == "PROUD")   proudStartedAt   = millis();
-            if (currentState == "CURIOUS") curiousStartedAt = millis();
-
-            if (detailRaw || textRaw) {
-                String d = detailRaw ? String(detailRaw) : "";
-                String t = textRaw   ? String(textRaw)   : "";
-                pushNotification(d, t);
-                // Mostra subito se utente è attivo (AWAKE/DROWSY)
-                if (currentIdleDepth <= IDLE_DROWSY) {
-                    int idx = getOldestUnread();
-                    if (idx >= 0) {
-                        showNotification(notifQueue[idx].detail, notifQueue[idx].text, false);
-                        markNotifRead(idx);
-                    }
-                }
-                // Se in deep idle: resta in coda, indicatore lo segnala
-            }
-
-            renderState();
+            if (!ok) break;
+            sendAck(seq);
+            if (!acceptSeq(seq)) break;
+            applyState(String(STATE_CODES[code]),
+                       fields[0].length() ? fields[0].c_str() : nullptr,
+                       fields[1].length() ? fields[1].c_str() : nullptr,
+                       payload[1] & 0x01, payload[7], payload[8], payload[9]);
             break;
         }
 
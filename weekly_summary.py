@@ -1,9 +1,12 @@
 #!/usr/bin/env python3
 """Weekly Summary — Fase 19A.
-Cron job settimanale: raccoglie dati ultimi 7 giorni, chiama Ollama per
-generare un riassunto narrativo, salva in SQLite.
-Schedule: 0 5 * * 0  python3.13 ~/weekly_summary.py
-(dopo self_evolve alle 3:00 e backup_db alle 4:00)
+Cron job settimanale: riduce i checkpoint giornalieri (daily_summary.py) degli
+ultimi 7 giorni chiusi in un riassunto narrativo, salva in SQLite.
+La riduzione è una chiamata piccola; se va in timeout il rilancio riusa i
+checkpoint e rifà solo quella. Una settimana già riassunta non si rifà.
+Schedule: 0 5-8 * * 0  python3.13 ~/weekly_summary.py
+(dopo self_evolve alle 3:00 e backup_db alle 4:00; i passaggi successivi
+riprovano solo se il primo è finito in fallback)
 """
 import http.client
 import json
@@ -40,6 +43,31 @@ def _ensure_table():
             )
         """)
         conn.execute("CREATE INDEX IF NOT EXISTS idx_weekly_ts ON weekly_summaries(ts)")
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS summary_checkpoints (
+                kind TEXT NOT NULL, period_start TEXT NOT NULL, period_end TEXT NOT NULL,
+                ts TEXT NOT NULL, summary TEXT NOT NULL DEFAULT '', stats TEXT NOT NULL DEFAULT '{}',
+                status TEXT NOT NULL DEFAULT 'ok', attempts INTEGER NOT NULL DEFAULT 1,
+                PRIMARY KEY (kind, period_start)
+            )
+        """)
+
+
+def load_day_checkpoints(week_start: str, week_end: str) -> list[dict]:
+    """Riassunti giornalieri già pronti per la settimana (vedi daily_summary.py)."""
+    with _db_conn() as conn:
+        return [dict(r) for r in conn.execute(
+            "SELECT period_start AS day, summary, status FROM summary_checkpoints "
+            "WHERE kind = 'day' AND period_start >= ? AND period_start <= ? ORDER BY period_start",
+            (week_start[:10], week_end[:10])).fetchall()]
+
+
+def week_already_done(week_start: str) -> bool:
+    with _db_conn() as conn:
+        row = conn.execute(
+            "SELECT status FROM summary_checkpoints WHERE kind = 'week' AND period_start = ?",
+            (week_start[:10],)).fetchone()
+    return bool(row) and row["status"] == "ok"
 
 
 def gather_week_data(week_start: str, week_end: str) -> dict:
@@ -101,8 +129,8 @@ def gather_week_data(week_start: str, week_end: str) -> dict:
         }
 
 
-def build_prompt(data: dict, week_start: str, week_end: str) -> str:
-    """Costruisce il prompt per Ollama. Compatto, ~400-500 token."""
+def build_prompt(data: dict, week_start: str, week_end: str, days: list[dict] | None = None) -> str:
+    """Costruisce il prompt per Ollama. Compatto: statistiche + un riassunto per giorno."""
     lines = [
         f"Periodo: {week_start[:10]} — {week_end[:10]}",
         f"Messaggi totali: {data['chat_total']}",
@@ -122,7 +150,12 @@ def build_prompt(data: dict, week_start: str, week_end: str) -> str:
         new = ", ".join(f"{n} ({t})" for n, t in data["new_entities"][:5])
         lines.append(f"Nuovi argomenti: {new}")
 
-    if data["user_messages_sample"]:
+    if days:
+        lines.append("Giornate:")
+        for d in days:
+            lines.append(f"  - {d['day']}: {d['summary'][:400]}")
+    elif data["user_messages_sample"]:
+        # Nessun checkpoint (daily_summary non ancora girato): campione di domande
         lines.append("Esempi domande utente:")
         for msg in data["user_messages_sample"][:5]:
             lines.append(f"  - {msg}")
@@ -131,6 +164,7 @@ def build_prompt(data: dict, week_start: str, week_end: str) -> str:
 
     return f"""Sei Vessel, assistente personale di Filippo su Raspberry Pi.
 Scrivi un breve riassunto settimanale (max 150 parole, italiano) basato su questi dati.
+Unisci le giornate in un racconto unico, non elencarle una per una.
 Tono informale, evidenzia pattern e temi ricorrenti. Non inventare dati.
 
 {data_block}
@@ -162,9 +196,19 @@ def call_ollama(prompt: str) -> str:
     return data.get("message", {}).get("content", "").strip()
 
 
-def save_summary(week_start: str, week_end: str, summary: str, stats: dict):
-    """Salva il riassunto in SQLite."""
+def save_summary(week_start: str, week_end: str, summary: str, stats: dict, status: str = "ok"):
+    """Salva il riassunto in SQLite (sostituisce un fallback precedente della stessa settimana)
+    e il checkpoint 'week', riusato dal riassunto d'archivio di self_evolve."""
     with _db_conn() as conn:
+        conn.execute("DELETE FROM weekly_summaries WHERE week_start = ? AND week_end = ?",
+                     (week_start, week_end))
+        conn.execute(
+            "INSERT INTO summary_checkpoints (kind, period_start, period_end, ts, summary, stats, status) "
+            "VALUES ('week', ?, ?, ?, ?, ?, ?) "
+            "ON CONFLICT(kind, period_start) DO UPDATE SET ts = excluded.ts, summary = excluded.summary, "
+            "stats = excluded.stats, status = excluded.status, attempts = summary_checkpoints.attempts + 1",
+            (week_start[:10], week_end[:10], time.strftime("%Y-%m-%dT%H:%M:%S"), summary,
+             json.dumps(stats, ensure_ascii=False), status))
         conn.execute(
             "INSERT INTO weekly_summaries (ts, week_start, week_end, summary, stats) VALUES (?, ?, ?, ?, ?)",
             (time.strftime("%Y-%m-%dT%H:%M:%S"), week_start, week_end,
@@ -182,9 +226,12 @@ def main():
 
     _ensure_table()
 
-    # Periodo: ultimi 7 giorni
-    week_end = now.strftime("%Y-%m-%dT%H:%M:%S")
+    # Periodo: ultimi 7 giorni chiusi (quelli con un checkpoint giornaliero)
+    week_end = (now - timedelta(days=1)).strftime("%Y-%m-%dT23:59:59")
     week_start = (now - timedelta(days=7)).strftime("%Y-%m-%dT00:00:00")
+    if week_already_done(week_start):
+        print(f"[Weekly Summary] Settimana {week_start[:10]} già riassunta, skip")
+        return
 
     # Raccolta dati
     data = gather_week_data(week_start, week_end)
@@ -194,13 +241,18 @@ def main():
         print("[Weekly Summary] Nessuna attività questa settimana, skip")
         return
 
-    # Genera summary con Ollama
-    prompt = build_prompt(data, week_start, week_end)
+    # Reduce sui checkpoint giornalieri
+    days = load_day_checkpoints(week_start, week_end)
+    print(f"[Weekly Summary] Checkpoint giornalieri: {len(days)} "
+          f"({sum(d['status'] == 'ok' for d in days)} da LLM)")
+    prompt = build_prompt(data, week_start, week_end, days)
     print(f"[Weekly Summary] Prompt: {len(prompt)} chars, chiamo Ollama ({OLLAMA_MODEL})...")
 
+    status = "ok"
     try:
         summary = call_ollama(prompt)
     except Exception as e:
+        status = "fallback"
         print(f"[Weekly Summary] Errore Ollama: {e}")
         # Fallback: summary statistico senza LLM
         summary = f"Settimana {week_start[:10]}—{week_end[:10]}: {data['chat_total']} messaggi, {data['usage_calls']} chiamate API."
@@ -217,9 +269,10 @@ def main():
         "chat_by_channel": data["chat_by_channel"],
         "usage_calls": data["usage_calls"],
         "tokens": data["total_input_tokens"] + data["total_output_tokens"],
+        "days": len(days),
     }
 
-    save_summary(week_start, week_end, summary, stats)
+    save_summary(week_start, week_end, summary, stats, status)
     print(f"[Weekly Summary] Salvato in DB. Completato.")
 
 